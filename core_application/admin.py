@@ -12,6 +12,9 @@ from .models import (
     LibraryTransaction, Hostel, Room, Bed, HostelBooking, HostelPayment,
     HostelIncident, Examination, Timetable, Attendance, Notification
 )
+from .admin_performance import (
+    AnnotatedAdminMixin, LargeTableAdminMixin, related_column, related_count
+)
 
 # Custom User Admin
 @admin.register(User)
@@ -42,15 +45,16 @@ class DepartmentInline(admin.TabularInline):
     fields = ('name', 'code', 'head_of_department', 'is_active')
 
 @admin.register(Faculty)
-class FacultyAdmin(admin.ModelAdmin):
+class FacultyAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'code', 'dean', 'department_count', 'is_active', 'established_date')
     list_filter = ('is_active', 'established_date')
     search_fields = ('name', 'code', 'description')
     inlines = [DepartmentInline]
+    list_annotations = {'department_total': related_count(Department, 'faculty')}
     
+    @admin.display(description='Departments', ordering='department_total')
     def department_count(self, obj):
-        return obj.departments.count()
-    department_count.short_description = 'Departments'
+        return obj.department_total
 
 class ProgrammeInline(admin.TabularInline):
     model = Programme
@@ -58,15 +62,16 @@ class ProgrammeInline(admin.TabularInline):
     fields = ('name', 'code', 'programme_type', 'study_mode', 'is_active')
 
 @admin.register(Department)
-class DepartmentAdmin(admin.ModelAdmin):
+class DepartmentAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'code', 'faculty', 'head_of_department', 'programme_count', 'is_active')
     list_filter = ('faculty', 'is_active', 'established_date')
     search_fields = ('name', 'code', 'description')
     inlines = [ProgrammeInline]
+    list_annotations = {'programme_total': related_count(Programme, 'department')}
     
+    @admin.display(description='Programmes', ordering='programme_total')
     def programme_count(self, obj):
-        return obj.programmes.count()
-    programme_count.short_description = 'Programmes'
+        return obj.programme_total
 
 class ProgrammeCourseInline(admin.TabularInline):
     model = ProgrammeCourse
@@ -74,38 +79,40 @@ class ProgrammeCourseInline(admin.TabularInline):
     fields = ('course', 'year', 'semester', 'is_mandatory', 'is_active')
 
 @admin.register(Programme)
-class ProgrammeAdmin(admin.ModelAdmin):
+class ProgrammeAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'code', 'programme_type', 'study_mode', 'department', 
                    'duration_years','semesters_per_year' , 'total_semesters', 'student_count', 'is_active')
     list_filter = ('programme_type', 'study_mode', 'department__faculty', 'department', 'is_active')
     search_fields = ('name', 'code', 'description')
     inlines = [ProgrammeCourseInline]
+    list_annotations = {'active_student_total': related_count(Student, 'programme', status='active')}
     
+    @admin.display(description='Active Students', ordering='active_student_total')
     def student_count(self, obj):
-        return obj.students.filter(status='active').count()
-    student_count.short_description = 'Active Students'
+        return obj.active_student_total
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'code', 'course_type', 'level', 'credit_hours', 
                    'department', 'total_contact_hours', 'enrollment_count', 'is_active')
     list_filter = ('course_type', 'level', 'department__faculty', 'department', 'is_active')
     search_fields = ('name', 'code', 'description')
     filter_horizontal = ('prerequisites',)
+    list_annotations = {'active_enrollment_total': related_count(Enrollment, 'course', is_active=True)}
     
+    @admin.display(description='Current Enrollments', ordering='active_enrollment_total')
     def enrollment_count(self, obj):
-        return obj.enrollments.filter(is_active=True).count()
-    enrollment_count.short_description = 'Current Enrollments'
+        return obj.active_enrollment_total
 
 @admin.register(ProgrammeCourse)
-class ProgrammeCourseAdmin(admin.ModelAdmin):
+class ProgrammeCourseAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('programme', 'course', 'year', 'semester', 'is_mandatory', 'is_active')
     list_filter = ('programme__programme_type', 'year', 'semester', 'is_mandatory', 'is_active')
     search_fields = ('programme__name', 'course__name', 'programme__code', 'course__code')
 
 # People Admin
 @admin.register(Lecturer)
-class LecturerAdmin(admin.ModelAdmin):
+class LecturerAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('get_full_name', 'employee_number', 'department', 'academic_rank', 
                    'employment_type', 'teaching_experience_years', 'is_active')
     list_filter = ('academic_rank', 'employment_type', 'department__faculty', 'department', 'is_active')
@@ -130,12 +137,12 @@ class LecturerAdmin(admin.ModelAdmin):
         }),
     )
     
+    @related_column('user', description='Full Name')
     def get_full_name(self, obj):
         return obj.user.get_full_name() or obj.user.username
-    get_full_name.short_description = 'Full Name'
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('get_full_name', 'student_id', 'programme', 'current_year', 
                    'current_semester', 'status', 'cumulative_gpa', 'sponsor_type')
     list_filter = ('status', 'programme__programme_type', 'programme', 'current_year', 
@@ -163,21 +170,21 @@ class StudentAdmin(admin.ModelAdmin):
         }),
     )
     
+    @related_column('user', description='Full Name')
     def get_full_name(self, obj):
         return obj.user.get_full_name() or obj.user.username
-    get_full_name.short_description = 'Full Name'
 
 @admin.register(Staff)
-class StaffAdmin(admin.ModelAdmin):
+class StaffAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('get_full_name', 'employee_number', 'staff_category', 'designation', 
                    'department', 'joining_date', 'is_active')
     list_filter = ('staff_category', 'department', 'is_active')
     search_fields = ('user__first_name', 'user__last_name', 'user__username', 'employee_number')
     readonly_fields = ('user',)
     
+    @related_column('user', description='Full Name')
     def get_full_name(self, obj):
         return obj.user.get_full_name() or obj.user.username
-    get_full_name.short_description = 'Full Name'
 
 # Academic Records Admin
 class SemesterInline(admin.TabularInline):
@@ -186,37 +193,46 @@ class SemesterInline(admin.TabularInline):
     fields = ('semester_number', 'start_date', 'end_date', 'is_current')
 
 @admin.register(AcademicYear)
-class AcademicYearAdmin(admin.ModelAdmin):
+class AcademicYearAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('year', 'start_date', 'end_date', 'is_current', 'semester_count')
     list_filter = ('is_current',)
     inlines = [SemesterInline]
+    list_annotations = {'semester_total': related_count(Semester, 'academic_year')}
     
+    @admin.display(description='Semesters', ordering='semester_total')
     def semester_count(self, obj):
-        return obj.semesters.count()
-    semester_count.short_description = 'Semesters'
+        return obj.semester_total
 
 @admin.register(Semester)
-class SemesterAdmin(admin.ModelAdmin):
+class SemesterAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('academic_year', 'semester_number', 'start_date', 'end_date', 
                    'registration_start_date', 'registration_end_date', 'is_current')
     list_filter = ('academic_year', 'semester_number', 'is_current')
 
 @admin.register(StudentReporting)
-class StudentReportingAdmin(admin.ModelAdmin):
+class StudentReportingAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('student', 'semester', 'reporting_type', 'reporting_date', 'status', 'processed_by')
+    list_related = ('student__user', 'semester__academic_year')
     list_filter = ('reporting_type', 'status', 'semester__academic_year', 'semester')
     search_fields = ('student__student_id', 'student__user__first_name', 'student__user__last_name')
     readonly_fields = ('reporting_date',)
 
 @admin.register(Enrollment)
-class EnrollmentAdmin(admin.ModelAdmin):
+class EnrollmentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('student', 'course', 'semester', 'lecturer', 'is_active', 'is_repeat', 'enrollment_date')
+    list_related = ('student__user', 'semester__academic_year', 'lecturer__user')
     list_filter = ('semester__academic_year', 'semester', 'course__department', 'is_active', 'is_repeat', 'is_audit')
     search_fields = ('student__student_id', 'course__code', 'course__name')
     readonly_fields = ('enrollment_date',)
 
+    def save_model(self, request, obj, form, change):
+        if change and 'is_active' in form.changed_data:
+            # Seat counters follow drops and reactivations (see signals.py)
+            obj._was_active = form.initial.get('is_active')
+        super().save_model(request, obj, form, change)
+
 @admin.register(Grade)
-class GradeAdmin(admin.ModelAdmin):
+class GradeAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('get_student', 'get_course', 'get_semester', 'continuous_assessment', 
                    'final_exam', 'total_marks', 'grade', 'grade_points', 'is_passed')
     list_filter = ('grade', 'is_passed', 'enrollment__semester__academic_year', 
@@ -224,23 +240,24 @@ class GradeAdmin(admin.ModelAdmin):
     search_fields = ('enrollment__student__student_id', 'enrollment__course__code')
     readonly_fields = ('total_marks', 'grade', 'grade_points', 'quality_points', 'is_passed')
     
+    @related_column('enrollment__student', description='Student ID', ordering='enrollment__student__student_id')
     def get_student(self, obj):
         return obj.enrollment.student.student_id
-    get_student.short_description = 'Student ID'
     
+    @related_column('enrollment__course', description='Course', ordering='enrollment__course__code')
     def get_course(self, obj):
         return obj.enrollment.course.code
-    get_course.short_description = 'Course'
     
+    @related_column('enrollment__semester__academic_year', description='Semester')
     def get_semester(self, obj):
         return str(obj.enrollment.semester)
-    get_semester.short_description = 'Semester'
 
 # Fee Management Admin
 @admin.register(FeeStructure)
-class FeeStructureAdmin(admin.ModelAdmin):
+class FeeStructureAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('programme', 'academic_year', 'year', 'semester', 'tuition_fee', 
                    'total_fee', 'net_fee', 'payment_count')
+    list_annotations = {'payment_total': related_count(FeePayment, 'fee_structure')}
     list_filter = ('academic_year', 'programme__programme_type', 'programme', 'year', 'semester')
     search_fields = ('programme__name', 'programme__code')
     
@@ -259,14 +276,15 @@ class FeeStructureAdmin(admin.ModelAdmin):
         }),
     )
     
+    @admin.display(description='Payments Made', ordering='payment_total')
     def payment_count(self, obj):
-        return obj.payments.count()
-    payment_count.short_description = 'Payments Made'
+        return obj.payment_total
 
 @admin.register(FeePayment)
-class FeePaymentAdmin(admin.ModelAdmin):
+class FeePaymentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('student', 'receipt_number', 'amount_paid', 'payment_date', 
                    'payment_method', 'payment_status', 'processed_by')
+    list_related = ('student__user',)
     list_filter = ('payment_method', 'payment_status', 'payment_date', 
                    'fee_structure__academic_year')
     search_fields = ('student__student_id', 'receipt_number', 'transaction_reference', 'mpesa_receipt')
@@ -394,9 +412,10 @@ class HostelPaymentInline(admin.TabularInline):
     readonly_fields = ('receipt_number',)
 
 @admin.register(HostelBooking)
-class HostelBookingAdmin(admin.ModelAdmin):
+class HostelBookingAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('student', 'bed', 'academic_year', 'booking_status', 'payment_status', 
                    'booking_fee', 'amount_paid', 'balance_due', 'booking_date')
+    list_related = ('student__user', 'bed__room__hostel', 'bed__academic_year')
     list_filter = ('booking_status', 'payment_status', 'academic_year', 
                    'bed__room__hostel__hostel_type', 'bed__room__hostel')
     search_fields = ('student__student_id', 'student__user__first_name', 
@@ -426,19 +445,20 @@ class HostelBookingAdmin(admin.ModelAdmin):
     )
 
 @admin.register(HostelPayment)
-class HostelPaymentAdmin(admin.ModelAdmin):
+class HostelPaymentAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('get_student', 'booking', 'amount', 'payment_date', 
                    'payment_method', 'receipt_number', 'received_by')
     list_filter = ('payment_method', 'payment_date', 'booking__academic_year')
     search_fields = ('booking__student__student_id', 'receipt_number', 'reference_number')
     readonly_fields = ('receipt_number',)
+    list_related = ('booking__bed__room__hostel', 'booking__bed__academic_year', 'booking__academic_year')
     
+    @related_column('booking__student', description='Student ID')
     def get_student(self, obj):
         return obj.booking.student.student_id
-    get_student.short_description = 'Student ID'
 
 @admin.register(HostelIncident)
-class HostelIncidentAdmin(admin.ModelAdmin):
+class HostelIncidentAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('get_student', 'incident_type', 'severity', 'status', 'incident_date', 
                    'fine_amount', 'fine_paid', 'reported_by')
     list_filter = ('incident_type', 'severity', 'status', 'fine_paid', 'incident_date')
@@ -456,9 +476,9 @@ class HostelIncidentAdmin(admin.ModelAdmin):
         }),
     )
     
+    @related_column('booking__student', description='Student ID')
     def get_student(self, obj):
         return obj.booking.student.student_id
-    get_student.short_description = 'Student ID'
 
 # Examination Admin
 @admin.register(Examination)
@@ -516,8 +536,9 @@ from django.utils.html import format_html
 
 
 @admin.register(Attendance)
-class AttendanceAdmin(admin.ModelAdmin):
+class AttendanceAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('student', 'get_course', 'get_session_date', 'status', 'marked_via_qr', 'marked_at')
+    list_related = ('student__user',)
     list_filter = (
         'status',
         'marked_via_qr',
@@ -533,13 +554,13 @@ class AttendanceAdmin(admin.ModelAdmin):
     )
     readonly_fields = ('marked_at',)
 
+    @related_column('timetable_slot__course', description='Course')
     def get_course(self, obj):
         return obj.timetable_slot.course.code
-    get_course.short_description = 'Course'
 
+    @related_column('attendance_session', description='Session Date')
     def get_session_date(self, obj):
         return obj.attendance_session.session_date
-    get_session_date.short_description = 'Session Date'
 
 
 @admin.register(AttendanceSession)
@@ -569,13 +590,14 @@ class AttendanceSessionAdmin(admin.ModelAdmin):
 
 # Notification Admin
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'notification_type', 'priority', 'sender', 'recipient_count', 
                    'is_read', 'send_email', 'send_sms', 'created_at')
     list_filter = ('notification_type', 'priority', 'is_read', 'send_email', 'send_sms', 'created_at')
     search_fields = ('title', 'message', 'sender__username')
     filter_horizontal = ('recipients',)
     readonly_fields = ('created_at',)
+    list_annotations = {'recipient_total': related_count(Notification.recipients.through, 'notification')}
     
     fieldsets = (
         ('Message Content', {
@@ -592,9 +614,9 @@ class NotificationAdmin(admin.ModelAdmin):
         }),
     )
     
+    @admin.display(description='Recipients', ordering='recipient_total')
     def recipient_count(self, obj):
-        return obj.recipients.count()
-    recipient_count.short_description = 'Recipients'
+        return obj.recipient_total
 
 # Custom admin actions
 def mark_as_read(modeladmin, request, queryset):
@@ -845,6 +867,7 @@ from django.urls import reverse
 from django.utils.safestring import mark_safe
 import json
 from .models import UserSession, ActivityLog, PageVisit, SystemMetrics
+from .admin_performance import LargeTableAdminMixin
 
 
 @admin.register(UserSession)
@@ -948,7 +971,7 @@ class UserSessionAdmin(admin.ModelAdmin):
 
 
 @admin.register(ActivityLog)
-class ActivityLogAdmin(admin.ModelAdmin):
+class ActivityLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = [
         'user', 'action_display', 'content_object_display', 'timestamp',
         'ip_address', 'description_short'
@@ -1061,7 +1084,7 @@ class ActivityLogAdmin(admin.ModelAdmin):
 
 
 @admin.register(PageVisit)
-class PageVisitAdmin(admin.ModelAdmin):
+class PageVisitAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = [
         'user_display', 'url_display', 'view_name', 'timestamp',
         'response_time_display', 'ip_address'
@@ -1283,3 +1306,207 @@ admin.site.site_header = "Dynamic 365 ERP"
 admin.site.site_title = "365 Admin Portal"
 admin.site.index_title = "Welcome to University ERP System Administration"
 
+
+
+from .models_registration import CourseCapacity, CourseWaitlistEntry
+
+@admin.register(CourseCapacity)
+class CourseCapacityAdmin(admin.ModelAdmin):
+    list_display = ['course', 'semester', 'capacity', 'enrolled_count', 'seats_available', 'waitlist_enabled']
+    list_filter = ['semester', 'waitlist_enabled']
+    search_fields = ['course__code', 'course__name']
+    list_select_related = ['course', 'semester__academic_year']
+    readonly_fields = ['enrolled_count', 'updated_at']
+    actions = ['resync_counters']
+
+    def resync_counters(self, request, queryset):
+        from .registration_control import sync_capacity_counters
+        semesters = {capacity.semester for capacity in queryset.select_related('semester')}
+        for semester in semesters:
+            sync_capacity_counters(semester)
+        self.message_user(request, f"Recounted enrollments for {len(semesters)} semester(s).")
+    resync_counters.short_description = 'Recount enrolled seats from enrollments'
+
+@admin.register(CourseWaitlistEntry)
+class CourseWaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ['student', 'course', 'semester', 'status', 'created_at', 'promoted_at']
+    list_filter = ['status', 'semester']
+    search_fields = ['student__student_id', 'course__code']
+    list_select_related = ['student__user', 'course', 'semester__academic_year']
+    ordering = ['created_at']
+
+
+from .models_monitoring import RequestProfileSample
+
+@admin.register(RequestProfileSample)
+class RequestProfileSampleAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'method', 'path', 'view_name', 'status_code', 'query_count', 'duplicate_count', 'db_ms', 'total_ms']
+    list_filter = ['method', 'status_code', 'created_at']
+    search_fields = ['path', 'view_name']
+    list_select_related = ['user']
+    readonly_fields = [field.name for field in RequestProfileSample._meta.fields]
+    date_hierarchy = 'created_at'
+
+
+from .models_analytics import FactPartition
+
+@admin.register(FactPartition)
+class FactPartitionAdmin(admin.ModelAdmin):
+    list_display = ['fact', 'partition_id', 'row_count', 'refreshed_at']
+    list_filter = ['fact']
+    readonly_fields = ['fact', 'partition_id', 'fingerprint', 'row_count', 'refreshed_at']
+    actions = ['rebuild_facts']
+
+    def rebuild_facts(self, request, queryset):
+        from .analytics_facts import refresh_facts
+        facts = sorted(set(queryset.values_list('fact', flat=True)))
+        if refresh_facts(full=True, facts=facts) is None:
+            self.message_user(request, "A fact refresh is already running; try again later.", level='warning')
+            return
+        self.message_user(request, f"Rebuilt {', '.join(facts)} facts.")
+    rebuild_facts.short_description = 'Rebuild selected fact tables'
+
+
+from .models_webhooks import WebhookInboxItem
+
+@admin.register(WebhookInboxItem)
+class WebhookInboxItemAdmin(admin.ModelAdmin):
+    list_display = ['received_at', 'provider', 'event_key', 'status', 'attempts', 'fee_payment', 'processed_at']
+    list_filter = ['provider', 'status', 'received_at']
+    search_fields = ['event_key', 'last_error']
+    list_select_related = ['fee_payment']
+    readonly_fields = [field.name for field in WebhookInboxItem._meta.fields]
+    date_hierarchy = 'received_at'
+    actions = ['replay_items']
+
+    def replay_items(self, request, queryset):
+        from .webhook_inbox import replay
+        queued = replay(queryset)
+        self.message_user(request, f"Queued {queued} webhook(s) for another attempt.")
+    replay_items.short_description = 'Replay selected webhooks'
+
+
+from .models_receipts import ReceiptSequence
+
+@admin.register(ReceiptSequence)
+class ReceiptSequenceAdmin(admin.ModelAdmin):
+    list_display = ['prefix', 'year', 'last_value', 'updated_at']
+    list_filter = ['year']
+    readonly_fields = ['prefix', 'year', 'updated_at']
+
+
+from .models_reconciliation import BankStatement, StatementException
+
+@admin.register(BankStatement)
+class BankStatementAdmin(admin.ModelAdmin):
+    list_display = ['uploaded_at', 'source', 'file_name', 'status', 'line_count', 'matched_count',
+                    'exception_count', 'matched_amount', 'uploaded_by']
+    list_filter = ['source', 'status', 'uploaded_at']
+    search_fields = ['file_name', 'checksum']
+    list_select_related = ['uploaded_by']
+    readonly_fields = [field.name for field in BankStatement._meta.fields]
+    date_hierarchy = 'uploaded_at'
+
+
+@admin.register(StatementException)
+class StatementExceptionAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
+    list_display = ['statement', 'line_number', 'reference', 'amount', 'value_date', 'reason',
+                    'detail', 'fee_payment', 'status']
+    list_filter = ['status', 'reason', 'statement__source']
+    search_fields = ['reference', 'narrative', 'detail']
+    raw_id_fields = ['fee_payment']
+    readonly_fields = ['statement', 'line_number', 'reference', 'amount', 'value_date', 'narrative',
+                       'reason', 'detail', 'resolved_by', 'resolved_at']
+    actions = ['mark_resolved', 'mark_ignored']
+
+    def mark_resolved(self, request, queryset):
+        from .reconciliation import resolve_exceptions
+        updated = resolve_exceptions(queryset, request.user)
+        self.message_user(request, f"Resolved {updated} statement exception(s).")
+    mark_resolved.short_description = 'Mark selected exceptions as resolved'
+
+    def mark_ignored(self, request, queryset):
+        from .reconciliation import resolve_exceptions
+        updated = resolve_exceptions(queryset, request.user, status='ignored')
+        self.message_user(request, f"Ignored {updated} statement exception(s).")
+    mark_ignored.short_description = 'Ignore selected exceptions'
+
+
+from .models_outbox import OutboundMessage
+
+@admin.register(OutboundMessage)
+class OutboundMessageAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['created_at', 'channel', 'category', 'recipients', 'subject', 'status', 'attempts',
+                     'next_attempt_at', 'sent_at']
+    list_filter = ['channel', 'status', 'category']
+    search_fields = ['subject', 'last_error']
+    readonly_fields = [field.name for field in OutboundMessage._meta.fields]
+    date_hierarchy = 'created_at'
+    actions = ['retry_messages']
+
+    @admin.display(description='To')
+    def recipients(self, obj):
+        return ', '.join(obj.to)
+
+    def retry_messages(self, request, queryset):
+        from .outbox import retry_failed
+        queued = retry_failed(queryset)
+        self.message_user(request, f"Queued {queued} failed message(s) for another attempt.")
+    retry_messages.short_description = 'Retry selected failed messages'
+
+
+from django import forms
+from .models_broadcast import BroadcastNotification
+
+
+class BroadcastNotificationForm(forms.ModelForm):
+    class Meta:
+        model = BroadcastNotification
+        fields = '__all__'
+
+    def clean(self):
+        from .broadcasts import check_audience
+        cleaned_data = super().clean()
+        try:
+            check_audience(cleaned_data.get('audience'), cleaned_data.get('programme'),
+                           cleaned_data.get('year'), cleaned_data.get('hostel'))
+        except ValueError as e:
+            raise forms.ValidationError(str(e))
+        return cleaned_data
+
+
+@admin.register(BroadcastNotification)
+class BroadcastNotificationAdmin(admin.ModelAdmin):
+    form = BroadcastNotificationForm
+    list_display = ['title', 'audience', 'programme', 'year', 'hostel', 'notification_type', 'sender',
+                    'created_at', 'expires_at']
+    list_filter = ['audience', 'notification_type']
+    search_fields = ['title', 'message']
+    raw_id_fields = ['sender']
+    readonly_fields = ['sender', 'created_at']
+    date_hierarchy = 'created_at'
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            super().save_model(request, obj, form, change)
+            return
+
+        # New notices go through publish() like the management page's, which
+        # drops scope the audience does not use and queues the copies
+        from .broadcasts import publish
+        broadcast = publish(
+            sender=request.user,
+            title=obj.title,
+            message=obj.message,
+            audience=obj.audience,
+            programme=obj.programme,
+            year=obj.year,
+            hostel=obj.hostel,
+            notification_type=obj.notification_type,
+            related_url=obj.related_url,
+            expires_at=obj.expires_at,
+            send_email=obj.send_email,
+            send_sms=obj.send_sms,
+        )
+        # The admin logs and redirects to the object it passed in
+        vars(obj).update(vars(broadcast))
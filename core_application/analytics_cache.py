@@ -0,0 +1,151 @@
+# analytics_cache.py - Result cache, entity-version ETags and single-flight
+# refresh for the JSON analytics endpoints behind analytics_dashboard.
+#
+# Every endpoint declares the entities it reads. Saving or deleting a model
+# of that entity bumps its version (see signals.py), which changes the ETag
+# and the cache key, so stale results are never served past a write in the
+# same cache. Versions live in the Django cache; configure a shared backend
+# (Redis/Memcached) in production so all workers agree on them (required by
+# ``manage.py check --deploy``, see checks.py). With a per-process cache a
+# write is only seen by the worker that made it, and other workers serve
+# their cached results until the endpoint's TTL runs out.
+
+from functools import wraps
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'analytics:version:{}'
+RESULT_KEY = 'analytics:result:{}:{}'
+LOCK_KEY = 'analytics:lock:{}:{}'
+
+DEFAULT_TTL = 300
+
+# Backends whose data only the current process sees
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared_cache(alias='default'):
+    """Do all workers see the same ``alias`` cache (not LocMem or Dummy)"""
+    return settings.CACHES.get(alias, {}).get('BACKEND') not in PROCESS_LOCAL_BACKENDS
+
+
+# =============================================================================
+# Entity versions
+# =============================================================================
+
+def get_entity_versions(entities):
+    """Return {entity: version}; unknown entities start at version 1"""
+    keys = {VERSION_KEY.format(entity): entity for entity in entities}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, entity in keys.items():
+        if key not in found:
+            cache.add(key, 1, timeout=None)
+        versions[entity] = found.get(key, 1)
+    return versions
+
+
+def bump_entity_version(*entities):
+    """Invalidate cached analytics that read any of ``entities``"""
+    for entity in entities:
+        key = VERSION_KEY.format(entity)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read yet (or evicted): any new value differs from the default
+            cache.set(key, int(time.time()), timeout=None)
+
+
+# =============================================================================
+# Cached endpoint decorator
+# =============================================================================
+
+def _endpoint_ttl(endpoint):
+    ttls = getattr(settings, 'ANALYTICS_CACHE_TTLS', {})
+    return ttls.get(endpoint, ttls.get('default', DEFAULT_TTL))
+
+
+def _compute_etag(endpoint, request, entities, ttl):
+    versions = get_entity_versions(entities)
+    parts = [endpoint, request.GET.urlencode()]
+    parts += [f"{entity}={versions[entity]}" for entity in sorted(versions)]
+    # Results that depend on "now" (last 30 days, current month) roll over
+    # with the TTL window even when nothing was written
+    parts.append(str(int(time.time() // ttl)))
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+def _json_response(content, etag):
+    response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = f'"{etag}"'
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def cached_analytics(endpoint, entities):
+    """
+    Serve a JSON analytics view from the result cache.
+
+    - A request whose If-None-Match matches the current ETag gets a 304
+      without running any of the view's queries.
+    - On a miss only one caller computes the result; concurrent callers wait
+      up to ANALYTICS_SINGLE_FLIGHT_WAIT seconds for it instead of running
+      the same aggregates in parallel.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if not getattr(settings, 'ANALYTICS_CACHE_ENABLED', True):
+                return view_func(request, *args, **kwargs)
+
+            ttl = _endpoint_ttl(endpoint)
+            etag = _compute_etag(endpoint, request, entities, ttl)
+
+            if f'"{etag}"' in parse_etags(request.headers.get('If-None-Match', '')):
+                response = HttpResponseNotModified()
+                response['ETag'] = f'"{etag}"'
+                return response
+
+            result_key = RESULT_KEY.format(endpoint, etag)
+            content = cache.get(result_key)
+            if content is not None:
+                return _json_response(content, etag)
+
+            lock_key = LOCK_KEY.format(endpoint, etag)
+            wait = getattr(settings, 'ANALYTICS_SINGLE_FLIGHT_WAIT', 10)
+
+            owns_lock = cache.add(lock_key, True, timeout=max(int(wait) * 3, 30))
+            if not owns_lock:
+                # Another request is computing this result; wait for it
+                deadline = time.monotonic() + wait
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    content = cache.get(result_key)
+                    if content is not None:
+                        return _json_response(content, etag)
+                logger.warning(f"Analytics '{endpoint}' single-flight wait timed out, computing directly")
+
+            try:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                cache.set(result_key, response.content, timeout=ttl)
+            finally:
+                if owns_lock:
+                    cache.delete(lock_key)
+
+            return _json_response(response.content, etag)
+        return _wrapped_view
+    return decorator
@@ -0,0 +1,466 @@
+# analytics_facts.py - Build and incrementally refresh the academic fact tables
+#
+# Each fact table is split into partitions (semester for enrollments and
+# grades, academic year for fee payments, a single partition for students).
+# A refresh computes one cheap fingerprint per partition straight from the
+# source tables and only rebuilds partitions whose fingerprint changed, with
+# one GROUP BY query and a bulk insert each. Fingerprints also cover the
+# student attributes copied into the facts (programme, year of study,
+# gender), so promotions and transfers are picked up by incremental refreshes.
+#
+# Reports call ensure_facts() before reading: the first report after a deploy
+# builds the facts in the request, and once the last refresh is older than
+# ANALYTICS_FACTS_MAX_AGE a background thread refreshes them while the
+# report reads the current rows. The refresh_analytics_facts command or
+# Celery task can run on a schedule instead. Only one refresh runs at a time
+# across all workers: it claims the FactRefreshState row under
+# select_for_update() before starting.
+
+from datetime import timedelta
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Enrollment, FeePayment, Grade, Student
+from .models_analytics import (
+    EnrollmentFact, FactPartition, FactRefreshState, FeePaymentFact, GradeFact, StudentFact
+)
+
+logger = logging.getLogger(__name__)
+
+REFRESH_LEASE = timedelta(minutes=30)
+FACT_INSERT_BATCH_SIZE = 1000
+
+
+def _fingerprint(row, fields):
+    return ':'.join(str(row[field] or 0) for field in fields)
+
+
+def _student_dimensions(student=''):
+    """
+    Fingerprint aggregates over the student attributes that facts are
+    grouped by, for rows reaching the student through ``student`` (e.g.
+    'student__'). Weighting by the student id means two students swapping
+    programmes or years still change the sums.
+    """
+    student_id = F(f'{student}id')
+    return {
+        'programmes': Sum(F(f'{student}programme_id') * student_id),
+        'years': Sum(F(f'{student}current_year') * student_id),
+        'female': Count('id', filter=Q(**{f'{student}user__gender': 'female'})),
+        'male': Count('id', filter=Q(**{f'{student}user__gender': 'male'})),
+    }
+
+
+DIMENSION_FIELDS = ['programmes', 'years', 'female', 'male']
+
+
+# =============================================================================
+# Enrollment facts (partitioned by semester)
+# =============================================================================
+
+def enrollment_fingerprints():
+    rows = (
+        Enrollment.objects.order_by()
+        .values('semester_id')
+        .annotate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+            repeat=Count('id', filter=Q(is_repeat=True)),
+            audit=Count('id', filter=Q(is_audit=True)),
+            id_sum=Sum('id'),
+            **_student_dimensions('student__'),
+        )
+    )
+    return {
+        row['semester_id']: _fingerprint(row, ['total', 'active', 'repeat', 'audit', 'id_sum'] + DIMENSION_FIELDS)
+        for row in rows
+    }
+
+
+def build_enrollment_partition(semester_id):
+    rows = (
+        Enrollment.objects.filter(semester_id=semester_id).order_by()
+        .annotate(month=TruncMonth('enrollment_date'))
+        .values(
+            'month', 'is_active', 'course_id',
+            academic_year_id=F('semester__academic_year_id'),
+            faculty_id=F('student__programme__faculty_id'),
+            department_id=F('course__department_id'),
+            programme_id=F('student__programme_id'),
+            year_of_study=F('student__current_year'),
+            gender=F('student__user__gender'),
+        )
+        .annotate(
+            enrollment_count=Count('id'),
+            repeat_count=Count('id', filter=Q(is_repeat=True)),
+            audit_count=Count('id', filter=Q(is_audit=True)),
+        )
+    )
+    return [
+        EnrollmentFact(
+            semester_id=semester_id,
+            academic_year_id=row['academic_year_id'],
+            faculty_id=row['faculty_id'],
+            department_id=row['department_id'],
+            programme_id=row['programme_id'],
+            course_id=row['course_id'],
+            year_of_study=row['year_of_study'],
+            gender=row['gender'] or '',
+            enrollment_month=row['month'],
+            is_active=row['is_active'],
+            enrollment_count=row['enrollment_count'],
+            repeat_count=row['repeat_count'],
+            audit_count=row['audit_count'],
+        )
+        for row in rows
+    ]
+
+
+# =============================================================================
+# Grade facts (partitioned by semester)
+# =============================================================================
+
+def grade_fingerprints():
+    rows = (
+        Grade.objects.order_by()
+        .values(semester_id=F('enrollment__semester_id'))
+        .annotate(
+            total=Count('id'),
+            passed=Count('id', filter=Q(is_passed=True)),
+            points=Sum('grade_points'),
+            marks=Sum('total_marks'),
+            quality=Sum('quality_points'),
+            id_sum=Sum('id'),
+            **_student_dimensions('enrollment__student__'),
+        )
+    )
+    return {
+        row['semester_id']: _fingerprint(
+            row, ['total', 'passed', 'points', 'marks', 'quality', 'id_sum'] + DIMENSION_FIELDS
+        )
+        for row in rows
+    }
+
+
+def build_grade_partition(semester_id):
+    rows = (
+        Grade.objects.filter(enrollment__semester_id=semester_id).order_by()
+        .values(
+            'grade', 'grade_points',
+            academic_year_id=F('enrollment__semester__academic_year_id'),
+            faculty_id=F('enrollment__student__programme__faculty_id'),
+            department_id=F('enrollment__course__department_id'),
+            programme_id=F('enrollment__student__programme_id'),
+            course_id=F('enrollment__course_id'),
+            year_of_study=F('enrollment__student__current_year'),
+            gender=F('enrollment__student__user__gender'),
+        )
+        .annotate(
+            graded_count=Count('id'),
+            passed_count=Count('id', filter=Q(is_passed=True)),
+            grade_points_sum=Sum('grade_points'),
+            grade_points_count=Count('grade_points'),
+            total_marks_sum=Sum('total_marks'),
+            total_marks_count=Count('total_marks'),
+            quality_points_sum=Sum('quality_points', filter=Q(quality_points__gt=0)),
+            credit_hours_sum=Sum('enrollment__course__credit_hours', filter=Q(quality_points__gt=0)),
+        )
+    )
+    return [
+        GradeFact(
+            semester_id=semester_id,
+            academic_year_id=row['academic_year_id'],
+            faculty_id=row['faculty_id'],
+            department_id=row['department_id'],
+            programme_id=row['programme_id'],
+            course_id=row['course_id'],
+            year_of_study=row['year_of_study'],
+            gender=row['gender'] or '',
+            grade=row['grade'] or '',
+            grade_points=row['grade_points'],
+            graded_count=row['graded_count'],
+            passed_count=row['passed_count'],
+            grade_points_sum=row['grade_points_sum'] or 0,
+            grade_points_count=row['grade_points_count'],
+            total_marks_sum=row['total_marks_sum'] or 0,
+            total_marks_count=row['total_marks_count'],
+            quality_points_sum=row['quality_points_sum'] or 0,
+            credit_hours_sum=row['credit_hours_sum'] or 0,
+        )
+        for row in rows
+    ]
+
+
+# =============================================================================
+# Fee payment facts (partitioned by academic year)
+# =============================================================================
+
+def fee_payment_fingerprints():
+    rows = (
+        FeePayment.objects.order_by()
+        .values(academic_year_id=F('fee_structure__academic_year_id'))
+        .annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(payment_status='completed')),
+            amount=Sum('amount_paid'),
+            completed_amount=Sum('amount_paid', filter=Q(payment_status='completed')),
+            id_sum=Sum('id'),
+        )
+    )
+    return {
+        row['academic_year_id']: _fingerprint(row, ['total', 'completed', 'amount', 'completed_amount', 'id_sum'])
+        for row in rows
+    }
+
+
+def build_fee_payment_partition(academic_year_id):
+    rows = (
+        FeePayment.objects.filter(fee_structure__academic_year_id=academic_year_id).order_by()
+        .annotate(month=TruncMonth('payment_date'))
+        .values(
+            'month', 'payment_status', 'payment_method',
+            faculty_id=F('fee_structure__programme__faculty_id'),
+            department_id=F('fee_structure__programme__department_id'),
+            programme_id=F('fee_structure__programme_id'),
+            year_of_study=F('fee_structure__year'),
+        )
+        .annotate(
+            payment_count=Count('id'),
+            amount_paid_sum=Sum('amount_paid'),
+        )
+    )
+    return [
+        FeePaymentFact(
+            academic_year_id=academic_year_id,
+            faculty_id=row['faculty_id'],
+            department_id=row['department_id'],
+            programme_id=row['programme_id'],
+            year_of_study=row['year_of_study'],
+            payment_status=row['payment_status'],
+            payment_method=row['payment_method'],
+            payment_month=row['month'],
+            payment_count=row['payment_count'],
+            amount_paid_sum=row['amount_paid_sum'] or 0,
+        )
+        for row in rows
+    ]
+
+
+# =============================================================================
+# Student facts (single partition)
+# =============================================================================
+
+STUDENT_STATUSES = [status for status, _ in Student._meta.get_field('status').choices]
+
+
+def student_fingerprints():
+    row = Student.objects.aggregate(
+        total=Count('id'),
+        id_sum=Sum('id'),
+        **{status: Sum('id', filter=Q(status=status)) for status in STUDENT_STATUSES},
+        **_student_dimensions(),
+    )
+    if not row['total']:
+        return {}
+    return {0: _fingerprint(row, ['total', 'id_sum'] + STUDENT_STATUSES + DIMENSION_FIELDS)}
+
+
+def build_student_partition(partition_id=0):
+    rows = (
+        Student.objects.order_by()
+        .values(
+            'status',
+            faculty_id=F('programme__faculty_id'),
+            department_id=F('programme__department_id'),
+            programme_ref=F('programme_id'),
+            year_of_study=F('current_year'),
+            gender=F('user__gender'),
+        )
+        .annotate(student_count=Count('id'))
+    )
+    return [
+        StudentFact(
+            faculty_id=row['faculty_id'],
+            department_id=row['department_id'],
+            programme_id=row['programme_ref'],
+            year_of_study=row['year_of_study'],
+            status=row['status'],
+            gender=row['gender'] or '',
+            student_count=row['student_count'],
+        )
+        for row in rows
+    ]
+
+
+# =============================================================================
+# Refresh
+# =============================================================================
+
+# fact name -> (fact model, partition column, fingerprint function, builder)
+FACTS = {
+    'enrollment': (EnrollmentFact, 'semester_id', enrollment_fingerprints, build_enrollment_partition),
+    'grade': (GradeFact, 'semester_id', grade_fingerprints, build_grade_partition),
+    'fee_payment': (FeePaymentFact, 'academic_year_id', fee_payment_fingerprints, build_fee_payment_partition),
+    'student': (StudentFact, None, student_fingerprints, build_student_partition),
+}
+
+
+def _partition_rows(model, column, partition_id):
+    if column is None:
+        return model.objects.all()
+    return model.objects.filter(**{column: partition_id})
+
+
+def refresh_fact(fact, full=False):
+    """
+    Bring one fact table up to date. Returns (rebuilt, removed) partition counts.
+    """
+    model, column, fingerprints, builder = FACTS[fact]
+    current = fingerprints()
+    stored = dict(
+        FactPartition.objects.filter(fact=fact).values_list('partition_id', 'fingerprint')
+    )
+
+    rebuilt = 0
+    for partition_id, fingerprint in current.items():
+        if not full and stored.get(partition_id) == fingerprint:
+            continue
+
+        rows = builder(partition_id)
+        with transaction.atomic():
+            _partition_rows(model, column, partition_id).delete()
+            model.objects.bulk_create(rows, batch_size=FACT_INSERT_BATCH_SIZE)
+            FactPartition.objects.update_or_create(
+                fact=fact,
+                partition_id=partition_id,
+                defaults={'fingerprint': fingerprint, 'row_count': len(rows)},
+            )
+        rebuilt += 1
+
+    # Partitions whose source rows are all gone
+    removed_ids = [partition_id for partition_id in stored if partition_id not in current]
+    if removed_ids:
+        with transaction.atomic():
+            for partition_id in removed_ids:
+                _partition_rows(model, column, partition_id).delete()
+            FactPartition.objects.filter(fact=fact, partition_id__in=removed_ids).delete()
+
+    return rebuilt, len(removed_ids)
+
+
+def _claim_refresh():
+    """
+    Mark a refresh as running. Returns False when another worker holds an
+    unexpired claim.
+    """
+    now = timezone.now()
+    FactRefreshState.objects.get_or_create(pk=1)
+    with transaction.atomic():
+        state = FactRefreshState.objects.select_for_update().get(pk=1)
+        if state.running_since and now - state.running_since < REFRESH_LEASE:
+            return False
+        state.running_since = now
+        state.save(update_fields=['running_since'])
+    return True
+
+
+def refresh_facts(full=False, facts=None):
+    """
+    Refresh all (or the named) fact tables. ``full`` rebuilds every partition
+    regardless of fingerprints, e.g. after editing a course's department.
+    Returns None when another refresh is already running.
+    """
+    if not _claim_refresh():
+        logger.info("Analytics fact refresh already running, skipping")
+        return None
+
+    summary = {}
+    try:
+        for fact in facts or FACTS:
+            rebuilt, removed = refresh_fact(fact, full=full)
+            summary[fact] = {'rebuilt': rebuilt, 'removed': removed}
+        FactRefreshState.objects.filter(pk=1).update(last_refreshed_at=timezone.now())
+    finally:
+        FactRefreshState.objects.filter(pk=1).update(running_since=None)
+
+    logger.info(f"Analytics facts refreshed: {summary}")
+    return summary
+
+
+# =============================================================================
+# Freshness for reports
+# =============================================================================
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def _refresh_in_background():
+    try:
+        refresh_facts()
+    except Exception as e:
+        logger.error(f"Background analytics fact refresh failed: {str(e)}")
+    finally:
+        connection.close()
+
+
+def ensure_facts():
+    """
+    Called by the reports before reading facts. Builds the facts in the
+    request if they were never built; when the last refresh is older than
+    ANALYTICS_FACTS_MAX_AGE seconds, refreshes them on a background thread
+    (one per process) and returns at once.
+    """
+    global _refresher
+    state = FactRefreshState.objects.filter(pk=1).values('last_refreshed_at', 'running_since').first()
+    if state is None or state['last_refreshed_at'] is None:
+        if state is None or state['running_since'] is None:
+            refresh_facts()
+        return
+
+    max_age = timedelta(seconds=getattr(settings, 'ANALYTICS_FACTS_MAX_AGE', 60 * 15))
+    if state['running_since'] is not None or timezone.now() - state['last_refreshed_at'] <= max_age:
+        return
+    with _refresher_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(target=_refresh_in_background, name='analytics-facts-refresh', daemon=True)
+            _refresher.start()
+
+
+# =============================================================================
+# Report helpers
+# =============================================================================
+
+def grade_performance(facts, *fields, **aliases):
+    """
+    Group GradeFact rows by the given dimensions and derive total, passed,
+    avg_gpa, avg_marks and pass_rate for each group.
+    """
+    rows = (
+        facts.order_by()
+        .values(*fields, **aliases)
+        .annotate(
+            total=Sum('graded_count'),
+            passed=Sum('passed_count'),
+            points=Sum('grade_points_sum'),
+            points_count=Sum('grade_points_count'),
+            marks=Sum('total_marks_sum'),
+            marks_count=Sum('total_marks_count'),
+        )
+    )
+
+    results = []
+    for row in rows:
+        points, points_count = row.pop('points'), row.pop('points_count')
+        marks, marks_count = row.pop('marks'), row.pop('marks_count')
+        row['avg_gpa'] = round(float(points) / points_count, 2) if points_count else None
+        row['avg_marks'] = round(float(marks) / marks_count, 2) if marks_count else None
+        row['pass_rate'] = round(row['passed'] * 100.0 / row['total'], 2) if row['total'] else 0
+        results.append(row)
+    return results
@@ -6,4 +6,15 @@ class CoreApplicationConfig(AppConfig):
     name = 'core_application'
 
     def ready(self):
+        # Feature model modules that live outside models.py
+        import core_application.models_registration
+        import core_application.models_monitoring
+        import core_application.models_analytics
+        import core_application.models_search
+        import core_application.models_webhooks
+        import core_application.models_receipts
+        import core_application.models_reconciliation
+        import core_application.models_outbox
+        import core_application.models_broadcast
         import core_application.signals  
+        import core_application.checks
@@ -0,0 +1,251 @@
+# broadcasts.py - Publishing and reading audience-targeted notices
+#
+# publish() stores a notice once for its whole audience (fan-out on read):
+# a user's inbox is the broadcasts whose audience matches the user, found
+# with one indexed query on (audience, created_at). Read state is sparse:
+#
+#   - BroadcastReadState.read_through: notices up to this time are read.
+#     "Mark all as read" moves it forward with one upsert. Users without a
+#     row use their date_joined, so new students do not inherit years of
+#     unread notices.
+#   - BroadcastReceipt: a notice opened individually after the watermark.
+#
+# unread_count() is cached per user under the 'broadcasts' version, which
+# publishing bumps, so a new notice invalidates every counter at once
+# without touching per-user keys. Reading something drops that user's key.
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, Case, Exists, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from .analytics_cache import bump_entity_version, get_entity_versions
+from .models import HostelBooking, Student, StudentNotification, User
+from .models_broadcast import BroadcastNotification, BroadcastReadState, BroadcastReceipt
+
+logger = logging.getLogger(__name__)
+
+UNREAD_KEY = 'broadcast:unread:{}:{}'
+AUDIENCE_KEY = 'broadcast:audience:{}'
+
+ACTIVE_BOOKING_STATUSES = ('approved', 'checked_in')
+LECTURER_TYPES = ('lecturer', 'professor')
+
+
+# =============================================================================
+# Audiences
+# =============================================================================
+
+def user_audience(user):
+    """
+    What the audience filters need to know about ``user``: role, and for
+    students their programme, year and hostel. Cached for
+    BROADCAST_AUDIENCE_CACHE_TTL; changes to the student or their booking
+    drop the entry (see signals.py).
+    """
+    key = AUDIENCE_KEY.format(user.pk)
+    audience = cache.get(key)
+    if audience is not None:
+        return audience
+
+    audience = {'role': 'staff', 'programme': None, 'year': None, 'hostel': None}
+    if user.user_type in LECTURER_TYPES:
+        audience['role'] = 'lecturer'
+    student = Student.objects.filter(user=user).values('id', 'programme_id', 'current_year').first()
+    if student:
+        audience.update(role='student', programme=student['programme_id'], year=student['current_year'])
+        audience['hostel'] = HostelBooking.objects.filter(
+            student_id=student['id'],
+            booking_status__in=ACTIVE_BOOKING_STATUSES,
+            academic_year__is_current=True,
+        ).values_list('bed__room__hostel_id', flat=True).first()
+
+    cache.set(key, audience, getattr(settings, 'BROADCAST_AUDIENCE_CACHE_TTL', 600))
+    return audience
+
+
+def audience_filter(user):
+    """Q matching the broadcasts addressed to ``user``"""
+    audience = user_audience(user)
+    matches = Q(audience='all_users')
+    if audience['role'] == 'student':
+        matches |= Q(audience='all_students')
+        if audience['programme']:
+            matches |= Q(audience='programme', programme_id=audience['programme']) & (
+                Q(year__isnull=True) | Q(year=audience['year'])
+            )
+        if audience['year']:
+            matches |= Q(audience='year', year=audience['year'])
+        if audience['hostel']:
+            matches |= Q(audience='hostel', hostel_id=audience['hostel'])
+    elif audience['role'] == 'lecturer':
+        matches |= Q(audience='all_lecturers')
+    else:
+        matches |= Q(audience='all_staff')
+    return matches
+
+
+def audience_users(broadcast):
+    """The active users a broadcast reaches, for email/SMS copies"""
+    users = User.objects.filter(is_active=True)
+    active_student = Q(student_profile__status='active')
+    if broadcast.audience == 'all_students':
+        return users.filter(active_student)
+    if broadcast.audience == 'all_lecturers':
+        return users.filter(user_type__in=LECTURER_TYPES)
+    if broadcast.audience == 'all_staff':
+        return users.exclude(user_type__in=('student',) + LECTURER_TYPES).filter(student_profile__isnull=True)
+    if broadcast.audience == 'programme':
+        users = users.filter(active_student, student_profile__programme_id=broadcast.programme_id)
+        return users.filter(student_profile__current_year=broadcast.year) if broadcast.year else users
+    if broadcast.audience == 'year':
+        return users.filter(active_student, student_profile__current_year=broadcast.year)
+    if broadcast.audience == 'hostel':
+        return users.filter(
+            student_profile__hostel_bookings__bed__room__hostel_id=broadcast.hostel_id,
+            student_profile__hostel_bookings__booking_status__in=ACTIVE_BOOKING_STATUSES,
+            student_profile__hostel_bookings__academic_year__is_current=True,
+        ).distinct()
+    return users
+
+
+# =============================================================================
+# Publishing
+# =============================================================================
+
+def check_audience(audience, programme=None, year=None, hostel=None):
+    """Raise ValueError unless the audience has the scope it needs"""
+    if audience not in dict(BroadcastNotification.AUDIENCES):
+        raise ValueError(f"Unknown audience {audience!r}")
+    if audience == 'programme' and not programme:
+        raise ValueError("A programme broadcast needs a programme")
+    if audience == 'year' and not year:
+        raise ValueError("A year broadcast needs a year of study")
+    if audience == 'hostel' and not hostel:
+        raise ValueError("A hostel broadcast needs a hostel")
+
+
+def publish(sender, title, message, audience, programme=None, year=None, hostel=None,
+            notification_type='general', related_url='', expires_at=None,
+            send_email=False, send_sms=False):
+    """Create a broadcast (one row whatever the audience size) and queue any copies"""
+    check_audience(audience, programme, year, hostel)
+
+    broadcast = BroadcastNotification.objects.create(
+        title=title,
+        message=message,
+        notification_type=notification_type,
+        audience=audience,
+        programme=programme if audience == 'programme' else None,
+        year=year if audience in ('programme', 'year') else None,
+        hostel=hostel if audience == 'hostel' else None,
+        related_url=related_url,
+        expires_at=expires_at,
+        send_email=send_email,
+        send_sms=send_sms,
+        sender=sender,
+    )
+    if send_email or send_sms:
+        queue_copies(broadcast)
+    return broadcast
+
+
+def queue_copies(broadcast):
+    """Queue the email/SMS copies of a broadcast in the outbox, in bulk"""
+    from .models_outbox import OutboundMessage
+    from .outbox import queue_email_each, queue_sms
+
+    contacts = audience_users(broadcast).values_list('email', 'phone')
+    emails, phones = [], []
+    for email, phone in contacts.iterator(chunk_size=2000):
+        if broadcast.send_email and email:
+            emails.append(email)
+        if broadcast.send_sms and phone:
+            phones.append(phone)
+
+    if emails:
+        queue_email_each(emails, broadcast.title, broadcast.message,
+                         category='broadcast', priority=OutboundMessage.PRIORITY_BULK)
+    if phones:
+        queue_sms(phones, f"{broadcast.title}: {broadcast.message}",
+                  category='broadcast', priority=OutboundMessage.PRIORITY_BULK)
+    logger.info(f"Broadcast {broadcast.pk}: queued {len(emails)} emails and {len(phones)} SMS")
+    return len(emails) + len(phones)
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+
+def read_through(user):
+    """The user's read watermark"""
+    state = BroadcastReadState.objects.filter(user=user).values_list('read_through', flat=True).first()
+    return state or user.date_joined
+
+
+def broadcasts_for(user, now=None, watermark=None):
+    """Live broadcasts addressed to ``user``, newest first, with ``is_read``"""
+    now = now or timezone.now()
+    watermark = watermark or read_through(user)
+    return BroadcastNotification.objects.filter(
+        audience_filter(user)
+    ).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+    ).annotate(
+        is_read=Case(
+            When(created_at__lte=watermark, then=Value(True)),
+            When(Exists(BroadcastReceipt.objects.filter(broadcast=OuterRef('pk'), user=user)), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
+    ).order_by('-created_at')
+
+
+def _unread_key(user):
+    version = get_entity_versions(['broadcasts'])['broadcasts']
+    return UNREAD_KEY.format(user.pk, version)
+
+
+def unread_count(user):
+    """Unread broadcasts plus unread personal notifications, cached per user"""
+    key = _unread_key(user)
+    count = cache.get(key)
+    if count is not None:
+        return count
+
+    count = broadcasts_for(user).filter(is_read=False).count()
+    count += StudentNotification.objects.filter(student__user=user, is_read=False).count()
+    cache.set(key, count, getattr(settings, 'BROADCAST_UNREAD_CACHE_TTL', 300))
+    return count
+
+
+def forget_unread_count(user_id):
+    cache.delete(UNREAD_KEY.format(user_id, get_entity_versions(['broadcasts'])['broadcasts']))
+
+
+def mark_read(user, broadcast):
+    """Record that ``user`` opened one broadcast"""
+    if broadcast.created_at > read_through(user):
+        BroadcastReceipt.objects.get_or_create(user=user, broadcast=broadcast)
+        forget_unread_count(user.pk)
+
+
+def mark_all_read(user, now=None):
+    """
+    Everything up to ``now`` is read: one watermark upsert, the receipts it
+    makes redundant removed, and personal notifications flagged in one UPDATE.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        BroadcastReadState.objects.update_or_create(user=user, defaults={'read_through': now})
+        BroadcastReceipt.objects.filter(user=user, broadcast__created_at__lte=now).delete()
+        StudentNotification.objects.filter(student__user=user, is_read=False).update(is_read=True, read_date=now)
+    forget_unread_count(user.pk)
+
+
+def broadcasts_changed():
+    """New or removed broadcasts: every cached counter is stale"""
+    bump_entity_version('broadcasts')
@@ -0,0 +1,151 @@
+# checks.py - System checks for the URL configuration and caches
+#
+# Django resolves a path by trying patterns in order and stops at the first
+# match, so a pattern can silently become unreachable:
+#
+#   - duplicated: the same route (converter names aside) registered twice
+#   - shadowed: an earlier pattern, possibly in another include() such as
+#     the admin's catch-all, already matches every path this one would
+#   - name clash: two patterns share a name and take the same arguments, so
+#     reverse() can only ever return one of them
+#
+# Each routed pattern is tested with a sample path built from its route
+# (one value per converter) and resolved from the root URLconf. Runs with
+# ``manage.py check``.
+#
+# ``manage.py check --deploy`` also requires the default cache to be shared
+# between workers: entity versions, role scopes and their invalidation live
+# there, and a per-process cache would let each worker keep stale data. It
+# warns when the rate-limit cache is per-process: limits are then counted
+# per worker, and admin login lockouts fall back to a COUNT query per login.
+
+import re
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+from django.urls import Resolver404, URLPattern, URLResolver, get_resolver
+from django.urls.converters import IntConverter, PathConverter, SlugConverter, StringConverter, UUIDConverter
+from django.urls.resolvers import RoutePattern
+
+from .analytics_cache import is_shared_cache
+
+CONVERTER_RE = re.compile(r'<(?:(?P<converter>[^>:]+):)?(?P<parameter>[^>]+)>')
+
+SAMPLE_VALUES = {
+    IntConverter: '1',
+    StringConverter: 'sample',
+    SlugConverter: 'sample-slug',
+    UUIDConverter: '00000000-0000-0000-0000-000000000001',
+    PathConverter: 'sample/path',
+}
+
+
+def iter_routes(resolver=None, prefix='', converters=None):
+    """
+    Yield (route, converters, pattern) for every URLPattern reachable through
+    path() routes only; route is the full route from the root, converters
+    maps its parameters to converter instances.
+    """
+    resolver = resolver or get_resolver()
+    for entry in resolver.url_patterns:
+        if not isinstance(entry.pattern, RoutePattern):
+            continue
+        route = prefix + str(entry.pattern)
+        merged = {**(converters or {}), **entry.pattern.converters}
+        if isinstance(entry, URLResolver):
+            yield from iter_routes(entry, route, merged)
+        elif isinstance(entry, URLPattern):
+            yield route, merged, entry
+
+
+def sample_path(route, converters):
+    """A path matching ``route``, or None when a converter has no sample value"""
+    values = {}
+    for parameter, converter in converters.items():
+        value = SAMPLE_VALUES.get(type(converter))
+        if value is None:
+            return None
+        values[parameter] = value
+    return '/' + CONVERTER_RE.sub(lambda match: values[match.group('parameter')], route)
+
+
+def normalize_route(route):
+    """``route`` with parameter names dropped: <int:pk> and <int:id> are the same route"""
+    return CONVERTER_RE.sub(lambda match: f"<{match.group('converter') or 'str'}>", route)
+
+
+def describe(route, pattern):
+    return f"'{route}'" + (f" [name='{pattern.name}']" if pattern.name else '')
+
+
+@register(Tags.urls)
+def check_url_patterns(app_configs=None, **kwargs):
+    errors = []
+    resolver = get_resolver()
+    routes = list(iter_routes(resolver))
+
+    seen = {}
+    for route, converters, pattern in routes:
+        key = normalize_route(route)
+        if key in seen:
+            errors.append(Warning(
+                f"URL pattern {describe(route, pattern)} duplicates {describe(*seen[key])} and is never used.",
+                hint='Remove the duplicate.',
+                id='core_application.W001',
+            ))
+            continue
+        seen[key] = (route, pattern)
+
+        path = sample_path(route, converters)
+        if path is None:
+            continue
+        try:
+            match = resolver.resolve(path)
+        except Resolver404:
+            continue
+        if match.route != route:
+            errors.append(Warning(
+                f"URL pattern {describe(route, pattern)} is shadowed by '{match.route}', "
+                f"which matches {path} first.",
+                hint='Move the more specific pattern before the general one, or change its route.',
+                id='core_application.W002',
+            ))
+
+    by_name = {}
+    for route, converters, pattern in routes:
+        if pattern.name:
+            signature = (pattern.name, frozenset(converters))
+            if signature in by_name and normalize_route(by_name[signature]) != normalize_route(route):
+                errors.append(Warning(
+                    f"URL patterns '{by_name[signature]}' and '{route}' are both named '{pattern.name}' "
+                    f"with the same arguments; reverse() only returns one of them.",
+                    hint='Give one of them a different name.',
+                    id='core_application.W003',
+                ))
+            by_name[signature] = route
+    return errors
+
+
+SHARED_CACHE_ALIASES = ('default',)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_caches(app_configs=None, **kwargs):
+    errors = []
+    for alias in SHARED_CACHE_ALIASES:
+        if not is_shared_cache(alias):
+            errors.append(Error(
+                f"The '{alias}' cache is local to each process, so workers do not see each other's "
+                f"invalidations.",
+                hint='Set CACHE_BACKEND and CACHE_LOCATION to a shared backend such as Redis or Memcached.',
+                id='core_application.E001',
+            ))
+    rate_limit_cache = getattr(settings, 'RATE_LIMIT_CACHE', 'default')
+    if not is_shared_cache(rate_limit_cache):
+        errors.append(Warning(
+            f"The '{rate_limit_cache}' rate-limit cache is local to each process, so limits are counted "
+            f"per worker and admin login lockouts query AdminLoginAttempt on every login.",
+            hint='Set RATE_LIMIT_CACHE_BACKEND to FileBasedCache, Redis or Memcached.',
+            id='core_application.W004',
+        ))
+    return errors
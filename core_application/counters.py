@@ -0,0 +1,218 @@
+# counters.py - Write-behind counters and audit rows
+#
+# Hot counters (CourseNotes.download_count, ExamRepository.download_count)
+# are not updated per request. increment() adds to an in-process buffer and
+# record() queues an unsaved audit row (NotesDownload, ExamMaterialDownload);
+# flush() then writes them:
+#
+#   UPDATE ... SET download_count = download_count + 3 WHERE id IN (...)
+#
+# one UPDATE per (model, field, delta) group, plus one bulk INSERT per audit
+# model, each in its own transaction so one failing group cannot hold back
+# the others. During exam week thousands of downloads of the same paper become
+# one row update every COUNTER_FLUSH_INTERVAL seconds instead of thousands
+# of requests queueing on the same row lock.
+#
+# Flushes happen from a background thread every COUNTER_FLUSH_INTERVAL
+# seconds, as soon as COUNTER_FLUSH_THRESHOLD operations are buffered, and at
+# interpreter exit. Counts buffered in a process that is killed outright are
+# lost, which is acceptable for statistics. With COUNTER_WRITE_BEHIND = False
+# every call is written straight away.
+#
+# Audit rows whose parent (the notes, the paper, the student) was deleted in
+# the meantime are dropped rather than retried. A group that fails for any
+# other reason (database unavailable) is buffered again for the next flush,
+# keeping at most COUNTER_MAX_BUFFERED_ROWS audit rows per model.
+
+import atexit
+from collections import defaultdict
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_counts = defaultdict(int)   # (model, field, pk) -> delta
+_rows = defaultdict(list)    # model -> unsaved instances
+_size = 0
+_flusher_pid = None
+
+
+def _write_behind():
+    return getattr(settings, 'COUNTER_WRITE_BEHIND', True)
+
+
+# =============================================================================
+# Buffering
+# =============================================================================
+
+def increment(model, pk, field='download_count', amount=1):
+    """Add ``amount`` to ``field`` of row ``pk`` (eventually)"""
+    if not _write_behind():
+        model.objects.filter(pk=pk).update(**{field: F(field) + amount})
+        return
+    with _lock:
+        _counts[(model, field, pk)] += amount
+    _buffered()
+
+
+def record(instance):
+    """Insert the unsaved ``instance`` (eventually, in bulk)"""
+    if not _write_behind():
+        instance.save()
+        return
+    with _lock:
+        _rows[type(instance)].append(instance)
+    _buffered()
+
+
+def pending(model, pk, field='download_count'):
+    """Increments for the row not yet written, e.g. to show a live total"""
+    with _lock:
+        return _counts.get((model, field, pk), 0)
+
+
+def _buffered():
+    global _size
+    with _lock:
+        _size += 1
+        full = _size >= getattr(settings, 'COUNTER_FLUSH_THRESHOLD', 1000)
+    _ensure_flusher()
+    if full:
+        flush()
+
+
+# =============================================================================
+# Flushing
+# =============================================================================
+
+def _take():
+    global _counts, _rows, _size
+    with _lock:
+        counts, rows = _counts, _rows
+        _counts, _rows, _size = defaultdict(int), defaultdict(list), 0
+    return counts, rows
+
+
+def _put_back(counts, rows):
+    global _size
+    limit = getattr(settings, 'COUNTER_MAX_BUFFERED_ROWS', 10000)
+    with _lock:
+        for key, delta in counts.items():
+            _counts[key] += delta
+        for model, instances in rows.items():
+            buffered = _rows[model]
+            buffered[:0] = instances
+            if len(buffered) > limit:
+                logger.warning(f"Dropping {len(buffered) - limit} buffered {model.__name__} rows over the limit")
+                del buffered[:len(buffered) - limit]
+        _size = len(_counts) + sum(len(instances) for instances in _rows.values())
+
+
+def _with_parents(model, instances):
+    """``instances`` without those whose foreign key points at a deleted row"""
+    for field in model._meta.concrete_fields:
+        if not field.many_to_one:
+            continue
+        ids = {getattr(instance, field.attname) for instance in instances} - {None}
+        if not ids:
+            continue
+        existing = set(
+            field.related_model._base_manager.filter(pk__in=ids).values_list('pk', flat=True)
+        )
+        if len(existing) < len(ids):
+            kept = [
+                instance for instance in instances
+                if getattr(instance, field.attname) is None or getattr(instance, field.attname) in existing
+            ]
+            logger.warning(
+                f"Dropping {len(instances) - len(kept)} {model.__name__} rows whose {field.name} was deleted"
+            )
+            instances = kept
+    return instances
+
+
+def _insert(model, instances):
+    """Insert audit rows, dropping any the database rejects; returns rows inserted"""
+    instances = _with_parents(model, instances)
+    try:
+        with transaction.atomic():
+            return len(model.objects.bulk_create(instances, batch_size=500))
+    except IntegrityError:
+        pass
+
+    # A parent was deleted between the check and the insert: go row by row
+    inserted = 0
+    for instance in instances:
+        try:
+            with transaction.atomic():
+                instance.save(force_insert=True)
+            inserted += 1
+        except IntegrityError as e:
+            logger.warning(f"Dropping {model.__name__} row: {e}")
+    return inserted
+
+
+def flush():
+    """Write buffered increments and audit rows; returns (rows updated, rows inserted)"""
+    counts, rows = _take()
+    if not counts and not rows:
+        return 0, 0
+
+    # Group rows that get the same delta so each group is one UPDATE
+    groups = defaultdict(dict)
+    for (model, field, pk), delta in counts.items():
+        if delta:
+            groups[(model, field, delta)][(model, field, pk)] = delta
+
+    updated = 0
+    for (model, field, delta), group in groups.items():
+        pks = sorted(pk for _, _, pk in group)
+        try:
+            # Rows deleted since the download simply match nothing
+            updated += model.objects.filter(pk__in=pks).update(**{field: F(field) + delta})
+        except Exception as e:
+            logger.error(f"Counter flush of {model.__name__}.{field} failed, keeping {len(pks)} buffered: {e}")
+            _put_back(group, {})
+
+    inserted = 0
+    for model, instances in rows.items():
+        try:
+            inserted += _insert(model, instances)
+        except Exception as e:
+            logger.error(f"Flush of {model.__name__} rows failed, keeping {len(instances)} buffered: {e}")
+            _put_back({}, {model: instances})
+
+    logger.debug(f"Flushed {updated} counter rows and {inserted} audit rows")
+    return updated, inserted
+
+
+def _flush_loop():
+    interval = getattr(settings, 'COUNTER_FLUSH_INTERVAL', 10)
+    while True:
+        time.sleep(interval)
+        try:
+            flush()
+        finally:
+            close_old_connections()
+
+
+def _ensure_flusher():
+    """Start this process's flush thread (again after a fork)"""
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+    threading.Thread(target=_flush_loop, name='counter-flush', daemon=True).start()
+
+
+atexit.register(flush)
@@ -0,0 +1,186 @@
+
+# enrollment_engine.py - Set-based bulk enrollment and cohort auto-registration
+
+from collections import defaultdict
+import logging
+
+from django.db import transaction
+
+from .analytics_cache import bump_entity_version
+from .models import Enrollment, ProgrammeCourse, Student
+from .models_registration import CourseCapacity
+from .registration_control import add_to_enrolled_counts, seat_availability
+
+logger = logging.getLogger(__name__)
+
+# Number of Enrollment rows sent to the database per INSERT statement
+BULK_ENROLLMENT_CHUNK_SIZE = 1000
+
+# Largest student batch filtered with an IN clause when diffing enrollments
+STUDENT_FILTER_LIMIT = 900
+
+
+def _chunks(items, size):
+    """Yield successive slices of ``items`` of at most ``size`` elements"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def existing_enrollment_pairs(semester, student_ids, course_ids):
+    """
+    Return the set of (student_id, course_id) pairs already enrolled in the
+    semester, fetched with a single query over the requested courses.
+
+    The student filter is only added for small batches so that whole-cohort
+    runs do not exceed the database's bound-parameter limit.
+    """
+    existing = Enrollment.objects.filter(semester=semester, course_id__in=course_ids)
+    if len(student_ids) <= STUDENT_FILTER_LIMIT:
+        existing = existing.filter(student_id__in=student_ids)
+    return set(existing.values_list('student_id', 'course_id'))
+
+
+def enroll_pairs(semester, pairs, chunk_size=BULK_ENROLLMENT_CHUNK_SIZE):
+    """
+    Enroll an iterable of (student_id, course_id) pairs into a semester.
+
+    Pairs that already have an Enrollment for the semester are skipped after a
+    single diff query. Courses with a CourseCapacity only take as many of the
+    rest as they have free seats (lowest student ids first); the remainder
+    are inserted with bulk_create in chunks.
+    ``ignore_conflicts`` keeps the insert safe against concurrent registrations
+    racing on the (student, course, semester) unique constraint. The created
+    count is the attempted pairs found after the insert: the diff runs inside
+    the transaction with the seat counters locked, so enrollments other
+    students make meanwhile are never counted as ours.
+    """
+    requested = set(pairs)
+    if not requested:
+        return {'created_count': 0, 'skipped_count': 0, 'full_count': 0, 'total_attempted': 0}
+
+    student_ids = {student_id for student_id, _ in requested}
+    course_ids = {course_id for _, course_id in requested}
+
+    with transaction.atomic():
+        # Lock the seat counters so registrations cannot take the seats
+        # counted here before the insert commits
+        list(CourseCapacity.objects.select_for_update().filter(
+            semester=semester, course_id__in=course_ids
+        ).values_list('pk', flat=True))
+        seats = seat_availability(semester, course_ids)
+        existing = existing_enrollment_pairs(semester, student_ids, course_ids)
+
+        to_create, full = [], []
+        for student_id, course_id in sorted(requested - existing):
+            if course_id in seats:
+                if seats[course_id] <= 0:
+                    full.append((student_id, course_id))
+                    continue
+                seats[course_id] -= 1
+            to_create.append((student_id, course_id))
+
+        new_enrollments = [
+            Enrollment(
+                student_id=student_id,
+                course_id=course_id,
+                semester=semester,
+                is_active=True,
+                is_repeat=False,
+                is_audit=False,
+            )
+            for student_id, course_id in to_create
+        ]
+
+        for chunk in _chunks(new_enrollments, chunk_size):
+            Enrollment.objects.bulk_create(chunk, ignore_conflicts=True)
+
+        # ignore_conflicts does not say which rows went in, so look the
+        # attempted pairs up again; bulk_create skips signals, so bump the
+        # seat counters by what was created here
+        created = set(to_create) & existing_enrollment_pairs(
+            semester, {student_id for student_id, _ in to_create}, course_ids
+        ) if to_create else set()
+        course_counts = defaultdict(int)
+        for _, course_id in created:
+            course_counts[course_id] += 1
+        add_to_enrolled_counts(semester.pk, course_counts)
+        created_count = len(created)
+
+        # ...and invalidate the cached enrollment analytics
+        transaction.on_commit(lambda: bump_entity_version('enrollments'))
+
+    skipped_count = len(requested) - created_count - len(full)
+    logger.info(
+        f"Bulk enrollment for semester {semester.pk}: "
+        f"{created_count} created, {skipped_count} skipped, {len(full)} over capacity"
+    )
+
+    return {
+        'created_count': created_count,
+        'skipped_count': skipped_count,
+        'full_count': len(full),
+        'total_attempted': len(requested),
+    }
+
+
+def bulk_enroll(semester, student_ids, course_ids, chunk_size=BULK_ENROLLMENT_CHUNK_SIZE):
+    """Enroll every student in ``student_ids`` into every course in ``course_ids``"""
+    pairs = [
+        (int(student_id), int(course_id))
+        for student_id in student_ids
+        for course_id in course_ids
+    ]
+    return enroll_pairs(semester, pairs, chunk_size=chunk_size)
+
+
+def cohort_enrollment_pairs(semester, programme=None, year_of_study=None):
+    """
+    Build the (student_id, course_id) pairs for auto-registering programme
+    cohorts into the semester's mandatory ProgrammeCourse units.
+
+    Students are matched to units on programme, current year of study and the
+    semester number, using one query for students and one for the curriculum.
+    """
+    students = Student.objects.filter(status='active')
+    units = ProgrammeCourse.objects.filter(
+        semester=semester.semester_number,
+        is_mandatory=True,
+        is_active=True,
+        course__is_active=True,
+    )
+
+    if programme is not None:
+        students = students.filter(programme=programme)
+        units = units.filter(programme=programme)
+    if year_of_study is not None:
+        students = students.filter(current_year=year_of_study)
+        units = units.filter(year=year_of_study)
+
+    curriculum = defaultdict(list)
+    for programme_id, year, course_id in units.values_list('programme_id', 'year', 'course_id'):
+        curriculum[(programme_id, year)].append(course_id)
+
+    if not curriculum:
+        return []
+
+    pairs = []
+    cohort_students = students.filter(
+        programme_id__in={programme_id for programme_id, _ in curriculum}
+    ).values_list('id', 'programme_id', 'current_year')
+
+    for student_id, programme_id, current_year in cohort_students.iterator(chunk_size=2000):
+        for course_id in curriculum.get((programme_id, current_year), ()):
+            pairs.append((student_id, course_id))
+
+    return pairs
+
+
+def auto_register_cohort(semester, programme=None, year_of_study=None,
+                         chunk_size=BULK_ENROLLMENT_CHUNK_SIZE):
+    """
+    Enroll every active student of a programme/year into that semester's
+    mandatory units. Omitting ``programme`` or ``year_of_study`` widens the
+    cohort to all programmes or all years respectively.
+    """
+    pairs = cohort_enrollment_pairs(semester, programme=programme, year_of_study=year_of_study)
+    return enroll_pairs(semester, pairs, chunk_size=chunk_size)
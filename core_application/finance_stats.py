@@ -0,0 +1,381 @@
+# finance_stats.py - Aggregates behind the finance dashboard
+#
+# The dashboard used to run a revenue query per month, a Student count per
+# fee structure and per-year/per-semester sums, plus balance counts that
+# joined every fee structure of a programme (multiplying payment totals).
+# Here every figure comes from a fixed handful of grouped queries:
+#
+# - one conditional aggregate for year-on-year, today's and current totals
+# - one TruncMonth GROUP BY for the 12-month trend
+# - one GROUP BY over the year's payments, rolled up in Python into the
+#   payment-method, programme, year-of-study and semester breakdowns
+# - one pass over the year's fee structures with their active cohort counted
+#   in a correlated subquery, giving expected revenue and fee components
+# - one aggregate over active students against their own cohort's fee
+#
+# Results are cached per academic year and day and invalidated through the
+# analytics entity versions bumped in signals.py.
+
+from datetime import date
+from decimal import Decimal
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Count, DecimalField, ExpressionWrapper, F, IntegerField, OuterRef, Q,
+    Subquery, Sum,
+)
+from django.db.models.functions import Coalesce, TruncMonth
+
+from .analytics_cache import get_entity_versions
+from .models import AcademicYear, FeePayment, FeeStructure, HostelBooking, Student
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_KEY = 'finance:dashboard:{}:{}'
+
+# Entities (see signals.ANALYTICS_ENTITY_MODELS) the dashboard figures read
+DASHBOARD_ENTITIES = ('fees', 'students', 'hostels', 'calendar')
+
+FEE_COMPONENTS = (
+    ('Tuition', 'tuition_fee'),
+    ('Registration', 'registration_fee'),
+    ('Examination', 'examination_fee'),
+    ('Library', 'library_fee'),
+    ('Laboratory', 'laboratory_fee'),
+    ('Technology', 'technology_fee'),
+    ('Accommodation', 'accommodation_fee'),
+    ('Other', 'other_fees'),
+)
+
+ZERO = Decimal('0.00')
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def _completed_payments():
+    return FeePayment.objects.filter(payment_status='completed').order_by()
+
+
+def _month_starts(today, months=12):
+    """First day of each of the last ``months`` calendar months, oldest first"""
+    starts = []
+    year, month = today.year, today.month
+    for _ in range(months):
+        starts.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return starts[::-1]
+
+
+# =============================================================================
+# Revenue
+# =============================================================================
+
+def revenue_totals(academic_year, previous_year, today):
+    """Current and previous academic year revenue and today's collections"""
+    totals = _completed_payments().aggregate(
+        total_revenue=Coalesce(
+            Sum('amount_paid', filter=Q(fee_structure__academic_year=academic_year)), ZERO
+        ),
+        previous_revenue=Coalesce(
+            Sum('amount_paid', filter=Q(fee_structure__academic_year=previous_year)), ZERO
+        ),
+        today_collections=Coalesce(Sum('amount_paid', filter=Q(payment_date=today)), ZERO),
+        today_payment_count=Count('id', filter=Q(payment_date=today)),
+    )
+    if previous_year is None:
+        totals['previous_revenue'] = ZERO
+    return totals
+
+
+def monthly_revenue(today, months=12):
+    """Revenue per calendar month for the last ``months`` months"""
+    starts = _month_starts(today, months)
+    rows = (
+        _completed_payments()
+        .filter(payment_date__gte=starts[0], payment_date__lte=today)
+        .annotate(month=TruncMonth('payment_date'))
+        .values('month')
+        .annotate(total=Sum('amount_paid'))
+    )
+    by_month = {row['month']: row['total'] for row in rows}
+    return {
+        'labels': [start.strftime('%b %Y') for start in starts],
+        'data': [float(by_month.get(start) or 0) for start in starts],
+    }
+
+
+def payment_breakdown(academic_year):
+    """
+    Payment-method, programme, year-of-study and semester revenue for the
+    academic year, all rolled up from a single grouped query.
+    """
+    rows = (
+        _completed_payments()
+        .filter(fee_structure__academic_year=academic_year)
+        .values(
+            'payment_method',
+            'fee_structure__programme__code',
+            'fee_structure__programme__name',
+            'fee_structure__year',
+            'fee_structure__semester',
+        )
+        .annotate(total=Sum('amount_paid'))
+    )
+
+    methods, programmes, years, semesters = {}, {}, {}, {}
+    for row in rows:
+        total = row['total'] or ZERO
+        methods[row['payment_method']] = methods.get(row['payment_method'], ZERO) + total
+        programme = (row['fee_structure__programme__code'], row['fee_structure__programme__name'])
+        programmes[programme] = programmes.get(programme, ZERO) + total
+        years[row['fee_structure__year']] = years.get(row['fee_structure__year'], ZERO) + total
+        semesters[row['fee_structure__semester']] = semesters.get(row['fee_structure__semester'], ZERO) + total
+
+    methods = sorted(methods.items(), key=lambda item: -item[1])
+    programmes = sorted(programmes.items(), key=lambda item: -item[1])[:10]
+    return {
+        'payment_method_data': {
+            'labels': [method.replace('_', ' ').title() for method, _ in methods],
+            'data': [float(total) for _, total in methods],
+        },
+        'programme_revenue_data': {
+            'labels': [code for (code, _), _ in programmes],
+            'data': [float(total) for _, total in programmes],
+        },
+        'collected_by_year': years,
+        'semester_revenues': {
+            f'semester_{number}_revenue': semesters.get(number, ZERO) for number in (1, 2, 3)
+        },
+    }
+
+
+# =============================================================================
+# Expected fees and balances
+# =============================================================================
+
+def _net_fee():
+    return ExpressionWrapper(
+        F('tuition_fee') + F('registration_fee') + F('examination_fee') +
+        F('library_fee') + F('laboratory_fee') + F('fieldwork_fee') +
+        F('technology_fee') + F('accommodation_fee') + F('meals_fee') +
+        F('medical_fee') + F('insurance_fee') + F('student_union_fee') +
+        F('sports_fee') + F('graduation_fee') + F('other_fees') -
+        F('government_subsidy') - F('scholarship_amount'),
+        output_field=MONEY,
+    )
+
+
+def expected_fees(academic_year):
+    """
+    Expected revenue (net fee x active cohort), tuition per year of study and
+    average fee components from one pass over the year's fee structures.
+    """
+    cohort = (
+        Student.objects.filter(
+            status='active',
+            programme=OuterRef('programme'),
+            current_year=OuterRef('year'),
+            current_semester=OuterRef('semester'),
+        )
+        .order_by().values('programme').annotate(total=Count('*')).values('total')
+    )
+    structures = list(
+        FeeStructure.objects.filter(academic_year=academic_year)
+        .annotate(
+            net_amount=_net_fee(),
+            cohort_size=Coalesce(Subquery(cohort, output_field=IntegerField()), 0),
+        )
+        .values('year', 'net_amount', 'cohort_size', *[field for _, field in FEE_COMPONENTS])
+    )
+
+    total_expected = sum((row['net_amount'] * row['cohort_size'] for row in structures), ZERO)
+    tuition_by_year = {}
+    for row in structures:
+        tuition_by_year[row['year']] = tuition_by_year.get(row['year'], ZERO) + row['tuition_fee']
+
+    components = []
+    for _, field in FEE_COMPONENTS:
+        values = [row[field] for row in structures]
+        components.append(float(sum(values, ZERO) / len(values)) if values else 0.0)
+
+    return {
+        'expected_revenue': total_expected,
+        'tuition_by_year': tuition_by_year,
+        'fee_components_data': {
+            'labels': [label for label, _ in FEE_COMPONENTS],
+            'data': components,
+        },
+    }
+
+
+def student_balances(academic_year):
+    """
+    Active students annotated with the tuition of their own cohort's fee
+    structure for ``academic_year`` and what they paid towards that year.
+    Students without a fee structure have a NULL ``expected_fee``.
+    """
+    expected = FeeStructure.objects.filter(
+        academic_year=academic_year,
+        programme=OuterRef('programme'),
+        year=OuterRef('current_year'),
+        semester=OuterRef('current_semester'),
+    ).values('tuition_fee')[:1]
+    paid = (
+        _completed_payments()
+        .filter(student=OuterRef('pk'), fee_structure__academic_year=academic_year)
+        .values('student').annotate(total=Sum('amount_paid')).values('total')
+    )
+    return Student.objects.filter(status='active').annotate(
+        expected_fee=Subquery(expected, output_field=MONEY),
+        total_paid=Coalesce(Subquery(paid, output_field=MONEY), ZERO, output_field=MONEY),
+    ).annotate(
+        balance=ExpressionWrapper(F('expected_fee') - F('total_paid'), output_field=MONEY),
+    )
+
+
+def balance_summary(academic_year, top=5):
+    students = student_balances(academic_year)
+    summary = students.aggregate(
+        students_with_balances=Count('id', filter=Q(total_paid__lt=F('expected_fee'))),
+        fully_paid=Count('id', filter=Q(total_paid__gte=F('expected_fee'))),
+        partially_paid=Count('id', filter=Q(total_paid__gt=0, total_paid__lt=F('expected_fee'))),
+        not_paid=Count('id', filter=Q(total_paid=0)),
+    )
+    summary['top_outstanding'] = [
+        {
+            'student__student_id': row['student_id'],
+            'student__programme__code': row['programme__code'],
+            'balance': row['balance'],
+        }
+        for row in students.filter(balance__gt=0).order_by('-balance', 'student_id')
+        .values('student_id', 'programme__code', 'balance')[:top]
+    ]
+    return summary
+
+
+# =============================================================================
+# Other breakdowns
+# =============================================================================
+
+def top_programmes(academic_year, limit=5):
+    rows = (
+        _completed_payments()
+        .filter(fee_structure__academic_year=academic_year)
+        .values('student__programme__name', 'student__programme__code')
+        .annotate(total_revenue=Sum('amount_paid'), student_count=Count('student', distinct=True))
+        .order_by('-total_revenue')[:limit]
+    )
+    return [
+        {
+            'programme__name': row['student__programme__name'],
+            'programme__code': row['student__programme__code'],
+            'total_revenue': row['total_revenue'],
+            'student_count': row['student_count'],
+        }
+        for row in rows
+    ]
+
+
+def hostel_revenue(academic_year, limit=8):
+    hostels = (
+        HostelBooking.objects.filter(academic_year=academic_year)
+        .values('bed__room__hostel__name')
+        .annotate(revenue=Sum('booking_fee'), bookings=Count('id'))
+        .order_by('-revenue')[:limit]
+    )
+    return {
+        'labels': [h['bed__room__hostel__name'] for h in hostels],
+        'revenue': [float(h['revenue']) for h in hostels],
+        'bookings': [h['bookings'] for h in hostels],
+    }
+
+
+def sponsor_revenue():
+    rows = (
+        Student.objects.filter(status='active')
+        .values('sponsor_type')
+        .annotate(total=Sum('fee_payments__amount_paid', filter=Q(fee_payments__payment_status='completed')))
+        .order_by('-total')
+    )
+    return {
+        'labels': [row['sponsor_type'].replace('_', ' ').title() for row in rows],
+        'data': [float(row['total'] or 0) for row in rows],
+    }
+
+
+# =============================================================================
+# Dashboard
+# =============================================================================
+
+def compute_finance_dashboard(academic_year, today):
+    previous_year = AcademicYear.objects.filter(
+        start_date__lt=academic_year.start_date
+    ).order_by('-start_date').first() if academic_year else None
+
+    stats = revenue_totals(academic_year, previous_year, today)
+    total_revenue = stats['total_revenue']
+    previous_revenue = stats.pop('previous_revenue')
+    stats['revenue_growth'] = (
+        ((total_revenue - previous_revenue) / previous_revenue) * 100 if previous_revenue > 0 else 0
+    )
+
+    expected = expected_fees(academic_year)
+    total_expected = expected['expected_revenue']
+    collection_rate = (total_revenue / total_expected) * 100 if total_expected > 0 else 0
+    stats.update(
+        expected_revenue=total_expected,
+        outstanding_fees=total_expected - total_revenue,
+        collection_rate=collection_rate,
+        outstanding_percentage=100 - collection_rate if collection_rate > 0 else 0,
+        fee_components_data=expected['fee_components_data'],
+    )
+
+    breakdown = payment_breakdown(academic_year)
+    stats.update(breakdown['semester_revenues'])
+    stats['payment_method_data'] = breakdown['payment_method_data']
+    stats['programme_revenue_data'] = breakdown['programme_revenue_data']
+    stats['year_collection_data'] = {
+        'labels': [f'Year {year}' for year in range(1, 5)],
+        'expected': [float(expected['tuition_by_year'].get(year, 0)) for year in range(1, 5)],
+        'collected': [float(breakdown['collected_by_year'].get(year, 0)) for year in range(1, 5)],
+    }
+
+    balances = balance_summary(academic_year)
+    stats['students_with_balances'] = balances['students_with_balances']
+    stats['top_outstanding'] = balances['top_outstanding']
+    stats['payment_status_data'] = {
+        'labels': ['Fully Paid', 'Partially Paid', 'Not Paid'],
+        'data': [balances['fully_paid'], balances['partially_paid'], balances['not_paid']],
+    }
+
+    stats['monthly_revenue_data'] = monthly_revenue(today)
+    stats['top_programmes'] = top_programmes(academic_year)
+    stats['hostel_revenue_data'] = hostel_revenue(academic_year)
+    stats['sponsor_revenue_data'] = sponsor_revenue()
+    return stats
+
+
+def finance_dashboard_stats(academic_year, today):
+    """
+    Dashboard figures for ``academic_year``, cached for
+    FINANCE_DASHBOARD_CACHE_TTL seconds and dropped on any write to payments,
+    fee structures, students, hostels or the academic calendar.
+    """
+    ttl = getattr(settings, 'FINANCE_DASHBOARD_CACHE_TTL', 300)
+    if not ttl:
+        return compute_finance_dashboard(academic_year, today)
+
+    versions = get_entity_versions(DASHBOARD_ENTITIES)
+    parts = [today.isoformat()] + [f"{entity}={versions[entity]}" for entity in sorted(versions)]
+    key = DASHBOARD_KEY.format(
+        academic_year.pk if academic_year else 'none',
+        hashlib.sha1('|'.join(parts).encode()).hexdigest(),
+    )
+
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_finance_dashboard(academic_year, today)
+        cache.set(key, stats, ttl)
+    return stats
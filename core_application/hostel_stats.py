@@ -0,0 +1,320 @@
+# hostel_stats.py - Occupancy, booking and payment statistics for hostels
+#
+# The warden dashboard and the booking management pages used to issue one
+# COUNT or SUM per figure (and per hostel), each repeating the
+# bed -> room -> hostel join. Here each source table is read once with
+# conditional aggregation, grouped by hostel, and rolled up in Python:
+#
+#   occupancy()        Room x Bed      per hostel and floor
+#   booking_summary()  HostelBooking   per hostel, status, payment status, gender
+#   payment_summary()  HostelPayment   per method and month
+#   incident_trend()   HostelIncident  per month
+#
+# Results are cached per set of hostels (i.e. per warden) and academic year,
+# and dropped whenever a hostel, bed, booking, payment or incident is written
+# (the 'hostels' analytics entity, see signals.py).
+
+from calendar import month_name
+from datetime import date, datetime, time
+from decimal import Decimal
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .analytics_cache import get_entity_versions
+from .models import HostelBooking, HostelIncident, HostelPayment, Room
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = 'hostel:stats:{}:{}:{}:{}'
+
+ACTIVE_BOOKING_STATUSES = ('approved', 'checked_in')
+UNPAID_STATUSES = ('pending', 'partial')
+
+ZERO = Decimal('0.00')
+
+
+def _month_starts(today, months):
+    """First day of each of the last ``months`` calendar months, oldest first"""
+    starts = []
+    year, month = today.year, today.month
+    for _ in range(months):
+        starts.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return starts[::-1]
+
+
+def _month_key(value):
+    return (value.year, value.month) if value else None
+
+
+def _rate(part, whole):
+    return (part / whole * 100) if whole > 0 else 0
+
+
+def _scoped(queryset, hostel_ids, path):
+    if hostel_ids is None:
+        return queryset
+    return queryset.filter(**{f'{path}__in': hostel_ids})
+
+
+# =============================================================================
+# Aggregates
+# =============================================================================
+
+def occupancy(hostel_ids, academic_year):
+    """
+    Bed counts per hostel and floor from one grouped query. Hostel totals
+    include inactive rooms (as the dashboard always did); ``active_*`` and the
+    floor breakdown only count active rooms.
+    """
+    rows = (
+        _scoped(Room.objects.all(), hostel_ids, 'hostel_id')
+        .values('hostel_id', 'hostel__hostel_type', 'hostel__is_active', 'floor', 'is_active')
+        .annotate(
+            room_total=Count('id', distinct=True),
+            bed_total=Count('beds', filter=Q(beds__academic_year=academic_year)),
+            bed_occupied=Count('beds', filter=Q(beds__academic_year=academic_year, beds__is_available=False)),
+        )
+        .order_by()
+    )
+
+    hostels, floors = {}, {}
+    totals = {'rooms': 0, 'beds': 0, 'occupied': 0}
+    for row in rows:
+        hostel = hostels.setdefault(row['hostel_id'], {
+            'hostel_type': row['hostel__hostel_type'],
+            'is_active': row['hostel__is_active'],
+            'total_beds': 0, 'occupied_beds': 0,
+            'active_beds': 0, 'active_occupied': 0,
+        })
+        hostel['total_beds'] += row['bed_total']
+        hostel['occupied_beds'] += row['bed_occupied']
+        totals['beds'] += row['bed_total']
+        totals['occupied'] += row['bed_occupied']
+        if row['is_active']:
+            hostel['active_beds'] += row['bed_total']
+            hostel['active_occupied'] += row['bed_occupied']
+            totals['rooms'] += row['room_total']
+            floor = floors.setdefault(row['floor'], {'beds': 0, 'occupied': 0})
+            floor['beds'] += row['bed_total']
+            floor['occupied'] += row['bed_occupied']
+
+    return {
+        'total_rooms': totals['rooms'],
+        'total_beds': totals['beds'],
+        'occupied_beds': totals['occupied'],
+        'hostels': hostels,
+        'floors': dict(sorted(floors.items())),
+    }
+
+
+def booking_summary(hostel_ids, academic_year):
+    """Booking status, payment and gender figures per hostel from one grouped query"""
+    rows = (
+        _scoped(HostelBooking.objects.filter(academic_year=academic_year), hostel_ids, 'bed__room__hostel_id')
+        .values('booking_status', 'payment_status', 'bed__room__hostel_id', 'student__user__gender')
+        .annotate(bookings=Count('id'), fees=Sum('booking_fee'), paid=Sum('amount_paid'))
+        .order_by()
+    )
+
+    summary = {
+        'total_bookings': 0,
+        'status_counts': {},
+        'gender_counts': {},
+        'total_fees': ZERO,
+        'collected': ZERO,
+        'unpaid_bookings': 0,
+        'pending_balance': ZERO,
+        'hostels': {},
+    }
+    for row in rows:
+        count, fees, paid = row['bookings'], row['fees'] or ZERO, row['paid'] or ZERO
+        status, gender = row['booking_status'], row['student__user__gender']
+        active = status in ACTIVE_BOOKING_STATUSES
+        unpaid = row['payment_status'] in UNPAID_STATUSES
+
+        hostel = summary['hostels'].setdefault(row['bed__room__hostel_id'], {
+            'bookings': 0, 'active_bookings': 0, 'total_fees': ZERO, 'collected': ZERO,
+            'pending_balance': ZERO, 'gender_counts': {},
+        })
+        for bucket in (summary, hostel):
+            bucket['total_fees'] += fees
+            bucket['collected'] += paid
+            if unpaid:
+                bucket['pending_balance'] += fees - paid
+            if active:
+                bucket['gender_counts'][gender] = bucket['gender_counts'].get(gender, 0) + count
+        hostel['bookings'] += count
+        if active:
+            hostel['active_bookings'] += count
+
+        summary['total_bookings'] += count
+        summary['status_counts'][status] = summary['status_counts'].get(status, 0) + count
+        if unpaid:
+            summary['unpaid_bookings'] += count
+    return summary
+
+
+def payment_summary(hostel_ids, academic_year, today, months=12):
+    """
+    Revenue for ``academic_year`` by method, today's takings and a monthly
+    trend for the last ``months`` calendar months, from one grouped query.
+    """
+    starts = _month_starts(today, months)
+    for_year = Q(booking__academic_year=academic_year)
+    rows = (
+        _scoped(HostelPayment.objects.all(), hostel_ids, 'booking__bed__room__hostel_id')
+        .filter(for_year | Q(payment_date__gte=starts[0]))
+        .annotate(month=TruncMonth('payment_date'))
+        .values('payment_method', 'month')
+        .annotate(
+            paid_total=Sum('amount'),
+            year_amount=Sum('amount', filter=for_year),
+            today_amount=Sum('amount', filter=Q(payment_date=today)),
+        )
+        .order_by()
+    )
+
+    methods, by_month = {}, {}
+    total_revenue = today_amount = ZERO
+    for row in rows:
+        year_amount = row['year_amount'] or ZERO
+        total_revenue += year_amount
+        today_amount += row['today_amount'] or ZERO
+        if row['year_amount'] is not None:
+            methods[row['payment_method']] = methods.get(row['payment_method'], ZERO) + year_amount
+        key = _month_key(row['month'])
+        by_month[key] = by_month.get(key, ZERO) + (row['paid_total'] or ZERO)
+
+    return {
+        'total_revenue': total_revenue,
+        'today_payments': today_amount,
+        'methods': sorted(methods.items(), key=lambda item: (-item[1], item[0])),
+        'monthly': [
+            (month_name[start.month][:3], by_month.get(_month_key(start), ZERO)) for start in starts
+        ],
+    }
+
+
+def incident_trend(hostel_ids, today, months=6):
+    starts = _month_starts(today, months)
+    since = timezone.make_aware(datetime.combine(starts[0], time.min))
+    rows = (
+        _scoped(HostelIncident.objects.filter(incident_date__gte=since), hostel_ids, 'booking__bed__room__hostel_id')
+        .annotate(month=TruncMonth('incident_date'))
+        .values('month')
+        .annotate(incidents=Count('id'))
+        .order_by()
+    )
+    by_month = {}
+    for row in rows:
+        key = _month_key(row['month'])
+        by_month[key] = by_month.get(key, 0) + row['incidents']
+    return [(month_name[start.month][:3], by_month.get(_month_key(start), 0)) for start in starts]
+
+
+# =============================================================================
+# Cached statistics
+# =============================================================================
+
+def _cached(kind, hostel_ids, academic_year, compute, today=None):
+    ttl = getattr(settings, 'HOSTEL_STATS_CACHE_TTL', 120)
+    if not ttl:
+        return compute()
+
+    versions = get_entity_versions(['hostels', 'calendar'])
+    scope = 'all' if hostel_ids is None else ','.join(str(pk) for pk in sorted(hostel_ids))
+    parts = [scope, today.isoformat() if today else ''] + [
+        f"{entity}={versions[entity]}" for entity in sorted(versions)
+    ]
+    key = STATS_KEY.format(
+        kind,
+        academic_year.pk if academic_year else 'none',
+        'all' if hostel_ids is None else 'hostels',
+        hashlib.sha1('|'.join(parts).encode()).hexdigest(),
+    )
+
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute()
+        cache.set(key, stats, ttl)
+    return stats
+
+
+def hostel_dashboard_stats(hostels, academic_year, today):
+    """Everything the warden dashboard shows for ``hostels``, in four queries"""
+    hostel_ids = [hostel.pk for hostel in hostels]
+
+    def compute():
+        beds = occupancy(hostel_ids, academic_year)
+        bookings = booking_summary(hostel_ids, academic_year)
+        per_hostel = []
+        for hostel in hostels:
+            hostel_beds = beds['hostels'].get(hostel.pk, {})
+            hostel_bookings = bookings['hostels'].get(hostel.pk, {})
+            total = hostel_beds.get('total_beds', 0)
+            occupied = hostel_beds.get('occupied_beds', 0)
+            per_hostel.append({
+                'id': hostel.pk,
+                'name': hostel.name,
+                'total': total,
+                'occupied': occupied,
+                'rate': _rate(occupied, total),
+                'bookings': hostel_bookings.get('bookings', 0),
+                'active_bookings': hostel_bookings.get('active_bookings', 0),
+                'collected': hostel_bookings.get('collected', ZERO),
+                'pending_balance': hostel_bookings.get('pending_balance', ZERO),
+                'gender_counts': hostel_bookings.get('gender_counts', {}),
+            })
+        return {
+            'occupancy': beds,
+            'bookings': bookings,
+            'payments': payment_summary(hostel_ids, academic_year, today),
+            'incidents': incident_trend(hostel_ids, today),
+            'per_hostel': per_hostel,
+        }
+
+    return _cached('dashboard', hostel_ids, academic_year, compute, today)
+
+
+def booking_statistics(academic_year):
+    """
+    Booking status counts, revenue and occupancy by hostel type across all
+    hostels, for the booking management pages.
+    """
+    def compute():
+        bookings = booking_summary(None, academic_year)
+        beds = occupancy(None, academic_year)
+
+        stats = {
+            'total_bookings': bookings['total_bookings'],
+            'total_revenue': bookings['total_fees'],
+            'collected_revenue': bookings['collected'],
+            'pending_payments': bookings['unpaid_bookings'],
+        }
+        for status in ('pending', 'approved', 'rejected', 'checked_in', 'checked_out', 'cancelled'):
+            stats[status] = bookings['status_counts'].get(status, 0)
+
+        # Occupancy counts active rooms of active hostels only
+        by_type = {'boys': [0, 0], 'girls': [0, 0]}
+        for hostel in beds['hostels'].values():
+            if hostel['is_active'] and hostel['hostel_type'] in by_type:
+                by_type[hostel['hostel_type']][0] += hostel['active_beds']
+                by_type[hostel['hostel_type']][1] += hostel['active_occupied']
+        boys_total, boys_occupied = by_type['boys']
+        girls_total, girls_occupied = by_type['girls']
+        stats['boys_occupancy'] = round(_rate(boys_occupied, boys_total), 1)
+        stats['girls_occupancy'] = round(_rate(girls_occupied, girls_total), 1)
+        stats['overall_occupancy'] = round(
+            _rate(boys_occupied + girls_occupied, boys_total + girls_total), 1
+        )
+        stats['hostels'] = beds['hostels']
+        return stats
+
+    return _cached('bookings', None, academic_year, compute)
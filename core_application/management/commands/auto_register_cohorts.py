@@ -0,0 +1,77 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core_application.models import Semester, Programme
+from core_application.enrollment_engine import (
+    BULK_ENROLLMENT_CHUNK_SIZE, auto_register_cohort, cohort_enrollment_pairs
+)
+
+
+class Command(BaseCommand):
+    help = "Auto-register programme cohorts into the mandatory units of a semester at semester start."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--semester', type=int,
+            help='Semester ID to register into (defaults to the current semester)'
+        )
+        parser.add_argument(
+            '--programme', type=str,
+            help='Programme code to limit registration to'
+        )
+        parser.add_argument(
+            '--year', type=int,
+            help='Year of study to limit registration to'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=BULK_ENROLLMENT_CHUNK_SIZE,
+            help='Number of enrollments inserted per batch'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Register even if the semester has not started yet'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report how many enrollments would be requested'
+        )
+
+    def handle(self, *args, **options):
+        if options['semester']:
+            semester = Semester.objects.select_related('academic_year').filter(id=options['semester']).first()
+        else:
+            semester = Semester.objects.select_related('academic_year').filter(is_current=True).first()
+
+        if not semester:
+            raise CommandError("❌ No matching semester found.")
+
+        today = timezone.now().date()
+        if semester.start_date > today and not options['force']:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ {semester.academic_year.year} Semester {semester.semester_number} starts on "
+                f"{semester.start_date}. Use --force to register early."
+            ))
+            return
+
+        programme = None
+        if options['programme']:
+            programme = Programme.objects.filter(code=options['programme']).first()
+            if not programme:
+                raise CommandError(f"❌ Programme '{options['programme']}' not found.")
+
+        if options['dry_run']:
+            pairs = cohort_enrollment_pairs(semester, programme=programme, year_of_study=options['year'])
+            self.stdout.write(f"🔎 {len(pairs)} cohort enrollments would be requested.")
+            return
+
+        result = auto_register_cohort(
+            semester,
+            programme=programme,
+            year_of_study=options['year'],
+            chunk_size=options['chunk_size'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"🎓 Auto-registration complete for {semester.academic_year.year} Semester {semester.semester_number}: "
+            f"{result['created_count']} created, {result['skipped_count']} already enrolled, "
+            f"{result['full_count']} over course capacity."
+        ))
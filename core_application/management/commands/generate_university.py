@@ -0,0 +1,800 @@
+"""
+Django Management Command for generating a complete synthetic university at scale.
+
+Builds faculties, departments, programmes, curricula, lecturers, students and
+several years of enrollments, grades, fee payments, attendance and hostel
+bookings using bulk_create, a single pre-hashed shared password and a seeded
+random generator, so the same options always produce the same dataset. The
+output is the fixture base for load, capacity and view benchmarks.
+
+Usage:
+  python manage.py generate_university
+  python manage.py generate_university --students 50000 --lecturers 2000 --years 5
+  python manage.py generate_university --students 500 --lecturers 40 --seed 7 --prefix BNC
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core_application.models import (
+    User, Faculty, Department, Programme, Course, ProgrammeCourse, Lecturer,
+    Student, AcademicYear, Semester, LecturerCourseAssignment, Enrollment, Grade,
+    FeeStructure, FeePayment, Timetable, AttendanceSession, Attendance,
+    Hostel, Room, Bed, HostelBooking, HostelPayment
+)
+from core_application.analytics_facts import refresh_facts
+from core_application.people_search import rebuild_search_index
+from core_application.reference_data import changed as reference_data_changed
+from core_application.role_context import roles_changed
+
+
+FIRST_NAMES_MALE = [
+    'Brian', 'Kevin', 'Dennis', 'Collins', 'Victor', 'Samuel', 'Peter', 'John',
+    'James', 'David', 'Joseph', 'Daniel', 'Stephen', 'Eric', 'Felix', 'Ian',
+    'Kelvin', 'Martin', 'Moses', 'Otieno', 'Kamau', 'Mwangi', 'Kiprono', 'Wafula',
+]
+FIRST_NAMES_FEMALE = [
+    'Faith', 'Mercy', 'Grace', 'Joy', 'Esther', 'Ann', 'Mary', 'Caroline',
+    'Diana', 'Sharon', 'Purity', 'Winnie', 'Lilian', 'Naomi', 'Ruth', 'Cynthia',
+    'Akinyi', 'Wanjiku', 'Njeri', 'Chebet', 'Atieno', 'Nafula', 'Wambui', 'Jepkosgei',
+]
+LAST_NAMES = [
+    'Mwangi', 'Otieno', 'Kamau', 'Wanjiru', 'Kiprop', 'Ochieng', 'Njoroge', 'Mutua',
+    'Kariuki', 'Omondi', 'Chebet', 'Kimani', 'Wafula', 'Mohamed', 'Achieng', 'Kiplagat',
+    'Muthoni', 'Odhiambo', 'Nyambura', 'Barasa', 'Korir', 'Maina', 'Onyango', 'Wekesa',
+]
+SUBJECT_WORDS = [
+    'Computing', 'Mathematics', 'Engineering', 'Economics', 'Statistics', 'Biology',
+    'Chemistry', 'Physics', 'Accounting', 'Marketing', 'Nursing', 'Education',
+    'Agriculture', 'Law', 'Journalism', 'Architecture', 'Pharmacy', 'Geography',
+]
+
+# (grade, grade points, representative total marks)
+GRADE_OPTIONS = [
+    ('A', Decimal('4.00'), Decimal('84')), ('A-', Decimal('3.70'), Decimal('77')),
+    ('B+', Decimal('3.30'), Decimal('72')), ('B', Decimal('3.00'), Decimal('67')),
+    ('B-', Decimal('2.70'), Decimal('62')), ('C+', Decimal('2.30'), Decimal('57')),
+    ('C', Decimal('2.00'), Decimal('52')), ('C-', Decimal('1.70'), Decimal('47')),
+    ('D+', Decimal('1.30'), Decimal('42')), ('D', Decimal('1.00'), Decimal('37')),
+    ('F', Decimal('0.00'), Decimal('25')),
+]
+GRADE_WEIGHTS = [8, 10, 12, 14, 12, 10, 9, 7, 6, 5, 7]
+
+PAYMENT_METHODS = ['mpesa', 'bank_transfer', 'online', 'card', 'cash']
+DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']
+SLOT_TIMES = [(time(8), time(10)), (time(10), time(12)), (time(13), time(15)), (time(15), time(17))]
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic synthetic university of configurable size for load and benchmark testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=5000, help='Number of students to create')
+        parser.add_argument('--lecturers', type=int, default=200, help='Number of lecturers to create')
+        parser.add_argument('--years', type=int, default=5, help='Number of academic years of history')
+        parser.add_argument('--faculties', type=int, default=6, help='Number of faculties')
+        parser.add_argument('--departments-per-faculty', type=int, default=4)
+        parser.add_argument('--programmes-per-department', type=int, default=3)
+        parser.add_argument('--units-per-semester', type=int, default=6,
+                            help='Mandatory units per programme per year/semester')
+        parser.add_argument('--hostels', type=int, default=6, help='Number of hostels (half boys, half girls)')
+        parser.add_argument('--rooms-per-hostel', type=int, default=100)
+        parser.add_argument('--attendance-weeks', type=int, default=4,
+                            help='Weeks of attendance to record for the current semester')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for a reproducible dataset')
+        parser.add_argument('--prefix', type=str, default='GEN',
+                            help='Code prefix (max 4 chars) used to namespace all generated records')
+        parser.add_argument('--password', type=str, default='cp7kvt',
+                            help='Shared password for every generated account')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per bulk INSERT')
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def log(self, message, level='INFO'):
+        timestamp = timezone.now().strftime('%H:%M:%S')
+        if level == 'SUCCESS':
+            self.stdout.write(self.style.SUCCESS(f"[{timestamp}] {message}"))
+        elif level == 'WARNING':
+            self.stdout.write(self.style.WARNING(f"[{timestamp}] {message}"))
+        else:
+            self.stdout.write(f"[{timestamp}] {message}")
+
+    def bulk(self, model, objects):
+        """bulk_create in batches and return the number of rows written"""
+        if objects:
+            model.objects.bulk_create(objects, batch_size=self.batch_size)
+        return len(objects)
+
+    def person(self):
+        gender = self.rng.choice(['male', 'female'])
+        first_names = FIRST_NAMES_MALE if gender == 'male' else FIRST_NAMES_FEMALE
+        return gender, self.rng.choice(first_names), self.rng.choice(LAST_NAMES)
+
+    def make_users(self, rows):
+        """
+        Bulk insert users and return {username: id}. Ids are read back by
+        username so the command works on backends without RETURNING support.
+        """
+        users = [
+            User(
+                username=username,
+                password=self.password_hash,
+                first_name=first_name,
+                last_name=last_name,
+                email=f"{username.replace('/', '.').lower()}@example.ac.ke",
+                user_type=user_type,
+                gender=gender,
+                phone=f"07{self.rng.randint(10000000, 99999999)}",
+                is_active=True,
+            )
+            for username, user_type, gender, first_name, last_name in rows
+        ]
+        self.bulk(User, users)
+
+        usernames = [row[0] for row in rows]
+        ids = {}
+        for start in range(0, len(usernames), 900):
+            ids.update(User.objects.filter(
+                username__in=usernames[start:start + 900]
+            ).values_list('username', 'id'))
+        return ids
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix'].upper()
+        self.batch_size = options['batch_size']
+        self.options = options
+
+        if not self.prefix.isalnum() or len(self.prefix) > 4:
+            raise CommandError('--prefix must be 1-4 alphanumeric characters.')
+        if Faculty.objects.filter(code__startswith=f"{self.prefix}F").exists():
+            raise CommandError(f"Data with prefix '{self.prefix}' already exists. Use a different --prefix.")
+
+        # Hash once and share across every generated account
+        self.password_hash = make_password(options['password'])
+
+        self.log(f"🏗️  Generating university '{self.prefix}' with seed {options['seed']}")
+
+        with transaction.atomic():
+            self.create_calendar()
+            self.create_structure()
+            self.create_curriculum()
+            self.create_staff_accounts()
+            self.create_lecturers()
+            self.create_fee_structures()
+        self.create_students()
+        with transaction.atomic():
+            self.create_hostels()
+
+        # bulk_create skips the signals that maintain the search index
+        self.summary['search entries'] = sum(rebuild_search_index().values())
+        # bulk_create and bulk_update skip the signals that version these caches
+        roles_changed()
+        reference_data_changed()
+        # Reports only read the fact tables; fill them now rather than
+        # waiting for the next scheduled refresh
+        refresh_facts()
+
+        self.log("🎉 Synthetic university generated successfully", 'SUCCESS')
+        for label, value in self.summary.items():
+            self.stdout.write(f"   {label:<22} {value:>10,}")
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def create_calendar(self):
+        """Academic years and two semesters each, ending with the current year"""
+        self.summary = {}
+        today = self.today = timezone.now().date()
+        last_start = today.year if today.month >= 9 else today.year - 1
+        first_start = last_start - self.options['years'] + 1
+
+        self.academic_years = []
+        self.semesters = []
+        self.semester_year_index = {}
+        for start_year in range(first_start, last_start + 1):
+            academic_year, _ = AcademicYear.objects.get_or_create(
+                year=f"{start_year}/{start_year + 1}",
+                defaults={
+                    'start_date': date(start_year, 9, 1),
+                    'end_date': date(start_year + 1, 6, 30),
+                },
+            )
+            self.academic_years.append(academic_year)
+
+            for number, start, end in [
+                (1, date(start_year, 9, 1), date(start_year, 12, 20)),
+                (2, date(start_year + 1, 1, 10), date(start_year + 1, 4, 30)),
+            ]:
+                semester, _ = Semester.objects.get_or_create(
+                    academic_year=academic_year,
+                    semester_number=number,
+                    defaults={
+                        'start_date': start,
+                        'end_date': end,
+                        'registration_start_date': start - timedelta(days=14),
+                        'registration_end_date': start + timedelta(days=14),
+                    },
+                )
+                self.semesters.append(semester)
+                self.semester_year_index[semester.id] = len(self.academic_years) - 1
+
+        # The generated "now" is semester 1 of the last academic year
+        self.current_academic_year = self.academic_years[-1]
+        self.current_semester = self.semesters[-2]
+        if not AcademicYear.objects.filter(is_current=True).exists():
+            AcademicYear.objects.filter(pk=self.current_academic_year.pk).update(is_current=True)
+        if not Semester.objects.filter(is_current=True).exists():
+            Semester.objects.filter(pk=self.current_semester.pk).update(is_current=True)
+
+        self.summary['academic years'] = len(self.academic_years)
+        self.log(f"📅 Calendar: {len(self.academic_years)} academic years, {len(self.semesters)} semesters")
+
+    def create_structure(self):
+        """Faculties, departments and programmes"""
+        established = date(2000, 1, 1)
+        faculties = [
+            Faculty(
+                name=f"{self.prefix} Faculty of {SUBJECT_WORDS[i % len(SUBJECT_WORDS)]} {i + 1}",
+                code=f"{self.prefix}F{i:02d}",
+                established_date=established,
+            )
+            for i in range(self.options['faculties'])
+        ]
+        self.bulk(Faculty, faculties)
+        self.faculties = list(Faculty.objects.filter(code__startswith=f"{self.prefix}F").order_by('code'))
+
+        departments = []
+        for faculty in self.faculties:
+            for _ in range(self.options['departments_per_faculty']):
+                index = len(departments)
+                departments.append(Department(
+                    name=f"Department of {self.rng.choice(SUBJECT_WORDS)} {index + 1}",
+                    code=f"{self.prefix}D{index:03d}",
+                    faculty=faculty,
+                    established_date=established,
+                ))
+        self.bulk(Department, departments)
+        self.departments = list(Department.objects.filter(code__startswith=f"{self.prefix}D").order_by('code'))
+
+        programmes = []
+        for department in self.departments:
+            for _ in range(self.options['programmes_per_department']):
+                index = len(programmes)
+                is_diploma = self.rng.random() < 0.25
+                duration = 2 if is_diploma else 4
+                programmes.append(Programme(
+                    name=f"{'Diploma' if is_diploma else 'Bachelor'} in {self.rng.choice(SUBJECT_WORDS)} {index + 1}",
+                    code=f"{self.prefix}P{index:03d}",
+                    programme_type='diploma' if is_diploma else 'bachelor',
+                    duration_years=duration,
+                    semesters_per_year=2,
+                    total_semesters=duration * 2,
+                    credit_hours_required=max(60, duration * 36),
+                    entry_requirements='KCSE C+ and above',
+                    department=department,
+                    faculty_id=department.faculty_id,
+                ))
+        self.bulk(Programme, programmes)
+        self.programmes = list(Programme.objects.filter(code__startswith=f"{self.prefix}P").order_by('code'))
+        self.programme_index = {programme.id: index for index, programme in enumerate(self.programmes)}
+
+        self.summary['faculties'] = len(self.faculties)
+        self.summary['departments'] = len(self.departments)
+        self.summary['programmes'] = len(self.programmes)
+        self.log(f"🏛️  Structure: {len(self.faculties)} faculties, {len(self.departments)} departments, "
+                 f"{len(self.programmes)} programmes")
+
+    def create_curriculum(self):
+        """Courses and mandatory ProgrammeCourse units for every year/semester"""
+        units = self.options['units_per_semester']
+        courses = []
+        slots = []  # (programme, year, semester) per course, in creation order
+        for programme in self.programmes:
+            for year in range(1, programme.duration_years + 1):
+                for semester in (1, 2):
+                    for _ in range(units):
+                        index = len(courses)
+                        courses.append(Course(
+                            name=f"{self.rng.choice(SUBJECT_WORDS)} {year}{semester}{index % 100:02d}",
+                            code=f"{self.prefix}C{index:05d}",
+                            course_type='core',
+                            level=str(year * 100),
+                            credit_hours=self.rng.choice([3, 3, 3, 4]),
+                            lecture_hours=3,
+                            department_id=programme.department_id,
+                        ))
+                        slots.append((programme, year, semester))
+        self.bulk(Course, courses)
+
+        course_ids = dict(Course.objects.filter(
+            code__startswith=f"{self.prefix}C"
+        ).values_list('code', 'id'))
+        self.course_credits = dict(Course.objects.filter(
+            code__startswith=f"{self.prefix}C"
+        ).values_list('id', 'credit_hours'))
+
+        # (programme_id, year, semester) -> [course_id, ...]
+        self.curriculum = defaultdict(list)
+        self.course_department = {}
+        programme_courses = []
+        for course, (programme, year, semester) in zip(courses, slots):
+            course_id = course_ids[course.code]
+            self.curriculum[(programme.id, year, semester)].append(course_id)
+            self.course_department[course_id] = programme.department_id
+            programme_courses.append(ProgrammeCourse(
+                programme=programme, course_id=course_id,
+                year=year, semester=semester, is_mandatory=True,
+            ))
+        self.bulk(ProgrammeCourse, programme_courses)
+
+        self.summary['courses'] = len(courses)
+        self.log(f"📚 Curriculum: {len(courses)} courses mapped to programmes")
+
+    def create_staff_accounts(self):
+        """Deans, CODs, a finance officer and hostel wardens"""
+        rows = []
+        for faculty in self.faculties:
+            gender, first, last = self.person()
+            rows.append((f"{self.prefix.lower()}.dean.{faculty.code.lower()}", 'dean', gender, first, last))
+        for department in self.departments:
+            gender, first, last = self.person()
+            rows.append((f"{self.prefix.lower()}.cod.{department.code.lower()}", 'cod', gender, first, last))
+        gender, first, last = self.person()
+        rows.append((f"{self.prefix.lower()}.finance", 'finance', gender, first, last))
+        for index in range(self.options['hostels']):
+            gender, first, last = self.person()
+            rows.append((f"{self.prefix.lower()}.warden.{index + 1}", 'hostel_warden', gender, first, last))
+
+        ids = self.make_users(rows)
+
+        for faculty in self.faculties:
+            faculty.dean_id = ids[f"{self.prefix.lower()}.dean.{faculty.code.lower()}"]
+        Faculty.objects.bulk_update(self.faculties, ['dean'], batch_size=self.batch_size)
+        for department in self.departments:
+            department.head_of_department_id = ids[f"{self.prefix.lower()}.cod.{department.code.lower()}"]
+        Department.objects.bulk_update(self.departments, ['head_of_department'], batch_size=self.batch_size)
+
+        self.warden_ids = [ids[f"{self.prefix.lower()}.warden.{i + 1}"] for i in range(self.options['hostels'])]
+        self.finance_user_id = ids[f"{self.prefix.lower()}.finance"]
+        self.summary['staff accounts'] = len(rows)
+
+    def create_lecturers(self):
+        """Lecturers spread across departments, plus course assignments for every semester"""
+        rows = []
+        for index in range(self.options['lecturers']):
+            gender, first, last = self.person()
+            rows.append((f"{self.prefix}L{index:05d}", 'lecturer', gender, first, last))
+        ids = self.make_users(rows)
+
+        lecturers = []
+        for index, (username, *_rest) in enumerate(rows):
+            lecturers.append(Lecturer(
+                user_id=ids[username],
+                employee_number=username,
+                academic_rank=self.rng.choice(['lecturer', 'senior_lecturer', 'assistant_lecturer', 'professor']),
+                highest_qualification=self.rng.choice(['PhD', 'MSc', 'MA']),
+                joining_date=date(2010 + index % 12, 1, 1),
+                department=self.departments[index % len(self.departments)],
+            ))
+        self.bulk(Lecturer, lecturers)
+
+        by_department = defaultdict(list)
+        for lecturer_id, department_id in Lecturer.objects.filter(
+            employee_number__startswith=f"{self.prefix}L"
+        ).order_by('id').values_list('id', 'department_id'):
+            by_department[department_id].append(lecturer_id)
+        all_lecturers = [lid for ids_ in by_department.values() for lid in ids_]
+
+        # One lecturer teaches a course every time it runs
+        self.course_lecturer = {}
+        for course_id, department_id in self.course_department.items():
+            pool = by_department.get(department_id) or all_lecturers
+            self.course_lecturer[course_id] = self.rng.choice(pool) if pool else None
+
+        assignments = []
+        for semester in self.semesters:
+            for (programme_id, year, number), course_ids in self.curriculum.items():
+                if number != semester.semester_number:
+                    continue
+                for course_id in course_ids:
+                    if self.course_lecturer[course_id]:
+                        assignments.append(LecturerCourseAssignment(
+                            lecturer_id=self.course_lecturer[course_id],
+                            course_id=course_id,
+                            academic_year_id=semester.academic_year_id,
+                            semester=semester,
+                        ))
+        self.bulk(LecturerCourseAssignment, assignments)
+
+        self.summary['lecturers'] = len(lecturers)
+        self.summary['course assignments'] = len(assignments)
+        self.log(f"👩‍🏫 Lecturers: {len(lecturers)} created, {len(assignments)} course assignments")
+
+    def create_fee_structures(self):
+        """One fee structure per programme, academic year, year of study and semester"""
+        structures = []
+        for programme in self.programmes:
+            base = Decimal('45000') if programme.programme_type == 'diploma' else Decimal('60000')
+            for index, academic_year in enumerate(self.academic_years):
+                tuition = base * (Decimal('1.05') ** index)
+                for year in range(1, programme.duration_years + 1):
+                    for semester in (1, 2):
+                        structures.append(FeeStructure(
+                            programme=programme,
+                            academic_year=academic_year,
+                            year=year,
+                            semester=semester,
+                            tuition_fee=tuition.quantize(Decimal('1')),
+                            registration_fee=Decimal('5000'),
+                            examination_fee=Decimal('3000'),
+                            library_fee=Decimal('1500'),
+                            technology_fee=Decimal('2000'),
+                            medical_fee=Decimal('1500'),
+                        ))
+        self.bulk(FeeStructure, structures)
+
+        self.fee_structures = {}
+        for fs_id, programme_id, ay_id, year, semester, tuition in FeeStructure.objects.filter(
+            programme__code__startswith=f"{self.prefix}P"
+        ).values_list('id', 'programme_id', 'academic_year_id', 'year', 'semester', 'tuition_fee'):
+            self.fee_structures[(programme_id, ay_id, year, semester)] = (fs_id, tuition + Decimal('13000'))
+
+        self.summary['fee structures'] = len(structures)
+
+    def create_students(self):
+        """
+        Students by admission cohort with their full history. Work is done in
+        batches of students so memory stays bounded at any dataset size.
+        """
+        total = self.options['students']
+        years = len(self.academic_years)
+        self.receipt_seq = 0
+        self.student_genders = {}
+        counts = defaultdict(int)
+
+        # Pre-build timetable slots and attendance sessions for the current semester
+        self.create_timetable()
+
+        plan = []
+        for index in range(total):
+            cohort = index % years
+            programme = self.programmes[(index // years) % len(self.programmes)]
+            plan.append((index, cohort, programme))
+
+        batch = 500
+        for start in range(0, len(plan), batch):
+            with transaction.atomic():
+                for key, value in self.create_student_batch(plan[start:start + batch]).items():
+                    counts[key] += value
+            self.log(f"🎓 Students {min(start + batch, total):,}/{total:,}")
+
+        self.summary.update(counts)
+
+    def create_student_batch(self, plan):
+        years = len(self.academic_years)
+        rows = []
+        meta = {}
+        for index, cohort, programme in plan:
+            admission_year = self.academic_years[cohort].start_date.year
+            username = f"{self.prefix}{self.programme_index[programme.id]:03d}/{index:05d}/{admission_year}"
+            gender, first, last = self.person()
+            rows.append((username, 'student', gender, first, last))
+            meta[username] = (index, cohort, programme, gender)
+
+        ids = self.make_users(rows)
+
+        students = []
+        for username, (index, cohort, programme, gender) in meta.items():
+            year_of_study = years - cohort
+            graduated = year_of_study > programme.duration_years
+            admission = self.academic_years[cohort].start_date
+            students.append(Student(
+                user_id=ids[username],
+                student_id=username.replace('/', '-'),
+                programme=programme,
+                current_year=min(year_of_study, programme.duration_years),
+                current_semester=1,
+                admission_date=admission,
+                sponsor_type=self.rng.choice(['government', 'government', 'self', 'scholarship', 'loan']),
+                status='graduated' if graduated else 'active',
+                entry_qualification='KCSE',
+                entry_points=Decimal(self.rng.randint(50, 84)),
+                expected_graduation_date=date(admission.year + programme.duration_years, 6, 30),
+                guardian_name=f"{self.rng.choice(FIRST_NAMES_MALE)} {self.rng.choice(LAST_NAMES)}",
+                guardian_phone=f"07{self.rng.randint(10000000, 99999999)}",
+                guardian_relationship=self.rng.choice(['Father', 'Mother', 'Guardian']),
+                guardian_address='P.O. Box 100, Nairobi',
+                emergency_contact=f"07{self.rng.randint(10000000, 99999999)}",
+            ))
+        self.bulk(Student, students)
+
+        student_rows = list(Student.objects.filter(
+            user_id__in=list(ids.values())
+        ).order_by('id').values_list('id', 'user_id', 'programme_id', 'admission_date', 'status'))
+        user_gender = {ids[username]: meta[username][3] for username in meta}
+
+        enrollments = []
+        payments = []
+        for student_id, user_id, programme_id, admission_date, status in student_rows:
+            self.student_genders[student_id] = (user_gender[user_id], status)
+            programme_duration = self.programme_duration(programme_id)
+            cohort = self.academic_year_index(admission_date)
+
+            for semester in self.semesters:
+                if semester.start_date > self.current_semester.start_date:
+                    break
+                year_of_study = self.semester_year_index[semester.id] - cohort + 1
+                if year_of_study < 1 or year_of_study > programme_duration:
+                    continue
+
+                for course_id in self.curriculum[(programme_id, year_of_study, semester.semester_number)]:
+                    enrollments.append(Enrollment(
+                        student_id=student_id,
+                        course_id=course_id,
+                        semester=semester,
+                        lecturer_id=self.course_lecturer.get(course_id),
+                    ))
+
+                fee_structure = self.fee_structures.get(
+                    (programme_id, semester.academic_year_id, year_of_study, semester.semester_number)
+                )
+                if fee_structure:
+                    payments.extend(self.build_payments(student_id, semester, *fee_structure))
+
+        self.bulk(Enrollment, enrollments)
+        self.bulk(FeePayment, payments)
+
+        student_ids = [row[0] for row in student_rows]
+        grades, attendance = self.build_results(student_ids)
+        self.bulk(Grade, grades)
+        self.bulk(Attendance, attendance)
+
+        return {
+            'students': len(students),
+            'enrollments': len(enrollments),
+            'grades': len(grades),
+            'fee payments': len(payments),
+            'attendance records': len(attendance),
+        }
+
+    def build_payments(self, student_id, semester, fee_structure_id, total_fee):
+        """Between zero and two instalments towards a semester's fees, none in the future"""
+        if semester.start_date > self.today:
+            return []
+        paid_ratio = self.rng.choice([Decimal('1'), Decimal('1'), Decimal('0.75'), Decimal('0.5'), Decimal('0')])
+        amount = (total_fee * paid_ratio).quantize(Decimal('1'))
+        if not amount:
+            return []
+
+        instalments = [amount] if self.rng.random() < 0.6 else [amount / 2, amount - amount / 2]
+        payments = []
+        for offset, instalment in enumerate(instalments):
+            self.receipt_seq += 1
+            method = self.rng.choice(PAYMENT_METHODS)
+            payments.append(FeePayment(
+                student_id=student_id,
+                fee_structure_id=fee_structure_id,
+                receipt_number=f"{self.prefix}-RCP-{self.receipt_seq:08d}",
+                amount_paid=instalment.quantize(Decimal('0.01')),
+                payment_date=min(
+                    semester.start_date + timedelta(days=self.rng.randint(0, 30) + offset * 45), self.today
+                ),
+                payment_method=method,
+                payment_status='completed',
+                transaction_reference=f"{self.prefix}TX{self.receipt_seq:010d}",
+                mpesa_receipt=f"{self.prefix}MP{self.receipt_seq:08d}" if method == 'mpesa' else '',
+                processed_by_id=self.finance_user_id,
+            ))
+        return payments
+
+    def build_results(self, student_ids):
+        """Grades for completed semesters and attendance for the current one"""
+        grades = []
+        attendance = []
+        past_semesters = [s.id for s in self.semesters if s.start_date < self.current_semester.start_date]
+
+        rows = Enrollment.objects.filter(student_id__in=student_ids).order_by('id').values_list(
+            'id', 'student_id', 'course_id', 'semester_id'
+        )
+        for enrollment_id, student_id, course_id, semester_id in rows:
+            if semester_id in past_semesters:
+                grade, points, marks = self.rng.choices(GRADE_OPTIONS, weights=GRADE_WEIGHTS)[0]
+                credits = self.course_credits[course_id]
+                grades.append(Grade(
+                    enrollment_id=enrollment_id,
+                    continuous_assessment=(marks * Decimal('0.4')).quantize(Decimal('0.01')),
+                    final_exam=(marks * Decimal('0.6')).quantize(Decimal('0.01')),
+                    total_marks=marks,
+                    grade=grade,
+                    grade_points=points,
+                    quality_points=points * credits,
+                    is_passed=grade != 'F',
+                ))
+            elif semester_id == self.current_semester.id:
+                for week, session_id, slot_id in self.sessions.get(course_id, ()):
+                    attendance.append(Attendance(
+                        student_id=student_id,
+                        timetable_slot_id=slot_id,
+                        attendance_session_id=session_id,
+                        week_number=week,
+                        status=self.rng.choices(['present', 'absent', 'late'], weights=[80, 12, 8])[0],
+                        marked_via_qr=True,
+                    ))
+        return grades, attendance
+
+    def create_timetable(self):
+        """Timetable slots and weekly attendance sessions for the current semester"""
+        semester = self.current_semester
+        slots = []
+        for (programme_id, year, number), course_ids in self.curriculum.items():
+            if number != semester.semester_number:
+                continue
+            for position, course_id in enumerate(course_ids):
+                if not self.course_lecturer[course_id]:
+                    continue
+                start, end = SLOT_TIMES[position % len(SLOT_TIMES)]
+                slots.append(Timetable(
+                    programme_id=programme_id,
+                    course_id=course_id,
+                    lecturer_id=self.course_lecturer[course_id],
+                    semester=semester,
+                    day_of_week=DAYS[position % len(DAYS)],
+                    start_time=start,
+                    end_time=end,
+                    venue=f"LH {1 + position % 20}",
+                    year=year,
+                    semester_number=number,
+                ))
+        self.bulk(Timetable, slots)
+
+        slot_rows = list(Timetable.objects.filter(
+            semester=semester, course__code__startswith=f"{self.prefix}C"
+        ).order_by('id').values_list('id', 'course_id', 'lecturer_id'))
+
+        sessions = []
+        for slot_id, course_id, lecturer_id in slot_rows:
+            for week in range(1, self.options['attendance_weeks'] + 1):
+                session_date = semester.start_date + timedelta(weeks=week - 1)
+                sessions.append(AttendanceSession(
+                    timetable_slot_id=slot_id,
+                    lecturer_id=lecturer_id,
+                    semester=semester,
+                    week_number=week,
+                    session_date=session_date,
+                    session_token=f"{self.prefix}-{slot_id}-{week}",
+                    expires_at=timezone.make_aware(
+                        datetime.combine(session_date, time(18))
+                    ),
+                    is_active=False,
+                ))
+        self.bulk(AttendanceSession, sessions)
+
+        # course_id -> [(week, session_id, slot_id), ...]
+        self.sessions = defaultdict(list)
+        for session_id, slot_id, course_id, week in AttendanceSession.objects.filter(
+            session_token__startswith=f"{self.prefix}-"
+        ).order_by('id').values_list('id', 'timetable_slot_id', 'timetable_slot__course_id', 'week_number'):
+            self.sessions[course_id].append((week, session_id, slot_id))
+
+        self.summary['timetable slots'] = len(slots)
+
+    def create_hostels(self):
+        """Hostels, rooms and beds for the current year, filled with bookings and payments"""
+        academic_year = self.current_academic_year
+        hostels = []
+        for index in range(self.options['hostels']):
+            hostels.append(Hostel(
+                name=f"{self.prefix} Hostel {index + 1}",
+                hostel_type='boys' if index % 2 == 0 else 'girls',
+                total_rooms=self.options['rooms_per_hostel'],
+                school=self.departments[index % len(self.departments)],
+                warden_id=self.warden_ids[index],
+                facilities='WiFi, Laundry, Common Room',
+            ))
+        self.bulk(Hostel, hostels)
+        hostel_rows = list(Hostel.objects.filter(
+            name__startswith=f"{self.prefix} Hostel "
+        ).order_by('id').values_list('id', 'hostel_type'))
+
+        rooms = [
+            Room(hostel_id=hostel_id, room_number=f"R{number:03d}", floor=number // 25, capacity=4)
+            for hostel_id, _ in hostel_rows
+            for number in range(1, self.options['rooms_per_hostel'] + 1)
+        ]
+        self.bulk(Room, rooms)
+        room_rows = list(Room.objects.filter(
+            hostel_id__in=[hostel_id for hostel_id, _ in hostel_rows]
+        ).order_by('id').values_list('id', 'hostel__hostel_type', 'room_number', 'hostel_id'))
+
+        beds = [
+            Bed(
+                room_id=room_id,
+                academic_year=academic_year,
+                bed_position=f"bed_{position}",
+                bed_number=f"H{hostel_id}-{room_number}-B{position}",
+            )
+            for room_id, _, room_number, hostel_id in room_rows
+            for position in range(1, 5)
+        ]
+        self.bulk(Bed, beds)
+
+        free_beds = {'boys': [], 'girls': []}
+        for bed_id, hostel_type in Bed.objects.filter(
+            room__hostel_id__in=[hostel_id for hostel_id, _ in hostel_rows],
+            academic_year=academic_year,
+        ).order_by('id').values_list('id', 'room__hostel__hostel_type'):
+            free_beds[hostel_type].append(bed_id)
+
+        bookings = []
+        booked_beds = []
+        for student_id, (gender, status) in self.student_genders.items():
+            if status != 'active' or self.rng.random() > 0.6:
+                continue
+            pool = free_beds['boys' if gender == 'male' else 'girls']
+            if not pool:
+                continue
+            bed_id = pool.pop()
+            booked_beds.append(bed_id)
+            fee = Decimal('15000')
+            paid = self.rng.choice([fee, fee, fee / 2, Decimal('0')])
+            bookings.append(HostelBooking(
+                student_id=student_id,
+                bed_id=bed_id,
+                academic_year=academic_year,
+                booking_status=self.rng.choice(['approved', 'checked_in', 'checked_in', 'pending']),
+                payment_status='paid' if paid == fee else ('partial' if paid else 'pending'),
+                booking_fee=fee,
+                amount_paid=paid,
+                check_in_date=academic_year.start_date,
+            ))
+        self.bulk(HostelBooking, bookings)
+        Bed.objects.filter(id__in=booked_beds).update(is_available=False)
+
+        hostel_payments = []
+        for booking_id, amount_paid in HostelBooking.objects.filter(
+            bed_id__in=booked_beds, amount_paid__gt=0
+        ).order_by('id').values_list('id', 'amount_paid'):
+            hostel_payments.append(HostelPayment(
+                booking_id=booking_id,
+                amount=amount_paid,
+                payment_date=academic_year.start_date + timedelta(days=self.rng.randint(0, 20)),
+                payment_method=self.rng.choice(['mobile_money', 'bank_transfer', 'cash']),
+                receipt_number=f"{self.prefix}-HST-{booking_id:08d}",
+                received_by_id=self.warden_ids[0] if self.warden_ids else None,
+            ))
+        self.bulk(HostelPayment, hostel_payments)
+
+        self.summary['hostel beds'] = len(beds)
+        self.summary['hostel bookings'] = len(bookings)
+        self.log(f"🏠 Hostels: {len(hostels)} hostels, {len(beds)} beds, {len(bookings)} bookings")
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def programme_duration(self, programme_id):
+        if not hasattr(self, '_durations'):
+            self._durations = {p.id: p.duration_years for p in self.programmes}
+        return self._durations[programme_id]
+
+    def academic_year_index(self, day):
+        """Index of the generated academic year containing ``day``"""
+        for index, academic_year in enumerate(self.academic_years):
+            if academic_year.start_date <= day <= academic_year.end_date:
+                return index
+        return 0
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from core_application.models_outbox import OutboundMessage
+from core_application.outbox import process_outbox, retry_failed
+
+
+class Command(BaseCommand):
+    help = "Deliver the email and SMS waiting in the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Messages claimed per batch (default OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--channel', choices=[code for code, _ in OutboundMessage.CHANNELS])
+        parser.add_argument('--retry-failed', action='store_true', help='Queue failed messages again first')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling the outbox instead of exiting once it is empty'
+        )
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        channels = [options['channel']] if options['channel'] else ['email', 'sms']
+        if options['retry_failed']:
+            queued = retry_failed(OutboundMessage.objects.filter(channel__in=channels))
+            self.stdout.write(f"🔁 {queued} failed message(s) queued again")
+
+        while True:
+            totals = process_outbox(batch_size=options['batch_size'], channels=channels)
+            for channel, counts in totals.items():
+                if any(counts.values()):
+                    summary = ', '.join(f"{count} {outcome}" for outcome, count in counts.items() if count)
+                    self.stdout.write(f"📤 {channel}: {summary}")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS("✅ Outbox drained."))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from core_application.webhook_inbox import process_inbox
+
+
+class Command(BaseCommand):
+    help = "Post the bank and M-Pesa payment callbacks waiting in the webhook inbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Worker threads (default WEBHOOK_INBOX_WORKERS)')
+        parser.add_argument('--batch-size', type=int, help='Items claimed per batch (default WEBHOOK_INBOX_BATCH_SIZE)')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling the inbox instead of exiting once it is empty'
+        )
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            counts = process_inbox(workers=options['workers'], batch_size=options['batch_size'])
+            if counts:
+                summary = ', '.join(f"{count} {outcome}" for outcome, count in sorted(counts.items()))
+                self.stdout.write(f"📥 Webhook inbox: {summary}")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS("✅ Webhook inbox drained."))
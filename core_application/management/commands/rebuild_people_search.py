@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from core_application.people_search import PERSON_MODELS, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the people search index used by the student, lecturer and staff search boxes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', action='append', choices=list(PERSON_MODELS), dest='person_types',
+            help='Only rebuild entries of this person type (can be repeated)'
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        counts = rebuild_search_index(options['person_types'], batch_size=options['batch_size'])
+        for person_type, count in counts.items():
+            self.stdout.write(f"🔎 {person_type}: {count} entries indexed")
+        self.stdout.write(self.style.SUCCESS("✅ People search index rebuilt."))
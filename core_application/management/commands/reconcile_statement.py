@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core_application.models_reconciliation import BankStatement
+from core_application.reconciliation import StatementError, reconcile_statement
+
+
+class Command(BaseCommand):
+    help = "Reconcile bank or M-Pesa statement CSV files against posted fee payments."
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='Statement CSV file(s)')
+        parser.add_argument(
+            '--source', choices=[code for code, _ in BankStatement.SOURCES],
+            help='Statement layout (detected from the header by default)'
+        )
+
+    def handle(self, *args, **options):
+        failed = 0
+        for path in options['files']:
+            started = time.perf_counter()
+            try:
+                with open(path, 'rb') as fileobj:
+                    statement = reconcile_statement(fileobj, source=options['source'], file_name=path)
+            except (OSError, StatementError) as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"❌ {path}: {e}"))
+                continue
+
+            self.stdout.write(
+                f"🏦 {path} ({statement.get_source_display()}): {statement.line_count} lines, "
+                f"{statement.matched_count} matched, {statement.exception_count} exceptions, "
+                f"{statement.skipped_count} skipped in {time.perf_counter() - started:.1f}s"
+            )
+
+        if failed:
+            raise CommandError(f"❌ {failed} statement(s) could not be reconciled")
+        self.stdout.write(self.style.SUCCESS("✅ Done."))
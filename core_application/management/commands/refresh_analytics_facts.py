@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from core_application.analytics_facts import FACTS, refresh_facts
+
+
+class Command(BaseCommand):
+    help = "Refresh the pre-aggregated enrollment, grade, fee and student fact tables used by the dean and COD reports."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Rebuild every partition instead of only the ones whose source rows changed'
+        )
+        parser.add_argument(
+            '--fact', action='append', choices=list(FACTS),
+            help='Only refresh this fact table (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        summary = refresh_facts(full=options['full'], facts=options['fact'])
+        if summary is None:
+            raise CommandError("❌ A fact refresh is already running.")
+
+        for fact, result in summary.items():
+            self.stdout.write(
+                f"📊 {fact}: {result['rebuilt']} partition(s) rebuilt, {result['removed']} removed"
+            )
+        self.stdout.write(self.style.SUCCESS("✅ Analytics facts are up to date."))
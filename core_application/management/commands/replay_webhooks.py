@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime, parse_date
+
+from core_application.models_webhooks import WebhookInboxItem
+from core_application.webhook_inbox import process_inbox, replay
+
+
+class Command(BaseCommand):
+    help = "Queue failed webhook inbox items for another attempt (and optionally post them now)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--id', type=int, action='append', dest='ids', help='Inbox item id (can be repeated)')
+        parser.add_argument('--provider', choices=[code for code, _ in WebhookInboxItem.PROVIDERS])
+        parser.add_argument('--since', help='Only items received at or after this date/time')
+        parser.add_argument(
+            '--stuck', action='store_true',
+            help='Also release items left in processing by a crashed worker'
+        )
+        parser.add_argument('--process', action='store_true', help='Process the inbox after queueing')
+
+    def handle(self, *args, **options):
+        statuses = ['failed', 'processing'] if options['stuck'] else ['failed']
+        items = WebhookInboxItem.objects.filter(status__in=statuses)
+        if options['ids']:
+            items = items.filter(id__in=options['ids'])
+        if options['provider']:
+            items = items.filter(provider=options['provider'])
+        if options['since']:
+            since = parse_datetime(options['since']) or parse_date(options['since'])
+            if since is None:
+                raise CommandError(f"❌ Cannot parse --since {options['since']!r}")
+            items = items.filter(received_at__gte=since)
+
+        queued = replay(items)
+        self.stdout.write(f"🔁 {queued} webhook(s) queued for replay")
+
+        if options['process'] and queued:
+            counts = process_inbox()
+            summary = ', '.join(f"{count} {outcome}" for outcome, count in sorted(counts.items()))
+            self.stdout.write(f"📥 Webhook inbox: {summary or 'nothing to do'}")
+        self.stdout.write(self.style.SUCCESS("✅ Done."))
@@ -0,0 +1,190 @@
+# media_delivery.py - Streaming delivery of uploaded files behind access checks
+#
+# serve_file() is the one way views hand out course notes, exam materials and
+# assignment submissions:
+#
+#   - Files are streamed in blocks with FileResponse, never read into memory.
+#   - Conditional requests (If-None-Match / If-Modified-Since) get a 304 and
+#     single byte ranges (Range / If-Range) a 206, so videos can seek and
+#     interrupted downloads resume.
+#   - With MEDIA_DELIVERY_OFFLOAD the front proxy sends the file instead:
+#     'x-sendfile' (Apache/lighttpd) or 'x-accel-redirect' (nginx, internal
+#     location MEDIA_ACCEL_REDIRECT_PREFIX mapped to MEDIA_ROOT).
+#
+# Access checks (is the student enrolled / does the lecturer teach the course
+# this semester) are cached per user and course for MEDIA_ACCESS_CACHE_TTL,
+# keyed by the 'enrollments' analytics version so enrolment changes apply at
+# once.
+
+import hashlib
+import logging
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+from .analytics_cache import get_entity_versions
+from .models import Enrollment, LecturerCourseAssignment
+
+logger = logging.getLogger(__name__)
+
+ACCESS_KEY = 'media:access:{}:{}:{}:{}:{}'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+# =============================================================================
+# Access checks
+# =============================================================================
+
+def _cached_check(kind, user, course_id, semester_id, check):
+    version = get_entity_versions(['enrollments'])['enrollments']
+    key = ACCESS_KEY.format(kind, user.pk, course_id, semester_id, version)
+    allowed = cache.get(key)
+    if allowed is None:
+        allowed = check()
+        cache.set(key, allowed, getattr(settings, 'MEDIA_ACCESS_CACHE_TTL', 300))
+    return allowed
+
+
+def is_enrolled(user, course_id, semester_id):
+    """Is ``user`` a student actively enrolled in the course this semester"""
+    return _cached_check('enrolled', user, course_id, semester_id, lambda: Enrollment.objects.filter(
+        student__user=user, course_id=course_id, semester_id=semester_id, is_active=True
+    ).exists())
+
+
+def teaches(user, course_id, semester_id):
+    """Is ``user`` the lecturer assigned to the course this semester"""
+    return _cached_check('teaches', user, course_id, semester_id, lambda: LecturerCourseAssignment.objects.filter(
+        lecturer__user=user, course_id=course_id, semester_id=semester_id
+    ).exists())
+
+
+# =============================================================================
+# Delivery
+# =============================================================================
+
+class _RangeFile:
+    """Read-only view of ``length`` bytes of ``file`` starting at ``start``"""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _parse_range(header, size):
+    """
+    (start, end) for a single satisfiable byte range, 'unsatisfiable', or None
+    to send the whole file (no header, or several/invalid ranges).
+    """
+    match = RANGE_RE.match(header.replace(' ', '')) if header else None
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if not length:
+            return 'unsatisfiable'
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return 'unsatisfiable'
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.headers.get('If-Range')
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith('W/'):
+        return value == etag
+    return parse_http_date_safe(value) == int(last_modified)
+
+
+def _offload_response(field_file, filename, as_attachment, content_type):
+    mode = getattr(settings, 'MEDIA_DELIVERY_OFFLOAD', '')
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type or '')
+        response['X-Sendfile'] = field_file.path
+    elif mode == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type or '')
+        prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + field_file.name.lstrip('/')
+    else:
+        return None
+    if not content_type:
+        # Let the proxy pick the type from the file name
+        del response['Content-Type']
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    return response
+
+
+def serve_file(request, field_file, filename=None, as_attachment=True, content_type=None,
+               record_download=None):
+    """
+    Deliver ``field_file`` (a FieldFile) to the client. ``record_download``
+    is called once per download: not for 304s or for ranges after the first
+    byte (a video player seeking through a lecture is one download).
+    """
+    storage = field_file.storage
+    filename = filename or field_file.name.rsplit('/', 1)[-1]
+    size = field_file.size
+    last_modified = storage.get_modified_time(field_file.name).timestamp()
+    etag = '"%s"' % hashlib.md5(f"{field_file.name}:{size}:{last_modified}".encode()).hexdigest()
+
+    response = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+    if response is not None:
+        return response
+
+    byte_range = None
+    if _if_range_matches(request, etag, last_modified):
+        byte_range = _parse_range(request.headers.get('Range'), size)
+    if byte_range == 'unsatisfiable':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if record_download is not None and (byte_range is None or byte_range[0] == 0):
+        record_download()
+
+    try:
+        local = bool(storage.path(field_file.name))
+    except NotImplementedError:
+        local = False
+    response = _offload_response(field_file, filename, as_attachment, content_type) if local else None
+    if response is None:
+        file = storage.open(field_file.name, 'rb')
+        if byte_range is None:
+            response = FileResponse(file, as_attachment=as_attachment, filename=filename)
+            response['Content-Length'] = str(size)
+        else:
+            start, end = byte_range
+            response = FileResponse(_RangeFile(file, start, end - start + 1),
+                                    as_attachment=as_attachment, filename=filename, status=206)
+            response['Content-Length'] = str(end - start + 1)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        if content_type:
+            response['Content-Type'] = content_type
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
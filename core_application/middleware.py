@@ -6,16 +6,16 @@ from django.utils.deprecation import MiddlewareMixin
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 from django.contrib.auth import get_user
+from django.utils.functional import SimpleLazyObject
+from django.conf import settings
 from .models import ActivityLog, PageVisit, UserSession
+from .ratelimit import client_ip
+from .role_context import RoleContext
+from .session_tracking import refresh_session, touch_session, track_session
 
 def get_client_ip(request):
     """Get client IP address"""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+    return client_ip(request)
 
 def get_user_agent(request):
     """Get user agent string"""
@@ -69,13 +69,9 @@ class ActivityTrackingMiddleware(MiddlewareMixin):
                     response_time=response_time
                 )
                 
-                # Update user session activity
+                # Update user session activity (at most once a minute)
                 if request.session.session_key:
-                    UserSession.objects.filter(
-                        session_key=request.session.session_key,
-                        user=user,
-                        is_active=True
-                    ).update(last_activity=timezone.now())
+                    touch_session(request)
                     
             except Exception as e:
                 # Log error but don't break the response
@@ -87,40 +83,40 @@ class UserSessionMiddleware(MiddlewareMixin):
     """Middleware to track user sessions"""
     
     def process_request(self, request):
-        """Track user login sessions"""
+        """Track user login sessions (known sessions are remembered in the cache)"""
         user = getattr(request, 'user', None)
         
         if user and user.is_authenticated and request.session.session_key:
-            # Check if this session is already tracked
-            session_exists = UserSession.objects.filter(
-                session_key=request.session.session_key,
-                user=user,
-                is_active=True
-            ).exists()
-            
-            if not session_exists:
-                # Create new session record
-                try:
-                    UserSession.objects.create(
-                        user=user,
-                        session_key=request.session.session_key,
-                        ip_address=get_client_ip(request),
-                        user_agent=get_user_agent(request)
-                    )
-                    
-                    # Log the login activity
-                    ActivityLog.objects.create(
-                        user=user,
-                        action='login',
-                        ip_address=get_client_ip(request),
-                        user_agent=get_user_agent(request),
-                        description=f"User logged in from {get_client_ip(request)}"
-                    )
-                except Exception as e:
-                    print(f"Error creating user session: {e}")
+            try:
+                track_session(request)
+            except Exception as e:
+                print(f"Error creating user session: {e}")
         
         return None
 
+
+class SlidingSessionMiddleware(MiddlewareMixin):
+    """
+    Extend the session's expiry while the user is active, saving it at most
+    once per SESSION_REFRESH_INTERVAL instead of on every request. Must come
+    after SessionMiddleware.
+    """
+    
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if session is not None and not getattr(settings, 'SESSION_SAVE_EVERY_REQUEST', False):
+            refresh_session(session)
+        return response
+
+class RoleContextMiddleware(MiddlewareMixin):
+    """
+    Attach ``request.role``, the user's role and scope (see role_context.py),
+    resolved on first use. Must come after AuthenticationMiddleware.
+    """
+    
+    def process_request(self, request):
+        request.role = SimpleLazyObject(lambda: RoleContext(request.user))
+
 # Utility functions for logging activities
 def log_activity(user, action, content_object=None, description='', old_values=None, new_values=None, request=None):
     """
@@ -214,21 +210,17 @@ class BankWebhookIPWhitelistMiddleware:
     def __call__(self, request):
         # Check if the request is for a webhook endpoint
         if any(request.path.startswith(path) for path in self.webhook_paths):
-            # Get client IP
-            x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-            if x_forwarded_for:
-                client_ip = x_forwarded_for.split(',')[0]
-            else:
-                client_ip = request.META.get('REMOTE_ADDR')
+            # Get client IP; X-Forwarded-For only counts behind trusted proxies
+            ip_address = client_ip(request)
             
             # Check if IP is whitelisted
             allowed_ips = getattr(settings, 'PAYMENT_WEBHOOK_IPS', [])
             
             # Allow localhost for testing
-            if settings.DEBUG or client_ip in allowed_ips or client_ip == '127.0.0.1':
+            if settings.DEBUG or ip_address in allowed_ips or ip_address == '127.0.0.1':
                 return self.get_response(request)
             else:
-                logger.warning(f"Unauthorized webhook access attempt from IP: {client_ip}")
+                logger.warning(f"Unauthorized webhook access attempt from IP: {ip_address}")
                 return HttpResponseForbidden("Access denied")
         
         return self.get_response(request)
@@ -295,12 +287,7 @@ class SecurityAuditMiddleware:
     
     def _get_client_ip(self, request):
         """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR', '127.0.0.1')
-        return ip
+        return client_ip(request) or '127.0.0.1'
 
 
 class DeletionControlMiddleware:
@@ -322,4 +309,48 @@ class DeletionControlMiddleware:
             if not request.user.is_superuser:
                 raise PermissionDenied("Only superusers can delete records from the system.")
         
-        return None
\ No newline at end of file
+        return None
+
+class QueryProfilingMiddleware:
+    """
+    Opt-in SQL profiler. Captures every query of a request with its duration,
+    flags repeated query shapes (N+1) and records the result against the
+    resolved view name. Enabled for all requests with QUERY_PROFILING_ENABLED,
+    or for a single request by an admin sending a signed X-Profile-Token.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.skip_paths = ['/static/', '/media/', '/favicon.ico']
+
+    def __call__(self, request):
+        from django.db import connection
+        from . import query_profiler
+
+        if any(request.path.startswith(path) for path in self.skip_paths):
+            return self.get_response(request)
+
+        forced = query_profiler.token_allows_profiling(request)
+        if not (forced or getattr(settings, 'QUERY_PROFILING_ENABLED', False)):
+            return self.get_response(request)
+
+        capture = query_profiler.QueryCapture()
+        started = time.perf_counter()
+        with connection.execute_wrapper(capture):
+            response = self.get_response(request)
+        total_time = time.perf_counter() - started
+
+        profile = query_profiler.build_profile(request, response, capture, total_time)
+        query_profiler.record_profile(profile)
+        if forced or query_profiler.should_sample():
+            query_profiler.store_sample(profile)
+
+        if profile['duplicate_count']:
+            logger.warning(
+                f"Possible N+1 in {profile['view_name'] or request.path}: "
+                f"{profile['query_count']} queries, {profile['duplicate_count']} repeated"
+            )
+
+        response['X-Query-Count'] = str(profile['query_count'])
+        response['X-DB-Time-Ms'] = str(profile['db_ms'])
+        return response
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_application', '0013_alter_user_user_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseWaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('waiting', 'Waiting'), ('promoted', 'Promoted'), ('cancelled', 'Cancelled')], default='waiting', max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('promoted_at', models.DateTimeField(blank=True, null=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='core_application.course')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='core_application.semester')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='core_application.student')),
+            ],
+            options={
+                'verbose_name_plural': 'Course Waitlist Entries',
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['course', 'semester', 'status', 'created_at'], name='core_applic_course__7cde6e_idx')],
+                'unique_together': {('course', 'semester', 'student')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseCapacity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('capacity', models.PositiveIntegerField(help_text='Maximum number of active enrollments')),
+                ('enrolled_count', models.PositiveIntegerField(default=0)),
+                ('waitlist_enabled', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='capacities', to='core_application.course')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_capacities', to='core_application.semester')),
+            ],
+            options={
+                'verbose_name_plural': 'Course Capacities',
+                'unique_together': {('course', 'semester')},
+            },
+        ),
+    ]
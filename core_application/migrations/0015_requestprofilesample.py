@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_application', '0014_coursecapacity_coursewaitlistentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfileSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255)),
+                ('view_name', models.CharField(blank=True, db_index=True, max_length=150)),
+                ('method', models.CharField(max_length=10)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('total_ms', models.FloatField()),
+                ('db_ms', models.FloatField()),
+                ('query_count', models.PositiveIntegerField()),
+                ('duplicate_count', models.PositiveIntegerField(default=0)),
+                ('top_duplicates', models.TextField(blank=True, help_text='JSON list of the most repeated query shapes')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_profiles', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['view_name', 'created_at'], name='core_applic_view_na_b769d3_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_application', '0015_requestprofilesample'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FactPartition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fact', models.CharField(choices=[('enrollment', 'Enrollment facts'), ('grade', 'Grade facts'), ('fee_payment', 'Fee payment facts'), ('student', 'Student facts')], max_length=20)),
+                ('partition_id', models.BigIntegerField(help_text='Semester id, academic year id or 0 for unpartitioned facts')),
+                ('fingerprint', models.CharField(blank=True, max_length=255)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('fact', 'partition_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year_of_study', models.PositiveSmallIntegerField()),
+                ('status', models.CharField(max_length=20)),
+                ('gender', models.CharField(blank=True, max_length=10)),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.department')),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.faculty')),
+                ('programme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.programme')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['faculty', 'status'], name='core_applic_faculty_406169_idx'), models.Index(fields=['department', 'status'], name='core_applic_departm_cf7547_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='GradeFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year_of_study', models.PositiveSmallIntegerField()),
+                ('gender', models.CharField(blank=True, max_length=10)),
+                ('grade', models.CharField(blank=True, max_length=2)),
+                ('grade_points', models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True)),
+                ('graded_count', models.PositiveIntegerField(default=0)),
+                ('passed_count', models.PositiveIntegerField(default=0)),
+                ('grade_points_sum', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('grade_points_count', models.PositiveIntegerField(default=0)),
+                ('total_marks_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_marks_count', models.PositiveIntegerField(default=0)),
+                ('quality_points_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('credit_hours_sum', models.PositiveIntegerField(default=0)),
+                ('academic_year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.academicyear')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.course')),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.department')),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.faculty')),
+                ('programme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.programme')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.semester')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['semester', 'department'], name='core_applic_semeste_fdd051_idx'), models.Index(fields=['academic_year', 'faculty'], name='core_applic_academi_4affd9_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='FeePaymentFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year_of_study', models.PositiveSmallIntegerField(help_text='Fee structure year')),
+                ('payment_status', models.CharField(max_length=20)),
+                ('payment_method', models.CharField(max_length=20)),
+                ('payment_month', models.DateField(help_text='First day of the month the payment was made')),
+                ('payment_count', models.PositiveIntegerField(default=0)),
+                ('amount_paid_sum', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('academic_year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.academicyear')),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.department')),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.faculty')),
+                ('programme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.programme')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['academic_year', 'faculty'], name='core_applic_academi_1da5de_idx'), models.Index(fields=['payment_month', 'payment_status'], name='core_applic_payment_504c90_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EnrollmentFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year_of_study', models.PositiveSmallIntegerField()),
+                ('gender', models.CharField(blank=True, max_length=10)),
+                ('enrollment_month', models.DateField(help_text='First day of the month the enrollment was made')),
+                ('is_active', models.BooleanField(default=True)),
+                ('enrollment_count', models.PositiveIntegerField(default=0)),
+                ('repeat_count', models.PositiveIntegerField(default=0)),
+                ('audit_count', models.PositiveIntegerField(default=0)),
+                ('academic_year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.academicyear')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.course')),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.department')),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.faculty')),
+                ('programme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.programme')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core_application.semester')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['semester', 'department'], name='core_applic_semeste_c8d454_idx'), models.Index(fields=['academic_year', 'faculty'], name='core_applic_academi_5a79af_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,152 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:35
+
+import re
+
+from django.db import migrations, models
+
+ENTRY_TABLE = 'core_application_personsearchentry'
+FTS_TABLE = 'people_search_fts'
+
+SQLITE_FORWARD = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(search_text, content='{ENTRY_TABLE}', content_rowid='id')",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {ENTRY_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {ENTRY_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {ENTRY_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END""",
+]
+SQLITE_REVERSE = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX people_search_trgm ON {ENTRY_TABLE} USING gin (search_text gin_trgm_ops)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS people_search_trgm",
+]
+
+
+def create_search_backend(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_backend(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+# Frozen copy of the document building in people_search.py as of this
+# migration, so later changes there do not change what this migration does
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def _tokenize(text):
+    return _TOKEN.findall((text or '').lower())
+
+
+def _normalize_identifier(value):
+    segments = []
+    for token in _tokenize(value):
+        if token.isdigit():
+            token = token.lstrip('0') or '0'
+        segments.append(token)
+    return ''.join(segments)
+
+
+def _identifier_terms(value):
+    tokens = _tokenize(value)
+    terms = [token.lstrip('0') for token in tokens if token.isdigit() and token.startswith('0')]
+    terms = [term for term in terms if term]
+    if len(tokens) > 1:
+        terms.append(''.join(tokens))
+        terms.append(_normalize_identifier(value))
+    return terms
+
+
+def _document(entry_model, person_type, profile):
+    user = profile.user
+    if person_type == 'student':
+        identifier = profile.student_id
+        extra = [profile.programme.name, profile.programme.code]
+    elif person_type == 'lecturer':
+        identifier = profile.employee_number
+        extra = []
+    else:
+        identifier = profile.employee_number
+        extra = [profile.designation]
+
+    fields = [user.first_name, user.last_name, user.username, user.email, identifier] + extra
+    tokens = []
+    for field in fields:
+        tokens.extend(_tokenize(field))
+    tokens.extend(_identifier_terms(identifier))
+
+    return entry_model(
+        person_type=person_type,
+        object_id=profile.pk,
+        user_id=user.pk,
+        display_name=f"{user.first_name} {user.last_name}".strip()[:300],
+        identifier=identifier[:50],
+        identifier_key=_normalize_identifier(identifier)[:50],
+        search_text=' '.join(tokens),
+    )
+
+
+def populate_index(apps, schema_editor):
+    PersonSearchEntry = apps.get_model('core_application', 'PersonSearchEntry')
+    profiles = {
+        'student': apps.get_model('core_application', 'Student').objects.select_related('user', 'programme'),
+        'lecturer': apps.get_model('core_application', 'Lecturer').objects.select_related('user'),
+        'staff': apps.get_model('core_application', 'Staff').objects.select_related('user'),
+    }
+    for person_type, queryset in profiles.items():
+        documents = [
+            _document(PersonSearchEntry, person_type, profile)
+            for profile in queryset.iterator(chunk_size=500)
+        ]
+        PersonSearchEntry.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_application', '0016_academic_fact_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonSearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('person_type', models.CharField(choices=[('student', 'Student'), ('lecturer', 'Lecturer'), ('staff', 'Staff')], max_length=10)),
+                ('object_id', models.BigIntegerField(help_text='Primary key of the Student, Lecturer or Staff row')),
+                ('user_id', models.BigIntegerField(db_index=True)),
+                ('display_name', models.CharField(blank=True, max_length=300)),
+                ('identifier', models.CharField(blank=True, help_text='Registration or employee number as entered', max_length=50)),
+                ('identifier_key', models.CharField(blank=True, help_text='Identifier without separators or leading zeros, e.g. SC211/0540/2025 -> sc2115402025', max_length=50)),
+                ('search_text', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['person_type', 'identifier_key'], name='core_applic_person__9cab43_idx'), models.Index(fields=['identifier_key'], name='core_applic_identif_164b59_idx')],
+                'unique_together': {('person_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_search_backend, drop_search_backend),
+        migrations.RunPython(populate_index, migrations.RunPython.noop),
+    ]
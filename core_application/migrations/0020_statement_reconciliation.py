@@ -0,0 +1,86 @@
+# Generated by Django 4.2.30 on 2026-10-19 17:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+# Reconciliation and the webhook inbox look payments up by reference
+PAYMENT_REFERENCE_INDEXES = [
+    ('feepayment_txn_ref_idx', 'transaction_reference'),
+    ('feepayment_mpesa_receipt_idx', 'mpesa_receipt'),
+]
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_application', '0019_receipt_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankStatement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('bank', 'Bank statement (CSV)'), ('mpesa', 'M-Pesa statement')], max_length=10)),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('checksum', models.CharField(blank=True, help_text='SHA-256 of the file; the same file cannot be imported twice', max_length=64, null=True, unique=True)),
+                ('status', models.CharField(choices=[('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='processing', max_length=12)),
+                ('line_count', models.PositiveIntegerField(default=0)),
+                ('matched_count', models.PositiveIntegerField(default=0)),
+                ('exception_count', models.PositiveIntegerField(default=0)),
+                ('skipped_count', models.PositiveIntegerField(default=0, help_text='Debits and incomplete transactions')),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('matched_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('error', models.TextField(blank=True)),
+                ('uploaded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('uploaded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-uploaded_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatementMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('line_number', models.PositiveIntegerField()),
+                ('reference', models.CharField(max_length=100)),
+                ('matched_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('fee_payment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='statement_match', to='core_application.feepayment')),
+                ('statement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='core_application.bankstatement')),
+            ],
+            options={
+                'ordering': ['statement', 'line_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatementException',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('line_number', models.PositiveIntegerField()),
+                ('reference', models.CharField(blank=True, max_length=100)),
+                ('amount', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('value_date', models.DateField(blank=True, null=True)),
+                ('narrative', models.CharField(blank=True, max_length=255)),
+                ('reason', models.CharField(choices=[('no_reference', 'No transaction reference'), ('unmatched', 'No payment with this reference'), ('amount_mismatch', 'Amount differs from posted payments'), ('date_mismatch', 'Date outside the matching window'), ('already_matched', 'Payment already reconciled'), ('invalid', 'Unreadable line')], max_length=20)),
+                ('detail', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('resolved', 'Resolved'), ('ignored', 'Ignored')], default='open', max_length=10)),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('fee_payment', models.ForeignKey(blank=True, help_text='Closest posted payment, when there is one', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='statement_exceptions', to='core_application.feepayment')),
+                ('resolved_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resolved_statement_exceptions', to=settings.AUTH_USER_MODEL)),
+                ('statement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exceptions', to='core_application.bankstatement')),
+            ],
+            options={
+                'ordering': ['statement', 'line_number'],
+                'indexes': [models.Index(fields=['status', 'reason'], name='core_applic_status_8a2320_idx')],
+            },
+        ),
+    ] + [
+        migrations.RunSQL(
+            f"CREATE INDEX {name} ON core_application_feepayment ({column})",
+            f"DROP INDEX {name}",
+        )
+        for name, column in PAYMENT_REFERENCE_INDEXES
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:21
+
+from django.db import migrations, models
+
+
+def clear_facts(apps, schema_editor):
+    # Overlapping refreshes may have left duplicate rows that would break the
+    # new constraints. Facts are derived data: drop them and the partition
+    # fingerprints so the next refresh rebuilds everything.
+    for model_name in ('EnrollmentFact', 'GradeFact', 'FeePaymentFact', 'StudentFact', 'FactPartition'):
+        apps.get_model('core_application', model_name).objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_application', '0022_broadcast_notifications'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FactRefreshState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('running_since', models.DateTimeField(blank=True, null=True)),
+                ('last_refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(clear_facts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='enrollmentfact',
+            constraint=models.UniqueConstraint(fields=('semester', 'course', 'programme', 'year_of_study', 'gender', 'enrollment_month', 'is_active'), name='unique_enrollment_fact'),
+        ),
+        migrations.AddConstraint(
+            model_name='feepaymentfact',
+            constraint=models.UniqueConstraint(fields=('academic_year', 'programme', 'year_of_study', 'payment_status', 'payment_method', 'payment_month'), name='unique_fee_payment_fact'),
+        ),
+        migrations.AddConstraint(
+            model_name='gradefact',
+            constraint=models.UniqueConstraint(fields=('semester', 'course', 'programme', 'year_of_study', 'gender', 'grade', 'grade_points'), name='unique_grade_fact'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentfact',
+            constraint=models.UniqueConstraint(fields=('programme', 'year_of_study', 'status', 'gender'), name='unique_student_fact'),
+        ),
+    ]
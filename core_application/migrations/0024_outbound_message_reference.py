@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_application', '0023_fact_refresh_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboundmessage',
+            name='reference',
+            field=models.CharField(blank=True, help_text='Record that tracks delivery, e.g. security_alert:12 (see outbox.message_sent)', max_length=64),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+AUTO_POSTED = 'Auto-posted from '
+
+
+def record_posted_transactions(apps, schema_editor):
+    # Payments already posted from callbacks: the inbox items that created
+    # them, then auto-posted payments whose remark names the provider
+    # ('Auto-posted from EQUITY Bank'). Conflicting rows keep the first.
+    PostedTransaction = apps.get_model('core_application', 'PostedTransaction')
+    WebhookInboxItem = apps.get_model('core_application', 'WebhookInboxItem')
+    FeePayment = apps.get_model('core_application', 'FeePayment')
+
+    rows = [
+        PostedTransaction(provider=provider, reference=reference, fee_payment_id=fee_payment_id)
+        for provider, reference, fee_payment_id in WebhookInboxItem.objects.filter(
+            status='processed', fee_payment__isnull=False
+        ).order_by('id').values_list('provider', 'event_key', 'fee_payment_id')
+    ]
+    PostedTransaction.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+    rows = []
+    for fee_payment_id, reference, remarks in FeePayment.objects.filter(
+        remarks__startswith=AUTO_POSTED
+    ).exclude(transaction_reference='').order_by('id').values_list('id', 'transaction_reference', 'remarks'):
+        provider = remarks[len(AUTO_POSTED):].split(' ', 1)[0].lower()[:10]
+        rows.append(PostedTransaction(provider=provider, reference=reference, fee_payment_id=fee_payment_id))
+    PostedTransaction.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_application', '0024_outbound_message_reference'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostedTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(help_text="Webhook provider, or 'manual'", max_length=10)),
+                ('reference', models.CharField(help_text='Provider transaction reference', max_length=100)),
+                ('posted_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('fee_payment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='posted_transaction', to='core_application.feepayment')),
+            ],
+            options={
+                'unique_together': {('provider', 'reference')},
+            },
+        ),
+        migrations.RunPython(record_posted_transactions, migrations.RunPython.noop),
+    ]
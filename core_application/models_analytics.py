@@ -0,0 +1,196 @@
+# models_analytics.py - Pre-aggregated academic fact tables
+#
+# Registered from CoreApplicationConfig.ready() alongside the main models.
+# Rows are rebuilt by analytics_facts.refresh_facts(); never edit them by hand.
+#
+# Dimension conventions shared by the enrollment and grade facts:
+#   faculty / programme / year_of_study / gender - taken from the student
+#   department / course                          - taken from the course taught
+# so dean reports slice by faculty and COD reports by the teaching department.
+#
+# Each fact has a unique constraint over its dimensions, so a partition can
+# never hold the same group twice even if two rebuilds overlap.
+
+from django.db import models
+
+from .models import AcademicYear, Course, Department, Faculty, Programme, Semester
+
+
+class EnrollmentFact(models.Model):
+    """Enrollment counts per semester, course and student cohort"""
+    academic_year = models.ForeignKey(AcademicYear, on_delete=models.CASCADE, related_name='+')
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='+')
+    faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='+')
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='+')
+    programme = models.ForeignKey(Programme, on_delete=models.CASCADE, related_name='+')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='+')
+    year_of_study = models.PositiveSmallIntegerField()
+    gender = models.CharField(max_length=10, blank=True)
+    enrollment_month = models.DateField(help_text="First day of the month the enrollment was made")
+    is_active = models.BooleanField(default=True)
+
+    enrollment_count = models.PositiveIntegerField(default=0)
+    repeat_count = models.PositiveIntegerField(default=0)
+    audit_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['semester', 'department']),
+            models.Index(fields=['academic_year', 'faculty']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    'semester', 'course', 'programme', 'year_of_study', 'gender',
+                    'enrollment_month', 'is_active',
+                ],
+                name='unique_enrollment_fact',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.course_id} / {self.programme_id} Y{self.year_of_study} - {self.enrollment_count}"
+
+
+class GradeFact(models.Model):
+    """Graded, passed and points totals per semester, course, cohort and grade"""
+    academic_year = models.ForeignKey(AcademicYear, on_delete=models.CASCADE, related_name='+')
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='+')
+    faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='+')
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='+')
+    programme = models.ForeignKey(Programme, on_delete=models.CASCADE, related_name='+')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='+')
+    year_of_study = models.PositiveSmallIntegerField()
+    gender = models.CharField(max_length=10, blank=True)
+    grade = models.CharField(max_length=2, blank=True)
+    grade_points = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+
+    graded_count = models.PositiveIntegerField(default=0)
+    passed_count = models.PositiveIntegerField(default=0)
+    grade_points_sum = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    grade_points_count = models.PositiveIntegerField(default=0)
+    total_marks_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_marks_count = models.PositiveIntegerField(default=0)
+    quality_points_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    credit_hours_sum = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['semester', 'department']),
+            models.Index(fields=['academic_year', 'faculty']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    'semester', 'course', 'programme', 'year_of_study', 'gender',
+                    'grade', 'grade_points',
+                ],
+                name='unique_grade_fact',
+            ),
+        ]
+
+    @property
+    def failed_count(self):
+        return self.graded_count - self.passed_count
+
+    def __str__(self):
+        return f"{self.course_id} / {self.programme_id} Y{self.year_of_study} {self.grade} - {self.graded_count}"
+
+
+class FeePaymentFact(models.Model):
+    """Fee payment totals per academic year, programme cohort, status and month"""
+    academic_year = models.ForeignKey(AcademicYear, on_delete=models.CASCADE, related_name='+')
+    faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='+')
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='+')
+    programme = models.ForeignKey(Programme, on_delete=models.CASCADE, related_name='+')
+    year_of_study = models.PositiveSmallIntegerField(help_text="Fee structure year")
+    payment_status = models.CharField(max_length=20)
+    payment_method = models.CharField(max_length=20)
+    payment_month = models.DateField(help_text="First day of the month the payment was made")
+
+    payment_count = models.PositiveIntegerField(default=0)
+    amount_paid_sum = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['academic_year', 'faculty']),
+            models.Index(fields=['payment_month', 'payment_status']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    'academic_year', 'programme', 'year_of_study', 'payment_status',
+                    'payment_method', 'payment_month',
+                ],
+                name='unique_fee_payment_fact',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.programme_id} {self.payment_month:%b %Y} {self.payment_status} - {self.amount_paid_sum}"
+
+
+class StudentFact(models.Model):
+    """Current student headcount per programme cohort, status and gender"""
+    faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='+')
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='+')
+    programme = models.ForeignKey(Programme, on_delete=models.CASCADE, related_name='+')
+    year_of_study = models.PositiveSmallIntegerField()
+    status = models.CharField(max_length=20)
+    gender = models.CharField(max_length=10, blank=True)
+
+    student_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['faculty', 'status']),
+            models.Index(fields=['department', 'status']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['programme', 'year_of_study', 'status', 'gender'],
+                name='unique_student_fact',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.programme_id} Y{self.year_of_study} {self.status} - {self.student_count}"
+
+
+class FactPartition(models.Model):
+    """
+    Refresh bookkeeping for one slice of a fact table. ``fingerprint`` is a
+    cheap aggregate over the source rows; a partition is only rebuilt when it
+    changes.
+    """
+    FACT_CHOICES = (
+        ('enrollment', 'Enrollment facts'),
+        ('grade', 'Grade facts'),
+        ('fee_payment', 'Fee payment facts'),
+        ('student', 'Student facts'),
+    )
+
+    fact = models.CharField(max_length=20, choices=FACT_CHOICES)
+    partition_id = models.BigIntegerField(help_text="Semester id, academic year id or 0 for unpartitioned facts")
+    fingerprint = models.CharField(max_length=255, blank=True)
+    row_count = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['fact', 'partition_id']
+
+    def __str__(self):
+        return f"{self.fact}:{self.partition_id} ({self.row_count} rows)"
+
+
+class FactRefreshState(models.Model):
+    """
+    Single row that serialises fact refreshes across workers. A refresh
+    claims it by setting ``running_since`` under a row lock; a claim older
+    than analytics_facts.REFRESH_LEASE is treated as abandoned.
+    """
+    running_since = models.DateTimeField(null=True, blank=True)
+    last_refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Fact refresh (last {self.last_refreshed_at or 'never'})"
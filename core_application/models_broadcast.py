@@ -0,0 +1,80 @@
+# models_broadcast.py - Audience-targeted notices with sparse read state
+#
+# A BroadcastNotification names its audience (everyone, all students, a
+# programme and/or year, a hostel, ...) instead of listing recipients, so a
+# university-wide notice is a single row. Read state is only stored for users
+# who have read something: a per-user watermark (everything up to
+# read_through is read) plus a BroadcastReceipt for notices read one at a time
+# after it. See broadcasts.py.
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from .models import Hostel, Programme, StudentNotification
+
+
+class BroadcastNotification(models.Model):
+    """A notice shown to everyone in its audience"""
+    AUDIENCES = (
+        ('all_users', 'Everyone'),
+        ('all_students', 'All Students'),
+        ('all_lecturers', 'All Lecturers'),
+        ('all_staff', 'All Staff'),
+        ('programme', 'Programme'),
+        ('year', 'Year of Study'),
+        ('hostel', 'Hostel Residents'),
+    )
+
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    notification_type = models.CharField(
+        max_length=20, choices=StudentNotification.NOTIFICATION_TYPES, default='general'
+    )
+    audience = models.CharField(max_length=15, choices=AUDIENCES)
+    programme = models.ForeignKey(Programme, on_delete=models.CASCADE, null=True, blank=True,
+                                  related_name='broadcasts')
+    year = models.PositiveSmallIntegerField(null=True, blank=True,
+                                            help_text="Year of study (also narrows a programme audience)")
+    hostel = models.ForeignKey(Hostel, on_delete=models.CASCADE, null=True, blank=True,
+                               related_name='broadcasts')
+    related_url = models.URLField(blank=True)
+    send_email = models.BooleanField(default=False)
+    send_sms = models.BooleanField(default=False)
+    sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True,
+                               related_name='sent_broadcasts')
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['audience', 'created_at']),
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.get_audience_display()})"
+
+
+class BroadcastReadState(models.Model):
+    """Everything created up to ``read_through`` counts as read for the user"""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                                related_name='broadcast_read_state')
+    read_through = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user} read through {self.read_through}"
+
+
+class BroadcastReceipt(models.Model):
+    """A single notice read after the user's watermark"""
+    broadcast = models.ForeignKey(BroadcastNotification, on_delete=models.CASCADE, related_name='receipts')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='broadcast_receipts')
+    read_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ['user', 'broadcast']
+
+    def __str__(self):
+        return f"{self.user} read {self.broadcast_id}"
@@ -0,0 +1,33 @@
+# models_monitoring.py - Request profiling samples
+#
+# Registered from CoreApplicationConfig.ready() alongside the main models.
+
+from django.conf import settings
+from django.db import models
+
+
+class RequestProfileSample(models.Model):
+    """Compact summary of one profiled request (see QueryProfilingMiddleware)"""
+    path = models.CharField(max_length=255)
+    view_name = models.CharField(max_length=150, blank=True, db_index=True)
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='request_profiles'
+    )
+    total_ms = models.FloatField()
+    db_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    duplicate_count = models.PositiveIntegerField(default=0)
+    top_duplicates = models.TextField(blank=True, help_text="JSON list of the most repeated query shapes")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['view_name', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.path} - {self.query_count} queries, {self.total_ms:.0f} ms"
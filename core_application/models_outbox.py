@@ -0,0 +1,59 @@
+# models_outbox.py - Durable queue of outgoing email and SMS
+#
+# Request handlers add OutboundMessage rows through outbox.queue_email() and
+# outbox.queue_sms() instead of talking to the SMTP server or SMS gateway;
+# outbox.process_outbox() delivers them in batches.
+
+from django.db import models
+from django.utils import timezone
+
+
+class OutboundMessage(models.Model):
+    """One email (to one or more addresses) or SMS (to one number) to deliver"""
+    CHANNELS = (
+        ('email', 'Email'),
+        ('sms', 'SMS'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+    # Lower is sent first: login codes before receipts before broadcasts
+    PRIORITY_URGENT = 0
+    PRIORITY_HIGH = 3
+    PRIORITY_NORMAL = 5
+    PRIORITY_BULK = 9
+
+    channel = models.CharField(max_length=5, choices=CHANNELS)
+    category = models.CharField(max_length=30, blank=True, help_text="e.g. payment, 2fa, security_alert")
+    priority = models.PositiveSmallIntegerField(default=PRIORITY_NORMAL)
+    to = models.JSONField(help_text="Email addresses or the phone number")
+    from_email = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255, blank=True)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    reference = models.CharField(
+        max_length=64, blank=True,
+        help_text="Record that tracks delivery, e.g. security_alert:12 (see outbox.message_sent)"
+    )
+
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Not sent before this time")
+    claim_token = models.CharField(max_length=32, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['priority', 'next_attempt_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'channel', 'priority', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} to {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,22 @@
+# models_receipts.py - Receipt number counters
+#
+# One row per receipt prefix (bank or posting channel) and calendar year.
+# receipt_sequence.allocate() bumps last_value with a single UPDATE, so
+# concurrent postings never read the same number.
+
+from django.db import models
+
+
+class ReceiptSequence(models.Model):
+    """Last receipt number handed out for a prefix in a year"""
+    prefix = models.CharField(max_length=10)
+    year = models.PositiveIntegerField()
+    last_value = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['prefix', 'year']
+        ordering = ['-year', 'prefix']
+
+    def __str__(self):
+        return f"{self.prefix}-{self.year} ({self.last_value})"
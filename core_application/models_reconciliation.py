@@ -0,0 +1,105 @@
+# models_reconciliation.py - Bank and M-Pesa statement reconciliation
+#
+# A BankStatement is one imported statement file. Lines that match posted
+# FeePayments become StatementMatch rows (a payment can only ever be matched
+# once); everything else is queued as a StatementException for the finance
+# office to review. See reconciliation.reconcile_statement().
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from .models import FeePayment
+
+
+class BankStatement(models.Model):
+    """One imported bank or M-Pesa statement file"""
+    SOURCES = (
+        ('bank', 'Bank statement (CSV)'),
+        ('mpesa', 'M-Pesa statement'),
+    )
+    STATUS_CHOICES = (
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    )
+
+    source = models.CharField(max_length=10, choices=SOURCES)
+    file_name = models.CharField(max_length=255, blank=True)
+    checksum = models.CharField(max_length=64, unique=True, null=True, blank=True,
+                                help_text="SHA-256 of the file; the same file cannot be imported twice")
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default='processing')
+    line_count = models.PositiveIntegerField(default=0)
+    matched_count = models.PositiveIntegerField(default=0)
+    exception_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0, help_text="Debits and incomplete transactions")
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    matched_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    error = models.TextField(blank=True)
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    uploaded_at = models.DateTimeField(default=timezone.now)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-uploaded_at']
+
+    def __str__(self):
+        return f"{self.get_source_display()} {self.file_name} ({self.matched_count}/{self.line_count})"
+
+
+class StatementMatch(models.Model):
+    """A statement credit reconciled against a posted FeePayment"""
+    statement = models.ForeignKey(BankStatement, on_delete=models.CASCADE, related_name='matches')
+    fee_payment = models.OneToOneField(FeePayment, on_delete=models.CASCADE, related_name='statement_match')
+    line_number = models.PositiveIntegerField()
+    reference = models.CharField(max_length=100)
+    matched_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['statement', 'line_number']
+
+    def __str__(self):
+        return f"{self.reference} -> {self.fee_payment_id}"
+
+
+class StatementException(models.Model):
+    """A statement line that could not be matched automatically"""
+    REASONS = (
+        ('no_reference', 'No transaction reference'),
+        ('unmatched', 'No payment with this reference'),
+        ('amount_mismatch', 'Amount differs from posted payments'),
+        ('date_mismatch', 'Date outside the matching window'),
+        ('already_matched', 'Payment already reconciled'),
+        ('invalid', 'Unreadable line'),
+    )
+    STATUS_CHOICES = (
+        ('open', 'Open'),
+        ('resolved', 'Resolved'),
+        ('ignored', 'Ignored'),
+    )
+
+    statement = models.ForeignKey(BankStatement, on_delete=models.CASCADE, related_name='exceptions')
+    line_number = models.PositiveIntegerField()
+    reference = models.CharField(max_length=100, blank=True)
+    amount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    value_date = models.DateField(null=True, blank=True)
+    narrative = models.CharField(max_length=255, blank=True)
+    reason = models.CharField(max_length=20, choices=REASONS)
+    detail = models.CharField(max_length=255, blank=True)
+    fee_payment = models.ForeignKey(
+        FeePayment, on_delete=models.SET_NULL, null=True, blank=True, related_name='statement_exceptions',
+        help_text="Closest posted payment, when there is one"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    resolved_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                                    related_name='resolved_statement_exceptions')
+    resolved_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['statement', 'line_number']
+        indexes = [
+            models.Index(fields=['status', 'reason']),
+        ]
+
+    def __str__(self):
+        return f"Line {self.line_number}: {self.get_reason_display()}"
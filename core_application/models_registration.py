@@ -0,0 +1,60 @@
+# models_registration.py - Course capacity and waitlist models
+#
+# Registered from CoreApplicationConfig.ready() alongside the main models.
+
+from django.db import models
+from django.utils import timezone
+
+from .models import Course, Semester, Student
+
+
+class CourseCapacity(models.Model):
+    """Seat limit and live enrolled counter for a course in a semester"""
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='capacities')
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='course_capacities')
+    capacity = models.PositiveIntegerField(help_text="Maximum number of active enrollments")
+    enrolled_count = models.PositiveIntegerField(default=0)
+    waitlist_enabled = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['course', 'semester']
+        verbose_name_plural = 'Course Capacities'
+
+    @property
+    def seats_available(self):
+        return max(self.capacity - self.enrolled_count, 0)
+
+    @property
+    def is_full(self):
+        return self.enrolled_count >= self.capacity
+
+    def __str__(self):
+        return f"{self.course.code} - {self.semester} ({self.enrolled_count}/{self.capacity})"
+
+
+class CourseWaitlistEntry(models.Model):
+    """A student queued for a seat in a full course"""
+    STATUS_CHOICES = (
+        ('waiting', 'Waiting'),
+        ('promoted', 'Promoted'),
+        ('cancelled', 'Cancelled'),
+    )
+
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='waitlist_entries')
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='waitlist_entries')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='waitlist_entries')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='waiting')
+    created_at = models.DateTimeField(default=timezone.now)
+    promoted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['course', 'semester', 'student']
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['course', 'semester', 'status', 'created_at']),
+        ]
+        verbose_name_plural = 'Course Waitlist Entries'
+
+    def __str__(self):
+        return f"{self.student.student_id} - {self.course.code} ({self.status})"
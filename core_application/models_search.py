@@ -0,0 +1,40 @@
+# models_search.py - Denormalized people-search index
+#
+# One row per student, lecturer and staff profile, rebuilt from the profile,
+# its user and programme by people_search.index_person(). The full-text side
+# (FTS5 on SQLite, trigram GIN on PostgreSQL) is created by migration 0017 and
+# reads ``search_text``; never edit rows by hand.
+
+from django.db import models
+
+
+class PersonSearchEntry(models.Model):
+    """Search document for a student, lecturer or staff member"""
+    PERSON_TYPES = (
+        ('student', 'Student'),
+        ('lecturer', 'Lecturer'),
+        ('staff', 'Staff'),
+    )
+
+    person_type = models.CharField(max_length=10, choices=PERSON_TYPES)
+    object_id = models.BigIntegerField(help_text="Primary key of the Student, Lecturer or Staff row")
+    user_id = models.BigIntegerField(db_index=True)
+
+    display_name = models.CharField(max_length=300, blank=True)
+    identifier = models.CharField(max_length=50, blank=True, help_text="Registration or employee number as entered")
+    identifier_key = models.CharField(
+        max_length=50, blank=True,
+        help_text="Identifier without separators or leading zeros, e.g. SC211/0540/2025 -> sc2115402025"
+    )
+    search_text = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['person_type', 'object_id']
+        indexes = [
+            models.Index(fields=['person_type', 'identifier_key']),
+            models.Index(fields=['identifier_key']),
+        ]
+
+    def __str__(self):
+        return f"{self.person_type}:{self.object_id} {self.identifier} {self.display_name}"
@@ -0,0 +1,73 @@
+# models_webhooks.py - Inbox for bank and M-Pesa payment callbacks
+#
+# The webhook views only verify the signature and store the raw payload here,
+# keyed by provider and transaction reference, before acknowledging. Posting
+# the FeePayment happens after the commit in webhook_inbox.process_inbox().
+#
+# PostedTransaction records which FeePayment each provider transaction was
+# posted as. Its unique (provider, reference) key is what makes posting
+# idempotent, for inbox items and synchronous postings alike.
+
+from django.db import models
+from django.utils import timezone
+
+from .models import FeePayment
+
+
+class WebhookInboxItem(models.Model):
+    """One payment callback as received from a bank or M-Pesa"""
+    PROVIDERS = (
+        ('equity', 'Equity Bank'),
+        ('kcb', 'KCB Bank'),
+        ('mpesa', 'M-Pesa'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('processed', 'Processed'),
+        ('duplicate', 'Duplicate'),
+        ('failed', 'Failed'),
+    )
+
+    provider = models.CharField(max_length=10, choices=PROVIDERS)
+    event_key = models.CharField(max_length=100, help_text="Provider transaction reference")
+    payload = models.JSONField()
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    # Set while a worker holds the item; an expired lease can be reclaimed
+    claim_token = models.CharField(max_length=32, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    fee_payment = models.ForeignKey(
+        FeePayment, on_delete=models.SET_NULL, null=True, blank=True, related_name='webhook_items'
+    )
+    received_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['provider', 'event_key']
+        ordering = ['received_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'received_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.provider}:{self.event_key} ({self.status})"
+
+
+class PostedTransaction(models.Model):
+    """The FeePayment a provider transaction was posted as"""
+    provider = models.CharField(max_length=10, help_text="Webhook provider, or 'manual'")
+    reference = models.CharField(max_length=100, help_text="Provider transaction reference")
+    fee_payment = models.OneToOneField(
+        FeePayment, on_delete=models.CASCADE, related_name='posted_transaction'
+    )
+    posted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ['provider', 'reference']
+
+    def __str__(self):
+        return f"{self.provider}:{self.reference} -> {self.fee_payment_id}"
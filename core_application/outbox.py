@@ -0,0 +1,400 @@
+# outbox.py - Queued, batched delivery of email and SMS
+#
+# Payment receipts, login codes, security alerts and notifications used to
+# call send_mail() from the request, opening one SMTP connection per message.
+# They now add an OutboundMessage row with queue_email()/queue_sms(), which
+# commits with the rest of the request, and process_outbox() delivers them:
+#
+#   - email: claimed batches go out over one SMTP connection from
+#     get_connection(), reopened only if the server drops it
+#   - SMS: messages with the same text are sent to up to SMS_BATCH_SIZE
+#     numbers per gateway call (see sms_backends.py)
+#   - each channel has a token bucket (OUTBOX_RATE_LIMITS); messages over the
+#     limit are put back for later without using up an attempt
+#   - failures are retried with exponential back-off until
+#     OUTBOX_MAX_ATTEMPTS, then left as failed
+#   - ``message_sent`` is sent with each delivered batch; receivers use the
+#     messages' ``reference`` to update the record that queued them
+#     (AdminSecurityAlert.email_sent)
+#
+# Claiming works like the webhook inbox: a conditional UPDATE with a claim
+# token and a lease, so several workers never send the same message. After a
+# commit that queued messages, kick() drains the outbox on a background
+# thread so login codes are not held up until the next scheduled run.
+
+from datetime import datetime, timedelta
+import logging
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.dispatch import Signal
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models_outbox import OutboundMessage
+from .registration_control import TokenBucket
+from .sms_backends import get_sms_backend
+
+logger = logging.getLogger(__name__)
+
+# Sent after a batch is marked sent, with the delivered ``messages``
+message_sent = Signal()
+
+NOTIFICATION_PRIORITIES = {
+    'urgent': OutboundMessage.PRIORITY_HIGH,
+    'high': OutboundMessage.PRIORITY_NORMAL,
+}
+
+
+# =============================================================================
+# Queueing
+# =============================================================================
+
+def _send_after(value):
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if isinstance(value, datetime) and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value or timezone.now()
+
+
+def queue_email(to, subject, body, html_body='', from_email=None, category='',
+                priority=OutboundMessage.PRIORITY_NORMAL, send_after=None, reference=''):
+    """
+    Queue one email to the addresses in ``to``. Returns the OutboundMessage,
+    or None when there is no address to send to.
+    """
+    recipients = [address for address in ([to] if isinstance(to, str) else to) if address]
+    if not recipients:
+        return None
+    message = OutboundMessage.objects.create(
+        channel='email',
+        category=category,
+        priority=priority,
+        to=recipients,
+        from_email=from_email or '',
+        subject=subject[:255],
+        body=body,
+        html_body=html_body,
+        reference=reference,
+        next_attempt_at=_send_after(send_after),
+    )
+    _kick_on_commit()
+    return message
+
+
+def queue_email_each(addresses, subject, body, html_body='', category='',
+                     priority=OutboundMessage.PRIORITY_BULK, send_after=None):
+    """Queue a separate copy of one email per address (bulk insert); returns the count"""
+    send_after = _send_after(send_after)
+    rows = OutboundMessage.objects.bulk_create([
+        OutboundMessage(
+            channel='email', category=category, priority=priority, to=[address],
+            subject=subject[:255], body=body, html_body=html_body, next_attempt_at=send_after,
+        )
+        for address in addresses if address
+    ], batch_size=500)
+    if rows:
+        _kick_on_commit()
+    return len(rows)
+
+
+def queue_sms(to, message, category='', priority=OutboundMessage.PRIORITY_NORMAL, send_after=None):
+    """Queue ``message`` to each phone number in ``to``; returns the rows created"""
+    numbers = [number for number in ([to] if isinstance(to, str) else to) if number]
+    if not numbers:
+        return []
+    send_after = _send_after(send_after)
+    rows = OutboundMessage.objects.bulk_create([
+        OutboundMessage(
+            channel='sms', category=category, priority=priority, to=[number],
+            body=message, next_attempt_at=send_after,
+        )
+        for number in numbers
+    ], batch_size=500)
+    _kick_on_commit()
+    return rows
+
+
+def queue_notification(notification, recipients):
+    """Queue the email and/or SMS copies a Notification asks for"""
+    priority = NOTIFICATION_PRIORITIES.get(notification.priority, OutboundMessage.PRIORITY_BULK)
+    send_after = _send_after(notification.scheduled_time)
+    queued = 0
+    for user in recipients:
+        if notification.send_email and user.email:
+            queue_email(
+                [user.email], notification.title, notification.message,
+                category='notification', priority=priority, send_after=send_after,
+            )
+            queued += 1
+        if notification.send_sms and getattr(user, 'phone', ''):
+            queued += len(queue_sms(
+                user.phone, f"{notification.title}: {notification.message}",
+                category='notification', priority=priority, send_after=send_after,
+            ))
+    return queued
+
+
+# =============================================================================
+# Claiming
+# =============================================================================
+
+def claim_batch(channel, batch_size):
+    """Atomically take up to ``batch_size`` due messages for ``channel``"""
+    now = timezone.now()
+    claimable = Q(channel=channel) & (
+        Q(status='pending', next_attempt_at__lte=now)
+        | Q(status='sending', locked_until__lt=now)
+    )
+    candidates = list(
+        OutboundMessage.objects.filter(claimable)
+        .order_by('priority', 'next_attempt_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not candidates:
+        return []
+
+    token = uuid.uuid4().hex
+    lease = timedelta(seconds=getattr(settings, 'OUTBOX_LEASE_SECONDS', 300))
+    OutboundMessage.objects.filter(claimable, id__in=candidates).update(
+        status='sending',
+        claim_token=token,
+        locked_until=now + lease,
+        attempts=F('attempts') + 1,
+    )
+    return list(
+        OutboundMessage.objects.filter(claim_token=token, status='sending')
+        .order_by('priority', 'next_attempt_at', 'id')
+    )
+
+
+def _mark_sent(messages):
+    if messages:
+        OutboundMessage.objects.filter(
+            id__in=[message.pk for message in messages], claim_token=messages[0].claim_token
+        ).update(status='sent', sent_at=timezone.now(), locked_until=None, last_error='')
+        message_sent.send(sender=OutboundMessage, messages=messages)
+
+
+def _retry(message, error):
+    """Put a message back with exponential back-off, or fail it. Returns the new status."""
+    max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+    base = getattr(settings, 'OUTBOX_RETRY_SECONDS', 60)
+    status = 'failed' if message.attempts >= max_attempts else 'pending'
+    delay = min(base * 2 ** (message.attempts - 1), 6 * 3600)
+    OutboundMessage.objects.filter(pk=message.pk, claim_token=message.claim_token).update(
+        status=status,
+        last_error=str(error)[:2000],
+        locked_until=None,
+        next_attempt_at=timezone.now() + timedelta(seconds=delay),
+    )
+    logger.warning(f"{message.channel} {message.pk} to {', '.join(message.to)} not sent "
+                   f"(attempt {message.attempts}): {error}")
+    return status
+
+
+def _defer(messages, seconds):
+    """Rate limited: put messages back without counting the attempt"""
+    if messages:
+        OutboundMessage.objects.filter(
+            id__in=[message.pk for message in messages], claim_token=messages[0].claim_token
+        ).update(
+            status='pending',
+            locked_until=None,
+            attempts=F('attempts') - 1,
+            next_attempt_at=timezone.now() + timedelta(seconds=seconds),
+        )
+    return len(messages)
+
+
+# =============================================================================
+# Delivery
+# =============================================================================
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(channel):
+    """Per-process send rate limit for ``channel``, configured from OUTBOX_RATE_LIMITS"""
+    with _buckets_lock:
+        bucket = _buckets.get(channel)
+        if bucket is None:
+            rate, burst = getattr(settings, 'OUTBOX_RATE_LIMITS', {}).get(channel, (10, 50))
+            bucket = _buckets[channel] = TokenBucket(rate=rate, capacity=burst)
+        return bucket
+
+
+def _email(message, smtp):
+    email = EmailMultiAlternatives(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=message.to,
+        connection=smtp,
+    )
+    if message.html_body:
+        email.attach_alternative(message.html_body, 'text/html')
+    return email
+
+
+def deliver_emails(messages):
+    """Send claimed email over one SMTP connection; returns outcome counts"""
+    counts = {'sent': 0, 'pending': 0, 'failed': 0, 'deferred': 0}
+    smtp = get_connection(fail_silently=False)
+    try:
+        smtp.open()
+    except Exception as e:
+        for message in messages:
+            counts[_retry(message, f"Cannot connect to the mail server: {e}")] += 1
+        return counts
+
+    bucket = get_bucket('email')
+    sent = []
+    try:
+        for index, message in enumerate(messages):
+            admitted, retry_after = bucket.consume()
+            if not admitted:
+                counts['deferred'] += _defer(messages[index:], retry_after)
+                break
+            try:
+                if smtp.send_messages([_email(message, smtp)]):
+                    sent.append(message)
+                else:
+                    counts[_retry(message, "Message was not accepted")] += 1
+            except Exception as e:
+                counts[_retry(message, e)] += 1
+                # The server may have dropped the connection; start a fresh one
+                smtp.close()
+                smtp.open()
+    except Exception as e:
+        logger.error(f"Mail server connection lost: {str(e)}")
+        for message in messages[index + 1:]:
+            counts[_retry(message, e)] += 1
+    finally:
+        smtp.close()
+
+    _mark_sent(sent)
+    counts['sent'] += len(sent)
+    return counts
+
+
+def deliver_sms(messages):
+    """Send claimed SMS, one gateway call per message text and batch of numbers"""
+    counts = {'sent': 0, 'pending': 0, 'failed': 0, 'deferred': 0}
+    backend = get_sms_backend()
+    bucket = get_bucket('sms')
+    per_call = getattr(settings, 'SMS_BATCH_SIZE', 100)
+
+    groups = {}
+    for message in messages:
+        groups.setdefault(message.body, []).append(message)
+
+    done = set()
+    for text, group in groups.items():
+        for start in range(0, len(group), per_call):
+            chunk = group[start:start + per_call]
+            admitted, retry_after = bucket.consume(len(chunk))
+            if not admitted:
+                remaining = [message for message in messages if message.pk not in done]
+                counts['deferred'] += _defer(remaining, retry_after)
+                return counts
+            done.update(message.pk for message in chunk)
+
+            by_number = {}
+            for message in chunk:
+                by_number.setdefault(message.to[0], []).append(message)
+            try:
+                results = backend.send_bulk(text, list(by_number))
+            except Exception as e:
+                results = {number: f"Gateway error: {e}" for number in by_number}
+
+            sent = []
+            for number, chunk_messages in by_number.items():
+                error = results.get(number, 'No status returned')
+                for message in chunk_messages:
+                    if error:
+                        counts[_retry(message, error)] += 1
+                    else:
+                        sent.append(message)
+            _mark_sent(sent)
+            counts['sent'] += len(sent)
+    return counts
+
+
+DELIVERY = {
+    'email': deliver_emails,
+    'sms': deliver_sms,
+}
+
+
+def process_outbox(batch_size=None, max_batches=100, channels=('email', 'sms')):
+    """
+    Deliver due messages, ``batch_size`` at a time per channel. Returns
+    counts per channel, e.g. {'email': {'sent': 12, ...}, 'sms': {...}}.
+    """
+    batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 100)
+    totals = {}
+    for channel in channels:
+        totals[channel] = {'sent': 0, 'pending': 0, 'failed': 0, 'deferred': 0}
+        for _ in range(max_batches):
+            messages = claim_batch(channel, batch_size)
+            if not messages:
+                break
+            counts = DELIVERY[channel](messages)
+            for outcome, count in counts.items():
+                totals[channel][outcome] += count
+            if counts['deferred']:
+                # Over the rate limit: the rest waits for the next run
+                break
+    return totals
+
+
+# =============================================================================
+# Background drain after commit
+# =============================================================================
+
+_drainer = None
+_drainer_lock = threading.Lock()
+_drain_again = threading.Event()
+
+
+def _drain():
+    try:
+        while True:
+            _drain_again.clear()
+            process_outbox()
+            if not _drain_again.is_set():
+                break
+    except Exception as e:
+        logger.error(f"Outbox drain failed: {str(e)}")
+    finally:
+        connection.close()
+
+
+def kick():
+    """Drain the outbox on a background thread (one per process)"""
+    global _drainer
+    with _drainer_lock:
+        if _drainer is not None and _drainer.is_alive():
+            _drain_again.set()
+            return
+        _drainer = threading.Thread(target=_drain, name='outbox-drain', daemon=True)
+        _drainer.start()
+
+
+def _kick_on_commit():
+    if getattr(settings, 'OUTBOX_SEND_ON_COMMIT', True):
+        transaction.on_commit(kick)
+
+
+def retry_failed(messages):
+    """Queue failed messages for another round of attempts; returns how many"""
+    return messages.filter(status='failed').update(
+        status='pending', attempts=0, claim_token='', locked_until=None, next_attempt_at=timezone.now()
+    )
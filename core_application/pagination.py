@@ -0,0 +1,293 @@
+# pagination.py - Keyset pagination and bounded counts for large list views
+#
+# Django's Paginator runs a full COUNT(*) on every request and reaches page N
+# with OFFSET, which scans and discards every earlier row. KeysetPaginator is
+# a drop-in replacement for templates and JSON endpoints:
+#
+# - next_page_number()/previous_page_number() return "N.<cursor>" tokens that
+#   the existing ?page= links carry unchanged. A request with a token seeks
+#   straight to the rows after (or before) the cursor on the sort keys, so page
+#   500 costs the same as page 1. Plain numbers (page links, "Last") still work
+#   through OFFSET.
+# - count is exact up to PAGINATION_EXACT_COUNT_LIMIT rows; above that it is
+#   cached for PAGINATION_COUNT_CACHE_TTL seconds, or taken from planner
+#   statistics for unfiltered tables on PostgreSQL.
+#
+# The sort keys must be non-null columns, given as field names ('-created_at')
+# or F() expressions (F('created_at').desc()); the primary key is appended as
+# a tie-breaker so every row has a unique position.
+
+import base64
+import datetime
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+from django.db.models.expressions import OrderBy
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+COUNT_KEY = 'pagination:count:{}'
+
+
+# =============================================================================
+# Counts
+# =============================================================================
+
+def _table_estimate(queryset):
+    """Planner row estimate for an unfiltered table, or None when unavailable"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql' or queryset.query.where:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] > 0 else None
+
+
+def fast_count(queryset, exact_limit=None):
+    """
+    Return (count, is_estimate). Counts up to ``exact_limit`` rows exactly with
+    a LIMITed subquery; bigger results come from the cache, planner statistics
+    or, once per TTL, a full count.
+    """
+    if exact_limit is None:
+        exact_limit = getattr(settings, 'PAGINATION_EXACT_COUNT_LIMIT', 10000)
+
+    queryset = queryset.order_by()
+    bounded = queryset[:exact_limit + 1].count()
+    if bounded <= exact_limit:
+        return bounded, False
+
+    try:
+        sql, params = queryset.query.sql_with_params()
+        key = COUNT_KEY.format(hashlib.sha1(f"{queryset.db}|{sql}|{params}".encode()).hexdigest())
+    except Exception:
+        # EmptyResultSet and friends: nothing worth caching
+        return queryset.count(), False
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, True
+
+    estimate = _table_estimate(queryset)
+    count = estimate if estimate is not None else queryset.count()
+    cache.set(key, count, getattr(settings, 'PAGINATION_COUNT_CACHE_TTL', 120))
+    return count, estimate is not None
+
+
+class FastCountPaginator(Paginator):
+    """
+    Paginator with a bounded, cached count. Also usable as ModelAdmin.paginator.
+    Pass ``count`` when the view has already computed it.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, count=None):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self._known_count = count
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        if self._known_count is not None:
+            return self._known_count
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        count, self.count_is_estimate = fast_count(self.object_list)
+        return count
+
+
+# =============================================================================
+# Keyset pagination
+# =============================================================================
+
+class CursorEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder truncates to milliseconds; cursors need exact values"""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _encode_cursor(direction, values):
+    payload = json.dumps(values, cls=CursorEncoder, separators=(',', ':'))
+    return direction + base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    direction, payload = cursor[:1], cursor[1:]
+    if direction not in ('n', 'p'):
+        raise ValueError(f"Unknown cursor direction {direction!r}")
+    payload += '=' * (-len(payload) % 4)
+    values = json.loads(base64.urlsafe_b64decode(payload.encode()))
+    if not isinstance(values, list):
+        raise ValueError("Cursor payload is not a list")
+    return direction, values
+
+
+class KeysetPage(Page):
+    """A Page whose next/previous numbers carry cursors for the adjacent rows"""
+
+    def __init__(self, object_list, number, paginator, has_next=None):
+        object_list = list(object_list)
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+        # Cursors are taken now so views may replace object_list with
+        # decorated rows (dicts, tuples) after paginating
+        self._first_key = paginator.key_values(object_list[0]) if object_list else None
+        self._last_key = paginator.key_values(object_list[-1]) if object_list else None
+
+    def has_next(self):
+        if self._has_next is not None:
+            return self._has_next
+        return super().has_next()
+
+    def next_page_number(self):
+        if not self.has_next():
+            raise EmptyPage('That page contains no results')
+        if self._last_key is None or None in self._last_key:
+            return self.number + 1
+        return f"{self.number + 1}.{_encode_cursor('n', self._last_key)}"
+
+    def previous_page_number(self):
+        if self.number <= 1:
+            raise EmptyPage('That page number is less than 1')
+        # Page 1 is cheap by offset and keeps a canonical URL
+        if self.number == 2 or self._first_key is None or None in self._first_key:
+            return self.number - 1
+        return f"{self.number - 1}.{_encode_cursor('p', self._first_key)}"
+
+
+def _ordering_name(item):
+    """'name' or '-name' for a field name, F() or F().asc()/desc() sort key"""
+    if isinstance(item, OrderBy) and isinstance(item.expression, F):
+        return f"{'-' if item.descending else ''}{item.expression.name}"
+    if isinstance(item, F):
+        return item.name
+    if isinstance(item, str) and item.lstrip('-') and item != '?':
+        return item
+    raise ValueError(
+        f"KeysetPaginator cannot seek on the sort key {item!r}; "
+        "use field names or F() expressions, or annotate the value and sort on the annotation"
+    )
+
+
+class KeysetPaginator(FastCountPaginator):
+    """
+    Drop-in Paginator for querysets. ``ordering`` defaults to the queryset's
+    own order_by(); the primary key is appended when missing. Sort keys other
+    than field names and F() expressions raise ValueError.
+    """
+
+    def __init__(self, object_list, per_page, ordering=None, **kwargs):
+        ordering = [_ordering_name(item) for item in ordering or object_list.query.order_by or ['-pk']]
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            ordering.append('-pk' if ordering[-1].startswith('-') else 'pk')
+        self.ordering = ordering
+        self.keys = [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+        super().__init__(object_list.order_by(*ordering), per_page, **kwargs)
+
+    # -- cursors -------------------------------------------------------------
+
+    def key_values(self, obj):
+        values = []
+        for name, _ in self.keys:
+            value = obj
+            for attr in name.split('__'):
+                value = getattr(value, attr, None)
+            values.append(value)
+        return values
+
+    def _key_field(self, name):
+        model = self.object_list.model
+        field = None
+        for part in name.split('__'):
+            if part == 'pk':
+                return model._meta.pk
+            field = model._meta.get_field(part)
+            model = field.related_model or model
+        return field
+
+    def _parse_values(self, values):
+        if len(values) != len(self.keys):
+            raise ValueError("Cursor does not match the sort keys")
+        parsed = []
+        for (name, _), value in zip(self.keys, values):
+            try:
+                field = self._key_field(name)
+            except FieldDoesNotExist:
+                # Annotation: compare the raw JSON value
+                parsed.append(value)
+                continue
+            parsed.append(field.to_python(value))
+        return parsed
+
+    def _seek_filter(self, values, forward):
+        """(k1 > v1) OR (k1 = v1 AND k2 > v2) OR ..., flipped for descending keys"""
+        condition = Q()
+        for index, (name, descending) in enumerate(self.keys):
+            lookup = 'lt' if descending == forward else 'gt'
+            clause = Q(**{f'{name}__{lookup}': values[index]})
+            for (previous_name, _), previous_value in zip(self.keys[:index], values):
+                clause &= Q(**{previous_name: previous_value})
+            condition |= clause
+        return condition
+
+    # -- pages ---------------------------------------------------------------
+
+    def _get_page(self, *args, **kwargs):
+        return KeysetPage(*args, **kwargs)
+
+    def _seek_page(self, number, cursor):
+        direction, values = _decode_cursor(cursor)
+        values = self._parse_values(values)
+        forward = direction == 'n'
+
+        queryset = self.object_list.filter(self._seek_filter(values, forward))
+        if not forward:
+            queryset = queryset.reverse()
+        rows = list(queryset[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if forward:
+            return KeysetPage(rows, number, self, has_next=more)
+        # Walking backwards there is always a next page: the one we came from
+        rows.reverse()
+        return KeysetPage(rows, number, self, has_next=True)
+
+    def page(self, number):
+        page_part, _, cursor = str(number).partition('.')
+        if cursor:
+            try:
+                number = int(page_part)
+                if number < 1:
+                    raise ValueError("Page number must be positive")
+                page = self._seek_page(number, cursor)
+                if page.object_list:
+                    return page
+            except (ValueError, TypeError, FieldDoesNotExist, json.JSONDecodeError, UnicodeDecodeError) as e:
+                logger.debug(f"Ignoring invalid page cursor {number!r}: {str(e)}")
+                raise PageNotAnInteger('That page cursor is not valid')
+        # Rows behind the cursor were deleted: fall back to the page number
+        return super().page(page_part)
+
+    def get_page(self, number):
+        try:
+            return self.page(number if number not in (None, '') else 1)
+        except PageNotAnInteger:
+            return self.page(1)
+        except EmptyPage:
+            return self.page(self.num_pages)
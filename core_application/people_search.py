@@ -0,0 +1,313 @@
+# people_search.py - Indexed search over students, lecturers and staff
+#
+# The list and lookup views used to OR together icontains filters over names,
+# usernames, emails, IDs and programme names; every one of those is a leading
+# wildcard scan across joins. Instead each profile is flattened into one
+# PersonSearchEntry row (kept current by signals.py) and matched through:
+#
+#   sqlite     - FTS5 virtual table people_search_fts, prefix queries ranked by bm25
+#   postgresql - pg_trgm GIN index on search_text, ranked by trigram similarity
+#   other      - plain LIKE over the single denormalized column
+#
+# Views call filter_people() to narrow a queryset they keep ordering and
+# paginating themselves, or search_people() for a ranked top-N lookup.
+
+from difflib import SequenceMatcher
+import logging
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.expressions import RawSQL
+
+from .models import Lecturer, Staff, Student
+from .models_search import PersonSearchEntry
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'people_search_fts'
+
+PERSON_MODELS = {
+    'student': Student,
+    'lecturer': Lecturer,
+    'staff': Staff,
+}
+
+# User fields that appear in search documents; saves touching only other
+# fields (last_login on every sign-in) skip re-indexing
+INDEXED_USER_FIELDS = {'first_name', 'last_name', 'username', 'email'}
+INDEXED_PROFILE_FIELDS = {
+    'student': {'student_id', 'programme', 'programme_id', 'user', 'user_id'},
+    'lecturer': {'employee_number', 'user', 'user_id'},
+    'staff': {'employee_number', 'designation', 'user', 'user_id'},
+}
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+# =============================================================================
+# Normalisation
+# =============================================================================
+
+def tokenize(text):
+    """Lower-case alphanumeric tokens, the same split FTS5's unicode61 makes"""
+    return _TOKEN.findall((text or '').lower())
+
+
+def normalize_identifier(value):
+    """
+    Canonical form of a registration or employee number: separators dropped
+    and leading zeros stripped from numeric segments, so SC211/0540/2025,
+    sc211-540-2025 and SC211 0540 2025 all become sc2115402025.
+    """
+    segments = []
+    for token in tokenize(value):
+        if token.isdigit():
+            token = token.lstrip('0') or '0'
+        segments.append(token)
+    return ''.join(segments)
+
+
+def identifier_terms(value):
+    """Extra tokens indexed for an identifier so prefixes of any spelling match"""
+    tokens = tokenize(value)
+    terms = [token.lstrip('0') for token in tokens if token.isdigit() and token.startswith('0')]
+    terms = [term for term in terms if term]
+    if len(tokens) > 1:
+        terms.append(''.join(tokens))
+        terms.append(normalize_identifier(value))
+    return terms
+
+
+def looks_like_identifier(query):
+    return any(char.isdigit() for char in query)
+
+
+# =============================================================================
+# Search documents
+# =============================================================================
+
+def _document(person_type, profile):
+    user = profile.user
+    if person_type == 'student':
+        identifier = profile.student_id
+        extra = [profile.programme.name, profile.programme.code]
+    elif person_type == 'lecturer':
+        identifier = profile.employee_number
+        extra = []
+    else:
+        identifier = profile.employee_number
+        extra = [profile.designation]
+
+    fields = [user.first_name, user.last_name, user.username, user.email, identifier] + extra
+    tokens = []
+    for field in fields:
+        tokens.extend(tokenize(field))
+    tokens.extend(identifier_terms(identifier))
+
+    return PersonSearchEntry(
+        person_type=person_type,
+        object_id=profile.pk,
+        user_id=user.pk,
+        display_name=f"{user.first_name} {user.last_name}".strip()[:300],
+        identifier=identifier[:50],
+        identifier_key=normalize_identifier(identifier)[:50],
+        search_text=' '.join(tokens),
+    )
+
+
+def _profiles(person_type):
+    related = ['user', 'programme'] if person_type == 'student' else ['user']
+    return PERSON_MODELS[person_type].objects.select_related(*related)
+
+
+def index_person(person_type, profile):
+    """Create or refresh the search entry for one profile"""
+    document = _document(person_type, profile)
+    PersonSearchEntry.objects.update_or_create(
+        person_type=person_type,
+        object_id=profile.pk,
+        defaults={
+            'user_id': document.user_id,
+            'display_name': document.display_name,
+            'identifier': document.identifier,
+            'identifier_key': document.identifier_key,
+            'search_text': document.search_text,
+        },
+    )
+
+
+def remove_person(person_type, object_id):
+    PersonSearchEntry.objects.filter(person_type=person_type, object_id=object_id).delete()
+
+
+def reindex_user(user_id):
+    """Refresh every profile entry of a user after their name or email changed"""
+    for person_type, object_id in PersonSearchEntry.objects.filter(
+        user_id=user_id
+    ).values_list('person_type', 'object_id'):
+        profile = _profiles(person_type).filter(pk=object_id).first()
+        if profile is not None:
+            index_person(person_type, profile)
+
+
+def reindex_queryset(person_type, queryset, batch_size=500):
+    """Rebuild the entries for ``queryset`` (e.g. students of a renamed programme)"""
+    object_ids = list(queryset.values_list('pk', flat=True))
+    with transaction.atomic():
+        PersonSearchEntry.objects.filter(person_type=person_type, object_id__in=object_ids).delete()
+        documents = [
+            _document(person_type, profile)
+            for profile in _profiles(person_type).filter(pk__in=object_ids).iterator(chunk_size=batch_size)
+        ]
+        PersonSearchEntry.objects.bulk_create(documents, batch_size=batch_size)
+    return len(documents)
+
+
+def rebuild_search_index(person_types=None, batch_size=500):
+    """
+    Rebuild the index from scratch. Needed after writes that bypass model
+    signals: bulk_create, queryset.update() or raw SQL imports.
+    """
+    counts = {}
+    for person_type in person_types or PERSON_MODELS:
+        with transaction.atomic():
+            PersonSearchEntry.objects.filter(person_type=person_type).delete()
+            documents = []
+            for profile in _profiles(person_type).iterator(chunk_size=batch_size):
+                documents.append(_document(person_type, profile))
+                if len(documents) >= batch_size:
+                    PersonSearchEntry.objects.bulk_create(documents)
+                    counts[person_type] = counts.get(person_type, 0) + len(documents)
+                    documents = []
+            PersonSearchEntry.objects.bulk_create(documents)
+            counts[person_type] = counts.get(person_type, 0) + len(documents)
+        logger.info(f"People search index rebuilt for {person_type}: {counts[person_type]} entries")
+    return counts
+
+
+# =============================================================================
+# Matching
+# =============================================================================
+
+def search_backend():
+    backend = getattr(settings, 'PEOPLE_SEARCH_BACKEND', 'auto')
+    if backend != 'auto':
+        return backend
+    return {'sqlite': 'fts5', 'postgresql': 'trigram'}.get(connection.vendor, 'basic')
+
+
+def _fts_expression(tokens):
+    # Tokens are alphanumeric only, so quoting cannot be broken out of
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def match_entries(query, person_type=None):
+    """PersonSearchEntry queryset matching every term of ``query`` as a prefix"""
+    tokens = tokenize(query)
+    entries = PersonSearchEntry.objects.all()
+    if person_type:
+        entries = entries.filter(person_type=person_type)
+    if not tokens:
+        return entries.none()
+
+    backend = search_backend()
+    if backend == 'fts5':
+        return entries.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            [_fts_expression(tokens)],
+        ))
+
+    # The pg_trgm GIN index serves these LIKE '%token%' filters on postgresql
+    for token in tokens:
+        entries = entries.filter(search_text__contains=token)
+    return entries
+
+
+def filter_people(queryset, query, person_type):
+    """
+    Narrow a Student/Lecturer/Staff queryset to the people matching ``query``.
+    Ordering, further filters and pagination stay with the caller.
+    """
+    query = (query or '').strip()
+    if not query:
+        return queryset
+    return queryset.filter(pk__in=match_entries(query, person_type).values('object_id'))
+
+
+def _ranked(entries, query):
+    """Order matches: exact identifier first, then by backend relevance"""
+    key = normalize_identifier(query)
+    exact = Case(When(identifier_key=key, then=Value(0)), default=Value(1), output_field=IntegerField())
+    entries = entries.annotate(exact_identifier=exact)
+
+    backend = search_backend()
+    if backend == 'fts5':
+        rank = RawSQL(
+            f"SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = {PersonSearchEntry._meta.db_table}.id",
+            [_fts_expression(tokenize(query))],
+        )
+        return entries.annotate(relevance=rank).order_by('exact_identifier', 'relevance', 'display_name')
+    if backend == 'trigram':
+        from django.contrib.postgres.search import TrigramSimilarity
+        return entries.annotate(
+            relevance=TrigramSimilarity('search_text', query.lower())
+        ).order_by('exact_identifier', '-relevance', 'display_name')
+    return entries.order_by('exact_identifier', 'display_name')
+
+
+def _fuzzy_identifier_matches(query, person_type, exclude, limit, within=None):
+    """
+    Typo-tolerant fallback for registration numbers: candidates sharing the
+    identifier's leading characters, scored by similarity of the canonical form.
+    """
+    key = normalize_identifier(query)
+    if len(key) < 4:
+        return []
+
+    threshold = getattr(settings, 'PEOPLE_SEARCH_FUZZY_THRESHOLD', 0.85)
+    candidates = PersonSearchEntry.objects.filter(identifier_key__startswith=key[:3])
+    if person_type:
+        candidates = candidates.filter(person_type=person_type)
+    if within is not None:
+        candidates = candidates.filter(object_id__in=within.values('pk'))
+    candidates = candidates.exclude(id__in=exclude)[:getattr(settings, 'PEOPLE_SEARCH_FUZZY_CANDIDATES', 500)]
+
+    scored = []
+    for entry in candidates:
+        score = SequenceMatcher(None, key, entry.identifier_key).ratio()
+        if score >= threshold:
+            scored.append((score, entry))
+    scored.sort(key=lambda item: (-item[0], item[1].identifier_key))
+    return [entry for _, entry in scored[:limit]]
+
+
+def search_people(query, person_type=None, limit=20, within=None):
+    """
+    Ranked PersonSearchEntry matches for ``query``. ``within`` restricts the
+    result to a queryset of profiles (e.g. active students only). When the
+    query looks like a registration number and prefix matching comes up
+    short, near-miss identifiers are appended.
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+
+    entries = match_entries(query, person_type)
+    if within is not None:
+        entries = entries.filter(object_id__in=within.values('pk'))
+    results = list(_ranked(entries, query)[:limit])
+
+    if len(results) < limit and looks_like_identifier(query):
+        results += _fuzzy_identifier_matches(
+            query, person_type, [entry.id for entry in results], limit - len(results), within
+        )
+    return results
+
+
+def search_profiles(queryset, query, person_type, limit=20):
+    """search_people() resolved to profile objects from ``queryset``, in rank order"""
+    entries = search_people(query, person_type, limit, within=queryset)
+    profiles = queryset.in_bulk([entry.object_id for entry in entries])
+    return [profiles[entry.object_id] for entry in entries if entry.object_id in profiles]
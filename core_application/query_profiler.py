@@ -0,0 +1,205 @@
+# query_profiler.py - Per-request SQL capture, N+1 fingerprinting and storage
+#
+# Used by QueryProfilingMiddleware. Profiling is opt-in: either globally with
+# QUERY_PROFILING_ENABLED or per request by an admin sending a signed
+# X-Profile-Token header (see issue_profile_token).
+
+from collections import Counter, deque
+import json
+import logging
+import random
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = 'X-Profile-Token'
+PROFILE_TOKEN_SALT = 'core_application.query_profiler'
+
+
+# =============================================================================
+# Settings helpers
+# =============================================================================
+
+def profiling_setting(name, default):
+    return getattr(settings, f'QUERY_PROFILING_{name}', default)
+
+
+# =============================================================================
+# SQL fingerprints
+# =============================================================================
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint_sql(sql):
+    """
+    Reduce a statement to its shape so the same query issued with different
+    parameters (the N+1 signature) collapses onto one fingerprint.
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+# =============================================================================
+# Capture
+# =============================================================================
+
+class QueryCapture:
+    """
+    connection.execute_wrapper hook that records every statement with its
+    duration. Works with DEBUG off, unlike connection.queries.
+    """
+
+    def __init__(self, max_queries=None):
+        self.max_queries = max_queries or profiling_setting('MAX_QUERIES', 2000)
+        self.queries = []
+        self.query_count = 0
+        self.db_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.query_count += 1
+            self.db_time += duration
+            if len(self.queries) < self.max_queries:
+                self.queries.append((sql, duration))
+
+    def duplicates(self, threshold=None):
+        """Return [(fingerprint, count, total_ms)] for repeated query shapes"""
+        threshold = threshold or profiling_setting('DUPLICATE_THRESHOLD', 3)
+        counts = Counter()
+        times = Counter()
+        for sql, duration in self.queries:
+            fingerprint = fingerprint_sql(sql)
+            counts[fingerprint] += 1
+            times[fingerprint] += duration
+
+        return [
+            (fingerprint, count, round(times[fingerprint] * 1000, 2))
+            for fingerprint, count in counts.most_common()
+            if count >= threshold
+        ]
+
+
+# =============================================================================
+# Ring buffer of recent profiles
+# =============================================================================
+
+_recent_profiles = deque(maxlen=profiling_setting('BUFFER_SIZE', 200))
+_recent_lock = threading.Lock()
+
+
+def record_profile(profile):
+    with _recent_lock:
+        _recent_profiles.appendleft(profile)
+
+
+def recent_profiles():
+    """Newest-first snapshot of the profiles kept in this process"""
+    with _recent_lock:
+        return list(_recent_profiles)
+
+
+def clear_profiles():
+    with _recent_lock:
+        _recent_profiles.clear()
+
+
+def build_profile(request, response, capture, total_time):
+    """Summarise a captured request into a plain dict"""
+    resolver_match = getattr(request, 'resolver_match', None)
+    user = getattr(request, 'user', None)
+    duplicates = capture.duplicates()
+
+    return {
+        'timestamp': timezone.now(),
+        'path': request.path[:255],
+        'method': request.method,
+        'view_name': resolver_match.view_name if resolver_match else '',
+        'status': response.status_code,
+        'user_id': user.pk if user is not None and user.is_authenticated else None,
+        'total_ms': round(total_time * 1000, 2),
+        'db_ms': round(capture.db_time * 1000, 2),
+        'query_count': capture.query_count,
+        'duplicate_count': sum(count - 1 for _, count, _ in duplicates),
+        'duplicates': duplicates[:10],
+        'slowest': sorted(
+            ((sql, round(duration * 1000, 2)) for sql, duration in capture.queries),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:5],
+    }
+
+
+def should_sample():
+    rate = profiling_setting('SAMPLE_RATE', 0.1)
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def store_sample(profile):
+    """Persist the compact summary of a profile. Never raises."""
+    from .models_monitoring import RequestProfileSample
+
+    try:
+        RequestProfileSample.objects.create(
+            path=profile['path'],
+            view_name=profile['view_name'][:150],
+            method=profile['method'],
+            status_code=profile['status'],
+            user_id=profile['user_id'],
+            total_ms=profile['total_ms'],
+            db_ms=profile['db_ms'],
+            query_count=profile['query_count'],
+            duplicate_count=profile['duplicate_count'],
+            top_duplicates=json.dumps([
+                {'sql': fingerprint[:500], 'count': count, 'ms': ms}
+                for fingerprint, count, ms in profile['duplicates'][:3]
+            ]),
+        )
+    except Exception as e:
+        logger.error(f"Failed to store request profile for {profile['path']}: {str(e)}")
+
+
+# =============================================================================
+# Signed per-request opt-in
+# =============================================================================
+
+def issue_profile_token(user):
+    """Signed token an admin sends as X-Profile-Token to profile one request"""
+    return signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).sign(str(user.pk))
+
+
+def token_allows_profiling(request):
+    """True when the request carries a valid, unexpired token for its admin user"""
+    token = request.headers.get(PROFILE_TOKEN_HEADER)
+    if not token:
+        return False
+
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return False
+    if not (user.is_superuser or getattr(user, 'user_type', None) == 'admin'):
+        return False
+
+    try:
+        user_pk = signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).unsign(
+            token, max_age=profiling_setting('TOKEN_MAX_AGE', 60 * 60 * 8)
+        )
+    except signing.BadSignature:
+        return False
+    return user_pk == str(user.pk)
@@ -0,0 +1,254 @@
+# ratelimit.py - Sliding-window rate limits kept in the cache
+#
+# Each limit is a scope in settings.RATE_LIMITS, (requests, window seconds),
+# counted per identity (client IP, user, a POSTed username, ...) in the
+# RATE_LIMIT_CACHE cache - local memory by default, or a file-based / shared
+# cache so that all worker processes see the same counters. Nothing here
+# touches the database.
+#
+# Client IPs come from REMOTE_ADDR unless TRUSTED_PROXY_COUNT reverse proxies
+# sit in front of the app; only then is X-Forwarded-For read, taking the
+# address the outermost trusted proxy saw, so clients cannot pick their own.
+#
+# The window slides by weighting the previous fixed window: with ``elapsed``
+# seconds into the current window,
+#
+#     count = current + previous * (1 - elapsed / window)
+#
+# which needs two counters per identity and no per-request timestamps.
+#
+# Used three ways:
+#   - @ratelimit('login_user', key='post:username') on a view
+#   - RateLimitMiddleware with settings.RATE_LIMIT_RULES (webhooks, AJAX)
+#   - get_limiter(scope).add()/.count() directly, e.g. to count failures
+
+from functools import wraps
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from django.shortcuts import render
+
+logger = logging.getLogger(__name__)
+
+KEY = 'rl:{}:{}:{}'
+
+
+def _cache():
+    return caches[getattr(settings, 'RATE_LIMIT_CACHE', 'default')]
+
+
+def _enabled():
+    return getattr(settings, 'RATE_LIMIT_ENABLED', True)
+
+
+# =============================================================================
+# Sliding-window counter
+# =============================================================================
+
+class SlidingWindow:
+    """At most ``limit`` hits per identity in any ``window`` seconds"""
+
+    def __init__(self, scope, limit, window):
+        self.scope = scope
+        self.limit = int(limit)
+        self.window = int(window)
+
+    def _keys(self, ident, now):
+        digest = hashlib.md5(str(ident).encode()).hexdigest()
+        index = int(now // self.window)
+        weight = 1 - (now % self.window) / self.window
+        return KEY.format(self.scope, digest, index), KEY.format(self.scope, digest, index - 1), weight
+
+    def _counts(self, ident, now):
+        current_key, previous_key, weight = self._keys(ident, now)
+        counts = _cache().get_many([current_key, previous_key])
+        return counts.get(current_key, 0), counts.get(previous_key, 0), weight
+
+    def count(self, ident, now=None):
+        """Hits for ``ident`` in the last window"""
+        current, previous, weight = self._counts(ident, now or time.time())
+        return current + previous * weight
+
+    def add(self, ident, cost=1, now=None):
+        """Record ``cost`` hits for ``ident`` unconditionally"""
+        current_key, _, _ = self._keys(ident, now or time.time())
+        cache = _cache()
+        cache.add(current_key, 0, self.window * 2)
+        try:
+            return cache.incr(current_key, cost)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(current_key, cost, self.window * 2)
+            return cost
+
+    def hit(self, ident, cost=1, now=None):
+        """
+        Record a hit if it fits in the limit. Returns (allowed, retry_after);
+        rejected hits are not counted.
+        """
+        now = now or time.time()
+        current_key, previous_key, weight = self._keys(ident, now)
+        previous = _cache().get(previous_key, 0)
+        # Increment first so concurrent hits cannot all pass the same check
+        current = self.add(ident, cost, now)
+        if current + previous * weight <= self.limit:
+            return True, 0
+        try:
+            _cache().decr(current_key, cost)
+        except ValueError:
+            pass
+        return False, self.retry_after(current - cost, previous, cost, now)
+
+    def retry_after(self, current, previous, cost, now):
+        """Seconds until ``cost`` more hits would fit"""
+        elapsed = now % self.window
+        remaining = self.window - elapsed
+        if current + cost > self.limit:
+            # Next window, once this window's hits (then "previous") decay enough
+            decay = self.window * (1 - (self.limit - cost) / current) if current else 0
+            wait = remaining + max(decay, 0)
+        else:
+            # The previous window's weight decays; it is gone at the rollover
+            wait = min(self.window * (1 - (self.limit - current - cost) / previous) - elapsed, remaining)
+        return max(int(wait) + 1, 1)
+
+    def reset(self, ident, now=None):
+        current_key, previous_key, _ = self._keys(ident, now or time.time())
+        _cache().delete_many([current_key, previous_key])
+
+
+def get_limiter(scope):
+    """The limiter for ``scope``, configured from settings.RATE_LIMITS"""
+    limit, window = getattr(settings, 'RATE_LIMITS', {}).get(scope, (60, 60))
+    return SlidingWindow(scope, limit, window)
+
+
+def first_in_window(scope, ident, window):
+    """True once per ``window`` seconds for (scope, ident), e.g. to alert once per lockout"""
+    digest = hashlib.md5(str(ident).encode()).hexdigest()
+    return _cache().add(KEY.format(scope, digest, 'once'), 1, window)
+
+
+# =============================================================================
+# Request identities and responses
+# =============================================================================
+
+def client_ip(request):
+    """
+    The client's address. X-Forwarded-For is only read behind
+    TRUSTED_PROXY_COUNT proxies, each of which appends the address it saw.
+    """
+    proxies = getattr(settings, 'TRUSTED_PROXY_COUNT', 0)
+    if proxies:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def request_identity(request, key):
+    """
+    The identity a limit is counted against:
+    'ip', 'user' (falls back to the IP when anonymous), 'post:<field>',
+    'ip+post:<field>', or a callable taking the request.
+    """
+    if callable(key):
+        return key(request)
+    if key == 'ip':
+        return client_ip(request)
+    if key == 'user':
+        user = getattr(request, 'user', None)
+        return f"user:{user.pk}" if user is not None and user.is_authenticated else client_ip(request)
+    if key.startswith('ip+post:'):
+        return f"{client_ip(request)}|{request.POST.get(key[8:], '').strip().lower()}"
+    if key.startswith('post:'):
+        return request.POST.get(key[5:], '').strip().lower()
+    raise ValueError(f"Unknown rate limit key {key!r}")
+
+
+def wants_json(request):
+    return (
+        request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+        or request.content_type == 'application/json'
+        or request.path.startswith('/api/')
+    )
+
+
+def rate_limited_response(request, retry_after):
+    """429 with Retry-After, as JSON for AJAX/API callers"""
+    if wants_json(request):
+        response = JsonResponse({
+            'error': 'Too many requests, please retry shortly.',
+            'retry_after': retry_after,
+            'success': False,
+        }, status=429)
+    else:
+        response = render(request, '429.html', {'retry_after': retry_after}, status=429)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def check_request(request, scope, key='ip', methods=None):
+    """Count ``request`` against ``scope``; returns a 429 response or None"""
+    if not _enabled() or (methods and request.method not in methods):
+        return None
+    ident = request_identity(request, key)
+    if not ident:
+        return None
+    allowed, retry_after = get_limiter(scope).hit(ident)
+    if allowed:
+        return None
+    logger.warning(f"Rate limit '{scope}' exceeded by {ident} on {request.path}")
+    return rate_limited_response(request, retry_after)
+
+
+# =============================================================================
+# Decorator and middleware
+# =============================================================================
+
+def ratelimit(scope, key='ip', methods=('POST',)):
+    """
+    Decorator that answers 429 once ``key`` exceeds the ``scope`` limit.
+    ``methods=None`` counts every method.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            response = check_request(request, scope, key, methods)
+            if response is not None:
+                return response
+            return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
+
+
+class RateLimitMiddleware:
+    """
+    Apply settings.RATE_LIMIT_RULES, each a dict with ``scope``, ``key`` and
+    optionally ``paths`` (prefixes), ``methods`` and ``ajax`` (only
+    XMLHttpRequest requests). Must come after AuthenticationMiddleware for
+    ``key='user'``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rules = getattr(settings, 'RATE_LIMIT_RULES', [])
+
+    def _matches(self, rule, request):
+        if rule.get('paths') and not any(request.path.startswith(path) for path in rule['paths']):
+            return False
+        if rule.get('ajax') and request.headers.get('X-Requested-With') != 'XMLHttpRequest':
+            return False
+        return True
+
+    def __call__(self, request):
+        for rule in self.rules:
+            if self._matches(rule, request):
+                response = check_request(request, rule['scope'], rule.get('key', 'ip'), rule.get('methods'))
+                if response is not None:
+                    return response
+        return self.get_response(request)
@@ -0,0 +1,103 @@
+# receipt_sequence.py - Collision-free receipt numbers
+#
+# Receipts used to be numbered by finding the highest FeePayment receipt with
+# the same prefix and adding one: a prefix scan per payment, and two postings
+# running at the same time could both read the same "last" number. Numbers
+# now come from a ReceiptSequence counter per prefix and year, advanced with
+# one UPDATE ... SET last_value = last_value + 1.
+#
+# The UPDATE runs in its own short transaction on an allocator thread (which
+# has its own database connection) and commits at once, so the counter row
+# is only locked for that statement and concurrent postings under the same
+# prefix do not wait for each other's posting transactions. The price is
+# gaps: a posting that rolls back does not give its number back.
+#
+# With RECEIPT_NUMBERS_GAPLESS, or on SQLite (one writer at a time anyway,
+# and a second connection would wait on the caller's write lock), the
+# UPDATE runs in the caller's transaction instead: a rolled back posting
+# returns its number, and postings under one prefix and year run one at a
+# time.
+#
+# The first allocation for a prefix in a year seeds the counter from the
+# receipts already issued under the old scheme.
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import FeePayment
+from .models_receipts import ReceiptSequence
+
+RECEIPT_FORMAT = '{prefix}-{year}-{sequence:06d}'
+ALLOCATOR_THREADS = 4
+
+_allocator = None
+_allocator_lock = threading.Lock()
+
+
+def _issued_max(prefix, year):
+    """Highest sequence already used in FeePayment receipts for prefix and year"""
+    issued = FeePayment.objects.filter(
+        receipt_number__startswith=f"{prefix}-{year}-"
+    ).values_list('receipt_number', flat=True)
+    highest = 0
+    # Compared as numbers: '...-1000000' sorts before '...-999999' as text
+    for receipt_number in issued.iterator(chunk_size=2000):
+        suffix = receipt_number.rsplit('-', 1)[-1]
+        if suffix.isdigit():
+            highest = max(highest, int(suffix))
+    return highest
+
+
+def _advance(prefix, year):
+    """Add one to the counter for prefix and year and return the new value"""
+    counter = ReceiptSequence.objects.filter(prefix=prefix, year=year)
+    with transaction.atomic():
+        if not counter.update(last_value=F('last_value') + 1, updated_at=timezone.now()):
+            try:
+                with transaction.atomic():
+                    ReceiptSequence.objects.create(
+                        prefix=prefix, year=year, last_value=_issued_max(prefix, year) + 1
+                    )
+            except IntegrityError:
+                # Another posting created the counter first
+                counter.update(last_value=F('last_value') + 1, updated_at=timezone.now())
+        return counter.values_list('last_value', flat=True).get()
+
+
+def _advance_and_release(prefix, year):
+    try:
+        return _advance(prefix, year)
+    finally:
+        # Allocator threads keep their connection like a request would
+        connection.close_if_unusable_or_obsolete()
+
+
+def _in_caller_transaction():
+    return getattr(settings, 'RECEIPT_NUMBERS_GAPLESS', False) or connection.vendor == 'sqlite'
+
+
+def allocate(prefix, year=None):
+    """
+    Reserve the next number for ``prefix`` in ``year`` (default: this year).
+    Committed at once unless numbers are gapless (see above).
+    """
+    global _allocator
+    year = year or timezone.now().year
+    if _in_caller_transaction():
+        return _advance(prefix, year)
+
+    with _allocator_lock:
+        if _allocator is None:
+            _allocator = ThreadPoolExecutor(max_workers=ALLOCATOR_THREADS, thread_name_prefix='receipt-allocator')
+    return _allocator.submit(_advance_and_release, prefix, year).result()
+
+
+def next_receipt_number(prefix, year=None):
+    """The next receipt number for ``prefix``, e.g. ``EQU-2025-000042``"""
+    year = year or timezone.now().year
+    return RECEIPT_FORMAT.format(prefix=prefix, year=year, sequence=allocate(prefix, year))
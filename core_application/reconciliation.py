@@ -0,0 +1,380 @@
+# reconciliation.py - Bulk reconciliation of bank and M-Pesa statements
+#
+# reconcile_statement() streams a statement file row by row and reconciles it
+# in chunks of RECONCILIATION_CHUNK_SIZE lines. For each chunk the posted
+# FeePayments carrying any of the chunk's references are loaded with one
+# query and hashed by reference (transaction_reference or mpesa_receipt);
+# every line is then checked against that table:
+#
+#   - the reference must exist and none of its payments may be matched yet
+#   - the line amount must equal the sum of the payments with that reference
+#     (an overpayment posted across semesters shares one reference)
+#   - every payment date must be within RECONCILIATION_DATE_WINDOW_DAYS of
+#     the statement date
+#
+# Matches and exceptions are written with bulk_create() per chunk and
+# pending payments are completed with one UPDATE per chunk; all other
+# credits become StatementExceptions for review. Memory use depends on the
+# chunk size, not the file size.
+#
+# The file is hashed before anything is written, so a statement that was
+# imported before is rejected without a BankStatement row or a second match.
+
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from pathlib import Path
+import csv
+import hashlib
+import io
+import logging
+import shutil
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .analytics_cache import bump_entity_version
+from .models import FeePayment
+from .models_reconciliation import BankStatement, StatementException, StatementMatch
+
+logger = logging.getLogger(__name__)
+
+# Header names (lower case) each statement layout uses for the fields we read
+COLUMN_ALIASES = {
+    'bank': {
+        'reference': ('transaction reference', 'transaction ref', 'transaction id', 'reference',
+                      'bank reference', 'customer reference', 'ref'),
+        'amount': ('credit', 'credit amount', 'amount', 'paid in', 'deposit'),
+        'date': ('value date', 'transaction date', 'posting date', 'date'),
+        'narrative': ('narrative', 'description', 'details', 'particulars'),
+    },
+    'mpesa': {
+        'reference': ('receipt no.', 'receipt no', 'receipt number', 'transaction id'),
+        'amount': ('paid in',),
+        'date': ('completion time', 'initiation time', 'transaction date', 'date'),
+        'narrative': ('details', 'other party info'),
+        'status': ('transaction status',),
+    },
+}
+DATE_FORMATS = (
+    '%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%d/%m/%Y', '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M', '%d-%m-%Y', '%d-%b-%Y', '%d %b %Y',
+)
+HEADER_SCAN_ROWS = 20
+EXCLUDED_PAYMENT_STATUSES = ('failed', 'reversed', 'refunded')
+
+
+class StatementError(Exception):
+    """The file cannot be reconciled (unknown layout, already imported, ...)"""
+
+
+class _Line:
+    __slots__ = ('number', 'reference', 'amount', 'value_date', 'narrative', 'error')
+
+    def __init__(self, number, reference='', amount=None, value_date=None, narrative='', error=''):
+        self.number = number
+        self.reference = reference
+        self.amount = amount
+        self.value_date = value_date
+        self.narrative = narrative
+        self.error = error
+
+
+# =============================================================================
+# Reading statements
+# =============================================================================
+
+class _RawReader(io.RawIOBase):
+    """Binary reader over any object with read(), e.g. an UploadedFile"""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.raw.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _checksum(fileobj, block_size=1 << 20):
+    """SHA-256 of a seekable binary file object, leaving it at the start"""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(block_size), b''):
+        digest.update(block)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def _parse_amount(value):
+    value = (value or '').strip().replace(',', '').replace('KES', '').replace('Ksh', '').strip()
+    if not value:
+        return None
+    if value.startswith('(') and value.endswith(')'):
+        value = f"-{value[1:-1]}"
+    return Decimal(value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value):
+    # Statements repeat the same few dates on thousands of lines
+    value = (value or '').strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date {value!r}")
+
+
+def _find_header(reader, source):
+    """
+    Skip any preamble (M-Pesa exports start with the customer details) and
+    return (source, {field: column index}, rows read).
+    """
+    sources = [source] if source else ['mpesa', 'bank']
+    for row_number, row in enumerate(reader, start=1):
+        header = [cell.strip().lower() for cell in row]
+        for candidate in sources:
+            columns = {}
+            for field, aliases in COLUMN_ALIASES[candidate].items():
+                for alias in aliases:
+                    if alias in header:
+                        columns[field] = header.index(alias)
+                        break
+            if {'reference', 'amount', 'date'} <= columns.keys():
+                return candidate, columns, row_number
+        if row_number >= HEADER_SCAN_ROWS:
+            break
+    raise StatementError("No statement header with reference, amount and date columns found")
+
+
+def read_statement(text, source=None):
+    """
+    Open a statement from the text stream ``text``. Returns the detected
+    source and a generator of its lines: a _Line per credit (with ``error``
+    set when it cannot be read) and None for debits and incomplete rows.
+    """
+    reader = csv.reader(text)
+    source, columns, header_row = _find_header(reader, source)
+
+    def cell(row, field):
+        index = columns.get(field)
+        return row[index].strip() if index is not None and index < len(row) else ''
+
+    def lines():
+        for line_number, row in enumerate(reader, start=header_row + 1):
+            if not any(value.strip() for value in row):
+                continue
+            if 'status' in columns and cell(row, 'status').lower() not in ('', 'completed'):
+                yield None
+                continue
+
+            line = _Line(line_number, reference=cell(row, 'reference')[:100], narrative=cell(row, 'narrative')[:255])
+            try:
+                line.amount = _parse_amount(cell(row, 'amount'))
+            except InvalidOperation:
+                line.error = f"Unreadable amount {cell(row, 'amount')!r}"
+                yield line
+                continue
+            # Only credits pay fees; debits and charges are not reconciled
+            if not line.amount or line.amount <= 0:
+                yield None
+                continue
+            try:
+                line.value_date = _parse_date(cell(row, 'date'))
+            except ValueError as e:
+                line.error = str(e)
+            yield line
+
+    return source, lines()
+
+
+# =============================================================================
+# Matching
+# =============================================================================
+
+def _match_chunk(statement, lines, window):
+    """Hash-join one chunk of lines against FeePayment; returns chunk totals"""
+    references = {line.reference for line in lines if line.reference}
+    by_reference = {}
+    if references:
+        rows = FeePayment.objects.filter(
+            Q(transaction_reference__in=references) | Q(mpesa_receipt__in=references)
+        ).exclude(
+            payment_status__in=EXCLUDED_PAYMENT_STATUSES
+        ).values_list('id', 'transaction_reference', 'mpesa_receipt', 'amount_paid', 'payment_date', 'payment_status')
+        for row in rows:
+            for reference in {row[1], row[2]} & references:
+                by_reference.setdefault(reference, []).append(row)
+
+    payment_ids = {row[0] for group in by_reference.values() for row in group}
+    reconciled = set(
+        StatementMatch.objects.filter(fee_payment_id__in=payment_ids).values_list('fee_payment_id', flat=True)
+    ) if payment_ids else set()
+
+    matched_at = timezone.now()
+    matches, exceptions, to_complete = [], [], []
+    matched_amount = Decimal('0')
+
+    def exception(line, reason, detail='', payment_id=None):
+        exceptions.append(StatementException(
+            statement=statement, line_number=line.number, reference=line.reference,
+            amount=line.amount, value_date=line.value_date, narrative=line.narrative,
+            reason=reason, detail=detail[:255], fee_payment_id=payment_id,
+        ))
+
+    for line in lines:
+        if line.error:
+            exception(line, 'invalid', line.error)
+            continue
+        if not line.reference:
+            exception(line, 'no_reference')
+            continue
+        group = by_reference.get(line.reference)
+        if not group:
+            exception(line, 'unmatched')
+            continue
+
+        first_id = group[0][0]
+        if any(row[0] in reconciled for row in group):
+            exception(line, 'already_matched', payment_id=first_id)
+            continue
+        posted = sum((row[3] for row in group), Decimal('0'))
+        if posted != line.amount:
+            exception(line, 'amount_mismatch', f"Posted KES {posted:,.2f}", first_id)
+            continue
+        if any(abs((row[4] - line.value_date).days) > window for row in group):
+            dates = ', '.join(sorted({row[4].isoformat() for row in group}))
+            exception(line, 'date_mismatch', f"Posted on {dates}", first_id)
+            continue
+
+        for row in group:
+            matches.append(StatementMatch(
+                statement=statement, fee_payment_id=row[0], line_number=line.number,
+                reference=line.reference, matched_at=matched_at,
+            ))
+            reconciled.add(row[0])
+            if row[5] == 'pending':
+                to_complete.append(row[0])
+        matched_amount += line.amount
+
+    StatementMatch.objects.bulk_create(matches, batch_size=500)
+    StatementException.objects.bulk_create(exceptions, batch_size=500)
+    completed = 0
+    if to_complete:
+        completed = FeePayment.objects.filter(id__in=to_complete, payment_status='pending').update(
+            payment_status='completed'
+        )
+    return {
+        'matched': len(lines) - len(exceptions),
+        'exceptions': len(exceptions),
+        'matched_amount': matched_amount,
+        'completed': completed,
+    }
+
+
+def reconcile_statement(fileobj, source=None, file_name='', uploaded_by=None):
+    """
+    Reconcile a statement read from the seekable binary file object ``fileobj``.
+    ``source`` is 'bank' or 'mpesa'; when omitted the layout is detected from
+    the header. Returns the BankStatement; raises StatementError for files
+    that cannot be read or were imported before.
+    """
+    chunk_size = getattr(settings, 'RECONCILIATION_CHUNK_SIZE', 1000)
+    window = getattr(settings, 'RECONCILIATION_DATE_WINDOW_DAYS', 3)
+
+    # A re-import is rejected before anything is recorded for it
+    checksum = _checksum(fileobj)
+    previous = BankStatement.objects.filter(checksum=checksum).values_list('pk', flat=True).first()
+    if previous:
+        raise StatementError(f"This file was already imported as statement #{previous}")
+
+    statement = BankStatement.objects.create(
+        source=source or 'bank', file_name=file_name[:255], uploaded_by=uploaded_by
+    )
+    totals = {'lines': 0, 'skipped': 0, 'amount': Decimal('0'), 'matched': 0, 'exceptions': 0,
+              'matched_amount': Decimal('0'), 'completed': 0}
+
+    def flush(chunk):
+        for key, value in _match_chunk(statement, chunk, window).items():
+            totals[key] += value
+
+    try:
+        raw = _RawReader(fileobj)
+        text = io.TextIOWrapper(io.BufferedReader(raw), encoding='utf-8-sig', errors='replace', newline='')
+        with transaction.atomic():
+            statement.source, lines = read_statement(text, source)
+            chunk = []
+            for line in lines:
+                totals['lines'] += 1
+                if line is None:
+                    totals['skipped'] += 1
+                    continue
+                totals['amount'] += line.amount or 0
+                chunk.append(line)
+                if len(chunk) >= chunk_size:
+                    flush(chunk)
+                    chunk = []
+            if chunk:
+                flush(chunk)
+
+            statement.checksum = checksum
+            statement.status = 'completed'
+            statement.line_count = totals['lines']
+            statement.skipped_count = totals['skipped']
+            statement.matched_count = totals['matched']
+            statement.exception_count = totals['exceptions']
+            statement.total_amount = totals['amount']
+            statement.matched_amount = totals['matched_amount']
+            statement.completed_at = timezone.now()
+            statement.save()
+            if totals['completed']:
+                # Payments were completed with update(), which sends no signals
+                transaction.on_commit(lambda: bump_entity_version('fees'))
+    except Exception as e:
+        BankStatement.objects.filter(pk=statement.pk).update(status='failed', error=str(e)[:2000])
+        statement.status = 'failed'
+        logger.error(f"Reconciliation of {file_name or 'statement'} failed: {str(e)}")
+        raise
+
+    logger.info(
+        f"Reconciled {file_name or 'statement'}: {totals['matched']} matched, "
+        f"{totals['exceptions']} exceptions, {totals['completed']} payments completed"
+    )
+    return statement
+
+
+def reconcile_directory(directory):
+    """
+    Reconcile every CSV statement in ``directory`` and move it to
+    ``processed/`` or ``failed/``. Returns the statements created.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        logger.warning(f"Statement directory {directory} does not exist")
+        return []
+
+    statements = []
+    for path in sorted(directory.glob('*.csv')):
+        outcome = 'processed'
+        try:
+            with path.open('rb') as fileobj:
+                statements.append(reconcile_statement(fileobj, file_name=path.name))
+        except Exception:
+            outcome = 'failed'
+        (directory / outcome).mkdir(exist_ok=True)
+        shutil.move(str(path), str(directory / outcome / path.name))
+    return statements
+
+
+def resolve_exceptions(exceptions, user, status='resolved'):
+    """Close open exceptions after review; returns how many were updated"""
+    return exceptions.filter(status='open').update(
+        status=status, resolved_by=user, resolved_at=timezone.now()
+    )
@@ -0,0 +1,117 @@
+# reference_data.py - Versioned in-process snapshots of reference data
+#
+# Faculties, departments, programmes, academic years, semesters and hostels
+# change a few times a year, yet the cascading selects on the programme,
+# enrolment, staff and grading forms queried them on every interaction.
+# snapshot(name) returns all rows of one of them as a tuple of dicts, loaded
+# with one query and then held in process memory.
+#
+# Each snapshot has a version in the default cache (analytics entity
+# 'reference:<name>'). Saving or deleting a row bumps it (see signals.py);
+# in between, a lookup costs one cache read to confirm the copy is current.
+# Writes that skip signals (queryset.update(), bulk_create) must call
+# changed() themselves. The version only reaches other workers when the
+# default cache is shared (see checks.py), so snapshots are also reloaded
+# once they are REFERENCE_DATA_SNAPSHOT_TTL seconds old.
+#
+# reference_endpoint() adds an ETag and a private max-age of
+# REFERENCE_DATA_MAX_AGE to the JSON views built from snapshots: browsers
+# reuse a response across pages for that long (a new department can take
+# as long to appear in an open form) and then revalidate with a 304.
+
+from functools import wraps
+import hashlib
+import time
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from .analytics_cache import bump_entity_version, get_entity_versions
+from .models import AcademicYear, Department, Faculty, Hostel, Programme, Semester
+
+ENTITY = 'reference:{}'
+
+# name -> (model, fields, ordering)
+SNAPSHOTS = {
+    'faculties': (Faculty, ('id', 'name', 'code', 'is_active'), ('name', 'id')),
+    'departments': (Department, ('id', 'name', 'code', 'faculty_id', 'is_active'), ('name', 'id')),
+    'programmes': (Programme, ('id', 'name', 'code', 'department_id', 'faculty_id', 'is_active'), ('name', 'id')),
+    'academic_years': (AcademicYear, ('id', 'year', 'start_date', 'end_date', 'is_current'), ('-start_date', 'id')),
+    'semesters': (Semester, (
+        'id', 'academic_year_id', 'semester_number', 'start_date', 'end_date',
+        'registration_start_date', 'registration_end_date', 'is_current',
+    ), ('semester_number', 'id')),
+    'hostels': (Hostel, ('id', 'name', 'hostel_type', 'school_id', 'is_active'), ('hostel_type', 'name', 'id')),
+}
+
+SNAPSHOT_MODELS = {model: name for name, (model, fields, ordering) in SNAPSHOTS.items()}
+
+_snapshots = {}  # name -> (version, loaded at, rows)
+
+
+# =============================================================================
+# Snapshots
+# =============================================================================
+
+def snapshot(name):
+    """Every row of ``name`` as a tuple of dicts, in its ordering; treat as read-only"""
+    entity = ENTITY.format(name)
+    version = get_entity_versions([entity])[entity]
+    now = time.monotonic()
+    max_age = getattr(settings, 'REFERENCE_DATA_SNAPSHOT_TTL', 300)
+    held = _snapshots.get(name)
+    if held is not None and held[0] == version and now - held[1] < max_age:
+        return held[2]
+
+    model, fields, ordering = SNAPSHOTS[name]
+    rows = tuple(model.objects.order_by(*ordering).values(*fields))
+    _snapshots[name] = (version, now, rows)
+    return rows
+
+
+def select(name, **filters):
+    """Rows of ``name`` whose fields equal ``filters``, e.g. select('departments', faculty_id=3)"""
+    return [
+        row for row in snapshot(name)
+        if all(row[field] == value for field, value in filters.items())
+    ]
+
+
+def pick(rows, *fields):
+    """New dicts holding only ``fields`` of ``rows``, for JSON responses"""
+    return [{field: row[field] for field in fields} for row in rows]
+
+
+def parse_id(value):
+    """A primary key from a query parameter, or None"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def changed(*names):
+    """Reload ``names`` (default: all snapshots) in every worker"""
+    bump_entity_version(*(ENTITY.format(name) for name in names or SNAPSHOTS))
+
+
+# =============================================================================
+# HTTP caching
+# =============================================================================
+
+def reference_endpoint(view_func):
+    """
+    Let browsers cache a JSON view built from snapshots: a private max-age
+    of REFERENCE_DATA_MAX_AGE and an ETag of the content, so a matching
+    If-None-Match gets a 304 with no body.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        if response.status_code != 200 or request.method not in ('GET', 'HEAD'):
+            return response
+        etag = '"%s"' % hashlib.md5(response.content).hexdigest()
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=getattr(settings, 'REFERENCE_DATA_MAX_AGE', 120))
+        return get_conditional_response(request, etag=etag, response=response)
+    return _wrapped_view
@@ -0,0 +1,283 @@
+# registration_control.py - Course seat capacity, waitlists and admission control
+#
+# Seats are counted in CourseCapacity.enrolled_count. Registration takes a
+# seat with reserve_seat() before saving an enrollment; other saves are
+# counted by the Enrollment signals (see signals.py). A full course queues
+# the student in CourseWaitlistEntry unless its waitlist is turned off, and
+# a freed seat promotes the longest-waiting student.
+
+from functools import wraps
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+
+from .models import Enrollment
+from .models_registration import CourseCapacity, CourseWaitlistEntry
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Seat counters
+# =============================================================================
+
+def reserve_seat(course_id, semester_id):
+    """
+    Atomically take a seat in a course for a semester.
+
+    The counter is bumped with a single conditional UPDATE so concurrent
+    registrations can never overfill a course. Courses without a
+    CourseCapacity row are unlimited and always succeed.
+    """
+    updated = CourseCapacity.objects.filter(
+        course_id=course_id,
+        semester_id=semester_id,
+        enrolled_count__lt=F('capacity'),
+    ).update(enrolled_count=F('enrolled_count') + 1, updated_at=timezone.now())
+
+    if updated:
+        return True
+    return not CourseCapacity.objects.filter(course_id=course_id, semester_id=semester_id).exists()
+
+
+def release_seat(course_id, semester_id, promote=True):
+    """Give a seat back and, optionally, promote the next waitlisted student"""
+    CourseCapacity.objects.filter(
+        course_id=course_id,
+        semester_id=semester_id,
+        enrolled_count__gt=0,
+    ).update(enrolled_count=F('enrolled_count') - 1, updated_at=timezone.now())
+
+    if promote:
+        return promote_waitlist(course_id, semester_id)
+    return 0
+
+
+def add_to_enrolled_counts(semester_id, course_counts):
+    """
+    Add enrollments created outside reserve_seat (e.g. bulk_create) to the
+    counters. ``course_counts`` maps course_id to the number of new rows.
+    """
+    for course_id, count in course_counts.items():
+        if count:
+            CourseCapacity.objects.filter(
+                course_id=course_id, semester_id=semester_id
+            ).update(enrolled_count=F('enrolled_count') + count, updated_at=timezone.now())
+
+
+def seat_availability(semester, course_ids):
+    """Return {course_id: seats_available} for capacity-limited courses"""
+    return {
+        course_id: max(capacity - enrolled, 0)
+        for course_id, capacity, enrolled in CourseCapacity.objects.filter(
+            semester=semester, course_id__in=course_ids
+        ).values_list('course_id', 'capacity', 'enrolled_count')
+    }
+
+
+def sync_capacity_counters(semester):
+    """
+    Recompute enrolled counters for a semester from active enrollments with
+    one grouped query. Used to repair drift after manual data fixes.
+    """
+    counts = dict(
+        Enrollment.objects.filter(semester=semester, is_active=True)
+        .values('course_id')
+        .annotate(total=Count('id'))
+        .values_list('course_id', 'total')
+    )
+
+    capacities = list(CourseCapacity.objects.filter(semester=semester))
+    for capacity in capacities:
+        capacity.enrolled_count = counts.get(capacity.course_id, 0)
+    CourseCapacity.objects.bulk_update(capacities, ['enrolled_count'])
+    return len(capacities)
+
+
+# =============================================================================
+# Waitlist
+# =============================================================================
+
+def has_waitlist(course_id, semester_id):
+    """Courses queue students when full unless their CourseCapacity turns it off"""
+    return not CourseCapacity.objects.filter(
+        course_id=course_id, semester_id=semester_id, waitlist_enabled=False
+    ).exists()
+
+
+def join_waitlist(student, course, semester):
+    """
+    Queue a student for a full course. Returns (entry, position), or
+    (None, None) when the course does not keep a waitlist.
+    """
+    if not has_waitlist(course.id, semester.id):
+        return None, None
+
+    entry, created = CourseWaitlistEntry.objects.get_or_create(
+        student=student,
+        course=course,
+        semester=semester,
+        defaults={'status': 'waiting'},
+    )
+    if not created and entry.status != 'waiting':
+        # Cancelled, or promoted into a seat the student has since dropped
+        requeue = entry.status == 'cancelled' or not Enrollment.objects.filter(
+            student=student, course=course, semester=semester, is_active=True
+        ).exists()
+        if requeue:
+            entry.status = 'waiting'
+            entry.created_at = timezone.now()
+            entry.promoted_at = None
+            entry.save(update_fields=['status', 'created_at', 'promoted_at'])
+
+    position = CourseWaitlistEntry.objects.filter(
+        course=course,
+        semester=semester,
+        status='waiting',
+        created_at__lte=entry.created_at,
+    ).count()
+    return entry, position
+
+
+def leave_waitlist(student, course, semester):
+    """Take a student out of the queue for a course. Returns True if they were waiting."""
+    return bool(CourseWaitlistEntry.objects.filter(
+        student=student, course=course, semester=semester, status='waiting'
+    ).update(status='cancelled'))
+
+
+def promote_waitlist(course_id, semester_id):
+    """
+    Move waitlisted students into the course while seats are free.
+    Returns the number of students promoted.
+    """
+    promoted = 0
+    with transaction.atomic():
+        while True:
+            entry = (
+                CourseWaitlistEntry.objects.select_for_update()
+                .filter(course_id=course_id, semester_id=semester_id, status='waiting')
+                .order_by('created_at', 'id')
+                .first()
+            )
+            if entry is None:
+                break
+
+            enrollment = Enrollment.objects.filter(
+                student_id=entry.student_id, course_id=course_id, semester_id=semester_id
+            ).first()
+
+            if enrollment is None or not enrollment.is_active:
+                if not reserve_seat(course_id, semester_id):
+                    break
+                if enrollment is None:
+                    enrollment = Enrollment(
+                        student_id=entry.student_id,
+                        course_id=course_id,
+                        semester_id=semester_id,
+                    )
+                enrollment.is_active = True
+                enrollment._seat_reserved = True
+                enrollment.save()
+                promoted += 1
+
+            entry.status = 'promoted'
+            entry.promoted_at = timezone.now()
+            entry.save(update_fields=['status', 'promoted_at'])
+
+    if promoted:
+        logger.info(f"Promoted {promoted} waitlisted students into course {course_id} (semester {semester_id})")
+    return promoted
+
+
+# =============================================================================
+# Token-bucket admission gate
+# =============================================================================
+#
+# Buckets live in each worker process, so the site as a whole admits up to
+# REGISTRATION_ADMISSION_RATE times the number of workers per second. That
+# is deliberate: the gate protects each worker's own threads and database
+# connections from a registration stampede and costs no cache round trip.
+# Size the rate per worker; limits that must hold across workers belong in
+# ratelimit.py, which counts in the shared cache.
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. ``rate`` tokens are added per second up to
+    ``capacity``; each admitted request consumes one token.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, tokens=1):
+        """Take tokens if available. Returns (admitted, retry_after_seconds)."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True, 0
+
+            retry_after = (tokens - self.tokens) / self.rate if self.rate else 60
+            return False, max(int(retry_after) + 1, 1)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(name):
+    """Return the per-process bucket for ``name``, configured from settings"""
+    with _buckets_lock:
+        bucket = _buckets.get(name)
+        if bucket is None:
+            bucket = TokenBucket(
+                rate=getattr(settings, 'REGISTRATION_ADMISSION_RATE', 20),
+                capacity=getattr(settings, 'REGISTRATION_ADMISSION_BURST', 40),
+            )
+            _buckets[name] = bucket
+        return bucket
+
+
+def admission_gate(bucket_name='registration'):
+    """
+    Decorator that sheds load with a 503 + Retry-After once the bucket is
+    empty, before the view touches the database.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if not getattr(settings, 'REGISTRATION_ADMISSION_ENABLED', True):
+                return view_func(request, *args, **kwargs)
+
+            admitted, retry_after = get_bucket(bucket_name).consume()
+            if admitted:
+                return view_func(request, *args, **kwargs)
+
+            logger.warning(f"Admission gate '{bucket_name}' shed request to {request.path}")
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                response = JsonResponse({
+                    'error': 'Registration is busy, please retry shortly.',
+                    'retry_after': retry_after,
+                    'success': False,
+                }, status=503)
+            else:
+                response = render(request, '503.html', {'retry_after': retry_after}, status=503)
+            response['Retry-After'] = str(retry_after)
+            return response
+        return _wrapped_view
+    return decorator
@@ -0,0 +1,199 @@
+# role_context.py - Per-request role and scope resolution
+#
+# Most views start by working out who the user is in the university: their
+# student or lecturer profile, the department they chair (COD), the faculty
+# they are dean of, the hostels they are warden of. Looked up ad hoc, that
+# is one to three queries per request, repeated by decorators and views.
+#
+# RoleContextMiddleware puts a lazy ``request.role`` on every request. The
+# first access resolves the user's scope in one query and caches it per user
+# for ROLE_CONTEXT_CACHE_TTL. Only ids and flags are cached:
+#
+#   - student_id / lecturer_id: the user's profile, or None
+#   - department_id: the department the user heads, or None
+#   - faculty_id: the faculty the user is dean of, or None
+#   - hostel_ids: active hostels the user is warden of
+#   - course_ids: courses the user teaches in the current semester
+#
+# The instances (role.student, role.department, ...) are loaded fresh from
+# the database the first time a request uses them, so views that modify and
+# save them never write back a stale copy.
+#
+# Entries are checked against the 'roles' and 'calendar' versions: saving a
+# Department, Faculty or Hostel (HOD, dean or warden assignment) bumps
+# 'roles', a new current semester bumps 'calendar'. Saving or deleting a
+# profile or course assignment drops that user's entry (see signals.py).
+# Writes that skip signals (queryset.update(), bulk_create) must call
+# forget() or roles_changed() themselves. The versions and entries live in
+# the default cache, which must be shared between workers in production
+# (CACHE_BACKEND, checked by ``manage.py check --deploy``); otherwise a
+# removed HOD or dean keeps their scope in other workers until the TTL ends.
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, F, OuterRef, Subquery
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from .analytics_cache import bump_entity_version, get_entity_versions
+from .models import Department, Faculty, Hostel, Lecturer, LecturerCourseAssignment, Student, User
+
+ROLE_KEY = 'role:context:{}'
+VERSION_ENTITIES = ('roles', 'calendar')
+
+EMPTY_SCOPE = {
+    'student_id': None,
+    'lecturer_id': None,
+    'department_id': None,
+    'faculty_id': None,
+    'hostel_ids': [],
+    'course_ids': [],
+}
+
+
+# =============================================================================
+# Resolution and caching
+# =============================================================================
+
+def resolve_scope(user):
+    """
+    Look up the scope of ``user``: one query for the profile ids and what
+    they head, plus one for hostels or courses when those apply.
+    """
+    scope = User.objects.filter(pk=user.pk).annotate(
+        department_id=Subquery(Department.objects.filter(head_of_department=OuterRef('pk')).order_by('pk').values('pk')[:1]),
+        faculty_id=Subquery(Faculty.objects.filter(dean=OuterRef('pk')).order_by('-is_active', 'pk').values('pk')[:1]),
+        is_warden=Exists(Hostel.objects.filter(warden=OuterRef('pk'), is_active=True)),
+    ).values(
+        'department_id', 'faculty_id', 'is_warden',
+        student_id=F('student_profile__id'), lecturer_id=F('lecturer_profile__id'),
+    ).first()
+    if scope is None:
+        return dict(EMPTY_SCOPE)
+
+    is_warden = scope.pop('is_warden')
+    scope['hostel_ids'] = []
+    scope['course_ids'] = []
+    if is_warden:
+        scope['hostel_ids'] = list(Hostel.objects.filter(warden=user, is_active=True).values_list('pk', flat=True))
+    if scope['lecturer_id'] is not None:
+        scope['course_ids'] = list(LecturerCourseAssignment.objects.filter(
+            lecturer_id=scope['lecturer_id'], semester__is_current=True
+        ).values_list('course_id', flat=True).distinct())
+    return scope
+
+
+def get_scope(user):
+    """The scope of ``user``, from the cache while the role versions hold"""
+    versions = get_entity_versions(VERSION_ENTITIES)
+    stamp = tuple(versions[entity] for entity in VERSION_ENTITIES)
+    key = ROLE_KEY.format(user.pk)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    scope = resolve_scope(user)
+    cache.set(key, (stamp, scope), getattr(settings, 'ROLE_CONTEXT_CACHE_TTL', 600))
+    return scope
+
+
+def forget(*user_ids):
+    """Drop the cached scope of ``user_ids`` (profile or assignment changed)"""
+    cache.delete_many([ROLE_KEY.format(user_id) for user_id in user_ids])
+
+
+def roles_changed():
+    """Drop every cached scope (an HOD, dean or warden assignment changed)"""
+    bump_entity_version('roles')
+
+
+# =============================================================================
+# Request context
+# =============================================================================
+
+class RoleContext:
+    """
+    Role and scope of the requesting user. The *_id attributes come from the
+    cache; student, lecturer, department and faculty are loaded on first use
+    and are None when they do not apply. The get_*() accessors raise the
+    model's DoesNotExist instead, like user.student_profile or
+    Faculty.objects.get().
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.role = getattr(user, 'user_type', None)
+        scope = get_scope(user) if user.is_authenticated else EMPTY_SCOPE
+
+        self.student_id = scope['student_id']
+        self.lecturer_id = scope['lecturer_id']
+        self.department_id = scope['department_id']
+        self.faculty_id = scope['faculty_id']
+        self.hostel_ids = scope['hostel_ids']
+        self.course_ids = scope['course_ids']
+
+    def __repr__(self):
+        return f'<RoleContext user={self.user.pk} role={self.role}>'
+
+    # Fresh instances, pointed at the request's user so following the
+    # relation back (student.user, faculty.dean.get_full_name) is free
+
+    @cached_property
+    def student(self):
+        return self._load(Student, self.student_id, 'user')
+
+    @cached_property
+    def lecturer(self):
+        return self._load(Lecturer, self.lecturer_id, 'user')
+
+    @cached_property
+    def department(self):
+        return self._load(Department, self.department_id, 'head_of_department')
+
+    @cached_property
+    def faculty(self):
+        return self._load(Faculty, self.faculty_id, 'dean')
+
+    def _load(self, model, pk, user_field):
+        if pk is None:
+            return None
+        # Filtering on the user as well means an appointment revoked since
+        # the scope was cached is not handed out
+        instance = model.objects.filter(pk=pk, **{f'{user_field}_id': self.user.pk}).first()
+        if instance is not None:
+            setattr(instance, user_field, self.user)
+        return instance
+
+    def _require(self, value, model):
+        if value is None:
+            raise model.DoesNotExist(f'{model._meta.object_name} matching the user does not exist.')
+        return value
+
+    def get_student(self):
+        return self._require(self.student, Student)
+
+    def get_lecturer(self):
+        return self._require(self.lecturer, Lecturer)
+
+    def get_department(self):
+        return self._require(self.department, Department)
+
+    @property
+    def active_faculty(self):
+        if self.faculty is not None and self.faculty.is_active:
+            return self.faculty
+        return None
+
+    def get_faculty(self, active_only=False):
+        return self._require(self.active_faculty if active_only else self.faculty, Faculty)
+
+    def student_or_404(self):
+        """For views that used get_object_or_404(Student, user=request.user)"""
+        if self.student is None:
+            raise Http404('No Student matches the given query.')
+        return self.student
+
+    def lecturer_or_404(self):
+        if self.lecturer is None:
+            raise Http404('No Lecturer matches the given query.')
+        return self.lecturer
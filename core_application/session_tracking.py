@@ -0,0 +1,150 @@
+# session_tracking.py - Low-write session bookkeeping
+#
+# Used by SlidingSessionMiddleware, UserSessionMiddleware and
+# ActivityTrackingMiddleware so that a steady-state request costs cache
+# lookups rather than database writes:
+#
+#   - Sliding expiry: the session is re-saved (extending its expiry) at most
+#     once per SESSION_REFRESH_INTERVAL instead of on every request
+#     (SESSION_SAVE_EVERY_REQUEST).
+#   - Known sessions: sessions that already have a UserSession row are kept
+#     in the cache, so the row is only looked up or created the first time a
+#     session is seen.
+#   - Activity: UserSession.last_activity is written at most once per
+#     SESSION_ACTIVITY_INTERVAL per session.
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+logger = logging.getLogger(__name__)
+
+KNOWN_KEY = 'session:known:{}'
+TOUCHED_KEY = 'session:touched:{}'
+REFRESHED_AT = '_refreshed_at'
+TRACKING_KEY = '_tracking_key'
+
+
+def tracking_key(session):
+    """
+    The key UserSession rows use for ``session``. Database-backed sessions
+    use their session key; signed-cookie sessions have no stable key of
+    UserSession's size, so they get a random one stored in the session.
+    """
+    key = session.session_key
+    if key and len(key) <= 40:
+        return key
+    if TRACKING_KEY not in session:
+        session[TRACKING_KEY] = get_random_string(32)
+    return session[TRACKING_KEY]
+
+
+# =============================================================================
+# Sliding expiry
+# =============================================================================
+
+def refresh_session(session, now=None):
+    """
+    Mark ``session`` for saving if it was last refreshed more than
+    SESSION_REFRESH_INTERVAL seconds ago; returns whether it will be saved.
+    """
+    if session.is_empty():
+        return False
+    now = int(now or time.time())
+    interval = getattr(settings, 'SESSION_REFRESH_INTERVAL', 300)
+    if session.modified or now - session.get(REFRESHED_AT, 0) >= interval:
+        session[REFRESHED_AT] = now
+        return True
+    return False
+
+
+# =============================================================================
+# UserSession tracking
+# =============================================================================
+
+def _cache_ttl():
+    return getattr(settings, 'SESSION_COOKIE_AGE', 1209600)
+
+
+def track_session(request):
+    """
+    Make sure an authenticated request's session has a UserSession row.
+    Returns True when the session was seen for the first time (a login).
+    """
+    from .models import ActivityLog, UserSession
+    from .middleware import get_client_ip, get_user_agent
+
+    key = tracking_key(request.session)
+    known = KNOWN_KEY.format(key)
+    if cache.get(known) == request.user.pk:
+        return False
+
+    ip_address = get_client_ip(request)
+    user_agent = get_user_agent(request)
+    existing = UserSession.objects.filter(session_key=key).values('pk', 'user_id', 'is_active')
+    session = existing.first()
+    created = False
+    if session is None:
+        try:
+            with transaction.atomic():
+                UserSession.objects.create(
+                    user=request.user, session_key=key, ip_address=ip_address, user_agent=user_agent
+                )
+            created = True
+        except IntegrityError:
+            # A concurrent request of the same session created the row first
+            session = existing.first()
+    if session is not None and (session['user_id'] != request.user.pk or not session['is_active']):
+        # The key was reused for another user (or after logout): start over
+        UserSession.objects.filter(pk=session['pk']).update(
+            user=request.user, ip_address=ip_address, user_agent=user_agent,
+            is_active=True, logout_time=None, login_time=timezone.now(),
+        )
+        created = True
+    if created:
+        # last_activity was just set; no need to touch it again right away
+        cache.set(TOUCHED_KEY.format(key), 1, getattr(settings, 'SESSION_ACTIVITY_INTERVAL', 60))
+        ActivityLog.objects.create(
+            user=request.user,
+            action='login',
+            ip_address=ip_address,
+            user_agent=user_agent,
+            description=f"User logged in from {ip_address}"
+        )
+    cache.set(known, request.user.pk, _cache_ttl())
+    return created
+
+
+def touch_session(request, now=None):
+    """
+    Update the session's last_activity, at most once per
+    SESSION_ACTIVITY_INTERVAL seconds; returns whether it was written.
+    """
+    from .models import UserSession
+
+    key = tracking_key(request.session)
+    interval = getattr(settings, 'SESSION_ACTIVITY_INTERVAL', 60)
+    if not cache.add(TOUCHED_KEY.format(key), 1, interval):
+        return False
+    UserSession.objects.filter(
+        session_key=key,
+        user=request.user,
+        is_active=True
+    ).update(last_activity=now or timezone.now())
+    return True
+
+
+def end_session(user, session):
+    """Close the UserSession of ``session`` on logout"""
+    from .models import UserSession
+
+    key = tracking_key(session)
+    UserSession.objects.filter(session_key=key, user=user, is_active=True).update(
+        is_active=False, logout_time=timezone.now()
+    )
+    cache.delete_many([KNOWN_KEY.format(key), TOUCHED_KEY.format(key)])
@@ -278,4 +278,298 @@
         
 #         for student in active_students:
 #             if _has_completed_current_year(student, instance):
-#                 _process_student_promotion(student, instance)
\ No newline at end of file
+#                 _process_student_promotion(student, instance)
+
+# =============================================================================
+# Course capacity counters
+# =============================================================================
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Enrollment
+
+
+@receiver(post_save, sender=Enrollment)
+def count_enrollment_seat(sender, instance, created, **kwargs):
+    """
+    Keep CourseCapacity counters in step with enrollments made outside
+    registration. Code that changes is_active on an existing enrollment sets
+    ``_was_active`` to the old value first (no query to look it up); saves
+    without it leave the counters alone.
+    """
+    was_active = False if created else instance.__dict__.pop('_was_active', None)
+    if was_active is None:
+        return
+
+    if instance.is_active and not was_active:
+        # New or reactivated without reserve_seat()
+        if getattr(instance, '_seat_reserved', False):
+            return
+        from .registration_control import add_to_enrolled_counts
+        add_to_enrolled_counts(instance.semester_id, {instance.course_id: 1})
+
+    elif was_active and not instance.is_active:
+        # Dropped: free the seat for the waitlist, as a deletion does
+        from .registration_control import release_seat
+        course_id, semester_id = instance.course_id, instance.semester_id
+        transaction.on_commit(lambda: release_seat(course_id, semester_id))
+
+
+@receiver(post_delete, sender=Enrollment)
+def release_enrollment_seat(sender, instance, **kwargs):
+    """Free the seat and promote the waitlist once the deletion commits"""
+    if not instance.is_active:
+        return
+
+    from .registration_control import release_seat
+    course_id, semester_id = instance.course_id, instance.semester_id
+    transaction.on_commit(lambda: release_seat(course_id, semester_id))
+
+
+# =============================================================================
+# Analytics cache invalidation
+# =============================================================================
+
+from . import models as core_models
+
+# Model name -> analytics entity whose cached results it affects
+ANALYTICS_ENTITY_MODELS = {
+    'Student': 'students',
+    'Programme': 'students',
+    'Enrollment': 'enrollments',
+    'Grade': 'grades',
+    'Assignment': 'grades',
+    'AssignmentSubmission': 'grades',
+    'FeePayment': 'fees',
+    'FeeStructure': 'fees',
+    'Hostel': 'hostels',
+    'Room': 'hostels',
+    'Bed': 'hostels',
+    'HostelBooking': 'hostels',
+    'HostelPayment': 'hostels',
+    'HostelIncident': 'hostels',
+    'Library': 'library',
+    'LibraryTransaction': 'library',
+    'Attendance': 'attendance',
+    'AttendanceSession': 'attendance',
+    'Semester': 'calendar',
+    'AcademicYear': 'calendar',
+}
+
+
+def bump_analytics_version(sender, **kwargs):
+    """Invalidate cached analytics for the sender's entity once the write commits"""
+    from .analytics_cache import bump_entity_version
+
+    entity = ANALYTICS_ENTITY_MODELS[sender.__name__]
+    transaction.on_commit(lambda: bump_entity_version(entity))
+
+
+for model_name in ANALYTICS_ENTITY_MODELS:
+    model = getattr(core_models, model_name)
+    post_save.connect(bump_analytics_version, sender=model, dispatch_uid=f'analytics_version_save_{model_name}')
+    post_delete.connect(bump_analytics_version, sender=model, dispatch_uid=f'analytics_version_delete_{model_name}')
+
+
+# =============================================================================
+# People search index
+# =============================================================================
+
+from django.db.models.signals import pre_save
+
+from .people_search import (
+    INDEXED_PROFILE_FIELDS, INDEXED_USER_FIELDS, PERSON_MODELS,
+    index_person, reindex_queryset, reindex_user, remove_person,
+)
+
+PERSON_TYPES_BY_MODEL = {model: person_type for person_type, model in PERSON_MODELS.items()}
+
+
+def _touches(update_fields, indexed_fields):
+    return update_fields is None or bool(set(update_fields) & indexed_fields)
+
+
+def index_person_on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    person_type = PERSON_TYPES_BY_MODEL[sender]
+    if raw or not _touches(update_fields, INDEXED_PROFILE_FIELDS[person_type]):
+        return
+    index_person(person_type, instance)
+
+
+def remove_person_on_delete(sender, instance, **kwargs):
+    remove_person(PERSON_TYPES_BY_MODEL[sender], instance.pk)
+
+
+for person_model in PERSON_MODELS.values():
+    post_save.connect(index_person_on_save, sender=person_model, dispatch_uid=f'people_search_save_{person_model.__name__}')
+    post_delete.connect(remove_person_on_delete, sender=person_model, dispatch_uid=f'people_search_delete_{person_model.__name__}')
+
+
+@receiver(post_save, sender=core_models.User, dispatch_uid='people_search_user_save')
+def reindex_user_on_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Names and emails live on User; profiles created later index themselves"""
+    if created or raw or not _touches(update_fields, INDEXED_USER_FIELDS):
+        return
+    reindex_user(instance.pk)
+
+
+@receiver(pre_save, sender=core_models.Programme, dispatch_uid='people_search_programme_pre_save')
+def note_programme_label_change(sender, instance, raw=False, **kwargs):
+    """Student documents carry the programme name and code; only re-index when they change"""
+    if raw or instance.pk is None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list('name', 'code').first()
+    instance._search_labels_changed = previous is not None and previous != (instance.name, instance.code)
+
+
+@receiver(post_save, sender=core_models.Programme, dispatch_uid='people_search_programme_save')
+def reindex_programme_students(sender, instance, **kwargs):
+    if getattr(instance, '_search_labels_changed', False):
+        reindex_queryset('student', core_models.Student.objects.filter(programme=instance))
+
+
+# =============================================================================
+# Broadcast notifications
+# =============================================================================
+
+from django.core.cache import cache
+
+from .broadcasts import AUDIENCE_KEY, broadcasts_changed, forget_unread_count
+from .models_broadcast import BroadcastNotification
+
+
+@receiver(post_save, sender=BroadcastNotification, dispatch_uid='broadcast_save')
+@receiver(post_delete, sender=BroadcastNotification, dispatch_uid='broadcast_delete')
+def invalidate_unread_counts(sender, **kwargs):
+    """A new or removed broadcast changes every unread counter"""
+    transaction.on_commit(broadcasts_changed)
+
+
+@receiver(post_save, sender=core_models.StudentNotification, dispatch_uid='student_notification_unread_save')
+@receiver(post_delete, sender=core_models.StudentNotification, dispatch_uid='student_notification_unread_delete')
+def invalidate_student_unread_count(sender, instance, **kwargs):
+    user_id = instance.student.user_id
+    transaction.on_commit(lambda: forget_unread_count(user_id))
+
+
+@receiver(post_save, sender=core_models.Student, dispatch_uid='broadcast_audience_student_save')
+@receiver(post_save, sender=core_models.HostelBooking, dispatch_uid='broadcast_audience_booking_save')
+def invalidate_broadcast_audience(sender, instance, **kwargs):
+    """Programme, year or hostel may have changed"""
+    user_id = instance.user_id if sender is core_models.Student else instance.student.user_id
+    transaction.on_commit(lambda: cache.delete(AUDIENCE_KEY.format(user_id)))
+
+
+# =============================================================================
+# Session tracking
+# =============================================================================
+
+from django.contrib.auth.signals import user_logged_out
+
+from .session_tracking import end_session
+
+
+@receiver(user_logged_out, dispatch_uid='end_user_session')
+def close_user_session(sender, request, user, **kwargs):
+    """Mark the UserSession closed and forget it in the known-session cache"""
+    if user is not None and request is not None and hasattr(request, 'session'):
+        end_session(user, request.session)
+
+
+# =============================================================================
+# Admin login failure counters
+# =============================================================================
+
+from .ratelimit import get_limiter
+
+
+@receiver(post_save, sender=core_models.AdminLoginAttempt, dispatch_uid='count_admin_login_failure')
+def count_admin_login_failure(sender, instance, created, raw=False, **kwargs):
+    """
+    Count failed admin logins per IP and username in the rate-limit cache,
+    so check_login_attempts() needs no COUNT queries. A password accepted
+    pending 2FA is not a failure.
+    """
+    if raw or not created or instance.success or instance.failure_reason == 'Pending 2FA verification':
+        return
+    get_limiter('admin_login_failures_ip').add(instance.ip_address)
+    get_limiter('admin_login_failures_user').add(instance.username.lower())
+
+
+# =============================================================================
+# Role context invalidation
+# =============================================================================
+
+from . import role_context
+
+
+@receiver(post_save, sender=core_models.Department, dispatch_uid='role_context_department_save')
+@receiver(post_delete, sender=core_models.Department, dispatch_uid='role_context_department_delete')
+@receiver(post_save, sender=core_models.Faculty, dispatch_uid='role_context_faculty_save')
+@receiver(post_delete, sender=core_models.Faculty, dispatch_uid='role_context_faculty_delete')
+@receiver(post_save, sender=core_models.Hostel, dispatch_uid='role_context_hostel_save')
+@receiver(post_delete, sender=core_models.Hostel, dispatch_uid='role_context_hostel_delete')
+def invalidate_role_assignments(sender, raw=False, **kwargs):
+    """The HOD, dean or warden may have changed, for any user"""
+    if not raw:
+        transaction.on_commit(role_context.roles_changed)
+
+
+@receiver(post_save, sender=core_models.Student, dispatch_uid='role_context_student_save')
+@receiver(post_delete, sender=core_models.Student, dispatch_uid='role_context_student_delete')
+@receiver(post_save, sender=core_models.Lecturer, dispatch_uid='role_context_lecturer_save')
+@receiver(post_delete, sender=core_models.Lecturer, dispatch_uid='role_context_lecturer_delete')
+@receiver(post_save, sender=core_models.LecturerCourseAssignment, dispatch_uid='role_context_assignment_save')
+@receiver(post_delete, sender=core_models.LecturerCourseAssignment, dispatch_uid='role_context_assignment_delete')
+def invalidate_role_profile(sender, instance, **kwargs):
+    """The user's cached profile or course list is out of date"""
+    if sender is core_models.LecturerCourseAssignment:
+        user_id = core_models.Lecturer.objects.filter(pk=instance.lecturer_id).values_list('user_id', flat=True).first()
+    else:
+        user_id = instance.user_id
+    if user_id is not None:
+        transaction.on_commit(lambda: role_context.forget(user_id))
+
+
+# =============================================================================
+# Reference data snapshots
+# =============================================================================
+
+from . import reference_data
+
+
+def reload_reference_snapshot(sender, raw=False, **kwargs):
+    """Workers reload the sender's snapshot once the write commits"""
+    if raw:
+        return
+    name = reference_data.SNAPSHOT_MODELS[sender]
+    transaction.on_commit(lambda: reference_data.changed(name))
+
+
+for reference_model, snapshot_name in reference_data.SNAPSHOT_MODELS.items():
+    post_save.connect(reload_reference_snapshot, sender=reference_model, dispatch_uid=f'reference_data_save_{snapshot_name}')
+    post_delete.connect(reload_reference_snapshot, sender=reference_model, dispatch_uid=f'reference_data_delete_{snapshot_name}')
+
+
+# =============================================================================
+# Security alert delivery
+# =============================================================================
+
+from .outbox import message_sent
+from .models_outbox import OutboundMessage
+
+
+SECURITY_ALERT_REFERENCE = 'security_alert:'
+
+
+@receiver(message_sent, sender=OutboundMessage, dispatch_uid='security_alert_email_sent')
+def mark_security_alert_emailed(sender, messages, **kwargs):
+    """Alerts are recorded when their email is queued; flag them once it is delivered"""
+    alert_ids = [
+        int(message.reference[len(SECURITY_ALERT_REFERENCE):]) for message in messages
+        if message.reference.startswith(SECURITY_ALERT_REFERENCE)
+    ]
+    if alert_ids:
+        core_models.AdminSecurityAlert.objects.filter(pk__in=alert_ids).update(email_sent=True)
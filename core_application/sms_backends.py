@@ -0,0 +1,68 @@
+# sms_backends.py - SMS gateway backends for the outbox
+#
+# Mirrors django.core.mail.backends: SMS_BACKEND names the class, and each
+# backend sends one message to many numbers per gateway call:
+#
+#     backend.send_bulk(message, ['+254700000001', '+254700000002'])
+#     -> {'+254700000001': '', '+254700000002': 'InvalidPhoneNumber'}
+#
+# The result maps every number to an error ('' when accepted). The locmem
+# backend collects messages in ``sms_backends.outbox`` for tests.
+
+import logging
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Messages "sent" through LocmemSMSBackend, as (message, recipients)
+outbox = []
+
+
+def get_sms_backend():
+    backend = getattr(settings, 'SMS_BACKEND', 'core_application.sms_backends.ConsoleSMSBackend')
+    return import_string(backend)()
+
+
+class BaseSMSBackend:
+    def send_bulk(self, message, recipients):
+        raise NotImplementedError
+
+
+class ConsoleSMSBackend(BaseSMSBackend):
+    """Log messages instead of sending them (development)"""
+
+    def send_bulk(self, message, recipients):
+        logger.info(f"SMS to {', '.join(recipients)}: {message}")
+        return {recipient: '' for recipient in recipients}
+
+
+class LocmemSMSBackend(BaseSMSBackend):
+    """Keep messages in ``outbox`` (tests)"""
+
+    def send_bulk(self, message, recipients):
+        outbox.append((message, list(recipients)))
+        return {recipient: '' for recipient in recipients}
+
+
+class AfricasTalkingSMSBackend(BaseSMSBackend):
+    """Africa's Talking bulk SMS (requires the ``africastalking`` package)"""
+
+    def __init__(self):
+        try:
+            import africastalking
+        except ImportError:
+            raise ImproperlyConfigured("AfricasTalkingSMSBackend requires the africastalking package")
+        africastalking.initialize(settings.AT_USERNAME, settings.AT_API_KEY)
+        self.sms = africastalking.SMS
+
+    def send_bulk(self, message, recipients):
+        response = self.sms.send(message, list(recipients), sender_id=getattr(settings, 'AT_SENDER_ID', None))
+        results = {recipient: 'No status returned' for recipient in recipients}
+        for entry in response.get('SMSMessageData', {}).get('Recipients', []):
+            number = entry.get('number')
+            if number in results:
+                results[number] = '' if entry.get('status') == 'Success' else entry.get('status', 'Failed')
+        return results
@@ -3,7 +3,6 @@
 # =============================================================================
 
 from celery import shared_task
-from django.core.mail import send_mail
 from django.conf import settings
 import logging
 
@@ -12,12 +11,13 @@ logger = logging.getLogger(__name__)
 @shared_task
 def send_payment_confirmation_email(student_id, payment_id):
     """
-    Send payment confirmation email asynchronously
+    Queue the payment confirmation email for the outbox
     """
     try:
         from .models import Student, FeePayment
+        from .outbox import queue_email
         
-        student = Student.objects.get(student_id=student_id)
+        student = Student.objects.select_related('user').get(student_id=student_id)
         payment = FeePayment.objects.get(id=payment_id)
         
         subject = f"Fee Payment Confirmation - {payment.receipt_number}"
@@ -37,39 +37,68 @@ Thank you.
 Finance Office
         """
         
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [student.user.email],
-            fail_silently=False
-        )
+        queue_email([student.user.email], subject, message, category='payment')
         
-        logger.info(f"Payment confirmation email sent to {student.user.email}")
+        logger.info(f"Payment confirmation email queued for {student.user.email}")
         
     except Exception as e:
-        logger.error(f"Failed to send payment email: {str(e)}")
+        logger.error(f"Failed to queue payment email: {str(e)}")
 
 
 @shared_task
 def reconcile_bank_payments():
     """
-    Daily task to reconcile payments with bank statements
+    Daily task to reconcile payments with the bank and M-Pesa statements
+    dropped in BANK_STATEMENT_DIR
     """
-    from .models import FeePayment
-    from datetime import timedelta
-    from django.utils import timezone
+    from .reconciliation import reconcile_directory
     
-    # Get pending payments from last 24 hours
-    yesterday = timezone.now() - timedelta(days=1)
-    pending_payments = FeePayment.objects.filter(
-        payment_status='pending',
-        payment_date__gte=yesterday
+    statements = reconcile_directory(settings.BANK_STATEMENT_DIR)
+    matched = sum(statement.matched_count for statement in statements)
+    exceptions = sum(statement.exception_count for statement in statements)
+    logger.info(f"Reconciled {len(statements)} statements: {matched} lines matched, {exceptions} queued for review")
+
+
+@shared_task
+def auto_register_current_semester():
+    """
+    Enroll programme cohorts into the current semester's mandatory units
+    once the semester has started
+    """
+    from .models import Semester
+    from .enrollment_engine import auto_register_cohort
+    from django.utils import timezone
+
+    semester = Semester.objects.filter(is_current=True).first()
+    if not semester or semester.start_date > timezone.now().date():
+        return
+
+    result = auto_register_cohort(semester)
+    logger.info(
+        f"Auto-registered cohorts for semester {semester.id}: "
+        f"{result['created_count']} created, {result['skipped_count']} skipped"
     )
-    
-    for payment in pending_payments:
-        # Call bank API to verify payment status
-        # Update payment status accordingly
-        pass
-    
-    logger.info(f"Reconciled {pending_payments.count()} pending payments")
+
+
+@shared_task
+def refresh_analytics_facts(full=False):
+    """Incrementally refresh the dean/COD report fact tables"""
+    from .analytics_facts import refresh_facts
+
+    return refresh_facts(full=full)
+
+
+@shared_task
+def process_webhook_inbox():
+    """Post pending bank/M-Pesa callbacks; schedule every few seconds with beat"""
+    from .webhook_inbox import process_inbox
+
+    return process_inbox()
+
+
+@shared_task
+def process_outbox():
+    """Deliver queued email and SMS; schedule every minute with beat"""
+    from .outbox import process_outbox as deliver
+
+    return deliver()
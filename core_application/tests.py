@@ -1,3 +1,1290 @@
-from django.test import TestCase
+"""
+View-level performance benchmarks and query-budget regression tests.
 
-# Create your tests here.
+A synthetic university is generated once with ``generate_university`` and the
+hot views are driven through the Django test client. For every view the wall
+time, number of SQL queries and peak Python memory are recorded, and the test
+fails when the query budget in benchmark_baseline.json is exceeded.
+
+Wall time and worker RSS depend on the machine, so they are only compared
+with the baseline on request:
+    BENCHMARK_TIMINGS=1 python manage.py test core_application --tag=benchmark
+
+Run only the benchmarks:
+    python manage.py test core_application --tag=benchmark
+
+Re-record the baseline after an intentional change:
+    BENCHMARK_RECORD=1 python manage.py test core_application --tag=benchmark
+
+Worker startup (django.setup() plus loading the URLconf, as a gunicorn worker
+does before its first request) is measured in a fresh interpreter, and URL
+resolution as the average time to resolve a path for each named route.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from pathlib import Path
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+import tempfile
+
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache, caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+
+from . import (
+    analytics_facts, counters, enrollment_engine, media_delivery, outbox, ratelimit, receipt_sequence, reconciliation, reference_data, registration_control,
+    role_context, sms_backends, webhook_inbox,
+)
+from .analytics_cache import is_shared_cache
+from .checks import check_url_patterns, iter_routes, sample_path
+from .middleware import BankWebhookIPWhitelistMiddleware
+from .receipt_sequence import next_receipt_number
+from .models import (
+    User, Student, Department, Faculty, Hostel, AcademicYear, Semester, Course,
+    Enrollment, LecturerCourseAssignment, AttendanceSession, Timetable,
+    FeeStructure, FeePayment, AdminSecurityAlert, AdminLoginAttempt, Programme, StudentNotification
+)
+from .models_analytics import FactRefreshState, StudentFact
+from .models_broadcast import BroadcastNotification
+from .models_outbox import OutboundMessage
+from .models_registration import CourseCapacity, CourseWaitlistEntry
+from .models_receipts import ReceiptSequence
+from .models_reconciliation import BankStatement, StatementException, StatementMatch
+from .models_webhooks import PostedTransaction, WebhookInboxItem
+
+
+BASELINE_FILE = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+
+# Dataset size used for the benchmarks; budgets in the baseline file are tied to it
+BENCHMARK_STUDENTS = int(os.environ.get('BENCHMARK_STUDENTS', 400))
+BENCHMARK_LECTURERS = int(os.environ.get('BENCHMARK_LECTURERS', 40))
+
+# Each view is timed this many times; the median is compared to the baseline
+BENCHMARK_RUNS = int(os.environ.get('BENCHMARK_RUNS', 3))
+
+# Allowed slowdown over the recorded latency before a test fails
+LATENCY_TOLERANCE = float(os.environ.get('BENCHMARK_LATENCY_TOLERANCE', 1.5))
+
+RECORD_BASELINE = os.environ.get('BENCHMARK_RECORD') == '1'
+
+# Compare wall time and RSS with the baseline (always done when recording)
+CHECK_TIMINGS = RECORD_BASELINE or os.environ.get('BENCHMARK_TIMINGS') == '1'
+
+# Allowed growth of a fresh worker's RSS over the recorded baseline
+RSS_TOLERANCE = float(os.environ.get('BENCHMARK_RSS_TOLERANCE', 1.1))
+
+# Passes over all named routes when timing URL resolution
+RESOLVE_PASSES = int(os.environ.get('BENCHMARK_RESOLVE_PASSES', 50))
+
+# Libraries only the export views need; loading the URLconf must not import them
+EXPORT_LIBRARIES = ('reportlab', 'openpyxl', 'weasyprint', 'pdfkit', 'qrcode', 'xhtml2pdf')
+
+# ru_maxrss survives exec on Linux (it would report the test runner's peak),
+# so the resident size is read from /proc where available
+STARTUP_SCRIPT = f"""
+import json, resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+setup_ms = (time.perf_counter() - started) * 1000
+from django.urls import get_resolver
+get_resolver().url_patterns
+ms = (time.perf_counter() - started) * 1000
+try:
+    with open('/proc/self/status') as status:
+        rss_kib = next(int(line.split()[1]) for line in status if line.startswith('VmRSS:'))
+except OSError:
+    rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    'ms': ms,
+    'setup_ms': setup_ms,
+    'rss_kib': rss_kib,
+    'modules': len(sys.modules),
+    'export_libraries': [name for name in {EXPORT_LIBRARIES!r} if name in sys.modules],
+}}))
+"""
+
+
+def load_baseline():
+    if BASELINE_FILE.exists():
+        return json.loads(BASELINE_FILE.read_text())
+    return {}
+
+
+def create_fee_student(student_id='FIN/001/2025', tuition=Decimal('50000')):
+    """An active first-year student with a fee structure in the current semester"""
+    faculty = Faculty.objects.create(name='Finance Faculty', code='FF', established_date='2000-01-01')
+    department = Department.objects.create(
+        name='Finance Department', code='FD', faculty=faculty, established_date='2000-01-01'
+    )
+    programme = Programme.objects.create(
+        name='Bachelor of Commerce', code='BCOM', programme_type='bachelor', duration_years=4,
+        total_semesters=8, credit_hours_required=120, entry_requirements='KCSE C+',
+        department=department, faculty=faculty,
+    )
+    today = timezone.localdate()
+    academic_year = AcademicYear.objects.create(
+        year=f'{today.year}/{today.year + 1}', start_date=today - timedelta(days=30),
+        end_date=today + timedelta(days=300), is_current=True,
+    )
+    Semester.objects.create(
+        academic_year=academic_year, semester_number=1, start_date=today - timedelta(days=30),
+        end_date=today + timedelta(days=90), registration_start_date=today - timedelta(days=40),
+        registration_end_date=today + timedelta(days=10), is_current=True,
+    )
+    fee_structure = FeeStructure.objects.create(
+        programme=programme, academic_year=academic_year, year=1, semester=1, tuition_fee=tuition,
+    )
+    user = User.objects.create_user(
+        username=student_id.replace('/', '').lower(), password='student', user_type='student',
+        first_name='Fee', last_name='Payer', email='payer@example.com',
+    )
+    student = Student.objects.create(
+        user=user, student_id=student_id, programme=programme, current_year=1, current_semester=1,
+        admission_date=today - timedelta(days=30), entry_qualification='KCSE', guardian_name='Guardian',
+        guardian_phone='0700000000', guardian_relationship='Parent', guardian_address='Nairobi',
+        emergency_contact='0700000000',
+    )
+    return student, fee_structure
+
+
+@tag('benchmark')
+@override_settings(
+    REGISTRATION_ADMISSION_ENABLED=False,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class ViewPerformanceBenchmarkTests(TestCase):
+    """Wall time, query count and peak memory for the hot views"""
+
+    results = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'generate_university',
+            students=BENCHMARK_STUDENTS,
+            lecturers=BENCHMARK_LECTURERS,
+            faculties=2,
+            hostels=2,
+            rooms_per_hostel=25,
+            prefix='BNC',
+            seed=2025,
+            stdout=StringIO(),
+        )
+
+        cls.current_semester = Semester.objects.get(is_current=True)
+        cls.current_year = AcademicYear.objects.get(is_current=True)
+
+        cls.admin_user = User.objects.create_user(
+            username='bnc.admin', password='benchmark', user_type='admin',
+            is_staff=True, is_superuser=True,
+        )
+        cls.finance_user = User.objects.get(username='bnc.finance')
+        cls.warden_user = User.objects.get(username='bnc.warden.1')
+        cls.cod_user = Department.objects.filter(
+            code__startswith='BNCD'
+        ).order_by('code').first().head_of_department
+        cls.hostel = Hostel.objects.get(warden=cls.warden_user)
+
+        cls.student = Student.objects.filter(
+            status='active',
+            enrollments__semester=cls.current_semester,
+        ).select_related('user').order_by('id').first()
+
+        assignment = LecturerCourseAssignment.objects.filter(
+            semester=cls.current_semester,
+            course__enrollments__semester=cls.current_semester,
+        ).select_related('lecturer__user').order_by('id').first()
+        cls.lecturer = assignment.lecturer
+        cls.graded_enrollments = list(Enrollment.objects.filter(
+            course=assignment.course, semester=cls.current_semester
+        ).values_list('id', flat=True)[:30])
+
+        # A live QR session for one of the student's current courses
+        enrollment = Enrollment.objects.filter(
+            student=cls.student, semester=cls.current_semester
+        ).order_by('id').first()
+        slot = Timetable.objects.filter(
+            course=enrollment.course, semester=cls.current_semester
+        ).first()
+        cls.qr_session = AttendanceSession.objects.create(
+            timetable_slot=slot,
+            lecturer=slot.lecturer,
+            semester=cls.current_semester,
+            week_number=12,
+            session_date=timezone.now().date(),
+            session_token='BNC-LIVE-SESSION',
+            expires_at=timezone.now() + timedelta(days=1),
+            is_active=True,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if not cls.results:
+            return
+
+        print(f"\n{'view':<26}{'queries':>9}{'median ms':>12}{'peak KiB':>11}")
+        for name, result in sorted(cls.results.items()):
+            print(f"{name:<26}{result['queries']:>9}{result['ms']:>12.1f}{result['peak_kib']:>11.0f}")
+
+        if RECORD_BASELINE:
+            baseline = load_baseline()
+            for name, result in cls.results.items():
+                baseline[name] = {
+                    'queries': result['queries'],
+                    'ms': round(result['ms'], 1),
+                }
+            BASELINE_FILE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+
+    # ------------------------------------------------------------------
+
+    def benchmark(self, name, user, method, url, data=None, content_type=None,
+                  expected_status=200, runs=BENCHMARK_RUNS, **extra):
+        """Drive a view ``runs`` times and compare with the recorded baseline"""
+        self.client.force_login(user)
+        request = getattr(self.client, method)
+        kwargs = dict(extra)
+        if data is not None:
+            kwargs['data'] = data
+        if content_type:
+            kwargs['content_type'] = content_type
+
+        timings = []
+        query_count = None
+        peak = 0
+        for _ in range(runs):
+            tracemalloc.start()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = request(url, **kwargs)
+                timings.append((time.perf_counter() - started) * 1000)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+            self.assertEqual(
+                response.status_code, expected_status,
+                f"{name} returned {response.status_code}"
+            )
+            # The cold first run sets the query count
+            if query_count is None:
+                query_count = len(queries)
+
+        result = {
+            'queries': query_count,
+            'ms': statistics.median(timings),
+            'peak_kib': peak / 1024,
+        }
+        type(self).results[name] = result
+
+        budget = load_baseline().get(name)
+        if budget and not RECORD_BASELINE:
+            self.assertLessEqual(
+                result['queries'], budget['queries'],
+                f"{name}: {result['queries']} queries exceeds budget of {budget['queries']}"
+            )
+        if budget and CHECK_TIMINGS and not RECORD_BASELINE:
+            self.assertLessEqual(
+                result['ms'], budget['ms'] * LATENCY_TOLERANCE,
+                f"{name}: {result['ms']:.1f} ms exceeds baseline {budget['ms']} ms x {LATENCY_TOLERANCE}"
+            )
+        return response
+
+    # ------------------------------------------------------------------
+
+    def test_student_dashboard(self):
+        self.benchmark('student_dashboard', self.student.user, 'get', reverse('student_dashboard'))
+
+    def test_admin_dashboard(self):
+        self.benchmark('admin_dashboard', self.admin_user, 'get', reverse('admin_dashboard'))
+
+    def test_finance_dashboard(self):
+        self.benchmark('finance_dashboard', self.finance_user, 'get', reverse('finance_dashboard'))
+
+    @override_settings(FINANCE_DASHBOARD_CACHE_TTL=0)
+    def test_finance_dashboard_query_count_is_constant(self):
+        self.client.force_login(self.finance_user)
+        url = reverse('finance_dashboard')
+        self.client.get(url)  # session and login bookkeeping
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(url)
+
+        # More fee structures, cohorts and payment months must not add queries
+        for fee_structure in FeeStructure.objects.filter(academic_year=self.current_year)[:5]:
+            fee_structure.pk = None
+            fee_structure.year += 4
+            fee_structure.save()
+        payment = FeePayment.objects.filter(payment_status='completed').first()
+        for months_ago in range(1, 6):
+            payment.pk = None
+            payment.receipt_number = f'BNC-CONST-{months_ago}'
+            payment.payment_date = timezone.now().date() - timedelta(days=31 * months_ago)
+            payment.save()
+
+        with CaptureQueriesContext(connection) as after:
+            self.client.get(url)
+        self.assertEqual(len(after), len(before))
+
+    def test_generated_payments_are_not_future_dated(self):
+        payments = FeePayment.objects.filter(receipt_number__startswith='BNC-RCP-')
+        self.assertTrue(payments.exists())
+        self.assertFalse(payments.filter(payment_date__gt=timezone.now().date()).exists())
+
+    def test_hostel_dashboard(self):
+        self.benchmark('hostel_dashboard', self.warden_user, 'get', reverse('hostel_dashboard'))
+
+    def test_cod_promotion_analysis(self):
+        self.benchmark('cod_promotion_analysis', self.cod_user, 'get', reverse('cod_promotion_analysis'))
+
+    def test_student_list(self):
+        self.benchmark('student_list', self.admin_user, 'get', reverse('student_list'))
+
+    def test_student_list_search(self):
+        self.benchmark(
+            'student_list_search', self.admin_user, 'get', reverse('student_list'),
+            data={'search': 'BNC0'},
+        )
+
+    def test_get_room_availability(self):
+        self.benchmark(
+            'get_room_availability', self.warden_user, 'get', reverse('get_room_availability'),
+            data={'hostel_id': self.hostel.id, 'year_id': self.current_year.id},
+        )
+
+    def test_save_grades(self):
+        grades = [
+            {'enrollment_id': enrollment_id, 'continuous_assessment': 30, 'final_exam': 45}
+            for enrollment_id in self.graded_enrollments
+        ]
+        self.benchmark(
+            'save_grades', self.lecturer.user, 'post', reverse('save_grades'),
+            data=json.dumps({'grades': grades}), content_type='application/json',
+        )
+
+    def test_mark_attendance_qr(self):
+        url = reverse('mark_attendance_qr', args=[self.qr_session.session_token])
+        self.benchmark('mark_attendance_qr', self.student.user, 'post', url, runs=1)
+
+
+@tag('benchmark')
+class WorkerStartupBenchmarkTests(SimpleTestCase):
+    """Import time and RSS of a fresh worker up to a loaded URLconf"""
+
+    def measure_startup(self):
+        completed = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        )
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def test_worker_startup_skips_export_libraries(self):
+        loaded = self.measure_startup()['export_libraries']
+        self.assertEqual(loaded, [], f"Loading the URLconf imports {', '.join(loaded)}")
+
+    @skipUnless(CHECK_TIMINGS, 'set BENCHMARK_TIMINGS=1 to compare startup time and RSS')
+    def test_worker_startup(self):
+        runs = [self.measure_startup() for _ in range(BENCHMARK_RUNS)]
+        result = {
+            'ms': statistics.median(run['ms'] for run in runs),
+            'rss_kib': statistics.median(run['rss_kib'] for run in runs),
+        }
+        print(
+            f"\nworker startup: {result['ms']:.1f} ms "
+            f"(django.setup {statistics.median(run['setup_ms'] for run in runs):.1f} ms), "
+            f"RSS {result['rss_kib']:.0f} KiB, {runs[0]['modules']} modules"
+        )
+
+        baseline = load_baseline()
+        if RECORD_BASELINE:
+            baseline['worker_startup'] = {
+                'ms': round(result['ms'], 1),
+                'rss_kib': round(result['rss_kib']),
+            }
+            BASELINE_FILE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+            return
+
+        budget = baseline.get('worker_startup')
+        if budget:
+            self.assertLessEqual(
+                result['ms'], budget['ms'] * LATENCY_TOLERANCE,
+                f"worker startup: {result['ms']:.1f} ms exceeds baseline {budget['ms']} ms x {LATENCY_TOLERANCE}"
+            )
+            self.assertLessEqual(
+                result['rss_kib'], budget['rss_kib'] * RSS_TOLERANCE,
+                f"worker startup: {result['rss_kib']:.0f} KiB exceeds baseline {budget['rss_kib']} KiB x {RSS_TOLERANCE}"
+            )
+
+
+@tag('benchmark')
+class UrlResolverBenchmarkTests(SimpleTestCase):
+    """Average time to resolve a path, over every named route of this app"""
+
+    def test_url_patterns_pass_checks(self):
+        self.assertEqual(check_url_patterns(), [])
+
+    def named_paths(self, resolver):
+        paths = []
+        for route, converters, pattern in iter_routes(resolver):
+            path = sample_path(route, converters)
+            if pattern.name and path and pattern.lookup_str.startswith('core_application.'):
+                paths.append((path, route))
+        return paths
+
+    def test_named_routes_resolve(self):
+        resolver = get_resolver()
+        for path, route in self.named_paths(resolver):
+            self.assertEqual(resolver.resolve(path).route, route, f"{path} does not resolve to '{route}'")
+
+    @skipUnless(CHECK_TIMINGS, 'set BENCHMARK_TIMINGS=1 to compare URL resolution time')
+    def test_resolve_named_routes(self):
+        resolver = get_resolver()
+        paths = [path for path, route in self.named_paths(resolver)]
+
+        timings = []
+        for _ in range(BENCHMARK_RUNS):
+            started = time.perf_counter()
+            for _ in range(RESOLVE_PASSES):
+                for path in paths:
+                    resolver.resolve(path)
+            timings.append((time.perf_counter() - started) * 1e6 / (RESOLVE_PASSES * len(paths)))
+        us = statistics.median(timings)
+        print(f"\nurl resolve: {us:.1f} us per path over {len(paths)} named routes")
+
+        baseline = load_baseline()
+        if RECORD_BASELINE:
+            baseline['url_resolve'] = {'us': round(us, 1)}
+            BASELINE_FILE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+            return
+
+        budget = baseline.get('url_resolve')
+        if budget:
+            self.assertLessEqual(
+                us, budget['us'] * LATENCY_TOLERANCE,
+                f"url resolve: {us:.1f} us exceeds baseline {budget['us']} us x {LATENCY_TOLERANCE}"
+            )
+
+
+class RequestCacheTests(TestCase):
+    """Per-user role scopes and reference-data snapshots, on a minimal dataset"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_user(
+            username='cache.admin', password='cache', user_type='admin',
+            is_staff=True, is_superuser=True,
+        )
+        cls.cod_user = User.objects.create_user(username='cache.cod', password='cache', user_type='cod')
+        cls.faculty = Faculty.objects.create(name='Cache Faculty', code='CF', established_date='2000-01-01')
+        cls.department = Department.objects.create(
+            name='Cache Department', code='CD', faculty=cls.faculty,
+            established_date='2000-01-01', head_of_department=cls.cod_user,
+        )
+
+    def setUp(self):
+        # Scopes and snapshots outlive each test's rolled-back transaction
+        cache.clear()
+        reference_data._snapshots.clear()
+
+    def test_role_context_is_cached(self):
+        self.client.force_login(self.cod_user)
+        url = reverse('cod_dashboard')
+        self.client.get(url)  # resolves the COD's department once
+        with mock.patch.object(role_context, 'resolve_scope', wraps=role_context.resolve_scope) as resolve:
+            self.assertEqual(self.client.get(url).status_code, 200)
+            self.assertEqual(resolve.call_count, 0)
+
+            # Unassigning the HOD applies to the next request
+            department = Department.objects.get(head_of_department=self.cod_user)
+            with self.captureOnCommitCallbacks(execute=True):
+                department.head_of_department = None
+                department.save()
+            self.assertRedirects(self.client.get(url), reverse('admin_dashboard'), fetch_redirect_response=False)
+            self.assertEqual(resolve.call_count, 1)
+
+    def test_reference_data_is_served_from_snapshots(self):
+        self.client.force_login(self.admin_user)
+        url = reverse('departments_by_faculty')
+        params = {'faculty_id': self.faculty.id}
+        response = self.client.get(url, params)  # loads the snapshot
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url, params).content, response.content)
+        self.assertFalse([query for query in queries if 'core_application_department' in query['sql']])
+
+        # Browsers revalidate with the ETag and get no body back
+        revalidated = self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertIn('max-age', revalidated['Cache-Control'])
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    SMS_BACKEND='core_application.sms_backends.LocmemSMSBackend',
+    OUTBOX_SEND_ON_COMMIT=False,
+    OUTBOX_RATE_LIMITS={'email': (1000, 1000), 'sms': (1000, 1000)},
+)
+class OutboxDeliveryTests(TestCase):
+    """Batching, retries and rate limiting of queued email and SMS"""
+
+    def setUp(self):
+        # Token buckets are per process and built from settings on first use
+        outbox._buckets.clear()
+        self.addCleanup(outbox._buckets.clear)
+        sms_backends.outbox.clear()
+
+    def make_due(self):
+        OutboundMessage.objects.filter(status='pending').update(next_attempt_at=timezone.now())
+
+    def test_email_batch_uses_one_connection(self):
+        for index in range(5):
+            outbox.queue_email([f'student{index}@example.com'], 'Receipt', 'Paid')
+
+        with mock.patch.object(outbox, 'get_connection', wraps=outbox.get_connection) as get_connection:
+            totals = outbox.process_outbox(batch_size=10)
+
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(totals['email']['sent'], 5)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(OutboundMessage.objects.exclude(status='sent').exists())
+
+    @override_settings(SMS_BATCH_SIZE=2)
+    def test_sms_grouped_by_text_per_gateway_call(self):
+        outbox.queue_sms(['+254700000001', '+254700000002', '+254700000003'], 'Exams start Monday')
+        outbox.queue_sms('+254700000004', 'Fees due Friday')
+
+        totals = outbox.process_outbox()
+
+        self.assertEqual(totals['sms']['sent'], 4)
+        self.assertEqual(sorted(sms_backends.outbox), [
+            ('Exams start Monday', ['+254700000001', '+254700000002']),
+            ('Exams start Monday', ['+254700000003']),
+            ('Fees due Friday', ['+254700000004']),
+        ])
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=3, OUTBOX_RETRY_SECONDS=60)
+    def test_failures_back_off_until_max_attempts(self):
+        message = outbox.queue_email(['dean@example.com'], 'Report', 'Attached')
+        delays = []
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('refused')):
+            for attempt in range(1, 4):
+                started = timezone.now()
+                outbox.process_outbox()
+                message.refresh_from_db()
+                self.assertEqual(message.attempts, attempt)
+                delays.append(round((message.next_attempt_at - started).total_seconds() / 60))
+                self.make_due()
+
+        self.assertEqual(message.status, 'failed')
+        self.assertEqual(delays[:2], [1, 2])
+        self.assertIn('refused', message.last_error)
+
+        # Failed messages are not picked up again
+        self.assertEqual(outbox.process_outbox()['email']['sent'], 0)
+
+    @override_settings(OUTBOX_RATE_LIMITS={'email': (0.001, 2), 'sms': (1000, 1000)})
+    def test_rate_limited_messages_are_deferred_without_an_attempt(self):
+        for index in range(5):
+            outbox.queue_email([f'lecturer{index}@example.com'], 'Timetable', 'Updated')
+
+        totals = outbox.process_outbox()
+
+        self.assertEqual(totals['email']['sent'], 2)
+        self.assertEqual(totals['email']['deferred'], 3)
+        deferred = OutboundMessage.objects.filter(status='pending')
+        self.assertEqual(deferred.count(), 3)
+        self.assertEqual(set(deferred.values_list('attempts', flat=True)), {0})
+        self.assertTrue(all(message.next_attempt_at > timezone.now() for message in deferred))
+
+    def test_security_alert_is_flagged_sent_on_delivery(self):
+        from .views.auth import send_security_alert_email
+
+        User.objects.create_user(
+            username='alerts.admin', password='alerts', email='security@example.com',
+            is_staff=True, is_superuser=True,
+        )
+        send_security_alert_email('Multiple Failures', 'admin', '10.0.0.5', '5 failed logins')
+        alert = AdminSecurityAlert.objects.get()
+        self.assertFalse(alert.email_sent)
+
+        outbox.process_outbox()
+        alert.refresh_from_db()
+        self.assertTrue(alert.email_sent)
+
+
+@override_settings(
+    RATE_LIMITS={'test': (3, 60), 'admin_login_failures_ip': (5, 900), 'admin_login_failures_user': (2, 900)},
+    PAYMENT_WEBHOOK_IPS=['196.201.214.200'],
+    DEBUG=False,
+)
+class RateLimitTests(TestCase):
+    """Sliding-window limits, client addresses and admin login lockouts"""
+
+    def setUp(self):
+        caches[settings.RATE_LIMIT_CACHE].clear()
+        self.factory = RequestFactory()
+
+    def test_sliding_window_rejects_over_limit_without_counting(self):
+        limiter = ratelimit.get_limiter('test')
+        now = 600.0  # start of a window
+        self.assertEqual([limiter.hit('10.0.0.1', now=now)[0] for _ in range(4)], [True, True, True, False])
+        self.assertEqual(limiter.count('10.0.0.1', now=now), 3)
+        # Other identities have their own window
+        self.assertTrue(limiter.hit('10.0.0.2', now=now)[0])
+        # Halfway into the next window half of the previous hits still count
+        self.assertEqual(limiter.count('10.0.0.1', now=now + 90), 1.5)
+        self.assertTrue(limiter.hit('10.0.0.1', now=now + 90)[0])
+
+    def test_forwarded_for_only_read_behind_trusted_proxies(self):
+        request = self.factory.get('/', HTTP_X_FORWARDED_FOR='1.2.3.4, 10.0.0.9', REMOTE_ADDR='10.0.0.10')
+        with self.settings(TRUSTED_PROXY_COUNT=0):
+            self.assertEqual(ratelimit.client_ip(request), '10.0.0.10')
+        with self.settings(TRUSTED_PROXY_COUNT=1):
+            self.assertEqual(ratelimit.client_ip(request), '10.0.0.9')
+        with self.settings(TRUSTED_PROXY_COUNT=3):
+            self.assertEqual(ratelimit.client_ip(request), '10.0.0.10')
+
+    def test_webhook_whitelist_ignores_spoofed_forwarded_for(self):
+        whitelist = BankWebhookIPWhitelistMiddleware(lambda request: HttpResponse('posted'))
+        spoofed = self.factory.post(
+            '/api/payments/equity/webhook/', HTTP_X_FORWARDED_FOR='196.201.214.200', REMOTE_ADDR='203.0.113.7'
+        )
+        self.assertEqual(whitelist(spoofed).status_code, 403)
+
+        proxied = self.factory.post(
+            '/api/payments/equity/webhook/', HTTP_X_FORWARDED_FOR='196.201.214.200', REMOTE_ADDR='10.0.0.10'
+        )
+        with self.settings(TRUSTED_PROXY_COUNT=1):
+            self.assertEqual(whitelist(proxied).status_code, 200)
+
+    def test_admin_lockout_counts_failed_attempts_in_the_database(self):
+        from .views.auth import check_login_attempts
+
+        self.assertFalse(is_shared_cache(settings.RATE_LIMIT_CACHE))
+        AdminLoginAttempt.objects.create(
+            username='Registrar', ip_address='10.0.0.5', success=False, failure_reason='Pending 2FA verification'
+        )
+        AdminLoginAttempt.objects.create(
+            username='Registrar', ip_address='10.0.0.5', success=False, failure_reason='Invalid credentials'
+        )
+        self.assertFalse(check_login_attempts('registrar', '10.0.0.6'))
+
+        AdminLoginAttempt.objects.create(
+            username='registrar', ip_address='10.0.0.6', success=False, failure_reason='Invalid credentials'
+        )
+        self.assertTrue(check_login_attempts('registrar', '10.0.0.7'))
+        # Old failures fall out of the window
+        AdminLoginAttempt.objects.update(attempt_time=timezone.now() - timedelta(hours=1))
+        self.assertFalse(check_login_attempts('registrar', '10.0.0.7'))
+
+    def test_admin_login_failures_alert_at_the_lockout_limit(self):
+        with mock.patch('core_application.views.auth.send_security_alert_email') as alert:
+            for _ in range(2):
+                self.client.post(reverse('admin_login'), {'username': 'ghost', 'password': 'wrong'})
+        self.assertEqual([call.args[0] for call in alert.call_args_list], ['Multiple Login Failures'])
+
+
+@override_settings(WEBHOOK_INBOX_POST_ON_COMMIT=True)
+class WebhookInboxTests(TestCase):
+    """Callbacks are stored once and posted as exactly one FeePayment"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student, cls.fee_structure = create_fee_student()
+
+    def equity_callback(self, transaction_id='EQ123', amount='15000.00'):
+        return {
+            'transaction_id': transaction_id, 'student_id': self.student.student_id, 'amount': amount,
+            'payment_date': timezone.localdate().isoformat(), 'bank_reference': f'SLIP-{transaction_id}',
+        }
+
+    def test_callback_is_posted_after_commit(self):
+        with mock.patch.object(webhook_inbox, 'kick') as kick:
+            with self.captureOnCommitCallbacks(execute=True):
+                webhook_inbox.enqueue('equity', self.equity_callback())
+        kick.assert_called_once_with()
+
+        self.assertEqual(webhook_inbox.process_inbox(workers=1), {'processed': 1})
+        item = WebhookInboxItem.objects.get()
+        payment = FeePayment.objects.get()
+        self.assertEqual((item.status, item.fee_payment), ('processed', payment))
+        self.assertEqual(payment.amount_paid, Decimal('15000.00'))
+        self.assertEqual(payment.posted_transaction.reference, 'EQ123')
+
+    def test_replayed_callbacks_post_once(self):
+        with mock.patch.object(webhook_inbox, 'kick'):
+            self.assertTrue(webhook_inbox.enqueue('equity', self.equity_callback())[1])
+            self.assertFalse(webhook_inbox.enqueue('equity', self.equity_callback())[1])
+        webhook_inbox.process_inbox(workers=1)
+
+        # Replaying the inbox and posting the same transaction directly change nothing
+        self.assertEqual(webhook_inbox.replay(WebhookInboxItem.objects.all()), 0)
+        self.assertEqual(webhook_inbox.process_inbox(workers=1), {})
+        from .views.finance import process_bank_payment
+        result = process_bank_payment(
+            'equity', 'EQ123', self.student.student_id, Decimal('15000.00'),
+            timezone.localdate().isoformat(), 'SLIP-EQ123', 'bank_transfer',
+        )
+        self.assertEqual(result['status'], 'duplicate')
+        self.assertEqual(FeePayment.objects.count(), 1)
+
+    def test_references_are_unique_per_provider(self):
+        with mock.patch.object(webhook_inbox, 'kick'):
+            webhook_inbox.enqueue('equity', self.equity_callback('TX900'))
+            webhook_inbox.enqueue('kcb', {
+                'transaction_ref': 'TX900', 'student_number': self.student.student_id,
+                'amount_paid': '2000', 'transaction_date': timezone.localdate().isoformat(),
+            })
+        self.assertEqual(webhook_inbox.process_inbox(workers=1), {'processed': 2})
+        self.assertEqual(
+            sorted(PostedTransaction.objects.values_list('provider', 'reference')),
+            [('equity', 'TX900'), ('kcb', 'TX900')],
+        )
+
+    def test_concurrent_posting_is_reported_as_duplicate(self):
+        with transaction.atomic():
+            first, _, created = webhook_inbox.post_payment(
+                'equity', 'EQ777', self.student.student_id, Decimal('500'), timezone.localdate(), '', 'bank_transfer'
+            )
+        self.assertTrue(created)
+        # A second worker that looked before the first one committed
+        with mock.patch.object(webhook_inbox, '_posted', side_effect=[None, first]):
+            with transaction.atomic():
+                payment, _, created = webhook_inbox.post_payment(
+                    'equity', 'EQ777', self.student.student_id, Decimal('500'), timezone.localdate(), '', 'bank_transfer'
+                )
+        self.assertEqual((payment, created), (first, False))
+        self.assertEqual(FeePayment.objects.count(), 1)
+
+    @override_settings(WEBHOOK_INBOX_RETRY_SECONDS=30)
+    def test_crash_while_posting_is_retried(self):
+        with mock.patch.object(webhook_inbox, 'kick'):
+            webhook_inbox.enqueue('equity', self.equity_callback())
+
+        # The notification insert fails after the payment row was written
+        with mock.patch.object(StudentNotification.objects, 'create', side_effect=OSError('disk full')):
+            self.assertEqual(webhook_inbox.process_inbox(workers=1), {'pending': 1})
+        item = WebhookInboxItem.objects.get()
+        self.assertEqual((item.status, item.attempts), ('pending', 1))
+        self.assertIn('disk full', item.last_error)
+        self.assertFalse(FeePayment.objects.exists())
+
+        # Backing off: not retried until the retry time
+        self.assertEqual(webhook_inbox.process_inbox(workers=1), {})
+        WebhookInboxItem.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(webhook_inbox.process_inbox(workers=1), {'processed': 1})
+        self.assertEqual(FeePayment.objects.count(), 1)
+
+    def test_expired_lease_is_taken_over_once(self):
+        with mock.patch.object(webhook_inbox, 'kick'):
+            webhook_inbox.enqueue('equity', self.equity_callback())
+        # A worker claims the item and stalls past its lease
+        stalled = webhook_inbox.claim_batch(10)[0]
+        WebhookInboxItem.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(webhook_inbox.process_inbox(workers=1), {'processed': 1})
+        # The stalled worker finds its claim gone and posts nothing
+        self.assertEqual(webhook_inbox.process_item(stalled), 'lost')
+        self.assertEqual(FeePayment.objects.count(), 1)
+        self.assertEqual(WebhookInboxItem.objects.get().attempts, 2)
+
+
+class AnalyticsFactTests(TestCase):
+    """Fact tables behind the dean/COD reports stay built and current"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student, cls.fee_structure = create_fee_student()
+
+    def student_years(self):
+        return dict(StudentFact.objects.values_list('year_of_study', 'student_count'))
+
+    def test_first_report_builds_the_facts(self):
+        self.assertFalse(FactRefreshState.objects.exists())
+        analytics_facts.ensure_facts()
+        self.assertEqual(self.student_years(), {1: 1})
+        self.assertIsNotNone(FactRefreshState.objects.get().last_refreshed_at)
+
+    @override_settings(ANALYTICS_FACTS_MAX_AGE=60)
+    def test_stale_facts_are_refreshed_in_the_background(self):
+        self.addCleanup(setattr, analytics_facts, '_refresher', None)
+        analytics_facts.refresh_facts()
+        with mock.patch.object(analytics_facts, '_refresh_in_background') as refresh:
+            analytics_facts.ensure_facts()
+            self.assertIsNone(analytics_facts._refresher)
+            FactRefreshState.objects.update(last_refreshed_at=timezone.now() - timedelta(minutes=5))
+            analytics_facts.ensure_facts()
+            analytics_facts._refresher.join()
+        refresh.assert_called_once_with()
+
+    def test_promotions_and_transfers_are_picked_up_incrementally(self):
+        analytics_facts.refresh_facts()
+        Student.objects.filter(pk=self.student.pk).update(current_year=2)
+        analytics_facts.refresh_facts()
+        self.assertEqual(self.student_years(), {2: 1})
+
+        other = Programme.objects.create(
+            name='Bachelor of Economics', code='BECO', programme_type='bachelor', duration_years=4,
+            total_semesters=8, credit_hours_required=120, entry_requirements='KCSE C+',
+            department=self.student.programme.department, faculty=self.student.programme.faculty,
+        )
+        Student.objects.filter(pk=self.student.pk).update(programme=other)
+        self.assertEqual(analytics_facts.refresh_facts()['student'], {'rebuilt': 1, 'removed': 0})
+        self.assertEqual(list(StudentFact.objects.values_list('programme_id', flat=True)), [other.pk])
+
+
+class ReceiptSequenceTests(TestCase):
+    """Receipt numbers per prefix and year"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student, cls.fee_structure = create_fee_student()
+
+    def issue(self, receipt_number):
+        FeePayment.objects.create(
+            student=self.student, fee_structure=self.fee_structure, receipt_number=receipt_number,
+            amount_paid=Decimal('100'), payment_date=timezone.localdate(), payment_method='cash',
+        )
+
+    def test_numbers_are_sequential_per_prefix_and_year(self):
+        self.assertEqual(
+            [next_receipt_number('EQU', 2030) for _ in range(3)],
+            ['EQU-2030-000001', 'EQU-2030-000002', 'EQU-2030-000003'],
+        )
+        self.assertEqual(next_receipt_number('KCB', 2030), 'KCB-2030-000001')
+        self.assertEqual(next_receipt_number('EQU', 2031), 'EQU-2031-000001')
+
+    def test_counter_is_seeded_from_the_highest_issued_number(self):
+        # As text '1000000' sorts before '999999'
+        self.issue('MPE-2030-999999')
+        self.issue('MPE-2030-1000000')
+        self.issue('MPE-20300115-AB12CD34')
+        self.assertEqual(next_receipt_number('MPE', 2030), 'MPE-2030-1000001')
+
+    @override_settings(RECEIPT_NUMBERS_GAPLESS=True)
+    def test_gapless_numbers_are_returned_on_rollback(self):
+        next_receipt_number('EQU', 2030)
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                next_receipt_number('EQU', 2030)
+                raise ValueError('posting failed')
+        self.assertEqual(next_receipt_number('EQU', 2030), 'EQU-2030-000002')
+
+
+class ReceiptAllocatorTests(TransactionTestCase):
+    """Outside SQLite numbers are committed at once on an allocator thread"""
+
+    def test_numbers_are_committed_outside_the_posting_transaction(self):
+        with mock.patch.object(receipt_sequence, '_in_caller_transaction', return_value=False):
+            with self.assertRaises(ValueError):
+                with transaction.atomic():
+                    self.assertEqual(next_receipt_number('EQU', 2030), 'EQU-2030-000001')
+                    raise ValueError('posting failed')
+            # The rolled back posting leaves a gap
+            self.assertEqual(next_receipt_number('EQU', 2030), 'EQU-2030-000002')
+        self.assertEqual(ReceiptSequence.objects.get(prefix='EQU').last_value, 2)
+
+
+class BroadcastTests(TestCase):
+    """Audience broadcasts reach every role and are validated however they are created"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student, _ = create_fee_student(student_id='BRD/001/2025')
+        cls.lecturer_user = User.objects.create_user(username='brd.lecturer', password='brd', user_type='lecturer')
+        cls.staff_user = User.objects.create_user(
+            username='brd.staff', password='brd', user_type='admin', is_staff=True, is_superuser=True,
+        )
+        # Joined before the notices, so they start unread
+        User.objects.update(date_joined=timezone.now() - timedelta(days=1))
+        for audience in ('all_users', 'all_students', 'all_lecturers', 'all_staff'):
+            BroadcastNotification.objects.create(title=audience, message='Notice', audience=audience)
+
+    def setUp(self):
+        cache.clear()
+
+    def menu_titles(self, user):
+        self.client.force_login(user)
+        data = self.client.get(reverse('broadcast_menu')).json()
+        return sorted(broadcast['title'] for broadcast in data['broadcasts']), data['unread_count']
+
+    def test_every_role_sees_its_audiences(self):
+        self.assertEqual(self.menu_titles(self.student.user), (['all_students', 'all_users'], 2))
+        self.assertEqual(self.menu_titles(self.lecturer_user), (['all_lecturers', 'all_users'], 2))
+        self.assertEqual(self.menu_titles(self.staff_user), (['all_staff', 'all_users'], 2))
+
+    def test_reading_from_the_menu(self):
+        lecturers = BroadcastNotification.objects.get(audience='all_lecturers')
+        self.client.force_login(self.lecturer_user)
+        self.assertEqual(self.client.post(reverse('read_broadcast', args=[lecturers.pk])).status_code, 200)
+        self.assertEqual(self.menu_titles(self.lecturer_user)[1], 1)
+
+        # Notices for other audiences cannot be opened
+        staff = BroadcastNotification.objects.get(audience='all_staff')
+        self.assertEqual(self.client.post(reverse('read_broadcast', args=[staff.pk])).status_code, 404)
+
+        self.client.post(reverse('read_all_broadcasts'))
+        self.assertEqual(self.menu_titles(self.lecturer_user)[1], 0)
+
+    def test_management_form_sends_to_an_audience(self):
+        self.client.force_login(self.staff_user)
+        form = {'notification_type': 'general', 'title': 'Exams', 'message': 'Start Monday', 'type': 'exam'}
+
+        response = self.client.post(reverse('create_notification'), dict(form, audience='programme'))
+        self.assertFalse(response.json()['success'])
+        self.assertFalse(BroadcastNotification.objects.filter(title='Exams').exists())
+
+        response = self.client.post(reverse('create_notification'), dict(
+            form, audience='programme', programme_id=self.student.programme_id, year='1',
+        ))
+        self.assertTrue(response.json()['success'])
+        broadcast = BroadcastNotification.objects.get(title='Exams')
+        self.assertEqual((broadcast.programme_id, broadcast.year, broadcast.sender), (
+            self.student.programme_id, 1, self.staff_user,
+        ))
+        self.assertEqual(broadcast.notification_type, 'general')
+        self.assertIn('Exams', self.menu_titles(self.student.user)[0])
+
+    def test_admin_creates_through_publish(self):
+        self.client.force_login(self.staff_user)
+        url = reverse('admin:core_application_broadcastnotification_add')
+        form = {'title': 'Fees', 'message': 'Due Friday', 'notification_type': 'general'}
+
+        response = self.client.post(url, dict(form, audience='programme'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'A programme broadcast needs a programme')
+        self.assertFalse(BroadcastNotification.objects.filter(title='Fees').exists())
+
+        # publish() drops scope the audience does not use and sets the sender
+        response = self.client.post(url, dict(form, audience='all_students', year='2'))
+        self.assertEqual(response.status_code, 302)
+        broadcast = BroadcastNotification.objects.get(title='Fees')
+        self.assertEqual((broadcast.year, broadcast.sender), (None, self.staff_user))
+
+
+class CourseCapacityTests(TestCase):
+    """Seat counters, waitlist queueing and promotion"""
+
+    @classmethod
+    def setUpTestData(cls):
+        first, _ = create_fee_student(student_id='CAP/001/2025')
+        cls.students = [first]
+        for index in range(2, 4):
+            user = User.objects.create_user(username=f'cap{index}', password='cap', user_type='student')
+            cls.students.append(Student.objects.create(
+                user=user, student_id=f'CAP/00{index}/2025', programme=first.programme, current_year=1,
+                current_semester=1, admission_date=first.admission_date, entry_qualification='KCSE',
+                guardian_name='Guardian', guardian_phone='0700000000', guardian_relationship='Parent',
+                guardian_address='Nairobi', emergency_contact='0700000000',
+            ))
+        cls.semester = Semester.objects.get(is_current=True)
+        cls.course = Course.objects.create(
+            name='Accounting I', code='ACC101', level='100', credit_hours=3, department=first.programme.department,
+        )
+        cls.capacity = CourseCapacity.objects.create(course=cls.course, semester=cls.semester, capacity=1)
+
+    def enroll(self, student):
+        self.assertTrue(registration_control.reserve_seat(self.course.id, self.semester.id))
+        enrollment = Enrollment(
+            student=student, course=self.course, semester=self.semester, enrollment_date=timezone.localdate(),
+        )
+        enrollment._seat_reserved = True
+        enrollment.save()
+        return enrollment
+
+    def drop(self, enrollment):
+        enrollment._was_active = True
+        enrollment.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment.save()
+
+    def test_full_course_queues_and_promotes_in_order(self):
+        enrollment = self.enroll(self.students[0])
+        self.assertFalse(registration_control.reserve_seat(self.course.id, self.semester.id))
+        self.assertEqual(registration_control.join_waitlist(self.students[1], self.course, self.semester)[1], 1)
+        self.assertEqual(registration_control.join_waitlist(self.students[2], self.course, self.semester)[1], 2)
+
+        self.drop(enrollment)
+
+        self.assertTrue(Enrollment.objects.get(student=self.students[1], course=self.course).is_active)
+        self.assertEqual(
+            CourseWaitlistEntry.objects.get(student=self.students[1]).status, 'promoted'
+        )
+        self.assertEqual(CourseWaitlistEntry.objects.get(student=self.students[2]).status, 'waiting')
+        self.capacity.refresh_from_db()
+        self.assertEqual(self.capacity.enrolled_count, 1)
+
+    def test_disabled_waitlist_turns_students_away(self):
+        CourseCapacity.objects.filter(pk=self.capacity.pk).update(waitlist_enabled=False)
+        self.enroll(self.students[0])
+
+        self.assertEqual(registration_control.join_waitlist(self.students[1], self.course, self.semester), (None, None))
+        self.assertFalse(CourseWaitlistEntry.objects.exists())
+
+    def test_promoted_student_who_dropped_can_queue_again(self):
+        enrollment = self.enroll(self.students[0])
+        registration_control.join_waitlist(self.students[1], self.course, self.semester)
+        self.drop(enrollment)
+        promoted = Enrollment.objects.get(student=self.students[1], course=self.course)
+
+        # Still enrolled: joining again keeps the promoted entry
+        entry, _ = registration_control.join_waitlist(self.students[1], self.course, self.semester)
+        self.assertEqual(entry.status, 'promoted')
+
+        self.drop(promoted)
+        self.enroll(self.students[2])
+        entry, position = registration_control.join_waitlist(self.students[1], self.course, self.semester)
+        self.assertEqual((entry.status, entry.promoted_at, position), ('waiting', None, 1))
+
+        self.assertTrue(registration_control.leave_waitlist(self.students[1], self.course, self.semester))
+        self.assertFalse(registration_control.leave_waitlist(self.students[1], self.course, self.semester))
+        self.assertEqual(CourseWaitlistEntry.objects.get(student=self.students[1]).status, 'cancelled')
+
+    def test_saves_do_not_look_up_the_previous_state(self):
+        enrollment = self.enroll(self.students[0])
+        enrollment.is_repeat = True
+        with self.assertNumQueries(1):
+            enrollment.save()
+
+    @override_settings(REGISTRATION_ADMISSION_ENABLED=False)
+    def test_student_leaves_the_waitlist_from_registration(self):
+        self.enroll(self.students[0])
+        registration_control.join_waitlist(self.students[1], self.course, self.semester)
+        self.client.force_login(self.students[1].user)
+
+        response = self.client.post(reverse('leave_course_waitlist', args=[self.course.id]))
+
+        self.assertRedirects(response, reverse('student_units'), fetch_redirect_response=False)
+        self.assertEqual(CourseWaitlistEntry.objects.get(student=self.students[1]).status, 'cancelled')
+
+    def test_bulk_enrollment_counts_only_its_own_rows(self):
+        self.enroll(self.students[0])
+        CourseCapacity.objects.filter(pk=self.capacity.pk).update(capacity=2)
+        unlimited = Course.objects.create(
+            name='Economics I', code='ECO101', level='100', credit_hours=3, department=self.course.department,
+        )
+        bulk_create = Enrollment.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # Another student registers for the same course mid-insert
+            Enrollment.objects.create(
+                student=self.students[2], course=unlimited, semester=self.semester,
+                enrollment_date=timezone.localdate(),
+            )
+            return bulk_create(objs, **kwargs)
+
+        pairs = [(student.id, course.id) for student in self.students[:2] for course in (self.course, unlimited)]
+        with mock.patch.object(Enrollment.objects, 'bulk_create', side_effect=racing_bulk_create):
+            result = enrollment_engine.enroll_pairs(self.semester, pairs)
+
+        self.assertEqual(
+            (result['created_count'], result['skipped_count'], result['full_count']), (3, 1, 0)
+        )
+        self.capacity.refresh_from_db()
+        self.assertEqual(self.capacity.enrolled_count, 2)
+
+
+
+@override_settings(COUNTER_WRITE_BEHIND=True, COUNTER_FLUSH_THRESHOLD=1000)
+class WriteBehindCounterTests(TestCase):
+    """Buffered increments and audit rows are written in batches by flush()"""
+
+    def setUp(self):
+        # No background flush thread in tests, and an empty buffer either side
+        patcher = mock.patch.object(counters, '_ensure_flusher')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        counters._take()
+        self.addCleanup(counters._take)
+        self.first, self.second = BankStatement.objects.create(source='bank'), BankStatement.objects.create(source='bank')
+
+    def exception_row(self, statement, line_number):
+        return StatementException(statement=statement, line_number=line_number, reason='unmatched')
+
+    def test_flush_writes_grouped_increments_and_rows(self):
+        for _ in range(3):
+            counters.increment(BankStatement, self.first.pk, 'line_count')
+        counters.increment(BankStatement, self.second.pk, 'line_count')
+        counters.record(self.exception_row(self.first, 1))
+        counters.record(self.exception_row(self.second, 2))
+        self.assertEqual(counters.pending(BankStatement, self.first.pk, 'line_count'), 3)
+        self.assertFalse(StatementException.objects.exists())
+
+        self.assertEqual(counters.flush(), (2, 2))
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.line_count, self.second.line_count), (3, 1))
+        self.assertEqual(StatementException.objects.count(), 2)
+        self.assertEqual(counters.pending(BankStatement, self.first.pk, 'line_count'), 0)
+        self.assertEqual(counters.flush(), (0, 0))
+
+    def test_failed_flush_is_buffered_again(self):
+        counters.increment(BankStatement, self.first.pk, 'line_count', amount=2)
+        counters.record(self.exception_row(self.first, 1))
+
+        with mock.patch.object(QuerySet, 'update', side_effect=DatabaseError('database unavailable')), \
+                mock.patch.object(counters, '_insert', side_effect=DatabaseError('database unavailable')):
+            self.assertEqual(counters.flush(), (0, 0))
+
+        self.assertEqual(counters.pending(BankStatement, self.first.pk, 'line_count'), 2)
+        self.assertEqual(counters.flush(), (1, 1))
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.line_count, 2)
+
+    @override_settings(COUNTER_MAX_BUFFERED_ROWS=2)
+    def test_rows_put_back_are_capped(self):
+        rows = [self.exception_row(self.first, number) for number in range(1, 4)]
+        counters._put_back({}, {StatementException: rows})
+
+        self.assertEqual(counters._rows[StatementException], rows[1:])
+
+    def test_rows_whose_parent_was_deleted_are_dropped(self):
+        counters.record(self.exception_row(self.first, 1))
+        counters.record(self.exception_row(self.second, 2))
+        self.first.delete()
+
+        self.assertEqual(counters.flush(), (0, 1))
+
+        self.assertEqual(list(StatementException.objects.values_list('statement_id', flat=True)), [self.second.pk])
+        # Dropped, not kept for the next flush
+        self.assertEqual(counters.flush(), (0, 0))
+
+@override_settings(RECONCILIATION_CHUNK_SIZE=2, RECONCILIATION_DATE_WINDOW_DAYS=3)
+class ReconciliationTests(TestCase):
+    """Statement lines are matched in chunks and a file is only imported once"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student, cls.fee_structure = create_fee_student(student_id='REC/001/2025')
+        cls.today = timezone.localdate()
+
+    def pay(self, reference, amount, status='pending', days_ago=0):
+        return FeePayment.objects.create(
+            student=self.student, fee_structure=self.fee_structure, receipt_number=f'RCT-{FeePayment.objects.count()}',
+            amount_paid=Decimal(amount), payment_date=self.today - timedelta(days=days_ago),
+            payment_method='bank_transfer', transaction_reference=reference, payment_status=status,
+        )
+
+    def statement(self, *lines):
+        rows = ['Transaction Reference,Credit,Value Date,Narrative']
+        rows += [f'{reference},{amount},{self.today.isoformat()},Fees' for reference, amount in lines]
+        return BytesIO('\n'.join(rows).encode())
+
+    def test_lines_are_matched_across_chunks(self):
+        single = self.pay('TX1', '100')
+        split = [self.pay('TX2', '60', 'completed'), self.pay('TX2', '40', 'completed')]
+        self.pay('TX3', '100')
+        self.pay('TX4', '100', days_ago=10)
+
+        statement = reconciliation.reconcile_statement(self.statement(
+            ('TX1', '100'), ('TX2', '100'), ('TX3', '90'), ('TX4', '100'), ('TX5', '100'), ('TX1', '100'),
+        ), file_name='march.csv')
+
+        self.assertEqual((statement.status, statement.matched_count, statement.exception_count), ('completed', 2, 4))
+        self.assertEqual(
+            set(StatementMatch.objects.values_list('fee_payment_id', flat=True)), {single.pk} | {p.pk for p in split}
+        )
+        self.assertEqual(dict(StatementException.objects.values_list('line_number', 'reason')), {
+            4: 'amount_mismatch', 5: 'date_mismatch', 6: 'unmatched', 7: 'already_matched',
+        })
+        single.refresh_from_db()
+        self.assertEqual(single.payment_status, 'completed')
+
+    def test_reimport_is_rejected_without_a_statement_row(self):
+        self.pay('TX1', '100')
+        reconciliation.reconcile_statement(self.statement(('TX1', '100')))
+
+        with self.assertRaises(reconciliation.StatementError):
+            reconciliation.reconcile_statement(self.statement(('TX1', '100')))
+
+        self.assertEqual(list(BankStatement.objects.values_list('status', flat=True)), ['completed'])
+        self.assertEqual(StatementMatch.objects.count(), 1)
+
+
+class MediaDeliveryTests(SimpleTestCase):
+    """Conditional requests and byte ranges in serve_file()"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        storage = FileSystemStorage(location=directory.name)
+        name = storage.save('notes/week1.pdf', ContentFile(b'0123456789'))
+        self.field_file = SimpleNamespace(storage=storage, name=name, size=storage.size(name))
+        self.downloads = 0
+        self.factory = RequestFactory()
+
+    def serve(self, **headers):
+        headers = {name.replace('_', '-'): value for name, value in headers.items()}
+        def record_download():
+            self.downloads += 1
+
+        response = media_delivery.serve_file(
+            self.factory.get('/notes/', headers=headers), self.field_file, record_download=record_download,
+        )
+        self.addCleanup(response.close)
+        return response
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_whole_file_with_validators(self):
+        response = self.serve()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), b'0123456789')
+        self.assertEqual((response['Content-Length'], response['Accept-Ranges']), ('10', 'bytes'))
+        self.assertTrue(response['ETag'] and response['Last-Modified'])
+        self.assertEqual(self.downloads, 1)
+
+    def test_conditional_requests_get_304(self):
+        full = self.serve()
+        self.assertEqual(self.serve(If_None_Match=full['ETag']).status_code, 304)
+        self.assertEqual(self.serve(If_Modified_Since=full['Last-Modified']).status_code, 304)
+        self.assertEqual(self.downloads, 1)
+
+    def test_byte_ranges(self):
+        first = self.serve(Range='bytes=0-3')
+        self.assertEqual((first.status_code, first['Content-Range'], first['Content-Length']), (206, 'bytes 0-3/10', '4'))
+        self.assertEqual(self.body(first), b'0123')
+
+        # Seeking on is the same download
+        self.assertEqual(self.body(self.serve(Range='bytes=4-')), b'456789')
+        self.assertEqual(self.body(self.serve(Range='bytes=-3')), b'789')
+        self.assertEqual(self.downloads, 1)
+
+        unsatisfiable = self.serve(Range='bytes=20-')
+        self.assertEqual((unsatisfiable.status_code, unsatisfiable['Content-Range']), (416, 'bytes */10'))
+
+        # Several ranges are answered with the whole file
+        self.assertEqual(self.serve(Range='bytes=0-1,4-5').status_code, 200)
+
+    def test_if_range_for_a_changed_file_sends_everything(self):
+        etag = self.serve()['ETag']
+        self.assertEqual(self.serve(Range='bytes=4-', If_Range=etag).status_code, 206)
+
+        response = self.serve(Range='bytes=4-', If_Range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), b'0123456789')
+
+    @override_settings(MEDIA_DELIVERY_OFFLOAD='x-accel-redirect', MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_offload_to_the_proxy(self):
+        response = self.serve()
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/notes/week1.pdf')
+        self.assertEqual(response.content, b'')
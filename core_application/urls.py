@@ -1,596 +1,687 @@
-from django.urls import path
+# urls.py - URL configuration of the ERP
+#
+# Django tries patterns in order until one matches, so routes are grouped
+# under include() by their leading path segment: a request for
+# /cod/results/ is compared with the top-level entries and then only with
+# the COD routes, instead of with every route listed before it. The groups
+# are defined by area below; urlpatterns lists the largest groups first and
+# the routes that have no group last. Paths and names are unaffected.
+#
+# A new route goes in the list for its prefix. ``manage.py check`` warns about
+# duplicated or shadowed routes (see checks.py).
+
+from django.urls import include, path
+
 from . import views
 
+
+# =============================================================================
+# Student portal
+# =============================================================================
+
+clubs_patterns = [
+    path('', views.student_clubs, name='student_clubs'),
+    path('join/<int:club_id>/', views.join_club, name='join_club'),
+    path('leave/<int:club_id>/', views.leave_club, name='leave_club'),
+]
+
+club_events_patterns = [
+    path('', views.club_events, name='club_events'),
+    path('<int:club_id>/', views.club_events, name='club_events_detail'),
+]
+
+student_patterns = [
+    path('transcript/', views.student_transcript, name='student_transcript'),
+    path('unit/dashboard/', views.student_unit_dashboard, name='student_unit_dashboard'),
+    path('course/<int:enrollment_id>/', views.student_course_detail, name='student_course_detail'),
+    path('assignments/', views.student_assignments, name='student_assignments'),
+    path('assignment/<int:assignment_id>/', views.assignment_detail, name='assignment_detail'),
+    path('assignment/<int:assignment_id>/submit/', views.submit_assignment, name='submit_assignment'),
+    path('notes/<int:notes_id>/download/', views.download_notes, name='download_notes'),
+    path('grades/', views.student_grades, name='student_grades'),
+    path('timetable/', views.student_timetable_view, name='student_timetable'),
+    path('attendance/history/', views.student_attendance_history, name='student_attendance_history'),
+    path('fees/', views.student_fee_management, name='student_fee_management'),
+    path('<str:student_id>/statement/', views.student_fee_statement, name='student_statement'),
+]
+
+special_exams_patterns = [
+    path('', views.special_exam_applications, name='special_exam_applications'),
+    path('apply/', views.apply_special_exam, name='apply_special_exam'),
+]
+
+deferments_patterns = [
+    path('', views.deferment_applications, name='deferment_applications'),
+    path('apply/', views.apply_deferment, name='apply_deferment'),
+]
+
+clearances_patterns = [
+    path('', views.clearance_requests, name='clearance_requests'),
+    path('request/', views.request_clearance, name='request_clearance'),
+]
+
+messages_patterns = [
+    path('', views.messages_inbox, name='messages_inbox'),
+    path('<int:message_id>/', views.message_detail, name='message_detail'),
+    path('compose/', views.compose_message, name='compose_message'),
+    path('<int:message_id>/reply/', views.reply_message, name='reply_message'),
+    path('sent/', views.sent_messages, name='sent_messages'),
+]
+
+
+# =============================================================================
+# Lecturer portal
+# =============================================================================
+
+lecturer_course_patterns = [
+    path('<int:assignment_id>/', views.lecturer_course_detail, name='lecturer_course_detail'),
+    path('<int:assignment_id>/create-assignment/', views.create_assignment, name='create_assignment'),
+    path('<int:assignment_id>/create-notes/', views.create_course_notes, name='create_course_notes'),
+    path('<int:assignment_id>/create-announcement/', views.create_announcement, name='create_announcement'),
+]
+
+lecturer_patterns = [
+    path('dashboard/', views.lecturer_dashboard, name='lecturer_dashboard'),
+    path('unit/dashboard/', views.lecturer_unit_dashboard, name='lecturer_unit_dashboard'),
+    path('profile/', views.lecturer_profile, name='lecturer_profile'),
+    path('profile/upload-picture/', views.lecturer_profile_picture_upload, name='lecturer_profile_picture_upload'),
+    path('course/', include(lecturer_course_patterns)),
+    path('timetable/', views.lecturer_timetable_view, name='lecturer_timetable'),
+    path('attendance/', views.lecturer_attendance_dashboard, name='lecturer_attendance_dashboard'),
+    path('attendance/generate/<int:timetable_id>/', views.lecturer_generate_qr_attendance, name='lecturer_generate_qr_attendance'),
+    path('attendance/detail/<int:session_id>/', views.lecturer_attendance_detail, name='lecturer_attendance_detail'),
+    path('get-student-enrollments/', views.get_student_enrollments, name='get_student_enrollments'),
+    path('save-grades/', views.save_grades, name='save_grades'),
+    path('get-semesters-by-year/', views.get_semesters_by_year, name='get_semesters_by_year'),
+    path('get-course-students/', views.get_course_students, name='get_course_students'),
+    path('update-attendance/', views.update_attendance, name='update_attendance'),
+    path('generate-qr-attendance/<int:course_id>/<int:semester_id>/', views.generate_qr_attendance, name='generate_qr_attendance'),
+]
+
+dashboard_patterns = [
+    path('', views.student_dashboard, name='student_dashboard'),
+    path('lecturer-allocation/', views.lecturer_allocation_dashboard, name='lecturer_allocation_dashboard'),
+    path('allocate-course/', views.allocate_course_to_lecturer, name='allocate_course_to_lecturer'),
+    path('remove-allocation/', views.remove_course_allocation, name='remove_course_allocation'),
+]
+
+assignment_patterns = [
+    path('<int:assignment_id>/submissions/', views.assignment_submissions_list, name='assignment_submissions_list'),
+    path('<int:assignment_id>/bulk-grade/', views.bulk_grade_submissions, name='bulk_grade_submissions'),
+    path('<int:assignment_id>/statistics/', views.submission_statistics, name='submission_statistics'),
+]
+
+submission_patterns = [
+    path('<int:submission_id>/grade/', views.grade_submission, name='grade_submission'),
+    path('<int:submission_id>/quick-grade/', views.quick_grade_submission, name='quick_grade_submission'),
+    path('<int:submission_id>/download/', views.download_submission, name='download_submission'),
+]
+
+
+# =============================================================================
+# Attendance
+# =============================================================================
+
+attendance_patterns = [
+    path('scan/', views.scan_attendance_qr, name='scan_attendance_qr'),
+    path('mark/<str:token>/', views.mark_attendance_qr, name='mark_attendance_qr'),
+]
+
+
+# =============================================================================
+# Hostels
+# =============================================================================
+
+hostel_patterns = [
+    path('check-eligibility/', views.hostel_booking_eligibility, name='hostel_booking_eligibility'),
+    path('list/', views.hostel_list, name='hostel_list'),
+    path('<int:hostel_id>/rooms/', views.room_list, name='room_list'),
+    path('<int:hostel_id>/rooms/create/', views.create_single_room, name='create_single_room'),
+    path('<int:hostel_id>/rooms/bulk-create/', views.bulk_create_rooms, name='bulk_create_rooms'),
+    path('<int:hostel_id>/rooms/bulk-delete/', views.bulk_delete_rooms, name='bulk_delete_rooms'),
+    path('get-booking-data/', views.get_booking_data, name='get_booking_data'),
+    path('get-room-availability/', views.get_room_availability, name='get_room_availability'),
+]
+
+rooms_patterns = [
+    path('<int:room_id>/delete/', views.delete_room, name='delete_room'),
+    path('<int:room_id>/toggle-status/', views.toggle_room_status, name='toggle_room_status'),
+    path('<int:room_id>/details/', views.get_room_details, name='get_room_details'),
+]
+
+booking_patterns = [
+    path('<int:booking_id>/', views.hostel_booking_detail, name='hostel_booking_detail'),
+    path('<int:booking_id>/cancel/', views.cancel_booking, name='cancel_booking'),
+]
+
+admin_hostel_management_patterns = [
+    path('', views.admin_hostel_management, name='admin_hostel_management'),
+    path('<int:hostel_id>/', views.hostel_detail_view, name='hostel_detail_view'),
+]
+
+admin_hostel_bookings_patterns = [
+    path('details/<int:booking_id>/', views.booking_details_ajax, name='booking_details_ajax'),
+    path('update/<int:booking_id>/', views.update_booking_ajax, name='update_booking_ajax'),
+    path('delete/<int:booking_id>/', views.delete_booking_ajax, name='delete_booking_ajax'),
+    path('stats/', views.booking_stats_ajax, name='booking_stats_ajax'),
+    path('bulk-update/', views.bulk_update_bookings_ajax, name='bulk_update_bookings_ajax'),
+]
+
+
+# =============================================================================
+# Library
+# =============================================================================
+
+library_api_patterns = [
+    path('books/create/', views.create_book, name='create_book'),
+    path('books/<int:book_id>/update/', views.update_book, name='update_book'),
+    path('books/<int:book_id>/delete/', views.delete_book, name='delete_book'),
+    path('books/<int:book_id>/details/', views.get_book_details, name='get_book_details'),
+    path('transactions/create/', views.create_transaction, name='create_transaction'),
+    path('transactions/<int:transaction_id>/return/', views.return_book, name='return_book'),
+    path('transactions/<int:transaction_id>/details/', views.get_transaction_details, name='get_transaction_details'),
+]
+
+
+# =============================================================================
+# Events, clubs, comments, notifications and news
+# =============================================================================
+
+events_patterns = [
+    path('', views.student_events, name='student_events'),
+    path('register/<int:event_id>/', views.register_event, name='register_event'),
+    path('create/', views.create_event, name='create_event'),
+    path('<int:event_id>/update/', views.update_event, name='update_event'),
+    path('<int:event_id>/delete/', views.delete_event, name='delete_event'),
+    path('<int:event_id>/details/', views.get_event_details, name='get_event_details'),
+]
+
+admin_clubs_patterns = [
+    path('', views.clubs_management, name='clubs_management'),
+    path('create/', views.create_club, name='create_club'),
+    path('<int:club_id>/', views.get_club, name='get_club'),
+    path('<int:club_id>/update/', views.update_club, name='update_club'),
+    path('<int:club_id>/delete/', views.delete_club, name='delete_club'),
+]
+
+admin_club_events_patterns = [
+    path('', views.club_events_management, name='club_events_management'),
+    path('create/', views.create_club_event, name='create_club_event'),
+    path('<int:event_id>/', views.get_club_event, name='get_club_event'),
+    path('<int:event_id>/update/', views.update_club_event, name='update_club_event'),
+    path('<int:event_id>/delete/', views.delete_club_event, name='delete_club_event'),
+]
+
+admin_student_comments_patterns = [
+    path('', views.student_comments_management, name='student_comments_management'),
+    path('<int:comment_id>/', views.get_student_comment, name='get_student_comment'),
+    path('<int:comment_id>/respond/', views.add_admin_response, name='add_admin_response'),
+    path('<int:comment_id>/update-response/', views.update_admin_response, name='update_admin_response'),
+    path('<int:comment_id>/toggle-status/', views.toggle_comment_status, name='toggle_comment_status'),
+    path('<int:comment_id>/delete/', views.delete_student_comment, name='delete_student_comment'),
+    path('bulk-action/', views.bulk_action_comments, name='bulk_action_comments'),
+]
+
+admin_notifications_patterns = [
+    path('', views.notification_management, name='notification_management'),
+    path('<int:notification_id>/', views.notification_detail, name='notification_detail'),
+    path('create/', views.create_notification, name='create_notification'),
+    path('<int:notification_id>/mark-read/', views.mark_as_read, name='mark_notification_read'),
+    path('<int:notification_id>/delete/', views.delete_notification, name='delete_notification'),
+    path('bulk-action/', views.bulk_action, name='notification_bulk_action'),
+    path('get-students/', views.get_students, name='get_students'),
+]
+
+broadcasts_patterns = [
+    path('menu/', views.broadcast_menu, name='broadcast_menu'),
+    path('<int:broadcast_id>/read/', views.read_broadcast, name='read_broadcast'),
+    path('read-all/', views.read_all_broadcasts, name='read_all_broadcasts'),
+]
+
+admin_news_patterns = [
+    path('', views.news_management, name='news_management'),
+    path('<int:article_id>/', views.news_detail, name='news_detail'),
+    path('create/', views.create_news, name='create_news'),
+    path('<int:article_id>/update/', views.update_news, name='update_news'),
+    path('<int:article_id>/delete/', views.delete_news, name='delete_news'),
+    path('<int:article_id>/toggle-publish/', views.toggle_publish_status, name='toggle_publish_status'),
+    path('bulk-action/', views.bulk_news_action, name='news_bulk_action'),
+    path('get-authors/', views.get_authors, name='get_authors'),
+]
+
+
+# =============================================================================
+# Fees and payments
+# =============================================================================
+
+api_patterns = [
+    path('programmes-by-school/', views.get_programmes_by_school, name='get_programmes_by_school'),
+    path('semesters-by-year/', views.get_semesters_by_year, name='api_semesters_by_year'),
+    path('programme/<int:programme_id>/academic-year/<int:academic_year_id>/year-data/', views.get_programme_year_data, name='get_programme_year_data'),
+    path('payments/equity/webhook/', views.equity_bank_webhook, name='equity_webhook'),
+    path('payments/kcb/webhook/', views.kcb_bank_webhook, name='kcb_webhook'),
+    path('payments/mpesa/callback/', views.mpesa_callback, name='mpesa_callback'),
+]
+
+fee_structures_patterns = [
+    path('', views.fee_structure_list, name='fee_structure_list'),
+    path('comparison/', views.fee_structure_comparison, name='fee_structure_comparison'),
+]
+
+finance_patterns = [
+    path('fee-structures/', views.finance_fee_structure_list, name='finance_fee_structure_list'),
+    path('programme/<int:programme_id>/fees/', views.finance_programme_fee_detail, name='finance_programme_fee_detail'),
+    path('payments/', views.finance_fee_payment_list, name='finance_fee_payment_list'),
+    path('payments/<int:payment_id>/', views.finance_fee_payment_detail, name='finance_fee_payment_detail'),
+    path('payments/reconciliation/', views.payment_reconciliation_view, name='payment_reconciliation'),
+    path('payments/manual-verification/', views.manual_payment_verification, name='manual_verification'),
+]
+
+fee_structure_patterns = [
+    path('edit/<int:fee_structure_id>/', views.edit_fee_structure, name='finance_edit_fee_structure'),
+    path('delete/<int:fee_structure_id>/', views.delete_fee_structure, name='finance_delete_fee_structure'),
+    path('add/', views.add_fee_structure, name='finance_add_fee_structure'),
+]
+
+
+# =============================================================================
+# Programmes, courses, grades, timetables and exams
+# =============================================================================
+
+ajax_staff_patterns = [
+    path('list/', views.staff_ajax_list, name='staff_ajax_list'),
+    path('create/', views.staff_create_ajax, name='staff_create_ajax'),
+    path('<int:staff_id>/detail/', views.staff_detail_ajax, name='staff_detail_ajax'),
+    path('<int:staff_id>/update/', views.staff_update_ajax, name='staff_update_ajax'),
+    path('<int:staff_id>/delete/', views.staff_delete_ajax, name='staff_delete_ajax'),
+]
+
+ajax_patterns = [
+    path('rooms/', views.get_rooms_ajax, name='get_rooms_ajax'),
+    path('beds/', views.get_beds_ajax, name='get_beds_ajax'),
+    path('departments-by-faculty/', views.get_departments_by_faculty, name='departments_by_faculty'),
+    path('add-programme-year/', views.add_programme_year, name='ajax_add_programme_year'),
+    path('add-programme-semester/', views.add_programme_semester, name='ajax_add_programme_semester'),
+    path('add-programme-course/', views.add_programme_course, name='ajax_add_programme_course'),
+    path('get-available-courses/', views.get_available_courses, name='ajax_get_available_courses'),
+    path('remove-programme-course/', views.remove_programme_course, name='ajax_remove_programme_course'),
+    path('student/<int:student_id>/enrollments/', views.get_student_enrollments, name='get_student_enrollments'),
+    path('enrollment/add/', views.add_student_enrollment, name='add_student_enrollment'),
+    path('enrollment/<int:enrollment_id>/delete/', views.delete_student_enrollment, name='delete_student_enrollment'),
+    path('enrollment/bulk-add/', views.bulk_add_enrollments, name='bulk_add_enrollments'),
+    path('semesters/options/', views.get_semester_options, name='get_semester_options'),
+    path('programme/<int:programme_id>/students/', views.get_programme_students, name='get_programme_students'),
+    path('programme/<int:programme_id>/courses/', views.get_programme_courses, name='get_programme_courses'),
+    path('course/<int:course_id>/lecturers/', views.get_course_lecturers, name='get_course_lecturers'),
+    path('staff/', include(ajax_staff_patterns)),
+    path('departments/', views.departments_ajax, name='departments_ajax'),
+    path('process-student-report/', views.process_student_report, name='process_student_report'),
+    path('bulk-approve-reports/', views.bulk_approve_reports, name='bulk_approve_reports'),
+    path('create-rooms-bulk/', views.create_rooms_bulk, name='create_rooms_bulk'),
+    path('toggle-bed-maintenance/', views.toggle_bed_maintenance, name='toggle_bed_maintenance'),
+    path('checkout-student/', views.checkout_student, name='checkout_student'),
+    path('search-students/', views.search_students, name='search_students'),
+    path('assign-bed-to-student/', views.assign_bed_to_student, name='assign_bed_to_student'),
+]
+
+admin_marks_entry_patterns = [
+    path('', views.admin_marks_entry, name='admin_marks_entry'),
+    path('<str:student_id>/', views.admin_marks_entry, name='admin_marks_entry_student'),
+]
+
+programmes_patterns = [
+    path('', views.programme_list, name='programme_list'),
+    path('add/', views.add_programme, name='add_programme'),
+    path('<int:programme_id>/edit/', views.edit_programme, name='edit_programme'),
+    path('<int:programme_id>/', views.programme_detail, name='programme_detail'),
+    path('<int:programme_id>/courses/<int:course_id>/enrollments/', views.course_enrollments, name='course_enrollments'),
+]
+
+grades_patterns = [
+    path('', views.grades_list, name='grades_list'),
+    path('download-pdf/', views.download_grades_pdf, name='download_grades_pdf'),
+    path('course/<int:course_id>/', views.course_grades, name='course_grades'),
+    path('analytics/', views.grades_analytics, name='grades_analytics'),
+]
+
+academics_api_patterns = [
+    path('academic-years/', views.get_academic_years, name='get_academic_years'),
+    path('academic-years/create/', views.create_academic_year, name='create_academic_year'),
+    path('academic-years/<int:year_id>/update/', views.update_academic_year, name='update_academic_year'),
+    path('academic-years/<int:year_id>/delete/', views.delete_academic_year, name='delete_academic_year'),
+    path('academic-years/<int:year_id>/set-current/', views.set_current_academic_year, name='set_current_academic_year'),
+    path('academic-years/<int:year_id>/semesters/create/', views.create_semester, name='create_semester'),
+    path('semesters/<int:semester_id>/update/', views.update_semester, name='update_semester'),
+    path('semesters/<int:semester_id>/delete/', views.delete_semester, name='delete_semester'),
+    path('semesters/<int:semester_id>/set-current/', views.set_current_semester, name='set_current_semester'),
+    path('semesters/<int:semester_id>/registrations/', views.get_semester_registrations, name='get_semester_registrations'),
+]
+
+admin_students_patterns = [
+    path('enrollments/', views.admin_student_enrollment_list, name='admin_student_enrollment_list'),
+    path('search/', views.student_search, name='student_search'),
+    path('<str:student_id>/transcript/', views.admin_student_transcript, name='admin_student_transcript'),
+    path('<str:student_id>/transcript/download/', views.download_transcript_pdf, name='download_transcript_pdf'),
+    path('<str:student_id>/certificate/download/', views.download_certificate_pdf, name='download_certificate_pdf'),
+]
+
+departments_patterns = [
+    path('export/', views.department_export, name='department_export'),
+    path('<str:code>/', views.department_detail, name='department_detail'),
+    path('<str:code>/update/', views.department_update, name='department_update'),
+    path('<str:code>/delete/', views.department_delete, name='department_delete'),
+    path('api/<int:department_id>/programmes/', views.get_department_programmes, name='get_department_programmes'),
+]
+
+student_exams_patterns = [
+    path('', views.student_exam_programmes_list, name='student_exam_programmes_list'),
+    path('programme/<int:programme_id>/', views.student_exam_programme_detail, name='student_exam_programme_detail'),
+]
+
+exams_patterns = [
+    path('course-students/<int:programme_id>/<int:course_id>/<int:semester_id>/', views.course_exam_students_list, name='course_exam_students_list'),
+    path('ajax/academic-year-courses/<int:programme_id>/<int:academic_year_id>/<int:year>/<int:semester_num>/', views.get_academic_year_courses, name='get_academic_year_courses'),
+    path('download-eligible-students/<int:programme_id>/<int:course_id>/<int:semester_id>/', views.download_eligible_students_csv, name='download_eligible_students_csv'),
+    path('download-all-students/<int:programme_id>/<int:course_id>/<int:semester_id>/', views.download_all_students_csv, name='download_all_students_csv'),
+]
+
+courses_patterns = [
+    path('', views.course_list, name='course_list'),
+    path('<int:course_id>/', views.course_detail, name='course_detail'),
+    path('add/', views.add_course, name='add_course'),
+    path('<int:course_id>/edit/', views.edit_course, name='edit_course'),
+    path('<int:course_id>/delete/', views.delete_course, name='delete_course'),
+]
+
+
+# =============================================================================
+# Administration
+# =============================================================================
+
+admin_dashboard_patterns = [
+    path('', views.admin_dashboard, name='admin_dashboard'),
+    path('query-profiler/', views.query_profiler_dashboard, name='query_profiler_dashboard'),
+]
+
+admin_profile_patterns = [
+    path('', views.admin_profile, name='admin_profile'),
+    path('api/', views.admin_profile_api, name='admin_profile_api'),
+]
+
+students_patterns = [
+    path('', views.student_list, name='student_list'),
+    path('create/', views.student_create, name='student_create'),
+    path('<str:student_id>/', views.student_detail, name='student_detail'),
+    path('<str:student_id>/update/', views.student_update, name='student_update'),
+    path('<str:student_id>/delete/', views.student_delete, name='student_delete'),
+    path('<str:student_id>/performance/', views.student_performance, name='student_performance'),
+    path('<int:student_id>/courses/<int:course_id>/enrollment/', views.student_enrollment_detail, name='student_enrollment_detail'),
+]
+
+lecturers_patterns = [
+    path('', views.lecturer_list, name='lecturer_list'),
+    path('create/', views.lecturer_create, name='lecturer_create'),
+    path('<str:employee_number>/', views.lecturer_detail, name='lecturer_detail'),
+    path('<str:employee_number>/edit/', views.lecturer_update, name='lecturer_update'),
+    path('<str:employee_number>/delete/', views.lecturer_delete, name='lecturer_delete'),
+    path('bulk/action/', views.lecturer_bulk_action, name='lecturer_bulk_action'),
+    path('export/csv/', views.lecturer_export, name='lecturer_export'),
+]
+
+admin_student_reporting_patterns = [
+    path('', views.student_reporting_list, name='student_reporting_list'),
+    path('<int:student_id>/', views.student_reporting_detail, name='student_reporting_detail'),
+    path('export/', views.export_reporting_data, name='export_reporting_data'),
+]
+
+
+# =============================================================================
+# Analytics
+# =============================================================================
+
+analytics_api_patterns = [
+    path('student-enrollment/', views.student_enrollment_data, name='student_enrollment_data'),
+    path('academic-performance/', views.academic_performance_data, name='academic_performance_data'),
+    path('financial-data/', views.financial_data, name='financial_data'),
+    path('hostel-occupancy/', views.hostel_occupancy_data, name='hostel_occupancy_data'),
+    path('library-usage/', views.library_usage_data, name='library_usage_data'),
+    path('attendance-analytics/', views.attendance_analytics_data, name='attendance_analytics_data'),
+]
+
+
+# =============================================================================
+# Dean
+# =============================================================================
+
+dean_lecturers_patterns = [
+    path('', views.dean_lecturer_list, name='dean_lecturer_list'),
+    path('export/', views.dean_lecturer_export, name='dean_lecturer_export'),
+    path('bulk-action/', views.dean_lecturer_bulk_action, name='dean_lecturer_bulk_action'),
+    path('<str:employee_number>/', views.dean_lecturer_detail, name='dean_lecturer_detail'),
+    path('<str:employee_number>/toggle-status/', views.dean_lecturer_toggle_status, name='dean_lecturer_toggle_status'),
+]
+
+dean_patterns = [
+    path('programmes/', views.dean_programmes, name='dean_programmes'),
+    path('programmes/<int:programme_id>/', views.dean_programme_detail, name='dean_programme_detail'),
+    path('allocate-courses/', views.dean_allocate_courses, name='dean_allocate_courses'),
+    path('remove-course-assignment/<int:assignment_id>/', views.dean_remove_course_assignment, name='dean_remove_course_assignment'),
+    path('lecturer-assignments/<int:lecturer_id>/', views.dean_view_lecturer_assignments, name='dean_view_lecturer_assignments'),
+    path('students/', views.dean_student_list, name='dean_student_list'),
+    path('students/<str:student_id>/', views.dean_student_detail, name='dean_student_detail'),
+    path('students/<str:student_id>/performance/', views.dean_student_performance, name='dean_student_performance'),
+    path('ajax/programmes/', views.get_programmes_by_department, name='get_programmes_by_department'),
+    path('profile/', views.dean_profile, name='dean_profile'),
+    path('lecturers/', include(dean_lecturers_patterns)),
+    path('api/departments/', views.dean_faculty_departments_api, name='dean_faculty_departments_api'),
+    path('api/analytics/', views.dean_analytics_api, name='dean_analytics_api'),
+    path('departments/', views.dean_departments_list, name='dean_departments_list'),
+    path('departments/<str:code>/', views.dean_department_detail, name='dean_department_detail'),
+    path('hods/', views.dean_hods_management, name='dean_hods_management'),
+    path('hods/assign/<str:department_code>/', views.assign_hod, name='assign_hod'),
+    path('hods/remove/<str:department_code>/', views.remove_hod, name='remove_hod'),
+    path('reports/', views.dean_report, name='dean_reports'),
+]
+
+
+# =============================================================================
+# Chair of department
+# =============================================================================
+
+cod_timetable_patterns = [
+    path('', views.view_timetable, name='cod_view_timetable'),
+    path('dashboard/', views.cod_timetable_dashboard, name='cod_timetable_dashboard'),
+    path('create/', views.cod_create_timetable, name='cod_create_timetable'),
+    path('view/<int:programme_id>/<int:year>/<int:semester_id>/', views.cod_view_timetable, name='cod_view_timetable'),
+    path('save-slot/', views.cod_save_timetable_slot, name='cod_save_timetable_slot'),
+    path('delete-slot/', views.cod_delete_timetable_slot, name='cod_delete_timetable_slot'),
+    path('get-courses/', views.cod_get_courses_ajax, name='cod_get_courses_ajax'),
+]
+
+cod_applications_patterns = [
+    path('special-exams/', views.cod_special_exam_applications, name='cod_special_exam_applications'),
+    path('special-exams/<int:application_id>/process/', views.process_special_exam, name='cod_process_special_exam'),
+    path('deferments/', views.cod_deferment_applications, name='cod_deferment_applications'),
+    path('deferments/<int:application_id>/process/', views.process_deferment, name='cod_process_deferment'),
+]
+
+cod_patterns = [
+    path('dashboard/', views.cod_dashboard, name='cod_dashboard'),
+    path('department/info/', views.department_info, name='cod_department_info'),
+    path('department/programmes/', views.department_programmes, name='cod_department_programmes'),
+    path('department/courses/', views.department_courses, name='cod_department_courses'),
+    path('download-students/<int:programme_id>/<int:year>/', views.download_students_csv, name='cod_download_students'),
+    path('download-all-students/<int:programme_id>/', views.download_all_programme_students_csv, name='cod_download_all_programme_students'),
+    path('lecturers/', views.lecturers_list, name='cod_lecturers_list'),
+    path('lecturers/<int:lecturer_id>/', views.lecturer_detail, name='cod_lecturer_detail'),
+    path('assignments/', views.course_assignments, name='cod_course_assignments'),
+    path('assignments/assign/', views.assign_course, name='cod_assign_course'),
+    path('assignments/<int:assignment_id>/unassign/', views.unassign_course, name='cod_unassign_course'),
+    path('workload/', views.workload_analysis, name='cod_workload_analysis'),
+    path('students/', views.students_list, name='cod_students_list'),
+    path('students/<int:student_id>/', views.cod_student_detail, name='cod_student_detail'),
+    path('enrollments/', views.enrollments_list, name='cod_enrollments_list'),
+    path('performance/', views.student_performance, name='cod_student_performance'),
+    path('timetable/', include(cod_timetable_patterns)),
+    path('exams/schedule/', views.exam_schedule, name='cod_exam_schedule'),
+    path('exams/marks-approval/', views.marks_approval, name='cod_marks_approval'),
+    path('applications/', include(cod_applications_patterns)),
+    path('clearances/', views.cod_clearance_requests, name='cod_clearance_requests'),
+    path('clearances/<int:clearance_id>/process/', views.process_clearance, name='cod_process_clearance'),
+    path('reports/department/', views.cod_department_report, name='cod_department_report'),
+    path('reports/enrollment/', views.cod_enrollment_report, name='cod_enrollment_report'),
+    path('reports/performance/', views.cod_performance_report, name='cod_performance_report'),
+    path('generate-exam-list/', views.cod_generate_exam_list, name='cod_generate_exam_list'),
+    path('download-exam-attendance-sheet/', views.cod_download_exam_attendance_sheet, name='cod_download_exam_attendance_sheet'),
+    path('get-courses-for-programme/', views.cod_get_courses_for_programme, name='cod_get_courses_for_programme'),
+]
+
+research_patterns = [
+    path('', views.cod_research_dashboard, name='cod_research_dashboard'),
+    path('<int:research_id>/', views.cod_research_detail, name='cod_research_detail'),
+    path('create/', views.cod_create_research, name='cod_create_research'),
+    path('<int:research_id>/edit/', views.cod_edit_research, name='cod_edit_research'),
+    path('<int:research_id>/delete/', views.cod_delete_research, name='cod_delete_research'),
+]
+
+results_patterns = [
+    path('dashboard/', views.cod_results_dashboard, name='cod_results_dashboard'),
+    path('view/', views.cod_view_results, name='cod_view_results'),
+    path('student/<str:student_id>/', views.cod_student_results_detail, name='cod_student_results_detail'),
+    path('promotion-analysis/', views.cod_promotion_analysis, name='cod_promotion_analysis'),
+    path('download-excel/', views.cod_download_results_excel, name='cod_download_results_excel'),
+    path('download-promotion-list/', views.cod_download_promotion_list, name='cod_download_promotion_list'),
+]
+
+consultation_patterns = [
+    path('', views.cod_student_consultation, name='cod_student_consultation'),
+    path('student/<str:student_id>/', views.cod_student_consultation_detail, name='cod_student_consultation_detail'),
+    path('student/<str:student_id>/advice/', views.cod_student_advice, name='cod_student_advice'),
+    path('edit-grade/<int:enrollment_id>/', views.cod_edit_grade, name='cod_edit_grade'),
+    path('quick-edit-grade/', views.cod_quick_edit_grade, name='cod_quick_edit_grade'),
+    path('student/<str:student_id>/transcript-pdf/', views.cod_download_transcript_pdf, name='cod_download_transcript_pdf'),
+]
+
+
+# =============================================================================
+# Downloads
+# =============================================================================
+
+transcript_pdf_patterns = [
+    path('', views.student_transcript_pdf, name='transcript_pdf'),
+    path('year/<int:academic_year_id>/', views.student_transcript_pdf, name='transcript_pdf_year'),
+    path('semester/<int:semester_id>/', views.student_transcript_pdf, name='transcript_pdf_semester'),
+]
+
+
 urlpatterns = [
-    # Student authentication
+    path('cod/', include(cod_patterns)),
+    path('ajax/', include(ajax_patterns)),
+    path('dean/', include(dean_patterns)),
+    path('lecturer/', include(lecturer_patterns)),
+    path('student/', include(student_patterns)),
+    path('academics/api/', include(academics_api_patterns)),
+    path('hostel/', include(hostel_patterns)),
+    path('admin-news/', include(admin_news_patterns)),
+    path('library/api/', include(library_api_patterns)),
+    path('admin-student-comments/', include(admin_student_comments_patterns)),
+    path('admin-notifications/', include(admin_notifications_patterns)),
+    path('broadcasts/', include(broadcasts_patterns)),
+    path('students/', include(students_patterns)),
+    path('lecturers/', include(lecturers_patterns)),
+    path('events/', include(events_patterns)),
+    path('api/', include(api_patterns)),
+    path('finance/', include(finance_patterns)),
+    path('analytics/api/', include(analytics_api_patterns)),
+    path('results/', include(results_patterns)),
+    path('consultation/', include(consultation_patterns)),
+    path('messages/', include(messages_patterns)),
+    path('admin-hostel/bookings/', include(admin_hostel_bookings_patterns)),
+    path('admin-clubs/', include(admin_clubs_patterns)),
+    path('admin-club-events/', include(admin_club_events_patterns)),
+    path('programmes/', include(programmes_patterns)),
+    path('admin-students/', include(admin_students_patterns)),
+    path('departments/', include(departments_patterns)),
+    path('courses/', include(courses_patterns)),
+    path('research/', include(research_patterns)),
+    path('dashboard/', include(dashboard_patterns)),
+    path('grades/', include(grades_patterns)),
+    path('exams/', include(exams_patterns)),
+    path('clubs/', include(clubs_patterns)),
+    path('assignment/', include(assignment_patterns)),
+    path('submission/', include(submission_patterns)),
+    path('rooms/', include(rooms_patterns)),
+    path('fee-structure/', include(fee_structure_patterns)),
+    path('admin-student-reporting/', include(admin_student_reporting_patterns)),
+    path('transcript/pdf/', include(transcript_pdf_patterns)),
+    path('club-events/', include(club_events_patterns)),
+    path('special-exams/', include(special_exams_patterns)),
+    path('deferments/', include(deferments_patterns)),
+    path('clearances/', include(clearances_patterns)),
+    path('attendance/', include(attendance_patterns)),
+    path('booking/', include(booking_patterns)),
+    path('admin-hostel-management/', include(admin_hostel_management_patterns)),
+    path('fee-structures/', include(fee_structures_patterns)),
+    path('admin-marks-entry/', include(admin_marks_entry_patterns)),
+    path('student-exams/', include(student_exams_patterns)),
+    path('admin-dashboard/', include(admin_dashboard_patterns)),
+    path('admin-profile/', include(admin_profile_patterns)),
     path('', views.login_view, name='login_view'),
     path('logout/', views.logout_view, name='logout_view'),
-    path('lecturer/dashboard/', views.lecturer_dashboard, name='lecturer_dashboard'),
-    path('dean-dashbaord/', views.dean_dashboard , name='dean_dashboard'),
-    
-    # Student dashboard and main views
-    path('dashboard/', views.student_dashboard, name='student_dashboard'),
+    path('admin-2fa-verify/', views.admin_2fa_verify_view, name='admin_2fa_verify'),
+    path('admin-resend-2fa/', views.admin_resend_2fa_code, name='admin_resend_2fa_code'),
+    path('admin-login/', views.admin_login_view, name='admin_login'),
+    path('admin-logout/', views.admin_logout_view, name='admin_logout'),
     path('profile/', views.student_profile, name='student_profile'),
     path('units/', views.student_units_view, name='student_units'),
+    path('units/<int:course_id>/leave-waitlist/', views.leave_course_waitlist, name='leave_course_waitlist'),
     path('check-prerequisites/', views.check_prerequisites_ajax, name='check_prerequisites'),
     path('course-details/<int:course_id>/', views.course_details_ajax, name='course_details'),
     path('reporting/', views.student_reporting, name='student_reporting'),
     path('news/', views.student_news, name='student_news'),
-    path('course_evaluation/', views.course_evaluation , name='course_evaluation'),
-    # Events
-    path('events/', views.student_events, name='student_events'),
-    path('events/register/<int:event_id>/', views.register_event, name='register_event'),
+    path('course_evaluation/', views.course_evaluation, name='course_evaluation'),
     path('comments/', views.student_comments, name='student_comments'),
-    path('faqs/', views.faqs , name="faqs"),
-    path('virtual_assistant', views.virtual_assistant , name="virtual_assistant"),
+    path('faqs/', views.faqs, name='faqs'),
+    path('virtual_assistant', views.virtual_assistant, name='virtual_assistant'),
     path('process-query/', views.process_assistant_query, name='process_assistant_query'),
-    
-   
-
-    path('news/', views.student_news, name='student_news'),
-    path('clubs/', views.student_clubs, name='student_clubs'),
-    path('clubs/join/<int:club_id>/', views.join_club, name='join_club'),
-    path('clubs/leave/<int:club_id>/', views.leave_club, name='leave_club'),
-    path('club-events/', views.club_events, name='club_events'),
-    path('club-events/<int:club_id>/', views.club_events, name='club_events_detail'),
-
-    # Main hostel booking flow
-    path('hostel/check-eligibility/', views.hostel_booking_eligibility, name='hostel_booking_eligibility'),
-    path('hostel/list/', views.hostel_list, name='hostel_list'),
-    path('hostel/<int:hostel_id>/rooms/', views.room_list, name='room_list'),
+    path('exam-repository/', views.exam_repository, name='exam_repository'),
+    path('exam-material/<int:material_id>/download/', views.download_exam_material, name='download_exam_material'),
+    path('notifications/', views.notifications, name='student_notifications'),
+    path('lecturer_support/', views.lecturer_support, name='lecturer_support'),
+    path('lecturer_training/', views.lecturer_training, name='lecturer_training'),
+    path('curriculum/', views.curriculum, name='curriculum'),
+    path('grade-entry/', views.grade_entry, name='grade_entry'),
+    path('my-students/', views.my_students, name='my_students'),
     path('room/<int:room_id>/beds/', views.bed_list, name='bed_list'),
     path('bed/<int:bed_id>/book/', views.book_bed, name='book_bed'),
-
-    #warden hostel views
-    # Hostel Management URLs
     path('hostels/', views.get_hostel_list, name='warden_hostel_list'),
     path('warden/hostel/<int:hostel_id>/rooms/', views.hostel_room_management, name='hostel_room_management'),
-    
-    # Room Creation URLs
-    path('hostel/<int:hostel_id>/rooms/create/', views.create_single_room, name='create_single_room'),
-    path('hostel/<int:hostel_id>/rooms/bulk-create/', views.bulk_create_rooms, name='bulk_create_rooms'),
-    
-    # Room Management URLs
-    path('rooms/<int:room_id>/delete/', views.delete_room, name='delete_room'),
-    path('rooms/<int:room_id>/toggle-status/', views.toggle_room_status, name='toggle_room_status'),
-    path('rooms/<int:room_id>/details/', views.get_room_details, name='get_room_details'),
-    
-    # Bulk Operations URLs
-    path('hostel/<int:hostel_id>/rooms/bulk-delete/', views.bulk_delete_rooms, name='bulk_delete_rooms'),
-
-    #end of warden views 
-
-    # Booking management
-    path('booking/<int:booking_id>/', views.hostel_booking_detail, name='hostel_booking_detail'),
-    path('booking/<int:booking_id>/cancel/', views.cancel_booking, name='cancel_booking'),
-    
-    # AJAX endpoints
-    path('ajax/rooms/', views.get_rooms_ajax, name='get_rooms_ajax'),
-    path('ajax/beds/', views.get_beds_ajax, name='get_beds_ajax'),
-
-    
-    # Admin 2FA URLs
-    path('admin-2fa-verify/', views.admin_2fa_verify_view, name='admin_2fa_verify'),
-    path('admin-resend-2fa/', views.admin_resend_2fa_code, name='admin_resend_2fa_code'),
-   
-
-    # Admin authentication URLs
-    path('admin-login/', views.admin_login_view, name='admin_login'),
-    path('admin-logout/', views.admin_logout_view, name='admin_logout'),
-    path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
-    path('admin-profile/', views.admin_profile, name='admin_profile'),
-    path('admin-profile/api/', views.admin_profile_api, name='admin_profile_api'),
     path('hostel-dashboard/', views.hostel_dashboard, name='hostel_dashboard'),
-
-    path('students/', views.student_list, name='student_list'),
-    path('students/create/', views.student_create, name='student_create'),
-    path('students/<str:student_id>/', views.student_detail, name='student_detail'),
-    path('students/<str:student_id>/update/', views.student_update, name='student_update'),
-    path('students/<str:student_id>/delete/', views.student_delete, name='student_delete'),
-    path('students/<str:student_id>/performance/', views.student_performance, name='student_performance'),
-    path('api/programmes-by-school/', views.get_programmes_by_school, name='get_programmes_by_school'),
-    # Marks entry URLs
-    path('admin-marks-entry/', views.admin_marks_entry, name='admin_marks_entry'),
-    path('admin-marks-entry/<str:student_id>/', views.admin_marks_entry, name='admin_marks_entry_student'),
-    
-    
-    # AJAX endpoints
+    path('manage-bookings/', views.manage_hostel_bookings, name='manage_hostel_bookings'),
+    path('update-booking-status/', views.update_booking_status, name='update_booking_status'),
+    path('bookings/', views.admin_hostel_bookings, name='admin_hostel_bookings'),
+    path('books/', views.library_book_management, name='book_management'),
+    path('issuance/', views.library_issuance, name='issuance_management'),
+    path('admin-events/', views.event_list, name='event_list'),
+    path('programme/<int:programme_id>/fees/', views.programme_fee_detail, name='programme_fee_detail'),
+    path('admin-fee-payment/', views.admin_fee_payment, name='admin_fee_payment'),
+    path('admin-fee-get-student-info/', views.get_student_data_info, name='get_student_data_info'),
+    path('admin-ajax/fee-structure/', views.get_fee_structure, name='get_fee_structure'),
+    path('finance-dashboard/', views.finance_dashboard, name='finance_dashboard'),
     path('admin-get-student-info/', views.get_student_info, name='get_student_info'),
     path('admin-calculate-gpa/<str:student_id>/', views.calculate_student_gpa, name='calculate_student_gpa'),
-     #students transcript
-    path('student/transcript/', views.student_transcript, name='student_transcript'),
-    # Complete transcript (all years)
-    path('transcript/pdf/', views.student_transcript_pdf, name='transcript_pdf'),
-    
-    # Academic year transcript
-    path('transcript/pdf/year/<int:academic_year_id>/', views.student_transcript_pdf, name='transcript_pdf_year'),
-    
-    # Semester transcript
-    path('transcript/pdf/semester/<int:semester_id>/', views.student_transcript_pdf, name='transcript_pdf_semester'),
-
-
-    # Lecturer management URLs
-    path('lecturers/', views.lecturer_list, name='lecturer_list'),
-    path('lecturers/create/', views.lecturer_create, name='lecturer_create'),
-    path('lecturers/<str:employee_number>/', views.lecturer_detail, name='lecturer_detail'),
-    path('lecturers/<str:employee_number>/edit/', views.lecturer_update, name='lecturer_update'),
-    path('lecturers/<str:employee_number>/delete/', views.lecturer_delete, name='lecturer_delete'),
-    
-    # Bulk operations
-    path('lecturers/bulk/action/', views.lecturer_bulk_action, name='lecturer_bulk_action'),
-    
-    # Export functionality
-    path('lecturers/export/csv/', views.lecturer_export, name='lecturer_export'),
-
-    # Programme URLs
-    path('programmes/', views.programme_list, name='programme_list'),
-    path('programmes/add/', views.add_programme, name='add_programme'),
-    path('programmes/<int:programme_id>/edit/', views.edit_programme, name='edit_programme'),
-    path('ajax/departments-by-faculty/', views.get_departments_by_faculty, name='departments_by_faculty'),
-    path('programmes/<int:programme_id>/', views.programme_detail, name='programme_detail'),
-    path('programmes/<int:programme_id>/courses/<int:course_id>/enrollments/', 
-         views.course_enrollments, name='course_enrollments'),
-    path('students/<int:student_id>/courses/<int:course_id>/enrollment/', 
-         views.student_enrollment_detail, name='student_enrollment_detail'),
-
-    path('ajax/add-programme-year/', views.add_programme_year, name='ajax_add_programme_year'),
-    path('ajax/add-programme-semester/', views.add_programme_semester, name='ajax_add_programme_semester'),
-    path('ajax/add-programme-course/', views.add_programme_course, name='ajax_add_programme_course'),
-    path('ajax/get-available-courses/', views.get_available_courses, name='ajax_get_available_courses'),
-    path('ajax/remove-programme-course/', views.remove_programme_course, name='ajax_remove_programme_course'),
-
-
-    # Dean specific URLs
-    path('dean/programmes/', views.dean_programmes, name='dean_programmes'),
-    path('dean/programmes/<int:programme_id>/', views.dean_programme_detail, name='dean_programme_detail'),
-    path('dean/allocate-courses/', views.dean_allocate_courses, name='dean_allocate_courses'),
-    path('dean/remove-course-assignment/<int:assignment_id>/', views.dean_remove_course_assignment, name='dean_remove_course_assignment'),
-    path('dean/lecturer-assignments/<int:lecturer_id>/', views.dean_view_lecturer_assignments, name='dean_view_lecturer_assignments'),
-
-
-     #Grades URLs
-    path('grades/', views.grades_list, name='grades_list'),
-    path('grades/download-pdf/', views.download_grades_pdf, name='download_grades_pdf'),
-    path('api/semesters-by-year/', views.get_semesters_by_year, name='get_semesters_by_year'),
-    
-    # Additional grade-related URLs you might need
-    #path('grades/student/<str:student_id>/', views.student_transcript, name='student_transcript'),
-    path('grades/course/<int:course_id>/', views.course_grades, name='course_grades'),
-    path('grades/analytics/', views.grades_analytics, name='grades_analytics'),
-
-    # Fee Structure URLs
-    path('fee-structures/', views.fee_structure_list, name='fee_structure_list'),
-    path('programme/<int:programme_id>/fees/', views.programme_fee_detail, name='programme_fee_detail'),
-    path('fee-structures/comparison/', views.fee_structure_comparison, name='fee_structure_comparison'),
-
-    # Finance Fee Structure URL
-    path('finance/fee-structures/', views.finance_fee_structure_list, name='finance_fee_structure_list'),
-    path('finance/programme/<int:programme_id>/fees/', views.finance_programme_fee_detail, name='finance_programme_fee_detail'),
-    path('fee-structure/edit/<int:fee_structure_id>/', views.edit_fee_structure, name='finance_edit_fee_structure'),
-    path('fee-structure/delete/<int:fee_structure_id>/', views.delete_fee_structure, name='finance_delete_fee_structure'),
-    path('fee-structure/add/', views.add_fee_structure, name='finance_add_fee_structure'),
-
-    # Fee Payment Management URLs
-    path('finance/payments/', views.finance_fee_payment_list, name='finance_fee_payment_list'),
-    path('finance/payments/<int:payment_id>/', views.finance_fee_payment_detail, name='finance_fee_payment_detail'),
-
-    # Admin or HOD views
-    path('dashboard/lecturer-allocation/', views.lecturer_allocation_dashboard, name='lecturer_allocation_dashboard'),
-    path('dashboard/allocate-course/', views.allocate_course_to_lecturer, name='allocate_course_to_lecturer'),
-    path('dashboard/remove-allocation/', views.remove_course_allocation, name='remove_course_allocation'),
-
-    # Lecturer views
-    path('lecturer/unit/dashboard/', views.lecturer_unit_dashboard, name='lecturer_unit_dashboard'),
-    # Lecturer Profile URLs
-    path('lecturer/profile/', views.lecturer_profile, name='lecturer_profile'),
-    path('lecturer/profile/upload-picture/', views.lecturer_profile_picture_upload, name='lecturer_profile_picture_upload'),
-    path('lecturer/course/<int:assignment_id>/', views.lecturer_course_detail, name='lecturer_course_detail'),
-    path('lecturer/course/<int:assignment_id>/create-assignment/', views.create_assignment, name='create_assignment'),
-    path('lecturer/course/<int:assignment_id>/create-notes/', views.create_course_notes, name='create_course_notes'),
-    path('lecturer/course/<int:assignment_id>/create-announcement/', views.create_announcement, name='create_announcement'),
-
-    # Student Dashboard URLs
-    path('student/unit/dashboard/', views.student_unit_dashboard, name='student_unit_dashboard'),
-    path('student/course/<int:enrollment_id>/', views.student_course_detail, name='student_course_detail'),
-    
-    # Assignment URLs
-    path('student/assignments/', views.student_assignments, name='student_assignments'),
-    path('student/assignment/<int:assignment_id>/', views.assignment_detail, name='assignment_detail'),
-    path('student/assignment/<int:assignment_id>/submit/', views.submit_assignment, name='submit_assignment'),
-    
-    # Notes and Downloads
-    path('student/notes/<int:notes_id>/download/', views.download_notes, name='download_notes'),
-    path('student/grades/', views.student_grades, name='student_grades'),
-
-    # Assignment Submission URLs
-    path('assignment/<int:assignment_id>/submissions/', views.assignment_submissions_list, name='assignment_submissions_list'),
-    path('submission/<int:submission_id>/grade/', views.grade_submission, name='grade_submission'),   
-    path('submission/<int:submission_id>/quick-grade/', views.quick_grade_submission, name='quick_grade_submission'), 
-    path('assignment/<int:assignment_id>/bulk-grade/', views.bulk_grade_submissions, name='bulk_grade_submissions'),
-    path('assignment/<int:assignment_id>/statistics/', views.submission_statistics, name='submission_statistics'),
-
-    # Main timetable management page
     path('admin-timetable-management/', views.timetable_management, name='timetable_management'),
-    # AJAX endpoints
     path('admin-get-programme-courses/<int:programme_id>/', views.admin_get_programme_courses, name='admin_get_programme_courses'),
     path('admin-get-programme-timetable/<int:programme_id>/', views.get_programme_timetable, name='get_programme_timetable'),
     path('admin-save-timetable-entry/', views.save_timetable_entry, name='save_timetable_entry'),
     path('admin-delete-timetable-entry/<int:entry_id>/', views.delete_timetable_entry, name='delete_timetable_entry'),
     path('admin-get-available-lecturers/', views.get_available_lecturers, name='get_available_lecturers'),
-
-    #timetable URL
-    path('student/timetable/', views.student_timetable_view, name='student_timetable'),
-    path('lecturer/timetable/', views.lecturer_timetable_view, name='lecturer_timetable'),
-
-    # Lecturer Attendance URLs
-    path('lecturer/attendance/', views.lecturer_attendance_dashboard, name='lecturer_attendance_dashboard'),
-    path('lecturer/attendance/generate/<int:timetable_id>/', views.lecturer_generate_qr_attendance, name='lecturer_generate_qr_attendance'),
-    path('lecturer/attendance/detail/<int:session_id>/', views.lecturer_attendance_detail, name='lecturer_attendance_detail'),
-    
-    # Student Attendance URLS  curriculum
-    path('attendance/scan/', views.scan_attendance_qr, name='scan_attendance_qr'),
-    path('attendance/mark/<str:token>/', views.mark_attendance_qr, name='mark_attendance_qr'),
-    path('student/attendance/history/', views.student_attendance_history, name='student_attendance_history'),
-    path('lecturer_support/', views.lecturer_support, name='lecturer_support'),
-    path('lecturer_training/', views.lecturer_training, name='lecturer_training'),
-    path('curriculum/', views.curriculum, name='curriculum'),
-
-    # Lecturer Grade Entry URLs
-    path('grade-entry/', views.grade_entry, name='grade_entry'),
-    path('lecturer/get-student-enrollments/', views.get_student_enrollments, name='get_student_enrollments'),
-    path('lecturer/save-grades/', views.save_grades, name='save_grades'),
-    path('lecturer/get-semesters-by-year/', views.get_semesters_by_year, name='get_semesters_by_year'),
-
-    # Students and Attendance Management
-    path('my-students/', views.my_students, name='my_students'),
-    path('lecturer/get-course-students/', views.get_course_students, name='get_course_students'),
-    path('lecturer/update-attendance/', views.update_attendance, name='update_attendance'),
-    path('export-attendance/<int:course_id>/<int:semester_id>/', views.export_attendance, name='export_attendance'),
-    # QR Code Attendance
-    path('lecturer/generate-qr-attendance/<int:course_id>/<int:semester_id>/', views.generate_qr_attendance, name='generate_qr_attendance'),
-
-    #  Fee Management
-    path('student/fees/', views.student_fee_management, name='student_fee_management'),
-    path('admin-fee-payment/', views.admin_fee_payment, name='admin_fee_payment'),
-    path('admin-fee-get-student-info/', views.get_student_data_info, name='get_student_data_info'), #used in fee management
-    path('admin-ajax/fee-structure/', views.get_fee_structure, name='get_fee_structure'),
-    path('"payments/<int:payment_id>/receipt/download/"', views.download_payment_receipt_pdf , name="download_payment_receipt_pdf"),
-
-    # Exam Repository URLs
-    path('exam-repository/', views.exam_repository, name='exam_repository'),
-    path('exam-material/<int:material_id>/download/', views.download_exam_material, name='download_exam_material'),
-
-    # Special Exam Application URLs
-    path('special-exams/', views.special_exam_applications, name='special_exam_applications'),
-    path('special-exams/apply/', views.apply_special_exam, name='apply_special_exam'),
-    
-    # Deferment Application URLs
-    path('deferments/', views.deferment_applications, name='deferment_applications'),
-    path('deferments/apply/', views.apply_deferment, name='apply_deferment'),
-    
-    # Clearance URLs
-    path('clearances/', views.clearance_requests, name='clearance_requests'),
-    path('clearances/request/', views.request_clearance, name='request_clearance'),
-    
-    # Messaging URLs
-    path('messages/', views.messages_inbox, name='messages_inbox'),
-    path('messages/<int:message_id>/', views.message_detail, name='message_detail'),
-    path('messages/compose/', views.compose_message, name='compose_message'),
-    path('messages/<int:message_id>/reply/', views.reply_message, name='reply_message'),
-    path('messages/sent/', views.sent_messages, name='sent_messages'),
-    
-    # Notifications URL
-    path('notifications/', views.notifications, name='student_notifications'),
-
-    # Main academic management dashboard
     path('management/', views.academic_management, name='academic_management'),
-    
-    # Academic Year AJAX endpoints
-    path('academics/api/academic-years/', views.get_academic_years, name='get_academic_years'),
-    path('academics/api/academic-years/create/', views.create_academic_year, name='create_academic_year'),
-    path('academics/api/academic-years/<int:year_id>/update/', views.update_academic_year, name='update_academic_year'),
-    path('academics/api/academic-years/<int:year_id>/delete/', views.delete_academic_year, name='delete_academic_year'),
-    path('academics/api/academic-years/<int:year_id>/set-current/', views.set_current_academic_year, name='set_current_academic_year'),
-    
-    # Semester AJAX endpoints
-    path('academics/api/academic-years/<int:year_id>/semesters/create/', views.create_semester, name='create_semester'),
-    path('academics/api/semesters/<int:semester_id>/update/', views.update_semester, name='update_semester'),
-    path('academics/api/semesters/<int:semester_id>/delete/', views.delete_semester, name='delete_semester'),
-    path('academics/api/semesters/<int:semester_id>/set-current/', views.set_current_semester, name='set_current_semester'),
-    path('academics/api/semesters/<int:semester_id>/registrations/', views.get_semester_registrations, name='get_semester_registrations'),
-
-    #Main hostel booking management view
-    path('manage-bookings/', views.manage_hostel_bookings, name='manage_hostel_bookings'),
-    
-    # AJAX endpoints
-    path('hostel/get-booking-data/', views.get_booking_data, name='get_booking_data'),
-    path('hostel/get-room-availability/', views.get_room_availability, name='get_room_availability'),
-    path('update-booking-status/', views.update_booking_status, name='update_booking_status'),
-
-    # Admin Student Enrollment Management
-    path('admin-students/enrollments/', views.admin_student_enrollment_list,   name='admin_student_enrollment_list'),
-    # AJAX endpoints
-    path('ajax/student/<int:student_id>/enrollments/',  views.get_student_enrollments,  name='get_student_enrollments'),
-    path('ajax/enrollment/add/', views.add_student_enrollment, name='add_student_enrollment'),
-    path('ajax/enrollment/<int:enrollment_id>/delete/',  views.delete_student_enrollment,  name='delete_student_enrollment'),
-    path('ajax/semesters/options/', views.get_semester_options,  name='get_semester_options'),
-
-    # Bulk enrollment AJAX endpoints
-    path('ajax/programme/<int:programme_id>/students/', views.get_programme_students, name='get_programme_students'),
-    path('ajax/programme/<int:programme_id>/courses/', views.get_programme_courses, name='get_programme_courses'),
-    path('ajax/enrollment/bulk-add/', views.bulk_add_enrollments, name='bulk_add_enrollments'),
-
-    # Optional: Lecturer assignment endpoint
-    path('ajax/course/<int:course_id>/lecturers/', views.get_course_lecturers, name='get_course_lecturers'),
-
     path('department-list/', views.department_list, name='department_list'),
     path('department/create/', views.department_create, name='department_create'),
-    path('departments/<str:code>/', views.department_detail, name='department_detail'),
-    path('departments/<str:code>/update/', views.department_update, name='department_update'),
-    path('departments/<str:code>/delete/', views.department_delete, name='department_delete'),
-    path('departments/export/', views.department_export, name='department_export'),
-    
-    # AJAX endpoints
-    path('departments/api/<int:department_id>/programmes/', views.get_department_programmes, name='get_department_programmes'),
-
     path('staff/', views.staff_list_view, name='staff_list'),
-    
-    # AJAX endpoints
-    path('ajax/staff/list/', views.staff_ajax_list, name='staff_ajax_list'),
-    path('ajax/staff/create/', views.staff_create_ajax, name='staff_create_ajax'),
-    path('ajax/staff/<int:staff_id>/detail/', views.staff_detail_ajax, name='staff_detail_ajax'),
-    path('ajax/staff/<int:staff_id>/update/', views.staff_update_ajax, name='staff_update_ajax'),
-    path('ajax/staff/<int:staff_id>/delete/', views.staff_delete_ajax, name='staff_delete_ajax'),
-    path('ajax/departments/', views.departments_ajax, name='departments_ajax'),
-
-
-    # Student Reporting Management URLs
-    path('admin-student-reporting/',  views.student_reporting_list,  name='student_reporting_list'),
-    path('admin-student-reporting/<int:student_id>/', views.student_reporting_detail, name='student_reporting_detail'),
-    path('admin-student-reporting/export/', views.export_reporting_data, name='export_reporting_data'),
-    
-    # AJAX endpoints
-    path('ajax/process-student-report/', views.process_student_report, name='process_student_report'),  
-    path('ajax/bulk-approve-reports/', views.bulk_approve_reports,  name='bulk_approve_reports'),
-
-   # Main hostel management dashboard
-    path('admin-hostel-management/', views.admin_hostel_management, name='admin_hostel_management'),                    
-    path('admin-hostel-management/<int:hostel_id>/', views.hostel_detail_view, name='hostel_detail_view'),
-    
-    # AJAX endpoints for hostel management
-    path('ajax/create-rooms-bulk/', views.create_rooms_bulk, name='create_rooms_bulk'),
-    path('ajax/toggle-bed-maintenance/', views.toggle_bed_maintenance, name='toggle_bed_maintenance'),
-    path('ajax/checkout-student/', views.checkout_student, name='checkout_student'),
-    path('ajax/search-students/', views.search_students, name='search_students'),
-    path('ajax/assign-bed-to-student/', views.assign_bed_to_student, name='assign_bed_to_student'),
-
-    # Main booking management page
-    path('bookings/', views.admin_hostel_bookings, name='admin_hostel_bookings'),
-    
-    # AJAX endpoints - Fixed URL patterns
-     path('admin-hostel/bookings/details/<int:booking_id>/', views.booking_details_ajax, name='booking_details_ajax'),
-     path('admin-hostel/bookings/update/<int:booking_id>/', views.update_booking_ajax, name='update_booking_ajax'),
-     path('admin-hostel/bookings/delete/<int:booking_id>/', views.delete_booking_ajax, name='delete_booking_ajax'),  # Fixed: removed duplicate admin-hostel
-     path('admin-hostel/bookings/stats/', views.booking_stats_ajax, name='booking_stats_ajax'),
-     path('admin-hostel/bookings/bulk-update/', views.bulk_update_bookings_ajax, name='bulk_update_bookings_ajax'),
-
-     # Student Exam Management URLs
-    path('student-exams/', views.student_exam_programmes_list, name='student_exam_programmes_list'),
-    path('student-exams/programme/<int:programme_id>/', views.student_exam_programme_detail, name='student_exam_programme_detail'),
-    path('exams/course-students/<int:programme_id>/<int:course_id>/<int:semester_id>/', 
-         views.course_exam_students_list, name='course_exam_students_list'),
-    
-    # AJAX endpoints
-    path('api/programme/<int:programme_id>/academic-year/<int:academic_year_id>/year-data/', 
-         views.get_programme_year_data, name='get_programme_year_data'),
-    path('exams/ajax/academic-year-courses/<int:programme_id>/<int:academic_year_id>/<int:year>/<int:semester_num>/', 
-     views.get_academic_year_courses, name='get_academic_year_courses'),
-    
-    # Download URLs
-    path('exams/download-eligible-students/<int:programme_id>/<int:course_id>/<int:semester_id>/', 
-         views.download_eligible_students_csv, name='download_eligible_students_csv'),
-    path('exams/download-all-students/<int:programme_id>/<int:course_id>/<int:semester_id>/', 
-         views.download_all_students_csv, name='download_all_students_csv'),
-
-     # Student transcript management URLs
-    path('admin-students/search/', views.student_search, name='student_search'),
-    path('admin-students/<str:student_id>/transcript/', views.admin_student_transcript, name='admin_student_transcript'),
-    path('admin-students/<str:student_id>/transcript/download/', views.download_transcript_pdf, name='download_transcript_pdf'),
-    path('admin-students/<str:student_id>/certificate/download/', views.download_certificate_pdf, name='download_certificate_pdf'),
-
-
-    path('books/', views.library_book_management, name='book_management'),
-    path('issuance/', views.library_issuance, name='issuance_management'),
-    path('library/api/books/create/', views.create_book, name='create_book'),
-    path('library/api/books/<int:book_id>/update/', views.update_book, name='update_book'),
-    path('library/api/books/<int:book_id>/delete/', views.delete_book, name='delete_book'),
-    path('library/api/books/<int:book_id>/details/', views.get_book_details, name='get_book_details'),
-    path('library/api/transactions/create/', views.create_transaction, name='create_transaction'),
-    path('library/api/transactions/<int:transaction_id>/return/', views.return_book, name='return_book'),
-    path('library/api/transactions/<int:transaction_id>/details/', views.get_transaction_details, name='get_transaction_details'),
-
-    path('admin-events/', views.event_list, name='event_list'),
-    path('events/create/', views.create_event, name='create_event'),
-    path('events/<int:event_id>/update/', views.update_event, name='update_event'),
-    path('events/<int:event_id>/delete/', views.delete_event, name='delete_event'),
-    path('events/<int:event_id>/details/', views.get_event_details, name='get_event_details'),
-
-    # Club Management URLs
-    path('admin-clubs/', views.clubs_management, name='clubs_management'),
-    path('admin-clubs/create/', views.create_club, name='create_club'),
-    path('admin-clubs/<int:club_id>/', views.get_club, name='get_club'),
-    path('admin-clubs/<int:club_id>/update/', views.update_club, name='update_club'),
-    path('admin-clubs/<int:club_id>/delete/', views.delete_club, name='delete_club'),
-    
-    # Club Events Management URLs
-    path('admin-club-events/', views.club_events_management, name='club_events_management'),
-    path('admin-club-events/create/', views.create_club_event, name='create_club_event'),
-    path('admin-club-events/<int:event_id>/', views.get_club_event, name='get_club_event'),
-    path('admin-club-events/<int:event_id>/update/', views.update_club_event, name='update_club_event'),
-    path('admin-club-events/<int:event_id>/delete/', views.delete_club_event, name='delete_club_event'),
-
-     # Admin/Staff Comment Management URLs
-    path('admin-student-comments/', views.student_comments_management, name='student_comments_management'),
-    path('admin-student-comments/<int:comment_id>/', views.get_student_comment, name='get_student_comment'),
-    path('admin-student-comments/<int:comment_id>/respond/', views.add_admin_response, name='add_admin_response'),
-    path('admin-student-comments/<int:comment_id>/update-response/', views.update_admin_response, name='update_admin_response'),
-    path('admin-student-comments/<int:comment_id>/toggle-status/', views.toggle_comment_status, name='toggle_comment_status'),
-    path('admin-student-comments/<int:comment_id>/delete/', views.delete_student_comment, name='delete_student_comment'),
-    path('admin-student-comments/bulk-action/', views.bulk_action_comments, name='bulk_action_comments'),
-
-    # Main notification management page
-    path('admin-notifications/', views.notification_management, name='notification_management'),
-    
-    # AJAX endpoints
-    path('admin-notifications/<int:notification_id>/', views.notification_detail, name='notification_detail'),
-    path('admin-notifications/create/', views.create_notification, name='create_notification'),
-    path('admin-notifications/<int:notification_id>/mark-read/', views.mark_as_read, name='mark_notification_read'),
-    path('admin-notifications/<int:notification_id>/delete/', views.delete_notification, name='delete_notification'),
-    path('admin-notifications/bulk-action/', views.bulk_action, name='notification_bulk_action'),
-    path('admin-notifications/get-students/', views.get_students, name='get_students'),
-
-    # Main news management page
-    path('admin-news/', views.news_management, name='news_management'),
-    
-    # AJAX endpoints for CRUD operations
-    path('admin-news/<int:article_id>/', views.news_detail, name='news_detail'),
-    path('admin-news/create/', views.create_news, name='create_news'),
-    path('admin-news/<int:article_id>/update/', views.update_news, name='update_news'),
-    path('admin-news/<int:article_id>/delete/', views.delete_news, name='delete_news'),
-    path('admin-news/<int:article_id>/toggle-publish/', views.toggle_publish_status, name='toggle_publish_status'),
-    path('admin-news/bulk-action/', views.bulk_news_action, name='news_bulk_action'),
-    path('admin-news/get-authors/', views.get_authors, name='get_authors'),
-
     path('report-dashboard/', views.analytics_dashboard, name='report_dashboard'),
-    
-    # API endpoints for chart data
-    path('analytics/api/student-enrollment/', views.student_enrollment_data, name='student_enrollment_data'),
-    path('analytics/api/academic-performance/', views.academic_performance_data, name='academic_performance_data'),
-    path('analytics/api/financial-data/', views.financial_data, name='financial_data'),
-    path('analytics/api/hostel-occupancy/', views.hostel_occupancy_data, name='hostel_occupancy_data'),
-    path('analytics/api/library-usage/', views.library_usage_data, name='library_usage_data'),
-    path('analytics/api/attendance-analytics/', views.attendance_analytics_data, name='attendance_analytics_data'),
-
-    #admin units managements
-
-    path('courses/', views.course_list, name='course_list'),
-    path('courses/<int:course_id>/', views.course_detail, name='course_detail'),
-    path('courses/add/', views.add_course, name='add_course'),
-    path('courses/<int:course_id>/edit/', views.edit_course, name='edit_course'),
-    path('courses/<int:course_id>/delete/', views.delete_course, name='delete_course'),
-
-    # Student Management URLs
-    path('dean/students/', views.dean_student_list, name='dean_student_list'),
-    path('dean/students/<str:student_id>/', views.dean_student_detail, name='dean_student_detail'),
-    path('dean/students/<str:student_id>/performance/', views.dean_student_performance, name='dean_student_performance'),
-    
-    # AJAX endpoints
-    path('dean/ajax/programmes/', views.get_programmes_by_department, name='get_programmes_by_department'),
-
-    # Main lecturer list for dean
-    path('dean/profile/', views.dean_profile, name='dean_profile'),
-    path('dean/lecturers/', views.dean_lecturer_list, name='dean_lecturer_list'),
-    path('dean/lecturers/<str:employee_number>/', views.dean_lecturer_detail, name='dean_lecturer_detail'),
-    path('dean/lecturers/<str:employee_number>/toggle-status/', views.dean_lecturer_toggle_status, name='dean_lecturer_toggle_status'),
-    path('dean/lecturers/export/', views.dean_lecturer_export, name='dean_lecturer_export'),
-    path('dean/lecturers/bulk-action/',  views.dean_lecturer_bulk_action, name='dean_lecturer_bulk_action'),
-    path('dean/api/departments/',  views.dean_faculty_departments_api,  name='dean_faculty_departments_api'),
-
-    # Dean Departments Management
-    path('dean/departments/', views.dean_departments_list, name='dean_departments_list'),
-    path('dean/departments/<str:code>/', views.dean_department_detail, name='dean_department_detail'),
-    
-    # HODs Management
-    path('dean/hods/', views.dean_hods_management, name='dean_hods_management'),
-    path('dean/hods/assign/<str:department_code>/', views.assign_hod, name='assign_hod'),
-    path('dean/hods/remove/<str:department_code>/', views.remove_hod, name='remove_hod'),
-
-    path('dean/reports/', views.dean_report, name='dean_reports'),
-    
-    # Analytics API
-    path('dean/api/analytics/', views.dean_analytics_api, name='dean_analytics_api'),
-
-    # ============ BANK WEBHOOK ENDPOINTS ============
-    # These URLs are given to banks for payment notifications
-    path('api/payments/equity/webhook/', views.equity_bank_webhook, name='equity_webhook'),
-    path('api/payments/kcb/webhook/',  views.kcb_bank_webhook, name='kcb_webhook'),
-    path('api/payments/mpesa/callback/',  views.mpesa_callback, name='mpesa_callback'),
-    
-    # ============ ADMIN/FINANCE OFFICE VIEWS ============
-    path('admin/payments/reconciliation/',  views.payment_reconciliation_view, name='payment_reconciliation'), 
-    path('admin/payments/manual-verification/', views.manual_payment_verification, name='manual_verification'),
-    
-    # ============ STUDENT VIEWS ============
-    path('student/<str:student_id>/statement/', views.student_fee_statement, name='student_statement'),
-
-    #finance dashboard
-    path('finance-dashboard/', views.finance_dashboard, name='finance_dashboard'),
-
-     #Cod Operation urls Dashboard
-    path('cod/dashboard/', views.cod_dashboard, name='cod_dashboard'),
-    path('cod/department/info/', views.department_info, name='cod_department_info'),
-    path('cod/download-students/<int:programme_id>/<int:year>/', views.download_students_csv, name='cod_download_students'),
-    path('cod/download-all-students/<int:programme_id>/', views.download_all_programme_students_csv, name='cod_download_all_programme_students'),
-    path('cod/department/programmes/', views.department_programmes, name='cod_department_programmes'),
-    path('cod/department/courses/', views.department_courses, name='cod_department_courses'),
-    path('cod/lecturers/', views.lecturers_list, name='cod_lecturers_list'),
-    path('cod/lecturers/<int:lecturer_id>/', views.lecturer_detail, name='cod_lecturer_detail'),
-    path('cod/assignments/', views.course_assignments, name='cod_course_assignments'),
-    path('cod/assignments/assign/', views.assign_course, name='cod_assign_course'),
-    path('cod/assignments/<int:assignment_id>/unassign/', views.unassign_course, name='cod_unassign_course'),
-    path('cod/workload/', views.workload_analysis, name='cod_workload_analysis'),
-    path('cod/students/', views.students_list, name='cod_students_list'),
-    path('cod/students/<int:student_id>/', views.cod_student_detail, name='cod_student_detail'),
-    path('cod/enrollments/', views.enrollments_list, name='cod_enrollments_list'),
-    path('cod/performance/', views.student_performance, name='cod_student_performance'),
-    path('cod/timetable/', views.view_timetable, name='cod_view_timetable'),
-    path('cod/exams/schedule/', views.exam_schedule, name='cod_exam_schedule'),
-    path('cod/exams/marks-approval/', views.marks_approval, name='cod_marks_approval'),
-    path('cod/applications/special-exams/', views.cod_special_exam_applications, name='cod_special_exam_applications'),
-    path('cod/applications/special-exams/<int:application_id>/process/', views.process_special_exam, name='cod_process_special_exam'),
-    path('cod/applications/deferments/', views.cod_deferment_applications, name='cod_deferment_applications'),
-    path('cod/applications/deferments/<int:application_id>/process/', views.process_deferment, name='cod_process_deferment'),
-    path('cod/clearances/', views.cod_clearance_requests, name='cod_clearance_requests'),
-    path('cod/clearances/<int:clearance_id>/process/', views.process_clearance, name='cod_process_clearance'),
-    # COD Reports URLs
-    path('cod/reports/department/', views.cod_department_report, name='cod_department_report'),
-    path('cod/reports/enrollment/', views.cod_enrollment_report, name='cod_enrollment_report'), 
-    path('cod/reports/performance/', views.cod_performance_report, name='cod_performance_report'),
-   
-    # Research Management URLs
-    path('research/', views.cod_research_dashboard, name='cod_research_dashboard'),
-    path('research/<int:research_id>/', views.cod_research_detail, name='cod_research_detail'),
-    path('research/create/', views.cod_create_research, name='cod_create_research'),
-    path('research/<int:research_id>/edit/', views.cod_edit_research, name='cod_edit_research'),
-    path('research/<int:research_id>/delete/', views.cod_delete_research, name='cod_delete_research'),
-     
-   
-     # Timetable Dashboard
-    path('cod/timetable/dashboard/', views.cod_timetable_dashboard, name='cod_timetable_dashboard'),
-    path('cod/timetable/create/', views.cod_create_timetable, name='cod_create_timetable'),
-    path('cod/timetable/view/<int:programme_id>/<int:year>/<int:semester_id>/',  views.cod_view_timetable, name='cod_view_timetable'),
-    path('cod/timetable/save-slot/', views.cod_save_timetable_slot, name='cod_save_timetable_slot'),
-    path('cod/timetable/delete-slot/', views.cod_delete_timetable_slot, name='cod_delete_timetable_slot'),
-    path('cod/timetable/get-courses/', views.cod_get_courses_ajax, name='cod_get_courses_ajax'),
-
-    path('results/dashboard/', views.cod_results_dashboard, name='cod_results_dashboard'),
-    path('results/view/', views.cod_view_results, name='cod_view_results'),
-    path('results/student/<str:student_id>/', views.cod_student_results_detail, name='cod_student_results_detail'),
-    path('results/promotion-analysis/', views.cod_promotion_analysis, name='cod_promotion_analysis'),
-    path('results/download-excel/', views.cod_download_results_excel, name='cod_download_results_excel'),
-    path('results/download-promotion-list/', views.cod_download_promotion_list, name='cod_download_promotion_list'),
-
-    # Student Consultation
-    path('consultation/', views.cod_student_consultation, name='cod_student_consultation'),
-    path('consultation/student/<str:student_id>/', views.cod_student_consultation_detail, name='cod_student_consultation_detail'),
-    path('consultation/student/<str:student_id>/advice/', views.cod_student_advice, name='cod_student_advice'),
-    path('consultation/edit-grade/<int:enrollment_id>/', views.cod_edit_grade, name='cod_edit_grade'),
-    path('consultation/quick-edit-grade/', views.cod_quick_edit_grade, name='cod_quick_edit_grade'),
-    path('consultation/student/<str:student_id>/transcript-pdf/', views.cod_download_transcript_pdf, name='cod_download_transcript_pdf'),
-
-    # Exam Attendance Sheet Generation
-    path('cod/generate-exam-list/', views.cod_generate_exam_list, name='cod_generate_exam_list'), 
-    path('cod/download-exam-attendance-sheet/', views.cod_download_exam_attendance_sheet, name='cod_download_exam_attendance_sheet'), 
-    path('cod/get-courses-for-programme/', views.cod_get_courses_for_programme, name='cod_get_courses_for_programme'),
-
-]
\ No newline at end of file
+    path('dean-dashbaord/', views.dean_dashboard, name='dean_dashboard'),
+    path('export-attendance/<int:course_id>/<int:semester_id>/', views.export_attendance, name='export_attendance'),
+    path('payments/<int:payment_id>/receipt/download/', views.download_payment_receipt_pdf, name='download_payment_receipt_pdf'),
+]
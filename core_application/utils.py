@@ -1,7 +1,6 @@
 
 # utils.py - Additional utility functions
 
-from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils import timezone
@@ -109,26 +108,23 @@ Please review admin access logs and take appropriate security measures.
 This is an automated security notification from your University Management System.
         """
         
-        # Send email
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=list(admin_emails)
-        )
-        msg.attach_alternative(html_content, "text/html")
-        msg.send()
-        
-        # Log the alert
-        AdminSecurityAlert.objects.create(
+        # Log the alert; email_sent is set once the outbox delivers it
+        alert = AdminSecurityAlert.objects.create(
             alert_type=alert_type.lower().replace(' ', '_'),
             username=username,
             ip_address=ip_address,
             details=f"{details}\nUser Agent: {user_agent}",
-            email_sent=True
         )
         
-        logger.info(f"Security alert sent for {alert_type}: {username}@{ip_address}")
+        # Queue email for the outbox
+        from core_application.outbox import OutboundMessage, queue_email
+        queue_email(
+            list(admin_emails), subject, text_content, html_body=html_content,
+            category='security_alert', priority=OutboundMessage.PRIORITY_HIGH,
+            reference=f'security_alert:{alert.pk}',
+        )
+        
+        logger.info(f"Security alert queued for {alert_type}: {username}@{ip_address}")
         return True
         
     except Exception as e:
@@ -0,0 +1,185 @@
+# views - Request handlers, one module per area of the system
+#
+# urls.py and the rest of the app keep using ``views.<name>``: the module
+# __getattr__ below imports the submodule that defines a view the first time
+# the view is looked up, so importing this package costs nothing and a
+# submodule is only loaded when one of its views is needed. PDF and
+# spreadsheet libraries are imported inside the export views themselves.
+#
+# New views go in the submodule for their area and are listed here.
+
+from importlib import import_module
+
+_MODULES = {
+    'common': (
+        'handler404', 'handler500', 'custom_permission_denied', 'custom_bad_request', 'is_admin',
+        'is_admin_or_staff', 'is_admin_or_registrar', 'is_admin_registrar_dean_or_superuser',
+        'is_admin_registrar_or_dean', 'is_administrative_staff',
+    ),
+    'auth': (
+        'login_view', 'logout_view', 'get_client_ip', 'get_user_agent', 'check_login_attempts',
+        'send_security_alert_email', 'generate_and_send_2fa_code', 'admin_login_view',
+        'admin_2fa_verify_view', 'admin_resend_2fa_code', 'admin_logout_view',
+    ),
+    'student': (
+        'student_dashboard', 'student_profile', 'student_units_view', 'handle_course_enrollment',
+        'leave_course_waitlist',
+        'check_prerequisites_ajax', 'course_details_ajax', 'student_reporting', 'student_news',
+        'student_comments', 'faqs', 'virtual_assistant', 'process_assistant_query',
+        'student_clubs', 'join_club', 'leave_club', 'club_events', 'student_events',
+        'register_event', 'student_transcript', 'student_transcript_preview',
+        'student_unit_dashboard', 'student_course_detail', 'download_notes', 'assignment_detail',
+        'submit_assignment', 'student_assignments', 'student_grades', 'student_timetable_view',
+        'student_fee_management', 'exam_repository', 'download_exam_material',
+        'special_exam_applications', 'apply_special_exam', 'deferment_applications',
+        'apply_deferment', 'clearance_requests', 'request_clearance', 'messages_inbox',
+        'message_detail', 'compose_message', 'reply_message', 'sent_messages', 'notifications',
+        'course_evaluation',
+    ),
+    'lecturer': (
+        'lecturer_dashboard', 'is_admin_or_hod', 'is_lecturer', 'lecturer_required', 'lecturer_allocation_dashboard',
+        'allocate_course_to_lecturer', 'remove_course_allocation', 'lecturer_unit_dashboard',
+        'lecturer_course_detail', 'create_assignment', 'create_course_notes',
+        'create_announcement', 'assignment_submissions_list', 'grade_submission',
+        'download_submission', 'quick_grade_submission', 'bulk_grade_submissions',
+        'submission_statistics', 'lecturer_timetable_view', 'lecturer_support',
+        'lecturer_training', 'curriculum', 'grade_entry', 'save_grades', 'get_semesters_by_year',
+        'my_students', 'lecturer_profile', 'handle_lecturer_profile_update',
+        'lecturer_profile_picture_upload',
+    ),
+    'hostel': (
+        'hostel_booking_eligibility', 'hostel_list', 'room_list', 'bed_list', 'book_bed',
+        'hostel_booking_detail', 'cancel_booking', 'get_rooms_ajax', 'get_beds_ajax',
+        'hostel_dashboard', 'is_admin_or_warden', 'manage_hostel_bookings', 'get_booking_data',
+        'get_room_availability', 'update_booking_status', 'get_booking_statistics',
+        'hostel_room_management', 'create_single_room', 'bulk_create_rooms', 'delete_room',
+        'bulk_delete_rooms', 'toggle_room_status', 'get_room_details', 'get_hostel_list',
+        'admin_hostel_management', 'hostel_detail_view', 'create_rooms_bulk',
+        'toggle_bed_maintenance', 'checkout_student', 'search_students', 'assign_bed_to_student',
+        'admin_hostel_bookings', 'booking_details_ajax', 'update_booking_ajax',
+        'delete_booking_ajax', 'booking_stats_ajax', 'bulk_update_bookings_ajax',
+    ),
+    'finance': (
+        'fee_structure_list', 'finance_fee_structure_list', 'programme_fee_detail',
+        'finance_programme_fee_detail', 'finance_user_required', 'finance_fee_payment_list',
+        'finance_fee_payment_detail', 'edit_fee_structure', 'delete_fee_structure',
+        'add_fee_structure', 'fee_structure_comparison', 'admin_fee_payment',
+        'handle_overpayment', 'get_student_data_info', 'get_fee_structure', 'equity_bank_webhook',
+        'kcb_bank_webhook', 'mpesa_callback', 'acknowledge_webhook', 'process_bank_payment',
+        'verify_bank_signature', 'generate_receipt_number', 'send_payment_notifications',
+        'send_sms_notification', 'payment_reconciliation_view', 'student_fee_statement',
+        'manual_payment_verification', 'finance_dashboard',
+    ),
+    'academics': (
+        'get_programmes_by_school', 'calculate_grade_and_points', 'calculate_total_marks',
+        'admin_marks_entry', 'get_student_info', 'calculate_student_gpa', 'programme_list',
+        'add_programme', 'get_departments_by_faculty', 'edit_programme', 'programme_detail',
+        'add_programme_year', 'add_programme_semester', 'add_programme_course',
+        'get_available_courses', 'remove_programme_course', 'course_enrollments',
+        'student_enrollment_detail', 'grades_list', 'course_grades', 'grades_analytics',
+        'timetable_management', 'admin_get_programme_courses', 'get_programme_timetable',
+        'save_timetable_entry', 'delete_timetable_entry', 'get_available_lecturers',
+        'academic_management', 'get_academic_years', 'create_academic_year',
+        'update_academic_year', 'delete_academic_year', 'create_semester', 'update_semester',
+        'delete_semester', 'set_current_academic_year', 'set_current_semester',
+        'get_semester_registrations', 'admin_student_enrollment_list', 'get_student_enrollments',
+        'get_available_courses_for_student', 'add_student_enrollment',
+        'delete_student_enrollment', 'get_semester_options', 'get_programme_students',
+        'get_programme_courses', 'bulk_add_enrollments', 'get_course_lecturers',
+        'department_list', 'department_detail', 'department_create', 'department_update',
+        'department_delete', 'get_department_programmes', 'student_exam_programmes_list',
+        'student_exam_programme_detail', 'get_programme_year_data', 'course_exam_students_list',
+        'get_academic_year_courses', 'student_search', 'admin_student_transcript',
+        'calculate_transcript_data', 'get_graduation_class', 'check_programme_completion',
+        'get_grading_system', 'course_list', 'course_detail', 'add_course', 'edit_course',
+        'delete_course',
+    ),
+    'administration': (
+        'admin_dashboard', 'student_list', 'student_detail', 'student_create', 'student_update',
+        'student_delete', 'lecturer_list', 'lecturer_create', 'lecturer_update',
+        'lecturer_delete', 'lecturer_bulk_action', 'lecturer_toggle_status', 'staff_list_view',
+        'staff_ajax_list', 'staff_create_ajax', 'staff_detail_ajax', 'staff_update_ajax',
+        'staff_delete_ajax', 'departments_ajax', 'student_reporting_list',
+        'student_reporting_detail', 'process_student_report', 'bulk_approve_reports',
+        'is_admin_or_superuser', 'admin_profile', 'admin_profile_api', 'query_profiler_dashboard',
+    ),
+    'dean': (
+        'dean_dashboard', 'dean_programme_detail', 'dean_student_list',
+        'get_programmes_by_department', 'dean_student_detail', 'dean_student_performance',
+        'dean_programmes', 'dean_allocate_courses', 'dean_remove_course_assignment',
+        'dean_view_lecturer_assignments', 'dean_lecturer_list', 'dean_lecturer_detail',
+        'dean_lecturer_toggle_status', 'dean_lecturer_bulk_action',
+        'dean_faculty_departments_api', 'dean_required', 'dean_departments_list',
+        'dean_department_detail', 'dean_hods_management', 'assign_hod', 'remove_hod',
+        'department_performance_summary', 'dean_report', 'dean_analytics_api', 'dean_profile',
+    ),
+    'cod': (
+        'cod_required', 'cod_dashboard', 'department_info', 'department_programmes',
+        'department_courses', 'lecturers_list', 'lecturer_detail', 'course_assignments',
+        'assign_course', 'unassign_course', 'workload_analysis', 'students_list',
+        'cod_student_detail', 'enrollments_list', 'student_performance', 'view_timetable',
+        'exam_schedule', 'marks_approval', 'cod_special_exam_applications',
+        'process_special_exam', 'cod_deferment_applications', 'process_deferment',
+        'cod_clearance_requests', 'process_clearance', 'cod_department_report',
+        'cod_enrollment_report', 'cod_performance_report', 'cod_results_dashboard',
+        'cod_view_results', 'cod_student_results_detail', 'cod_promotion_analysis',
+        'cod_student_consultation', 'cod_student_consultation_detail', 'cod_edit_grade',
+        'cod_quick_edit_grade', 'update_student_gpa', 'cod_student_advice',
+        'cod_generate_exam_list', 'get_student_fee_status', 'cod_get_courses_for_programme',
+        'cod_research_dashboard', 'cod_research_detail', 'cod_create_research',
+        'cod_edit_research', 'cod_delete_research', 'cod_timetable_dashboard',
+        'cod_create_timetable', 'cod_save_timetable_slot', 'cod_delete_timetable_slot',
+        'cod_view_timetable', 'cod_get_courses_ajax',
+    ),
+    'library': (
+        'is_librarian', 'library_book_management', 'library_issuance', 'create_book',
+        'update_book', 'delete_book', 'create_transaction', 'return_book', 'get_book_details',
+        'get_transaction_details',
+    ),
+    'attendance': (
+        'lecturer_generate_qr_attendance', 'lecturer_attendance_dashboard', 'mark_attendance_qr',
+        'lecturer_attendance_detail', 'student_attendance_history', 'scan_attendance_qr',
+        'get_course_students', 'update_attendance', 'generate_qr_attendance',
+    ),
+    'community': (
+        'event_list', 'create_event', 'update_event', 'delete_event', 'get_event_details',
+        'clubs_management', 'create_club', 'get_club', 'update_club', 'delete_club',
+        'club_events_management', 'create_club_event', 'get_club_event', 'update_club_event',
+        'delete_club_event', 'student_comments_management', 'get_student_comment',
+        'add_admin_response', 'update_admin_response', 'toggle_comment_status',
+        'delete_student_comment', 'bulk_action_comments', 'notification_management',
+        'notification_detail', 'create_notification', 'mark_as_read', 'delete_notification',
+        'bulk_action', 'get_students', 'broadcast_menu', 'read_broadcast', 'read_all_broadcasts',
+        'news_management', 'news_detail', 'create_news',
+        'update_news', 'delete_news', 'toggle_publish_status', 'bulk_news_action', 'get_authors',
+    ),
+    'analytics': (
+        'analytics_dashboard', 'student_enrollment_data', 'academic_performance_data',
+        'financial_data', 'hostel_occupancy_data', 'library_usage_data',
+        'attendance_analytics_data',
+    ),
+    'exports': (
+        'student_transcript_pdf', 'lecturer_export', 'download_grades_pdf', 'export_attendance',
+        'download_payment_receipt_pdf', 'get_receipt_data_json', 'department_export',
+        'export_reporting_data', 'download_eligible_students_csv', 'download_all_students_csv',
+        'download_transcript_pdf', 'download_certificate_pdf', 'dean_lecturer_export',
+        'download_students_csv', 'download_all_programme_students_csv',
+        'cod_download_results_excel', 'cod_download_promotion_list',
+        'cod_download_transcript_pdf', 'cod_download_exam_attendance_sheet',
+    ),
+}
+
+_VIEW_MODULES = {name: module for module, names in _MODULES.items() for name in names}
+
+
+def __getattr__(name):
+    module = _VIEW_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_VIEW_MODULES))
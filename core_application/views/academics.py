@@ -0,0 +1,3800 @@
+# academics.py - Programmes, courses, academic years and semesters, marks
+# entry, grading, timetables and enrolments
+
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+import json
+import logging
+
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.http import HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from .. import reference_data
+from ..forms import CourseForm, DepartmentForm, ProgrammeForm
+from ..models import (
+    AcademicYear, Course, Department, Enrollment, Faculty, FeePayment, FeeStructure, Grade,
+    Lecturer, LecturerCourseAssignment, Programme, ProgrammeCourse, Semester, Student, Timetable,
+    User,
+)
+from ..reference_data import parse_id, pick, reference_endpoint
+from .common import (
+    is_admin_or_registrar, is_admin_registrar_dean_or_superuser, is_admin_registrar_or_dean,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# AJAX view for dynamic filtering (optional)
+@login_required
+@reference_endpoint
+def get_programmes_by_school(request):
+    """
+    AJAX view to get programmes filtered by school (department)
+    """
+    school_id = parse_id(request.GET.get('school_id'))
+    programmes = reference_data.select('programmes', department_id=school_id, is_active=True)
+    
+    return JsonResponse(pick(programmes, 'id', 'name', 'code'), safe=False)
+
+
+def calculate_grade_and_points(total_marks):
+    """
+    Calculate grade, grade points, and pass status based on total marks
+    Based on your Grade model's save method logic
+    """
+    if total_marks is None or total_marks == 0:
+        return '', 0.0, False
+    
+    if total_marks >= 90:
+        return 'A+', 4.0, True
+    elif total_marks >= 80:
+        return 'A', 4.0, True
+    elif total_marks >= 75:
+        return 'A-', 3.7, True
+    elif total_marks >= 70:
+        return 'B+', 3.3, True
+    elif total_marks >= 65:
+        return 'B', 3.0, True
+    elif total_marks >= 60:
+        return 'B-', 2.7, True
+    elif total_marks >= 55:
+        return 'C+', 2.3, True
+    elif total_marks >= 50:
+        return 'C', 2.0, True
+    elif total_marks >= 45:
+        return 'C-', 1.7, True
+    elif total_marks >= 40:
+        return 'D+', 1.3, False
+    elif total_marks >= 35:
+        return 'D', 1.0, False
+    else:
+        return 'F', 0.0, False
+
+
+def calculate_total_marks(continuous_assessment, final_exam, practical_marks, project_marks):
+    """
+    Calculate total marks based on your Grade model logic
+    CA (40%) + Final Exam (60%) + optional practical/project components
+    """
+    ca = continuous_assessment if continuous_assessment is not None else 0
+    final_exam = final_exam if final_exam is not None else 0
+    practical = practical_marks if practical_marks is not None else 0
+    project = project_marks if project_marks is not None else 0
+    
+    # Base calculation: CA (40%) + Final Exam (60%)
+    total = (ca * 0.4) + (final_exam * 0.6)
+    
+    # Add practical and project marks if applicable (10% each as per your model)
+    if practical > 0:
+        total += practical * 0.1
+    if project > 0:
+        total += project * 0.1
+    
+    return round(total, 2) if total > 0 else 0
+
+
+@login_required
+def admin_marks_entry(request, student_id=None):
+    # Check if user is admin, lecturer, or registrar
+    if request.user.user_type not in ['admin', 'lecturer', 'registrar']:
+        return HttpResponseForbidden("Access denied. Authorized personnel only.")
+    
+    # Get current academic year and semester
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    if not current_academic_year or not current_semester:
+        messages.error(request, "Please set current academic year and semester first.")
+        return render(request, 'admin/admin_marks_entry.html', {'error': 'No current academic year/semester set'})
+    
+    student = None
+    enrollments = []
+    grades_data = {}
+    
+    # Handle student search - check both GET parameter and URL parameter
+    search_student_id = student_id or request.GET.get('student_id')
+    
+    if search_student_id:
+        try:
+            student = Student.objects.get(student_id=search_student_id, status='active')
+            
+            # Get enrollments for current semester
+            enrollments = Enrollment.objects.filter(
+                student=student,
+                semester=current_semester,
+                is_active=True
+            ).select_related('course', 'lecturer').order_by('course__code')
+            
+            # Get existing grades
+            for enrollment in enrollments:
+                try:
+                    grade = Grade.objects.get(enrollment=enrollment)
+                    grades_data[enrollment.id] = {
+                        'continuous_assessment': float(grade.continuous_assessment) if grade.continuous_assessment else None,
+                        'final_exam': float(grade.final_exam) if grade.final_exam else None,
+                        'practical_marks': float(grade.practical_marks) if grade.practical_marks else None,
+                        'project_marks': float(grade.project_marks) if grade.project_marks else None,
+                        'total_marks': float(grade.total_marks) if grade.total_marks else None,
+                        'grade': grade.grade,
+                        'grade_points': float(grade.grade_points) if grade.grade_points else None,
+                        'quality_points': float(grade.quality_points) if grade.quality_points else None,
+                        'is_passed': grade.is_passed,
+                        'exam_date': grade.exam_date.strftime('%Y-%m-%d') if grade.exam_date else '',
+                        'remarks': grade.remarks or ''
+                    }
+                except Grade.DoesNotExist:
+                    grades_data[enrollment.id] = {
+                        'continuous_assessment': None,
+                        'final_exam': None,
+                        'practical_marks': None,
+                        'project_marks': None,
+                        'total_marks': None,
+                        'grade': '',
+                        'grade_points': None,
+                        'quality_points': None,
+                        'is_passed': False,
+                        'exam_date': '',
+                        'remarks': ''
+                    }
+            
+        except Student.DoesNotExist:
+            messages.error(request, f"Student with ID '{search_student_id}' not found or not active.")
+    
+    # Handle marks submission
+    if request.method == 'POST' and 'save_marks' in request.POST:
+        student_id_post = request.POST.get('student_id')
+        if not student_id_post:
+            messages.error(request, "Student ID is required.")
+            return render(request, 'admin/admin_marks_entry.html', {})
+        
+        try:
+            student = Student.objects.get(student_id=student_id_post, status='active')
+            enrollments = Enrollment.objects.filter(
+                student=student,
+                semester=current_semester,
+                is_active=True
+            ).select_related('course')
+            
+            saved_count = 0
+            
+            with transaction.atomic():
+                for enrollment in enrollments:
+                    enrollment_id = str(enrollment.id)
+                    
+                    # Get form data
+                    continuous_assessment = request.POST.get(f'continuous_assessment_{enrollment_id}')
+                    final_exam = request.POST.get(f'final_exam_{enrollment_id}')
+                    practical_marks = request.POST.get(f'practical_marks_{enrollment_id}')
+                    project_marks = request.POST.get(f'project_marks_{enrollment_id}')
+                    exam_date = request.POST.get(f'exam_date_{enrollment_id}')
+                    remarks = request.POST.get(f'remarks_{enrollment_id}')
+                    
+                    # Convert to appropriate types with proper validation
+                    def safe_float(value):
+                        if value and value.strip():
+                            try:
+                                return float(value)
+                            except ValueError:
+                                return None
+                        return None
+                    
+                    continuous_assessment = safe_float(continuous_assessment)
+                    final_exam = safe_float(final_exam)
+                    practical_marks = safe_float(practical_marks)
+                    project_marks = safe_float(project_marks)
+                    
+                    # Validate mark ranges
+                    def validate_mark_range(mark, max_value, field_name):
+                        if mark is not None and (mark < 0 or mark > max_value):
+                            raise ValidationError(f"{field_name} must be between 0 and {max_value}")
+                    
+                    try:
+                        validate_mark_range(continuous_assessment, 100, "Continuous Assessment")
+                        validate_mark_range(final_exam, 100, "Final exam marks")
+                        validate_mark_range(practical_marks, 100, "Practical marks")
+                        validate_mark_range(project_marks, 100, "Project marks")
+                    except ValidationError as e:
+                        messages.error(request, f"Validation error for course {enrollment.course.code}: {str(e)}")
+                        continue
+                    
+                    # Handle exam date
+                    exam_date_obj = None
+                    if exam_date and exam_date.strip():
+                        try:
+                            exam_date_obj = datetime.strptime(exam_date, '%Y-%m-%d').date()
+                        except ValueError:
+                            pass  # Invalid date format, keep as None
+                    
+                    remarks = remarks.strip() if remarks else ''
+                    
+                    # Check if at least one mark is provided
+                    has_marks = any([
+                        continuous_assessment is not None,
+                        final_exam is not None,
+                        practical_marks is not None,
+                        project_marks is not None
+                    ])
+                    
+                    if has_marks:
+                        # Create or update grade - let the model's save method handle calculations
+                        grade_obj, created = Grade.objects.get_or_create(
+                            enrollment=enrollment,
+                            defaults={
+                                'continuous_assessment': continuous_assessment,
+                                'final_exam': final_exam,
+                                'practical_marks': practical_marks,
+                                'project_marks': project_marks,
+                                'exam_date': exam_date_obj,
+                                'remarks': remarks
+                            }
+                        )
+                        
+                        if not created:
+                            # Update existing grade
+                            grade_obj.continuous_assessment = continuous_assessment
+                            grade_obj.final_exam = final_exam
+                            grade_obj.practical_marks = practical_marks
+                            grade_obj.project_marks = project_marks
+                            grade_obj.exam_date = exam_date_obj
+                            grade_obj.remarks = remarks
+                            grade_obj.save()  # This will trigger the automatic calculations
+                        
+                        saved_count += 1
+                
+                if saved_count > 0:
+                    messages.success(request, f"Marks saved successfully for {saved_count} courses for student {student.student_id}")
+                    # Redirect to prevent re-submission  return redirect('student_performance', registration_number=registration_number)
+                    return redirect('student_performance', student_id=student.student_id)
+                else:
+                    messages.warning(request, "No marks were provided to save.")
+                
+        except Student.DoesNotExist:
+            messages.error(request, f"Student with ID '{student_id_post}' not found.")
+        except Exception as e:
+            messages.error(request, f"Error saving marks: {str(e)}")
+            # For debugging - remove in production
+            import traceback
+            print(traceback.format_exc())
+    
+    # Get all active students for dropdown
+    all_students = Student.objects.filter(status='active').select_related('user', 'programme').order_by('student_id')
+    
+    context = {
+        'student': student,
+        'enrollments': enrollments,
+        'grades_data': grades_data,
+        'current_academic_year': current_academic_year,
+        'current_semester': current_semester,
+        'all_students': all_students,
+    }
+    
+    return render(request, 'admin/admin_marks_entry.html', context)
+
+
+@login_required
+def get_student_info(request):
+    """AJAX endpoint to get student information"""
+    if request.user.user_type not in ['admin', 'lecturer', 'registrar']:
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    student_id = request.GET.get('student_id')
+    if not student_id:
+        return JsonResponse({'error': 'Student ID required'}, status=400)
+    
+    try:
+        student = Student.objects.get(student_id=student_id, status='active')
+        current_semester = Semester.objects.filter(is_current=True).first()
+        
+        enrollments = Enrollment.objects.filter(
+            student=student,
+            semester=current_semester,
+            is_active=True
+        ).select_related('course', 'lecturer')
+        
+        data = {
+            'student': {
+                'student_id': student.student_id,
+                'name': student.user.get_full_name(),
+                'programme': student.programme.name,
+                'programme_code': student.programme.code,
+                'current_year': student.current_year,
+                'current_semester': student.current_semester,
+                'department': student.programme.department.name,
+                'faculty': student.programme.faculty.name,
+            },
+            'enrollments': [
+                {
+                    'id': enrollment.id,
+                    'course_code': enrollment.course.code,
+                    'course_name': enrollment.course.name,
+                    'credit_hours': enrollment.course.credit_hours,
+                    'lecture_hours': enrollment.course.lecture_hours,
+                    'tutorial_hours': enrollment.course.tutorial_hours,
+                    'practical_hours': enrollment.course.practical_hours,
+                    'field_work_hours': enrollment.course.field_work_hours,
+                    'course_type': enrollment.course.get_course_type_display(),
+                    'level': enrollment.course.get_level_display(),
+                    'lecturer': enrollment.lecturer.user.get_full_name() if enrollment.lecturer else 'Not Assigned',
+                }
+                for enrollment in enrollments
+            ]
+        }
+        
+        return JsonResponse(data)
+        
+    except Student.DoesNotExist:
+        return JsonResponse({'error': 'Student not found'}, status=404)
+
+
+# Additional helper view for calculating GPA
+@login_required
+def calculate_student_gpa(request, student_id):
+    """Calculate and update student's cumulative GPA"""
+    if request.user.user_type not in ['admin', 'registrar']:
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    try:
+        student = Student.objects.get(student_id=student_id, status='active')
+        
+        # Get all grades for the student
+        grades = Grade.objects.filter(
+            enrollment__student=student,
+            enrollment__is_active=True,
+            is_passed=True
+        ).select_related('enrollment__course')
+        
+        total_quality_points = sum(grade.quality_points for grade in grades if grade.quality_points)
+        total_credit_hours = sum(grade.enrollment.course.credit_hours for grade in grades)
+        
+        if total_credit_hours > 0:
+            cumulative_gpa = total_quality_points / total_credit_hours
+            student.cumulative_gpa = round(cumulative_gpa, 2)
+            student.total_credit_hours = total_credit_hours
+            student.save()
+            
+            return JsonResponse({
+                'success': True,
+                'cumulative_gpa': student.cumulative_gpa,
+                'total_credit_hours': student.total_credit_hours
+            })
+        else:
+            return JsonResponse({'error': 'No completed courses found'}, status=400)
+            
+    except Student.DoesNotExist:
+        return JsonResponse({'error': 'Student not found'}, status=404)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def programme_list(request):
+    """View to display all programmes with statistics"""
+    programmes = Programme.objects.select_related(
+        'department', 'faculty'
+    ).prefetch_related(
+        'students', 'programme_courses__course'
+    ).filter(is_active=True)
+    
+    # Add search functionality
+    search_query = request.GET.get('search', '')
+    if search_query:
+        programmes = programmes.filter(
+            Q(name__icontains=search_query) |
+            Q(code__icontains=search_query) |
+            Q(department__name__icontains=search_query) |
+            Q(faculty__name__icontains=search_query)
+        )
+    
+    # Filter by faculty
+    faculty_id = request.GET.get('faculty', '')
+    if faculty_id:
+        programmes = programmes.filter(faculty_id=faculty_id)
+    
+    # Filter by programme type
+    programme_type = request.GET.get('programme_type', '')
+    if programme_type:
+        programmes = programmes.filter(programme_type=programme_type)
+    
+    # Add statistics for each programme
+    programme_stats = []
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    for programme in programmes:
+        total_courses = programme.programme_courses.filter(is_active=True).count()
+        active_students = programme.students.filter(status='active').count()
+        
+        # Get enrolled students for current semester
+        current_enrollments = 0
+        if current_semester:
+            current_enrollments = Enrollment.objects.filter(
+                student__programme=programme,
+                semester=current_semester,
+                is_active=True
+            ).values('student').distinct().count()
+        
+        programme_stats.append({
+            'programme': programme,
+            'total_courses': total_courses,
+            'active_students': active_students,
+            'current_enrollments': current_enrollments,
+        })
+    
+    # Pagination
+    paginator = Paginator(programme_stats, 12)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Get filter options
+    faculties = Faculty.objects.filter(is_active=True).order_by('name')
+    programme_types = Programme.PROGRAMME_TYPES
+    
+    context = {
+        'page_obj': page_obj,
+        'faculties': faculties,
+        'programme_types': programme_types,
+        'search_query': search_query,
+        'selected_faculty': faculty_id,
+        'selected_programme_type': programme_type,
+        'current_semester': current_semester,
+    }
+    
+    return render(request, 'programmes/programme_list.html', context)
+
+
+@login_required
+def add_programme(request):
+    """View to add a new programme"""
+    if request.method == 'POST':
+        form = ProgrammeForm(request.POST)
+        if form.is_valid():
+            programme = form.save()
+            messages.success(request, f'Programme "{programme.name}" has been successfully created.')
+            return redirect('programme_detail', programme.id)
+        else:
+            messages.error(request, 'There were errors in the form. Please correct them and try again.')
+    else:
+        form = ProgrammeForm()
+    
+    context = {
+        'form': form,
+        'faculties': Faculty.objects.filter(is_active=True).order_by('name'),
+        'departments': Department.objects.filter(is_active=True).order_by('name'),
+        'programme_types': Programme.PROGRAMME_TYPES,
+        'programme_modes': Programme.PROGRAMME_MODES,
+    }
+    
+    return render(request, 'programmes/add_programme.html', context)
+
+
+@login_required
+@reference_endpoint
+def get_departments_by_faculty(request):
+    """AJAX view to get departments based on selected faculty"""
+    faculty_id = request.GET.get('faculty_id')
+    if faculty_id:
+        departments = reference_data.select('departments', faculty_id=parse_id(faculty_id), is_active=True)
+        return JsonResponse({'departments': pick(departments, 'id', 'name', 'code')})
+    return JsonResponse({'departments': []})
+
+
+@login_required
+def edit_programme(request, programme_id):
+    """View to edit an existing programme"""
+    programme = get_object_or_404(Programme, id=programme_id)
+    
+    if request.method == 'POST':
+        form = ProgrammeForm(request.POST, instance=programme)
+        if form.is_valid():
+            updated_programme = form.save()
+            messages.success(request, f'Programme "{updated_programme.name}" has been successfully updated.')
+            return redirect('programme_detail', updated_programme.id)
+        else:
+            messages.error(request, 'There were errors in the form. Please correct them and try again.')
+    else:
+        form = ProgrammeForm(instance=programme)
+    
+    context = {
+        'form': form,
+        'programme': programme,
+        'faculties': Faculty.objects.filter(is_active=True).order_by('name'),
+        'departments': Department.objects.filter(is_active=True).order_by('name'),
+        'programme_types': Programme.PROGRAMME_TYPES,
+        'programme_modes': Programme.PROGRAMME_MODES,
+        'is_editing': True,
+    }
+    
+    return render(request, 'programmes/edit_programme.html', context)
+
+
+@login_required
+def programme_detail(request, programme_id):
+    """View to display programme details with courses organized by year and semester"""
+    programme = get_object_or_404(
+        Programme.objects.select_related('department', 'faculty'),
+        id=programme_id,
+        is_active=True
+    )
+    
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get all programme courses organized by year and semester
+    programme_courses = ProgrammeCourse.objects.select_related(
+        'course', 'course__department'
+    ).filter(
+        programme=programme,
+        is_active=True
+    ).order_by('year', 'semester', 'course__name')
+    
+    # Organize courses by year and semester
+    courses_by_year = {}
+    years = []
+    
+    for pc in programme_courses:
+        year = pc.year
+        semester = pc.semester
+        
+        if year not in years:
+            years.append(year)
+        
+        if year not in courses_by_year:
+            courses_by_year[year] = {}
+        
+        if semester not in courses_by_year[year]:
+            courses_by_year[year][semester] = []
+        
+        # Get enrollment count for current semester
+        enrollment_count = 0
+        if current_semester:
+            enrollment_count = Enrollment.objects.filter(
+                course=pc.course,
+                semester=current_semester,
+                student__programme=programme,
+                is_active=True
+            ).count()
+        
+        course_data = {
+            'course': pc.course,
+            'programme_course': pc,
+            'enrollment_count': enrollment_count,
+        }
+        
+        courses_by_year[year][semester].append(course_data)
+    
+    # Calculate programme statistics
+    programme_stats = {
+        'total_courses': programme_courses.count(),
+        'total_credits': sum(pc.course.credit_hours for pc in programme_courses),
+        'total_lecture_hours': sum(pc.course.lecture_hours for pc in programme_courses),
+        'total_practical_hours': sum(pc.course.practical_hours for pc in programme_courses),
+        'core_courses': programme_courses.filter(is_mandatory=True).count(),
+        'elective_courses': programme_courses.filter(is_mandatory=False).count(),
+        'active_students': programme.students.filter(status='active').count(),
+    }
+    
+    context = {
+        'programme': programme,
+        'courses_by_year': courses_by_year,
+        'years': sorted(years),
+        'programme_stats': programme_stats,
+        'current_semester': current_semester,
+    }
+    
+    return render(request, 'programmes/programme_detail.html', context)
+
+
+@login_required
+@require_http_methods(["POST"])
+def add_programme_year(request):
+    try:
+        # Check if request is AJAX
+        if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid request type'
+            }, status=400)
+        
+        # Parse JSON data
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid JSON data'
+            }, status=400)
+        
+        programme_id = data.get('programme_id')
+        year = data.get('year')
+        
+        # Validate required fields
+        if not programme_id:
+            return JsonResponse({
+                'success': False,
+                'error': 'Programme ID is required'
+            }, status=400)
+        
+        if not year:
+            return JsonResponse({
+                'success': False,
+                'error': 'Year is required'
+            }, status=400)
+        
+        # Validate programme exists
+        try:
+            programme = Programme.objects.get(id=programme_id)
+        except Programme.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'error': 'Programme not found'
+            }, status=404)
+        
+        # Validate year
+        if not isinstance(year, int) or year < 1 or year > programme.duration_years:
+            return JsonResponse({
+                'success': False,
+                'error': f'Year must be between 1 and {programme.duration_years}'
+            }, status=400)
+        
+        # Check if year already exists
+        existing_year = ProgrammeCourse.objects.filter(
+            programme=programme,
+            year=year
+        ).exists()
+        
+        if existing_year:
+            return JsonResponse({
+                'success': False,
+                'error': f'Year {year} already exists for this programme'
+            }, status=400)
+        
+        # Create entries for each semester WITHOUT creating placeholder courses
+        semesters = range(1, programme.semesters_per_year + 1)
+        created_semesters = []
+        
+        with transaction.atomic():
+            # Just create the year structure without courses
+            # The frontend will handle showing empty semesters
+            for semester in semesters:
+                # We don't create any ProgrammeCourse entries yet
+                # The year structure will be created when courses are added
+                created_semesters.append(semester)
+        
+        logger.info(f"Year {year} structure created for programme {programme.name}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Year {year} created successfully with {len(created_semesters)} semesters',
+            'year': year,
+            'semesters': created_semesters,
+            'programme_id': programme_id
+        })
+        
+    except Exception as e:
+        logger.error(f"Unexpected error in add_programme_year: {e}")
+        return JsonResponse({
+            'success': False,
+            'error': f'Server error: {str(e)}'
+        }, status=500)
+
+
+@login_required
+@require_http_methods(["POST"])
+def add_programme_semester(request):
+    """Add a new semester to a specific year in a programme"""
+    try:
+        # Check if request is AJAX
+        if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid request type'
+            }, status=400)
+        
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid JSON data'
+            }, status=400)
+        
+        programme_id = data.get('programme_id')
+        year = data.get('year')
+        semester = data.get('semester')
+        
+        try:
+            programme = get_object_or_404(Programme, id=programme_id)
+        except Programme.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'error': 'Programme not found'
+            }, status=404)
+        
+        # Validate inputs
+        if not year or not isinstance(year, int) or year < 1 or year > 8:
+            return JsonResponse({
+                'success': False,
+                'error': 'Year must be between 1 and 8'
+            }, status=400)
+        
+        # Get semesters_per_year from programme or default to 2
+        max_semesters = getattr(programme, 'semesters_per_year', 2)
+        
+        if not semester or not isinstance(semester, int) or semester < 1 or semester > max_semesters:
+            return JsonResponse({
+                'success': False,
+                'error': f'Semester must be between 1 and {max_semesters}'
+            }, status=400)
+        
+        # Check if semester already exists for this year
+        existing_semester = ProgrammeCourse.objects.filter(
+            programme=programme,
+            year=year,
+            semester=semester
+        ).exists()
+        
+        if existing_semester:
+            return JsonResponse({
+                'success': False,
+                'error': f'Semester {semester} already exists for Year {year}'
+            }, status=400)
+        
+        logger.info(f"Semester {semester} added to Year {year} in programme {programme.name}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Semester {semester} added to Year {year} successfully',
+            'year': year,
+            'semester': semester
+        })
+        
+    except Exception as e:
+        logger.error(f"Unexpected error in add_programme_semester: {e}")
+        return JsonResponse({
+            'success': False,
+            'error': f'Server error: {str(e)}'
+        }, status=500)
+
+
+@login_required
+@require_http_methods(["POST"])
+def add_programme_course(request):
+    """Add a course to a specific year and semester of a programme"""
+    try:
+        # Check if request is AJAX
+        if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid request type'
+            }, status=400)
+        
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid JSON data'
+            }, status=400)
+        
+        programme_id = data.get('programme_id')
+        course_id = data.get('course_id')
+        year = data.get('year')
+        semester = data.get('semester')
+        is_mandatory = data.get('is_mandatory', True)
+        
+        try:
+            programme = get_object_or_404(Programme, id=programme_id)
+            course = get_object_or_404(Course, id=course_id)
+        except (Programme.DoesNotExist, Course.DoesNotExist):
+            return JsonResponse({
+                'success': False,
+                'error': 'Programme or Course not found'
+            }, status=404)
+        
+        # Validate inputs
+        if not year or not isinstance(year, int) or year < 1 or year > 8:
+            return JsonResponse({
+                'success': False,
+                'error': 'Year must be between 1 and 8'
+            }, status=400)
+        
+        max_semesters = getattr(programme, 'semesters_per_year', 2)
+        if not semester or not isinstance(semester, int) or semester < 1 or semester > max_semesters:
+            return JsonResponse({
+                'success': False,
+                'error': f'Semester must be between 1 and {max_semesters}'
+            }, status=400)
+        
+        # Check if course already exists in this programme, year, and semester
+        existing_course = ProgrammeCourse.objects.filter(
+            programme=programme,
+            course=course,
+            year=year,
+            semester=semester
+        ).exists()
+        
+        if existing_course:
+            return JsonResponse({
+                'success': False,
+                'error': f'{course.name} already exists in Year {year}, Semester {semester}'
+            }, status=400)
+        
+        # Create the programme course
+        with transaction.atomic():
+            programme_course = ProgrammeCourse.objects.create(
+                programme=programme,
+                course=course,
+                year=year,
+                semester=semester,
+                is_mandatory=is_mandatory
+            )
+        
+        logger.info(f"Course {course.name} added to programme {programme.name}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'{course.name} added successfully to Year {year}, Semester {semester}',
+            'course_data': {
+                'id': programme_course.id,
+                'course_id': course.id,
+                'course_name': course.name,
+                'course_code': course.code,
+                'credit_hours': course.credit_hours,
+                'lecture_hours': getattr(course, 'lecture_hours', 0),
+                'practical_hours': getattr(course, 'practical_hours', 0),
+                'department': course.department.name,
+                'is_mandatory': is_mandatory,
+                'year': year,
+                'semester': semester
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"Unexpected error in add_programme_course: {e}")
+        return JsonResponse({
+            'success': False,
+            'error': f'Server error: {str(e)}'
+        }, status=500)
+
+
+@login_required
+@require_http_methods(["GET"])
+def get_available_courses(request):
+    """Get available courses for a programme (not already added to specific year/semester)"""
+    try:
+        programme_id = request.GET.get('programme_id')
+        year = request.GET.get('year')
+        semester = request.GET.get('semester')
+        search = request.GET.get('search', '')
+        
+        try:
+            programme = get_object_or_404(Programme, id=programme_id)
+        except Programme.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'error': 'Programme not found'
+            }, status=404)
+        
+        # Get courses from the same department or faculty
+        available_courses = Course.objects.filter(
+            department__faculty=programme.faculty,
+            is_active=True
+        )
+        
+        # Filter out courses already in this programme for this year/semester
+        if year and semester:
+            existing_course_ids = ProgrammeCourse.objects.filter(
+                programme=programme,
+                year=year,
+                semester=semester
+            ).values_list('course_id', flat=True)
+            available_courses = available_courses.exclude(id__in=existing_course_ids)
+        
+        # Apply search filter
+        if search:
+            available_courses = available_courses.filter(
+                Q(name__icontains=search) | 
+                Q(code__icontains=search) |
+                Q(department__name__icontains=search)
+            )
+        
+        # Limit results
+        available_courses = available_courses[:20]
+        
+        courses_data = []
+        for course in available_courses:
+            courses_data.append({
+                'id': course.id,
+                'name': course.name,
+                'code': course.code,
+                'credit_hours': course.credit_hours,
+                'level': getattr(course, 'level', ''),
+                'department': course.department.name,
+                'course_type': getattr(course, 'get_course_type_display', lambda: 'N/A')()
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'courses': courses_data
+        })
+        
+    except Exception as e:
+        logger.error(f"Unexpected error in get_available_courses: {e}")
+        return JsonResponse({
+            'success': False,
+            'error': f'Server error: {str(e)}'
+        }, status=500)
+
+
+@login_required
+@require_http_methods(["DELETE"])
+def remove_programme_course(request):
+    """Remove a course from a programme"""
+    try:
+        # Check if request is AJAX
+        if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid request type'
+            }, status=400)
+        
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid JSON data'
+            }, status=400)
+        
+        programme_course_id = data.get('programme_course_id')
+        
+        try:
+            programme_course = get_object_or_404(ProgrammeCourse, id=programme_course_id)
+        except ProgrammeCourse.DoesNotExist:
+            return JsonResponse({
+                'success': False,
+                'error': 'Programme course not found'
+            }, status=404)
+        
+        # Check if there are any enrollments
+        try:
+            from ..models import Enrollment
+            enrollment_count = Enrollment.objects.filter(
+                course=programme_course.course,
+                student__programme=programme_course.programme
+            ).count()
+        except ImportError:
+            # If Enrollment model doesn't exist, assume no enrollments
+            enrollment_count = 0
+        
+        if enrollment_count > 0:
+            return JsonResponse({
+                'success': False,
+                'error': f'Cannot remove course. {enrollment_count} students are enrolled.'
+            }, status=400)
+        
+        course_name = programme_course.course.name
+        programme_course.delete()
+        
+        logger.info(f"Course {course_name} removed from programme")
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'{course_name} removed successfully'
+        })
+        
+    except Exception as e:
+        logger.error(f"Unexpected error in remove_programme_course: {e}")
+        return JsonResponse({
+            'success': False,
+            'error': f'Server error: {str(e)}'
+        }, status=500)
+
+
+@login_required
+def course_enrollments(request, programme_id, course_id):
+    """View to display students enrolled in a specific course for a programme"""
+    programme = get_object_or_404(Programme, id=programme_id, is_active=True)
+    course = get_object_or_404(Course, id=course_id, is_active=True)
+    
+    # Verify the course is part of this programme
+    programme_course = get_object_or_404(
+        ProgrammeCourse,
+        programme=programme,
+        course=course,
+        is_active=True
+    )
+    
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get enrollments for current semester
+    enrollments = Enrollment.objects.select_related(
+        'student__user', 'student__programme', 'lecturer__user'
+    ).filter(
+        course=course,
+        student__programme=programme,
+        is_active=True
+    )
+    
+    # Filter by semester
+    semester_id = request.GET.get('semester', '')
+    if semester_id:
+        enrollments = enrollments.filter(semester_id=semester_id)
+    elif current_semester:
+        enrollments = enrollments.filter(semester=current_semester)
+    
+    # Add search functionality
+    search_query = request.GET.get('search', '')
+    if search_query:
+        enrollments = enrollments.filter(
+            Q(student__user__first_name__icontains=search_query) |
+            Q(student__user__last_name__icontains=search_query) |
+            Q(student__student_id__icontains=search_query) |
+            Q(student__user__username__icontains=search_query)
+        )
+    
+    # Filter by year
+    year_filter = request.GET.get('year', '')
+    if year_filter:
+        enrollments = enrollments.filter(student__current_year=year_filter)
+    
+    # Filter by status
+    status_filter = request.GET.get('status', '')
+    if status_filter:
+        enrollments = enrollments.filter(student__status=status_filter)
+    
+    enrollments = enrollments.order_by(
+        'student__current_year', 
+        'student__user__last_name', 
+        'student__user__first_name'
+    )
+    
+    # Pagination
+    paginator = Paginator(enrollments, 25)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Get filter options
+    available_semesters = Semester.objects.filter(
+        enrollments__course=course,
+        enrollments__student__programme=programme,
+        enrollments__is_active=True
+    ).distinct().order_by('-academic_year__start_date', '-semester_number')
+    
+    years_with_enrollments = enrollments.values_list(
+        'student__current_year', flat=True
+    ).distinct().order_by('student__current_year')
+    
+    # Calculate statistics
+    enrollment_stats = {
+        'total_enrolled': enrollments.count(),
+        'by_year': {},
+        'by_status': {},
+        'repeat_students': enrollments.filter(is_repeat=True).count(),
+        'audit_students': enrollments.filter(is_audit=True).count(),
+    }
+    
+    # Group by year
+    for year in years_with_enrollments:
+        enrollment_stats['by_year'][year] = enrollments.filter(
+            student__current_year=year
+        ).count()
+    
+    # Group by status
+    for status, _ in Student.STATUS_CHOICES:
+        count = enrollments.filter(student__status=status).count()
+        if count > 0:
+            enrollment_stats['by_status'][status] = count
+    
+    context = {
+        'programme': programme,
+        'course': course,
+        'programme_course': programme_course,
+        'page_obj': page_obj,
+        'enrollment_stats': enrollment_stats,
+        'available_semesters': available_semesters,
+        'years_with_enrollments': years_with_enrollments,
+        'current_semester': current_semester,
+        'search_query': search_query,
+        'selected_semester': semester_id,
+        'selected_year': year_filter,
+        'selected_status': status_filter,
+        'student_status_choices': Student.STATUS_CHOICES,
+    }
+    
+    return render(request, 'programmes/course_enrollments.html', context)
+
+
+@login_required
+def student_enrollment_detail(request, student_id, course_id):
+    """View to display detailed information about a student's enrollment in a course"""
+    student = get_object_or_404(
+        Student.objects.select_related('user', 'programme'),
+        id=student_id
+    )
+    course = get_object_or_404(Course, id=course_id)
+    
+    # Get all enrollments for this student in this course
+    enrollments = Enrollment.objects.select_related(
+        'semester__academic_year', 'lecturer__user'
+    ).filter(
+        student=student,
+        course=course
+    ).order_by('-semester__academic_year__start_date', '-semester__semester_number')
+    
+    # Get the most recent enrollment
+    current_enrollment = enrollments.first()
+    
+    context = {
+        'student': student,
+        'course': course,
+        'enrollments': enrollments,
+        'current_enrollment': current_enrollment,
+    }
+    
+    return render(request, 'programmes/student_enrollment_detail.html', context)
+
+
+@login_required
+def grades_list(request):
+    """
+    Display grades list with filtering options
+    """
+    # Get filter parameters
+    academic_year_id = request.GET.get('academic_year')
+    semester_id = request.GET.get('semester')
+    programme_id = request.GET.get('programme')
+    department_id = request.GET.get('department')
+    student_search = request.GET.get('student_search', '').strip()
+    course_search = request.GET.get('course_search', '').strip()
+    grade_filter = request.GET.get('grade_filter')
+    
+    # Base queryset
+    grades = Grade.objects.select_related(
+        'enrollment__student__user',
+        'enrollment__student__programme',
+        'enrollment__course',
+        'enrollment__semester__academic_year',
+        'enrollment__lecturer__user'
+    ).order_by(
+        'enrollment__semester__academic_year__year',
+        'enrollment__semester__semester_number',
+        'enrollment__student__user__last_name',
+        'enrollment__student__user__first_name',
+        'enrollment__course__code'
+    )
+    
+    # Apply filters
+    if academic_year_id:
+        grades = grades.filter(enrollment__semester__academic_year_id=academic_year_id)
+    
+    if semester_id:
+        grades = grades.filter(enrollment__semester_id=semester_id)
+    
+    if programme_id:
+        grades = grades.filter(enrollment__student__programme_id=programme_id)
+    
+    if department_id:
+        grades = grades.filter(enrollment__course__department_id=department_id)
+    
+    if student_search:
+        grades = grades.filter(
+            Q(enrollment__student__user__first_name__icontains=student_search) |
+            Q(enrollment__student__user__last_name__icontains=student_search) |
+            Q(enrollment__student__student_id__icontains=student_search)
+        )
+    
+    if course_search:
+        grades = grades.filter(
+            Q(enrollment__course__name__icontains=course_search) |
+            Q(enrollment__course__code__icontains=course_search)
+        )
+    
+    if grade_filter:
+        grades = grades.filter(grade=grade_filter)
+    
+    # Paginate students rather than grades, so only one page of grades is loaded
+    from ..pagination import KeysetPaginator
+    graded_students = Student.objects.filter(
+        id__in=grades.order_by().values('enrollment__student_id')
+    ).select_related('user', 'programme')
+    paginator = KeysetPaginator(
+        graded_students, 20, ordering=['user__last_name', 'user__first_name', 'student_id']
+    )
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Group the page's grades by student for better organization
+    students_grades = {
+        student.id: {
+            'student': student,
+            'grades': [],
+            'total_credits': 0,
+            'total_quality_points': Decimal('0.00'),
+            'gpa': Decimal('0.00')
+        }
+        for student in page_obj
+    }
+    for grade in grades.filter(enrollment__student_id__in=list(students_grades)):
+        student_data = students_grades[grade.enrollment.student_id]
+        student_data['grades'].append(grade)
+        student_data['total_credits'] += grade.enrollment.course.credit_hours
+        if grade.quality_points:
+            student_data['total_quality_points'] += grade.quality_points
+    
+    # Calculate GPA for each student
+    for student_data in students_grades.values():
+        if student_data['total_credits'] > 0:
+            student_data['gpa'] = student_data['total_quality_points'] / student_data['total_credits']
+        student_data['gpa'] = round(student_data['gpa'], 2)
+    page_obj.object_list = list(students_grades.values())
+    
+    # Get filter options
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    semesters = Semester.objects.all().order_by('-academic_year__year', '-semester_number')
+    programmes = Programme.objects.filter(is_active=True).order_by('name')
+    departments = Department.objects.filter(is_active=True).order_by('name')
+    
+    # Statistics, aggregated per student in the database
+    per_student = grades.order_by().values('enrollment__student_id').annotate(
+        quality_points=Sum('quality_points'),
+        credits=Sum('enrollment__course__credit_hours'),
+    )
+    student_gpas = [
+        round(row['quality_points'] / row['credits'], 2) if row['credits'] and row['quality_points'] else Decimal('0.00')
+        for row in per_student
+    ]
+    total_students = len(student_gpas)
+    total_grades = grades.count()
+    average_gpa = sum(student_gpas) / total_students if total_students > 0 else 0
+    
+    # Grade distribution
+    grade_distribution = dict(
+        grades.exclude(grade='').filter(grade__isnull=False).order_by('grade').values_list('grade').annotate(
+            count=Count('id')
+        )
+    )
+    
+    context = {
+        'students_grades': page_obj,
+        'academic_years': academic_years,
+        'semesters': semesters,
+        'programmes': programmes,
+        'departments': departments,
+        'total_students': total_students,
+        'total_grades': total_grades,
+        'average_gpa': round(average_gpa, 2),
+        'grade_distribution': grade_distribution,
+        'filters': {
+            'academic_year_id': academic_year_id,
+            'semester_id': semester_id,
+            'programme_id': programme_id,
+            'department_id': department_id,
+            'student_search': student_search,
+            'course_search': course_search,
+            'grade_filter': grade_filter,
+        },
+        'grade_choices': Grade.GRADE_CHOICES,
+    }
+    
+    return render(request, 'grades/grades_list.html', context)
+
+
+@login_required
+def course_grades(request, course_id):
+    """
+    View grades for a specific course across all students
+    """
+    course = get_object_or_404(Course, id=course_id)
+    semester_id = request.GET.get('semester')
+    
+    # Base queryset
+    grades = Grade.objects.filter(
+        enrollment__course=course
+    ).select_related(
+        'enrollment__student__user',
+        'enrollment__student__programme',
+        'enrollment__semester__academic_year',
+        'enrollment__lecturer__user'
+    )
+    
+    if semester_id:
+        grades = grades.filter(enrollment__semester_id=semester_id)
+    
+    grades = grades.order_by('enrollment__student__user__last_name')
+    
+    # Statistics
+    total_students = grades.count()
+    passed_students = grades.filter(is_passed=True).count()
+    failed_students = total_students - passed_students
+    
+    # Grade distribution
+    grade_distribution = {}
+    total_marks_sum = 0
+    marks_count = 0
+    
+    for grade in grades:
+        if grade.grade:
+            grade_distribution[grade.grade] = grade_distribution.get(grade.grade, 0) + 1
+        
+        if grade.total_marks:
+            total_marks_sum += float(grade.total_marks)
+            marks_count += 1
+    
+    average_marks = total_marks_sum / marks_count if marks_count > 0 else 0
+    pass_rate = (passed_students / total_students * 100) if total_students > 0 else 0
+    
+    # Get semesters for filtering
+    semesters = Semester.objects.filter(
+        enrollments__course=course
+    ).distinct().order_by('-academic_year__year', '-semester_number')
+    
+    context = {
+        'course': course,
+        'grades': grades,
+        'semesters': semesters,
+        'selected_semester': semester_id,
+        'statistics': {
+            'total_students': total_students,
+            'passed_students': passed_students,
+            'failed_students': failed_students,
+            'pass_rate': round(pass_rate, 1),
+            'average_marks': round(average_marks, 1),
+            'grade_distribution': grade_distribution,
+        }
+    }
+    
+    return render(request, 'grades/course_grades.html', context)
+
+
+@login_required
+def grades_analytics(request):
+    """
+    Analytics dashboard for grades, read from the pre-aggregated GradeFact table
+    """
+    from ..analytics_facts import ensure_facts, grade_performance
+    from ..models_analytics import GradeFact
+
+    ensure_facts()
+
+    # Get filter parameters
+    academic_year_id = request.GET.get('academic_year')
+    programme_id = request.GET.get('programme')
+    department_id = request.GET.get('department')
+    
+    # Base querysets: facts for the aggregates, raw grades for per-student figures
+    facts = GradeFact.objects.all()
+    grades = Grade.objects.all()
+    
+    # Apply filters
+    if academic_year_id:
+        facts = facts.filter(academic_year_id=academic_year_id)
+        grades = grades.filter(enrollment__semester__academic_year_id=academic_year_id)
+    if programme_id:
+        facts = facts.filter(programme_id=programme_id)
+        grades = grades.filter(enrollment__student__programme_id=programme_id)
+    if department_id:
+        facts = facts.filter(department_id=department_id)
+        grades = grades.filter(enrollment__course__department_id=department_id)
+    
+    # Overall statistics
+    total_grades = facts.aggregate(total=Sum('graded_count'))['total'] or 0
+    total_students = grades.values('enrollment__student').distinct().count()
+    
+    # Grade distribution
+    grade_counts = dict(
+        facts.order_by().values('grade').annotate(count=Sum('graded_count')).values_list('grade', 'count')
+    )
+    grade_distribution = {}
+    for grade_code, _ in Grade.GRADE_CHOICES:
+        count = grade_counts.get(grade_code, 0)
+        if count > 0:
+            grade_distribution[grade_code] = {
+                'count': count,
+                'percentage': round((count / total_grades * 100), 1) if total_grades > 0 else 0
+            }
+    
+    # Performance by programme
+    programme_performance = {}
+    for row in sorted(
+        grade_performance(facts.filter(programme__is_active=True), 'programme_id', name=F('programme__name')),
+        key=lambda row: row['programme_id']
+    ):
+        programme_performance[row['name']] = {
+            'total_grades': row['total'],
+            'passed': row['passed'],
+            'pass_rate': round(row['passed'] / row['total'] * 100, 1) if row['total'] else 0
+        }
+    
+    # Performance by department
+    department_performance = {}
+    for row in sorted(
+        grade_performance(facts.filter(department__is_active=True), 'department_id', name=F('department__name')),
+        key=lambda row: row['department_id']
+    ):
+        department_performance[row['name']] = {
+            'total_grades': row['total'],
+            'passed': row['passed'],
+            'pass_rate': round(row['passed'] / row['total'] * 100, 1) if row['total'] else 0
+        }
+    
+    # GPA distribution
+    gpa_ranges = {
+        '3.5-4.0': 0, '3.0-3.49': 0, '2.5-2.99': 0,
+        '2.0-2.49': 0, '1.5-1.99': 0, 'Below 1.5': 0
+    }
+    
+    # Calculate student GPAs (simplified) with one grouped query
+    student_gpas = grades.filter(quality_points__gt=0).order_by().values(
+        'enrollment__student'
+    ).annotate(
+        quality_points=Sum('quality_points'),
+        credits=Sum('enrollment__course__credit_hours')
+    )
+    
+    for student_data in student_gpas:
+        if student_data['credits']:
+            gpa = float(student_data['quality_points']) / student_data['credits']
+            if gpa >= 3.5:
+                gpa_ranges['3.5-4.0'] += 1
+            elif gpa >= 3.0:
+                gpa_ranges['3.0-3.49'] += 1
+            elif gpa >= 2.5:
+                gpa_ranges['2.5-2.99'] += 1
+            elif gpa >= 2.0:
+                gpa_ranges['2.0-2.49'] += 1
+            elif gpa >= 1.5:
+                gpa_ranges['1.5-1.99'] += 1
+            else:
+                gpa_ranges['Below 1.5'] += 1
+    
+    # Get filter options
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    programmes = Programme.objects.filter(is_active=True).order_by('name')
+    departments = Department.objects.filter(is_active=True).order_by('name')
+    
+    context = {
+        'total_grades': total_grades,
+        'total_students': total_students,
+        'grade_distribution': grade_distribution,
+        'programme_performance': programme_performance,
+        'department_performance': department_performance,
+        'gpa_ranges': gpa_ranges,
+        'academic_years': academic_years,
+        'programmes': programmes,
+        'departments': departments,
+        'filters': {
+            'academic_year_id': academic_year_id,
+            'programme_id': programme_id,
+            'department_id': department_id,
+        }
+    }
+    
+    return render(request, 'grades/analytics.html', context)
+
+
+@login_required
+def timetable_management(request):
+    """Main timetable management view"""
+    if not request.user.user_type == 'admin':
+        messages.error(request, "Access denied. Admin privileges required.")
+        return redirect('home')
+    
+    # Get current academic year and semester
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get all active programmes
+    programmes = Programme.objects.filter(is_active=True).order_by('name')
+    
+    # Time slots - default university schedule
+    time_slots = [
+        {'start': '07:00', 'end': '10:00', 'label': '7:00 AM - 10:00 AM'},
+        {'start': '10:00', 'end': '13:00', 'label': '10:00 AM - 1:00 PM'},
+        {'start': '14:00', 'end': '17:00', 'label': '2:00 PM - 5:00 PM'},
+        {'start': '17:00', 'end': '19:00', 'label': '5:00 PM - 7:00 PM'},
+    ]
+    
+    days_of_week = [
+        {'key': 'monday', 'label': 'Monday'},
+        {'key': 'tuesday', 'label': 'Tuesday'},
+        {'key': 'wednesday', 'label': 'Wednesday'},
+        {'key': 'thursday', 'label': 'Thursday'},
+        {'key': 'friday', 'label': 'Friday'},
+    ]
+    
+    context = {
+        'programmes': programmes,
+        'current_academic_year': current_academic_year,
+        'current_semester': current_semester,
+        'time_slots': time_slots,
+        'days_of_week': days_of_week,
+        'years_range': range(1, 5),  # Assuming max 4 years
+    }
+    
+    return render(request, 'admin/timetable_management.html', context)
+
+
+@login_required
+def admin_get_programme_courses(request, programme_id):
+    """Get courses for a specific programme and year"""
+    if not request.user.user_type == 'admin':
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    try:
+        programme = get_object_or_404(Programme, id=programme_id, is_active=True)
+        year = request.GET.get('year', 1)
+        
+        current_semester = Semester.objects.filter(is_current=True).first()
+        if not current_semester:
+            return JsonResponse({'error': 'No current semester found'}, status=400)
+        
+        # Get programme courses for the specified year and current semester
+        programme_courses = ProgrammeCourse.objects.filter(
+            programme=programme,
+            year=year,
+            semester=current_semester.semester_number,
+            is_active=True
+        ).select_related('course', 'course__department')
+        
+        courses = []
+        for pc in programme_courses:
+            # Get assigned lecturer (if any)
+            lecturer = None
+            timetable_entry = Timetable.objects.filter(
+                course=pc.course,
+                programme=programme,
+                year=year,
+                semester=current_semester,
+                is_active=True
+            ).first()
+            
+            if timetable_entry:
+                lecturer = timetable_entry.lecturer
+            
+            courses.append({
+                'id': pc.course.id,
+                'code': pc.course.code,
+                'name': pc.course.name,
+                'credit_hours': pc.course.credit_hours,
+                'course_type': pc.course.get_course_type_display(),
+                'department': pc.course.department.name,
+                'lecturer': {
+                    'id': lecturer.id if lecturer else None,
+                    'name': lecturer.user.get_full_name() if lecturer else 'Not Assigned',
+                    'rank': lecturer.academic_rank if lecturer else ''
+                }
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'courses': courses,
+            'programme': {
+                'id': programme.id,
+                'name': programme.name,
+                'code': programme.code
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def get_programme_timetable(request, programme_id):
+    """Get existing timetable for a programme"""
+    if not request.user.user_type == 'admin':
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    try:
+        programme = get_object_or_404(Programme, id=programme_id, is_active=True)
+        year = request.GET.get('year', 1)
+        
+        current_semester = Semester.objects.filter(is_current=True).first()
+        if not current_semester:
+            return JsonResponse({'error': 'No current semester found'}, status=400)
+        
+        # Get timetable entries
+        timetable_entries = Timetable.objects.filter(
+            programme=programme,
+            year=year,
+            semester=current_semester,
+            is_active=True
+        ).select_related('course', 'lecturer', 'lecturer__user')
+        
+        timetable_data = []
+        for entry in timetable_entries:
+            timetable_data.append({
+                'id': entry.id,
+                'course_id': entry.course.id,
+                'course_code': entry.course.code,
+                'course_name': entry.course.name,
+                'lecturer_name': entry.lecturer.user.get_full_name(),
+                'day_of_week': entry.day_of_week,
+                'start_time': entry.start_time.strftime('%H:%M'),
+                'end_time': entry.end_time.strftime('%H:%M'),
+                'venue': entry.venue,
+                'class_type': entry.class_type,
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'timetable': timetable_data
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@login_required
+def save_timetable_entry(request):
+    """Save a timetable entry via AJAX"""
+    if not request.user.user_type == 'admin':
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    try:
+        data = json.loads(request.body)
+        
+        course_id = data.get('course_id')
+        programme_id = data.get('programme_id')
+        year = data.get('year')
+        day_of_week = data.get('day_of_week')
+        start_time = data.get('start_time')
+        end_time = data.get('end_time')
+        venue = data.get('venue', 'TBA')
+        class_type = data.get('class_type', 'lecture')
+        
+        # Validate required fields
+        if not all([course_id, programme_id, year, day_of_week, start_time, end_time]):
+            return JsonResponse({'error': 'Missing required fields'}, status=400)
+        
+        # Get objects
+        course = get_object_or_404(Course, id=course_id)
+        programme = get_object_or_404(Programme, id=programme_id)
+        current_semester = Semester.objects.filter(is_current=True).first()
+        
+        if not current_semester:
+            return JsonResponse({'error': 'No current semester found'}, status=400)
+        
+        # Get a lecturer for the course (preferably from the same department)
+        lecturer = Lecturer.objects.filter(
+            department=course.department,
+            is_active=True
+        ).first()
+        
+        if not lecturer:
+            # Get any available lecturer
+            lecturer = Lecturer.objects.filter(is_active=True).first()
+        
+        if not lecturer:
+            return JsonResponse({'error': 'No lecturer available'}, status=400)
+        
+        # Parse time strings
+        start_time_obj = datetime.strptime(start_time, '%H:%M').time()
+        end_time_obj = datetime.strptime(end_time, '%H:%M').time()
+        
+        with transaction.atomic():
+            # Check for conflicts
+            conflicts = Timetable.objects.filter(
+                programme=programme,
+                year=year,
+                semester=current_semester,
+                day_of_week=day_of_week,
+                start_time__lt=end_time_obj,
+                end_time__gt=start_time_obj,
+                is_active=True
+            ).exclude(course=course)
+            
+            if conflicts.exists():
+                return JsonResponse({
+                    'error': 'Time slot conflict detected',
+                    'conflicts': list(conflicts.values('course__code', 'start_time', 'end_time'))
+                }, status=400)
+            
+            # Check if entry already exists and update, otherwise create
+            timetable_entry, created = Timetable.objects.update_or_create(
+                course=course,
+                programme=programme,
+                year=year,
+                semester=current_semester,
+                defaults={
+                    'lecturer': lecturer,
+                    'day_of_week': day_of_week,
+                    'start_time': start_time_obj,
+                    'end_time': end_time_obj,
+                    'venue': venue,
+                    'class_type': class_type,
+                    'semester_number': current_semester.semester_number,
+                    'is_active': True
+                }
+            )
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Timetable entry saved successfully',
+            'entry': {
+                'id': timetable_entry.id,
+                'course_code': course.code,
+                'course_name': course.name,
+                'lecturer_name': lecturer.user.get_full_name(),
+                'day_of_week': day_of_week,
+                'start_time': start_time,
+                'end_time': end_time,
+                'venue': venue,
+                'class_type': class_type,
+            }
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@login_required
+def delete_timetable_entry(request, entry_id):
+    """Delete a timetable entry"""
+    if not request.user.user_type == 'admin':
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    if request.method != 'DELETE':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    try:
+        entry = get_object_or_404(Timetable, id=entry_id)
+        entry.is_active = False  # Soft delete
+        entry.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Timetable entry deleted successfully'
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def get_available_lecturers(request):
+    """Get available lecturers for a course"""
+    if not request.user.user_type == 'admin':
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    try:
+        course_id = request.GET.get('course_id')
+        if not course_id:
+            return JsonResponse({'error': 'Course ID required'}, status=400)
+        
+        course = get_object_or_404(Course, id=course_id)
+        
+        # Get lecturers from the same department first, then others
+        department_lecturers = Lecturer.objects.filter(
+            department=course.department,
+            is_active=True
+        ).select_related('user')
+        
+        other_lecturers = Lecturer.objects.filter(
+            is_active=True
+        ).exclude(
+            department=course.department
+        ).select_related('user')
+        
+        lecturers_data = []
+        
+        # Add department lecturers first
+        for lecturer in department_lecturers:
+            lecturers_data.append({
+                'id': lecturer.id,
+                'name': lecturer.user.get_full_name(),
+                'rank': lecturer.academic_rank,
+                'department': lecturer.department.name,
+                'preferred': True
+            })
+        
+        # Add other lecturers
+        for lecturer in other_lecturers:
+            lecturers_data.append({
+                'id': lecturer.id,
+                'name': lecturer.user.get_full_name(),
+                'rank': lecturer.academic_rank,
+                'department': lecturer.department.name,
+                'preferred': False
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'lecturers': lecturers_data
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+def academic_management(request):
+    """Main academic year and semester management dashboard"""
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    context = {
+        'current_academic_year': current_academic_year,
+        'current_semester': current_semester,
+        'total_academic_years': AcademicYear.objects.count(),
+        'total_semesters': Semester.objects.count(),
+        'active_students': Student.objects.filter(status='active').count(),
+    }
+    return render(request, 'admin/academic_management.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+def get_academic_years(request):
+    """AJAX endpoint to get all academic years with their semesters"""
+    semesters_by_year = defaultdict(list)
+    for semester in reference_data.snapshot('semesters'):
+        semesters_by_year[semester['academic_year_id']].append(semester)
+    
+    # Students within the year span, counted once per distinct span
+    student_counts = {}
+    
+    years_data = []
+    for year in reference_data.snapshot('academic_years'):
+        span = year['end_date'].year - year['start_date'].year + 1
+        if span not in student_counts:
+            student_counts[span] = Student.objects.filter(current_year__lte=span).count()
+        
+        semesters = []
+        for semester in semesters_by_year[year['id']]:
+            semester_stats = {
+                'total_students': student_counts[span],
+                # Registrations were never counted here (there is no
+                # courseenrollment_set); kept at 0 for the page's JS
+                'registrations': 0
+            }
+            
+            semesters.append({
+                'id': semester['id'],
+                'semester_number': semester['semester_number'],
+                'start_date': semester['start_date'].strftime('%Y-%m-%d'),
+                'end_date': semester['end_date'].strftime('%Y-%m-%d'),
+                'registration_start_date': semester['registration_start_date'].strftime('%Y-%m-%d'),
+                'registration_end_date': semester['registration_end_date'].strftime('%Y-%m-%d'),
+                'is_current': semester['is_current'],
+                'stats': semester_stats
+            })
+        
+        years_data.append({
+            'id': year['id'],
+            'year': year['year'],
+            'start_date': year['start_date'].strftime('%Y-%m-%d'),
+            'end_date': year['end_date'].strftime('%Y-%m-%d'),
+            'is_current': year['is_current'],
+            'semesters': semesters
+        })
+    
+    return JsonResponse({'academic_years': years_data})
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+@require_http_methods(["POST"])
+def create_academic_year(request):
+    """AJAX endpoint to create a new academic year"""
+    try:
+        data = json.loads(request.body)
+        
+        with transaction.atomic():
+            academic_year = AcademicYear.objects.create(
+                year=data['year'],
+                start_date=datetime.strptime(data['start_date'], '%Y-%m-%d').date(),
+                end_date=datetime.strptime(data['end_date'], '%Y-%m-%d').date(),
+                is_current=data.get('is_current', False)
+            )
+            
+        return JsonResponse({
+            'success': True,
+            'message': f'Academic year {academic_year.year} created successfully!',
+            'academic_year': {
+                'id': academic_year.id,
+                'year': academic_year.year,
+                'start_date': academic_year.start_date.strftime('%Y-%m-%d'),
+                'end_date': academic_year.end_date.strftime('%Y-%m-%d'),
+                'is_current': academic_year.is_current
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error creating academic year: {str(e)}'
+        }, status=400)
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+@require_http_methods(["POST"])
+def update_academic_year(request, year_id):
+    """AJAX endpoint to update an academic year"""
+    try:
+        academic_year = get_object_or_404(AcademicYear, id=year_id)
+        data = json.loads(request.body)
+        
+        with transaction.atomic():
+            academic_year.year = data['year']
+            academic_year.start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+            academic_year.end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+            academic_year.is_current = data.get('is_current', False)
+            academic_year.save()
+            
+        return JsonResponse({
+            'success': True,
+            'message': f'Academic year {academic_year.year} updated successfully!',
+            'academic_year': {
+                'id': academic_year.id,
+                'year': academic_year.year,
+                'start_date': academic_year.start_date.strftime('%Y-%m-%d'),
+                'end_date': academic_year.end_date.strftime('%Y-%m-%d'),
+                'is_current': academic_year.is_current
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error updating academic year: {str(e)}'
+        }, status=400)
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+@require_http_methods(["POST"])
+def delete_academic_year(request, year_id):
+    """AJAX endpoint to delete an academic year"""
+    try:
+        academic_year = get_object_or_404(AcademicYear, id=year_id)
+        year_name = academic_year.year
+        
+        # Check if year has students or other dependencies
+        if academic_year.semesters.exists():
+            return JsonResponse({
+                'success': False,
+                'message': 'Cannot delete academic year with existing semesters. Delete semesters first.'
+            }, status=400)
+        
+        academic_year.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Academic year {year_name} deleted successfully!'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error deleting academic year: {str(e)}'
+        }, status=400)
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+@require_http_methods(["POST"])
+def create_semester(request, year_id):
+    """AJAX endpoint to create a new semester"""
+    try:
+        academic_year = get_object_or_404(AcademicYear, id=year_id)
+        data = json.loads(request.body)
+        
+        with transaction.atomic():
+            semester = Semester.objects.create(
+                academic_year=academic_year,
+                semester_number=data['semester_number'],
+                start_date=datetime.strptime(data['start_date'], '%Y-%m-%d').date(),
+                end_date=datetime.strptime(data['end_date'], '%Y-%m-%d').date(),
+                registration_start_date=datetime.strptime(data['registration_start_date'], '%Y-%m-%d').date(),
+                registration_end_date=datetime.strptime(data['registration_end_date'], '%Y-%m-%d').date(),
+                is_current=data.get('is_current', False)
+            )
+            
+        return JsonResponse({
+            'success': True,
+            'message': f'Semester {semester.semester_number} created successfully!',
+            'semester': {
+                'id': semester.id,
+                'semester_number': semester.semester_number,
+                'start_date': semester.start_date.strftime('%Y-%m-%d'),
+                'end_date': semester.end_date.strftime('%Y-%m-%d'),
+                'registration_start_date': semester.registration_start_date.strftime('%Y-%m-%d'),
+                'registration_end_date': semester.registration_end_date.strftime('%Y-%m-%d'),
+                'is_current': semester.is_current
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error creating semester: {str(e)}'
+        }, status=400)
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+@require_http_methods(["POST"])
+def update_semester(request, semester_id):
+    """AJAX endpoint to update a semester"""
+    try:
+        semester = get_object_or_404(Semester, id=semester_id)
+        data = json.loads(request.body)
+        
+        with transaction.atomic():
+            semester.semester_number = data['semester_number']
+            semester.start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+            semester.end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+            semester.registration_start_date = datetime.strptime(data['registration_start_date'], '%Y-%m-%d').date()
+            semester.registration_end_date = datetime.strptime(data['registration_end_date'], '%Y-%m-%d').date()
+            semester.is_current = data.get('is_current', False)
+            semester.save()
+            
+        return JsonResponse({
+            'success': True,
+            'message': f'Semester {semester.semester_number} updated successfully!',
+            'semester': {
+                'id': semester.id,
+                'semester_number': semester.semester_number,
+                'start_date': semester.start_date.strftime('%Y-%m-%d'),
+                'end_date': semester.end_date.strftime('%Y-%m-%d'),
+                'registration_start_date': semester.registration_start_date.strftime('%Y-%m-%d'),
+                'registration_end_date': semester.registration_end_date.strftime('%Y-%m-%d'),
+                'is_current': semester.is_current
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error updating semester: {str(e)}'
+        }, status=400)
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+@require_http_methods(["POST"])
+def delete_semester(request, semester_id):
+    """AJAX endpoint to delete a semester"""
+    try:
+        semester = get_object_or_404(Semester, id=semester_id)
+        semester_name = f"Semester {semester.semester_number}"
+        
+        # Check if semester has enrollments or other dependencies
+        if hasattr(semester, 'courseenrollment_set') and semester.courseenrollment_set.exists():
+            return JsonResponse({
+                'success': False,
+                'message': 'Cannot delete semester with existing course enrollments.'
+            }, status=400)
+        
+        semester.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'{semester_name} deleted successfully!'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error deleting semester: {str(e)}'
+        }, status=400)
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+@require_http_methods(["POST"])
+def set_current_academic_year(request, year_id):
+    """AJAX endpoint to set current academic year"""
+    try:
+        with transaction.atomic():
+            AcademicYear.objects.filter(is_current=True).update(is_current=False)
+            academic_year = get_object_or_404(AcademicYear, id=year_id)
+            academic_year.is_current = True
+            academic_year.save()
+            
+        return JsonResponse({
+            'success': True,
+            'message': f'Academic year {academic_year.year} set as current!'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error setting current academic year: {str(e)}'
+        }, status=400)
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+@require_http_methods(["POST"])
+def set_current_semester(request, semester_id):
+    """AJAX endpoint to set current semester"""
+    try:
+        with transaction.atomic():
+            Semester.objects.filter(is_current=True).update(is_current=False)
+            semester = get_object_or_404(Semester, id=semester_id)
+            semester.is_current = True
+            semester.save()
+            
+        return JsonResponse({
+            'success': True,
+            'message': f'Semester {semester.semester_number} ({semester.academic_year.year}) set as current!'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error setting current semester: {str(e)}'
+        }, status=400)
+
+
+@login_required
+@user_passes_test(is_admin_or_registrar)
+def get_semester_registrations(request, semester_id):
+    """AJAX endpoint to get semester registration details"""
+    try:
+        semester = get_object_or_404(Semester, id=semester_id)
+        
+        # Get all programmes and count enrollments for this semester
+        programmes = Programme.objects.filter(is_active=True).annotate(
+            enrollment_count=Count(
+                'students__enrollments',
+                filter=Q(students__enrollments__semester=semester) & Q(students__enrollments__is_active=True),
+                distinct=True
+            )
+        ).select_related('department', 'faculty')
+        
+        programmes_data = []
+        total_registrations = 0
+        
+        for programme in programmes:
+            enrollment_count = programme.enrollment_count
+            total_registrations += enrollment_count
+            
+            programmes_data.append({
+                'id': programme.id,
+                'name': programme.name,
+                'code': programme.code,
+                'programme_type': programme.get_programme_type_display(),
+                'department': programme.department.name if programme.department else 'N/A',
+                'enrollment_count': enrollment_count
+            })
+        
+        # Sort by enrollment count (highest first)
+        programmes_data.sort(key=lambda x: x['enrollment_count'], reverse=True)
+        
+        return JsonResponse({
+            'success': True,
+            'semester': {
+                'id': semester.id,
+                'name': f"Semester {semester.semester_number}",
+                'academic_year': semester.academic_year.year,
+                'registration_start': semester.registration_start_date.strftime('%Y-%m-%d') if semester.registration_start_date else 'N/A',
+                'registration_end': semester.registration_end_date.strftime('%Y-%m-%d') if semester.registration_end_date else 'N/A',
+            },
+            'programmes': programmes_data,
+            'total_registrations': total_registrations
+        })
+        
+    except Exception as e:
+        import traceback
+        print(f"Error in get_semester_registrations: {str(e)}")
+        print(traceback.format_exc())
+        
+        return JsonResponse({
+            'success': False,
+            'message': f'Error fetching semester registrations: {str(e)}'
+        }, status=400)
+
+
+@staff_member_required
+@login_required
+def admin_student_enrollment_list(request):
+    """Main view to display list of students for enrollment management"""
+    # Get filter parameters
+    search_query = request.GET.get('search', '')
+    programme_filter = request.GET.get('programme', '')
+    faculty_filter = request.GET.get('faculty', '')
+    status_filter = request.GET.get('status', '')
+    year_filter = request.GET.get('year', '')
+    
+    # Base queryset with related data
+    students = Student.objects.select_related(
+        'user', 'programme', 'programme__department', 'programme__faculty'
+    ).annotate(
+        total_enrollments=Count('enrollments')
+    ).order_by('-admission_date')
+    
+    # Apply filters
+    if search_query:
+        students = students.filter(
+            Q(user__first_name__icontains=search_query) |
+            Q(user__last_name__icontains=search_query) |
+            Q(student_id__icontains=search_query) |
+            Q(user__email__icontains=search_query)
+        )
+    
+    if programme_filter:
+        students = students.filter(programme_id=programme_filter)
+    
+    if faculty_filter:
+        students = students.filter(programme__faculty_id=faculty_filter)
+    
+    if status_filter:
+        students = students.filter(status=status_filter)
+    
+    if year_filter:
+        students = students.filter(current_year=year_filter)
+    
+    # Pagination
+    paginator = Paginator(students, 12)  # 12 students per page
+    page_number = request.GET.get('page')
+    students_page = paginator.get_page(page_number)
+    
+    # Get filter options
+    programmes = Programme.objects.filter(is_active=True).select_related('faculty')
+    faculties = Faculty.objects.filter(is_active=True)
+    
+    context = {
+        'students': students_page,
+        'programmes': programmes,
+        'faculties': faculties,
+        'search_query': search_query,
+        'programme_filter': programme_filter,
+        'faculty_filter': faculty_filter,
+        'status_filter': status_filter,
+        'year_filter': year_filter,
+        'student_statuses': Student.STATUS_CHOICES,
+        'current_years': range(1, 9),  # 1-8 years
+    }
+    
+    return render(request, 'admin/student_enrollment_list.html', context)
+
+
+@staff_member_required
+@login_required
+def get_student_enrollments(request, student_id):
+    """AJAX view to fetch student enrollments organized by academic year and semester"""
+    if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    try:
+        student = get_object_or_404(
+            Student.objects.select_related('user', 'programme'), 
+            id=student_id
+        )
+        
+        # Get all enrollments with related data
+        enrollments = Enrollment.objects.filter(
+            student=student
+        ).select_related(
+            'course', 'semester', 'semester__academic_year', 'lecturer', 'lecturer__user'
+        ).order_by(
+            'semester__academic_year__start_date', 'semester__semester_number', 'course__name'
+        )
+        
+        # Organize enrollments by academic year and semester
+        enrollment_data = {}
+        
+        for enrollment in enrollments:
+            academic_year = enrollment.semester.academic_year
+            semester_num = enrollment.semester.semester_number
+            
+            year_key = academic_year.year
+            semester_key = f"semester_{semester_num}"
+            
+            if year_key not in enrollment_data:
+                enrollment_data[year_key] = {
+                    'academic_year': {
+                        'id': academic_year.id,
+                        'year': academic_year.year,
+                        'start_date': academic_year.start_date.strftime('%Y-%m-%d'),
+                        'end_date': academic_year.end_date.strftime('%Y-%m-%d'),
+                        'is_current': academic_year.is_current,
+                    },
+                    'semesters': {}
+                }
+            
+            if semester_key not in enrollment_data[year_key]['semesters']:
+                enrollment_data[year_key]['semesters'][semester_key] = {
+                    'semester_info': {
+                        'id': enrollment.semester.id,
+                        'number': semester_num,
+                        'start_date': enrollment.semester.start_date.strftime('%Y-%m-%d'),
+                        'end_date': enrollment.semester.end_date.strftime('%Y-%m-%d'),
+                        'is_current': enrollment.semester.is_current,
+                    },
+                    'enrollments': []
+                }
+            
+            # Add enrollment data
+            enrollment_info = {
+                'id': enrollment.id,
+                'course': {
+                    'id': enrollment.course.id,
+                    'name': enrollment.course.name,
+                    'code': enrollment.course.code,
+                    'credit_hours': enrollment.course.credit_hours,
+                    'course_type': enrollment.course.course_type,
+                    'course_type_display': enrollment.course.get_course_type_display(),
+                    'level': enrollment.course.level,
+                },
+                'lecturer': {
+                    'id': enrollment.lecturer.id if enrollment.lecturer else None,
+                    'name': enrollment.lecturer.user.get_full_name() if enrollment.lecturer else 'Not Assigned',
+                    'academic_rank': enrollment.lecturer.academic_rank if enrollment.lecturer else '',
+                } if enrollment.lecturer else None,
+                'enrollment_date': enrollment.enrollment_date.strftime('%Y-%m-%d'),
+                'is_active': enrollment.is_active,
+                'is_repeat': enrollment.is_repeat,
+                'is_audit': enrollment.is_audit,
+            }
+            
+            enrollment_data[year_key]['semesters'][semester_key]['enrollments'].append(enrollment_info)
+        
+        # Get available courses for adding new enrollments
+        available_courses = get_available_courses_for_student(student)
+        
+        response_data = {
+            'student': {
+                'id': student.id,
+                'student_id': student.student_id,
+                'name': student.user.get_full_name(),
+                'email': student.user.email,
+                'programme': {
+                    'name': student.programme.name,
+                    'code': student.programme.code,
+                },
+                'current_year': student.current_year,
+                'current_semester': student.current_semester,
+                'status': student.status,
+                'admission_date': student.admission_date.strftime('%Y-%m-%d'),
+            },
+            'enrollment_data': enrollment_data,
+            'available_courses': available_courses,
+            'success': True
+        }
+        
+        return JsonResponse(response_data)
+        
+    except Exception as e:
+        return JsonResponse({
+            'error': f'Failed to fetch enrollments: {str(e)}',
+            'success': False
+        }, status=500)
+
+
+def get_available_courses_for_student(student):
+    """Get courses available for the student based on their programme"""
+    # Get programme courses for the student's current level
+    programme_courses = ProgrammeCourse.objects.filter(
+        programme=student.programme,
+        is_active=True,
+        year__lte=student.current_year
+    ).select_related('course').order_by('year', 'semester', 'course__name')
+    
+    # Get already enrolled course IDs
+    enrolled_course_ids = Enrollment.objects.filter(
+        student=student
+    ).values_list('course_id', flat=True)
+    
+    available_courses = []
+    for pc in programme_courses:
+        if pc.course.id not in enrolled_course_ids:
+            available_courses.append({
+                'id': pc.course.id,
+                'name': pc.course.name,
+                'code': pc.course.code,
+                'credit_hours': pc.course.credit_hours,
+                'course_type': pc.course.get_course_type_display(),
+                'level': pc.course.level,
+                'year': pc.year,
+                'semester': pc.semester,
+                'is_mandatory': pc.is_mandatory,
+            })
+    
+    return available_courses
+
+
+@staff_member_required
+@login_required
+@require_http_methods(["POST"])
+def add_student_enrollment(request):
+    """AJAX view to add new enrollment for a student"""
+    if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    try:
+        data = json.loads(request.body)
+        student_id = data.get('student_id')
+        course_id = data.get('course_id')
+        semester_id = data.get('semester_id')
+        lecturer_id = data.get('lecturer_id')
+        
+        # Validate required fields
+        if not all([student_id, course_id, semester_id]):
+            return JsonResponse({
+                'error': 'Student, course, and semester are required',
+                'success': False
+            }, status=400)
+        
+        # Get objects
+        student = get_object_or_404(Student, id=student_id)
+        course = get_object_or_404(Course, id=course_id)
+        semester = get_object_or_404(Semester, id=semester_id)
+        lecturer = None
+        
+        if lecturer_id:
+            lecturer = get_object_or_404(Lecturer, id=lecturer_id)
+        
+        # Check if enrollment already exists
+        existing_enrollment = Enrollment.objects.filter(
+            student=student,
+            course=course,
+            semester=semester
+        ).first()
+        
+        if existing_enrollment:
+            return JsonResponse({
+                'error': 'Student is already enrolled in this course for this semester',
+                'success': False
+            }, status=400)
+        
+        # Create enrollment
+        with transaction.atomic():
+            enrollment = Enrollment.objects.create(
+                student=student,
+                course=course,
+                semester=semester,
+                lecturer=lecturer,
+                is_active=True
+            )
+        
+        return JsonResponse({
+            'message': f'Successfully enrolled {student.user.get_full_name()} in {course.name}',
+            'enrollment_id': enrollment.id,
+            'success': True
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'error': 'Invalid JSON data',
+            'success': False
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'error': f'Failed to add enrollment: {str(e)}',
+            'success': False
+        }, status=500)
+
+
+@staff_member_required
+@login_required
+@require_http_methods(["DELETE"])
+def delete_student_enrollment(request, enrollment_id):
+    """AJAX view to delete a student enrollment"""
+    if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    try:
+        enrollment = get_object_or_404(
+            Enrollment.objects.select_related('student__user', 'course'),
+            id=enrollment_id
+        )
+        
+        student_name = enrollment.student.user.get_full_name()
+        course_name = enrollment.course.name
+        
+        enrollment.delete()
+        
+        return JsonResponse({
+            'message': f'Successfully removed {student_name} from {course_name}',
+            'success': True
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'error': f'Failed to delete enrollment: {str(e)}',
+            'success': False
+        }, status=500)
+
+
+@staff_member_required
+@login_required
+@reference_endpoint
+def get_semester_options(request):
+    """AJAX view to get available semesters for enrollment"""
+    if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    try:
+        current_years = {year['id']: year['year'] for year in reference_data.select('academic_years', is_current=True)}
+        
+        semester_options = []
+        for semester in reference_data.snapshot('semesters'):
+            year = current_years.get(semester['academic_year_id'])
+            if year is None:
+                continue
+            semester_options.append({
+                'id': semester['id'],
+                'display_name': f"{year} - Semester {semester['semester_number']}",
+                'semester_number': semester['semester_number'],
+                'academic_year': year,
+                'is_current': semester['is_current'],
+            })
+        
+        return JsonResponse({
+            'semesters': semester_options,
+            'success': True
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'error': f'Failed to fetch semesters: {str(e)}',
+            'success': False
+        }, status=500)
+
+
+# Add these views to your views.py file
+
+@staff_member_required
+@login_required
+def get_programme_students(request, programme_id):
+    """Get students for a specific programme (for bulk enrollment)"""
+    if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    try:
+        programme = get_object_or_404(Programme, id=programme_id, is_active=True)
+        
+        # Get students enrolled in this programme
+        students = Student.objects.filter(
+            programme=programme,
+            status__in=['active', 'deferred']  # Only active and deferred students
+        ).select_related('user').order_by('user__first_name', 'user__last_name')
+        
+        student_data = []
+        for student in students:
+            student_data.append({
+                'id': student.id,
+                'name': student.user.get_full_name(),
+                'student_id': student.student_id,
+                'current_year': student.current_year,
+                'current_semester': student.current_semester,
+                'status': student.status,
+                'status_display': student.get_status_display(),
+                'email': student.user.email,
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'students': student_data,
+            'programme': {
+                'id': programme.id,
+                'name': programme.name,
+                'code': programme.code,
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'error': f'Failed to fetch students: {str(e)}',
+            'success': False
+        }, status=500)
+
+
+@staff_member_required
+@login_required  
+def get_programme_courses(request, programme_id):
+    """Get courses for a specific programme/year/semester (for bulk enrollment)"""
+    if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    try:
+        programme = get_object_or_404(Programme, id=programme_id, is_active=True)
+        year = request.GET.get('year')
+        semester = request.GET.get('semester')
+        
+        if not year or not semester:
+            return JsonResponse({
+                'error': 'Year and semester parameters are required',
+                'success': False
+            }, status=400)
+        
+        # Get programme courses for the specified year and semester
+        programme_courses = ProgrammeCourse.objects.filter(
+            programme=programme,
+            year=year,
+            semester=semester,
+            is_active=True
+        ).select_related('course').order_by('course__name')
+        
+        course_data = []
+        for pc in programme_courses:
+            course_data.append({
+                'id': pc.course.id,
+                'name': pc.course.name,
+                'code': pc.course.code,
+                'credit_hours': pc.course.credit_hours,
+                'course_type': pc.course.get_course_type_display(),
+                'course_type_raw': pc.course.course_type,
+                'level': pc.course.level,
+                'is_mandatory': pc.is_mandatory,
+                'year': pc.year,
+                'semester': pc.semester,
+                'description': pc.course.description,
+                'department': pc.course.department.name,
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'courses': course_data,
+            'programme': {
+                'id': programme.id,
+                'name': programme.name,
+                'code': programme.code,
+            },
+            'filters': {
+                'year': year,
+                'semester': semester,
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'error': f'Failed to fetch courses: {str(e)}',
+            'success': False
+        }, status=500)
+
+
+@staff_member_required
+@login_required
+@require_http_methods(["POST"])
+def bulk_add_enrollments(request):
+    """Handle bulk enrollment creation"""
+    if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    try:
+        data = json.loads(request.body)
+        student_ids = data.get('student_ids', [])
+        course_ids = data.get('course_ids', [])
+        semester_id = data.get('semester_id')
+        
+        # Validate required fields
+        if not student_ids or not course_ids or not semester_id:
+            return JsonResponse({
+                'error': 'Student IDs, course IDs, and semester ID are required',
+                'success': False
+            }, status=400)
+        
+        # Validate the requested ids with two id-only queries
+        semester = get_object_or_404(Semester, id=semester_id)
+        found_student_ids = set(Student.objects.filter(id__in=student_ids).values_list('id', flat=True))
+        found_course_ids = set(Course.objects.filter(id__in=course_ids).values_list('id', flat=True))
+        
+        if len(found_student_ids) != len(set(student_ids)):
+            return JsonResponse({
+                'error': 'Some students were not found',
+                'success': False
+            }, status=400)
+        
+        if len(found_course_ids) != len(set(course_ids)):
+            return JsonResponse({
+                'error': 'Some courses were not found',
+                'success': False
+            }, status=400)
+        
+        # Diff against existing enrollments in one query and bulk insert the rest
+        from ..enrollment_engine import bulk_enroll
+        result = bulk_enroll(semester, found_student_ids, found_course_ids)
+        
+        created_count = result['created_count']
+        skipped_count = result['skipped_count']
+        full_count = result['full_count']
+        error_count = 0
+        errors = []
+        
+        # Prepare response
+        response_data = {
+            'success': True,
+            'created_count': created_count,
+            'skipped_count': skipped_count,
+            'full_count': full_count,
+            'error_count': error_count,
+            'total_attempted': result['total_attempted'],
+            'message': f'Bulk enrollment completed. Created: {created_count}, Skipped: {skipped_count}, Course full: {full_count}, Errors: {error_count}'
+        }
+        
+        if errors:
+            response_data['errors'] = errors[:10]  # Limit to first 10 errors
+            if len(errors) > 10:
+                response_data['additional_errors'] = len(errors) - 10
+        
+        return JsonResponse(response_data)
+        
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'error': 'Invalid JSON data',
+            'success': False
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'error': f'Failed to perform bulk enrollment: {str(e)}',
+            'success': False
+        }, status=500)
+
+
+# Additional helper view for getting lecturers (optional - for lecturer assignment in enrollment modal)
+@staff_member_required
+@login_required
+def get_course_lecturers(request, course_id):
+    """Get lecturers who can teach a specific course"""
+    if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+    
+    try:
+        course = get_object_or_404(Course, id=course_id)
+        
+        # Get lecturers from the same department as the course
+        lecturers = Lecturer.objects.filter(
+            department=course.department,
+            is_active=True
+        ).select_related('user').order_by('user__first_name', 'user__last_name')
+        
+        lecturer_data = []
+        for lecturer in lecturers:
+            lecturer_data.append({
+                'id': lecturer.id,
+                'name': lecturer.user.get_full_name(),
+                'academic_rank': lecturer.get_academic_rank_display(),
+                'employee_number': lecturer.employee_number,
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'lecturers': lecturer_data,
+            'course': {
+                'id': course.id,
+                'name': course.name,
+                'code': course.code,
+                'department': course.department.name,
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'error': f'Failed to fetch lecturers: {str(e)}',
+            'success': False
+        }, status=500)
+
+
+@login_required
+@user_passes_test(is_admin_registrar_or_dean)
+def department_list(request):
+    """List all departments with filtering and search"""
+    
+    # Get filter parameters
+    search_query = request.GET.get('search', '').strip()
+    faculty_filter = request.GET.get('faculty', '')
+    status_filter = request.GET.get('status', '')
+    
+    # Base queryset with related data
+    departments = Department.objects.select_related(
+        'faculty', 
+        'head_of_department'
+    ).annotate(
+        total_programmes=Count('programmes', distinct=True),
+        total_students=Count('programmes__students', distinct=True)
+    )
+    
+    # Apply search filter
+    if search_query:
+        departments = departments.filter(
+            Q(name__icontains=search_query) |
+            Q(code__icontains=search_query) |
+            Q(faculty__name__icontains=search_query) |
+            Q(description__icontains=search_query)
+        )
+    
+    # Apply faculty filter
+    if faculty_filter:
+        departments = departments.filter(faculty_id=faculty_filter)
+    
+    # Apply status filter
+    if status_filter:
+        if status_filter == 'active':
+            departments = departments.filter(is_active=True)
+        elif status_filter == 'inactive':
+            departments = departments.filter(is_active=False)
+    
+    # Order by name
+    departments = departments.order_by('faculty__name', 'name')
+    
+    # Pagination
+    paginator = Paginator(departments, 25)
+    page_number = request.GET.get('page')
+    departments_page = paginator.get_page(page_number)
+    
+    # Get all faculties for filter dropdown
+    faculties = Faculty.objects.filter(is_active=True).order_by('name')
+    
+    # Status choices for filter
+    status_choices = [
+        ('active', 'Active'),
+        ('inactive', 'Inactive'),
+    ]
+    
+    # Calculate totals
+    total_departments = Department.objects.count()
+    active_departments = Department.objects.filter(is_active=True).count()
+    inactive_departments = Department.objects.filter(is_active=False).count()
+    
+    context = {
+        'departments': departments_page,
+        'faculties': faculties,
+        'status_choices': status_choices,
+        'search_query': search_query,
+        'faculty_filter': faculty_filter,
+        'status_filter': status_filter,
+        'total_departments': total_departments,
+        'active_departments': active_departments,
+        'inactive_departments': inactive_departments,
+    }
+    
+    return render(request, 'departments/department_list.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_registrar_or_dean)
+def department_detail(request, code):
+    """Get department details via AJAX"""
+    department = get_object_or_404(Department, code=code)
+    
+    if request.method == 'GET':
+        # Return JSON response for AJAX requests
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            data = {
+                'id': department.id,
+                'name': department.name,
+                'code': department.code,
+                'faculty_name': department.faculty.name,
+                'faculty_code': department.faculty.code,
+                'head_of_department': {
+                    'name': department.head_of_department.get_full_name() if department.head_of_department else None,
+                    'email': department.head_of_department.email if department.head_of_department else None,
+                    'phone': department.head_of_department.phone if department.head_of_department else None,
+                } if department.head_of_department else None,
+                'description': department.description,
+                'established_date': department.established_date.strftime('%Y-%m-%d') if department.established_date else None,
+                'is_active': department.is_active,
+                'total_programmes': getattr(department, 'total_programmes', 0),
+                'total_students': getattr(department, 'total_students', 0),
+            }
+            return JsonResponse(data)
+        
+        # Regular page view
+        context = {
+            'department': department,
+        }
+        return render(request, 'departments/department_detail.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_registrar_or_dean)
+def department_create(request):
+    """Create new department"""
+    if request.method == 'POST':
+        form = DepartmentForm(request.POST)
+        if form.is_valid():
+            department = form.save()
+            
+            # AJAX response
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({
+                    'success': True,
+                    'message': f'Department "{department.name}" created successfully!',
+                    'department': {
+                        'id': department.id,
+                        'name': department.name,
+                        'code': department.code,
+                        'faculty_name': department.faculty.name,
+                    }
+                })
+            
+            messages.success(request, f'Department "{department.name}" created successfully!')
+            return redirect('department_list')
+        else:
+            # AJAX error response
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({
+                    'success': False,
+                    'errors': form.errors
+                })
+    else:
+        form = DepartmentForm()
+    
+    # Get faculties for dropdown
+    faculties = Faculty.objects.filter(is_active=True).order_by('name')
+    
+    # Get potential HODs (lecturers, professors, staff)
+    potential_hods = User.objects.filter(
+        user_type__in=['lecturer', 'professor', 'hod', 'staff'],
+        is_active=True
+    ).order_by('first_name', 'last_name')
+    
+    context = {
+        'form': form,
+        'faculties': faculties,
+        'potential_hods': potential_hods,
+        'action': 'Create',
+    }
+    
+    return render(request, 'departments/department_form.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_registrar_or_dean)
+def department_update(request, code):
+    """Update department via AJAX"""
+    department = get_object_or_404(Department, code=code)
+    
+    if request.method == 'POST':
+        form = DepartmentForm(request.POST, instance=department)
+        if form.is_valid():
+            department = form.save()
+            
+            # AJAX response
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({
+                    'success': True,
+                    'message': f'Department "{department.name}" updated successfully!',
+                    'department': {
+                        'id': department.id,
+                        'name': department.name,
+                        'code': department.code,
+                        'faculty_name': department.faculty.name,
+                        'head_of_department': department.head_of_department.get_full_name() if department.head_of_department else 'Not assigned',
+                        'is_active': department.is_active,
+                    }
+                })
+            
+            messages.success(request, f'Department "{department.name}" updated successfully!')
+            return redirect('department_list')
+        else:
+            # AJAX error response
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({
+                    'success': False,
+                    'errors': form.errors
+                })
+    else:
+        form = DepartmentForm(instance=department)
+    
+    # Get faculties for dropdown
+    faculties = Faculty.objects.filter(is_active=True).order_by('name')
+    
+    # Get potential HODs
+    potential_hods = User.objects.filter(
+        user_type__in=['lecturer', 'professor', 'hod', 'staff'],
+        is_active=True
+    ).order_by('first_name', 'last_name')
+    
+    context = {
+        'form': form,
+        'department': department,
+        'faculties': faculties,
+        'potential_hods': potential_hods,
+        'action': 'Update',
+    }
+    
+    return render(request, 'departments/department_form.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_registrar_or_dean)
+@require_http_methods(["DELETE", "POST"])
+def department_delete(request, code):
+    """Delete department via AJAX"""
+    department = get_object_or_404(Department, code=code)
+    
+    try:
+        department_name = department.name
+        department.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Department "{department_name}" deleted successfully!'
+        })
+    
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error deleting department: {str(e)}'
+        })
+
+
+@login_required
+def get_department_programmes(request, department_id):
+    """Get programmes for a specific department (AJAX endpoint)"""
+    try:
+        department = get_object_or_404(Department, id=department_id)
+        programmes = department.programmes.filter(is_active=True).values('id', 'name', 'code')
+        
+        return JsonResponse({
+            'success': True,
+            'programmes': list(programmes)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        })
+
+
+@login_required
+def student_exam_programmes_list(request):
+    """View to display all programmes for exam management"""
+    programmes = Programme.objects.filter(is_active=True).select_related(
+        'department', 'faculty'
+    ).annotate(
+        total_students=Count('students', distinct=True),
+        active_students=Count('students', filter=Q(students__status='active'), distinct=True)
+    ).order_by('faculty__name', 'name')
+    
+    context = {
+        'programmes': programmes,
+        'page_title': 'Student Exam Management - Programmes',
+    }
+    return render(request, 'exams/student_exam_programmes_list.html', context)
+
+
+@login_required
+def student_exam_programme_detail(request, programme_id):
+    """Detailed view of a specific programme showing academic years and students"""
+    programme = get_object_or_404(Programme, id=programme_id, is_active=True)
+    
+    # Get all academic years that have enrollments for this programme
+    academic_years = AcademicYear.objects.filter(
+        semesters__enrollments__student__programme=programme
+    ).distinct().order_by('-year')
+    
+    # Get programme course structure to determine years and semesters
+    programme_years = list(range(1, programme.duration_years + 1))
+    programme_semesters = list(range(1, programme.semesters_per_year + 1))
+    
+    context = {
+        'programme': programme,
+        'academic_years': academic_years,
+        'programme_years': programme_years,
+        'programme_semesters': programme_semesters,
+        'page_title': f'Exam Management - {programme.name}',
+    }
+    return render(request, 'exams/student_exam_programme_detail.html', context)
+
+
+@login_required
+def get_programme_year_data(request, programme_id, academic_year_id):
+    """AJAX endpoint to get student data for a specific programme and academic year"""
+    programme = get_object_or_404(Programme, id=programme_id)
+    academic_year = get_object_or_404(AcademicYear, id=academic_year_id)
+    
+    # Get all semesters for this academic year
+    semesters = Semester.objects.filter(academic_year=academic_year).order_by('semester_number')
+    
+    year_data = {}
+    for year in range(1, programme.duration_years + 1):
+        year_data[year] = {
+            'year_number': year,
+            'semesters': []
+        }
+        
+        for semester in semesters:
+            if semester.semester_number <= programme.semesters_per_year:
+                # Get students for this year and semester
+                students = Student.objects.filter(
+                    programme=programme,
+                    current_year=year,
+                    status='active',
+                    enrollments__semester=semester
+                ).select_related('user').distinct()
+                
+                # Get courses for this year and semester
+                courses = Course.objects.filter(
+                    course_programmes__programme=programme,
+                    course_programmes__year=year,
+                    course_programmes__semester=semester.semester_number,
+                    course_programmes__is_active=True
+                ).select_related('department')
+                
+                semester_data = {
+                    'semester': semester,
+                    'student_count': students.count(),
+                    'courses': []
+                }
+                
+                for course in courses:
+                    # Get lecturer assignment for this course
+                    lecturer_assignment = LecturerCourseAssignment.objects.filter(
+                        course=course,
+                        academic_year=academic_year,
+                        semester=semester,
+                        is_active=True
+                    ).select_related('lecturer__user').first()
+                    
+                    # Get enrolled students for this specific course
+                    enrolled_students = students.filter(
+                        enrollments__course=course,
+                        enrollments__semester=semester,
+                        enrollments__is_active=True
+                    )
+                    
+                    course_data = {
+                        'course': course,
+                        'lecturer_assignment': lecturer_assignment,
+                        'enrolled_count': enrolled_students.count(),
+                        'course_id': course.id,
+                        'semester_id': semester.id,
+                    }
+                    semester_data['courses'].append(course_data)
+                
+                year_data[year]['semesters'].append(semester_data)
+    
+    return JsonResponse({
+        'year_data': year_data,
+        'programme_name': programme.name,
+        'academic_year': academic_year.year
+    })
+
+
+@login_required
+def course_exam_students_list(request, programme_id, course_id, semester_id):
+    """View to show all students enrolled in a specific course with exam eligibility"""
+    programme = get_object_or_404(Programme, id=programme_id)
+    course = get_object_or_404(Course, id=course_id)
+    semester = get_object_or_404(Semester, id=semester_id)
+    
+    # Get lecturer assignment
+    lecturer_assignment = LecturerCourseAssignment.objects.filter(
+        course=course,
+        academic_year=semester.academic_year,
+        semester=semester,
+        is_active=True
+    ).select_related('lecturer__user').first()
+    
+    # Get all enrolled students for this course
+    enrollments = Enrollment.objects.filter(
+        course=course,
+        semester=semester,
+        is_active=True,
+        student__programme=programme
+    ).select_related(
+        'student__user', 'student__programme'
+    ).prefetch_related(
+        'student__fee_payments'
+    )
+    
+    # Get fee structure for the semester
+    fee_structure = FeeStructure.objects.filter(
+        programme=programme,
+        academic_year=semester.academic_year,
+        semester=semester.semester_number
+    ).first()
+    
+    # Process student eligibility
+    students_data = []
+    eligible_count = 0
+    ineligible_count = 0
+    
+    for enrollment in enrollments:
+        student = enrollment.student
+        
+        # Calculate fee payment status
+        total_paid = 0
+        if fee_structure:
+            payments = FeePayment.objects.filter(
+                student=student,
+                fee_structure=fee_structure,
+                payment_status='completed'
+            ).aggregate(total=Sum('amount_paid'))['total'] or 0
+            total_paid = payments
+            
+            required_fee = fee_structure.net_fee()
+            fee_balance = required_fee - total_paid
+            is_eligible = fee_balance <= 0  # Eligible if no outstanding balance
+        else:
+            required_fee = 0
+            fee_balance = 0
+            is_eligible = True  # If no fee structure, assume eligible
+        
+        if is_eligible:
+            eligible_count += 1
+        else:
+            ineligible_count += 1
+        
+        student_data = {
+            'enrollment': enrollment,
+            'student': student,
+            'total_paid': total_paid,
+            'required_fee': fee_structure.net_fee() if fee_structure else 0,
+            'fee_balance': fee_balance,
+            'is_eligible': is_eligible,
+        }
+        students_data.append(student_data)
+    
+    # Sort by eligibility first, then by student name
+    students_data.sort(key=lambda x: (not x['is_eligible'], x['student'].user.get_full_name()))
+    
+    context = {
+        'programme': programme,
+        'course': course,
+        'semester': semester,
+        'lecturer_assignment': lecturer_assignment,
+        'students_data': students_data,
+        'fee_structure': fee_structure,
+        'eligible_count': eligible_count,
+        'ineligible_count': ineligible_count,
+        'total_students': len(students_data),
+        'page_title': f'Exam Eligibility - {course.name}',
+    }
+    
+    return render(request, 'exams/course_exam_students_list.html', context)
+
+
+@login_required
+def get_academic_year_courses(request, programme_id, academic_year_id, year, semester_num):
+    """AJAX endpoint to get courses for a specific year and semester"""
+    programme = get_object_or_404(Programme, id=programme_id)
+    academic_year = get_object_or_404(AcademicYear, id=academic_year_id)
+    
+    # Get semester
+    semester = get_object_or_404(Semester, 
+        academic_year=academic_year, 
+        semester_number=semester_num
+    )
+    
+    # Get courses for this programme, year, and semester
+    courses = Course.objects.filter(
+        course_programmes__programme=programme,
+        course_programmes__year=year,
+        course_programmes__semester=semester_num,
+        course_programmes__is_active=True
+    ).select_related('department').distinct()
+    
+    courses_data = []
+    for course in courses:
+        # Get lecturer assignment
+        lecturer_assignment = LecturerCourseAssignment.objects.filter(
+            course=course,
+            academic_year=academic_year,
+            semester=semester,
+            is_active=True
+        ).select_related('lecturer__user').first()
+        
+        # Get enrollment count
+        enrollment_count = Enrollment.objects.filter(
+            course=course,
+            semester=semester,
+            student__programme=programme,
+            student__current_year=year,
+            is_active=True
+        ).count()
+        
+        # Calculate eligible students count
+        enrollments = Enrollment.objects.filter(
+            course=course,
+            semester=semester,
+            student__programme=programme,
+            student__current_year=year,
+            is_active=True
+        ).select_related('student')
+        
+        eligible_count = 0
+        fee_structure = FeeStructure.objects.filter(
+            programme=programme,
+            academic_year=academic_year,
+            year=year,
+            semester=semester_num
+        ).first()
+        
+        if fee_structure:
+            for enrollment in enrollments:
+                payments = FeePayment.objects.filter(
+                    student=enrollment.student,
+                    fee_structure=fee_structure,
+                    payment_status='completed'
+                ).aggregate(total=Sum('amount_paid'))['total'] or 0
+                
+                fee_balance = fee_structure.net_fee() - payments
+                if fee_balance <= 0:
+                    eligible_count += 1
+        else:
+            eligible_count = enrollment_count  # If no fee structure, all are eligible
+        
+        course_data = {
+            'id': course.id,
+            'code': course.code,
+            'name': course.name,
+            'credit_hours': course.credit_hours,
+            'course_type': course.get_course_type_display(),
+            'lecturer_name': lecturer_assignment.lecturer.user.get_full_name() if lecturer_assignment else 'Not Assigned',
+            'lecturer_id': lecturer_assignment.lecturer.id if lecturer_assignment else None,
+            'enrollment_count': enrollment_count,
+            'eligible_count': eligible_count,
+            'ineligible_count': enrollment_count - eligible_count,
+        }
+        courses_data.append(course_data)
+    
+    return JsonResponse({
+        'courses': courses_data,
+        'semester_id': semester.id,
+        'year': year,
+        'semester_number': semester_num
+    })
+
+
+@login_required
+@user_passes_test(is_admin_registrar_dean_or_superuser)
+def student_search(request):
+    """Search for students by ID or name"""
+    students = []
+    search_query = ''
+    
+    if request.method == 'GET' and request.GET.get('q'):
+        search_query = request.GET.get('q', '').strip()
+        
+        if search_query:
+            from ..people_search import search_profiles
+            students = search_profiles(
+                Student.objects.select_related(
+                    'user', 'programme', 'programme__department', 'programme__faculty'
+                ),
+                search_query, 'student', limit=20
+            )
+    
+    context = {
+        'students': students,
+        'search_query': search_query,
+    }
+    return render(request, 'admin/student_search.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_registrar_dean_or_superuser)
+def admin_student_transcript(request, student_id):
+    """Display detailed student transcript"""
+    student = get_object_or_404(Student, student_id=student_id)
+    
+    # Get all enrollments grouped by academic year and semester
+    enrollments = Enrollment.objects.filter(
+        student=student
+    ).select_related(
+        'course', 'semester', 'semester__academic_year', 'lecturer', 'lecturer__user'
+    ).prefetch_related('grade').order_by(
+        'semester__academic_year__start_date', 'semester__semester_number', 'course__name'
+    )
+    
+    # Group enrollments by academic year and semester
+    transcript_data = {}
+    total_credit_hours = 0
+    total_quality_points = Decimal('0.00')
+    passed_units = 0
+    failed_units = 0
+    semester_gpas = []
+    
+    for enrollment in enrollments:
+        year_key = enrollment.semester.academic_year.year
+        semester_key = enrollment.semester.semester_number
+        
+        if year_key not in transcript_data:
+            transcript_data[year_key] = {}
+        if semester_key not in transcript_data[year_key]:
+            transcript_data[year_key][semester_key] = {
+                'enrollments': [],
+                'semester_credits': 0,
+                'semester_quality_points': Decimal('0.00'),
+                'semester_gpa': Decimal('0.00')
+            }
+        
+        # Add enrollment with grade info
+        enrollment_data = {
+            'enrollment': enrollment,
+            'course': enrollment.course,
+            'grade_obj': getattr(enrollment, 'grade', None),
+            'grade': getattr(enrollment, 'grade', None).grade if hasattr(enrollment, 'grade') else 'N/A',
+            'grade_points': getattr(enrollment, 'grade', None).grade_points if hasattr(enrollment, 'grade') else 0,
+            'quality_points': getattr(enrollment, 'grade', None).quality_points if hasattr(enrollment, 'grade') else 0,
+            'is_passed': getattr(enrollment, 'grade', None).is_passed if hasattr(enrollment, 'grade') else False,
+        }
+        
+        transcript_data[year_key][semester_key]['enrollments'].append(enrollment_data)
+        
+        # Calculate semester totals
+        if hasattr(enrollment, 'grade') and enrollment.grade.quality_points:
+            transcript_data[year_key][semester_key]['semester_credits'] += enrollment.course.credit_hours
+            transcript_data[year_key][semester_key]['semester_quality_points'] += enrollment.grade.quality_points
+            
+            total_credit_hours += enrollment.course.credit_hours
+            total_quality_points += enrollment.grade.quality_points
+            
+            if enrollment.grade.is_passed:
+                passed_units += 1
+            else:
+                failed_units += 1
+    
+    # Calculate semester GPAs
+    for year in transcript_data:
+        for semester in transcript_data[year]:
+            semester_data = transcript_data[year][semester]
+            if semester_data['semester_credits'] > 0:
+                semester_gpa = semester_data['semester_quality_points'] / semester_data['semester_credits']
+                semester_data['semester_gpa'] = semester_gpa.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                semester_gpas.append(semester_gpa)
+    
+    # Calculate overall GPA
+    overall_gpa = Decimal('0.00')
+    if total_credit_hours > 0:
+        overall_gpa = (total_quality_points / total_credit_hours).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    
+    # Determine class/honors based on GPA
+    graduation_class = get_graduation_class(overall_gpa)
+    
+    # Check if student has completed programme
+    programme_completed = check_programme_completion(student, total_credit_hours, passed_units)
+    
+    context = {
+        'student': student,
+        'transcript_data': transcript_data,
+        'overall_gpa': overall_gpa,
+        'total_credit_hours': total_credit_hours,
+        'total_quality_points': total_quality_points,
+        'passed_units': passed_units,
+        'failed_units': failed_units,
+        'total_units': passed_units + failed_units,
+        'graduation_class': graduation_class,
+        'programme_completed': programme_completed,
+        'semester_gpas': semester_gpas,
+    }
+    
+    return render(request, 'admin/admin_student_transcript.html', context)
+
+
+def calculate_transcript_data(enrollments, student):
+    """Helper function to calculate transcript data and statistics"""
+    transcript_data = {}
+    total_credit_hours = 0
+    total_quality_points = Decimal('0.00')
+    passed_units = 0
+    failed_units = 0
+    
+    for enrollment in enrollments:
+        year_key = enrollment.semester.academic_year.year
+        semester_key = enrollment.semester.semester_number
+        
+        if year_key not in transcript_data:
+            transcript_data[year_key] = {}
+        if semester_key not in transcript_data[year_key]:
+            transcript_data[year_key][semester_key] = {
+                'enrollments': [],
+                'semester_credits': 0,
+                'semester_quality_points': Decimal('0.00'),
+                'semester_gpa': Decimal('0.00')
+            }
+        
+        # Add enrollment data
+        grade_obj = getattr(enrollment, 'grade', None)
+        enrollment_data = {
+            'enrollment': enrollment,
+            'course': enrollment.course,
+            'grade_obj': grade_obj,
+            'grade': grade_obj.grade if grade_obj else 'N/A',
+            'grade_points': grade_obj.grade_points if grade_obj else 0,
+            'quality_points': grade_obj.quality_points if grade_obj else 0,
+            'is_passed': grade_obj.is_passed if grade_obj else False,
+        }
+        
+        transcript_data[year_key][semester_key]['enrollments'].append(enrollment_data)
+        
+        # Calculate totals
+        if grade_obj and grade_obj.quality_points:
+            transcript_data[year_key][semester_key]['semester_credits'] += enrollment.course.credit_hours
+            transcript_data[year_key][semester_key]['semester_quality_points'] += grade_obj.quality_points
+            
+            total_credit_hours += enrollment.course.credit_hours
+            total_quality_points += grade_obj.quality_points
+            
+            if grade_obj.is_passed:
+                passed_units += 1
+            else:
+                failed_units += 1
+    
+    # Calculate semester GPAs
+    for year in transcript_data:
+        for semester in transcript_data[year]:
+            semester_data = transcript_data[year][semester]
+            if semester_data['semester_credits'] > 0:
+                semester_gpa = semester_data['semester_quality_points'] / semester_data['semester_credits']
+                semester_data['semester_gpa'] = semester_gpa.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    
+    # Calculate overall GPA
+    overall_gpa = Decimal('0.00')
+    if total_credit_hours > 0:
+        overall_gpa = (total_quality_points / total_credit_hours).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    
+    # Determine graduation class and programme completion
+    graduation_class = get_graduation_class(overall_gpa)
+    programme_completed = check_programme_completion(student, total_credit_hours, passed_units)
+    
+    stats = {
+        'total_credit_hours': total_credit_hours,
+        'total_quality_points': total_quality_points,
+        'passed_units': passed_units,
+        'failed_units': failed_units,
+        'overall_gpa': overall_gpa,
+        'graduation_class': graduation_class,
+        'programme_completed': programme_completed
+    }
+    
+    return transcript_data, stats
+
+
+def get_graduation_class(gpa):
+    """Determine graduation class based on GPA"""
+    gpa = float(gpa)
+    if gpa >= 3.7:
+        return "First Class Honors"
+    elif gpa >= 3.3:
+        return "Second Class Honors (Upper Division)"
+    elif gpa >= 2.7:
+        return "Second Class Honors (Lower Division)"
+    elif gpa >= 2.0:
+        return "Third Class Honors"
+    elif gpa >= 1.0:
+        return "Pass"
+    else:
+        return "Fail"
+
+
+def check_programme_completion(student, total_credit_hours, passed_units):
+    """Check if student has completed their programme requirements"""
+    programme = student.programme
+    required_credits = programme.credit_hours_required
+    
+    # Simple check - can be enhanced with more complex logic
+    return total_credit_hours >= required_credits and passed_units > 0
+
+
+def get_grading_system():
+    """Return grading system for display in transcript"""
+    return [
+        {'grade': 'A+', 'points': '4.0', 'percentage': '90-100'},
+        {'grade': 'A', 'points': '4.0', 'percentage': '80-89'},
+        {'grade': 'A-', 'points': '3.7', 'percentage': '75-79'},
+        {'grade': 'B+', 'points': '3.3', 'percentage': '70-74'},
+        {'grade': 'B', 'points': '3.0', 'percentage': '65-69'},
+        {'grade': 'B-', 'points': '2.7', 'percentage': '60-64'},
+        {'grade': 'C+', 'points': '2.3', 'percentage': '55-59'},
+        {'grade': 'C', 'points': '2.0', 'percentage': '50-54'},
+        {'grade': 'C-', 'points': '1.7', 'percentage': '45-49'},
+        {'grade': 'D+', 'points': '1.3', 'percentage': '40-44'},
+        {'grade': 'D', 'points': '1.0', 'percentage': '35-39'},
+        {'grade': 'F', 'points': '0.0', 'percentage': 'Below 35'},
+    ]
+
+
+@login_required
+def course_list(request):
+    """View to list all courses with search and filter functionality"""
+    courses = Course.objects.select_related('department', 'department__faculty').annotate(
+        programme_count=Count('course_programmes'),
+        enrollment_count=Count('enrollments')
+    ).order_by('name')
+    
+    # Search functionality
+    search_query = request.GET.get('search', '')
+    if search_query:
+        courses = courses.filter(
+            Q(name__icontains=search_query) |
+            Q(code__icontains=search_query) |
+            Q(department__name__icontains=search_query) |
+            Q(department__faculty__name__icontains=search_query)
+        )
+    
+    # Filter by department
+    selected_department = request.GET.get('department', '')
+    if selected_department:
+        courses = courses.filter(department_id=selected_department)
+    
+    # Filter by course level
+    selected_level = request.GET.get('level', '')
+    if selected_level:
+        courses = courses.filter(level=selected_level)
+    
+    # Filter by course type
+    selected_type = request.GET.get('course_type', '')
+    if selected_type:
+        courses = courses.filter(course_type=selected_type)
+    
+    # Filter by active status
+    status_filter = request.GET.get('status', '')
+    if status_filter == 'active':
+        courses = courses.filter(is_active=True)
+    elif status_filter == 'inactive':
+        courses = courses.filter(is_active=False)
+    
+    # Pagination
+    paginator = Paginator(courses, 12)  # 12 courses per page
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Get filter options
+    departments = Department.objects.filter(is_active=True).order_by('name')
+    course_levels = Course.COURSE_LEVELS
+    course_types = Course.COURSE_TYPES
+    
+    context = {
+        'page_obj': page_obj,
+        'search_query': search_query,
+        'selected_department': selected_department,
+        'selected_level': selected_level,
+        'selected_type': selected_type,
+        'status_filter': status_filter,
+        'departments': departments,
+        'course_levels': course_levels,
+        'course_types': course_types,
+        'total_courses': courses.count(),
+    }
+    
+    return render(request, 'courses/course_list.html', context)
+
+
+@login_required
+def course_detail(request, course_id):
+    """View to display detailed information about a specific course"""
+    course = get_object_or_404(Course.objects.select_related(
+        'department', 'department__faculty'
+    ).prefetch_related('prerequisites', 'prerequisite_for'), id=course_id)
+    
+    # Get programmes using this course
+    programme_courses = ProgrammeCourse.objects.filter(
+        course=course, is_active=True
+    ).select_related('programme').order_by('programme__name')
+    
+    # Get current enrollments
+    current_enrollments = course.enrollments.filter(is_active=True).count()
+    
+    # Get prerequisites and courses this is prerequisite for
+    prerequisites = course.prerequisites.all()
+    prerequisite_for = course.prerequisite_for.all()
+    
+    context = {
+        'course': course,
+        'programme_courses': programme_courses,
+        'current_enrollments': current_enrollments,
+        'prerequisites': prerequisites,
+        'prerequisite_for': prerequisite_for,
+    }
+    
+    return render(request, 'courses/course_detail.html', context)
+
+
+@login_required
+def add_course(request):
+    """View to add a new course"""
+    if request.method == 'POST':
+        form = CourseForm(request.POST)
+        if form.is_valid():
+            course = form.save()
+            messages.success(request, f'Course "{course.name}" has been successfully created.')
+            return redirect('course_detail', course.id)
+        else:
+            messages.error(request, 'There were errors in the form. Please correct them and try again.')
+    else:
+        form = CourseForm()
+    
+    context = {
+        'form': form,
+        'departments': Department.objects.filter(is_active=True).order_by('name'),
+        'course_types': Course.COURSE_TYPES,
+        'course_levels': Course.COURSE_LEVELS,
+    }
+    
+    return render(request, 'courses/add_course.html', context)
+
+
+@login_required
+def edit_course(request, course_id):
+    """View to edit an existing course"""
+    course = get_object_or_404(Course, id=course_id)
+    
+    if request.method == 'POST':
+        form = CourseForm(request.POST, instance=course)
+        if form.is_valid():
+            updated_course = form.save()
+            messages.success(request, f'Course "{updated_course.name}" has been successfully updated.')
+            return redirect('course_detail', updated_course.id)
+        else:
+            messages.error(request, 'There were errors in the form. Please correct them and try again.')
+    else:
+        form = CourseForm(instance=course)
+    
+    context = {
+        'form': form,
+        'course': course,
+        'departments': Department.objects.filter(is_active=True).order_by('name'),
+        'course_types': Course.COURSE_TYPES,
+        'course_levels': Course.COURSE_LEVELS,
+        'is_editing': True,
+    }
+    
+    return render(request, 'courses/edit_course.html', context)
+
+
+@login_required
+def delete_course(request, course_id):
+    """View to delete a course"""
+    course = get_object_or_404(Course, id=course_id)
+    
+    if request.method == 'POST':
+        course_name = course.name
+        course.delete()
+        messages.success(request, f'Course "{course_name}" has been successfully deleted.')
+        return redirect('course_list')
+    
+    # Check if course has dependencies
+    programme_count = course.course_programmes.count()
+    enrollment_count = course.enrollments.count()
+    prerequisite_count = course.prerequisite_for.count()
+    
+    context = {
+        'course': course,
+        'programme_count': programme_count,
+        'enrollment_count': enrollment_count,
+        'prerequisite_count': prerequisite_count,
+        'has_dependencies': programme_count > 0 or enrollment_count > 0 or prerequisite_count > 0,
+    }
+    
+    return render(request, 'courses/delete_course.html', context)
@@ -0,0 +1,2035 @@
+# administration.py - Admin dashboard, student/lecturer/staff records,
+# semester reporting and the admin profile
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+import json
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth.hashers import make_password
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import transaction
+from django.db.models import Avg, Count, Prefetch, Q
+from django.db.models.functions import Extract
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods, require_POST
+
+from .. import reference_data, role_context
+from ..forms import LecturerForm, StudentForm, UserForm
+from ..models import (
+    AcademicYear, ActivityLog, Course, Department, Enrollment, Faculty, FeePayment, Grade,
+    Lecturer, PageVisit, Programme, Semester, Staff, Student, StudentReporting, User, UserSession,
+)
+from ..reference_data import pick, reference_endpoint
+from .common import is_admin, is_administrative_staff
+
+
+@login_required
+@user_passes_test(is_admin)
+def admin_dashboard(request):
+    """
+    Admin dashboard with comprehensive statistics and charts
+    """
+    # Helper function to normalize datetime timezone awareness
+    def normalize_datetime(dt):
+        """Ensure datetime is timezone-aware"""
+        if dt is None:
+            return timezone.now()
+        if timezone.is_naive(dt):
+            return timezone.make_aware(dt)
+        return dt
+    
+    def date_to_aware_datetime(date_obj):
+        """Convert date to timezone-aware datetime"""
+        if date_obj is None:
+            return timezone.now()
+        if isinstance(date_obj, datetime):
+            return normalize_datetime(date_obj)
+        # Convert date to datetime at start of day, then make timezone-aware
+        dt = datetime.combine(date_obj, datetime.min.time())
+        return timezone.make_aware(dt)
+    
+    # Get current date and academic year
+    current_date = timezone.now().date()
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Basic User Statistics
+    total_users = User.objects.count()
+    active_users = User.objects.filter(is_active=True).count()
+    new_users_today = User.objects.filter(created_at__date=current_date).count()
+    
+    # Student Statistics
+    total_students = Student.objects.count()
+    active_students = Student.objects.filter(status='active').count()
+    new_students_today = Student.objects.filter(
+        user__created_at__date=current_date
+    ).count()
+    
+    # Faculty Statistics
+    total_lecturers = Lecturer.objects.count()
+    active_lecturers = Lecturer.objects.filter(is_active=True).count()
+    
+    # Staff Statistics
+    total_staff = Staff.objects.count()
+    active_staff = Staff.objects.filter(is_active=True).count()
+    
+    # Academic Overview
+    total_faculties = Faculty.objects.filter(is_active=True).count()
+    total_departments = Department.objects.filter(is_active=True).count()
+    total_programmes = Programme.objects.filter(is_active=True).count()
+    total_courses = Course.objects.filter(is_active=True).count()
+    
+    # Add these missing variables for the template
+    total_schools = Faculty.objects.filter(is_active=True).count()  # Assuming Faculty = Schools
+    total_units = Course.objects.filter(is_active=True).count()  # Assuming Course = Units
+    active_placements = 0  # You'll need to define this based on your placement model
+    completed_placements = 0  # You'll need to define this based on your placement model
+    total_fee_payments = 0  # You'll need to define this based on your payment model
+    today_fee_payments = 0  # You'll need to define this based on your payment model
+    recent_payments = []  # You'll need to define this based on your payment model
+    
+    # Enrollment Statistics
+    if current_semester:
+        current_enrollments = Enrollment.objects.filter(
+            semester=current_semester,
+            is_active=True
+        ).count()
+        
+        today_enrollments = Enrollment.objects.filter(
+            enrollment_date=current_date,
+            is_active=True
+        ).count()
+    else:
+        current_enrollments = 0
+        today_enrollments = 0
+    
+    # Gender Distribution Data for Donut Chart
+    gender_data = Student.objects.filter(status='active').values(
+        'user__gender'
+    ).annotate(count=Count('id'))
+    
+    gender_chart_data = {
+        'labels': [],
+        'data': [],
+        'colors': ['#FF6384', '#36A2EB', '#FFCE56']
+    }
+    
+    for item in gender_data:
+        gender = item['user__gender']
+        if gender == 'male':
+            gender_chart_data['labels'].append('Male')
+            gender_chart_data['data'].append(item['count'])
+        elif gender == 'female':
+            gender_chart_data['labels'].append('Female')
+            gender_chart_data['data'].append(item['count'])
+        elif gender == 'other':
+            gender_chart_data['labels'].append('Other')
+            gender_chart_data['data'].append(item['count'])
+    
+    # Student Admission Trends (Bar Chart) - Last 5 years
+    current_year = current_date.year
+    admission_years = []
+    admission_counts = []
+    
+    for year in range(current_year - 4, current_year + 1):
+        year_start = datetime(year, 1, 1).date()
+        year_end = datetime(year, 12, 31).date()
+        count = Student.objects.filter(
+            admission_date__range=[year_start, year_end]
+        ).count()
+        admission_years.append(str(year))
+        admission_counts.append(count)
+    
+    admission_trend_data = {
+        'labels': admission_years,
+        'data': admission_counts
+    }
+    
+    # FIXED: Student Enrollment by Programme (Horizontal Bar Chart)
+    try:
+        programme_enrollment = Programme.objects.filter(
+            is_active=True
+        ).annotate(
+            student_count=Count('students', filter=Q(students__status='active'))
+        ).order_by('-student_count')[:10]
+        
+        programme_chart_data = {
+            'labels': [p.name[:25] + '...' if len(p.name) > 25 else p.name 
+                      for p in programme_enrollment],
+            'data': [p.student_count for p in programme_enrollment]
+        }
+        
+        # Ensure we have data, if not provide default
+        if not programme_chart_data['labels']:
+            programme_chart_data = {
+                'labels': ['No Data Available'],
+                'data': [0]
+            }
+    except Exception as e:
+        programme_chart_data = {
+            'labels': ['No Data Available'],
+            'data': [0]
+        }
+    
+    # FIXED: Student Reporting in Last 6 Semesters
+    try:
+        last_6_semesters = Semester.objects.order_by('-academic_year__start_date', '-semester_number')[:6]
+        reporting_data = []
+        
+        if last_6_semesters.exists():
+            for semester in last_6_semesters:
+                # Get total students who should report for this semester
+                total_expected = Student.objects.filter(
+                    status='active',
+                    admission_date__lte=semester.end_date if hasattr(semester, 'end_date') else current_date
+                ).count()
+                
+                # Get students who actually reported
+                try:
+                    reported = StudentReporting.objects.filter(
+                        semester=semester,
+                        status='approved'
+                    ).count()
+                except:
+                    # If StudentReporting model doesn't exist or has different structure
+                    # Use enrollment as a proxy for reporting
+                    reported = Enrollment.objects.filter(
+                        semester=semester,
+                        is_active=True
+                    ).count()
+                
+                reporting_data.append({
+                    'semester': f"{semester.academic_year.year} S{semester.semester_number}",
+                    'reported': reported,
+                    'expected': total_expected,
+                    'percentage': round((reported/total_expected * 100) if total_expected > 0 else 0, 1)
+                })
+        
+        # Reverse to show chronologically
+        reporting_data = list(reversed(reporting_data))
+        
+        reporting_chart_data = {
+            'labels': [item['semester'] for item in reporting_data],
+            'reported': [item['reported'] for item in reporting_data],
+            'expected': [item['expected'] for item in reporting_data],
+            'percentages': [item['percentage'] for item in reporting_data]
+        }
+        
+        # Ensure we have data
+        if not reporting_chart_data['labels']:
+            reporting_chart_data = {
+                'labels': ['No Data Available'],
+                'reported': [0],
+                'expected': [0],
+                'percentages': [0]
+            }
+            
+    except Exception as e:
+        print(f"Error in reporting data: {e}")  # For debugging
+        reporting_chart_data = {
+            'labels': ['No Data Available'],
+            'reported': [0],
+            'expected': [0],
+            'percentages': [0]
+        }
+    
+    # Course Enrollment Trends (Last 12 months)
+    twelve_months_ago = current_date - timedelta(days=365)
+    try:
+        monthly_enrollments = Enrollment.objects.filter(
+            enrollment_date__gte=twelve_months_ago,
+            is_active=True
+        ).extra(
+            select={'month': "strftime('%%Y-%%m', enrollment_date)"}
+        ).values('month').annotate(
+            enrollment_count=Count('id')
+        ).order_by('month')
+        
+        enrollment_labels = []
+        enrollment_counts = []
+        
+        for enrollment in monthly_enrollments:
+            if enrollment['month']:  # Check if month is not None
+                try:
+                    month_year = datetime.strptime(enrollment['month'], '%Y-%m')
+                    enrollment_labels.append(month_year.strftime('%b %Y'))
+                    enrollment_counts.append(enrollment['enrollment_count'])
+                except ValueError:
+                    continue  # Skip invalid date formats
+        
+        enrollment_trend_data = {
+            'labels': enrollment_labels,
+            'data': enrollment_counts
+        }
+        
+        # Ensure we have data
+        if not enrollment_trend_data['labels']:
+            enrollment_trend_data = {
+                'labels': ['No Data Available'],
+                'data': [0]
+            }
+    except Exception as e:
+        enrollment_trend_data = {
+            'labels': ['No Data Available'],
+            'data': [0]
+        }
+    
+    # Programme Performance (Average GPA by Programme)
+    programme_performance = []
+    for programme in Programme.objects.filter(is_active=True)[:10]:
+        avg_gpa = Grade.objects.filter(
+            enrollment__student__programme=programme,
+            is_passed=True
+        ).aggregate(avg_gpa=Avg('grade_points'))['avg_gpa']
+        
+        if avg_gpa:
+            programme_performance.append({
+                'programme': programme.name[:25] + '...' if len(programme.name) > 25 else programme.name,
+                'avg_gpa': float(avg_gpa)
+            })
+    
+    programme_performance.sort(key=lambda x: x['avg_gpa'], reverse=True)
+    
+    performance_chart_data = {
+        'labels': [item['programme'] for item in programme_performance],
+        'data': [item['avg_gpa'] for item in programme_performance]
+    }
+    
+    # Department wise student distribution
+    department_data = Department.objects.filter(is_active=True).annotate(
+        student_count=Count('programmes__students', filter=Q(programmes__students__status='active'))
+    ).order_by('-student_count')[:8]
+    
+    department_chart_data = {
+        'labels': [dept.name[:20] + '...' if len(dept.name) > 20 else dept.name 
+                  for dept in department_data],
+        'data': [dept.student_count for dept in department_data]
+    }
+    
+    # Programme type distribution
+    programme_type_data = Programme.objects.filter(is_active=True).values(
+        'programme_type'
+    ).annotate(count=Count('id'))
+    
+    programme_type_chart_data = {
+        'labels': [item['programme_type'].replace('_', ' ').title() for item in programme_type_data],
+        'data': [item['count'] for item in programme_type_data],
+        'colors': ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', '#FF9F40']
+    }
+    
+    # Recent Activities (Student Registrations, Enrollments, etc.) - ALL TIMEZONE-AWARE
+    recent_activities = []
+    
+    # Recent student registrations
+    recent_students = Student.objects.select_related('user', 'programme').order_by('-user__created_at')[:5]
+    for student in recent_students:
+        created_at = normalize_datetime(student.user.created_at)
+        activity_date = created_at.date()
+        
+        recent_activities.append({
+            'type': 'student_registration',
+            'message': f"New student {student.user.get_full_name()} registered for {student.programme.name}",
+            'date': activity_date,
+            'datetime': created_at,  # timezone-aware
+            'icon': 'fa-user-plus',
+            'color': 'success'
+        })
+    
+    # Recent enrollments
+    recent_enrollments = Enrollment.objects.select_related(
+        'student__user', 'course'
+    ).order_by('-enrollment_date')[:5]
+    for enrollment in recent_enrollments:
+        # Convert enrollment date to timezone-aware datetime
+        activity_datetime = date_to_aware_datetime(enrollment.enrollment_date)
+        
+        recent_activities.append({
+            'type': 'course_enrollment',
+            'message': f"{enrollment.student.user.get_full_name()} enrolled in {enrollment.course.name}",
+            'date': enrollment.enrollment_date,
+            'datetime': activity_datetime,  # timezone-aware
+            'icon': 'fa-book',
+            'color': 'info'
+        })
+    
+    # Recent grade entries
+    recent_grades = Grade.objects.select_related(
+        'enrollment__student__user', 'enrollment__course'
+    ).order_by('-id')[:5]
+    current_datetime = timezone.now()  # already timezone-aware
+    for grade in recent_grades:
+        if grade.grade:
+            recent_activities.append({
+                'type': 'grade_entry',
+                'message': f"Grade {grade.grade} recorded for {grade.enrollment.student.user.get_full_name()} in {grade.enrollment.course.code}",
+                'date': current_datetime.date(),
+                'datetime': current_datetime,  # timezone-aware
+                'icon': 'fa-star',
+                'color': 'warning'
+            })
+    
+    # Sort activities by datetime (now all are consistently timezone-aware)
+    try:
+        recent_activities.sort(key=lambda x: x['datetime'], reverse=True)
+        recent_activities = recent_activities[:10]
+    except Exception as e:
+        # If sorting still fails, just take first 10 without sorting
+        recent_activities = recent_activities[:10]
+
+    # Top Performing Students (by GPA)
+    top_students = []
+    try:
+        active_students = Student.objects.filter(status='active').select_related('user')[:50]
+
+        for student in active_students:
+            avg_gpa = Grade.objects.filter(
+                enrollment__student=student,
+                is_passed=True
+            ).aggregate(avg_gpa=Avg('grade_points'))['avg_gpa']
+            
+            if avg_gpa and avg_gpa > 0:
+                top_students.append({
+                    'student': student,
+                    'gpa': round(float(avg_gpa), 2)  # Round to 2 decimal places
+                })
+
+        # Sort top students by GPA
+        top_students.sort(key=lambda x: x['gpa'], reverse=True)
+        top_students = top_students[:10]  # Limit to top 10
+    except Exception as e:
+        top_students = []
+    
+    # Grade distribution
+    try:
+        grade_distribution = Grade.objects.filter(
+            grade__isnull=False
+        ).exclude(grade__in=['I', 'W']).values('grade').annotate(
+            count=Count('id')
+        ).order_by('grade')
+        
+        grade_chart_data = {
+            'labels': [item['grade'] for item in grade_distribution],
+            'data': [item['count'] for item in grade_distribution]
+        }
+    except Exception as e:
+        grade_chart_data = {
+            'labels': [],
+            'data': []
+        }
+    
+    # User type distribution
+    try:
+        user_type_data = User.objects.filter(is_active=True).values(
+            'user_type'
+        ).annotate(count=Count('id'))
+        
+        user_type_chart_data = {
+            'labels': [item['user_type'].replace('_', ' ').title() for item in user_type_data],
+            'data': [item['count'] for item in user_type_data],
+            'colors': ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', '#FF9F40', '#FF6384', '#36A2EB']
+        }
+    except Exception as e:
+        user_type_chart_data = {
+            'labels': [],
+            'data': [],
+            'colors': []
+        }
+    
+    context = {
+        'current_date': current_date,
+        'current_academic_year': current_academic_year,
+        'current_semester': current_semester,
+        
+        # Basic Statistics
+        'total_users': total_users,
+        'active_users': active_users,
+        'new_users_today': new_users_today,
+        'total_students': total_students,
+        'active_students': active_students,
+        'new_students_today': new_students_today,
+        'total_lecturers': total_lecturers,
+        'active_lecturers': active_lecturers,
+        'total_staff': total_staff,
+        'active_staff': active_staff,
+        
+        # Academic Overview
+        'total_faculties': total_faculties,
+        'total_departments': total_departments,
+        'total_programmes': total_programmes,
+        'total_courses': total_courses,
+        'current_enrollments': current_enrollments,
+        'today_enrollments': today_enrollments,
+        
+        # Missing template variables
+        'total_schools': total_schools,
+        'total_units': total_units,
+        'active_placements': active_placements,
+        'completed_placements': completed_placements,
+        'total_fee_payments': total_fee_payments,
+        'today_fee_payments': today_fee_payments,
+        'recent_payments': recent_payments,
+        
+        # Chart Data (JSON)
+        'gender_chart_data': json.dumps(gender_chart_data),
+        'admission_trend_data': json.dumps(admission_trend_data),
+        'programme_chart_data': json.dumps(programme_chart_data),
+        'reporting_chart_data': json.dumps(reporting_chart_data),
+        'enrollment_trend_data': json.dumps(enrollment_trend_data),
+        'performance_chart_data': json.dumps(performance_chart_data),
+        'department_chart_data': json.dumps(department_chart_data),
+        'programme_type_chart_data': json.dumps(programme_type_chart_data),
+        'grade_chart_data': json.dumps(grade_chart_data),
+        'user_type_chart_data': json.dumps(user_type_chart_data),
+        
+        # Additional Data
+        'recent_activities': recent_activities,
+        'top_students': top_students,
+        'programme_performance': programme_performance,
+        'reporting_data': reporting_data,
+    }
+    
+    return render(request, 'admin/dashboard.html', context)
+
+
+@login_required
+def student_list(request):
+    """
+    Display a paginated list of students with search and filter functionality
+    """
+    # Get all students with related data to avoid N+1 queries
+    students = Student.objects.select_related(
+        'user', 'programme', 'programme__department'
+    ).all()
+    
+    # Get filter parameters from request
+    search_query = request.GET.get('search', '').strip()
+    status_filter = request.GET.get('status', '')
+    programme_filter = request.GET.get('programme', '')
+    school_filter = request.GET.get('department', '')
+    year_filter = request.GET.get('year', '')
+    semester_filter = request.GET.get('semester', '')
+    admission_type_filter = request.GET.get('admission_type', '')
+    sponsor_type_filter = request.GET.get('sponsor_type', '')
+    
+    # Apply search filter
+    if search_query:
+        from ..people_search import filter_people
+        students = filter_people(students, search_query, 'student')
+    
+    # Apply status filter
+    if status_filter:
+        students = students.filter(status=status_filter)
+    
+    # Apply programme filter
+    if programme_filter:
+        students = students.filter(programme_id=programme_filter)
+    
+    # Apply school filter
+    if school_filter:
+        students = students.filter(programme__school_id=school_filter)
+    
+    # Apply year filter
+    if year_filter:
+        students = students.filter(current_year=year_filter)
+    
+    # Apply semester filter
+    if semester_filter:
+        students = students.filter(current_semester=semester_filter)
+    
+    # Apply admission type filter
+    if admission_type_filter:
+        students = students.filter(admission_type=admission_type_filter)
+    
+    # Apply sponsor type filter
+    if sponsor_type_filter:
+        students = students.filter(sponsor_type=sponsor_type_filter)
+    
+    # Order students by registration number
+    students = students.order_by('-admission_date', 'student_id')
+    
+    # Pagination
+    from ..pagination import KeysetPaginator
+    paginator = KeysetPaginator(students, 20)  # Show 20 students per page
+    page = request.GET.get('page', 1)
+    
+    try:
+        students_page = paginator.page(page)
+    except PageNotAnInteger:
+        students_page = paginator.page(1)
+    except EmptyPage:
+        students_page = paginator.page(paginator.num_pages)
+    
+    # Get data for filter dropdowns
+    status_choices = Student.STATUS_CHOICES
+    programmes = Programme.objects.filter(is_active=True).order_by('name')
+    schools = Department.objects.filter(is_active=True).order_by('name')
+    admission_type_choices = Student.ADMISSION_TYPES
+    sponsor_type_choices = Student.SPONSOR_TYPES
+    
+    # Year and semester choices (based on your model validators)
+    year_choices = [(i, f'Year {i}') for i in range(1, 5)]  # 1-4 years
+    semester_choices = [(i, f'Semester {i}') for i in range(1, 4)]  # 1-3 semesters
+    
+    context = {
+        'students': students_page,
+        'search_query': search_query,
+        'status_filter': status_filter,
+        'programme_filter': programme_filter,
+        'school_filter': school_filter,
+        'year_filter': year_filter,
+        'semester_filter': semester_filter,
+        'admission_type_filter': admission_type_filter,
+        'sponsor_type_filter': sponsor_type_filter,
+        
+        # Filter options
+        'status_choices': status_choices,
+        'programmes': programmes,
+        'schools': schools,
+        'year_choices': year_choices,
+        'semester_choices': semester_choices,
+        'admission_type_choices': admission_type_choices,
+        'sponsor_type_choices': sponsor_type_choices,
+        
+        # Statistics
+        'total_students': students.count(),
+        'active_students': Student.objects.filter(status='active').count(),
+        'graduated_students': Student.objects.filter(status='graduated').count(),
+    }
+    
+    return render(request, 'admin/students/student_list.html', context)
+
+
+@login_required
+def student_detail(request, student_id):
+    """
+    Display detailed information for a specific student
+    """
+    student = get_object_or_404(
+        Student.objects.select_related(
+            'user', 'programme', 'programme__department'
+        ),
+        student_id=student_id
+    )
+    
+    context = {
+        'student': student,
+    }
+    
+    return render(request, 'admin/students/student_detail.html', context)
+
+
+@login_required
+def student_create(request):
+    """
+    Create a new student record
+    """
+    if request.method == 'POST':
+        user_form = UserForm(request.POST, request.FILES)
+        student_form = StudentForm(request.POST)
+        
+        if user_form.is_valid() and student_form.is_valid():
+            try:
+                with transaction.atomic():
+                    # Create user
+                    user = user_form.save(commit=False)
+                    user.user_type = 'student'
+                    
+                    # Set password
+                    password = user_form.cleaned_data.get('password')
+                    if password:
+                        user.password = make_password(password)
+                    
+                    user.save()
+                    
+                    # Create student profile
+                    student = student_form.save(commit=False)
+                    student.user = user
+                    student.save()
+                    
+                    messages.success(request, f'Student {user.get_full_name()} created successfully!')
+                    return redirect('student_list')
+                    
+            except Exception as e:
+                messages.error(request, f'Error creating student: {str(e)}')
+        else:
+            # Add form errors to messages
+            for field, errors in user_form.errors.items():
+                for error in errors:
+                    messages.error(request, f'{field}: {error}')
+            for field, errors in student_form.errors.items():
+                for error in errors:
+                    messages.error(request, f'{field}: {error}')
+    else:
+        user_form = UserForm()
+        student_form = StudentForm()
+    
+    # Get data for form dropdowns
+    programmes = Programme.objects.filter(is_active=True).order_by('name')
+    schools = Department.objects.filter(is_active=True).order_by('name')
+    
+    context = {
+        'user_form': user_form,
+        'student_form': student_form,
+        'action': 'Create',
+        'programmes': programmes,
+        'schools': schools,
+        'status_choices': Student.STATUS_CHOICES,
+        'admission_type_choices': Student.ADMISSION_TYPES,
+        'sponsor_type_choices': Student.SPONSOR_TYPES,
+        'gender_choices': User.GENDER_CHOICES,
+    }
+    
+    return render(request, 'admin/students/student_form.html', context)
+
+
+@login_required
+def student_update(request, student_id):
+    """
+    Update an existing student record
+    """
+    student = get_object_or_404(Student, student_id=student_id)
+    user = student.user
+    
+    if request.method == 'POST':
+        user_form = UserForm(request.POST, request.FILES, instance=user, is_update=True)
+        student_form = StudentForm(request.POST, instance=student)
+        
+        if user_form.is_valid() and student_form.is_valid():
+            try:
+                with transaction.atomic():
+                    # Update user
+                    user = user_form.save(commit=False)
+                    
+                    # Update password if provided
+                    password = user_form.cleaned_data.get('password')
+                    if password:
+                        user.password = make_password(password)
+                    
+                    user.save()
+                    
+                    # Update student profile
+                    student = student_form.save()
+                    
+                    messages.success(request, f'Student {user.get_full_name()} updated successfully!')
+                    return redirect('student_detail', student_id=student_id)
+                    
+            except Exception as e:
+                messages.error(request, f'Error updating student: {str(e)}')
+        else:
+            # Add form errors to messages
+            for field, errors in user_form.errors.items():
+                for error in errors:
+                    messages.error(request, f'{field}: {error}')
+            for field, errors in student_form.errors.items():
+                for error in errors:
+                    messages.error(request, f'{field}: {error}')
+    else:
+        user_form = UserForm(instance=user, is_update=True)
+        student_form = StudentForm(instance=student)
+    
+    # Get data for form dropdowns
+    programmes = Programme.objects.filter(is_active=True).order_by('name')
+    schools = Department.objects.filter(is_active=True).order_by('name')
+    
+    context = {
+        'user_form': user_form,
+        'student_form': student_form,
+        'student': student,
+        'action': 'Update',
+        'programmes': programmes,
+        'schools': schools,
+        'status_choices': Student.STATUS_CHOICES,
+        'admission_type_choices': Student.ADMISSION_TYPES,
+        'sponsor_type_choices': Student.SPONSOR_TYPES,
+        'gender_choices': User.GENDER_CHOICES,
+    }
+    
+    return render(request, 'admin/students/student_form.html', context)
+
+
+@login_required
+@require_http_methods(["POST"])
+def student_delete(request, student_id):
+    """
+    Delete a student record
+    """
+    student = get_object_or_404(Student, student_id=student_id)
+    
+    try:
+        student_name = student.user.get_full_name()
+        student_reg_number = student.student_id
+        
+        # Delete the user account (this will cascade to delete student record)
+        with transaction.atomic():
+            student.user.delete()
+        
+        messages.success(request, f'Student {student_name} ({student_reg_number}) has been deleted successfully!')
+    except Exception as e:
+        messages.error(request, f'Error deleting student: {str(e)}')
+    
+    return redirect('student_list')
+
+
+# Views
+@login_required
+def lecturer_list(request):
+    """List all lecturers with search, filter, and pagination"""
+    lecturers = Lecturer.objects.select_related(
+        'user', 'department', 'department__faculty'
+    ).all()
+    
+    # Search functionality
+    search_query = request.GET.get('search', '')
+    if search_query:
+        from ..people_search import filter_people
+        lecturers = filter_people(lecturers, search_query, 'lecturer')
+    
+    # Filter by faculty
+    faculty_filter = request.GET.get('faculty', '')
+    if faculty_filter:
+        lecturers = lecturers.filter(department__faculty_id=faculty_filter)
+    
+    # Filter by department
+    department_filter = request.GET.get('department', '')
+    if department_filter:
+        lecturers = lecturers.filter(department_id=department_filter)
+    
+    # Filter by academic rank
+    rank_filter = request.GET.get('academic_rank', '')
+    if rank_filter:
+        lecturers = lecturers.filter(academic_rank=rank_filter)
+    
+    # Filter by status
+    status_filter = request.GET.get('status', '')
+    if status_filter:
+        is_active = status_filter == 'active'
+        lecturers = lecturers.filter(is_active=is_active)
+    
+    # Sorting
+    order_by = request.GET.get('order_by', 'employee_number')
+    if order_by:
+        lecturers = lecturers.order_by(order_by)
+    
+    # Pagination
+    paginator = Paginator(lecturers, 20)  # 20 lecturers per page
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Get filter options
+    faculties = Faculty.objects.filter(is_active=True)
+    departments = Department.objects.filter(is_active=True)
+    
+    context = {
+        'lecturers': page_obj,
+        'page_obj': page_obj,
+        'total_lecturers': lecturers.count(),
+        'search_query': search_query,
+        'faculty_filter': faculty_filter,
+        'department_filter': department_filter,
+        'rank_filter': rank_filter,
+        'status_filter': status_filter,
+        'order_by': order_by,
+        'faculties': faculties,
+        'departments': departments,
+        'rank_choices': Lecturer.ACADEMIC_RANKS,
+    }
+    
+    return render(request, 'lecturers/lecturer_list.html', context)
+
+
+@login_required
+def lecturer_create(request):
+    """Create a new lecturer"""
+    if request.method == 'POST':
+        user_form = UserForm(request.POST, request.FILES)
+        lecturer_form = LecturerForm(request.POST)
+        
+        if user_form.is_valid() and lecturer_form.is_valid():
+            try:
+                # Create user
+                user = user_form.save(commit=False)
+                user.user_type = 'lecturer'
+                
+                # Set password if provided
+                password = user_form.cleaned_data.get('password')
+                if password:
+                    user.set_password(password)
+                else:
+                    user.set_password('defaultpassword123')  # Set a default password
+                
+                user.save()
+                
+                # Create lecturer
+                lecturer = lecturer_form.save(commit=False)
+                lecturer.user = user
+                lecturer.save()
+                
+                messages.success(request, f'Lecturer {user.get_full_name()} created successfully!')
+                return redirect('lecturer_detail', employee_number=lecturer.employee_number)
+                
+            except Exception as e:
+                messages.error(request, f'Error creating lecturer: {str(e)}')
+        else:
+            messages.error(request, 'Please correct the errors below.')
+    else:
+        user_form = UserForm()
+        lecturer_form = LecturerForm()
+    
+    context = {
+        'user_form': user_form,
+        'lecturer_form': lecturer_form,
+        'title': 'Add New Lecturer',
+        'departments': Department.objects.filter(is_active=True),
+    }
+    
+    return render(request, 'lecturers/lecturer_form.html', context)
+
+
+@login_required
+def lecturer_update(request, employee_number):
+    """Update lecturer information"""
+    lecturer = get_object_or_404(Lecturer, employee_number=employee_number)
+    
+    if request.method == 'POST':
+        user_form = UserForm(request.POST, request.FILES, instance=lecturer.user)
+        lecturer_form = LecturerForm(request.POST, instance=lecturer)
+        
+        if user_form.is_valid() and lecturer_form.is_valid():
+            try:
+                # Update user
+                user = user_form.save(commit=False)
+                
+                # Update password if provided
+                password = user_form.cleaned_data.get('password')
+                if password:
+                    user.set_password(password)
+                
+                user.save()
+                
+                # Update lecturer
+                lecturer_form.save()
+                
+                messages.success(request, f'Lecturer {user.get_full_name()} updated successfully!')
+                return redirect('lecturer_detail', employee_number=lecturer.employee_number)
+                
+            except Exception as e:
+                messages.error(request, f'Error updating lecturer: {str(e)}')
+        else:
+            messages.error(request, 'Please correct the errors below.')
+    else:
+        user_form = UserForm(instance=lecturer.user)
+        lecturer_form = LecturerForm(instance=lecturer)
+    
+    context = {
+        'user_form': user_form,
+        'lecturer_form': lecturer_form,
+        'lecturer': lecturer,
+        'title': f'Edit Lecturer - {lecturer.user.get_full_name()}',
+        'departments': Department.objects.filter(is_active=True),
+    }
+    
+    return render(request, 'lecturers/lecturer_form.html', context)
+
+
+@login_required
+def lecturer_delete(request, employee_number):
+    """Delete a lecturer"""
+    lecturer = get_object_or_404(Lecturer, employee_number=employee_number)
+    
+    if request.method == 'POST':
+        lecturer_name = lecturer.user.get_full_name()
+        
+        try:
+            # Delete the user (cascade will delete lecturer)
+            lecturer.user.delete()
+            messages.success(request, f'Lecturer {lecturer_name} deleted successfully!')
+        except Exception as e:
+            messages.error(request, f'Error deleting lecturer: {str(e)}')
+    
+    return redirect('lecturer_list')
+
+
+@login_required
+@require_POST
+def lecturer_bulk_action(request):
+    """Handle bulk actions for lecturers"""
+    action = request.POST.get('action')
+    lecturer_ids = request.POST.get('lecturer_ids', '').split(',')
+    lecturer_ids = [id.strip() for id in lecturer_ids if id.strip()]
+    
+    if not action or not lecturer_ids:
+        messages.error(request, 'Invalid action or no lecturers selected.')
+        return redirect('lecturer_list')
+    
+    lecturers = Lecturer.objects.filter(employee_number__in=lecturer_ids)
+    count = lecturers.count()
+    
+    try:
+        if action == 'activate':
+            lecturers.update(is_active=True)
+            role_context.forget(*lecturers.values_list('user_id', flat=True))
+            messages.success(request, f'{count} lecturer(s) activated successfully!')
+            
+        elif action == 'deactivate':
+            lecturers.update(is_active=False)
+            role_context.forget(*lecturers.values_list('user_id', flat=True))
+            messages.success(request, f'{count} lecturer(s) deactivated successfully!')
+            
+        elif action == 'delete':
+            # Delete users (cascade will delete lecturers)
+            user_ids = lecturers.values_list('user_id', flat=True)
+            User.objects.filter(id__in=user_ids).delete()
+            messages.success(request, f'{count} lecturer(s) deleted successfully!')
+            
+        else:
+            messages.error(request, 'Invalid action selected.')
+            
+    except Exception as e:
+        messages.error(request, f'Error performing bulk action: {str(e)}')
+    
+    return redirect('lecturer_list')
+
+
+@login_required
+@csrf_exempt
+def lecturer_toggle_status(request, employee_number):
+    """Toggle lecturer active status via AJAX"""
+    if request.method == 'POST':
+        try:
+            lecturer = get_object_or_404(Lecturer, employee_number=employee_number)
+            lecturer.is_active = not lecturer.is_active
+            lecturer.save()
+            
+            return JsonResponse({
+                'status': 'success',
+                'is_active': lecturer.is_active,
+                'message': f'Lecturer status updated to {"Active" if lecturer.is_active else "Inactive"}'
+            })
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            })
+    
+    return JsonResponse({'status': 'error', 'message': 'Invalid request method'})
+
+
+@login_required
+def staff_list_view(request):
+    """Main staff list page"""
+    # Get filter choices for the template
+    departments = Department.objects.filter(is_active=True).order_by('name')
+    
+    # Get staff statistics
+    total_staff = Staff.objects.count()
+    active_staff = Staff.objects.filter(is_active=True).count()
+    inactive_staff = Staff.objects.filter(is_active=False).count()
+    
+    context = {
+        'total_staff': total_staff,
+        'active_staff': active_staff,
+        'inactive_staff': inactive_staff,
+        'departments': departments,
+    }
+    
+    return render(request, 'staff/staff_list.html', context)
+
+
+@login_required
+def staff_ajax_list(request):
+    """AJAX endpoint for staff data"""
+    try:
+        # Get filter parameters
+        search = request.GET.get('search', '')
+        status = request.GET.get('status', '')
+        department_id = request.GET.get('department', '')
+        category = request.GET.get('category', '')
+        page = request.GET.get('page', 1)
+        per_page = int(request.GET.get('per_page', 10))
+        
+        # Base queryset
+        staff_list = Staff.objects.select_related(
+            'user', 'department'
+        ).all()
+        
+        # Apply filters
+        if search:
+            from ..people_search import filter_people
+            staff_list = filter_people(staff_list, search, 'staff')
+        
+        if status:
+            is_active = status == 'active'
+            staff_list = staff_list.filter(is_active=is_active)
+        
+        if department_id:
+            staff_list = staff_list.filter(department_id=department_id)
+        
+        if category:
+            staff_list = staff_list.filter(staff_category=category)
+        
+        # Order by name
+        staff_list = staff_list.order_by('user__first_name', 'user__last_name')
+        
+        # Pagination; next/previous pages are keyset cursors
+        from ..pagination import KeysetPaginator
+        paginator = KeysetPaginator(staff_list, per_page)
+        page_obj = paginator.get_page(page)
+        
+        # Serialize data
+        staff_data = []
+        for staff in page_obj:
+            profile_picture_url = ''
+            if staff.user.profile_picture:
+                try:
+                    profile_picture_url = staff.user.profile_picture.url
+                except:
+                    profile_picture_url = ''
+            
+            staff_data.append({
+                'id': staff.id,
+                'employee_number': staff.employee_number,
+                'first_name': staff.user.first_name,
+                'last_name': staff.user.last_name,
+                'full_name': staff.user.get_full_name(),
+                'email': staff.user.email or 'No email',
+                'designation': staff.designation,
+                'staff_category': staff.get_staff_category_display(),
+                'staff_category_code': staff.staff_category,
+                'department': staff.department.name if staff.department else 'No Department',
+                'department_id': staff.department.id if staff.department else None,
+                'joining_date': staff.joining_date.strftime('%b %d, %Y'),
+                'is_active': staff.is_active,
+                'status_display': 'Active' if staff.is_active else 'Inactive',
+                'profile_picture': profile_picture_url,
+                'phone': staff.user.phone or '',
+                'address': staff.user.address or '',
+                'gender': staff.user.gender or '',
+                'date_of_birth': staff.user.date_of_birth.strftime('%Y-%m-%d') if staff.user.date_of_birth else '',
+                'national_id': staff.user.national_id or '',
+                'office_location': staff.office_location or '',
+                'job_description': staff.job_description or '',
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'data': staff_data,
+            'pagination': {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'has_previous': page_obj.has_previous(),
+                'has_next': page_obj.has_next(),
+                'previous_page': page_obj.previous_page_number() if page_obj.has_previous() else None,
+                'next_page': page_obj.next_page_number() if page_obj.has_next() else None,
+                'total_items': paginator.count,
+                'start_index': page_obj.start_index(),
+                'end_index': page_obj.end_index(),
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error fetching staff data: {str(e)}'
+        }, status=500)
+
+
+@login_required
+@csrf_exempt
+@require_http_methods(["POST"])
+def staff_create_ajax(request):
+    """AJAX endpoint for creating staff"""
+    try:
+        # Create user first
+        user_data = {
+            'first_name': request.POST.get('first_name'),
+            'last_name': request.POST.get('last_name'),
+            'email': request.POST.get('email'),
+            'username': request.POST.get('email'),  # Use email as username
+            'user_type': 'staff',
+            'phone': request.POST.get('phone', ''),
+            'address': request.POST.get('address', ''),
+            'gender': request.POST.get('gender', ''),
+            'national_id': request.POST.get('national_id', ''),
+        }
+        
+        # Handle date of birth
+        date_of_birth = request.POST.get('date_of_birth')
+        if date_of_birth:
+            user_data['date_of_birth'] = date_of_birth
+        
+        # Create user
+        user = User.objects.create_user(
+            username=user_data['email'],
+            email=user_data['email'],
+            first_name=user_data['first_name'],
+            last_name=user_data['last_name'],
+            user_type=user_data['user_type'],
+            phone=user_data['phone'],
+            address=user_data['address'],
+            gender=user_data['gender'],
+            national_id=user_data['national_id'] if user_data['national_id'] else None,
+        )
+        
+        if date_of_birth:
+            user.date_of_birth = date_of_birth
+            user.save()
+        
+        # Handle profile picture
+        if 'profile_picture' in request.FILES:
+            user.profile_picture = request.FILES['profile_picture']
+            user.save()
+        
+        # Create staff profile
+        staff_data = {
+            'employee_number': request.POST.get('employee_number'),
+            'staff_category': request.POST.get('staff_category'),
+            'designation': request.POST.get('designation'),
+            'joining_date': request.POST.get('joining_date'),
+            'office_location': request.POST.get('office_location', ''),
+            'job_description': request.POST.get('job_description', ''),
+        }
+        
+        # Handle department
+        department_id = request.POST.get('department')
+        if department_id:
+            staff_data['department_id'] = department_id
+        
+        # Handle salary
+        salary = request.POST.get('salary')
+        if salary:
+            staff_data['salary'] = salary
+        
+        staff = Staff.objects.create(
+            user=user,
+            **staff_data
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Staff member created successfully!',
+            'staff_id': staff.id
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error creating staff: {str(e)}'
+        }, status=500)
+
+
+@login_required
+def staff_detail_ajax(request, staff_id):
+    """AJAX endpoint for staff details"""
+    try:
+        staff = get_object_or_404(Staff, id=staff_id)
+        
+        profile_picture_url = ''
+        if staff.user.profile_picture:
+            try:
+                profile_picture_url = staff.user.profile_picture.url
+            except:
+                profile_picture_url = ''
+        
+        data = {
+            'id': staff.id,
+            'employee_number': staff.employee_number,
+            'first_name': staff.user.first_name,
+            'last_name': staff.user.last_name,
+            'email': staff.user.email,
+            'phone': staff.user.phone or '',
+            'address': staff.user.address or '',
+            'gender': staff.user.gender or '',
+            'date_of_birth': staff.user.date_of_birth.strftime('%Y-%m-%d') if staff.user.date_of_birth else '',
+            'national_id': staff.user.national_id or '',
+            'profile_picture': profile_picture_url,
+            'staff_category': staff.staff_category,
+            'staff_category_display': staff.get_staff_category_display(),
+            'department_id': staff.department.id if staff.department else '',
+            'department_name': staff.department.name if staff.department else '',
+            'designation': staff.designation,
+            'joining_date': staff.joining_date.strftime('%Y-%m-%d'),
+            'office_location': staff.office_location or '',
+            'job_description': staff.job_description or '',
+            'salary': str(staff.salary) if staff.salary else '',
+            'is_active': staff.is_active,
+        }
+        
+        return JsonResponse({
+            'success': True,
+            'data': data
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error fetching staff details: {str(e)}'
+        }, status=500)
+
+
+@login_required
+@csrf_exempt
+@require_http_methods(["POST"])
+def staff_update_ajax(request, staff_id):
+    """AJAX endpoint for updating staff"""
+    try:
+        staff = get_object_or_404(Staff, id=staff_id)
+        user = staff.user
+        
+        # Update user data
+        user.first_name = request.POST.get('first_name', user.first_name)
+        user.last_name = request.POST.get('last_name', user.last_name)
+        user.email = request.POST.get('email', user.email)
+        user.phone = request.POST.get('phone', user.phone)
+        user.address = request.POST.get('address', user.address)
+        user.gender = request.POST.get('gender', user.gender)
+        
+        # Handle national ID
+        national_id = request.POST.get('national_id')
+        if national_id:
+            user.national_id = national_id
+        
+        # Handle date of birth
+        date_of_birth = request.POST.get('date_of_birth')
+        if date_of_birth:
+            user.date_of_birth = date_of_birth
+        
+        # Handle profile picture
+        if 'profile_picture' in request.FILES:
+            user.profile_picture = request.FILES['profile_picture']
+        
+        user.save()
+        
+        # Update staff data
+        staff.employee_number = request.POST.get('employee_number', staff.employee_number)
+        staff.staff_category = request.POST.get('staff_category', staff.staff_category)
+        staff.designation = request.POST.get('designation', staff.designation)
+        staff.joining_date = request.POST.get('joining_date', staff.joining_date)
+        staff.office_location = request.POST.get('office_location', staff.office_location)
+        staff.job_description = request.POST.get('job_description', staff.job_description)
+        
+        # Handle department
+        department_id = request.POST.get('department')
+        if department_id:
+            staff.department_id = department_id
+        else:
+            staff.department = None
+        
+        # Handle salary
+        salary = request.POST.get('salary')
+        if salary:
+            staff.salary = salary
+        
+        staff.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Staff updated successfully!'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error updating staff: {str(e)}'
+        }, status=500)
+
+
+@login_required
+@csrf_exempt
+@require_http_methods(["POST"])
+def staff_delete_ajax(request, staff_id):
+    """AJAX endpoint for deleting staff"""
+    try:
+        staff = get_object_or_404(Staff, id=staff_id)
+        user = staff.user
+        
+        # Delete staff and user
+        staff.delete()
+        user.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Staff deleted successfully!'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error deleting staff: {str(e)}'
+        }, status=500)
+
+
+@login_required
+@reference_endpoint
+def departments_ajax(request):
+    """AJAX endpoint for departments list"""
+    try:
+        departments = reference_data.select('departments', is_active=True)
+        return JsonResponse({
+            'success': True,
+            'data': pick(departments, 'id', 'name')
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error fetching departments: {str(e)}'
+        }, status=500)
+
+
+@login_required
+@user_passes_test(is_administrative_staff)
+def student_reporting_list(request):
+    """List all students with their reporting status"""
+    
+    # Get filter parameters
+    programme_id = request.GET.get('programme')
+    faculty_id = request.GET.get('faculty')
+    year = request.GET.get('year')
+    status = request.GET.get('status')
+    search = request.GET.get('search', '').strip()
+    
+    # Base queryset
+    students = Student.objects.select_related(
+        'user', 'programme', 'programme__department', 'programme__faculty'
+    ).prefetch_related(
+        Prefetch(
+            'studentreporting_set',
+            queryset=StudentReporting.objects.select_related('semester__academic_year')
+        )
+    )
+    
+    # Apply filters
+    if programme_id:
+        students = students.filter(programme_id=programme_id)
+    
+    if faculty_id:
+        students = students.filter(programme__faculty_id=faculty_id)
+    
+    if year:
+        students = students.filter(current_year=year)
+    
+    if status:
+        students = students.filter(status=status)
+    
+    if search:
+        from ..people_search import filter_people
+        students = filter_people(students, search, 'student')
+    
+    # Get current semester for reporting status
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Annotate with reporting counts
+    students = students.annotate(
+        total_reports=Count('studentreporting'),
+        pending_reports=Count(
+            'studentreporting',
+            filter=Q(studentreporting__status='pending')
+        )
+    )
+    
+    # Pagination: only the rows on this page get reporting details built
+    from ..pagination import KeysetPaginator
+    paginator = KeysetPaginator(students, 20, ordering=['student_id'])
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Calculate reporting statistics for each student on the page
+    students_data = []
+    for student in page_obj:
+        # Get current semester reporting status from the prefetched reports
+        current_report = None
+        if current_semester:
+            current_report = next(
+                (report for report in student.studentreporting_set.all()
+                 if report.semester_id == current_semester.id),
+                None
+            )
+        
+        # Calculate total semesters the student should have reported for
+        total_semesters = 0
+        if student.admission_date:
+            # Simple calculation - this can be made more sophisticated
+            years_enrolled = student.current_year
+            total_semesters = years_enrolled * student.programme.semesters_per_year
+        
+        students_data.append({
+            'student': student,
+            'current_report': current_report,
+            'total_semesters': total_semesters,
+            'reporting_percentage': (
+                (student.total_reports / total_semesters * 100) 
+                if total_semesters > 0 else 0
+            ),
+        })
+    page_obj.object_list = students_data
+    
+    # Get filter options
+    programmes = Programme.objects.filter(is_active=True).select_related('department', 'faculty')
+    faculties = Faculty.objects.filter(is_active=True)
+    
+    # Statistics
+    stats = {
+        'total_students': paginator.count,
+        'reported_current': StudentReporting.objects.filter(
+            semester=current_semester,
+            status='approved'
+        ).count() if current_semester else 0,
+        'pending_reports': StudentReporting.objects.filter(
+            semester=current_semester,
+            status='pending'
+        ).count() if current_semester else 0,
+        'active_students': students.filter(status='active').count(),
+    }
+    
+    context = {
+        'page_obj': page_obj,
+        'programmes': programmes,
+        'faculties': faculties,
+        'current_semester': current_semester,
+        'stats': stats,
+        'filters': {
+            'programme_id': programme_id,
+            'faculty_id': faculty_id,
+            'year': year,
+            'status': status,
+            'search': search,
+        },
+        'year_choices': range(1, 9),
+        'status_choices': Student.STATUS_CHOICES,
+    }
+    
+    return render(request, 'admin/student_reporting_list.html', context)
+
+
+@login_required
+@user_passes_test(is_administrative_staff)
+def student_reporting_detail(request, student_id):
+    """Detailed view of a student's reporting history"""
+    
+    student = get_object_or_404(
+        Student.objects.select_related(
+            'user', 'programme', 'programme__department', 'programme__faculty'
+        ),
+        id=student_id
+    )
+    
+    # Get all student reports with semester and academic year info
+    reports = StudentReporting.objects.filter(
+        student=student
+    ).select_related(
+        'semester__academic_year', 'processed_by'
+    ).order_by('-semester__academic_year__start_date', '-semester__semester_number')
+    
+    # Get all academic years and semesters for this student's tenure
+    academic_years = AcademicYear.objects.filter(
+        start_date__gte=student.admission_date
+    ).prefetch_related('semesters').order_by('start_date')
+    
+    # Organize reports by academic year and semester
+    reports_by_year = defaultdict(lambda: defaultdict(dict))
+    for report in reports:
+        year_key = report.semester.academic_year.year
+        sem_key = report.semester.semester_number
+        reports_by_year[year_key][sem_key] = report
+    
+    # Create complete structure including missing semesters
+    years_structure = []
+    for academic_year in academic_years:
+        year_data = {
+            'academic_year': academic_year,
+            'semesters': []
+        }
+        
+        for semester in academic_year.semesters.all():
+            # Check if student should have been enrolled in this semester
+            semester_data = {
+                'semester': semester,
+                'report': reports_by_year[academic_year.year].get(
+                    semester.semester_number
+                ),
+                'should_report': True,  # Logic to determine if student should report
+            }
+            year_data['semesters'].append(semester_data)
+        
+        if year_data['semesters']:  # Only add years with semesters
+            years_structure.append(year_data)
+    
+    # Calculate statistics
+    total_semesters = sum(len(year['semesters']) for year in years_structure)
+    reported_semesters = len(reports)
+    pending_reports = reports.filter(status='pending').count()
+    approved_reports = reports.filter(status='approved').count()
+    rejected_reports = reports.filter(status='rejected').count()
+    
+    stats = {
+        'total_semesters': total_semesters,
+        'reported_semesters': reported_semesters,
+        'pending_reports': pending_reports,
+        'approved_reports': approved_reports,
+        'rejected_reports': rejected_reports,
+        'reporting_percentage': (
+            (reported_semesters / total_semesters * 100) 
+            if total_semesters > 0 else 0
+        ),
+    }
+    
+    context = {
+        'student': student,
+        'years_structure': years_structure,
+        'reports': reports,
+        'stats': stats,
+        'current_semester': Semester.objects.filter(is_current=True).first(),
+    }
+    
+    return render(request, 'admin/student_reporting_detail.html', context)
+
+
+@login_required
+@user_passes_test(is_administrative_staff)
+def process_student_report(request):
+    """AJAX endpoint to approve/reject student reports"""
+    
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'})
+    
+    try:
+        data = json.loads(request.body)
+        report_id = data.get('report_id')
+        action = data.get('action')  # 'approve' or 'reject'
+        remarks = data.get('remarks', '')
+        
+        if not report_id or action not in ['approve', 'reject']:
+            return JsonResponse({
+                'success': False, 
+                'error': 'Invalid parameters'
+            })
+        
+        report = get_object_or_404(StudentReporting, id=report_id)
+        
+        # Update report status
+        if action == 'approve':
+            report.status = 'approved'
+            message = f'Report for {report.student.student_id} approved successfully'
+        else:
+            report.status = 'rejected'
+            message = f'Report for {report.student.student_id} rejected'
+        
+        report.processed_by = request.user
+        report.processed_date = timezone.now()
+        if remarks:
+            report.remarks = remarks
+        
+        report.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': message,
+            'status': report.get_status_display(),
+            'processed_by': report.processed_by.get_full_name(),
+            'processed_date': report.processed_date.strftime('%Y-%m-%d %H:%M'),
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': f'An error occurred: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_administrative_staff)
+def bulk_approve_reports(request):
+    """AJAX endpoint to bulk approve multiple reports"""
+    
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'})
+    
+    try:
+        data = json.loads(request.body)
+        report_ids = data.get('report_ids', [])
+        
+        if not report_ids:
+            return JsonResponse({
+                'success': False,
+                'error': 'No reports selected'
+            })
+        
+        # Update selected reports
+        updated = StudentReporting.objects.filter(
+            id__in=report_ids,
+            status='pending'
+        ).update(
+            status='approved',
+            processed_by=request.user,
+            processed_date=timezone.now()
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'{updated} reports approved successfully'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': f'An error occurred: {str(e)}'
+        })
+
+
+def is_admin_or_superuser(user):
+    """Check if user is admin or superuser"""
+    return user.is_authenticated and (user.is_superuser or user.user_type in ['admin', 'registrar'])
+
+
+@login_required
+@user_passes_test(is_admin_or_superuser)
+def admin_profile(request):
+    """
+    Admin profile view with comprehensive system tracking and analytics
+    """
+    # Get current datetime for calculations
+    now = timezone.now()
+    today = now.date()
+    week_ago = now - timedelta(days=7)
+    month_ago = now - timedelta(days=30)
+    
+    # ============ ONLINE USERS ============
+    # Users active in the last 15 minutes
+    active_threshold = now - timedelta(minutes=15)
+    online_users = UserSession.objects.filter(
+        is_active=True,
+        last_activity__gte=active_threshold
+    ).select_related('user').order_by('-last_activity')
+    
+    online_count = online_users.count()
+    
+    # Categorize online users
+    online_students = online_users.filter(user__user_type='student').count()
+    online_lecturers = online_users.filter(user__user_type__in=['lecturer', 'professor']).count()
+    online_staff = online_users.filter(user__user_type__in=['admin', 'staff', 'registrar', 'dean', 'hod']).count()
+    
+    # ============ RECENT ACTIVITIES ============
+    recent_activities = ActivityLog.objects.select_related('user', 'content_type').order_by('-timestamp')[:50]
+    
+    # Activity counts by type
+    today_activities = ActivityLog.objects.filter(timestamp__date=today)
+    activity_counts = today_activities.values('action').annotate(count=Count('id')).order_by('-count')
+    
+    # ============ SYSTEM STATISTICS ============
+    # User statistics
+    total_users = User.objects.count()
+    total_students = Student.objects.count()
+    total_lecturers = Lecturer.objects.count()
+    total_staff = Staff.objects.count()
+    
+    # Recent registrations
+    new_users_today = User.objects.filter(date_joined__date=today).count()
+    new_users_week = User.objects.filter(date_joined__gte=week_ago).count()
+    
+    # Login statistics
+    logins_today = ActivityLog.objects.filter(
+        action='login',
+        timestamp__date=today
+    ).count()
+    
+    # ============ PAGE ANALYTICS ============
+    # Most visited pages today
+    popular_pages_today = PageVisit.objects.filter(
+        timestamp__date=today
+    ).values('url', 'view_name').annotate(
+        visits=Count('id'),
+        unique_users=Count('user', distinct=True)
+    ).order_by('-visits')[:10]
+    
+    # Page visits by hour for today - FIXED VERSION
+    try:
+        # Try using Django's Extract function first (works with PostgreSQL, MySQL)
+        hourly_visits = PageVisit.objects.filter(
+            timestamp__date=today
+        ).annotate(
+            hour=Extract('timestamp', 'hour')
+        ).values('hour').annotate(
+            visits=Count('id')
+        ).order_by('hour')
+    except:
+        # Fallback for SQLite - get all visits for today and process in Python
+        today_visits = PageVisit.objects.filter(
+            timestamp__date=today
+        ).values_list('timestamp', flat=True)
+        
+        # Process in Python to extract hours
+        hourly_visits = {}
+        for timestamp in today_visits:
+            hour = timestamp.hour
+            hourly_visits[hour] = hourly_visits.get(hour, 0) + 1
+        
+        # Convert to list of dicts to match expected format
+        hourly_visits = [{'hour': k, 'visits': v} for k, v in hourly_visits.items()]
+    
+    # Create hourly data for chart (24 hours)
+    hourly_data = {i: 0 for i in range(24)}
+    for item in hourly_visits:
+        hour_key = int(item['hour']) if isinstance(item, dict) else int(item.hour)
+        visits_count = item['visits'] if isinstance(item, dict) else item.visits
+        hourly_data[hour_key] = visits_count
+    
+    # ============ USER BEHAVIOR ANALYTICS ============
+    # Most active users
+    active_users_week = ActivityLog.objects.filter(
+        timestamp__gte=week_ago
+    ).values('user__username', 'user__first_name', 'user__last_name', 'user__user_type').annotate(
+        activity_count=Count('id')
+    ).order_by('-activity_count')[:10]
+    
+    # Browser/Device analytics
+    user_agents = PageVisit.objects.filter(
+        timestamp__gte=week_ago
+    ).values('user_agent').annotate(
+        count=Count('id')
+    ).order_by('-count')[:5]
+    
+    # ============ ACADEMIC ANALYTICS ============
+    # Recent academic activities
+    recent_enrollments = Enrollment.objects.filter(
+        enrollment_date__gte=week_ago
+    ).count()
+    
+    recent_grades = Grade.objects.filter(
+        enrollment__semester__is_current=True
+    ).exclude(grade='').count()
+    
+    # ============ FINANCIAL ANALYTICS ============
+    # Fee payments today
+    payments_today = FeePayment.objects.filter(
+        payment_date=today,
+        payment_status='completed'
+    ).aggregate(
+        count=Count('id'),
+        total=Count('amount_paid') or 0
+    )
+    
+    # ============ SYSTEM PERFORMANCE ============
+    # Average response time for today
+    avg_response_time = PageVisit.objects.filter(
+        timestamp__date=today,
+        response_time__isnull=False
+    ).aggregate(avg_time=Avg('response_time'))['avg_time'] or 0
+    
+    # Error logs (you might need to implement error tracking)
+    error_count = ActivityLog.objects.filter(
+        timestamp__date=today,
+        description__icontains='error'
+    ).count()
+    
+    # ============ PRIVILEGED USER ACTIVITIES ============
+    # Track what privileged users (admin, staff, lecturers) did
+    privileged_activities = ActivityLog.objects.filter(
+        user__user_type__in=['admin', 'staff', 'registrar', 'dean', 'hod', 'lecturer', 'professor'],
+        timestamp__gte=week_ago
+    ).select_related('user', 'content_type').order_by('-timestamp')[:20]
+    
+    # ============ CHARTS DATA FOR FRONTEND ============
+    # Daily activity chart (last 7 days)
+    daily_activities = []
+    for i in range(7):
+        date = today - timedelta(days=i)
+        count = ActivityLog.objects.filter(timestamp__date=date).count()
+        daily_activities.append({
+            'date': date.strftime('%Y-%m-%d'),
+            'count': count
+        })
+    daily_activities.reverse()
+    
+    # User type distribution for pie chart
+    user_distribution = [
+        {'type': 'Students', 'count': total_students},
+        {'type': 'Lecturers', 'count': total_lecturers},
+        {'type': 'Staff', 'count': total_staff},
+    ]
+    
+    # Most visited pages data for chart
+    page_visits_data = [
+        {
+            'page': item['url'].split('/')[-2] or 'Dashboard' if item['url'] != '/' else 'Dashboard',
+            'visits': item['visits'],
+            'unique_users': item['unique_users']
+        }
+        for item in popular_pages_today[:5]
+    ]
+    
+    context = {
+        'title': 'Admin Profile & System Analytics',
+        
+        # Current user info
+        'current_user': request.user,
+        
+        # Online users
+        'online_users': online_users[:20],  # Limit display
+        'online_count': online_count,
+        'online_students': online_students,
+        'online_lecturers': online_lecturers,
+        'online_staff': online_staff,
+        
+        # System statistics
+        'total_users': total_users,
+        'total_students': total_students,
+        'total_lecturers': total_lecturers,
+        'total_staff': total_staff,
+        'new_users_today': new_users_today,
+        'new_users_week': new_users_week,
+        'logins_today': logins_today,
+        
+        # Activities
+        'recent_activities': recent_activities,
+        'privileged_activities': privileged_activities,
+        'activity_counts': activity_counts,
+        
+        # Page analytics
+        'popular_pages_today': popular_pages_today,
+        'active_users_week': active_users_week,
+        
+        # Academic stats
+        'recent_enrollments': recent_enrollments,
+        'recent_grades': recent_grades,
+        
+        # Financial stats
+        'payments_today': payments_today,
+        
+        # Performance metrics
+        'avg_response_time': round(avg_response_time, 2),
+        'error_count': error_count,
+        
+        # Chart data (JSON serialized)
+        'daily_activities_json': json.dumps(daily_activities),
+        'hourly_data_json': json.dumps(list(hourly_data.values())),
+        'user_distribution_json': json.dumps(user_distribution),
+        'page_visits_data_json': json.dumps(page_visits_data),
+        
+        # Time ranges for display
+        'today': today,
+        'week_ago': week_ago,
+    }
+    
+    return render(request, 'admin/admin_profile.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_or_superuser)
+def admin_profile_api(request):
+    """
+    API endpoint for real-time data updates
+    """
+    data_type = request.GET.get('type', 'online_users')
+    
+    if data_type == 'online_users':
+        # Get current online users
+        active_threshold = timezone.now() - timedelta(minutes=15)
+        online_users = UserSession.objects.filter(
+            is_active=True,
+            last_activity__gte=active_threshold
+        ).select_related('user').values(
+            'user__username',
+            'user__first_name',
+            'user__last_name',
+            'user__user_type',
+            'login_time',
+            'last_activity',
+            'ip_address'
+        )
+        
+        return JsonResponse({
+            'online_users': list(online_users),
+            'count': len(online_users)
+        })
+    
+    elif data_type == 'recent_activities':
+        # Get recent activities
+        activities = ActivityLog.objects.select_related(
+            'user', 'content_type'
+        ).order_by('-timestamp')[:10].values(
+            'user__username',
+            'action',
+            'timestamp',
+            'description',
+            'content_type__model'
+        )
+        
+        return JsonResponse({
+            'activities': list(activities)
+        })
+    
+    elif data_type == 'system_stats':
+        # Get real-time system statistics
+        now = timezone.now()
+        today = now.date()
+        
+        stats = {
+            'online_count': UserSession.objects.filter(
+                is_active=True,
+                last_activity__gte=now - timedelta(minutes=15)
+            ).count(),
+            'activities_today': ActivityLog.objects.filter(
+                timestamp__date=today
+            ).count(),
+            'logins_today': ActivityLog.objects.filter(
+                action='login',
+                timestamp__date=today
+            ).count(),
+        }
+        
+        return JsonResponse(stats)
+    
+    return JsonResponse({'error': 'Invalid data type'}, status=400)
+
+
+# =============================================================================
+# Query profiler
+# =============================================================================
+
+@login_required
+@user_passes_test(is_admin)
+def query_profiler_dashboard(request):
+    """Recent request profiles from this process and per-view sampled aggregates"""
+    from django.db.models import Avg, Count, Max, Sum
+    from .. import query_profiler
+    from ..models_monitoring import RequestProfileSample
+
+    if request.method == 'POST' and request.POST.get('action') == 'clear':
+        query_profiler.clear_profiles()
+        messages.success(request, 'Recent profiles cleared.')
+        return redirect('query_profiler_dashboard')
+
+    try:
+        days = max(int(request.GET.get('days', 7)), 1)
+    except ValueError:
+        days = 7
+
+    view_stats = (
+        RequestProfileSample.objects
+        .filter(created_at__gte=timezone.now() - timedelta(days=days))
+        .values('view_name')
+        .annotate(
+            samples=Count('id'),
+            avg_queries=Avg('query_count'),
+            max_queries=Max('query_count'),
+            avg_db_ms=Avg('db_ms'),
+            avg_total_ms=Avg('total_ms'),
+            duplicates=Sum('duplicate_count'),
+        )
+        .order_by('-duplicates', '-avg_queries')[:50]
+    )
+
+    context = {
+        'recent_profiles': query_profiler.recent_profiles(),
+        'view_stats': view_stats,
+        'days': days,
+        'profiling_enabled': getattr(settings, 'QUERY_PROFILING_ENABLED', False),
+        'profile_token': query_profiler.issue_profile_token(request.user),
+        'profile_token_header': query_profiler.PROFILE_TOKEN_HEADER,
+    }
+    return render(request, 'admin/query_profiler.html', context)
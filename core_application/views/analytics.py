@@ -0,0 +1,341 @@
+# analytics.py - Analytics dashboard and its chart data endpoints
+
+from datetime import timedelta
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+
+from ..analytics_cache import cached_analytics
+from ..models import (
+    AcademicYear, Assignment, AssignmentSubmission, Attendance, AttendanceSession, Course,
+    Enrollment, Faculty, FeePayment, Hostel, HostelBooking, Lecturer, Library, LibraryTransaction,
+    Programme, Semester, Student,
+)
+
+
+@login_required
+def analytics_dashboard(request):
+    """Main analytics dashboard view"""
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Basic statistics
+    context = {
+        'total_students': Student.objects.filter(status='active').count(),
+        'total_lecturers': Lecturer.objects.filter(is_active=True).count(),
+        'total_courses': Course.objects.filter(is_active=True).count(),
+        'total_programmes': Programme.objects.filter(is_active=True).count(),
+        'total_faculties': Faculty.objects.filter(is_active=True).count(),
+        'current_semester': current_semester,
+        'current_academic_year': current_academic_year,
+    }
+    
+    return render(request, 'analytics/dashboard.html', context)
+
+
+@login_required
+@cached_analytics('student_enrollment', ['students', 'enrollments', 'calendar'])
+def student_enrollment_data(request):
+    """API endpoint for student enrollment trends"""
+    current_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Get enrollment data by programme
+    programme_data = Programme.objects.annotate(
+        student_count=Count('students', filter=Q(students__status='active'))
+    ).values('name', 'student_count')
+    
+    # Get enrollment trends over semesters
+    semester_data = []
+    semesters = Semester.objects.filter(
+        academic_year__year__gte='2023/2024'
+    ).order_by('academic_year__start_date', 'semester_number')
+    
+    semester_counts = dict(
+        Enrollment.objects.filter(
+            semester__in=semesters,
+            is_active=True
+        ).order_by().values('semester_id').annotate(
+            total=Count('id')
+        ).values_list('semester_id', 'total')
+    )
+    
+    for semester in semesters.select_related('academic_year'):
+        semester_data.append({
+            'semester': f"{semester.academic_year.year} S{semester.semester_number}",
+            'enrollments': semester_counts.get(semester.id, 0)
+        })
+    
+    # Gender distribution
+    gender_data = Student.objects.filter(status='active').values('user__gender').annotate(
+        count=Count('id')
+    ).order_by('user__gender')
+    
+    return JsonResponse({
+        'programme_data': list(programme_data),
+        'semester_trends': semester_data,
+        'gender_distribution': list(gender_data)
+    })
+
+
+@login_required
+@cached_analytics('academic_performance', ['grades', 'calendar'])
+def academic_performance_data(request):
+    """API endpoint for academic performance metrics"""
+    from ..analytics_facts import ensure_facts, grade_performance
+    from ..models_analytics import GradeFact
+
+    ensure_facts()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    semester_facts = GradeFact.objects.filter(semester=current_semester)
+    
+    # Grade distribution
+    grade_distribution = semester_facts.order_by('grade').values('grade').annotate(
+        count=Sum('graded_count')
+    )
+    
+    # Programme performance averages
+    programme_gpa = {
+        row['programme_id']: row['avg_gpa']
+        for row in grade_performance(semester_facts, 'programme_id')
+    }
+    programme_performance = [
+        {'name': name, 'avg_gpa': programme_gpa.get(programme_id)}
+        for programme_id, name in Programme.objects.values_list('id', 'name')
+    ]
+    
+    # Assignment completion rates
+    assignment_completion = AssignmentSubmission.objects.filter(
+        assignment__lecturer_assignment__semester=current_semester,
+        is_submitted=True
+    ).count()
+    
+    total_assignments = Assignment.objects.filter(
+        lecturer_assignment__semester=current_semester,
+        is_published=True
+    ).count()
+    
+    completion_rate = (assignment_completion / total_assignments * 100) if total_assignments > 0 else 0
+    
+    return JsonResponse({
+        'grade_distribution': list(grade_distribution),
+        'programme_performance': list(programme_performance),
+        'assignment_completion_rate': completion_rate,
+        'total_assignments': total_assignments,
+        'submitted_assignments': assignment_completion
+    })
+
+
+@login_required
+@cached_analytics('financial', ['fees', 'calendar'])
+def financial_data(request):
+    """API endpoint for financial analytics"""
+    current_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Fee collection by programme
+    fee_by_programme = FeePayment.objects.filter(
+        fee_structure__academic_year=current_year,
+        payment_status='completed'
+    ).values(
+        'fee_structure__programme__name'
+    ).annotate(
+        total_fees=Sum('amount_paid')
+    ).order_by('-total_fees')
+    
+    # Monthly fee collection trend
+    months = []
+    fee_collections = []
+    
+    month_dates = [timezone.now().replace(day=1) - timedelta(days=30*i) for i in range(12)]
+    monthly_totals = {
+        (month.year, month.month): total
+        for month, total in FeePayment.objects.filter(
+            payment_date__gte=min(month_dates).date().replace(day=1),
+            payment_status='completed'
+        ).annotate(
+            month=TruncMonth('payment_date')
+        ).order_by().values('month').annotate(
+            total=Sum('amount_paid')
+        ).values_list('month', 'total')
+    }
+    
+    for month_date in month_dates:
+        monthly_fees = monthly_totals.get((month_date.year, month_date.month)) or 0
+        
+        months.insert(0, month_date.strftime('%b %Y'))
+        fee_collections.insert(0, float(monthly_fees))
+    
+    # Payment method distribution
+    payment_methods = FeePayment.objects.filter(
+        fee_structure__academic_year=current_year,
+        payment_status='completed'
+    ).values('payment_method').annotate(
+        count=Count('id'),
+        total_amount=Sum('amount_paid')
+    )
+    
+    return JsonResponse({
+        'fee_by_programme': list(fee_by_programme),
+        'monthly_trends': {
+            'months': months,
+            'collections': fee_collections
+        },
+        'payment_methods': list(payment_methods)
+    })
+
+
+@login_required
+@cached_analytics('hostel_occupancy', ['hostels', 'calendar'])
+def hostel_occupancy_data(request):
+    """API endpoint for hostel occupancy analytics"""
+    current_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Occupancy by hostel
+    hostel_occupancy = []
+    for hostel in Hostel.objects.filter(is_active=True):
+        total_beds = hostel.get_total_beds_count(current_year)
+        occupied_beds = hostel.get_occupied_beds_count(current_year)
+        occupancy_rate = (occupied_beds / total_beds * 100) if total_beds > 0 else 0
+        
+        hostel_occupancy.append({
+            'hostel_name': hostel.name,
+            'total_beds': total_beds,
+            'occupied_beds': occupied_beds,
+            'occupancy_rate': round(occupancy_rate, 2)
+        })
+    
+    # Gender-wise accommodation
+    gender_accommodation = HostelBooking.objects.filter(
+        academic_year=current_year,
+        booking_status='checked_in'
+    ).values(
+        'student__user__gender'
+    ).annotate(count=Count('id'))
+    
+    # Booking status distribution
+    booking_status = HostelBooking.objects.filter(
+        academic_year=current_year
+    ).values('booking_status').annotate(count=Count('id'))
+    
+    return JsonResponse({
+        'hostel_occupancy': hostel_occupancy,
+        'gender_accommodation': list(gender_accommodation),
+        'booking_status': list(booking_status)
+    })
+
+
+@login_required
+@cached_analytics('library_usage', ['library'])
+def library_usage_data(request):
+    """API endpoint for library usage analytics"""
+    # Most borrowed books
+    popular_books = LibraryTransaction.objects.filter(
+        transaction_type='borrow',
+        transaction_date__gte=timezone.now() - timedelta(days=30)
+    ).values(
+        'library_resource__title',
+        'library_resource__author'
+    ).annotate(
+        borrow_count=Count('id')
+    ).order_by('-borrow_count')[:10]
+    
+    # Daily library usage trend
+    today = timezone.now().date()
+    daily_counts = dict(
+        LibraryTransaction.objects.filter(
+            transaction_date__date__gte=today - timedelta(days=29)
+        ).annotate(
+            day=TruncDate('transaction_date')
+        ).order_by().values('day').annotate(
+            total=Count('id')
+        ).values_list('day', 'total')
+    )
+    
+    daily_usage = []
+    for i in range(30):
+        date = today - timedelta(days=i)
+        daily_usage.insert(0, {
+            'date': date.strftime('%m/%d'),
+            'transactions': daily_counts.get(date, 0)
+        })
+    
+    # Resource type distribution
+    resource_types = Library.objects.values('resource_type').annotate(
+        count=Count('id')
+    )
+    
+    return JsonResponse({
+        'popular_books': list(popular_books),
+        'daily_usage': daily_usage,
+        'resource_types': list(resource_types)
+    })
+
+
+@login_required
+@cached_analytics('attendance_analytics', ['attendance', 'enrollments', 'calendar'])
+def attendance_analytics_data(request):
+    """API endpoint for attendance analytics"""
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Course-wise attendance rates
+    course_attendance = []
+    courses = Course.objects.filter(
+        enrollments__semester=current_semester,
+        is_active=True
+    ).distinct()
+    
+    # One grouped count per measure instead of three queries per course
+    sessions_per_course = dict(
+        AttendanceSession.objects.filter(semester=current_semester).order_by()
+        .values('timetable_slot__course').annotate(total=Count('id'))
+        .values_list('timetable_slot__course', 'total')
+    )
+    enrollments_per_course = dict(
+        Enrollment.objects.filter(semester=current_semester, is_active=True).order_by()
+        .values('course').annotate(total=Count('id'))
+        .values_list('course', 'total')
+    )
+    present_per_course = dict(
+        Attendance.objects.filter(
+            attendance_session__semester=current_semester,
+            status='present'
+        ).order_by().values('timetable_slot__course').annotate(total=Count('id'))
+        .values_list('timetable_slot__course', 'total')
+    )
+    
+    for course in courses:
+        total_possible_attendance = (
+            enrollments_per_course.get(course.id, 0) * sessions_per_course.get(course.id, 0)
+        )
+        present_count = present_per_course.get(course.id, 0)
+        
+        attendance_rate = (present_count / total_possible_attendance * 100) if total_possible_attendance > 0 else 0
+        
+        course_attendance.append({
+            'course_code': course.code,
+            'course_name': course.name,
+            'attendance_rate': round(attendance_rate, 2)
+        })
+    
+    # Weekly attendance trends
+    weekly_counts = dict(
+        Attendance.objects.filter(
+            week_number__range=(1, 12),
+            attendance_session__semester=current_semester,
+            status='present'
+        ).order_by().values('week_number').annotate(
+            total=Count('id')
+        ).values_list('week_number', 'total')
+    )
+    weekly_attendance = [
+        {'week': week, 'attendance': weekly_counts.get(week, 0)}
+        for week in range(1, 13)
+    ]
+    
+    return JsonResponse({
+        'course_attendance': course_attendance,
+        'weekly_trends': weekly_attendance
+    })
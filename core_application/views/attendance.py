@@ -0,0 +1,716 @@
+# attendance.py - QR-code attendance for lecturers and students
+
+from datetime import timedelta
+import json
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db.models import Count, Q
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
+
+from ..models import (
+    Attendance, AttendanceSession, Enrollment, Lecturer, LecturerCourseAssignment, Semester,
+    Student, Timetable,
+)
+
+
+@login_required
+def lecturer_generate_qr_attendance(request, timetable_id):
+    """Lecturer view to generate QR code for attendance"""
+    try:
+        lecturer = request.role.lecturer_or_404()
+        timetable_slot = get_object_or_404(Timetable, id=timetable_id, lecturer=lecturer)
+        
+        # Get current semester
+        current_semester = Semester.objects.filter(is_current=True).first()
+        if not current_semester:
+            messages.error(request, "No active semester found.")
+            return redirect('lecturer_dashboard')
+        
+        if request.method == 'POST':
+            week_number = request.POST.get('week_number')
+            session_date = request.POST.get('session_date')
+            
+            if not week_number or not session_date:
+                messages.error(request, "Week number and session date are required.")
+                return redirect(request.META.get('HTTP_REFERER', 'lecturer_dashboard'))
+            
+            try:
+                # Check if session already exists for this week
+                existing_session = AttendanceSession.objects.filter(
+                    timetable_slot=timetable_slot,
+                    week_number=week_number,
+                    session_date=session_date
+                ).first()
+                
+                if existing_session:
+                    if existing_session.is_expired:
+                        # Deactivate expired session and create new one
+                        existing_session.is_active = False
+                        existing_session.save()
+                    else:
+                        messages.info(request, f"Attendance session for Week {week_number} already exists and is still active.")
+                        return redirect('lecturer_attendance_dashboard')
+                
+                # Create new attendance session
+                attendance_session = AttendanceSession.objects.create(
+                    timetable_slot=timetable_slot,
+                    lecturer=lecturer,
+                    semester=current_semester,
+                    week_number=week_number,
+                    session_date=session_date
+                )
+                
+                messages.success(request, f"QR Code generated successfully for Week {week_number}!")
+                return redirect('lecturer_attendance_dashboard')
+                
+            except Exception as e:
+                messages.error(request, f"Error creating attendance session: {str(e)}")
+                return redirect('lecturer_attendance_dashboard')
+        
+        # Get enrolled students for this course
+        enrolled_students = Student.objects.filter(
+            enrollments__course=timetable_slot.course,
+            enrollments__semester=current_semester,
+            enrollments__is_active=True
+        ).count()
+        
+        # Get existing sessions for this timetable slot
+        existing_sessions = AttendanceSession.objects.filter(
+            timetable_slot=timetable_slot,
+            semester=current_semester
+        ).order_by('-week_number')
+        
+        context = {
+            'timetable_slot': timetable_slot,
+            'lecturer': lecturer,
+            'current_semester': current_semester,
+            'enrolled_students': enrolled_students,
+            'existing_sessions': existing_sessions,
+            'week_choices': AttendanceSession.WEEK_CHOICES,
+        }
+        
+        return render(request, 'lecturers/generate_qr_attendance.html', context)
+        
+    except Lecturer.DoesNotExist:
+        messages.error(request, "Lecturer profile not found.")
+        return redirect('lecturer_dashboard')
+    except Exception as e:
+        messages.error(request, f"An error occurred: {str(e)}")
+        return redirect('lecturer_dashboard')
+
+
+@login_required
+def lecturer_attendance_dashboard(request):
+    """Lecturer dashboard to view all attendance sessions and statistics"""
+    try:
+        lecturer = request.role.lecturer_or_404()
+        current_semester = Semester.objects.filter(is_current=True).first()
+        
+        if not current_semester:
+            messages.error(request, "No active semester found.")
+            return redirect('lecturer_dashboard')
+        
+        # Get lecturer's timetable slots for current semester
+        timetable_slots = Timetable.objects.filter(
+            lecturer=lecturer,
+            semester=current_semester,
+            is_active=True
+        ).select_related('course', 'programme').order_by('day_of_week', 'start_time')
+        
+        # Get attendance sessions with statistics
+        attendance_sessions = AttendanceSession.objects.filter(
+            lecturer=lecturer,
+            semester=current_semester
+        ).select_related('timetable_slot__course').annotate(
+            total_attendance=Count('attendance_records'),
+            present_count=Count('attendance_records', filter=Q(attendance_records__status='present')),
+            absent_count=Count('attendance_records', filter=Q(attendance_records__status='absent')),
+            late_count=Count('attendance_records', filter=Q(attendance_records__status='late'))
+        ).order_by('-created_at')
+        
+        # Paginate sessions
+        paginator = Paginator(attendance_sessions, 10)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        
+        # Get overall statistics
+        total_sessions = attendance_sessions.count()
+        active_sessions = attendance_sessions.filter(is_active=True, expires_at__gt=timezone.now()).count()
+        total_courses = timetable_slots.values('course').distinct().count()
+        
+        # Get attendance summary by course
+        course_attendance = []
+        for slot in timetable_slots:
+            sessions = AttendanceSession.objects.filter(
+                timetable_slot=slot,
+                semester=current_semester
+            )
+            total_possible_attendance = 0
+            actual_attendance = 0
+            
+            for session in sessions:
+                enrolled_count = Student.objects.filter(
+                    enrollments__course=slot.course,
+                    enrollments__semester=current_semester,
+                    enrollments__is_active=True
+                ).count()
+                present_count = Attendance.objects.filter(
+                    attendance_session=session,
+                    status='present'
+                ).count()
+                
+                total_possible_attendance += enrolled_count
+                actual_attendance += present_count
+            
+            attendance_rate = (actual_attendance / total_possible_attendance * 100) if total_possible_attendance > 0 else 0
+            
+            course_attendance.append({
+                'course': slot.course,
+                'timetable_slot': slot,
+                'sessions_count': sessions.count(),
+                'attendance_rate': round(attendance_rate, 1),
+                'total_possible': total_possible_attendance,
+                'actual_attendance': actual_attendance
+            })
+        
+        context = {
+            'lecturer': lecturer,
+            'current_semester': current_semester,
+            'timetable_slots': timetable_slots,
+            'attendance_sessions': page_obj,
+            'course_attendance': course_attendance,
+            'stats': {
+                'total_sessions': total_sessions,
+                'active_sessions': active_sessions,
+                'total_courses': total_courses,
+            }
+        }
+        
+        return render(request, 'lecturers/attendance_dashboard.html', context)
+        
+    except Lecturer.DoesNotExist:
+        messages.error(request, "Lecturer profile not found.")
+        return redirect('lecturer_dashboard')
+    except Exception as e:
+        messages.error(request, f"An error occurred: {str(e)}")
+        return redirect('lecturer_dashboard')
+
+
+def mark_attendance_qr(request, token):
+    """Student marks attendance via QR code"""
+    try:
+        # Get attendance session by token
+        attendance_session = get_object_or_404(AttendanceSession, session_token=token)
+        
+        # Check if session is still active and not expired
+        if not attendance_session.is_active or attendance_session.is_expired:
+            return render(request, 'student/attendance_error.html', {
+                'error': 'This attendance session has expired or is no longer active.',
+                'session': attendance_session
+            })
+        
+        if request.method == 'POST':
+            if not request.user.is_authenticated:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'You must be logged in to mark attendance.'
+                })
+            
+            try:
+                student = request.role.student_or_404()
+                
+                # Check if student is enrolled in this course
+                enrollment = Enrollment.objects.filter(
+                    student=student,
+                    course=attendance_session.timetable_slot.course,
+                    semester=attendance_session.semester,
+                    is_active=True
+                ).first()
+                
+                if not enrollment:
+                    return JsonResponse({
+                        'success': False,
+                        'message': 'You are not enrolled in this course.'
+                    })
+                
+                # Check if attendance already marked for this session
+                existing_attendance = Attendance.objects.filter(
+                    student=student,
+                    attendance_session=attendance_session
+                ).first()
+                
+                if existing_attendance:
+                    return JsonResponse({
+                        'success': False,
+                        'message': 'You have already marked attendance for this session.'
+                    })
+                
+                # Mark attendance
+                attendance = Attendance.objects.create(
+                    student=student,
+                    attendance_session=attendance_session,
+                    timetable_slot=attendance_session.timetable_slot,
+                    week_number=attendance_session.week_number,
+                    status='present',
+                    marked_via_qr=True,
+                    ip_address=request.META.get('REMOTE_ADDR')
+                )
+                
+                return JsonResponse({
+                    'success': True,
+                    'message': 'Attendance marked successfully!',
+                    'attendance_id': attendance.id
+                })
+                
+            except Student.DoesNotExist:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Student profile not found.'
+                })
+            except Exception as e:
+                return JsonResponse({
+                    'success': False,
+                    'message': f'Error marking attendance: {str(e)}'
+                })
+        
+        # GET request - show attendance form
+        context = {
+            'attendance_session': attendance_session,
+            'course': attendance_session.timetable_slot.course,
+            'lecturer': attendance_session.lecturer,
+            'week_number': attendance_session.week_number,
+            'expires_at': attendance_session.expires_at,
+        }
+        
+        return render(request, 'student/mark_attendance_qr.html', context)
+        
+    except AttendanceSession.DoesNotExist:
+        return render(request, 'student/attendance_error.html', {
+            'error': 'Invalid attendance session. The QR code may be corrupted or expired.'
+        })
+    except Exception as e:
+        return render(request, 'student/attendance_error.html', {
+            'error': f'An error occurred: {str(e)}'
+        })
+
+
+@login_required
+def lecturer_attendance_detail(request, session_id):
+    """Detailed view of a specific attendance session"""
+    try:
+        lecturer = request.role.lecturer_or_404()
+        attendance_session = get_object_or_404(
+            AttendanceSession, 
+            id=session_id, 
+            lecturer=lecturer
+        )
+        
+        # Get all attendance records for this session
+        attendance_records = Attendance.objects.filter(
+            attendance_session=attendance_session
+        ).select_related('student__user').order_by('student__user__first_name')
+        
+        # Get enrolled students who haven't marked attendance
+        enrolled_students = Student.objects.filter(
+            enrollments__course=attendance_session.timetable_slot.course,
+            enrollments__semester=attendance_session.semester,
+            enrollments__is_active=True
+        ).exclude(
+            id__in=attendance_records.values_list('student_id', flat=True)
+        ).select_related('user')
+        
+        # Statistics
+        total_enrolled = Student.objects.filter(
+            enrollments__course=attendance_session.timetable_slot.course,
+            enrollments__semester=attendance_session.semester,
+            enrollments__is_active=True
+        ).count()
+        
+        present_count = attendance_records.filter(status='present').count()
+        absent_count = enrolled_students.count()  # Students who didn't mark attendance
+        late_count = attendance_records.filter(status='late').count()
+        
+        attendance_rate = (present_count / total_enrolled * 100) if total_enrolled > 0 else 0
+        
+        context = {
+            'attendance_session': attendance_session,
+            'attendance_records': attendance_records,
+            'absent_students': enrolled_students,
+            'lecturer': lecturer,
+            'stats': {
+                'total_enrolled': total_enrolled,
+                'present_count': present_count,
+                'absent_count': absent_count,
+                'late_count': late_count,
+                'attendance_rate': round(attendance_rate, 1)
+            }
+        }
+        
+        return render(request, 'lecturers/attendance_detail.html', context)
+        
+    except Lecturer.DoesNotExist:
+        messages.error(request, "Lecturer profile not found.")
+        return redirect('lecturer_dashboard')
+    except Exception as e:
+        messages.error(request, f"An error occurred: {str(e)}")
+        return redirect('lecturer_attendance_dashboard')
+
+
+@login_required
+def student_attendance_history(request):
+    """Student view of their attendance history"""
+    try:
+        student = request.role.student_or_404()
+        current_semester = Semester.objects.filter(is_current=True).first()
+        
+        if not current_semester:
+            messages.error(request, "No active semester found.")
+            return redirect('student_dashboard')
+        
+        # Get student's attendance records for current semester
+        attendance_records = Attendance.objects.filter(
+            student=student,
+            attendance_session__semester=current_semester
+        ).select_related(
+            'timetable_slot__course',
+            'attendance_session'
+        ).order_by('-marked_at')
+        
+        # Get attendance summary by course
+        course_attendance = {}
+        enrolled_courses = Enrollment.objects.filter(
+            student=student,
+            semester=current_semester,
+            is_active=True
+        ).select_related('course')
+        
+        for enrollment in enrolled_courses:
+            course_records = attendance_records.filter(
+                timetable_slot__course=enrollment.course
+            )
+            
+            total_sessions = AttendanceSession.objects.filter(
+                timetable_slot__course=enrollment.course,
+                semester=current_semester
+            ).count()
+            
+            present_count = course_records.filter(status='present').count()
+            late_count = course_records.filter(status='late').count()
+            absent_count = total_sessions - course_records.count()
+            
+            attendance_rate = (present_count / total_sessions * 100) if total_sessions > 0 else 0
+            
+            course_attendance[enrollment.course.id] = {
+                'course': enrollment.course,
+                'total_sessions': total_sessions,
+                'present_count': present_count,
+                'late_count': late_count,
+                'absent_count': absent_count,
+                'attendance_rate': round(attendance_rate, 1),
+                'records': course_records
+            }
+        
+        context = {
+            'student': student,
+            'current_semester': current_semester,
+            'attendance_records': attendance_records,
+            'course_attendance': course_attendance,
+        }
+        
+        return render(request, 'student/attendance_history.html', context)
+        
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('student_dashboard')
+    except Exception as e:
+        messages.error(request, f"An error occurred: {str(e)}")
+        return redirect('student_dashboard')
+
+
+def scan_attendance_qr(request):
+    """View to scan QR code for attendance"""
+    context = {
+        'page_title': 'Scan QR Code for Attendance',
+    }
+    return render(request, 'student/scan_attendance_qr.html', context)
+
+
+@login_required
+@require_http_methods(["POST"])
+def get_course_students(request):
+    """AJAX view to get students for a specific course and their attendance"""
+    try:
+        lecturer = request.role.get_lecturer()
+    except:
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    try:
+        data = json.loads(request.body)
+        course_id = data.get('course_id')
+        academic_year_id = data.get('academic_year_id')
+        semester_id = data.get('semester_id')
+        
+        if not all([course_id, academic_year_id, semester_id]):
+            return JsonResponse({'error': 'Missing required fields'}, status=400)
+        
+        # Get course assignment
+        try:
+            assignment = LecturerCourseAssignment.objects.get(
+                lecturer=lecturer,
+                course_id=course_id,
+                academic_year_id=academic_year_id,
+                semester_id=semester_id,
+                is_active=True
+            )
+        except LecturerCourseAssignment.DoesNotExist:
+            return JsonResponse({'error': 'Course assignment not found'}, status=404)
+        
+        # Get enrolled students
+        enrollments = Enrollment.objects.filter(
+            course=assignment.course,
+            semester=assignment.semester,
+            is_active=True
+        ).select_related('student__user', 'student__programme').order_by('student__student_id')
+        
+        # Get attendance sessions for this course
+        attendance_sessions = AttendanceSession.objects.filter(
+            timetable_slot__course=assignment.course,
+            semester=assignment.semester,
+            lecturer=lecturer
+        ).order_by('week_number', 'session_date')
+        
+        # Prepare student data with attendance records
+        students_data = []
+        for enrollment in enrollments:
+            student = enrollment.student
+            
+            # Get attendance records for this student
+            attendance_records = Attendance.objects.filter(
+                student=student,
+                timetable_slot__course=assignment.course,
+                attendance_session__semester=assignment.semester
+            ).order_by('week_number')
+            
+            # Create attendance summary
+            attendance_summary = {}
+            total_sessions = attendance_sessions.count()
+            present_count = 0
+            
+            for record in attendance_records:
+                attendance_summary[record.week_number] = {
+                    'status': record.status,
+                    'marked_at': record.marked_at.strftime('%Y-%m-%d %H:%M'),
+                    'marked_via_qr': record.marked_via_qr,
+                    'remarks': record.remarks
+                }
+                if record.status in ['present', 'late']:
+                    present_count += 1
+            
+            # Calculate attendance percentage
+            attendance_percentage = round((present_count / total_sessions * 100), 1) if total_sessions > 0 else 0
+            
+            students_data.append({
+                'student_id': student.student_id,
+                'name': student.user.get_full_name(),
+                'email': student.user.email,
+                'phone': student.user.phone,
+                'programme': student.programme.name,
+                'year': student.current_year,
+                'semester': student.current_semester,
+                'attendance_summary': attendance_summary,
+                'attendance_percentage': attendance_percentage,
+                'total_present': present_count,
+                'total_sessions': total_sessions
+            })
+        
+        # Prepare attendance sessions data
+        sessions_data = []
+        for session in attendance_sessions:
+            sessions_data.append({
+                'week_number': session.week_number,
+                'session_date': session.session_date.strftime('%Y-%m-%d'),
+                'day_of_week': session.timetable_slot.day_of_week.title(),
+                'start_time': session.timetable_slot.start_time.strftime('%H:%M'),
+                'end_time': session.timetable_slot.end_time.strftime('%H:%M'),
+                'venue': session.timetable_slot.venue,
+                'is_active': session.is_active,
+                'is_expired': session.is_expired
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'course': {
+                'code': assignment.course.code,
+                'name': assignment.course.name,
+                'credit_hours': assignment.course.credit_hours,
+                'course_type': assignment.course.get_course_type_display()
+            },
+            'academic_info': {
+                'academic_year': assignment.academic_year.year,
+                'semester': f"Semester {assignment.semester.semester_number}"
+            },
+            'students': students_data,
+            'attendance_sessions': sessions_data,
+            'summary': {
+                'total_students': len(students_data),
+                'total_sessions': len(sessions_data),
+                'average_attendance': round(sum(s['attendance_percentage'] for s in students_data) / len(students_data), 1) if students_data else 0
+            }
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+@require_http_methods(["POST"])
+def update_attendance(request):
+    """AJAX view to manually update student attendance"""
+    try:
+        lecturer = request.role.get_lecturer()
+    except:
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    try:
+        data = json.loads(request.body)
+        student_id_number = data.get('student_id')
+        course_id = data.get('course_id')
+        semester_id = data.get('semester_id')
+        week_number = data.get('week_number')
+        status = data.get('status')
+        remarks = data.get('remarks', '')
+        
+        if not all([student_id_number, course_id, semester_id, week_number, status]):
+            return JsonResponse({'error': 'Missing required fields'}, status=400)
+        
+        # Get student
+        try:
+            student = Student.objects.get(student_id=student_id_number)
+        except Student.DoesNotExist:
+            return JsonResponse({'error': 'Student not found'}, status=404)
+        
+        # Verify lecturer has permission
+        assignment = LecturerCourseAssignment.objects.filter(
+            lecturer=lecturer,
+            course_id=course_id,
+            semester_id=semester_id,
+            is_active=True
+        ).first()
+        
+        if not assignment:
+            return JsonResponse({'error': 'No permission to update attendance for this course'}, status=403)
+        
+        # Get or create attendance session
+        timetable_slot = Timetable.objects.filter(
+            course_id=course_id,
+            lecturer=lecturer,
+            semester_id=semester_id
+        ).first()
+        
+        if not timetable_slot:
+            return JsonResponse({'error': 'No timetable slot found for this course'}, status=404)
+        
+        attendance_session, created = AttendanceSession.objects.get_or_create(
+            timetable_slot=timetable_slot,
+            lecturer=lecturer,
+            semester_id=semester_id,
+            week_number=week_number,
+            defaults={
+                'session_date': timezone.now().date(),
+                'expires_at': timezone.now() + timedelta(hours=3)
+            }
+        )
+        
+        # Update or create attendance record
+        attendance, created = Attendance.objects.update_or_create(
+            student=student,
+            attendance_session=attendance_session,
+            timetable_slot=timetable_slot,
+            week_number=week_number,
+            defaults={
+                'status': status,
+                'remarks': remarks,
+                'marked_via_qr': False,
+                'ip_address': request.META.get('REMOTE_ADDR')
+            }
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Attendance updated for {student.user.get_full_name()}',
+            'attendance': {
+                'status': attendance.status,
+                'marked_at': attendance.marked_at.strftime('%Y-%m-%d %H:%M'),
+                'remarks': attendance.remarks
+            }
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def generate_qr_attendance(request, course_id, semester_id):
+    """Generate QR code for attendance"""
+    try:
+        lecturer = request.role.get_lecturer()
+    except:
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    # Verify lecturer has permission
+    assignment = LecturerCourseAssignment.objects.filter(
+        lecturer=lecturer,
+        course_id=course_id,
+        semester_id=semester_id,
+        is_active=True
+    ).first()
+    
+    if not assignment:
+        return JsonResponse({'error': 'Course assignment not found'}, status=404)
+    
+    # Get current week number (you may need to adjust this logic)
+    from datetime import datetime
+    current_date = datetime.now().date()
+    semester_start = assignment.semester.start_date
+    week_number = ((current_date - semester_start).days // 7) + 1
+    week_number = max(1, min(week_number, 12))  # Ensure week is between 1-12
+    
+    # Get timetable slot
+    timetable_slot = Timetable.objects.filter(
+        course=assignment.course,
+        lecturer=lecturer,
+        semester=assignment.semester
+    ).first()
+    
+    if not timetable_slot:
+        return JsonResponse({'error': 'No timetable slot found'}, status=404)
+    
+    # Create or get attendance session
+    attendance_session, created = AttendanceSession.objects.get_or_create(
+        timetable_slot=timetable_slot,
+        lecturer=lecturer,
+        semester=assignment.semester,
+        week_number=week_number,
+        session_date=current_date,
+        defaults={
+            'expires_at': timezone.now() + timedelta(hours=3)
+        }
+    )
+    
+    return JsonResponse({
+        'success': True,
+        'session_id': attendance_session.id,
+        'qr_code_url': attendance_session.qr_code_image_url,
+        'session_token': attendance_session.session_token,
+        'expires_at': attendance_session.expires_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'week_number': week_number
+    })
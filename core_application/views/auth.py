@@ -0,0 +1,691 @@
+# auth.py - Sign-in and sign-out for all user types, admin login with 2FA
+
+from datetime import timedelta
+import logging
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseForbidden, JsonResponse
+from django.shortcuts import redirect, render
+from django.utils import timezone
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_protect, ensure_csrf_cookie
+from django.views.decorators.http import require_http_methods
+
+from ..analytics_cache import is_shared_cache
+from ..models import AdminLoginAttempt, AdminSecurityAlert, AdminTwoFactorCode, User
+from ..ratelimit import client_ip, first_in_window, get_limiter, ratelimit
+
+logger = logging.getLogger(__name__)
+
+
+# Whole campuses share a NAT address on results day, so the per-IP limit is
+# generous; guessing one account's password is limited per username.
+@ratelimit('login_ip', key='ip')
+@ratelimit('login_user', key='post:username')
+def login_view(request):
+    next_url = request.GET.get('next') or request.POST.get('next')
+    
+    # Debug prints - check console/logs
+    print(f"=== LOGIN DEBUG ===")
+    print(f"Method: {request.method}")
+    print(f"Next URL: {next_url}")
+    print(f"POST data keys: {list(request.POST.keys())}")
+    print(f"User is authenticated: {request.user.is_authenticated}")
+    
+    if request.method == 'POST':
+        username = request.POST.get('username', '').strip()
+        password = request.POST.get('password', '')
+        
+        print(f"Username: '{username}'")
+        print(f"Password provided: {bool(password)}")
+        print(f"Password length: {len(password) if password else 0}")
+        
+        if not username or not password:
+            messages.error(request, 'Please provide both username and password.')
+            return render(request, 'student/auth/login.html', {'next': next_url})
+        
+        user = authenticate(request, username=username, password=password)
+        print(f"Authentication result: {user}")
+        
+        if user is not None:
+            print(f"User authenticated successfully - ID: {user.id}, Type: {user.user_type}")
+            login(request, user)
+            print(f"User logged in successfully. Session key: {request.session.session_key}")
+            
+            messages.success(request, f'Welcome back, {user.get_full_name() or user.username}!')
+
+            # Redirect to next if available
+            if next_url:
+                print(f"Redirecting to next URL: {next_url}")
+                return redirect(next_url)
+
+            # Otherwise, redirect based on user_type
+            redirect_map = {
+                'student': 'student_dashboard',
+                'lecturer': 'lecturer_dashboard', 
+                'dean': 'dean_dashboard',
+                'hostel_warden': 'hostel_dashboard',
+                'finance': 'finance_dashboard',
+                'cod': 'cod_dashboard',
+            }
+            
+            redirect_name = redirect_map.get(user.user_type)
+            if redirect_name:
+                print(f"Redirecting to: {redirect_name}")
+                return redirect(redirect_name)
+            else:
+                messages.error(request, f'Unauthorized user type: {user.user_type}')
+                print(f"Unknown user type: {user.user_type}")
+        else:
+            messages.error(request, 'Invalid username or password.')
+            print("Authentication failed - user is None")
+    
+    print(f"Rendering login template with next: {next_url}")
+    return render(request, 'student/auth/login.html', {'next': next_url})
+
+
+def logout_view(request):
+    logout(request)
+    messages.success(request, "logged out sucessfully !")
+    return redirect('login_view')  # This should match your login URL name
+
+
+def get_client_ip(request):
+    """Get the client's IP address from request"""
+    return client_ip(request)
+
+
+def get_user_agent(request):
+    """Get the user agent string"""
+    return request.META.get('HTTP_USER_AGENT', '')[:500]
+
+
+def count_login_failures(username=None, ip_address=None):
+    """
+    Recent failed admin logins for ``ip_address`` or ``username``, counted
+    over the admin_login_failures_* windows. Failures are counted in the
+    rate-limit cache as AdminLoginAttempt rows are saved (signals.py), but
+    those counters are only trusted when every worker shares them; otherwise
+    the AdminLoginAttempt rows are counted.
+    """
+    limiter = get_limiter('admin_login_failures_ip' if ip_address is not None else 'admin_login_failures_user')
+
+    if is_shared_cache(getattr(settings, 'RATE_LIMIT_CACHE', 'default')):
+        return limiter.count(ip_address if ip_address is not None else username.lower())
+
+    failures = AdminLoginAttempt.objects.filter(
+        success=False,
+        attempt_time__gte=timezone.now() - timedelta(seconds=limiter.window),
+    ).exclude(failure_reason='Pending 2FA verification')
+    if ip_address is not None:
+        return failures.filter(ip_address=ip_address).count()
+    return failures.filter(username__iexact=username).count()
+
+
+def check_login_attempts(username, ip_address):
+    """Check if there are too many failed login attempts"""
+    if count_login_failures(ip_address=ip_address) >= get_limiter('admin_login_failures_ip').limit:
+        return True
+    return count_login_failures(username=username) >= get_limiter('admin_login_failures_user').limit
+
+
+def send_security_alert_email(alert_type, username, ip_address, details):
+    """Send security alert email to administrators"""
+    try:
+        # Get all superusers to notify
+        admin_emails = User.objects.filter(
+            is_superuser=True, 
+            is_active=True,
+            email__isnull=False
+        ).exclude(email='').values_list('email', flat=True)
+        
+        if admin_emails:
+            subject = f'🚨 Admin Security Alert - {alert_type}'
+            message = f"""
+SECURITY ALERT: Suspicious Admin Login Activity Detected
+
+Alert Type: {alert_type}
+Target Username: {username}
+IP Address: {ip_address}
+Time: {timezone.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+
+Details:
+{details}
+
+Please review admin access logs and take appropriate security measures if necessary.
+
+This is an automated security notification from your University Management System.
+            """
+            
+            # Record the alert; email_sent is set once the outbox delivers it
+            alert = AdminSecurityAlert.objects.create(
+                alert_type=alert_type.lower().replace(' ', '_'),
+                username=username,
+                ip_address=ip_address,
+                details=details,
+            )
+            
+            from ..outbox import OutboundMessage, queue_email
+            queue_email(
+                list(admin_emails), subject, message,
+                category='security_alert', priority=OutboundMessage.PRIORITY_HIGH,
+                reference=f'security_alert:{alert.pk}',
+            )
+            
+    except Exception as e:
+        logger.error(f"Failed to send security alert email: {str(e)}")
+
+
+def generate_and_send_2fa_code(user, ip_address):
+    """Generate and send 2FA code to admin"""
+    try:
+        # Deactivate any existing unused codes for this user
+        AdminTwoFactorCode.objects.filter(
+            user=user,
+            is_used=False
+        ).update(is_used=True)
+        
+        # Generate new code
+        code = AdminTwoFactorCode.generate_code()
+        
+        # Save to database
+        AdminTwoFactorCode.objects.create(
+            user=user,
+            code=code,
+            ip_address=ip_address
+        )
+        
+        # Send email with 2FA code
+        subject = f'🔒 Admin Login Verification Code'
+        message = f"""
+Hello {user.first_name or user.username},
+
+Your admin login verification code is: {code}
+
+This code will expire in 3 minutes.
+
+If you did not request this code, someone may be attempting to access your admin account. Please change your password immediately and contact IT support.
+
+IP Address: {ip_address}
+Time: {timezone.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+
+University Management System Security
+        """
+        
+        # Login codes go ahead of everything else in the outbox
+        from ..outbox import OutboundMessage, queue_email
+        queue_email(
+            [user.email], subject, message,
+            category='2fa', priority=OutboundMessage.PRIORITY_URGENT,
+        )
+        
+        return True
+        
+    except Exception as e:
+        logger.error(f"Failed to generate/send 2FA code: {str(e)}")
+        return False
+
+
+@csrf_protect
+@never_cache
+@require_http_methods(["GET", "POST"])
+def admin_login_view(request):
+    """
+    Admin login view with enhanced security and 2FA
+    """
+    if request.user.is_authenticated and (request.user.is_staff or request.user.is_superuser):
+        return redirect('admin_dashboard')
+    
+    ip_address = get_client_ip(request)
+    user_agent = get_user_agent(request)
+    
+    if request.method == 'POST':
+        username = request.POST.get('username', '').strip()
+        password = request.POST.get('password', '').strip()
+        remember_me = request.POST.get('RememberMe') == 'on'
+        
+        # Basic validation
+        if not username or not password:
+            messages.error(request, 'Please provide both username and password.')
+            return render(request, 'admin/admin_login.html')
+        
+        # Check for too many failed attempts
+        if check_login_attempts(username, ip_address):
+            # Log and alert once per lockout, not for every blocked attempt
+            lockout = get_limiter('admin_login_failures_user').window
+            if first_in_window('admin_login_blocked', f"{ip_address}|{username.lower()}", lockout):
+                AdminLoginAttempt.objects.create(
+                    username=username,
+                    ip_address=ip_address,
+                    user_agent=user_agent,
+                    success=False,
+                    failure_reason='Too many failed attempts'
+                )
+                
+                # Send security alert
+                send_security_alert_email(
+                    'Brute Force Attack',
+                    username,
+                    ip_address,
+                    f'Multiple failed login attempts detected from IP {ip_address} for username {username}. Access temporarily blocked.'
+                )
+            
+            messages.error(request, 'Too many failed login attempts. Access temporarily blocked for security.')
+            return HttpResponseForbidden("Access temporarily blocked due to suspicious activity.")
+        
+        # Authenticate user
+        user = authenticate(request, username=username, password=password)
+        
+        if user is not None:
+            # Check if user is admin/staff
+            if user.is_staff or user.is_superuser:
+                if user.is_active:
+                    # Check if user has email for 2FA
+                    if not user.email:
+                        messages.error(request, 'Admin account must have an email address for 2FA verification.')
+                        AdminLoginAttempt.objects.create(
+                            username=username,
+                            ip_address=ip_address,
+                            user_agent=user_agent,
+                            success=False,
+                            failure_reason='No email for 2FA'
+                        )
+                        return render(request, 'admin/admin_login.html')
+                    
+                    # Generate and send 2FA code
+                    if generate_and_send_2fa_code(user, ip_address):
+                        # Log successful first step
+                        AdminLoginAttempt.objects.create(
+                            username=username,
+                            ip_address=ip_address,
+                            user_agent=user_agent,
+                            success=False,
+                            failure_reason='Pending 2FA verification'
+                        )
+                        
+                        # Store user info in session for 2FA verification
+                        request.session['pending_admin_user_id'] = user.id
+                        request.session['admin_remember_me'] = remember_me
+                        request.session['admin_2fa_start_time'] = timezone.now().timestamp()
+                        
+                        messages.info(request, 'Verification code sent to your email. Please check and enter the code.')
+                        return redirect('admin_2fa_verify')
+                    else:
+                        messages.error(request, 'Failed to send verification code. Please try again.')
+                else:
+                    AdminLoginAttempt.objects.create(
+                        username=username,
+                        ip_address=ip_address,
+                        user_agent=user_agent,
+                        success=False,
+                        failure_reason='Account deactivated'
+                    )
+                    messages.error(request, 'Your account has been deactivated. Please contact support.')
+            else:
+                AdminLoginAttempt.objects.create(
+                    username=username,
+                    ip_address=ip_address,
+                    user_agent=user_agent,
+                    success=False,
+                    failure_reason='Not admin user'
+                )
+                
+                # Send alert for non-admin attempting admin access
+                send_security_alert_email(
+                    'Suspicious Activity',
+                    username,
+                    ip_address,
+                    f'Non-admin user {username} attempted to access admin login from IP {ip_address}'
+                )
+                
+                messages.error(request, 'Access denied. Admin privileges required.')
+                logger.warning(f"Non-admin user attempted admin login: {username}")
+        else:
+            # Log failed authentication
+            AdminLoginAttempt.objects.create(
+                username=username,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                success=False,
+                failure_reason='Invalid credentials'
+            )
+            
+            # Alert once the username reaches its lockout limit
+            recent_failures = count_login_failures(username=username)
+            
+            if recent_failures >= get_limiter('admin_login_failures_user').limit:
+                send_security_alert_email(
+                    'Multiple Login Failures',
+                    username,
+                    ip_address,
+                    f'Multiple failed login attempts for username {username} from IP {ip_address}'
+                )
+            
+            messages.error(request, 'Invalid username or password.')
+            logger.warning(f"Failed admin login attempt for username: {username}")
+    
+    return render(request, 'admin/admin_login.html')
+
+
+@csrf_protect
+@ensure_csrf_cookie
+@never_cache
+@require_http_methods(["GET", "POST"])
+def admin_2fa_verify_view(request):
+    """
+    Verify 2FA code for admin login with improved CSRF handling
+    """
+    if request.user.is_authenticated:
+        return redirect('admin_dashboard')
+    
+    # Check if there's a pending user in session
+    user_id = request.session.get('pending_admin_user_id')
+    start_time = request.session.get('admin_2fa_start_time')
+    
+    if not user_id or not start_time:
+        messages.error(request, 'Session expired. Please login again.')
+        return redirect('admin_login')
+    
+    # Check if 2FA session has expired (5 minutes max)
+    if timezone.now().timestamp() - start_time > 300:  # 5 minutes
+        # Clean up session
+        request.session.pop('pending_admin_user_id', None)
+        request.session.pop('admin_remember_me', None)
+        request.session.pop('admin_2fa_start_time', None)
+        messages.error(request, '2FA session expired. Please login again.')
+        return redirect('admin_login')
+    
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        # Clean up invalid session
+        request.session.pop('pending_admin_user_id', None)
+        request.session.pop('admin_remember_me', None)
+        request.session.pop('admin_2fa_start_time', None)
+        messages.error(request, 'Invalid session. Please login again.')
+        return redirect('admin_login')
+    
+    ip_address = get_client_ip(request)
+    
+    # Handle AJAX requests
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        if request.method == 'POST':
+            try:
+                entered_code = request.POST.get('verification_code', '').strip()
+                
+                if not entered_code:
+                    return JsonResponse({
+                        'success': False,
+                        'error': 'Please enter the verification code.'
+                    })
+                
+                # Find valid code
+                try:
+                    code_obj = AdminTwoFactorCode.objects.get(
+                        user=user,
+                        code=entered_code,
+                        is_used=False,
+                        ip_address=ip_address,
+                        expires_at__gt=timezone.now()
+                    )
+                    
+                    # Mark code as used
+                    code_obj.is_used = True
+                    code_obj.used_at = timezone.now()
+                    code_obj.save()
+                    
+                    # Complete the login
+                    login(request, user)
+                    
+                    # Handle remember me
+                    remember_me = request.session.get('admin_remember_me', False)
+                    if remember_me:
+                        request.session.set_expiry(1209600)  # 2 weeks
+                    else:
+                        request.session.set_expiry(0)  # Browser close
+                    
+                    # Log successful login
+                    AdminLoginAttempt.objects.create(
+                        username=user.username,
+                        ip_address=ip_address,
+                        user_agent=get_user_agent(request),
+                        success=True
+                    )
+                    
+                    # Clean up session
+                    request.session.pop('pending_admin_user_id', None)
+                    request.session.pop('admin_remember_me', None)
+                    request.session.pop('admin_2fa_start_time', None)
+                    
+                    logger.info(f"Admin 2FA login successful for user: {user.username}")
+                    
+                    next_url = request.GET.get('next', '/admin-dashboard/')
+                    return JsonResponse({
+                        'success': True,
+                        'redirect_url': next_url,
+                        'message': f'Welcome back, {user.first_name or user.username}!'
+                    })
+                    
+                except AdminTwoFactorCode.DoesNotExist:
+                    # Log invalid 2FA attempt
+                    AdminLoginAttempt.objects.create(
+                        username=user.username,
+                        ip_address=ip_address,
+                        user_agent=get_user_agent(request),
+                        success=False,
+                        failure_reason='Invalid 2FA code'
+                    )
+                    
+                    # Check for multiple invalid attempts
+                    invalid_attempts = AdminLoginAttempt.objects.filter(
+                        username=user.username,
+                        ip_address=ip_address,
+                        attempt_time__gte=timezone.now() - timedelta(minutes=5),
+                        failure_reason='Invalid 2FA code'
+                    ).count()
+                    
+                    if invalid_attempts >= 3:
+                        # Clear session and send alert
+                        request.session.pop('pending_admin_user_id', None)
+                        request.session.pop('admin_remember_me', None)
+                        request.session.pop('admin_2fa_start_time', None)
+                        
+                        send_security_alert_email(
+                            'Invalid 2FA Attempts',
+                            user.username,
+                            ip_address,
+                            f'Multiple invalid 2FA code attempts for user {user.username} from IP {ip_address}'
+                        )
+                        
+                        return JsonResponse({
+                            'success': False,
+                            'error': 'Too many invalid attempts. Please login again.',
+                            'redirect_url': '/admin-login/'
+                        })
+                    
+                    return JsonResponse({
+                        'success': False,
+                        'error': 'Invalid or expired verification code.'
+                    })
+                    
+            except Exception as e:
+                logger.error(f"2FA verification error: {str(e)}")
+                return JsonResponse({
+                    'success': False,
+                    'error': 'An error occurred during verification. Please try again.'
+                })
+    
+    # Handle regular POST request (fallback)
+    if request.method == 'POST':
+        entered_code = request.POST.get('verification_code', '').strip()
+        
+        if not entered_code:
+            messages.error(request, 'Please enter the verification code.')
+            return render(request, 'admin/admin_2fa_verify.html', {
+                'user_email': user.email[:3] + '*' * (len(user.email) - 6) + user.email[-3:] if user.email else ''
+            })
+        
+        # Find valid code
+        try:
+            code_obj = AdminTwoFactorCode.objects.get(
+                user=user,
+                code=entered_code,
+                is_used=False,
+                ip_address=ip_address,
+                expires_at__gt=timezone.now()
+            )
+            
+            # Mark code as used
+            code_obj.is_used = True
+            code_obj.used_at = timezone.now()
+            code_obj.save()
+            
+            # Complete the login
+            login(request, user)
+            
+            # Handle remember me
+            remember_me = request.session.get('admin_remember_me', False)
+            if remember_me:
+                request.session.set_expiry(1209600)  # 2 weeks
+            else:
+                request.session.set_expiry(0)  # Browser close
+            
+            # Log successful login
+            AdminLoginAttempt.objects.create(
+                username=user.username,
+                ip_address=ip_address,
+                user_agent=get_user_agent(request),
+                success=True
+            )
+            
+            # Clean up session
+            request.session.pop('pending_admin_user_id', None)
+            request.session.pop('admin_remember_me', None)
+            request.session.pop('admin_2fa_start_time', None)
+            
+            logger.info(f"Admin 2FA login successful for user: {user.username}")
+            messages.success(request, f'Welcome back, {user.first_name or user.username}!')
+            
+            next_url = request.GET.get('next', 'admin_dashboard')
+            return redirect(next_url)
+            
+        except AdminTwoFactorCode.DoesNotExist:
+            # Log invalid 2FA attempt
+            AdminLoginAttempt.objects.create(
+                username=user.username,
+                ip_address=ip_address,
+                user_agent=get_user_agent(request),
+                success=False,
+                failure_reason='Invalid 2FA code'
+            )
+            
+            # Check for multiple invalid attempts
+            invalid_attempts = AdminLoginAttempt.objects.filter(
+                username=user.username,
+                ip_address=ip_address,
+                attempt_time__gte=timezone.now() - timedelta(minutes=5),
+                failure_reason='Invalid 2FA code'
+            ).count()
+            
+            if invalid_attempts >= 3:
+                # Clear session and send alert
+                request.session.pop('pending_admin_user_id', None)
+                request.session.pop('admin_remember_me', None)
+                request.session.pop('admin_2fa_start_time', None)
+                
+                send_security_alert_email(
+                    'Invalid 2FA Attempts',
+                    user.username,
+                    ip_address,
+                    f'Multiple invalid 2FA code attempts for user {user.username} from IP {ip_address}'
+                )
+                
+                messages.error(request, 'Too many invalid attempts. Please login again.')
+                return redirect('admin_login')
+            
+            messages.error(request, 'Invalid or expired verification code.')
+    
+    return render(request, 'admin/admin_2fa_verify.html', {
+        'user_email': user.email[:3] + '*' * (len(user.email) - 6) + user.email[-3:] if user.email else ''
+    })
+
+
+@csrf_protect
+@never_cache
+@require_http_methods(["POST"])
+def admin_resend_2fa_code(request):
+    """Resend 2FA code with CSRF protection"""
+    user_id = request.session.get('pending_admin_user_id')
+    if not user_id:
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({
+                'success': False,
+                'error': 'Session expired. Please login again.',
+                'redirect_url': '/admin-login/'
+            })
+        messages.error(request, 'Session expired. Please login again.')
+        return redirect('admin_login')
+    
+    try:
+        user = User.objects.get(id=user_id)
+        ip_address = get_client_ip(request)
+        
+        # Check if too many codes were sent recently
+        recent_codes = AdminTwoFactorCode.objects.filter(
+            user=user,
+            created_at__gte=timezone.now() - timedelta(minutes=5)
+        ).count()
+        
+        if recent_codes >= 3:
+            error_msg = 'Too many verification codes requested. Please try again later.'
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({'success': False, 'error': error_msg})
+            messages.error(request, error_msg)
+            return redirect('admin_2fa_verify')
+        
+        if generate_and_send_2fa_code(user, ip_address):
+            # Update session timestamp
+            request.session['admin_2fa_start_time'] = timezone.now().timestamp()
+            
+            success_msg = 'New verification code sent to your email.'
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({'success': True, 'message': success_msg})
+            messages.success(request, success_msg)
+        else:
+            error_msg = 'Failed to send verification code. Please try again.'
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({'success': False, 'error': error_msg})
+            messages.error(request, error_msg)
+            
+    except User.DoesNotExist:
+        # Clean up invalid session
+        request.session.pop('pending_admin_user_id', None)
+        request.session.pop('admin_remember_me', None)
+        request.session.pop('admin_2fa_start_time', None)
+        
+        error_msg = 'Invalid session. Please login again.'
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({
+                'success': False,
+                'error': error_msg,
+                'redirect_url': '/admin-login/'
+            })
+        messages.error(request, error_msg)
+        return redirect('admin_login')
+    
+    return redirect('admin_2fa_verify')
+
+
+@login_required
+def admin_logout_view(request):
+    """
+    Admin logout view
+    """
+    username = request.user.username
+    logout(request)
+    messages.success(request, 'You have been successfully logged out.')
+    logger.info(f"Admin logout for user: {username}")
+    return redirect('admin_login')
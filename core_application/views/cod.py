@@ -0,0 +1,3656 @@
+# cod.py - Chair of department: courses, lecturers, results, promotions,
+# applications, consultations and research
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import wraps
+import json
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db.models import Avg, Count, F, Q, Sum
+from django.http import HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from ..models import (
+    AcademicYear, Assignment, AssignmentSubmission, Attendance, ClearanceRequest, Course,
+    DefermentApplication, Department, Enrollment, Examination, FeePayment, FeeStructure, Grade,
+    Lecturer, LecturerCourseAssignment, Programme, ProgrammeCourse, Research, Semester,
+    SpecialExamApplication, Student, Timetable,
+)
+
+
+# Decorator to check if user is COD
+def cod_required(view_func):
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return redirect('admin_login')
+        
+        if request.user.user_type != 'cod':
+            messages.error(request, 'Access denied. COD privileges required.')
+            return HttpResponseForbidden('Access Denied: COD privileges required')
+        
+        # Check if user is head of a department
+        if request.role.department_id is None:
+            messages.error(request, 'You are not assigned as head of any department.')
+            return redirect('admin_dashboard')
+        
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+@login_required
+@cod_required
+def cod_dashboard(request):
+    """Enhanced COD Dashboard with comprehensive analytics"""
+    department = request.role.department
+    current_semester = Semester.objects.filter(is_current=True).first()
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Basic Statistics
+    total_lecturers = Lecturer.objects.filter(department=department, is_active=True).count()
+    total_programmes = Programme.objects.filter(department=department, is_active=True).count()
+    total_courses = Course.objects.filter(department=department, is_active=True).count()
+    
+    # Students in department programmes
+    total_students = Student.objects.filter(
+        programme__department=department,
+        status='active'
+    ).count()
+    
+    # Current semester enrollments
+    current_enrollments = Enrollment.objects.filter(
+        course__department=department,
+        semester=current_semester,
+        is_active=True
+    ).count() if current_semester else 0
+    
+    # Pending applications
+    pending_deferments = DefermentApplication.objects.filter(
+        student__programme__department=department,
+        status='pending'
+    ).count()
+    
+    pending_special_exams = SpecialExamApplication.objects.filter(
+        course__department=department,
+        status='pending'
+    ).count()
+    
+    pending_clearances = ClearanceRequest.objects.filter(
+        student__programme__department=department,
+        clearance_type='department',
+        status='pending'
+    ).count()
+    
+    # Recent activities
+    recent_enrollments = Enrollment.objects.filter(
+        course__department=department,
+        semester=current_semester
+    ).select_related('student__user', 'course').order_by('-enrollment_date')[:5]
+    
+    # ============ ANALYTICS DATA FOR CHARTS ============
+    
+    # 1. Programme Enrollment Distribution (Donut Chart)
+    programme_enrollments = Student.objects.filter(
+        programme__department=department,
+        status='active'
+    ).values('programme__name').annotate(
+        count=Count('id')
+    ).order_by('-count')
+    
+    programme_chart_data = {
+        'labels': [p['programme__name'] for p in programme_enrollments],
+        'data': [p['count'] for p in programme_enrollments],
+        'colors': ['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6', '#1abc9c']
+    }
+    
+    # 2. Student Gender Distribution (Pie Chart)
+    gender_distribution = Student.objects.filter(
+        programme__department=department,
+        status='active'
+    ).values('user__gender').annotate(
+        count=Count('id')
+    )
+    
+    gender_chart_data = {
+        'labels': [g['user__gender'].title() if g['user__gender'] else 'Not Specified' 
+                   for g in gender_distribution],
+        'data': [g['count'] for g in gender_distribution],
+        'colors': ['#3498db', '#e74c3c', '#95a5a6']
+    }
+    
+    # 3. Course Enrollment Trend (Line Chart - Last 6 Semesters)
+    last_6_semesters = Semester.objects.filter(
+        academic_year__in=AcademicYear.objects.order_by('-year')[:3]
+    ).order_by('academic_year__year', 'semester_number')[:6]
+    
+    enrollment_trend_data = {
+        'labels': [],
+        'data': []
+    }
+    
+    for semester in last_6_semesters:
+        label = f"{semester.academic_year.year} S{semester.semester_number}"
+        enrollment_count = Enrollment.objects.filter(
+            course__department=department,
+            semester=semester,
+            is_active=True
+        ).count()
+        enrollment_trend_data['labels'].append(label)
+        enrollment_trend_data['data'].append(enrollment_count)
+    
+    # 4. Course Performance by Level (Bar Chart)
+    course_levels = ['100', '200', '300', '400', '500', '600']
+    performance_data = {
+        'labels': [f'Level {level}' for level in course_levels],
+        'data': []
+    }
+    
+    for level in course_levels:
+        avg_grade = Grade.objects.filter(
+            enrollment__course__department=department,
+            enrollment__course__level=level,
+            enrollment__semester=current_semester
+        ).aggregate(avg=Avg('grade_points'))['avg'] or 0
+        performance_data['data'].append(round(float(avg_grade), 2))
+    
+    # 5. Lecturer Workload Distribution (Horizontal Bar Chart)
+    lecturer_workload = LecturerCourseAssignment.objects.filter(
+        course__department=department,
+        semester=current_semester,
+        is_active=True
+    ).select_related('lecturer__user').values(
+        'lecturer__user__first_name', 
+        'lecturer__user__last_name'
+    ).annotate(
+        total_courses=Count('id')
+    ).order_by('-total_courses')[:8]
+    
+    workload_chart_data = {
+        'labels': [f"{l['lecturer__user__first_name']} {l['lecturer__user__last_name']}" 
+                   for l in lecturer_workload],
+        'data': [l['total_courses'] for l in lecturer_workload]
+    }
+    
+    # 6. Assignment Submission Rate (Donut Chart)
+    if current_semester:
+        total_assignments = Assignment.objects.filter(
+            lecturer_assignment__course__department=department,
+            lecturer_assignment__semester=current_semester,
+            is_published=True
+        ).count()
+        
+        submitted_assignments = AssignmentSubmission.objects.filter(
+            assignment__lecturer_assignment__course__department=department,
+            assignment__lecturer_assignment__semester=current_semester,
+            is_submitted=True
+        ).count()
+        
+        expected_submissions = total_assignments * current_enrollments if total_assignments > 0 else 1
+        submission_rate = (submitted_assignments / expected_submissions * 100) if expected_submissions > 0 else 0
+        
+        submission_chart_data = {
+            'labels': ['Submitted', 'Pending'],
+            'data': [
+                round(submission_rate, 2),
+                round(100 - submission_rate, 2)
+            ],
+            'colors': ['#2ecc71', '#e74c3c']
+        }
+    else:
+        submission_chart_data = {
+            'labels': ['Submitted', 'Pending'],
+            'data': [0, 100],
+            'colors': ['#2ecc71', '#e74c3c']
+        }
+    
+    # 7. Student Status Distribution (Bar Chart)
+    status_distribution = Student.objects.filter(
+        programme__department=department
+    ).values('status').annotate(
+        count=Count('id')
+    ).order_by('-count')
+    
+    status_chart_data = {
+        'labels': [s['status'].replace('_', ' ').title() for s in status_distribution],
+        'data': [s['count'] for s in status_distribution]
+    }
+    
+    # 8. Course Type Distribution (Pie Chart)
+    course_types = Course.objects.filter(
+        department=department,
+        is_active=True
+    ).values('course_type').annotate(
+        count=Count('id')
+    )
+    
+    course_type_chart_data = {
+        'labels': [c['course_type'].replace('_', ' ').title() for c in course_types],
+        'data': [c['count'] for c in course_types],
+        'colors': ['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6']
+    }
+    
+    # 9. Student Admission Trend (Line Chart - Last 5 Years)
+    current_year = timezone.now().year
+    admission_years = range(current_year - 4, current_year + 1)
+    
+    admission_trend_data = {
+        'labels': [str(year) for year in admission_years],
+        'data': []
+    }
+    
+    for year in admission_years:
+        count = Student.objects.filter(
+            programme__department=department,
+            admission_date__year=year
+        ).count()
+        admission_trend_data['data'].append(count)
+    
+    # 10. Grade Distribution (Bar Chart)
+    grade_distribution = Grade.objects.filter(
+        enrollment__course__department=department,
+        enrollment__semester=current_semester
+    ).values('grade').annotate(
+        count=Count('id')
+    ).order_by('grade')
+    
+    grade_chart_data = {
+        'labels': [g['grade'] for g in grade_distribution if g['grade']],
+        'data': [g['count'] for g in grade_distribution if g['grade']]
+    }
+    
+    # 11. Attendance Rate by Course (Horizontal Bar Chart)
+    if current_semester:
+        courses_with_attendance = Course.objects.filter(
+            department=department,
+            is_active=True,
+            timetable_slots__semester=current_semester
+        ).annotate(
+            total_sessions=Count('timetable_slots__attendance_sessions'),
+            total_attendance=Count('timetable_slots__attendance_records')
+        ).filter(total_sessions__gt=0)[:8]
+        
+        attendance_by_course_data = {
+            'labels': [course.code for course in courses_with_attendance],
+            'data': []
+        }
+        
+        for course in courses_with_attendance:
+            enrolled = Enrollment.objects.filter(
+                course=course,
+                semester=current_semester,
+                is_active=True
+            ).count()
+            expected_attendance = course.total_sessions * enrolled if enrolled > 0 else 1
+            rate = (course.total_attendance / expected_attendance * 100) if expected_attendance > 0 else 0
+            attendance_by_course_data['data'].append(round(rate, 2))
+    else:
+        attendance_by_course_data = {
+            'labels': [],
+            'data': []
+        }
+    
+    # 12. Recent Applications Status (Stacked Bar Chart)
+    recent_months = []
+    for i in range(5, -1, -1):
+        month = timezone.now() - timedelta(days=30 * i)
+        recent_months.append(month.strftime('%b %Y'))
+    
+    applications_trend = {
+        'labels': recent_months,
+        'deferments': [],
+        'special_exams': [],
+        'clearances': []
+    }
+    
+    for i in range(5, -1, -1):
+        month = timezone.now() - timedelta(days=30 * i)
+        start_date = month.replace(day=1)
+        end_date = (start_date + timedelta(days=32)).replace(day=1)
+        
+        deferments = DefermentApplication.objects.filter(
+            student__programme__department=department,
+            application_date__gte=start_date,
+            application_date__lt=end_date
+        ).count()
+        
+        special_exams = SpecialExamApplication.objects.filter(
+            course__department=department,
+            application_date__gte=start_date,
+            application_date__lt=end_date
+        ).count()
+        
+        clearances = ClearanceRequest.objects.filter(
+            student__programme__department=department,
+            clearance_type='department',
+            request_date__gte=start_date,
+            request_date__lt=end_date
+        ).count()
+        
+        applications_trend['deferments'].append(deferments)
+        applications_trend['special_exams'].append(special_exams)
+        applications_trend['clearances'].append(clearances)
+    
+    # Top Performing Students
+    top_students = Student.objects.filter(
+        programme__department=department,
+        status='active',
+        cumulative_gpa__isnull=False
+    ).select_related('user', 'programme').order_by('-cumulative_gpa')[:5]
+    
+    # Recent Activities with Icons
+    recent_activities = []
+    
+    # Recent assignments
+    recent_assignments = Assignment.objects.filter(
+        lecturer_assignment__course__department=department,
+        lecturer_assignment__semester=current_semester
+    ).select_related('lecturer_assignment__course').order_by('-posted_date')[:3]
+    
+    for assignment in recent_assignments:
+        recent_activities.append({
+            'icon': 'fa-file-alt',
+            'color': 'primary',
+            'message': f"New assignment posted for {assignment.lecturer_assignment.course.code}",
+            'date': assignment.posted_date
+        })
+    
+    # Recent deferments
+    recent_defer = DefermentApplication.objects.filter(
+        student__programme__department=department
+    ).select_related('student__user').order_by('-application_date')[:2]
+    
+    for defer in recent_defer:
+        recent_activities.append({
+            'icon': 'fa-pause-circle',
+            'color': 'warning',
+            'message': f"Deferment application from {defer.student.student_id}",
+            'date': defer.application_date
+        })
+    
+    # Sort by date
+    recent_activities.sort(key=lambda x: x['date'], reverse=True)
+    recent_activities = recent_activities[:10]
+    
+    context = {
+        'department': department,
+        'current_semester': current_semester,
+        'current_academic_year': current_academic_year,
+        'total_lecturers': total_lecturers,
+        'total_programmes': total_programmes,
+        'total_courses': total_courses,
+        'total_students': total_students,
+        'current_enrollments': current_enrollments,
+        'pending_deferments': pending_deferments,
+        'pending_special_exams': pending_special_exams,
+        'pending_clearances': pending_clearances,
+        'recent_enrollments': recent_enrollments,
+        'top_students': top_students,
+        'recent_activities': recent_activities,
+        
+        # Chart Data (JSON encoded for JavaScript)
+        'programme_chart_data': json.dumps(programme_chart_data),
+        'gender_chart_data': json.dumps(gender_chart_data),
+        'enrollment_trend_data': json.dumps(enrollment_trend_data),
+        'performance_data': json.dumps(performance_data),
+        'workload_chart_data': json.dumps(workload_chart_data),
+        'submission_chart_data': json.dumps(submission_chart_data),
+        'status_chart_data': json.dumps(status_chart_data),
+        'course_type_chart_data': json.dumps(course_type_chart_data),
+        'admission_trend_data': json.dumps(admission_trend_data),
+        'grade_chart_data': json.dumps(grade_chart_data),
+        'attendance_by_course_data': json.dumps(attendance_by_course_data),
+        'applications_trend': json.dumps(applications_trend),
+    }
+    
+    return render(request, 'cod/dashboard.html', context)
+
+
+@login_required
+@cod_required
+def department_info(request):
+    """View and manage department information with student statistics"""
+    department = request.role.department
+    
+    if not department:
+        messages.error(request, 'No department assigned to you.')
+        return redirect('cod_dashboard')
+    
+    # Get current academic year
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    if request.method == 'POST':
+        # Update department information
+        department.description = request.POST.get('description')
+        department.save()
+        messages.success(request, 'Department information updated successfully.')
+        return redirect('cod_department_info')
+    
+    # Get all programmes in the department
+    programmes = department.programmes.filter(is_active=True).order_by('name')
+    
+    # Prepare programme statistics
+    programme_stats = []
+    for programme in programmes:
+        # Count students by year for current academic year
+        year_stats = []
+        for year in range(1, programme.duration_years + 1):
+            student_count = Student.objects.filter(
+                programme=programme,
+                current_year=year,
+                status='active'
+            ).count()
+            
+            year_stats.append({
+                'year': year,
+                'count': student_count
+            })
+        
+        total_students = sum(y['count'] for y in year_stats)
+        
+        programme_stats.append({
+            'programme': programme,
+            'year_stats': year_stats,
+            'total': total_students
+        })
+    
+    # Overall department statistics
+    total_department_students = Student.objects.filter(
+        programme__department=department,
+        status='active'
+    ).count()
+    
+    context = {
+        'department': department,
+        'current_academic_year': current_academic_year,
+        'programme_stats': programme_stats,
+        'total_department_students': total_department_students,
+        'total_programmes': programmes.count(),
+        'total_courses': department.courses.filter(is_active=True).count(),
+        'total_lecturers': department.lecturers.filter(is_active=True).count(),
+    }
+    return render(request, 'cod/department_info.html', context)
+
+
+# Programmes Management
+@login_required
+@cod_required
+def department_programmes(request):
+    """List all programmes in the department"""
+    department = request.role.department
+    programmes = Programme.objects.filter(department=department).select_related('faculty')
+    
+    context = {
+        'department': department,
+        'programmes': programmes,
+    }
+    return render(request, 'cod/programmes.html', context)
+
+
+# Courses Management
+@login_required
+@cod_required
+def department_courses(request):
+    """List all courses in the department"""
+    department = request.role.department
+    courses = Course.objects.filter(department=department).prefetch_related('prerequisites')
+    
+    context = {
+        'department': department,
+        'courses': courses,
+    }
+    return render(request, 'cod/courses.html', context)
+
+
+# Lecturers Management
+@login_required
+@cod_required
+def lecturers_list(request):
+    """List all lecturers in the department"""
+    department = request.role.department
+    lecturers = Lecturer.objects.filter(
+        department=department,
+        is_active=True
+    ).select_related('user')
+    
+    context = {
+        'department': department,
+        'lecturers': lecturers,
+    }
+    return render(request, 'cod/lecturers_list.html', context)
+
+
+@login_required
+@cod_required
+def lecturer_detail(request, lecturer_id):
+    """View detailed information about a lecturer"""
+    department = request.role.department
+    lecturer = get_object_or_404(Lecturer, id=lecturer_id, department=department)
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get current assignments
+    current_assignments = LecturerCourseAssignment.objects.filter(
+        lecturer=lecturer,
+        semester=current_semester,
+        is_active=True
+    ).select_related('course', 'academic_year')
+    
+    context = {
+        'department': department,
+        'lecturer': lecturer,
+        'current_semester': current_semester,
+        'current_assignments': current_assignments,
+    }
+    return render(request, 'cod/lecturer_detail.html', context)
+
+
+# Course Assignments
+@login_required
+@cod_required
+def course_assignments(request):
+    """Manage lecturer course assignments"""
+    department = request.role.department
+    current_semester = Semester.objects.filter(is_current=True).first()
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    assignments = LecturerCourseAssignment.objects.filter(
+        course__department=department,
+        semester=current_semester,
+        is_active=True
+    ).select_related('lecturer__user', 'course', 'academic_year')
+    
+    # Get unassigned courses
+    assigned_course_ids = assignments.values_list('course_id', flat=True)
+    unassigned_courses = Course.objects.filter(
+        department=department,
+        is_active=True
+    ).exclude(id__in=assigned_course_ids)
+    
+    lecturers = Lecturer.objects.filter(department=department, is_active=True)
+    
+    context = {
+        'department': department,
+        'current_semester': current_semester,
+        'current_academic_year': current_academic_year,
+        'assignments': assignments,
+        'unassigned_courses': unassigned_courses,
+        'lecturers': lecturers,
+    }
+    return render(request, 'cod/course_assignments.html', context)
+
+
+@login_required
+@cod_required
+def assign_course(request):
+    """Assign a course to a lecturer"""
+    if request.method == 'POST':
+        department = request.role.department
+        course_id = request.POST.get('course_id')
+        lecturer_id = request.POST.get('lecturer_id')
+        
+        course = get_object_or_404(Course, id=course_id, department=department)
+        lecturer = get_object_or_404(Lecturer, id=lecturer_id, department=department)
+        current_semester = Semester.objects.filter(is_current=True).first()
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        
+        # Check if already assigned
+        existing = LecturerCourseAssignment.objects.filter(
+            lecturer=lecturer,
+            course=course,
+            semester=current_semester,
+            academic_year=current_academic_year
+        ).first()
+        
+        if existing:
+            messages.warning(request, 'This course is already assigned to this lecturer.')
+        else:
+            LecturerCourseAssignment.objects.create(
+                lecturer=lecturer,
+                course=course,
+                semester=current_semester,
+                academic_year=current_academic_year,
+                assigned_by=request.user,
+                lecture_venue=request.POST.get('lecture_venue', ''),
+                lecture_time=request.POST.get('lecture_time', ''),
+            )
+            messages.success(request, f'{course.name} assigned to {lecturer.user.get_full_name()} successfully.')
+        
+        return redirect('cod_course_assignments')
+    
+    return redirect('cod_course_assignments')
+
+
+@login_required
+@cod_required
+def unassign_course(request, assignment_id):
+    """Remove a course assignment"""
+    department = request.role.department
+    assignment = get_object_or_404(
+        LecturerCourseAssignment,
+        id=assignment_id,
+        course__department=department
+    )
+    
+    assignment.is_active = False
+    assignment.save()
+    
+    messages.success(request, 'Course assignment removed successfully.')
+    return redirect('cod_course_assignments')
+
+
+# Workload Analysis
+@login_required
+@cod_required
+def workload_analysis(request):
+    """Analyze lecturer workload distribution"""
+    department = request.role.department
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    workload_data = Lecturer.objects.filter(
+        department=department,
+        is_active=True
+    ).annotate(
+        total_courses=Count(
+            'course_assignments',
+            filter=Q(
+                course_assignments__semester=current_semester,
+                course_assignments__is_active=True
+            )
+        ),
+        total_credit_hours=Sum(
+            'course_assignments__course__credit_hours',
+            filter=Q(
+                course_assignments__semester=current_semester,
+                course_assignments__is_active=True
+            )
+        )
+    ).select_related('user').order_by('-total_courses')
+    
+    context = {
+        'department': department,
+        'current_semester': current_semester,
+        'workload_data': workload_data,
+    }
+    return render(request, 'cod/workload_analysis.html', context)
+
+
+# Students Management
+@login_required
+@cod_required
+def students_list(request):
+    """List all students in department programmes with advanced filtering"""
+    department = request.role.department
+    
+    # Get filter parameters
+    search_query = request.GET.get('search', '')
+    programme_id = request.GET.get('programme', '')
+    year = request.GET.get('year', '')
+    semester = request.GET.get('semester', '')
+    status = request.GET.get('status', '')
+    admission_type = request.GET.get('admission_type', '')
+    sponsor_type = request.GET.get('sponsor_type', '')
+    
+    # Base queryset
+    students = Student.objects.filter(
+        programme__department=department
+    ).select_related(
+        'user', 
+        'programme', 
+        'programme__department'
+    ).prefetch_related(
+        'enrollments'
+    )
+    
+    # Apply search filter
+    if search_query:
+        from ..people_search import filter_people
+        students = filter_people(students, search_query, 'student')
+    
+    # Apply filters
+    if programme_id:
+        students = students.filter(programme_id=programme_id)
+    if year:
+        students = students.filter(current_year=year)
+    if semester:
+        students = students.filter(current_semester=semester)
+    if status:
+        students = students.filter(status=status)
+    if admission_type:
+        students = students.filter(admission_type=admission_type)
+    if sponsor_type:
+        students = students.filter(sponsor_type=sponsor_type)
+    
+    # Order by most recent first
+    students = students.order_by('-admission_date', 'user__first_name')
+    
+    # Get statistics
+    total_students = students.count()
+    active_students = students.filter(status='active').count()
+    deferred_students = students.filter(status='deferred').count()
+    suspended_students = students.filter(status='suspended').count()
+    graduated_students = students.filter(status='graduated').count()
+    
+    # Get programmes for filter
+    programmes = Programme.objects.filter(department=department).order_by('name')
+    
+    # Pagination
+    paginator = Paginator(students, 25)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Choices for filters (assuming these are defined in your Student model)
+    status_choices = Student.STATUS_CHOICES if hasattr(Student, 'STATUS_CHOICES') else [
+        ('active', 'Active'),
+        ('deferred', 'Deferred'),
+        ('suspended', 'Suspended'),
+        ('graduated', 'Graduated'),
+        ('discontinued', 'Discontinued'),
+    ]
+    
+    year_choices = [(i, f'Year {i}') for i in range(1, 6)]
+    semester_choices = [(i, f'Semester {i}') for i in range(1, 3)]
+    
+    admission_type_choices = Student.ADMISSION_TYPE_CHOICES if hasattr(Student, 'ADMISSION_TYPE_CHOICES') else [
+        ('regular', 'Regular'),
+        ('direct', 'Direct Entry'),
+        ('transfer', 'Transfer'),
+    ]
+    
+    sponsor_type_choices = Student.SPONSOR_TYPE_CHOICES if hasattr(Student, 'SPONSOR_TYPE_CHOICES') else [
+        ('self', 'Self Sponsored'),
+        ('government', 'Government'),
+        ('scholarship', 'Scholarship'),
+        ('company', 'Company'),
+    ]
+    
+    context = {
+        'department': department,
+        'page_obj': page_obj,
+        'students': page_obj,  # For template compatibility
+        'programmes': programmes,
+        'total_students': total_students,
+        'active_students': active_students,
+        'deferred_students': deferred_students,
+        'suspended_students': suspended_students,
+        'graduated_students': graduated_students,
+        
+        # Filter values
+        'search_query': search_query,
+        'programme_filter': programme_id,
+        'year_filter': year,
+        'semester_filter': semester,
+        'status_filter': status,
+        'admission_type_filter': admission_type,
+        'sponsor_type_filter': sponsor_type,
+        
+        # Choices for dropdowns
+        'status_choices': status_choices,
+        'year_choices': year_choices,
+        'semester_choices': semester_choices,
+        'admission_type_choices': admission_type_choices,
+        'sponsor_type_choices': sponsor_type_choices,
+    }
+    
+    return render(request, 'cod/students_list.html', context)
+
+
+@login_required
+@cod_required
+def cod_student_detail(request, student_id):
+    """View detailed student information with comprehensive data"""
+    department = request.role.department
+    
+    if not department:
+        messages.error(request, "You are not assigned as head of any department.")
+        return redirect('dashboard')
+    
+    # Get student with related data
+    student = get_object_or_404(
+        Student.objects.select_related(
+            'user',
+            'programme',
+            'programme__department',
+            'programme__faculty'
+        ),
+        id=student_id,
+        programme__department=department
+    )
+    
+    # Get all academic years and semesters
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    
+    # Get enrollments with related data
+    enrollments = Enrollment.objects.filter(
+        student=student
+    ).select_related(
+        'course',
+        'semester',
+        'semester__academic_year',
+        'lecturer__user'
+    ).order_by('-semester__start_date', 'course__code')
+    
+    # Separate current and past enrollments
+    current_enrollments = enrollments.filter(is_active=True)
+    past_enrollments = enrollments.filter(is_active=False)
+    
+    # Get grades with detailed information
+    grades = Grade.objects.filter(
+        enrollment__student=student
+    ).select_related(
+        'enrollment__course',
+        'enrollment__semester',
+        'enrollment__semester__academic_year'
+    ).order_by('-enrollment__semester__start_date')
+    
+    # Calculate academic statistics
+    academic_stats = grades.aggregate(
+        avg_total=Avg('total_marks'),
+        avg_grade_points=Avg('grade_points'),
+        total_courses=Count('id', distinct=True)
+    )
+    
+    # Grade distribution
+    grade_distribution = {}
+    for grade in grades:
+        grade_letter = grade.grade
+        grade_distribution[grade_letter] = grade_distribution.get(grade_letter, 0) + 1
+    
+    # Get attendance records
+    attendance_records = Attendance.objects.filter(
+        student=student
+    ).select_related(
+        'timetable_slot__course',
+        'attendance_session'
+    ).order_by('-attendance_session__session_date')
+    
+    # Calculate attendance statistics
+    total_sessions = attendance_records.count()
+    present_count = attendance_records.filter(status='present').count()
+    attendance_percentage = (present_count / total_sessions * 100) if total_sessions > 0 else 0
+    
+    # Organize enrollments by academic year and semester
+    enrollments_by_period = {}
+    for enrollment in enrollments:
+        year_key = enrollment.semester.academic_year.year
+        semester_key = enrollment.semester.semester_number
+        
+        if year_key not in enrollments_by_period:
+            enrollments_by_period[year_key] = {}
+        
+        if semester_key not in enrollments_by_period[year_key]:
+            enrollments_by_period[year_key][semester_key] = {
+                'enrollments': [],
+                'semester_obj': enrollment.semester
+            }
+        
+        enrollments_by_period[year_key][semester_key]['enrollments'].append(enrollment)
+    
+    # Calculate semester-wise performance with detailed stats
+    semester_performance = {}
+    for enrollment in enrollments:
+        semester_key = f"{enrollment.semester.academic_year.year}|{enrollment.semester.semester_number}"
+        semester_display = f"{enrollment.semester.academic_year.year} - Semester {enrollment.semester.semester_number}"
+        
+        if semester_key not in semester_performance:
+            semester_performance[semester_key] = {
+                'display': semester_display,
+                'year': enrollment.semester.academic_year.year,
+                'semester': enrollment.semester.semester_number,
+                'enrollments': [],
+                'total_courses': 0,
+                'completed_courses': 0,
+                'gpa': 0,
+                'total_credits': 0,
+                'total_marks': 0,
+                'grade_points_sum': 0,
+                'credits_earned': 0
+            }
+        
+        semester_performance[semester_key]['enrollments'].append(enrollment)
+        semester_performance[semester_key]['total_courses'] += 1
+        
+        # Check if course is completed (has grade)
+        try:
+            grade_obj = enrollment.grade
+            if grade_obj:
+                semester_performance[semester_key]['completed_courses'] += 1
+                semester_performance[semester_key]['grade_points_sum'] += grade_obj.grade_points or 0
+                semester_performance[semester_key]['total_marks'] += grade_obj.total_marks or 0
+                semester_performance[semester_key]['total_credits'] += enrollment.course.credit_hours or 0
+                
+                if grade_obj.is_passed:
+                    semester_performance[semester_key]['credits_earned'] += enrollment.course.credit_hours or 0
+        except Grade.DoesNotExist:
+            pass
+    
+    # Calculate average GPA and marks for each semester
+    for semester_key in semester_performance:
+        completed = semester_performance[semester_key]['completed_courses']
+        if completed > 0:
+            semester_performance[semester_key]['gpa'] = semester_performance[semester_key]['grade_points_sum'] / completed
+            semester_performance[semester_key]['avg_marks'] = semester_performance[semester_key]['total_marks'] / completed
+    
+    # Prepare performance chart data
+    performance_chart_data = {
+        'labels': [],
+        'gpa_data': [],
+        'avg_marks_data': []
+    }
+    
+    for semester_key in sorted(semester_performance.keys()):
+        perf = semester_performance[semester_key]
+        performance_chart_data['labels'].append(f"Y{perf['year'][-4:]} S{perf['semester']}")
+        performance_chart_data['gpa_data'].append(round(perf['gpa'], 2))
+        performance_chart_data['avg_marks_data'].append(round(perf.get('avg_marks', 0), 2))
+    
+    # Organize attendance by semester
+    attendance_by_semester = {}
+    for record in attendance_records:
+        semester_key = f"{record.attendance_session.semester.academic_year.year}|{record.attendance_session.semester.semester_number}"
+        
+        if semester_key not in attendance_by_semester:
+            attendance_by_semester[semester_key] = {
+                'year': record.attendance_session.semester.academic_year.year,
+                'semester': record.attendance_session.semester.semester_number,
+                'records': [],
+                'total': 0,
+                'present': 0,
+                'absent': 0,
+                'late': 0
+            }
+        
+        attendance_by_semester[semester_key]['records'].append(record)
+        attendance_by_semester[semester_key]['total'] += 1
+        
+        if record.status == 'present':
+            attendance_by_semester[semester_key]['present'] += 1
+        elif record.status == 'absent':
+            attendance_by_semester[semester_key]['absent'] += 1
+        elif record.status == 'late':
+            attendance_by_semester[semester_key]['late'] += 1
+    
+    # Calculate attendance percentage for each semester
+    for semester_key in attendance_by_semester:
+        total = attendance_by_semester[semester_key]['total']
+        present = attendance_by_semester[semester_key]['present']
+        attendance_by_semester[semester_key]['percentage'] = (present / total * 100) if total > 0 else 0
+    
+    context = {
+        'department': department,
+        'student': student,
+        
+        # Enrollment data
+        'enrollments': enrollments,
+        'current_enrollments': current_enrollments,
+        'past_enrollments': past_enrollments,
+        'total_enrollments': enrollments.count(),
+        'active_enrollments': current_enrollments.count(),
+        'enrollments_by_period': enrollments_by_period,
+        
+        # Academic performance
+        'grades': grades,
+        'academic_stats': academic_stats,
+        'grade_distribution': grade_distribution,
+        'semester_performance': semester_performance,
+        'performance_chart_data': performance_chart_data,
+        
+        # Attendance
+        'attendance_records': attendance_records[:20],
+        'attendance_by_semester': attendance_by_semester,
+        'total_sessions': total_sessions,
+        'present_count': present_count,
+        'absent_count': attendance_records.filter(status='absent').count(),
+        'late_count': attendance_records.filter(status='late').count(),
+        'attendance_percentage': round(attendance_percentage, 2),
+        
+        # Academic years for filtering
+        'academic_years': academic_years,
+        
+        # Statistics
+        'total_credits_completed': sum([e.course.credit_hours for e in past_enrollments if e.course.credit_hours and hasattr(e, 'grade') and e.grade.is_passed]),
+        'cgpa': student.cumulative_gpa if student.cumulative_gpa else 0,
+    }
+    
+    return render(request, 'cod/student_detail.html', context)
+
+
+# Enrollments
+@login_required
+@cod_required
+def enrollments_list(request):
+    """View enrollments for department courses"""
+    department = request.role.department
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    enrollments = Enrollment.objects.filter(
+        course__department=department,
+        semester=current_semester
+    ).select_related('student__user', 'course', 'lecturer__user')
+    
+    context = {
+        'department': department,
+        'current_semester': current_semester,
+        'enrollments': enrollments,
+    }
+    return render(request, 'cod/enrollments_list.html', context)
+
+
+# Student Performance
+@login_required
+@cod_required
+def student_performance(request):
+    """Analyze student performance in department"""
+    department = request.role.department
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Programme-wise performance
+    programme_performance = Programme.objects.filter(
+        department=department
+    ).annotate(
+        total_students=Count('students', filter=Q(students__status='active')),
+        avg_gpa=Avg('students__cumulative_gpa')
+    )
+    
+    # Course-wise pass rates
+    course_performance = Course.objects.filter(
+        department=department
+    ).annotate(
+        total_enrollments=Count('enrollments'),
+        passed=Count('enrollments__grade', filter=Q(enrollments__grade__is_passed=True))
+    )
+    
+    context = {
+        'department': department,
+        'current_semester': current_semester,
+        'programme_performance': programme_performance,
+        'course_performance': course_performance,
+    }
+    return render(request, 'cod/student_performance.html', context)
+
+
+# Timetable Management
+@login_required
+@cod_required
+def view_timetable(request):
+    """View department timetable"""
+    department = request.role.department
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    timetable_slots = Timetable.objects.filter(
+        course__department=department,
+        semester=current_semester,
+        is_active=True
+    ).select_related('course', 'lecturer__user', 'programme').order_by('day_of_week', 'start_time')
+    
+    context = {
+        'department': department,
+        'current_semester': current_semester,
+        'timetable_slots': timetable_slots,
+    }
+    return render(request, 'cod/view_timetable.html', context)
+
+
+# Examination Management
+@login_required
+@cod_required
+def exam_schedule(request):
+    """View and manage exam schedules"""
+    department = request.role.department
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    examinations = Examination.objects.filter(
+        course__department=department,
+        semester=current_semester
+    ).select_related('course').prefetch_related('invigilators').order_by('exam_date', 'start_time')
+    
+    context = {
+        'department': department,
+        'current_semester': current_semester,
+        'examinations': examinations,
+    }
+    return render(request, 'cod/exam_schedule.html', context)
+
+
+@login_required
+@cod_required
+def marks_approval(request):
+    """Approve marks submitted by lecturers"""
+    department = request.role.department
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get courses with submitted marks pending approval
+    pending_marks = Grade.objects.filter(
+        enrollment__course__department=department,
+        enrollment__semester=current_semester,
+        total_marks__isnull=False
+    ).select_related('enrollment__student__user', 'enrollment__course')
+    
+    context = {
+        'department': department,
+        'current_semester': current_semester,
+        'pending_marks': pending_marks,
+    }
+    return render(request, 'cod/marks_approval.html', context)
+
+
+# Special Exam Applications
+@login_required
+@cod_required
+def cod_special_exam_applications(request):
+    """Review special exam applications"""
+    department = request.role.department
+    
+    status_filter = request.GET.get('status', 'pending')
+    applications = SpecialExamApplication.objects.filter(
+        course__department=department,
+        status=status_filter
+    ).select_related('student__user', 'course', 'semester').order_by('-application_date')
+    
+    context = {
+        'department': department,
+        'applications': applications,
+        'status_filter': status_filter,
+    }
+    return render(request, 'cod/special_exam_applications.html', context)
+
+
+@login_required
+@cod_required
+def process_special_exam(request, application_id):
+    """Approve or reject special exam application"""
+    if request.method == 'POST':
+        department = request.role.department
+        application = get_object_or_404(
+            SpecialExamApplication,
+            id=application_id,
+            course__department=department
+        )
+        
+        action = request.POST.get('action')
+        remarks = request.POST.get('remarks', '')
+        
+        if action == 'approve':
+            application.status = 'approved'
+            application.scheduled_exam_date = request.POST.get('exam_date')
+            application.exam_venue = request.POST.get('exam_venue')
+            messages.success(request, 'Special exam application approved.')
+        elif action == 'reject':
+            application.status = 'rejected'
+            messages.info(request, 'Special exam application rejected.')
+        
+        application.processed_by = request.user
+        application.processed_date = timezone.now()
+        application.admin_remarks = remarks
+        application.save()
+        
+        return redirect('cod_special_exam_applications')
+    
+    return redirect('cod_special_exam_applications')
+
+
+# Deferment Applications
+@login_required
+@cod_required
+def cod_deferment_applications(request):
+    """Review deferment applications"""
+    department = request.role.department
+    
+    status_filter = request.GET.get('status', 'pending')
+    applications = DefermentApplication.objects.filter(
+        student__programme__department=department,
+        status=status_filter
+    ).select_related('student__user', 'student__programme').order_by('-application_date')
+    
+    context = {
+        'department': department,
+        'applications': applications,
+        'status_filter': status_filter,
+    }
+    return render(request, 'cod/deferment_applications.html', context)
+
+
+@login_required
+@cod_required
+def process_deferment(request, application_id):
+    """Approve or reject deferment application"""
+    if request.method == 'POST':
+        department = request.role.department
+        application = get_object_or_404(
+            DefermentApplication,
+            id=application_id,
+            student__programme__department=department
+        )
+        
+        action = request.POST.get('action')
+        remarks = request.POST.get('remarks', '')
+        
+        if action == 'approve':
+            application.status = 'approved'
+            application.approved_start_date = request.POST.get('start_date')
+            application.approved_end_date = request.POST.get('end_date')
+            messages.success(request, 'Deferment application approved.')
+        elif action == 'reject':
+            application.status = 'rejected'
+            messages.info(request, 'Deferment application rejected.')
+        
+        application.processed_by = request.user
+        application.processed_date = timezone.now()
+        application.admin_remarks = remarks
+        application.save()
+        
+        return redirect('cod_deferment_applications')
+    
+    return redirect('cod_deferment_applications')
+
+
+# Clearance Requests
+@login_required
+@cod_required
+def cod_clearance_requests(request):
+    """Process department clearance requests"""
+    department = request.role.department
+    
+    status_filter = request.GET.get('status', 'pending')
+    requests_list = ClearanceRequest.objects.filter(
+        student__programme__department=department,
+        clearance_type='department',
+        status=status_filter
+    ).select_related('student__user', 'student__programme').order_by('-request_date')
+    
+    context = {
+        'department': department,
+        'clearance_requests': requests_list,
+        'status_filter': status_filter,
+    }
+    return render(request, 'cod/clearance_requests.html', context)
+
+
+@login_required
+@cod_required
+def process_clearance(request, clearance_id):
+    """Approve or reject clearance request"""
+    if request.method == 'POST':
+        department = request.role.department
+        clearance = get_object_or_404(
+            ClearanceRequest,
+            id=clearance_id,
+            student__programme__department=department
+        )
+        
+        action = request.POST.get('action')
+        remarks = request.POST.get('remarks', '')
+        
+        if action == 'approve':
+            clearance.status = 'approved'
+            messages.success(request, 'Clearance approved.')
+        elif action == 'reject':
+            clearance.status = 'rejected'
+            messages.info(request, 'Clearance rejected.')
+        
+        clearance.processed_by = request.user
+        clearance.processed_date = timezone.now()
+        clearance.remarks = remarks
+        clearance.save()
+        
+        return redirect('cod_clearance_requests')
+    
+    return redirect('cod_clearance_requests')
+
+
+@login_required
+def cod_department_report(request):
+    """Department overview report with statistics and graphs"""
+    from ..analytics_facts import ensure_facts
+    from ..models_analytics import EnrollmentFact, StudentFact
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied. Only COD can access this page.")
+        return redirect('dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get filter parameters
+    selected_academic_year_id = request.GET.get('academic_year')
+    selected_semester_id = request.GET.get('semester')
+    
+    # Get academic years and semesters
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    if selected_academic_year_id:
+        academic_year = AcademicYear.objects.get(id=selected_academic_year_id)
+        semesters = Semester.objects.filter(academic_year=academic_year).order_by('semester_number')
+    else:
+        academic_year = current_academic_year
+        semesters = Semester.objects.filter(academic_year=academic_year).order_by('semester_number') if academic_year else []
+    
+    if selected_semester_id:
+        semester = Semester.objects.get(id=selected_semester_id)
+    else:
+        semester = Semester.objects.filter(is_current=True).first()
+    
+    # Department Statistics
+    total_programmes = Programme.objects.filter(department=department, is_active=True).count()
+    total_courses = Course.objects.filter(department=department, is_active=True).count()
+    total_lecturers = Lecturer.objects.filter(department=department, is_active=True).count()
+    
+    # Student Statistics (from the StudentFact table)
+    ensure_facts()
+    student_facts = StudentFact.objects.filter(department=department).order_by()
+    active_student_facts = student_facts.filter(status='active')
+    total_students = active_student_facts.aggregate(total=Sum('student_count'))['total'] or 0
+    
+    # Students by programme (for pie chart)
+    students_by_programme = active_student_facts.values(
+        programme__name=F('programme__name'), programme__code=F('programme__code')
+    ).annotate(
+        count=Sum('student_count')
+    ).order_by('-count')
+    
+    # Students by year (for bar chart)
+    students_by_year = active_student_facts.values(current_year=F('year_of_study')).annotate(
+        count=Sum('student_count')
+    ).order_by('current_year')
+    
+    # Students by gender (for donut chart)
+    students_by_gender = active_student_facts.values(user__gender=F('gender')).annotate(
+        count=Sum('student_count')
+    )
+    
+    # Students by status (for donut chart)
+    students_by_status = student_facts.values('status').annotate(
+        count=Sum('student_count')
+    )
+    
+    # Enrollment trends (for line chart)
+    enrollment_trends = []
+    if academic_year:
+        semester_counts = dict(
+            EnrollmentFact.objects.filter(
+                department=department,
+                academic_year=academic_year,
+                is_active=True
+            ).order_by().values('semester_id').annotate(
+                total=Sum('enrollment_count')
+            ).values_list('semester_id', 'total')
+        )
+        for sem in Semester.objects.filter(academic_year=academic_year).order_by('semester_number'):
+            enrollment_trends.append({
+                'semester': f"Sem {sem.semester_number}",
+                'count': semester_counts.get(sem.id, 0)
+            })
+    
+    # Course distribution by level (for bar chart)
+    courses_by_level = Course.objects.filter(
+        department=department,
+        is_active=True
+    ).values('level').annotate(
+        count=Count('id')
+    ).order_by('level')
+    
+    # Lecturer distribution by rank (for pie chart)
+    lecturers_by_rank = Lecturer.objects.filter(
+        department=department,
+        is_active=True
+    ).values('academic_rank').annotate(
+        count=Count('id')
+    )
+    
+    # Programme types distribution
+    programmes_by_type = Programme.objects.filter(
+        department=department,
+        is_active=True
+    ).values('programme_type').annotate(
+        count=Count('id')
+    )
+    
+    # Recent enrollments (last 30 days)
+    thirty_days_ago = datetime.now() - timedelta(days=30)
+    recent_enrollments = Enrollment.objects.filter(
+        course__department=department,
+        enrollment_date__gte=thirty_days_ago
+    ).count()
+    
+    context = {
+        'department': department,
+        'academic_years': academic_years,
+        'current_academic_year': current_academic_year,
+        'academic_year': academic_year,
+        'semesters': semesters,
+        'semester': semester,
+        'selected_academic_year': selected_academic_year_id,
+        'selected_semester': selected_semester_id,
+        
+        # Statistics
+        'total_programmes': total_programmes,
+        'total_courses': total_courses,
+        'total_lecturers': total_lecturers,
+        'total_students': total_students,
+        'recent_enrollments': recent_enrollments,
+        
+        # Chart Data (will be converted to JSON in template)
+        'students_by_programme': list(students_by_programme),
+        'students_by_year': list(students_by_year),
+        'students_by_gender': list(students_by_gender),
+        'students_by_status': list(students_by_status),
+        'enrollment_trends': enrollment_trends,
+        'courses_by_level': list(courses_by_level),
+        'lecturers_by_rank': list(lecturers_by_rank),
+        'programmes_by_type': list(programmes_by_type),
+    }
+    
+    return render(request, 'cod/department_report.html', context)
+
+
+@login_required
+def cod_enrollment_report(request):
+    """Enrollment analysis report with detailed statistics"""
+    from ..analytics_facts import ensure_facts
+    from ..models_analytics import EnrollmentFact
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get filter parameters
+    selected_academic_year_id = request.GET.get('academic_year')
+    selected_semester_id = request.GET.get('semester')
+    selected_programme_id = request.GET.get('programme')
+    selected_year = request.GET.get('year')
+    
+    # Get academic years, semesters, and programmes
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    programmes = Programme.objects.filter(department=department, is_active=True)
+    
+    if selected_academic_year_id:
+        academic_year = AcademicYear.objects.get(id=selected_academic_year_id)
+        semesters = Semester.objects.filter(academic_year=academic_year).order_by('semester_number')
+    else:
+        academic_year = current_academic_year
+        semesters = Semester.objects.filter(academic_year=academic_year).order_by('semester_number') if academic_year else []
+    
+    if selected_semester_id:
+        semester = Semester.objects.get(id=selected_semester_id)
+    else:
+        semester = Semester.objects.filter(is_current=True).first()
+    
+    # Base queries: enrollment facts for the aggregates, raw enrollments for
+    # the lecturer breakdown which the facts do not carry
+    ensure_facts()
+    enrollment_facts = EnrollmentFact.objects.filter(
+        department=department,
+        is_active=True
+    ).order_by()
+    enrollment_query = Enrollment.objects.filter(
+        course__department=department,
+        is_active=True
+    )
+    
+    if semester:
+        enrollment_facts = enrollment_facts.filter(semester=semester)
+        enrollment_query = enrollment_query.filter(semester=semester)
+    
+    if selected_programme_id:
+        enrollment_facts = enrollment_facts.filter(programme_id=selected_programme_id)
+        enrollment_query = enrollment_query.filter(student__programme_id=selected_programme_id)
+    
+    if selected_year:
+        enrollment_facts = enrollment_facts.filter(year_of_study=selected_year)
+        enrollment_query = enrollment_query.filter(student__current_year=selected_year)
+    
+    # Totals and enrollment status breakdown (for donut chart)
+    totals = enrollment_facts.aggregate(
+        total=Sum('enrollment_count'),
+        repeat=Sum('repeat_count'),
+        audit=Sum('audit_count'),
+    )
+    total_enrollments = totals['total'] or 0
+    enrollment_status = {
+        'active': total_enrollments,
+        'repeat': totals['repeat'] or 0,
+        'audit': totals['audit'] or 0,
+    }
+    
+    # Enrollments by programme (for bar chart)
+    enrollments_by_programme = enrollment_facts.values(
+        student__programme__name=F('programme__name'),
+        student__programme__code=F('programme__code')
+    ).annotate(
+        count=Sum('enrollment_count')
+    ).order_by('-count')
+    
+    # Enrollments per course: top 10 for the horizontal bar chart and the
+    # capacity table, all of them for the per-course average
+    per_course = list(enrollment_facts.values(
+        course__code=F('course__code'),
+        course__name=F('course__name'),
+        course__credit_hours=F('course__credit_hours')
+    ).annotate(
+        count=Sum('enrollment_count')
+    ).order_by('-count'))
+    
+    enrollments_by_course = [
+        {'course__code': row['course__code'], 'course__name': row['course__name'], 'count': row['count']}
+        for row in per_course[:10]
+    ]
+    course_capacity = [
+        {
+            'course__code': row['course__code'],
+            'course__name': row['course__name'],
+            'course__credit_hours': row['course__credit_hours'],
+            'enrollment_count': row['count'],
+        }
+        for row in per_course[:10]
+    ]
+    avg_enrollments_per_course = (
+        sum(row['count'] for row in per_course) / len(per_course) if per_course else 0
+    )
+    
+    # Enrollments by year of study (for pie chart)
+    enrollments_by_year = enrollment_facts.values(
+        student__current_year=F('year_of_study')
+    ).annotate(
+        count=Sum('enrollment_count')
+    ).order_by('student__current_year')
+    
+    # Monthly enrollment trends (for line chart)
+    enrollment_monthly_trends = []
+    if semester:
+        monthly_counts = dict(
+            enrollment_facts.values('enrollment_month').annotate(
+                total=Sum('enrollment_count')
+            ).values_list('enrollment_month', 'total')
+        )
+        
+        # Walk the months of the semester period
+        start_date = semester.start_date
+        end_date = semester.end_date
+        
+        current_date = start_date
+        while current_date <= end_date:
+            enrollment_monthly_trends.append({
+                'month': current_date.strftime('%b %Y'),
+                'count': monthly_counts.get(current_date.replace(day=1), 0)
+            })
+            
+            # Move to next month
+            if current_date.month == 12:
+                current_date = current_date.replace(year=current_date.year + 1, month=1)
+            else:
+                current_date = current_date.replace(month=current_date.month + 1)
+    
+    # Enrollment by lecturer (top 10 - for bar chart)
+    enrollments_by_lecturer = enrollment_query.filter(
+        lecturer__isnull=False
+    ).values(
+        'lecturer__user__first_name',
+        'lecturer__user__last_name',
+        'lecturer__employee_number'
+    ).annotate(
+        count=Count('id')
+    ).order_by('-count')[:10]
+    
+    context = {
+        'department': department,
+        'academic_years': academic_years,
+        'current_academic_year': current_academic_year,
+        'academic_year': academic_year,
+        'semesters': semesters,
+        'semester': semester,
+        'programmes': programmes,
+        'selected_academic_year': selected_academic_year_id,
+        'selected_semester': selected_semester_id,
+        'selected_programme': selected_programme_id,
+        'selected_year': selected_year,
+        'years_range': range(1, 9),
+        
+        # Statistics
+        'total_enrollments': total_enrollments,
+        'avg_enrollments_per_course': round(avg_enrollments_per_course, 2),
+        
+        # Chart Data
+        'enrollments_by_programme': list(enrollments_by_programme),
+        'enrollments_by_course': list(enrollments_by_course),
+        'enrollments_by_year': list(enrollments_by_year),
+        'enrollment_status': enrollment_status,
+        'enrollment_monthly_trends': enrollment_monthly_trends,
+        'enrollments_by_lecturer': list(enrollments_by_lecturer),
+        'course_capacity': list(course_capacity),
+    }
+    
+    return render(request, 'cod/enrollment_report.html', context)
+
+
+@login_required
+def cod_performance_report(request):
+    """Student performance analysis report with grade statistics"""
+    from ..analytics_facts import ensure_facts, grade_performance
+    from ..models_analytics import GradeFact
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get filter parameters
+    selected_academic_year_id = request.GET.get('academic_year')
+    selected_semester_id = request.GET.get('semester')
+    selected_programme_id = request.GET.get('programme')
+    selected_year = request.GET.get('year')
+    
+    # Get academic years, semesters, and programmes
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    programmes = Programme.objects.filter(department=department, is_active=True)
+    
+    if selected_academic_year_id:
+        academic_year = AcademicYear.objects.get(id=selected_academic_year_id)
+        semesters = Semester.objects.filter(academic_year=academic_year).order_by('semester_number')
+    else:
+        academic_year = current_academic_year
+        semesters = Semester.objects.filter(academic_year=academic_year).order_by('semester_number') if academic_year else []
+    
+    if selected_semester_id:
+        semester = Semester.objects.get(id=selected_semester_id)
+    else:
+        semester = Semester.objects.filter(is_current=True).first()
+    
+    # Base query for grades, read from the GradeFact table
+    ensure_facts()
+    grade_facts = GradeFact.objects.filter(department=department).order_by()
+    
+    if semester:
+        grade_facts = grade_facts.filter(semester=semester)
+    
+    if selected_programme_id:
+        grade_facts = grade_facts.filter(programme_id=selected_programme_id)
+    
+    if selected_year:
+        grade_facts = grade_facts.filter(year_of_study=selected_year)
+    
+    # Total graded students, Pass/Fail Statistics and Average GPA
+    overall = grade_facts.aggregate(
+        total=Sum('graded_count'),
+        passed=Sum('passed_count'),
+        points=Sum('grade_points_sum'),
+        points_count=Sum('grade_points_count'),
+    )
+    total_graded = overall['total'] or 0
+    passed_students = overall['passed'] or 0
+    failed_students = total_graded - passed_students
+    pass_rate = (passed_students / total_graded * 100) if total_graded > 0 else 0
+    avg_gpa = float(overall['points']) / overall['points_count'] if overall['points_count'] else 0
+    
+    # Grade distribution (for bar chart)
+    grade_distribution = grade_facts.values('grade').annotate(
+        count=Sum('graded_count')
+    ).order_by('grade')
+    
+    # Performance by programme (for bar chart)
+    performance_by_programme = sorted(
+        grade_performance(
+            grade_facts,
+            enrollment__student__programme__name=F('programme__name'),
+            enrollment__student__programme__code=F('programme__code')
+        ),
+        key=lambda row: row['avg_gpa'] or 0,
+        reverse=True
+    )
+    
+    # Performance by year of study (for line chart)
+    performance_by_year = sorted(
+        grade_performance(grade_facts, enrollment__student__current_year=F('year_of_study')),
+        key=lambda row: row['enrollment__student__current_year']
+    )
+    
+    # Top and poor performing courses (for bar charts)
+    course_performance = grade_performance(
+        grade_facts,
+        enrollment__course__code=F('course__code'),
+        enrollment__course__name=F('course__name')
+    )
+    top_performing_courses = sorted(
+        course_performance, key=lambda row: row['avg_marks'] or 0, reverse=True
+    )[:10]
+    poor_performing_courses = sorted(
+        course_performance, key=lambda row: row['pass_rate']
+    )[:10]
+    
+    # GPA distribution ranges (for pie chart)
+    gpa_ranges = {
+        'Excellent (3.7-4.0)': 0,
+        'Very Good (3.3-3.6)': 0,
+        'Good (3.0-3.2)': 0,
+        'Satisfactory (2.0-2.9)': 0,
+        'Below Average (<2.0)': 0,
+    }
+    for points, count in grade_facts.filter(grade_points__isnull=False).values(
+        'grade_points'
+    ).annotate(count=Sum('graded_count')).values_list('grade_points', 'count'):
+        if points >= Decimal('3.7'):
+            gpa_ranges['Excellent (3.7-4.0)'] += count
+        elif points >= Decimal('3.3'):
+            gpa_ranges['Very Good (3.3-3.6)'] += count
+        elif points >= Decimal('3.0'):
+            gpa_ranges['Good (3.0-3.2)'] += count
+        elif points >= Decimal('2.0'):
+            gpa_ranges['Satisfactory (2.0-2.9)'] += count
+        else:
+            gpa_ranges['Below Average (<2.0)'] += count
+    
+    # Pass/Fail trend by semester (for line chart)
+    pass_fail_trends = []
+    if academic_year:
+        semester_rates = {
+            row['semester_id']: row['pass_rate']
+            for row in grade_performance(
+                GradeFact.objects.filter(department=department, academic_year=academic_year),
+                'semester_id'
+            )
+        }
+        for sem in Semester.objects.filter(academic_year=academic_year).order_by('semester_number'):
+            pass_rate_sem = semester_rates.get(sem.id, 0)
+            
+            pass_fail_trends.append({
+                'semester': f"Sem {sem.semester_number}",
+                'pass_rate': round(pass_rate_sem, 2),
+                'fail_rate': round(100 - pass_rate_sem, 2)
+            })
+    
+    # Gender performance comparison (for bar chart)
+    gender_performance = grade_performance(
+        grade_facts, enrollment__student__user__gender=F('gender')
+    )
+    
+    context = {
+        'department': department,
+        'academic_years': academic_years,
+        'current_academic_year': current_academic_year,
+        'academic_year': academic_year,
+        'semesters': semesters,
+        'semester': semester,
+        'programmes': programmes,
+        'selected_academic_year': selected_academic_year_id,
+        'selected_semester': selected_semester_id,
+        'selected_programme': selected_programme_id,
+        'selected_year': selected_year,
+        'years_range': range(1, 9),
+        
+        # Statistics
+        'total_graded': total_graded,
+        'passed_students': passed_students,
+        'failed_students': failed_students,
+        'pass_rate': round(pass_rate, 2),
+        'avg_gpa': round(avg_gpa, 2),
+        
+        # Chart Data
+        'grade_distribution': list(grade_distribution),
+        'performance_by_programme': list(performance_by_programme),
+        'performance_by_year': list(performance_by_year),
+        'top_performing_courses': list(top_performing_courses),
+        'poor_performing_courses': list(poor_performing_courses),
+        'gpa_ranges': gpa_ranges,
+        'pass_fail_trends': pass_fail_trends,
+        'gender_performance': list(gender_performance),
+    }
+    
+    return render(request, 'cod/performance_report.html', context)
+
+
+@login_required
+def cod_results_dashboard(request):
+    """Main results dashboard for COD"""
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    # Get current academic year
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Get all programmes in the department
+    programmes = Programme.objects.filter(
+        department=department,
+        is_active=True
+    ).order_by('name')
+    
+    # Get all academic years
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    
+    # Statistics
+    total_students = Student.objects.filter(
+        programme__department=department,
+        status='active'
+    ).count()
+    
+    # Get students with results
+    students_with_results = Grade.objects.filter(
+        enrollment__course__department=department,
+        enrollment__semester__academic_year=current_academic_year
+    ).values('enrollment__student').distinct().count()
+    
+    # Calculate pass rate
+    if students_with_results > 0:
+        passed_students = Grade.objects.filter(
+            enrollment__course__department=department,
+            enrollment__semester__academic_year=current_academic_year,
+            is_passed=True
+        ).values('enrollment__student').distinct().count()
+        pass_rate = (passed_students / students_with_results * 100)
+    else:
+        pass_rate = 0
+    
+    # Average GPA
+    avg_gpa = Student.objects.filter(
+        programme__department=department,
+        status='active',
+        cumulative_gpa__isnull=False
+    ).aggregate(avg_gpa=Avg('cumulative_gpa'))['avg_gpa'] or 0
+    
+    context = {
+        'department': department,
+        'programmes': programmes,
+        'academic_years': academic_years,
+        'current_academic_year': current_academic_year,
+        'total_students': total_students,
+        'students_with_results': students_with_results,
+        'pass_rate': round(pass_rate, 2),
+        'avg_gpa': round(avg_gpa, 2),
+    }
+    
+    return render(request, 'cod/results/dashboard.html', context)
+
+
+@login_required
+def cod_view_results(request):
+    """View and filter student results"""
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    # Get filter parameters
+    programme_id = request.GET.get('programme')
+    year = request.GET.get('year')
+    semester_id = request.GET.get('semester')
+    academic_year_id = request.GET.get('academic_year')
+    status = request.GET.get('status')
+    search_query = request.GET.get('search')
+    
+    # Base queryset - students in department
+    students = Student.objects.filter(
+        programme__department=department
+    ).select_related(
+        'user', 'programme'
+    ).order_by('student_id')
+    
+    # Apply filters
+    if programme_id:
+        students = students.filter(programme_id=programme_id)
+    
+    if year:
+        students = students.filter(current_year=year)
+    
+    if status:
+        students = students.filter(status=status)
+    
+    if search_query:
+        students = students.filter(
+            Q(student_id__icontains=search_query) |
+            Q(user__first_name__icontains=search_query) |
+            Q(user__last_name__icontains=search_query) |
+            Q(user__email__icontains=search_query)
+        )
+    
+    # Get academic year and semester for results
+    if academic_year_id:
+        academic_year = get_object_or_404(AcademicYear, id=academic_year_id)
+    else:
+        academic_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    if semester_id:
+        semester = get_object_or_404(Semester, id=semester_id)
+    else:
+        semester = Semester.objects.filter(
+            academic_year=academic_year,
+            is_current=True
+        ).first() if academic_year else None
+    
+    # Prepare student results data
+    student_results = []
+    for student in students:
+        # Get enrollments for the selected semester
+        if semester:
+            enrollments = Enrollment.objects.filter(
+                student=student,
+                semester=semester,
+                is_active=True
+            ).select_related('course', 'grade')
+        else:
+            enrollments = []
+        
+        # Calculate semester GPA
+        total_quality_points = 0
+        total_credit_hours = 0
+        grades_list = []
+        
+        for enrollment in enrollments:
+            try:
+                grade = enrollment.grade
+                grades_list.append({
+                    'course': enrollment.course,
+                    'grade': grade.grade,
+                    'total_marks': grade.total_marks,
+                    'is_passed': grade.is_passed,
+                })
+                
+                if grade.grade_points and grade.quality_points:
+                    total_quality_points += float(grade.quality_points)
+                    total_credit_hours += enrollment.course.credit_hours
+            except Grade.DoesNotExist:
+                grades_list.append({
+                    'course': enrollment.course,
+                    'grade': 'N/A',
+                    'total_marks': None,
+                    'is_passed': None,
+                })
+        
+        # Calculate semester GPA
+        semester_gpa = (total_quality_points / total_credit_hours) if total_credit_hours > 0 else 0
+        
+        student_results.append({
+            'student': student,
+            'grades': grades_list,
+            'semester_gpa': round(semester_gpa, 2),
+            'cumulative_gpa': student.cumulative_gpa or 0,
+            'total_courses': len(grades_list),
+            'passed_courses': sum(1 for g in grades_list if g['is_passed']),
+        })
+    
+    # Pagination
+    paginator = Paginator(student_results, 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Get filter options
+    programmes = Programme.objects.filter(
+        department=department,
+        is_active=True
+    ).order_by('name')
+    
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    
+    semesters = Semester.objects.filter(
+        academic_year=academic_year
+    ).order_by('semester_number') if academic_year else []
+    
+    years_range = range(1, 9)
+    
+    context = {
+        'department': department,
+        'page_obj': page_obj,
+        'programmes': programmes,
+        'academic_years': academic_years,
+        'semesters': semesters,
+        'years_range': years_range,
+        'selected_programme': programme_id,
+        'selected_year': year,
+        'selected_semester': semester_id,
+        'selected_academic_year': academic_year_id,
+        'selected_status': status,
+        'search_query': search_query,
+        'current_semester': semester,
+        'current_academic_year': academic_year,
+    }
+    
+    return render(request, 'cod/results/view_results.html', context)
+
+
+@login_required
+def cod_student_results_detail(request, student_id):
+    """View detailed results for a specific student"""
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    # Get student
+    student = get_object_or_404(
+        Student.objects.select_related('user', 'programme'),
+        student_id=student_id,
+        programme__department=department
+    )
+    
+    # Get all academic years with results
+    academic_years = AcademicYear.objects.filter(
+        semesters__enrollments__student=student
+    ).distinct().order_by('-year')
+    
+    # Organize results by academic year and semester
+    results_by_year = []
+    
+    for academic_year in academic_years:
+        semesters_data = []
+        
+        for semester in academic_year.semesters.filter(
+            enrollments__student=student
+        ).distinct().order_by('semester_number'):
+            
+            # Get enrollments for this semester
+            enrollments = Enrollment.objects.filter(
+                student=student,
+                semester=semester
+            ).select_related('course', 'lecturer', 'grade').order_by('course__code')
+            
+            # Calculate semester statistics
+            total_quality_points = 0
+            total_credit_hours = 0
+            grades_list = []
+            
+            for enrollment in enrollments:
+                try:
+                    grade = enrollment.grade
+                    grades_list.append({
+                        'enrollment': enrollment,
+                        'grade': grade,
+                    })
+                    
+                    if grade.grade_points and grade.quality_points:
+                        total_quality_points += float(grade.quality_points)
+                        total_credit_hours += enrollment.course.credit_hours
+                except Grade.DoesNotExist:
+                    grades_list.append({
+                        'enrollment': enrollment,
+                        'grade': None,
+                    })
+            
+            semester_gpa = (total_quality_points / total_credit_hours) if total_credit_hours > 0 else 0
+            
+            semesters_data.append({
+                'semester': semester,
+                'grades': grades_list,
+                'semester_gpa': round(semester_gpa, 2),
+                'total_courses': len(grades_list),
+                'passed_courses': sum(1 for g in grades_list if g['grade'] and g['grade'].is_passed),
+            })
+        
+        results_by_year.append({
+            'academic_year': academic_year,
+            'semesters': semesters_data,
+        })
+    
+    context = {
+        'department': department,
+        'student': student,
+        'results_by_year': results_by_year,
+    }
+    
+    return render(request, 'cod/results/student_detail.html', context)
+
+
+@login_required
+def cod_promotion_analysis(request):
+    """Analyze students eligible for promotion"""
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    # Get filter parameters
+    programme_id = request.GET.get('programme')
+    year = request.GET.get('year')
+    academic_year_id = request.GET.get('academic_year')
+    min_gpa = request.GET.get('min_gpa', 2.0)
+    
+    try:
+        min_gpa = float(min_gpa)
+    except ValueError:
+        min_gpa = 2.0
+    
+    # Get academic year
+    if academic_year_id:
+        academic_year = get_object_or_404(AcademicYear, id=academic_year_id)
+    else:
+        academic_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Base queryset
+    students = Student.objects.filter(
+        programme__department=department,
+        status='active'
+    ).select_related('user', 'programme')
+    
+    # Apply filters
+    if programme_id:
+        students = students.filter(programme_id=programme_id)
+    
+    if year:
+        students = students.filter(current_year=year)
+    
+    # Analyze each student
+    promotion_data = []
+    
+    for student in students:
+        # Get all enrollments for the academic year
+        enrollments = Enrollment.objects.filter(
+            student=student,
+            semester__academic_year=academic_year,
+            is_active=True
+        ).select_related('course')
+        
+        total_courses = enrollments.count()
+        
+        if total_courses == 0:
+            continue
+        
+        # Count passed and failed courses
+        passed_courses = 0
+        failed_courses = 0
+        total_quality_points = 0
+        total_credit_hours = 0
+        
+        for enrollment in enrollments:
+            try:
+                grade = enrollment.grade
+                if grade.is_passed:
+                    passed_courses += 1
+                else:
+                    failed_courses += 1
+                
+                if grade.grade_points and grade.quality_points:
+                    total_quality_points += float(grade.quality_points)
+                    total_credit_hours += enrollment.course.credit_hours
+            except Grade.DoesNotExist:
+                failed_courses += 1
+        
+        # Calculate year GPA
+        year_gpa = (total_quality_points / total_credit_hours) if total_credit_hours > 0 else 0
+        
+        # Determine eligibility
+        pass_rate = (passed_courses / total_courses * 100) if total_courses > 0 else 0
+        
+        eligible = (
+            failed_courses == 0 and
+            year_gpa >= min_gpa and
+            pass_rate >= 70
+        )
+        
+        promotion_data.append({
+            'student': student,
+            'total_courses': total_courses,
+            'passed_courses': passed_courses,
+            'failed_courses': failed_courses,
+            'year_gpa': round(year_gpa, 2),
+            'cumulative_gpa': student.cumulative_gpa or 0,
+            'pass_rate': round(pass_rate, 2),
+            'eligible': eligible,
+        })
+    
+    # Sort by eligibility and GPA
+    promotion_data.sort(key=lambda x: (x['eligible'], x['year_gpa']), reverse=True)
+    
+    # Pagination
+    paginator = Paginator(promotion_data, 50)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Statistics
+    total_analyzed = len(promotion_data)
+    eligible_count = sum(1 for d in promotion_data if d['eligible'])
+    not_eligible_count = total_analyzed - eligible_count
+    
+    # Get filter options
+    programmes = Programme.objects.filter(
+        department=department,
+        is_active=True
+    ).order_by('name')
+    
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    years_range = range(1, 9)
+    
+    context = {
+        'department': department,
+        'page_obj': page_obj,
+        'programmes': programmes,
+        'academic_years': academic_years,
+        'years_range': years_range,
+        'selected_programme': programme_id,
+        'selected_year': year,
+        'selected_academic_year': academic_year_id,
+        'min_gpa': min_gpa,
+        'current_academic_year': academic_year,
+        'total_analyzed': total_analyzed,
+        'eligible_count': eligible_count,
+        'not_eligible_count': not_eligible_count,
+    }
+    
+    return render(request, 'cod/results/promotion_analysis.html', context)
+
+
+@login_required
+def cod_student_consultation(request):
+    """Main consultation view - Search for student"""
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    student = None
+    student_id = request.GET.get('student_id') or request.POST.get('student_id')
+    
+    if student_id:
+        try:
+            # Get student and verify they belong to this department
+            student = Student.objects.select_related(
+                'user', 'programme', 'programme__department'
+            ).get(
+                student_id=student_id,
+                programme__department=department
+            )
+            
+            # Redirect to detailed view
+            return redirect('cod_student_consultation_detail', student_id=student.student_id)
+            
+        except Student.DoesNotExist:
+            messages.error(request, f"Student {student_id} not found in {department.name}")
+    
+    context = {
+        'department': department,
+    }
+    
+    return render(request, 'cod/consultation/search_student.html', context)
+
+
+@login_required
+def cod_student_consultation_detail(request, student_id):
+    """Detailed student consultation view with academic records"""
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    # Get student
+    student = get_object_or_404(
+        Student.objects.select_related('user', 'programme'),
+        student_id=student_id,
+        programme__department=department
+    )
+    
+    # Get all academic years with results
+    academic_years = AcademicYear.objects.filter(
+        semesters__enrollments__student=student
+    ).distinct().order_by('-year')
+    
+    # Organize results by academic year and semester
+    results_by_year = []
+    overall_stats = {
+        'total_courses': 0,
+        'passed_courses': 0,
+        'failed_courses': 0,
+        'total_credit_hours': 0,
+        'total_quality_points': 0,
+    }
+    
+    for academic_year in academic_years:
+        semesters_data = []
+        
+        for semester in academic_year.semesters.filter(
+            enrollments__student=student
+        ).distinct().order_by('semester_number'):
+            
+            # Get enrollments for this semester
+            enrollments = Enrollment.objects.filter(
+                student=student,
+                semester=semester
+            ).select_related('course', 'lecturer', 'grade').order_by('course__code')
+            
+            # Calculate semester statistics
+            semester_quality_points = 0
+            semester_credit_hours = 0
+            grades_list = []
+            semester_passed = 0
+            semester_failed = 0
+            
+            for enrollment in enrollments:
+                try:
+                    grade = enrollment.grade
+                    grades_list.append({
+                        'enrollment': enrollment,
+                        'grade': grade,
+                        'can_edit': True,  # COD can edit all grades
+                    })
+                    
+                    if grade.grade_points and grade.quality_points:
+                        semester_quality_points += float(grade.quality_points)
+                        semester_credit_hours += enrollment.course.credit_hours
+                        overall_stats['total_quality_points'] += float(grade.quality_points)
+                        overall_stats['total_credit_hours'] += enrollment.course.credit_hours
+                    
+                    if grade.is_passed:
+                        semester_passed += 1
+                        overall_stats['passed_courses'] += 1
+                    else:
+                        semester_failed += 1
+                        overall_stats['failed_courses'] += 1
+                    
+                    overall_stats['total_courses'] += 1
+                    
+                except Grade.DoesNotExist:
+                    grades_list.append({
+                        'enrollment': enrollment,
+                        'grade': None,
+                        'can_edit': True,
+                    })
+                    overall_stats['total_courses'] += 1
+                    semester_failed += 1
+                    overall_stats['failed_courses'] += 1
+            
+            semester_gpa = (semester_quality_points / semester_credit_hours) if semester_credit_hours > 0 else 0
+            
+            semesters_data.append({
+                'semester': semester,
+                'grades': grades_list,
+                'semester_gpa': round(semester_gpa, 2),
+                'total_courses': len(grades_list),
+                'passed_courses': semester_passed,
+                'failed_courses': semester_failed,
+            })
+        
+        results_by_year.append({
+            'academic_year': academic_year,
+            'semesters': semesters_data,
+        })
+    
+    # Calculate overall GPA
+    overall_gpa = (overall_stats['total_quality_points'] / overall_stats['total_credit_hours']) if overall_stats['total_credit_hours'] > 0 else 0
+    overall_stats['gpa'] = round(overall_gpa, 2)
+    
+    # Calculate performance metrics
+    if overall_stats['total_courses'] > 0:
+        overall_stats['pass_rate'] = round((overall_stats['passed_courses'] / overall_stats['total_courses']) * 100, 2)
+    else:
+        overall_stats['pass_rate'] = 0
+    
+    # Determine class/standing
+    if overall_gpa >= 3.7:
+        class_standing = "First Class Honours"
+        class_color = "success"
+    elif overall_gpa >= 3.0:
+        class_standing = "Second Class Honours (Upper Division)"
+        class_color = "info"
+    elif overall_gpa >= 2.0:
+        class_standing = "Second Class Honours (Lower Division)"
+        class_color = "primary"
+    elif overall_gpa >= 1.5:
+        class_standing = "Pass"
+        class_color = "warning"
+    else:
+        class_standing = "Below Pass Standard"
+        class_color = "danger"
+    
+    # Get courses with missing grades
+    missing_grades = Enrollment.objects.filter(
+        student=student,
+        is_active=True
+    ).exclude(
+        id__in=Grade.objects.values_list('enrollment_id', flat=True)
+    ).select_related('course', 'semester', 'semester__academic_year')
+    
+    context = {
+        'department': department,
+        'student': student,
+        'results_by_year': results_by_year,
+        'overall_stats': overall_stats,
+        'class_standing': class_standing,
+        'class_color': class_color,
+        'missing_grades': missing_grades,
+    }
+    
+    return render(request, 'cod/consultation/student_detail.html', context)
+
+
+@login_required
+def cod_edit_grade(request, enrollment_id):
+    """Edit or create grade for a student"""
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    # Get enrollment
+    enrollment = get_object_or_404(
+        Enrollment.objects.select_related('student', 'course', 'semester'),
+        id=enrollment_id,
+        course__department=department
+    )
+    
+    # Get or create grade
+    try:
+        grade = enrollment.grade
+        is_new = False
+    except Grade.DoesNotExist:
+        grade = None
+        is_new = True
+    
+    if request.method == 'POST':
+        ca_marks = request.POST.get('continuous_assessment')
+        exam_marks = request.POST.get('final_exam')
+        practical_marks = request.POST.get('practical_marks')
+        project_marks = request.POST.get('project_marks')
+        remarks = request.POST.get('remarks', '')
+        
+        try:
+            if is_new:
+                grade = Grade(enrollment=enrollment)
+            
+            # Update marks
+            if ca_marks:
+                grade.continuous_assessment = Decimal(ca_marks)
+            if exam_marks:
+                grade.final_exam = Decimal(exam_marks)
+            if practical_marks:
+                grade.practical_marks = Decimal(practical_marks)
+            if project_marks:
+                grade.project_marks = Decimal(project_marks)
+            
+            grade.remarks = remarks
+            grade.save()  # Calculations happen in model save method
+            
+            # Update student's cumulative GPA
+            update_student_gpa(enrollment.student)
+            
+            messages.success(request, f"Grade {'created' if is_new else 'updated'} successfully for {enrollment.course.code}")
+            return JsonResponse({
+                'success': True,
+                'message': f"Grade {'created' if is_new else 'updated'} successfully",
+                'grade': grade.grade,
+                'total_marks': float(grade.total_marks) if grade.total_marks else 0,
+                'is_passed': grade.is_passed,
+            })
+            
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=400)
+    
+    context = {
+        'enrollment': enrollment,
+        'grade': grade,
+        'is_new': is_new,
+    }
+    
+    return render(request, 'cod/consultation/edit_grade.html', context)
+
+
+@login_required
+def cod_quick_edit_grade(request):
+    """Quick AJAX grade edit"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Invalid request'}, status=400)
+    
+    # Verify COD
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        return JsonResponse({'success': False, 'message': 'Unauthorized'}, status=403)
+    
+    enrollment_id = request.POST.get('enrollment_id')
+    ca_marks = request.POST.get('continuous_assessment')
+    exam_marks = request.POST.get('final_exam')
+    practical_marks = request.POST.get('practical_marks')
+    project_marks = request.POST.get('project_marks')
+    
+    try:
+        enrollment = Enrollment.objects.select_related('course').get(
+            id=enrollment_id,
+            course__department=department
+        )
+        
+        # Get or create grade
+        try:
+            grade = enrollment.grade
+        except Grade.DoesNotExist:
+            grade = Grade(enrollment=enrollment)
+        
+        # Update marks
+        if ca_marks:
+            grade.continuous_assessment = Decimal(ca_marks)
+        if exam_marks:
+            grade.final_exam = Decimal(exam_marks)
+        if practical_marks:
+            grade.practical_marks = Decimal(practical_marks) if practical_marks else None
+        if project_marks:
+            grade.project_marks = Decimal(project_marks) if project_marks else None
+        
+        grade.save()
+        
+        # Update student's cumulative GPA
+        update_student_gpa(enrollment.student)
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Grade updated successfully',
+            'grade': grade.grade,
+            'total_marks': float(grade.total_marks) if grade.total_marks else 0,
+            'grade_points': float(grade.grade_points) if grade.grade_points else 0,
+            'is_passed': grade.is_passed,
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
+
+
+def update_student_gpa(student):
+    """Recalculate and update student's cumulative GPA"""
+    enrollments = Enrollment.objects.filter(
+        student=student,
+        is_active=True
+    ).select_related('course', 'grade')
+    
+    total_quality_points = 0
+    total_credit_hours = 0
+    
+    for enrollment in enrollments:
+        try:
+            grade = enrollment.grade
+            if grade.grade_points and grade.quality_points:
+                total_quality_points += float(grade.quality_points)
+                total_credit_hours += enrollment.course.credit_hours
+        except Grade.DoesNotExist:
+            continue
+    
+    if total_credit_hours > 0:
+        cumulative_gpa = total_quality_points / total_credit_hours
+        student.cumulative_gpa = round(Decimal(cumulative_gpa), 2)
+        student.total_credit_hours = total_credit_hours
+        student.save()
+
+
+@login_required
+def cod_student_advice(request, student_id):
+    """Provide academic advice and recommendations"""
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    # Get student
+    student = get_object_or_404(
+        Student.objects.select_related('user', 'programme'),
+        student_id=student_id,
+        programme__department=department
+    )
+    
+    # Calculate current performance
+    enrollments = Enrollment.objects.filter(
+        student=student,
+        is_active=True
+    ).select_related('course', 'grade')
+    
+    total_courses = enrollments.count()
+    passed_courses = 0
+    failed_courses = []
+    weak_courses = []  # C grade or below
+    
+    for enrollment in enrollments:
+        try:
+            grade = enrollment.grade
+            if grade.is_passed:
+                passed_courses += 1
+                if grade.grade_points and grade.grade_points < 2.0:  # C or below
+                    weak_courses.append({
+                        'course': enrollment.course,
+                        'grade': grade,
+                    })
+            else:
+                failed_courses.append({
+                    'course': enrollment.course,
+                    'grade': grade,
+                })
+        except Grade.DoesNotExist:
+            failed_courses.append({
+                'course': enrollment.course,
+                'grade': None,
+            })
+    
+    # Generate recommendations
+    recommendations = []
+    
+    if student.cumulative_gpa:
+        gpa = float(student.cumulative_gpa)
+        
+        if gpa >= 3.7:
+            recommendations.append({
+                'type': 'success',
+                'title': 'Excellent Performance',
+                'message': 'You are performing excellently! Maintain this standard to achieve First Class Honours.'
+            })
+        elif gpa >= 3.0:
+            recommendations.append({
+                'type': 'info',
+                'title': 'Good Performance',
+                'message': 'You are on track for Second Class Honours (Upper). Focus on improving weak areas to achieve First Class.'
+            })
+        elif gpa >= 2.0:
+            recommendations.append({
+                'type': 'warning',
+                'title': 'Average Performance',
+                'message': 'Your performance is average. You need to improve significantly to achieve higher honors.'
+            })
+        else:
+            recommendations.append({
+                'type': 'danger',
+                'title': 'Below Standard',
+                'message': 'Your GPA is below the pass standard. Immediate intervention is required.'
+            })
+    
+    if failed_courses:
+        recommendations.append({
+            'type': 'danger',
+            'title': 'Failed Courses',
+            'message': f'You have {len(failed_courses)} failed course(s). You must retake these courses.'
+        })
+    
+    if weak_courses:
+        recommendations.append({
+            'type': 'warning',
+            'title': 'Weak Areas',
+            'message': f'You have {len(weak_courses)} course(s) with C grade or below. Consider revising these topics.'
+        })
+    
+    context = {
+        'department': department,
+        'student': student,
+        'total_courses': total_courses,
+        'passed_courses': passed_courses,
+        'failed_courses': failed_courses,
+        'weak_courses': weak_courses,
+        'recommendations': recommendations,
+    }
+    
+    return render(request, 'cod/consultation/student_advice.html', context)
+
+
+@login_required
+def cod_generate_exam_list(request):
+    """COD view to generate exam attendance sheets"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied. Only COD can access this page.")
+        return redirect('dashboard')
+    
+    # Get COD's department
+    try:
+        cod_department = request.role.department
+        if not cod_department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get department programmes
+    programmes = Programme.objects.filter(department=cod_department, is_active=True)
+    
+    # Get academic years
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Get semesters for selected academic year
+    selected_academic_year_id = request.GET.get('academic_year')
+    if selected_academic_year_id:
+        semesters = Semester.objects.filter(
+            academic_year_id=selected_academic_year_id
+        ).order_by('semester_number')
+    else:
+        semesters = Semester.objects.filter(
+            academic_year=current_academic_year
+        ).order_by('semester_number') if current_academic_year else []
+    
+    # Years range (1-8 for university)
+    years_range = range(1, 9)
+    
+    context = {
+        'department': cod_department,
+        'programmes': programmes,
+        'academic_years': academic_years,
+        'current_academic_year': current_academic_year,
+        'semesters': semesters,
+        'years_range': years_range,
+    }
+    
+    return render(request, 'cod/generate_exam_list.html', context)
+
+
+def get_student_fee_status(student, semester):
+    """Calculate student's fee balance for a semester"""
+    try:
+        # Get fee structure for student's programme, year and semester
+        fee_structure = FeeStructure.objects.filter(
+            programme=student.programme,
+            academic_year=semester.academic_year,
+            year=student.current_year,
+            semester=semester.semester_number
+        ).first()
+        
+        if not fee_structure:
+            return {
+                'balance': 0,
+                'has_balance': False,
+                'total_fee': 0,
+                'paid': 0
+            }
+        
+        total_fee = fee_structure.net_fee()
+        
+        # Get total payments
+        total_paid = FeePayment.objects.filter(
+            student=student,
+            fee_structure=fee_structure,
+            payment_status='completed'
+        ).aggregate(
+            total=Sum('amount_paid')
+        )['total'] or 0
+        
+        balance = total_fee - total_paid
+        
+        return {
+            'balance': balance,
+            'has_balance': balance > 0,
+            'total_fee': total_fee,
+            'paid': total_paid
+        }
+    except Exception as e:
+        return {
+            'balance': 0,
+            'has_balance': False,
+            'total_fee': 0,
+            'paid': 0
+        }
+
+
+@login_required
+def cod_get_courses_for_programme(request):
+    """AJAX endpoint to get courses for selected programme, year and semester"""
+    from django.http import JsonResponse
+    
+    programme_id = request.GET.get('programme')
+    year = request.GET.get('year')
+    semester_id = request.GET.get('semester')
+    
+    if not all([programme_id, year, semester_id]):
+        return JsonResponse({'courses': []})
+    
+    try:
+        semester = Semester.objects.get(id=semester_id)
+        
+        # Get courses for this programme/year/semester that have enrollments
+        courses = Course.objects.filter(
+            course_programmes__programme_id=programme_id,
+            course_programmes__year=year,
+            course_programmes__semester=semester.semester_number,
+            course_programmes__is_active=True,
+            enrollments__semester=semester,
+            enrollments__is_active=True
+        ).distinct().values('id', 'code', 'name')
+        
+        return JsonResponse({'courses': list(courses)})
+    except Exception as e:
+        return JsonResponse({'courses': [], 'error': str(e)})
+
+
+@login_required
+def cod_research_dashboard(request):
+    """Research dashboard with overview and analytics"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied. Only COD can access this page.")
+        return redirect('dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get filter parameters
+    status_filter = request.GET.get('status', '')
+    research_type_filter = request.GET.get('research_type', '')
+    year_filter = request.GET.get('year', '')
+    
+    # Base query for research in department
+    research_query = Research.objects.filter(
+        department=department
+    ).select_related(
+        'principal_investigator__user',
+        'department'
+    ).prefetch_related(
+        'co_investigators',
+        'students'
+    ).order_by('-start_date')
+    
+    # Apply filters
+    if status_filter:
+        research_query = research_query.filter(status=status_filter)
+    
+    if research_type_filter:
+        research_query = research_query.filter(research_type=research_type_filter)
+    
+    if year_filter:
+        research_query = research_query.filter(start_date__year=year_filter)
+    
+    # Statistics
+    total_research = Research.objects.filter(department=department).count()
+    ongoing_research = Research.objects.filter(department=department, status='ongoing').count()
+    completed_research = Research.objects.filter(department=department, status='completed').count()
+    published_research = Research.objects.filter(department=department, status='published').count()
+    
+    # Total funding
+    from django.db.models import Sum
+    total_funding = Research.objects.filter(
+        department=department,
+        funding_amount__isnull=False
+    ).aggregate(total=Sum('funding_amount'))['total'] or 0
+    
+    # Research by type (for pie chart)
+    research_by_type = Research.objects.filter(
+        department=department
+    ).values('research_type').annotate(
+        count=Count('id')
+    )
+    
+    # Research by status (for donut chart)
+    research_by_status = Research.objects.filter(
+        department=department
+    ).values('status').annotate(
+        count=Count('id')
+    )
+    
+    # Research trends by year (for line chart)
+    research_trends = []
+    current_year = datetime.now().year
+    for year in range(current_year - 4, current_year + 1):
+        count = Research.objects.filter(
+            department=department,
+            start_date__year=year
+        ).count()
+        research_trends.append({
+            'year': year,
+            'count': count
+        })
+    
+    # Top researchers (lecturers with most research)
+    top_researchers = Lecturer.objects.filter(
+        department=department,
+        led_research__isnull=False
+    ).annotate(
+        research_count=Count('led_research')
+    ).order_by('-research_count')[:10]
+    
+    # Funding by research type (for bar chart)
+    funding_by_type = Research.objects.filter(
+        department=department,
+        funding_amount__isnull=False
+    ).values('research_type').annotate(
+        total_funding=Sum('funding_amount')
+    )
+    
+    # Recent research (last 6 months)
+    six_months_ago = datetime.now() - timedelta(days=180)
+    recent_research = Research.objects.filter(
+        department=department,
+        created_at__gte=six_months_ago
+    ).count()
+    
+    # Pagination
+    paginator = Paginator(research_query, 10)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Get distinct years for filter
+    years = Research.objects.filter(
+        department=department
+    ).dates('start_date', 'year').distinct()
+    
+    context = {
+        'department': department,
+        'page_obj': page_obj,
+        'status_filter': status_filter,
+        'research_type_filter': research_type_filter,
+        'year_filter': year_filter,
+        'years': [date.year for date in years],
+        
+        # Statistics
+        'total_research': total_research,
+        'ongoing_research': ongoing_research,
+        'completed_research': completed_research,
+        'published_research': published_research,
+        'total_funding': total_funding,
+        'recent_research': recent_research,
+        
+        # Chart Data
+        'research_by_type': list(research_by_type),
+        'research_by_status': list(research_by_status),
+        'research_trends': research_trends,
+        'top_researchers': top_researchers,
+        'funding_by_type': list(funding_by_type),
+        
+        # Choices for filters
+        'research_types': Research.RESEARCH_TYPES,
+        'status_choices': Research.STATUS_CHOICES,
+    }
+    
+    return render(request, 'cod/research_dashboard.html', context)
+
+
+@login_required
+def cod_research_detail(request, research_id):
+    """View detailed information about a specific research project"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get research project
+    research = get_object_or_404(
+        Research.objects.select_related(
+            'principal_investigator__user',
+            'department'
+        ).prefetch_related(
+            'co_investigators__user',
+            'students__user'
+        ),
+        id=research_id,
+        department=department
+    )
+    
+    # Calculate research duration
+    if research.actual_end_date:
+        duration = (research.actual_end_date - research.start_date).days
+    else:
+        duration = (datetime.now().date() - research.start_date).days
+    
+    # Calculate progress percentage
+    if research.actual_end_date:
+        progress = 100
+    else:
+        total_days = (research.expected_end_date - research.start_date).days
+        elapsed_days = (datetime.now().date() - research.start_date).days
+        progress = min(100, (elapsed_days / total_days * 100)) if total_days > 0 else 0
+    
+    context = {
+        'department': department,
+        'research': research,
+        'duration': duration,
+        'progress': round(progress, 2),
+    }
+    
+    return render(request, 'cod/research_detail.html', context)
+
+
+@login_required
+def cod_create_research(request):
+    """Create new research project"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied.")
+        return redirect('cod_dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    if request.method == 'POST':
+        try:
+            # Create research project
+            research = Research.objects.create(
+                title=request.POST.get('title'),
+                research_type=request.POST.get('research_type'),
+                principal_investigator_id=request.POST.get('principal_investigator'),
+                department=department,
+                start_date=request.POST.get('start_date'),
+                expected_end_date=request.POST.get('expected_end_date'),
+                status=request.POST.get('status', 'proposal'),
+                abstract=request.POST.get('abstract'),
+                keywords=request.POST.get('keywords', ''),
+                funding_amount=request.POST.get('funding_amount') or None,
+                funding_source=request.POST.get('funding_source', ''),
+                ethics_approval=request.POST.get('ethics_approval') == 'on'
+            )
+            
+            # Add co-investigators
+            co_investigators = request.POST.getlist('co_investigators')
+            if co_investigators:
+                research.co_investigators.set(co_investigators)
+            
+            # Add students
+            students = request.POST.getlist('students')
+            if students:
+                research.students.set(students)
+            
+            messages.success(request, f"Research project '{research.title}' created successfully!")
+            return redirect('cod_research_detail', research_id=research.id)
+            
+        except Exception as e:
+            messages.error(request, f"Error creating research project: {str(e)}")
+    
+    # Get lecturers and students in department for form
+    lecturers = Lecturer.objects.filter(
+        department=department,
+        is_active=True
+    ).select_related('user')
+    
+    students = Student.objects.filter(
+        programme__department=department,
+        status='active'
+    ).select_related('user')
+    
+    context = {
+        'department': department,
+        'lecturers': lecturers,
+        'students': students,
+        'research_types': Research.RESEARCH_TYPES,
+        'status_choices': Research.STATUS_CHOICES,
+    }
+    
+    return render(request, 'cod/research_create.html', context)
+
+
+@login_required
+def cod_edit_research(request, research_id):
+    """Edit existing research project"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get research project
+    research = get_object_or_404(
+        Research,
+        id=research_id,
+        department=department
+    )
+    
+    if request.method == 'POST':
+        try:
+            research.title = request.POST.get('title')
+            research.research_type = request.POST.get('research_type')
+            research.principal_investigator_id = request.POST.get('principal_investigator')
+            research.start_date = request.POST.get('start_date')
+            research.expected_end_date = request.POST.get('expected_end_date')
+            research.actual_end_date = request.POST.get('actual_end_date') or None
+            research.status = request.POST.get('status')
+            research.abstract = request.POST.get('abstract')
+            research.keywords = request.POST.get('keywords', '')
+            research.funding_amount = request.POST.get('funding_amount') or None
+            research.funding_source = request.POST.get('funding_source', '')
+            research.ethics_approval = request.POST.get('ethics_approval') == 'on'
+            research.save()
+            
+            # Update co-investigators
+            co_investigators = request.POST.getlist('co_investigators')
+            research.co_investigators.set(co_investigators)
+            
+            # Update students
+            students = request.POST.getlist('students')
+            research.students.set(students)
+            
+            messages.success(request, "Research project updated successfully!")
+            return redirect('cod_research_detail', research_id=research.id)
+            
+        except Exception as e:
+            messages.error(request, f"Error updating research project: {str(e)}")
+    
+    # Get lecturers and students in department for form
+    lecturers = Lecturer.objects.filter(
+        department=department,
+        is_active=True
+    ).select_related('user')
+    
+    students = Student.objects.filter(
+        programme__department=department,
+        status='active'
+    ).select_related('user')
+    
+    context = {
+        'department': department,
+        'research': research,
+        'lecturers': lecturers,
+        'students': students,
+        'research_types': Research.RESEARCH_TYPES,
+        'status_choices': Research.STATUS_CHOICES,
+    }
+    
+    return render(request, 'cod/research_edit.html', context)
+
+
+@login_required
+def cod_delete_research(request, research_id):
+    """Delete research project"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get research project
+    research = get_object_or_404(
+        Research,
+        id=research_id,
+        department=department
+    )
+    
+    if request.method == 'POST':
+        title = research.title
+        research.delete()
+        messages.success(request, f"Research project '{title}' deleted successfully!")
+        return redirect('cod_research_dashboard')
+    
+    return redirect('cod_research_detail', research_id=research_id)
+
+
+@login_required
+def cod_timetable_dashboard(request):
+    """Timetable management dashboard"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied. Only COD can access this page.")
+        return redirect('cod_dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get programmes in department
+    programmes = Programme.objects.filter(
+        department=department,
+        is_active=True
+    ).order_by('name')
+    
+    # Get current academic year and semester
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get all academic years and semesters
+    academic_years = AcademicYear.objects.all().order_by('-start_date')
+    
+    context = {
+        'department': department,
+        'programmes': programmes,
+        'current_academic_year': current_academic_year,
+        'current_semester': current_semester,
+        'academic_years': academic_years,
+    }
+    
+    return render(request, 'cod/timetable_dashboard.html', context)
+
+
+@login_required
+def cod_create_timetable(request):
+    """Create timetable for a programme"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get filter parameters
+    programme_id = request.GET.get('programme')
+    year = request.GET.get('year')
+    academic_year_id = request.GET.get('academic_year')
+    semester_id = request.GET.get('semester')
+    
+    # Get programmes in department
+    programmes = Programme.objects.filter(
+        department=department,
+        is_active=True
+    ).order_by('name')
+    
+    # Get academic years and semesters
+    academic_years = AcademicYear.objects.all().order_by('-start_date')
+    
+    # Initialize variables
+    selected_programme = None
+    selected_year = None
+    selected_academic_year = None
+    selected_semester = None
+    courses = []
+    lecturers = []
+    existing_timetable = []
+    venues = []
+    
+    if programme_id and year and semester_id:
+        selected_programme = get_object_or_404(
+            Programme, 
+            id=programme_id, 
+            department=department
+        )
+        selected_year = int(year)
+        selected_semester = get_object_or_404(Semester, id=semester_id)
+        selected_academic_year = selected_semester.academic_year
+        
+        # Get courses for the selected programme and year
+        programme_courses = ProgrammeCourse.objects.filter(
+            programme=selected_programme,
+            year=selected_year,
+            semester=selected_semester.semester_number,
+            is_active=True
+        ).select_related('course')
+        
+        courses = [pc.course for pc in programme_courses]
+        
+        # Get lecturers in department
+        lecturers = Lecturer.objects.filter(
+            department=department,
+            is_active=True
+        ).select_related('user')
+        
+        # Get existing timetable entries
+        existing_timetable = Timetable.objects.filter(
+            programme=selected_programme,
+            year=selected_year,
+            semester=selected_semester,
+            is_active=True
+        ).select_related('course', 'lecturer__user')
+        
+        # Common venues (you can fetch from database if you have a Venue model)
+        venues = [
+            'LH 01', 'LH 02', 'LH 03', 'LH 04', 'LH 05',
+            'Lab 101', 'Lab 102', 'Lab 201', 'Lab 202',
+            'Tutorial Room 1', 'Tutorial Room 2', 'Tutorial Room 3',
+            'Computer Lab A', 'Computer Lab B', 'Seminar Room',
+        ]
+    
+    # Get semesters for selected academic year
+    semesters = []
+    if academic_year_id or selected_academic_year:
+        ay_id = academic_year_id if academic_year_id else selected_academic_year.id
+        semesters = Semester.objects.filter(
+            academic_year_id=ay_id
+        ).order_by('semester_number')
+    
+    # Time slots (8 AM to 6 PM)
+    time_slots = [
+        ('08:00', '09:00'), ('09:00', '10:00'), ('10:00', '11:00'),
+        ('11:00', '12:00'), ('12:00', '13:00'), ('13:00', '14:00'),
+        ('14:00', '15:00'), ('15:00', '16:00'), ('16:00', '17:00'),
+        ('17:00', '18:00'),
+    ]
+    
+    days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
+    
+    context = {
+        'department': department,
+        'programmes': programmes,
+        'academic_years': academic_years,
+        'semesters': semesters,
+        'selected_programme': selected_programme,
+        'selected_year': selected_year,
+        'selected_academic_year': selected_academic_year,
+        'selected_semester': selected_semester,
+        'courses': courses,
+        'lecturers': lecturers,
+        'existing_timetable': existing_timetable,
+        'venues': venues,
+        'time_slots': time_slots,
+        'days': days,
+        'years_range': range(1, 9),
+    }
+    
+    return render(request, 'cod/timetable_create.html', context)
+
+
+@login_required
+@require_POST
+def cod_save_timetable_slot(request):
+    """Save a timetable slot via AJAX"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        return JsonResponse({
+            'success': False,
+            'error': 'Access denied'
+        }, status=403)
+    
+    try:
+        # Parse JSON data
+        data = json.loads(request.body)
+        
+        # Get COD's department
+        department = request.role.department
+        if not department:
+            return JsonResponse({
+                'success': False,
+                'error': 'Department not found'
+            }, status=400)
+        
+        # Get related objects
+        programme = get_object_or_404(
+            Programme, 
+            id=data['programme_id'],
+            department=department
+        )
+        course = get_object_or_404(Course, id=data['course_id'])
+        lecturer = get_object_or_404(Lecturer, id=data['lecturer_id'])
+        semester = get_object_or_404(Semester, id=data['semester_id'])
+        
+        # Convert time strings to time objects
+        start_time = datetime.strptime(data['start_time'], '%H:%M').time()
+        end_time = datetime.strptime(data['end_time'], '%H:%M').time()
+        
+        # Check for conflicts
+        conflict = Timetable.objects.filter(
+            Q(lecturer=lecturer) | Q(venue=data['venue']),
+            semester=semester,
+            day_of_week=data['day'],
+            start_time=start_time,
+            is_active=True
+        ).exclude(id=data.get('timetable_id')).exists()
+        
+        if conflict:
+            return JsonResponse({
+                'success': False,
+                'error': 'Conflict detected: Lecturer or venue already occupied at this time'
+            }, status=400)
+        
+        # Create or update timetable slot
+        if data.get('timetable_id'):
+            # Update existing slot
+            timetable = get_object_or_404(Timetable, id=data['timetable_id'])
+            timetable.course = course
+            timetable.lecturer = lecturer
+            timetable.day_of_week = data['day']
+            timetable.start_time = start_time
+            timetable.end_time = end_time
+            timetable.venue = data['venue']
+            timetable.class_type = data.get('class_type', 'lecture')
+            timetable.save()
+            message = 'Timetable slot updated successfully'
+        else:
+            # Create new slot
+            timetable = Timetable.objects.create(
+                course=course,
+                lecturer=lecturer,
+                semester=semester,
+                day_of_week=data['day'],
+                start_time=start_time,
+                end_time=end_time,
+                venue=data['venue'],
+                class_type=data.get('class_type', 'lecture'),
+                programme=programme,
+                year=data['year'],
+                semester_number=semester.semester_number,
+                is_active=True
+            )
+            message = 'Timetable slot created successfully'
+        
+        return JsonResponse({
+            'success': True,
+            'message': message,
+            'timetable_id': timetable.id,
+            'course_name': course.name,
+            'course_code': course.code,
+            'lecturer_name': lecturer.user.get_full_name(),
+            'venue': timetable.venue,
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+
+@login_required
+@require_POST
+def cod_delete_timetable_slot(request):
+    """Delete a timetable slot via AJAX"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        return JsonResponse({
+            'success': False,
+            'error': 'Access denied'
+        }, status=403)
+    
+    try:
+        data = json.loads(request.body)
+        timetable_id = data.get('timetable_id')
+        
+        # Get COD's department
+        department = request.role.department
+        if not department:
+            return JsonResponse({
+                'success': False,
+                'error': 'Department not found'
+            }, status=400)
+        
+        # Get and delete timetable slot
+        timetable = get_object_or_404(
+            Timetable,
+            id=timetable_id,
+            programme__department=department
+        )
+        timetable.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Timetable slot deleted successfully'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+
+@login_required
+def cod_view_timetable(request, programme_id, year, semester_id):
+    """View completed timetable"""
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    # Get COD's department
+    try:
+        department = request.role.department
+        if not department:
+            messages.error(request, "You are not assigned as head of any department.")
+            return redirect('cod_dashboard')
+    except:
+        messages.error(request, "Department information not found.")
+        return redirect('cod_dashboard')
+    
+    # Get related objects
+    programme = get_object_or_404(
+        Programme,
+        id=programme_id,
+        department=department
+    )
+    semester = get_object_or_404(Semester, id=semester_id)
+    
+    # Get timetable entries
+    timetable_entries = Timetable.objects.filter(
+        programme=programme,
+        year=year,
+        semester=semester,
+        is_active=True
+    ).select_related('course', 'lecturer__user').order_by('day_of_week', 'start_time')
+    
+    # Time slots and days
+    time_slots = [
+        ('08:00', '09:00'), ('09:00', '10:00'), ('10:00', '11:00'),
+        ('11:00', '12:00'), ('12:00', '13:00'), ('13:00', '14:00'),
+        ('14:00', '15:00'), ('15:00', '16:00'), ('16:00', '17:00'),
+        ('17:00', '18:00'),
+    ]
+    
+    days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
+    
+    context = {
+        'department': department,
+        'programme': programme,
+        'year': year,
+        'semester': semester,
+        'timetable_entries': timetable_entries,
+        'time_slots': time_slots,
+        'days': days,
+    }
+    
+    return render(request, 'cod/timetable_view.html', context)
+
+
+@login_required
+def cod_get_courses_ajax(request):
+    """Get courses for programme and year via AJAX"""
+    
+    try:
+        programme_id = request.GET.get('programme_id')
+        year = request.GET.get('year')
+        semester_number = request.GET.get('semester_number')
+        
+        # Get courses
+        programme_courses = ProgrammeCourse.objects.filter(
+            programme_id=programme_id,
+            year=year,
+            semester=semester_number,
+            is_active=True
+        ).select_related('course')
+        
+        courses_data = [{
+            'id': pc.course.id,
+            'code': pc.course.code,
+            'name': pc.course.name,
+            'credit_hours': pc.course.credit_hours,
+            'course_type': pc.course.get_course_type_display(),
+        } for pc in programme_courses]
+        
+        return JsonResponse({
+            'success': True,
+            'courses': courses_data
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
@@ -0,0 +1,79 @@
+# common.py - Error pages and the permission checks shared between view modules
+#
+# The is_admin / is_admin_or_staff family: several areas were written against
+# different notions of "admin", so each variant keeps its own name and the
+# decorators keep checking exactly what they checked before.
+
+from django.shortcuts import render
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+
+
+# =============================================================================
+# Error pages
+# =============================================================================
+
+@csrf_exempt
+def handler404(request, exception=None):
+    """ Custom 404 error handler """
+    context = {
+        'error_code': '404_NOT_FOUND',
+        'timestamp': timezone.now().isoformat(),
+    }
+    return render(request, '404.html', context, status=404)
+
+
+@csrf_exempt
+def handler500(request):
+    """ Custom 500 error handler """
+    context = {
+        'error_code': '500_SERVER_ERROR',
+        'timestamp': timezone.now().isoformat(),
+    }
+    return render(request, '500.html', context, status=500)
+
+
+def custom_permission_denied(request, exception=None):
+    """ Custom 403 error handler """
+    return render(request, '403.html', status=403)
+
+
+def custom_bad_request(request, exception=None):
+    """ Custom 400 error handler """
+    return render(request, '400.html', status=400)
+
+
+# =============================================================================
+# Permission checks
+# =============================================================================
+
+def is_admin(user):
+    """Check if user is admin"""
+    return user.is_authenticated and user.user_type == 'admin'
+
+
+def is_admin_or_staff(user):
+    """Check if user is Django staff or a superuser"""
+    return user.is_staff or user.is_superuser
+
+
+def is_admin_or_registrar(user):
+    """Check if user is admin or registrar (academic year and semester management)"""
+    return user.is_authenticated and user.user_type in ['admin', 'registrar']
+
+
+def is_admin_registrar_dean_or_superuser(user):
+    """Check if user is a superuser, admin, registrar or dean (student search)"""
+    return user.is_authenticated and (user.is_superuser or user.user_type in ['admin', 'registrar', 'dean'])
+
+
+def is_admin_registrar_or_dean(user):
+    """Check if user is admin, registrar or dean (departments)"""
+    return user.is_authenticated and user.user_type in ['admin', 'registrar', 'dean']
+
+
+def is_administrative_staff(user):
+    """Check if user is admin, registrar, dean, hod, or staff"""
+    return user.is_authenticated and user.user_type in [
+        'admin', 'registrar', 'dean', 'hod', 'staff'
+    ]
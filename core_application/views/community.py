@@ -0,0 +1,1655 @@
+# community.py - Events, clubs, student comments, notifications and news
+
+from datetime import timedelta
+import json
+
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.core.files.storage import default_storage
+from django.core.paginator import Paginator
+from django.db.models import CharField, Count, Q, Value
+from django.db.models.functions import Concat
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
+from django.utils.text import Truncator
+from django.utils.timesince import timesince
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from ..forms import ClubEventForm, StudentClubForm
+from ..models import (
+    ClubEvent, ClubMembership, Event, Hostel, NewsArticle, Notification, Programme, Student,
+    StudentClub, StudentComment, StudentNotification, User,
+)
+from .common import is_admin_or_staff
+
+BROADCAST_MENU_SIZE = 5
+
+
+@login_required
+def event_list(request):
+    """Event list view"""
+    events = Event.objects.all().order_by('-start_date')
+    
+    # Filter by event type if provided
+    event_type = request.GET.get('event_type')
+    if event_type:
+        events = events.filter(event_type=event_type)
+    
+    # Calculate counts
+    upcoming_count = events.filter(start_date__gte=timezone.now()).count()
+    past_count = events.filter(start_date__lt=timezone.now()).count()
+    my_events_count = events.filter(organizer=request.user).count()
+    
+    # Pagination
+    paginator = Paginator(events, 10)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    context = {
+        'events': page_obj,
+        'event_types': Event.EVENT_TYPES,
+        'selected_event_type': event_type,
+        'upcoming_count': upcoming_count,
+        'past_count': past_count,
+        'my_events_count': my_events_count,
+    }
+    return render(request, 'events/event_list.html', context)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@login_required
+def create_event(request):
+    """Create event via AJAX"""
+    try:
+        data = json.loads(request.body)
+        
+        event = Event(
+            title=data['title'],
+            description=data['description'],
+            event_type=data['event_type'],
+            start_date=data['start_date'],
+            end_date=data['end_date'],
+            venue=data['venue'],
+            organizer=request.user,
+            is_public=data.get('is_public', True),
+            max_participants=data.get('max_participants'),
+            registration_required=data.get('registration_required', False)
+        )
+        event.save()
+        
+        return JsonResponse({
+            'success': True,
+            'event': {
+                'id': event.id,
+                'title': event.title,
+                'event_type': event.get_event_type_display(),
+                'start_date': event.start_date.strftime('%Y-%m-%d %H:%M'),
+                'end_date': event.end_date.strftime('%Y-%m-%d %H:%M'),
+                'venue': event.venue,
+                'organizer': event.organizer.get_full_name(),
+            }
+        })
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@login_required
+def update_event(request, event_id):
+    """Update event via AJAX"""
+    try:
+        event = get_object_or_404(Event, id=event_id)
+        
+        # Check if user is the organizer
+        if event.organizer != request.user and not request.user.is_staff:
+            return JsonResponse({'success': False, 'error': 'Permission denied'})
+        
+        data = json.loads(request.body)
+        
+        event.title = data['title']
+        event.description = data['description']
+        event.event_type = data['event_type']
+        event.start_date = data['start_date']
+        event.end_date = data['end_date']
+        event.venue = data['venue']
+        event.is_public = data.get('is_public', True)
+        event.max_participants = data.get('max_participants')
+        event.registration_required = data.get('registration_required', False)
+        
+        event.save()
+        
+        return JsonResponse({
+            'success': True,
+            'event': {
+                'id': event.id,
+                'title': event.title,
+                'event_type': event.get_event_type_display(),
+                'start_date': event.start_date.strftime('%Y-%m-%d %H:%M'),
+                'end_date': event.end_date.strftime('%Y-%m-%d %H:%M'),
+                'venue': event.venue,
+            }
+        })
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@csrf_exempt
+@require_http_methods(["DELETE"])
+@login_required
+def delete_event(request, event_id):
+    """Delete event via AJAX"""
+    try:
+        event = get_object_or_404(Event, id=event_id)
+        
+        # Check if user is the organizer
+        if event.organizer != request.user and not request.user.is_staff:
+            return JsonResponse({'success': False, 'error': 'Permission denied'})
+        
+        event.delete()
+        
+        return JsonResponse({'success': True})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@login_required
+def get_event_details(request, event_id):
+    """Get event details for editing"""
+    try:
+        event = get_object_or_404(Event, id=event_id)
+        
+        # Check if user is the organizer
+        if event.organizer != request.user and not request.user.is_staff:
+            return JsonResponse({'success': False, 'error': 'Permission denied'})
+        
+        return JsonResponse({
+            'success': True,
+            'event': {
+                'id': event.id,
+                'title': event.title,
+                'description': event.description,
+                'event_type': event.event_type,
+                'start_date': event.start_date.strftime('%Y-%m-%dT%H:%M'),
+                'end_date': event.end_date.strftime('%Y-%m-%dT%H:%M'),
+                'venue': event.venue,
+                'is_public': event.is_public,
+                'max_participants': event.max_participants,
+                'registration_required': event.registration_required,
+            }
+        })
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@login_required
+def clubs_management(request):
+    """Main clubs management view"""
+    clubs = StudentClub.objects.annotate(
+        members_count=Count('members', filter=Q(members__is_active=True)),
+        events_count=Count('events')
+    ).select_related('chairperson').order_by('-created_at')
+    
+    # Filtering
+    search_query = request.GET.get('search', '')
+    category_filter = request.GET.get('category', '')
+    status_filter = request.GET.get('status', '')
+    
+    if search_query:
+        clubs = clubs.filter(
+            Q(name__icontains=search_query) |
+            Q(description__icontains=search_query)
+        )
+    
+    if category_filter:
+        clubs = clubs.filter(category=category_filter)
+    
+    if status_filter:
+        clubs = clubs.filter(is_active=(status_filter == 'active'))
+    
+    # Pagination
+    paginator = Paginator(clubs, 12)
+    page = request.GET.get('page')
+    clubs_page = paginator.get_page(page)
+    
+    # Statistics
+    stats = {
+        'total_clubs': StudentClub.objects.count(),
+        'active_clubs': StudentClub.objects.filter(is_active=True).count(),
+        'total_members': ClubMembership.objects.filter(is_active=True).count(),
+        'categories_count': StudentClub.objects.values('category').distinct().count(),
+    }
+    
+    context = {
+        'clubs': clubs_page,
+        'stats': stats,
+        'search_query': search_query,
+        'category_filter': category_filter,
+        'status_filter': status_filter,
+        'categories': StudentClub.CATEGORY_CHOICES,
+    }
+    
+    return render(request, 'clubs/clubs_management.html', context)
+
+
+@login_required
+@require_http_methods(["POST"])
+def create_club(request):
+    """AJAX endpoint to create a new club"""
+    try:
+        form = StudentClubForm(request.POST, request.FILES)
+        if form.is_valid():
+            club = form.save()
+            
+            # Create membership for chairperson if specified
+            if club.chairperson:
+                ClubMembership.objects.get_or_create(
+                    student=club.chairperson,
+                    club=club,
+                    defaults={
+                        'is_executive': True,
+                        'position': 'Chairperson'
+                    }
+                )
+            
+            return JsonResponse({
+                'success': True,
+                'message': 'Club created successfully!',
+                'club': {
+                    'id': club.id,
+                    'name': club.name,
+                    'category': club.get_category_display(),
+                    'description': club.description,
+                    'chairperson': club.chairperson.get_full_name() if club.chairperson else 'Not assigned',
+                    'contact_phone': club.contact_phone,
+                    'email': club.email,
+                    'membership_fee': str(club.membership_fee),
+                    'is_active': club.is_active,
+                    'created_at': club.created_at.strftime('%B %d, %Y'),
+                    'members_count': 0,
+                    'events_count': 0,
+                }
+            })
+        else:
+            return JsonResponse({
+                'success': False,
+                'errors': form.errors
+            })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error creating club: {str(e)}'
+        })
+
+
+@login_required
+def get_club(request, club_id):
+    """AJAX endpoint to get club details"""
+    try:
+        club = get_object_or_404(StudentClub, id=club_id)
+        members_count = club.members.filter(is_active=True).count()
+        events_count = club.events.count()
+        
+        data = {
+            'id': club.id,
+            'name': club.name,
+            'category': club.category,
+            'description': club.description,
+            'chairperson_id': club.chairperson.id if club.chairperson else None,
+            'chairperson_name': club.chairperson.get_full_name() if club.chairperson else 'Not assigned',
+            'contact_phone': club.contact_phone,
+            'email': club.email,
+            'meeting_schedule': club.meeting_schedule,
+            'membership_fee': str(club.membership_fee),
+            'is_active': club.is_active,
+            'created_at': club.created_at.strftime('%B %d, %Y'),
+            'members_count': members_count,
+            'events_count': events_count,
+            'logo_url': club.logo.url if club.logo else None,
+        }
+        
+        return JsonResponse({'success': True, 'club': data})
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)})
+
+
+@login_required
+@require_http_methods(["POST"])
+def update_club(request, club_id):
+    """AJAX endpoint to update club"""
+    try:
+        club = get_object_or_404(StudentClub, id=club_id)
+        form = StudentClubForm(request.POST, request.FILES, instance=club)
+        
+        if form.is_valid():
+            updated_club = form.save()
+            
+            # Update chairperson membership
+            if updated_club.chairperson:
+                membership, created = ClubMembership.objects.get_or_create(
+                    student=updated_club.chairperson,
+                    club=updated_club,
+                    defaults={
+                        'is_executive': True,
+                        'position': 'Chairperson'
+                    }
+                )
+                if not created:
+                    membership.is_executive = True
+                    membership.position = 'Chairperson'
+                    membership.is_active = True
+                    membership.save()
+            
+            return JsonResponse({
+                'success': True,
+                'message': 'Club updated successfully!',
+                'club': {
+                    'id': updated_club.id,
+                    'name': updated_club.name,
+                    'category': updated_club.get_category_display(),
+                    'description': updated_club.description,
+                    'chairperson': updated_club.chairperson.get_full_name() if updated_club.chairperson else 'Not assigned',
+                    'contact_phone': updated_club.contact_phone,
+                    'email': updated_club.email,
+                    'membership_fee': str(updated_club.membership_fee),
+                    'is_active': updated_club.is_active,
+                }
+            })
+        else:
+            return JsonResponse({
+                'success': False,
+                'errors': form.errors
+            })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error updating club: {str(e)}'
+        })
+
+
+@login_required
+@require_http_methods(["POST"])
+def delete_club(request, club_id):
+    """AJAX endpoint to delete club"""
+    try:
+        club = get_object_or_404(StudentClub, id=club_id)
+        club_name = club.name
+        club.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Club "{club_name}" deleted successfully!'
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error deleting club: {str(e)}'
+        })
+
+
+@login_required
+def club_events_management(request):
+    """Main club events management view"""
+    events = ClubEvent.objects.select_related('club', 'organizer').order_by('-start_datetime')
+    
+    # Filtering
+    search_query = request.GET.get('search', '')
+    club_filter = request.GET.get('club', '')
+    status_filter = request.GET.get('status', '')
+    
+    if search_query:
+        events = events.filter(
+            Q(title__icontains=search_query) |
+            Q(description__icontains=search_query) |
+            Q(location__icontains=search_query)
+        )
+    
+    if club_filter:
+        events = events.filter(club_id=club_filter)
+    
+    if status_filter:
+        events = events.filter(status=status_filter)
+    
+    # Pagination
+    paginator = Paginator(events, 12)
+    page = request.GET.get('page')
+    events_page = paginator.get_page(page)
+    
+    # Statistics
+    now = timezone.now()
+    stats = {
+        'total_events': ClubEvent.objects.count(),
+        'upcoming_events': ClubEvent.objects.filter(start_datetime__gt=now).count(),
+        'ongoing_events': ClubEvent.objects.filter(
+            start_datetime__lte=now,
+            end_datetime__gte=now
+        ).count(),
+        'completed_events': ClubEvent.objects.filter(end_datetime__lt=now).count(),
+    }
+    
+    context = {
+        'events': events_page,
+        'stats': stats,
+        'search_query': search_query,
+        'club_filter': club_filter,
+        'status_filter': status_filter,
+        'clubs': StudentClub.objects.filter(is_active=True),
+        'status_choices': ClubEvent.EVENT_STATUS_CHOICES,
+    }
+    
+    return render(request, 'clubs/club_events_management.html', context)
+
+
+@login_required
+@require_http_methods(["POST"])
+def create_club_event(request):
+    """AJAX endpoint to create a new club event"""
+    try:
+        form = ClubEventForm(request.POST, request.FILES)
+        if form.is_valid():
+            event = form.save(commit=False)
+            if not event.organizer:
+                event.organizer = request.user
+            event.save()
+            
+            return JsonResponse({
+                'success': True,
+                'message': 'Event created successfully!',
+                'event': {
+                    'id': event.id,
+                    'title': event.title,
+                    'club_name': event.club.name,
+                    'description': event.description,
+                    'start_datetime': event.start_datetime.strftime('%B %d, %Y %I:%M %p'),
+                    'end_datetime': event.end_datetime.strftime('%B %d, %Y %I:%M %p'),
+                    'location': event.location,
+                    'organizer': event.organizer.get_full_name() if event.organizer else 'Unknown',
+                    'status': event.get_status_display(),
+                    'registration_required': event.registration_required,
+                    'max_participants': event.max_participants,
+                }
+            })
+        else:
+            return JsonResponse({
+                'success': False,
+                'errors': form.errors
+            })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error creating event: {str(e)}'
+        })
+
+
+@login_required
+def get_club_event(request, event_id):
+    """AJAX endpoint to get club event details"""
+    try:
+        event = get_object_or_404(ClubEvent, id=event_id)
+        
+        data = {
+            'id': event.id,
+            'title': event.title,
+            'club_id': event.club.id,
+            'club_name': event.club.name,
+            'description': event.description,
+            'start_datetime': event.start_datetime.strftime('%Y-%m-%dT%H:%M'),
+            'end_datetime': event.end_datetime.strftime('%Y-%m-%dT%H:%M'),
+            'location': event.location,
+            'organizer_id': event.organizer.id if event.organizer else None,
+            'organizer_name': event.organizer.get_full_name() if event.organizer else 'Unknown',
+            'status': event.status,
+            'registration_required': event.registration_required,
+            'max_participants': event.max_participants,
+            'image_url': event.image.url if event.image else None,
+        }
+        
+        return JsonResponse({'success': True, 'event': data})
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)})
+
+
+@login_required
+@require_http_methods(["POST"])
+def update_club_event(request, event_id):
+    """AJAX endpoint to update club event"""
+    try:
+        event = get_object_or_404(ClubEvent, id=event_id)
+        form = ClubEventForm(request.POST, request.FILES, instance=event)
+        
+        if form.is_valid():
+            updated_event = form.save()
+            
+            return JsonResponse({
+                'success': True,
+                'message': 'Event updated successfully!',
+                'event': {
+                    'id': updated_event.id,
+                    'title': updated_event.title,
+                    'club_name': updated_event.club.name,
+                    'description': updated_event.description,
+                    'start_datetime': updated_event.start_datetime.strftime('%B %d, %Y %I:%M %p'),
+                    'end_datetime': updated_event.end_datetime.strftime('%B %d, %Y %I:%M %p'),
+                    'location': updated_event.location,
+                    'organizer': updated_event.organizer.get_full_name() if updated_event.organizer else 'Unknown',
+                    'status': updated_event.get_status_display(),
+                    'registration_required': updated_event.registration_required,
+                    'max_participants': updated_event.max_participants,
+                }
+            })
+        else:
+            return JsonResponse({
+                'success': False,
+                'errors': form.errors
+            })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error updating event: {str(e)}'
+        })
+
+
+@login_required
+@require_http_methods(["POST"])
+def delete_club_event(request, event_id):
+    """AJAX endpoint to delete club event"""
+    try:
+        event = get_object_or_404(ClubEvent, id=event_id)
+        event_title = event.title
+        event.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Event "{event_title}" deleted successfully!'
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error deleting event: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+def student_comments_management(request):
+    """Main student comments management view"""
+    comments = StudentComment.objects.select_related(
+        'student__user', 'responded_by'
+    ).annotate(
+        student_name=Concat(
+            'student__user__first_name',
+            Value(' '),
+            'student__user__last_name',
+            output_field=CharField()
+        )
+    ).order_by('-created_at')
+    
+    # Filtering
+    search_query = request.GET.get('search', '')
+    status_filter = request.GET.get('status', '')
+    date_filter = request.GET.get('date', '')
+    
+    if search_query:
+        comments = comments.filter(
+            Q(comment__icontains=search_query) |
+            Q(student__user__first_name__icontains=search_query) |
+            Q(student__user__last_name__icontains=search_query) |
+            Q(student__student_id__icontains=search_query) |
+            Q(admin_response__icontains=search_query)
+        )
+    
+    if status_filter:
+        if status_filter == 'resolved':
+            comments = comments.filter(is_resolved=True)
+        elif status_filter == 'pending':
+            comments = comments.filter(is_resolved=False)
+        elif status_filter == 'responded':
+            comments = comments.filter(admin_response__isnull=False)
+        elif status_filter == 'unresponded':
+            comments = comments.filter(admin_response__isnull=True)
+    
+    if date_filter:
+        from datetime import datetime, timedelta
+        today = timezone.now().date()
+        
+        if date_filter == 'today':
+            comments = comments.filter(created_at__date=today)
+        elif date_filter == 'week':
+            week_ago = today - timedelta(days=7)
+            comments = comments.filter(created_at__date__gte=week_ago)
+        elif date_filter == 'month':
+            month_ago = today - timedelta(days=30)
+            comments = comments.filter(created_at__date__gte=month_ago)
+    
+    # Pagination
+    paginator = Paginator(comments, 15)
+    page = request.GET.get('page')
+    comments_page = paginator.get_page(page)
+    
+    # Statistics
+    stats = {
+        'total_comments': StudentComment.objects.count(),
+        'pending_comments': StudentComment.objects.filter(is_resolved=False).count(),
+        'resolved_comments': StudentComment.objects.filter(is_resolved=True).count(),
+        'responded_comments': StudentComment.objects.filter(admin_response__isnull=False).count(),
+        'unresponded_comments': StudentComment.objects.filter(admin_response__isnull=True).count(),
+        'today_comments': StudentComment.objects.filter(
+            created_at__date=timezone.now().date()
+        ).count(),
+    }
+    
+    context = {
+        'comments': comments_page,
+        'stats': stats,
+        'search_query': search_query,
+        'status_filter': status_filter,
+        'date_filter': date_filter,
+    }
+    
+    return render(request, 'comments/student_comments_management.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+def get_student_comment(request, comment_id):
+    """AJAX endpoint to get comment details"""
+    try:
+        comment = get_object_or_404(StudentComment, id=comment_id)
+        
+        data = {
+            'id': comment.id,
+            'student_name': comment.student.user.get_full_name(),
+            'student_id': comment.student.student_id,
+            'student_email': comment.student.user.email,
+            'comment': comment.comment,
+            'created_at': comment.created_at.strftime('%B %d, %Y %I:%M %p'),
+            'updated_at': comment.updated_at.strftime('%B %d, %Y %I:%M %p'),
+            'is_resolved': comment.is_resolved,
+            'admin_response': comment.admin_response,
+            'responded_by': comment.responded_by.get_full_name() if comment.responded_by else None,
+            'response_date': comment.updated_at.strftime('%B %d, %Y %I:%M %p') if comment.admin_response else None,
+        }
+        
+        return JsonResponse({'success': True, 'comment': data})
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)})
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def add_admin_response(request, comment_id):
+    """AJAX endpoint to add admin response to comment"""
+    try:
+        comment = get_object_or_404(StudentComment, id=comment_id)
+        
+        admin_response = request.POST.get('admin_response', '').strip()
+        is_resolved = request.POST.get('is_resolved') == 'on'
+        
+        if not admin_response:
+            return JsonResponse({
+                'success': False,
+                'message': 'Admin response cannot be empty.'
+            })
+        
+        comment.admin_response = admin_response
+        comment.is_resolved = is_resolved
+        comment.responded_by = request.user
+        comment.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Response added successfully!',
+            'comment': {
+                'id': comment.id,
+                'admin_response': comment.admin_response,
+                'is_resolved': comment.is_resolved,
+                'responded_by': comment.responded_by.get_full_name(),
+                'response_date': comment.updated_at.strftime('%B %d, %Y %I:%M %p'),
+                'updated_at': comment.updated_at.strftime('%B %d, %Y %I:%M %p'),
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error adding response: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def update_admin_response(request, comment_id):
+    """AJAX endpoint to update admin response"""
+    try:
+        comment = get_object_or_404(StudentComment, id=comment_id)
+        
+        admin_response = request.POST.get('admin_response', '').strip()
+        is_resolved = request.POST.get('is_resolved') == 'on'
+        
+        if not admin_response:
+            return JsonResponse({
+                'success': False,
+                'message': 'Admin response cannot be empty.'
+            })
+        
+        comment.admin_response = admin_response
+        comment.is_resolved = is_resolved
+        comment.responded_by = request.user
+        comment.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Response updated successfully!',
+            'comment': {
+                'id': comment.id,
+                'admin_response': comment.admin_response,
+                'is_resolved': comment.is_resolved,
+                'responded_by': comment.responded_by.get_full_name(),
+                'response_date': comment.updated_at.strftime('%B %d, %Y %I:%M %p'),
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error updating response: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def toggle_comment_status(request, comment_id):
+    """AJAX endpoint to toggle comment resolved status"""
+    try:
+        comment = get_object_or_404(StudentComment, id=comment_id)
+        comment.is_resolved = not comment.is_resolved
+        comment.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Comment marked as {"resolved" if comment.is_resolved else "pending"}.',
+            'is_resolved': comment.is_resolved
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error updating status: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def delete_student_comment(request, comment_id):
+    """AJAX endpoint to delete comment"""
+    try:
+        comment = get_object_or_404(StudentComment, id=comment_id)
+        student_name = comment.student.user.get_full_name()
+        comment.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Comment by {student_name} deleted successfully!'
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error deleting comment: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def bulk_action_comments(request):
+    """AJAX endpoint for bulk actions on comments"""
+    try:
+        action = request.POST.get('action')
+        comment_ids = request.POST.getlist('comment_ids')
+        
+        if not comment_ids:
+            return JsonResponse({
+                'success': False,
+                'message': 'No comments selected.'
+            })
+        
+        comments = StudentComment.objects.filter(id__in=comment_ids)
+        
+        if action == 'mark_resolved':
+            comments.update(is_resolved=True)
+            message = f'{comments.count()} comments marked as resolved.'
+        elif action == 'mark_pending':
+            comments.update(is_resolved=False)
+            message = f'{comments.count()} comments marked as pending.'
+        elif action == 'delete':
+            count = comments.count()
+            comments.delete()
+            message = f'{count} comments deleted.'
+        else:
+            return JsonResponse({
+                'success': False,
+                'message': 'Invalid action.'
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'message': message
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error performing bulk action: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+def notification_management(request):
+    """Main notification management view"""
+    # Get notification type from URL parameter
+    notification_type = request.GET.get('type', 'student')  # 'student' or 'general'
+    
+    if notification_type == 'student':
+        notifications = StudentNotification.objects.select_related(
+            'student__user'
+        ).annotate(
+            student_name=Concat(
+                'student__user__first_name',
+                Value(' '),
+                'student__user__last_name',
+                output_field=CharField()
+            )
+        ).order_by('-created_date')
+        
+        # Student notification statistics
+        stats = {
+            'total_notifications': StudentNotification.objects.count(),
+            'read_notifications': StudentNotification.objects.filter(is_read=True).count(),
+            'unread_notifications': StudentNotification.objects.filter(is_read=False).count(),
+            'today_notifications': StudentNotification.objects.filter(
+                created_date__date=timezone.now().date()
+            ).count(),
+            'exam_notifications': StudentNotification.objects.filter(
+                notification_type='exam_schedule'
+            ).count(),
+            'assignment_notifications': StudentNotification.objects.filter(
+                notification_type='assignment_due'
+            ).count(),
+        }
+        
+    else:  # general notifications
+        notifications = Notification.objects.select_related(
+            'sender'
+        ).prefetch_related('recipients').annotate(
+            recipient_count=Count('recipients')
+        ).order_by('-created_at')
+        
+        # General notification statistics
+        stats = {
+            'total_notifications': Notification.objects.count(),
+            'active_notifications': Notification.objects.filter(
+                Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+            ).count(),
+            'expired_notifications': Notification.objects.filter(
+                expires_at__lte=timezone.now()
+            ).count(),
+            'today_notifications': Notification.objects.filter(
+                created_at__date=timezone.now().date()
+            ).count(),
+            'high_priority': Notification.objects.filter(priority='high').count(),
+            'urgent_priority': Notification.objects.filter(priority='urgent').count(),
+        }
+    
+    # Common filtering
+    search_query = request.GET.get('search', '')
+    status_filter = request.GET.get('status', '')
+    type_filter = request.GET.get('filter_type', '')
+    date_filter = request.GET.get('date', '')
+    
+    if search_query:
+        if notification_type == 'student':
+            notifications = notifications.filter(
+                Q(title__icontains=search_query) |
+                Q(message__icontains=search_query) |
+                Q(student__user__first_name__icontains=search_query) |
+                Q(student__user__last_name__icontains=search_query) |
+                Q(student__student_id__icontains=search_query)
+            )
+        else:
+            notifications = notifications.filter(
+                Q(title__icontains=search_query) |
+                Q(message__icontains=search_query) |
+                Q(sender__first_name__icontains=search_query) |
+                Q(sender__last_name__icontains=search_query)
+            )
+    
+    if status_filter:
+        if notification_type == 'student':
+            if status_filter == 'read':
+                notifications = notifications.filter(is_read=True)
+            elif status_filter == 'unread':
+                notifications = notifications.filter(is_read=False)
+        else:
+            if status_filter == 'active':
+                notifications = notifications.filter(
+                    Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+                )
+            elif status_filter == 'expired':
+                notifications = notifications.filter(expires_at__lte=timezone.now())
+    
+    if type_filter:
+        notifications = notifications.filter(notification_type=type_filter)
+    
+    if date_filter:
+        today = timezone.now().date()
+        date_field = 'created_date' if notification_type == 'student' else 'created_at'
+        
+        if date_filter == 'today':
+            notifications = notifications.filter(**{f'{date_field}__date': today})
+        elif date_filter == 'week':
+            week_ago = today - timedelta(days=7)
+            notifications = notifications.filter(**{f'{date_field}__date__gte': week_ago})
+        elif date_filter == 'month':
+            month_ago = today - timedelta(days=30)
+            notifications = notifications.filter(**{f'{date_field}__date__gte': month_ago})
+    
+    # Pagination
+    from ..pagination import KeysetPaginator
+    paginator = KeysetPaginator(notifications, 15)
+    page = request.GET.get('page')
+    notifications_page = paginator.get_page(page)
+    
+    context = {
+        'notifications': notifications_page,
+        'notification_type': notification_type,
+        'stats': stats,
+        'search_query': search_query,
+        'status_filter': status_filter,
+        'type_filter': type_filter,
+        'date_filter': date_filter,
+        'student_notification_types': StudentNotification.NOTIFICATION_TYPES,
+        'general_notification_types': Notification.NOTIFICATION_TYPES,
+        'priority_levels': Notification.PRIORITY_LEVELS,
+    }
+    if notification_type == 'general':
+        from ..models_broadcast import BroadcastNotification
+        context.update({
+            'broadcast_audiences': BroadcastNotification.AUDIENCES,
+            'programmes': Programme.objects.filter(is_active=True).only('id', 'code', 'name').order_by('code'),
+            'hostels': Hostel.objects.filter(is_active=True).only('id', 'name').order_by('name'),
+            'study_years': range(1, 9),
+        })
+    
+    return render(request, 'admin/notification_management.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+def notification_detail(request, notification_id):
+    """Get notification details for viewing"""
+    notification_type = request.GET.get('type', 'student')
+    
+    try:
+        if notification_type == 'student':
+            notification = get_object_or_404(
+                StudentNotification.objects.select_related('student__user'),
+                id=notification_id
+            )
+            data = {
+                'success': True,
+                'notification': {
+                    'id': notification.id,
+                    'title': notification.title,
+                    'message': notification.message,
+                    'notification_type': notification.get_notification_type_display(),
+                    'student_name': notification.student.user.get_full_name(),
+                    'student_id': notification.student.student_id,
+                    'student_email': notification.student.user.email,
+                    'is_read': notification.is_read,
+                    'created_date': notification.created_date.strftime('%B %d, %Y at %H:%M'),
+                    'read_date': notification.read_date.strftime('%B %d, %Y at %H:%M') if notification.read_date else None,
+                    'related_url': notification.related_url,
+                }
+            }
+        else:
+            notification = get_object_or_404(
+                Notification.objects.select_related('sender').prefetch_related('recipients'),
+                id=notification_id
+            )
+            recipients = [f"{user.get_full_name()} ({user.email})" for user in notification.recipients.all()]
+            
+            data = {
+                'success': True,
+                'notification': {
+                    'id': notification.id,
+                    'title': notification.title,
+                    'message': notification.message,
+                    'notification_type': notification.get_notification_type_display(),
+                    'priority': notification.get_priority_display(),
+                    'sender_name': notification.sender.get_full_name(),
+                    'sender_email': notification.sender.email,
+                    'recipients': recipients,
+                    'recipient_count': notification.recipients.count(),
+                    'send_email': notification.send_email,
+                    'send_sms': notification.send_sms,
+                    'created_at': notification.created_at.strftime('%B %d, %Y at %H:%M'),
+                    'scheduled_time': notification.scheduled_time.strftime('%B %d, %Y at %H:%M') if notification.scheduled_time else None,
+                    'expires_at': notification.expires_at.strftime('%B %d, %Y at %H:%M') if notification.expires_at else None,
+                }
+            }
+            
+    except Exception as e:
+        data = {
+            'success': False,
+            'message': f'Error loading notification: {str(e)}'
+        }
+    
+    return JsonResponse(data)
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def create_notification(request):
+    """Create a new notification"""
+    try:
+        notification_type = request.POST.get('notification_type')
+        if notification_type == 'general' and request.POST.get('audience'):
+            # "Send To" an audience instead of picked recipients
+            notification_type = 'broadcast'
+        
+        if notification_type == 'student':
+            student_id = request.POST.get('student_id')
+            student = get_object_or_404(Student, id=student_id)
+            
+            notification = StudentNotification.objects.create(
+                student=student,
+                title=request.POST.get('title'),
+                message=request.POST.get('message'),
+                notification_type=request.POST.get('type'),
+                related_url=request.POST.get('related_url', '')
+            )
+            
+            return JsonResponse({
+                'success': True,
+                'message': 'Student notification created successfully!'
+            })
+            
+        elif notification_type == 'broadcast':
+            # One row for the whole audience; inboxes match it on read
+            from ..broadcasts import publish
+            
+            audience = request.POST.get('audience')
+            programme_id = request.POST.get('programme_id')
+            hostel_id = request.POST.get('hostel_id')
+            year = request.POST.get('year')
+            broadcast = publish(
+                sender=request.user,
+                title=request.POST.get('title'),
+                message=request.POST.get('message'),
+                audience=audience,
+                programme=get_object_or_404(Programme, id=programme_id) if programme_id else None,
+                year=int(year) if year else None,
+                hostel=get_object_or_404(Hostel, id=hostel_id) if hostel_id else None,
+                # The general form offers Notification types; others become 'general'
+                notification_type=request.POST.get('type') if request.POST.get('type') in dict(
+                    StudentNotification.NOTIFICATION_TYPES) else 'general',
+                related_url=request.POST.get('related_url', ''),
+                expires_at=request.POST.get('expires_at') or None,
+                send_email=request.POST.get('send_email') == 'on',
+                send_sms=request.POST.get('send_sms') == 'on',
+            )
+            
+            return JsonResponse({
+                'success': True,
+                'message': f'Broadcast sent to {broadcast.get_audience_display()}!'
+            })
+            
+        else:  # general notification
+            recipient_ids = request.POST.getlist('recipients')
+            
+            notification = Notification.objects.create(
+                title=request.POST.get('title'),
+                message=request.POST.get('message'),
+                notification_type=request.POST.get('type'),
+                priority=request.POST.get('priority', 'medium'),
+                sender=request.user,
+                send_email=request.POST.get('send_email') == 'on',
+                send_sms=request.POST.get('send_sms') == 'on',
+                scheduled_time=request.POST.get('scheduled_time') or None,
+                expires_at=request.POST.get('expires_at') or None,
+            )
+            
+            # Add recipients
+            if recipient_ids:
+                recipients = User.objects.filter(id__in=recipient_ids)
+                notification.recipients.set(recipients)
+                
+                # Email/SMS copies are delivered by the outbox
+                if notification.send_email or notification.send_sms:
+                    from ..outbox import queue_notification
+                    queue_notification(notification, recipients)
+            
+            return JsonResponse({
+                'success': True,
+                'message': 'General notification created successfully!'
+            })
+            
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error creating notification: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def mark_as_read(request, notification_id):
+    """Mark student notification as read"""
+    try:
+        notification = get_object_or_404(StudentNotification, id=notification_id)
+        notification.is_read = True
+        notification.read_date = timezone.now()
+        notification.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Notification marked as read!'
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error updating notification: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def delete_notification(request, notification_id):
+    """Delete a notification"""
+    try:
+        notification_type = request.POST.get('type', 'student')
+        
+        if notification_type == 'student':
+            notification = get_object_or_404(StudentNotification, id=notification_id)
+        else:
+            notification = get_object_or_404(Notification, id=notification_id)
+        
+        notification.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Notification deleted successfully!'
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error deleting notification: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def bulk_action(request):
+    """Handle bulk actions on notifications"""
+    try:
+        action = request.POST.get('action')
+        notification_ids = request.POST.getlist('notification_ids')
+        notification_type = request.POST.get('type', 'student')
+        
+        if not notification_ids:
+            return JsonResponse({
+                'success': False,
+                'message': 'No notifications selected.'
+            })
+        
+        if notification_type == 'student':
+            notifications = StudentNotification.objects.filter(id__in=notification_ids)
+            
+            if action == 'mark_read':
+                notifications.update(is_read=True, read_date=timezone.now())
+                message = f'{len(notification_ids)} notifications marked as read.'
+            elif action == 'mark_unread':
+                notifications.update(is_read=False, read_date=None)
+                message = f'{len(notification_ids)} notifications marked as unread.'
+            elif action == 'delete':
+                notifications.delete()
+                message = f'{len(notification_ids)} notifications deleted.'
+        else:
+            notifications = Notification.objects.filter(id__in=notification_ids)
+            
+            if action == 'delete':
+                notifications.delete()
+                message = f'{len(notification_ids)} notifications deleted.'
+            else:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Invalid action for general notifications.'
+                })
+        
+        return JsonResponse({
+            'success': True,
+            'message': message
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error performing bulk action: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+def get_students(request):
+    """Get students for notification creation"""
+    try:
+        search = request.GET.get('search', '')
+        students = Student.objects.select_related('user').all()
+        
+        if search:
+            students = students.filter(
+                Q(user__first_name__icontains=search) |
+                Q(user__last_name__icontains=search) |
+                Q(student_id__icontains=search)
+            )
+        
+        student_data = []
+        for student in students[:20]:  # Limit to 20 results
+            student_data.append({
+                'id': student.id,
+                'name': student.user.get_full_name(),
+                'student_id': student.student_id,
+                'email': student.user.email
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'students': student_data
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error loading students: {str(e)}'
+        })
+
+
+# Announcements menu (every role's navbar loads it after the page renders)
+
+@login_required
+def broadcast_menu(request):
+    """Unread count and latest broadcasts for the signed-in user"""
+    from ..broadcasts import broadcasts_for, unread_count
+
+    broadcasts = broadcasts_for(request.user).only(
+        'id', 'title', 'message', 'related_url', 'created_at'
+    )[:BROADCAST_MENU_SIZE]
+    return JsonResponse({
+        'success': True,
+        'unread_count': unread_count(request.user),
+        'broadcasts': [{
+            'id': broadcast.id,
+            'title': broadcast.title,
+            'message': Truncator(broadcast.message).chars(120),
+            'related_url': broadcast.related_url,
+            'created_at': timesince(broadcast.created_at),
+            'is_read': broadcast.is_read,
+        } for broadcast in broadcasts],
+    })
+
+
+@login_required
+@require_http_methods(["POST"])
+def read_broadcast(request, broadcast_id):
+    """Mark one broadcast addressed to the user as read"""
+    from ..broadcasts import broadcasts_for, mark_read
+
+    broadcast = get_object_or_404(broadcasts_for(request.user), id=broadcast_id)
+    mark_read(request.user, broadcast)
+    return JsonResponse({'success': True, 'related_url': broadcast.related_url})
+
+
+@login_required
+@require_http_methods(["POST"])
+def read_all_broadcasts(request):
+    """Mark everything the user has been sent as read"""
+    from ..broadcasts import mark_all_read
+
+    mark_all_read(request.user)
+    return JsonResponse({'success': True})
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+def news_management(request):
+    """Main news management view"""
+    
+    # Get all news articles with author information
+    news_articles = NewsArticle.objects.select_related('author').all()
+    
+    # Statistics
+    stats = {
+        'total_articles': NewsArticle.objects.count(),
+        'published_articles': NewsArticle.objects.filter(is_published=True).count(),
+        'draft_articles': NewsArticle.objects.filter(is_published=False).count(),
+        'today_articles': NewsArticle.objects.filter(
+            created_at__date=timezone.now().date()
+        ).count(),
+        'academic_articles': NewsArticle.objects.filter(category='academic').count(),
+        'event_articles': NewsArticle.objects.filter(category='event').count(),
+    }
+    
+    # Filtering
+    search_query = request.GET.get('search', '')
+    category_filter = request.GET.get('category', '')
+    status_filter = request.GET.get('status', '')
+    date_filter = request.GET.get('date', '')
+    
+    if search_query:
+        news_articles = news_articles.filter(
+            Q(title__icontains=search_query) |
+            Q(summary__icontains=search_query) |
+            Q(content__icontains=search_query) |
+            Q(author__first_name__icontains=search_query) |
+            Q(author__last_name__icontains=search_query)
+        )
+    
+    if category_filter:
+        news_articles = news_articles.filter(category=category_filter)
+    
+    if status_filter:
+        if status_filter == 'published':
+            news_articles = news_articles.filter(is_published=True)
+        elif status_filter == 'draft':
+            news_articles = news_articles.filter(is_published=False)
+    
+    if date_filter:
+        today = timezone.now().date()
+        
+        if date_filter == 'today':
+            news_articles = news_articles.filter(created_at__date=today)
+        elif date_filter == 'week':
+            week_ago = today - timedelta(days=7)
+            news_articles = news_articles.filter(created_at__date__gte=week_ago)
+        elif date_filter == 'month':
+            month_ago = today - timedelta(days=30)
+            news_articles = news_articles.filter(created_at__date__gte=month_ago)
+    
+    # Ordering
+    news_articles = news_articles.order_by('-created_at')
+    
+    # Pagination
+    paginator = Paginator(news_articles, 15)
+    page = request.GET.get('page')
+    articles_page = paginator.get_page(page)
+    
+    context = {
+        'articles': articles_page,
+        'stats': stats,
+        'search_query': search_query,
+        'category_filter': category_filter,
+        'status_filter': status_filter,
+        'date_filter': date_filter,
+        'category_choices': NewsArticle.CATEGORY_CHOICES,
+    }
+    
+    return render(request, 'admin/news_management.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+def news_detail(request, article_id):
+    """Get news article details for viewing"""
+    try:
+        article = get_object_or_404(
+            NewsArticle.objects.select_related('author'),
+            id=article_id
+        )
+        
+        data = {
+            'success': True,
+            'article': {
+                'id': article.id,
+                'title': article.title,
+                'summary': article.summary,
+                'content': article.content,
+                'category': article.get_category_display(),
+                'category_key': article.category,
+                'image_url': article.image.url if article.image else None,
+                'author_name': article.author.get_full_name() if article.author else 'Unknown',
+                'author_email': article.author.email if article.author else '',
+                'publish_date': article.publish_date.strftime('%B %d, %Y at %H:%M'),
+                'is_published': article.is_published,
+                'created_at': article.created_at.strftime('%B %d, %Y at %H:%M'),
+                'updated_at': article.updated_at.strftime('%B %d, %Y at %H:%M'),
+            }
+        }
+            
+    except Exception as e:
+        data = {
+            'success': False,
+            'message': f'Error loading article: {str(e)}'
+        }
+    
+    return JsonResponse(data)
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def create_news(request):
+    """Create a new news article"""
+    try:
+        # Handle image upload
+        image = request.FILES.get('image')
+        
+        article = NewsArticle.objects.create(
+            title=request.POST.get('title'),
+            summary=request.POST.get('summary'),
+            content=request.POST.get('content'),
+            category=request.POST.get('category'),
+            image=image,
+            author=request.user,
+            is_published=request.POST.get('is_published') == 'on',
+            publish_date=request.POST.get('publish_date') or timezone.now(),
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'News article created successfully!',
+            'article_id': article.id
+        })
+            
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error creating article: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def update_news(request, article_id):
+    """Update an existing news article"""
+    try:
+        article = get_object_or_404(NewsArticle, id=article_id)
+        
+        # Update fields
+        article.title = request.POST.get('title')
+        article.summary = request.POST.get('summary')
+        article.content = request.POST.get('content')
+        article.category = request.POST.get('category')
+        article.is_published = request.POST.get('is_published') == 'on'
+        
+        # Handle publish date
+        publish_date = request.POST.get('publish_date')
+        if publish_date:
+            article.publish_date = publish_date
+        
+        # Handle image upload
+        if request.FILES.get('image'):
+            # Delete old image if exists
+            if article.image:
+                default_storage.delete(article.image.name)
+            article.image = request.FILES.get('image')
+        
+        article.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'News article updated successfully!'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error updating article: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def delete_news(request, article_id):
+    """Delete a news article"""
+    try:
+        article = get_object_or_404(NewsArticle, id=article_id)
+        
+        # Delete associated image
+        if article.image:
+            default_storage.delete(article.image.name)
+        
+        article.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'News article deleted successfully!'
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error deleting article: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def toggle_publish_status(request, article_id):
+    """Toggle publish status of a news article"""
+    try:
+        article = get_object_or_404(NewsArticle, id=article_id)
+        article.is_published = not article.is_published
+        
+        # If publishing for first time, set publish date to now
+        if article.is_published and not article.publish_date:
+            article.publish_date = timezone.now()
+        
+        article.save()
+        
+        status = 'published' if article.is_published else 'unpublished'
+        return JsonResponse({
+            'success': True,
+            'message': f'Article {status} successfully!',
+            'is_published': article.is_published
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error updating publish status: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+@require_http_methods(["POST"])
+def bulk_news_action(request):
+    """Handle bulk actions on news articles"""
+    try:
+        action = request.POST.get('action')
+        article_ids = request.POST.getlist('article_ids')
+        
+        if not article_ids:
+            return JsonResponse({
+                'success': False,
+                'message': 'No articles selected.'
+            })
+        
+        articles = NewsArticle.objects.filter(id__in=article_ids)
+        
+        if action == 'publish':
+            articles.update(is_published=True, publish_date=timezone.now())
+            message = f'{len(article_ids)} articles published.'
+        elif action == 'unpublish':
+            articles.update(is_published=False)
+            message = f'{len(article_ids)} articles unpublished.'
+        elif action == 'delete':
+            # Delete associated images
+            for article in articles:
+                if article.image:
+                    default_storage.delete(article.image.name)
+            articles.delete()
+            message = f'{len(article_ids)} articles deleted.'
+        else:
+            return JsonResponse({
+                'success': False,
+                'message': 'Invalid action.'
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'message': message
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error performing bulk action: {str(e)}'
+        })
+
+
+@login_required
+@user_passes_test(is_admin_or_staff)
+def get_authors(request):
+    """Get authors for news article creation/editing"""
+    try:
+        search = request.GET.get('search', '')
+        authors = User.objects.filter(is_staff=True)
+        
+        if search:
+            authors = authors.filter(
+                Q(first_name__icontains=search) |
+                Q(last_name__icontains=search) |
+                Q(email__icontains=search)
+            )
+        
+        author_data = []
+        for author in authors[:20]:  # Limit to 20 results
+            author_data.append({
+                'id': author.id,
+                'name': author.get_full_name() or author.username,
+                'email': author.email
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'authors': author_data
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Error loading authors: {str(e)}'
+        })
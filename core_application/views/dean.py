@@ -0,0 +1,1977 @@
+# dean.py - Dean of faculty: programmes, departments, HODs, lecturers and reports
+
+from datetime import timedelta
+import json
+
+from django.contrib import messages
+from django.contrib.auth import update_session_auth_hash
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.forms import PasswordChangeForm
+from django.core.files.storage import default_storage
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q, Sum
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods, require_POST
+
+from .. import reference_data, role_context
+from ..models import (
+    AcademicYear, Course, Department, Enrollment, Faculty, FeePayment, FeeStructure, Grade,
+    Lecturer, LecturerCourseAssignment, Programme, ProgrammeCourse, Research, Semester, Staff,
+    Student,
+)
+from ..reference_data import parse_id, pick, reference_endpoint
+
+
+@login_required
+def dean_dashboard(request):
+    """
+    Dean Dashboard View - Shows faculty-level analytics and management data
+    """
+    user = request.user
+    
+    # Verify user is a dean
+    if user.user_type != 'dean':
+        return render(request, 'error.html', {'message': 'Access denied. Dean privileges required.'})
+    
+    # Get the faculty headed by this dean
+    try:
+        faculty = request.role.get_faculty()
+    except Faculty.DoesNotExist:
+        return render(request, 'error.html', {'message': 'No faculty assigned to this dean.'})
+    
+    # Get current academic year and semester
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    current_date = timezone.now().date()
+    
+    # Faculty Overview Statistics
+    departments = Department.objects.filter(faculty=faculty, is_active=True)
+    programmes = Programme.objects.filter(faculty=faculty, is_active=True)
+    courses = Course.objects.filter(department__faculty=faculty, is_active=True)
+    
+    # Student Statistics
+    students = Student.objects.filter(programme__faculty=faculty, status='active')
+    total_students = students.count()
+    
+    # Staff Statistics
+    lecturers = Lecturer.objects.filter(department__faculty=faculty, is_active=True)
+    total_lecturers = lecturers.count()
+    
+    staff = Staff.objects.filter(department__faculty=faculty, is_active=True)
+    total_staff = staff.count()
+    
+    # Students by programme
+    students_by_programme = students.values('programme__name').annotate(
+        count=Count('id')
+    ).order_by('-count')[:10]
+    
+    # Students by year
+    students_by_year = students.values('current_year').annotate(
+        count=Count('id')
+    ).order_by('current_year')
+    
+    # Gender distribution
+    gender_distribution = students.values('user__gender').annotate(
+        count=Count('id')
+    )
+    
+    # Recent enrollments (last 30 days)
+    recent_enrollments = Enrollment.objects.filter(
+        course__department__faculty=faculty,
+        enrollment_date__gte=current_date - timedelta(days=30)
+    ).count()
+    
+    # Academic Performance
+    if current_semester:
+        # Average GPA by programme
+        programme_performance = []
+        for programme in programmes:
+            avg_gpa = Grade.objects.filter(
+                enrollment__student__programme=programme,
+                enrollment__semester=current_semester
+            ).aggregate(avg_gpa=Avg('grade_points'))['avg_gpa']
+            
+            if avg_gpa:
+                programme_performance.append({
+                    'programme': programme.name,
+                    'avg_gpa': round(avg_gpa, 2)
+                })
+        
+        # Pass rate by programme
+        programme_pass_rates = []
+        for programme in programmes:
+            total_grades = Grade.objects.filter(
+                enrollment__student__programme=programme,
+                enrollment__semester=current_semester
+            ).count()
+            
+            passed_grades = Grade.objects.filter(
+                enrollment__student__programme=programme,
+                enrollment__semester=current_semester,
+                is_passed=True
+            ).count()
+            
+            if total_grades > 0:
+                pass_rate = (passed_grades / total_grades) * 100
+                programme_pass_rates.append({
+                    'programme': programme.name,
+                    'pass_rate': round(pass_rate, 1),
+                    'total_grades': total_grades
+                })
+    
+    # Research Activities
+    research_projects = Research.objects.filter(
+        department__faculty=faculty
+    ).count()
+    
+    active_research = Research.objects.filter(
+        department__faculty=faculty,
+        status='ongoing'
+    ).count()
+    
+    # Fee Collection (Faculty level)
+    if current_academic_year:
+        faculty_fee_payments = FeePayment.objects.filter(
+            student__programme__faculty=faculty,
+            fee_structure__academic_year=current_academic_year
+        )
+        
+        total_collected = faculty_fee_payments.aggregate(
+            total=Sum('amount_paid')
+        )['total'] or 0
+        
+        payments_today = faculty_fee_payments.filter(
+            payment_date=current_date
+        ).aggregate(total=Sum('amount_paid'))['total'] or 0
+    else:
+        total_collected = 0
+        payments_today = 0
+    
+    # Recent Activities
+    recent_activities = []
+    
+    # Recent course assignments
+    recent_assignments = LecturerCourseAssignment.objects.filter(
+        course__department__faculty=faculty,
+        assigned_date__gte=current_date - timedelta(days=7)
+    ).select_related('lecturer__user', 'course').order_by('-assigned_date')[:5]
+    
+    for assignment in recent_assignments:
+        recent_activities.append({
+            'message': f'{assignment.lecturer.user.get_full_name()} assigned to {assignment.course.code}',
+            'date': assignment.assigned_date,
+            'icon': 'fa-chalkboard-teacher',
+            'color': 'info'
+        })
+    
+    # Recent student enrollments
+    recent_student_enrollments = Enrollment.objects.filter(
+        course__department__faculty=faculty,
+        enrollment_date__gte=current_date - timedelta(days=7)
+    ).select_related('student__user', 'course').order_by('-enrollment_date')[:5]
+    
+    for enrollment in recent_student_enrollments:
+        recent_activities.append({
+            'message': f'{enrollment.student.user.get_full_name()} enrolled in {enrollment.course.code}',
+            'date': enrollment.enrollment_date,
+            'icon': 'fa-user-graduate',
+            'color': 'success'
+        })
+    
+    # Sort activities by date
+    recent_activities.sort(key=lambda x: x['date'], reverse=True)
+    recent_activities = recent_activities[:10]
+    
+    # Top performing students in faculty
+    if current_semester:
+        top_students = Student.objects.filter(
+            programme__faculty=faculty,
+            status='active'
+        ).annotate(
+            avg_gpa=Avg('enrollments__grade__grade_points')
+        ).filter(avg_gpa__isnull=False).order_by('-avg_gpa')[:10]
+    else:
+        top_students = []
+    
+    # Chart Data Preparation
+    
+    # Programme enrollment chart
+    programme_chart_labels = [item['programme__name'] for item in students_by_programme]
+    programme_chart_data = [item['count'] for item in students_by_programme]
+    programme_chart_data_json = {
+        'labels': programme_chart_labels,
+        'data': programme_chart_data
+    }
+    
+    # Year distribution chart
+    year_chart_labels = [f'Year {item["current_year"]}' for item in students_by_year]
+    year_chart_data = [item['count'] for item in students_by_year]
+    year_chart_data_json = {
+        'labels': year_chart_labels,
+        'data': year_chart_data
+    }
+    
+    # Gender distribution chart
+    gender_chart_labels = []
+    gender_chart_data = []
+    gender_colors = ['#FF6384', '#36A2EB', '#FFCE56']
+    
+    for item in gender_distribution:
+        if item['user__gender']:
+            gender_chart_labels.append(item['user__gender'].title())
+            gender_chart_data.append(item['count'])
+    
+    gender_chart_data_json = {
+        'labels': gender_chart_labels,
+        'data': gender_chart_data,
+        'colors': gender_colors[:len(gender_chart_labels)]
+    }
+    
+    # Programme performance chart
+    performance_chart_labels = [item['programme'] for item in programme_performance]
+    performance_chart_data = [item['avg_gpa'] for item in programme_performance]
+    performance_chart_data_json = {
+        'labels': performance_chart_labels,
+        'data': performance_chart_data
+    }
+    
+    # Department distribution
+    dept_distribution = departments.annotate(
+        student_count=Count('programmes__students')
+    ).values('name', 'student_count')
+    
+    dept_chart_labels = [item['name'] for item in dept_distribution]
+    dept_chart_data = [item['student_count'] for item in dept_distribution]
+    dept_chart_data_json = {
+        'labels': dept_chart_labels,
+        'data': dept_chart_data
+    }
+    
+    # Monthly enrollment trend (last 6 months)
+    six_months_ago = current_date - timedelta(days=180)
+    monthly_enrollments = []
+    for i in range(6):
+        month_start = six_months_ago + timedelta(days=i*30)
+        month_end = month_start + timedelta(days=30)
+        
+        enrollments_count = Enrollment.objects.filter(
+            course__department__faculty=faculty,
+            enrollment_date__range=[month_start, month_end]
+        ).count()
+        
+        monthly_enrollments.append({
+            'month': month_start.strftime('%b %Y'),
+            'count': enrollments_count
+        })
+    
+    enrollment_trend_labels = [item['month'] for item in monthly_enrollments]
+    enrollment_trend_data = [item['count'] for item in monthly_enrollments]
+    enrollment_trend_data_json = {
+        'labels': enrollment_trend_labels,
+        'data': enrollment_trend_data
+    }
+    
+    # Recent payments for display
+    recent_payments = FeePayment.objects.filter(
+        student__programme__faculty=faculty,
+        payment_date__gte=current_date - timedelta(days=30)
+    ).select_related('student__user').order_by('-payment_date')[:10]
+    
+    context = {
+        'faculty': faculty,
+        'current_academic_year': current_academic_year,
+        'current_semester': current_semester,
+        'current_date': current_date,
+        
+        # Overview Statistics
+        'total_departments': departments.count(),
+        'total_programmes': programmes.count(),
+        'total_courses': courses.count(),
+        'total_students': total_students,
+        'total_lecturers': total_lecturers,
+        'total_staff': total_staff,
+        'recent_enrollments': recent_enrollments,
+        'active_research': active_research,
+        'total_research': research_projects,
+        
+        # Financial
+        'total_collected': total_collected,
+        'payments_today': payments_today,
+        'recent_payments': recent_payments,
+        
+        # Lists
+        'departments': departments,
+        'programmes': programmes,
+        'students_by_programme': students_by_programme,
+        'programme_performance': programme_performance,
+        'programme_pass_rates': programme_pass_rates,
+        'top_students': top_students,
+        'recent_activities': recent_activities,
+        
+        # Chart Data (JSON)
+        'programme_chart_data': json.dumps(programme_chart_data_json),
+        'year_chart_data': json.dumps(year_chart_data_json),
+        'gender_chart_data': json.dumps(gender_chart_data_json),
+        'performance_chart_data': json.dumps(performance_chart_data_json, cls=DjangoJSONEncoder),
+        'dept_chart_data': json.dumps(dept_chart_data_json),
+        'enrollment_trend_data': json.dumps(enrollment_trend_data_json),
+    }
+    
+    return render(request, 'dean/dean_dashboard.html', context)
+
+
+@login_required
+def dean_programme_detail(request, programme_id):
+    """View to display programme details with courses organized by year and semester"""
+    programme = get_object_or_404(
+        Programme.objects.select_related('department', 'faculty'),
+        id=programme_id,
+        is_active=True
+    )
+    
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get all programme courses organized by year and semester
+    programme_courses = ProgrammeCourse.objects.select_related(
+        'course', 'course__department'
+    ).filter(
+        programme=programme,
+        is_active=True
+    ).order_by('year', 'semester', 'course__name')
+    
+    # Organize courses by year and semester
+    courses_by_year = {}
+    years = []
+    
+    for pc in programme_courses:
+        year = pc.year
+        semester = pc.semester
+        
+        if year not in years:
+            years.append(year)
+        
+        if year not in courses_by_year:
+            courses_by_year[year] = {}
+        
+        if semester not in courses_by_year[year]:
+            courses_by_year[year][semester] = []
+        
+        # Get enrollment count for current semester
+        enrollment_count = 0
+        if current_semester:
+            enrollment_count = Enrollment.objects.filter(
+                course=pc.course,
+                semester=current_semester,
+                student__programme=programme,
+                is_active=True
+            ).count()
+        
+        course_data = {
+            'course': pc.course,
+            'programme_course': pc,
+            'enrollment_count': enrollment_count,
+        }
+        
+        courses_by_year[year][semester].append(course_data)
+    
+    # Calculate programme statistics
+    programme_stats = {
+        'total_courses': programme_courses.count(),
+        'total_credits': sum(pc.course.credit_hours for pc in programme_courses),
+        'total_lecture_hours': sum(pc.course.lecture_hours for pc in programme_courses),
+        'total_practical_hours': sum(pc.course.practical_hours for pc in programme_courses),
+        'core_courses': programme_courses.filter(is_mandatory=True).count(),
+        'elective_courses': programme_courses.filter(is_mandatory=False).count(),
+        'active_students': programme.students.filter(status='active').count(),
+    }
+    
+    context = {
+        'programme': programme,
+        'courses_by_year': courses_by_year,
+        'years': sorted(years),
+        'programme_stats': programme_stats,
+        'current_semester': current_semester,
+    }
+    
+    return render(request, 'dean/programme_detail.html', context)
+
+
+@login_required
+def dean_student_list(request):
+    # Ensure user is a dean
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied. Only deans can access this page.")
+        return redirect('dashboard')
+    
+    # Get the faculty this dean is responsible for
+    try:
+        faculty = request.role.get_faculty()
+    except Faculty.DoesNotExist:
+        messages.error(request, "You are not assigned to any faculty as dean.")
+        return redirect('dashboard')
+    
+    # Get all students from programmes within departments of this faculty
+    students_queryset = Student.objects.filter(
+        programme__department__faculty=faculty
+    ).select_related(
+        'user', 'programme', 'programme__department', 'programme__faculty'
+    ).order_by('student_id')
+    
+    # Apply filters
+    search_query = request.GET.get('search', '')
+    if search_query:
+        from ..people_search import filter_people
+        students_queryset = filter_people(students_queryset, search_query, 'student')
+    
+    # Status filter
+    status_filter = request.GET.get('status', '')
+    if status_filter:
+        students_queryset = students_queryset.filter(status=status_filter)
+    
+    # Department filter (within the dean's faculty)
+    department_filter = request.GET.get('department', '')
+    if department_filter:
+        students_queryset = students_queryset.filter(programme__department_id=department_filter)
+    
+    # Programme filter
+    programme_filter = request.GET.get('programme', '')
+    if programme_filter:
+        students_queryset = students_queryset.filter(programme_id=programme_filter)
+    
+    # Year filter
+    year_filter = request.GET.get('year', '')
+    if year_filter:
+        students_queryset = students_queryset.filter(current_year=year_filter)
+    
+    # Semester filter
+    semester_filter = request.GET.get('semester', '')
+    if semester_filter:
+        students_queryset = students_queryset.filter(current_semester=semester_filter)
+    
+    # Admission type filter
+    admission_type_filter = request.GET.get('admission_type', '')
+    if admission_type_filter:
+        students_queryset = students_queryset.filter(admission_type=admission_type_filter)
+    
+    # Sponsor type filter
+    sponsor_type_filter = request.GET.get('sponsor_type', '')
+    if sponsor_type_filter:
+        students_queryset = students_queryset.filter(sponsor_type=sponsor_type_filter)
+    
+    # Get filter choices for the dean's faculty
+    departments = Department.objects.filter(faculty=faculty, is_active=True).order_by('name')
+    programmes = Programme.objects.filter(
+        department__faculty=faculty, 
+        is_active=True
+    ).order_by('name')
+    
+    # Pagination
+    paginator = Paginator(students_queryset, 25)  # Show 25 students per page
+    page_number = request.GET.get('page')
+    students = paginator.get_page(page_number)
+    
+    # Calculate statistics for the dean's faculty
+    total_students = students_queryset.count()
+    active_students = students_queryset.filter(status='active').count()
+    graduated_students = students_queryset.filter(status='graduated').count()
+    
+    # Get department-wise statistics
+    department_stats = departments.annotate(
+        student_count=Count('programmes__students', distinct=True)
+    ).order_by('name')
+    
+    context = {
+        'students': students,
+        'faculty': faculty,
+        'total_students': total_students,
+        'active_students': active_students,
+        'graduated_students': graduated_students,
+        'department_stats': department_stats,
+        
+        # Filter data
+        'departments': departments,
+        'programmes': programmes,
+        'status_choices': Student.STATUS_CHOICES,
+        'year_choices': [(i, f'Year {i}') for i in range(1, 9)],
+        'semester_choices': [(i, f'Semester {i}') for i in range(1, 4)],
+        'admission_type_choices': Student.ADMISSION_TYPES,
+        'sponsor_type_choices': Student.SPONSOR_TYPES,
+        
+        # Current filter values
+        'search_query': search_query,
+        'status_filter': status_filter,
+        'department_filter': department_filter,
+        'programme_filter': programme_filter,
+        'year_filter': year_filter,
+        'semester_filter': semester_filter,
+        'admission_type_filter': admission_type_filter,
+        'sponsor_type_filter': sponsor_type_filter,
+    }
+    
+    return render(request, 'dean/student_list.html', context)
+
+
+@login_required
+@require_http_methods(["GET"])
+@reference_endpoint
+def get_programmes_by_department(request):
+    """AJAX endpoint to get programmes filtered by department for dean's faculty"""
+    if request.user.user_type != 'dean':
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    try:
+        faculty = request.role.get_faculty()
+    except Faculty.DoesNotExist:
+        return JsonResponse({'error': 'Faculty not found'}, status=404)
+    
+    department_ids = {department['id'] for department in reference_data.select('departments', faculty_id=faculty.pk)}
+    department_id = request.GET.get('department_id')
+    if department_id:
+        department_ids &= {parse_id(department_id)}
+    programmes = [
+        programme for programme in reference_data.select('programmes', is_active=True)
+        if programme['department_id'] in department_ids
+    ]
+    
+    return JsonResponse({'programmes': pick(programmes, 'id', 'name', 'code')})
+
+
+@login_required
+def dean_student_detail(request, student_id):
+    """Detailed view of a student for dean - only if student belongs to dean's faculty"""
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    try:
+        faculty = request.role.get_faculty()
+    except Faculty.DoesNotExist:
+        messages.error(request, "You are not assigned to any faculty as dean.")
+        return redirect('dashboard')
+    
+    student = get_object_or_404(
+        Student.objects.select_related('user', 'programme', 'programme__department'),
+        student_id=student_id,
+        programme__department__faculty=faculty
+    )
+    
+    # Get student's academic records, enrollments etc.
+    enrollments = student.enrollments.select_related(
+        'course', 'semester', 'semester__academic_year', 'lecturer'
+    ).order_by('-semester__academic_year__year', '-semester__semester_number')
+    
+    # Get grades
+    grades = []
+    for enrollment in enrollments:
+        try:
+            grade = enrollment.grade
+            grades.append({
+                'enrollment': enrollment,
+                'grade': grade
+            })
+        except:
+            grades.append({
+                'enrollment': enrollment,
+                'grade': None
+            })
+    
+    context = {
+        'student': student,
+        'faculty': faculty,
+        'enrollments': enrollments,
+        'grades': grades,
+    }
+    
+    return render(request, 'dean/student_detail.html', context)
+
+
+@login_required
+def dean_student_performance(request, student_id):
+    """View specific student performance with all academic records"""
+    
+    # Get the student
+    student = get_object_or_404(Student, student_id=student_id)
+    
+    # Get all enrollments for this student
+    enrollments = Enrollment.objects.filter(
+        student=student
+    ).select_related(
+        'course', 'semester', 'semester__academic_year'
+    ).prefetch_related('grade').order_by(
+        'semester__academic_year__start_date', 'semester__semester_number'
+    )
+    
+    # Organize data by academic year and semester
+    academic_data = []
+    
+    current_year = None
+    current_semester = None
+    year_data = None
+    semester_data = None
+    
+    overall_stats = {
+        'total_subjects': 0,
+        'passed_subjects': 0,
+        'failed_subjects': 0,
+        'total_credits': 0,
+        'earned_credits': 0,
+        'overall_gpa': 0,
+        'total_grade_points': 0
+    }
+    
+    for enrollment in enrollments:
+        academic_year = enrollment.semester.academic_year
+        semester = enrollment.semester
+        
+        # Create new year data if needed
+        if current_year != academic_year:
+            if year_data:
+                academic_data.append(year_data)
+            year_data = {
+                'academic_year': academic_year,
+                'semesters': []
+            }
+            current_year = academic_year
+            current_semester = None
+        
+        # Create new semester data if needed
+        if current_semester != semester:
+            if semester_data:
+                # Calculate semester statistics
+                total_subjects = len(semester_data['subjects'])
+                passed_subjects = sum(1 for s in semester_data['subjects'] if s['is_passed'])
+                failed_subjects = total_subjects - passed_subjects
+                
+                total_credits = sum(s['subject'].credit_hours for s in semester_data['subjects'])
+                earned_credits = sum(s['subject'].credit_hours for s in semester_data['subjects'] if s['is_passed'])
+                
+                # Calculate GPA for semester
+                total_grade_points = sum(
+                    (s['grade_points'] or 0) * s['subject'].credit_hours 
+                    for s in semester_data['subjects'] if s['grade_points'] is not None
+                )
+                semester_gpa = total_grade_points / total_credits if total_credits > 0 else 0
+                
+                semester_data['stats'] = {
+                    'total_subjects': total_subjects,
+                    'passed_subjects': passed_subjects,
+                    'failed_subjects': failed_subjects,
+                    'total_credits': total_credits,
+                    'earned_credits': earned_credits,
+                    'semester_gpa': round(semester_gpa, 2),
+                    'total_grade_points': total_grade_points
+                }
+                
+                year_data['semesters'].append(semester_data)
+            
+            semester_data = {
+                'semester': semester,
+                'subjects': [],
+                'stats': {}
+            }
+            current_semester = semester
+        
+        # Get grade information
+        grade_info = {
+            'enrollment': enrollment,
+            'subject': enrollment.course,
+            'theory_marks': None,
+            'practical_marks': None,
+            'clinical_marks': None,
+            'continuous_assessment': None,
+            'final_exam_marks': None,
+            'total_marks': None,
+            'grade': None,
+            'grade_points': None,
+            'is_passed': False,
+            'exam_date': None,
+            'remarks': None
+        }
+        
+        # Check if grade exists
+        if hasattr(enrollment, 'grade'):
+            grade = enrollment.grade
+            grade_info.update({
+                'theory_marks': grade.final_exam,
+                'practical_marks': grade.practical_marks,
+                'clinical_marks': grade.project_marks,
+                'continuous_assessment': grade.continuous_assessment,
+                'final_exam_marks': grade.final_exam,
+                'total_marks': grade.total_marks,
+                'grade': grade.grade,
+                'grade_points': grade.grade_points,
+                'is_passed': grade.is_passed,
+                'exam_date': grade.exam_date,
+                'remarks': grade.remarks
+            })
+        
+        semester_data['subjects'].append(grade_info)
+        
+        # Add to overall statistics
+        overall_stats['total_subjects'] += 1
+        if grade_info['is_passed']:
+            overall_stats['passed_subjects'] += 1
+        else:
+            overall_stats['failed_subjects'] += 1
+        
+        overall_stats['total_credits'] += enrollment.course.credit_hours
+        if grade_info['is_passed']:
+            overall_stats['earned_credits'] += enrollment.course.credit_hours
+        
+        if grade_info['grade_points'] is not None:
+            overall_stats['total_grade_points'] += grade_info['grade_points'] * enrollment.course.credit_hours
+    
+    # Don't forget the last semester and year
+    if semester_data:
+        # Calculate final semester statistics
+        total_subjects = len(semester_data['subjects'])
+        passed_subjects = sum(1 for s in semester_data['subjects'] if s['is_passed'])
+        failed_subjects = total_subjects - passed_subjects
+        
+        total_credits = sum(s['subject'].credit_hours for s in semester_data['subjects'])
+        earned_credits = sum(s['subject'].credit_hours for s in semester_data['subjects'] if s['is_passed'])
+        
+        total_grade_points = sum(
+            (s['grade_points'] or 0) * s['subject'].credit_hours 
+            for s in semester_data['subjects'] if s['grade_points'] is not None
+        )
+        semester_gpa = total_grade_points / total_credits if total_credits > 0 else 0
+        
+        semester_data['stats'] = {
+            'total_subjects': total_subjects,
+            'passed_subjects': passed_subjects,
+            'failed_subjects': failed_subjects,
+            'total_credits': total_credits,
+            'earned_credits': earned_credits,
+            'semester_gpa': round(semester_gpa, 2),
+            'total_grade_points': total_grade_points
+        }
+        
+        year_data['semesters'].append(semester_data)
+    
+    if year_data:
+        academic_data.append(year_data)
+    
+    # Calculate overall GPA
+    if overall_stats['total_credits'] > 0:
+        overall_stats['overall_gpa'] = round(
+            overall_stats['total_grade_points'] / overall_stats['total_credits'], 2
+        )
+    
+    # Calculate completion percentage
+    overall_stats['completion_percentage'] = round(
+        (overall_stats['earned_credits'] / overall_stats['total_credits']) * 100, 2
+    ) if overall_stats['total_credits'] > 0 else 0
+    
+    context = {
+        'student': student,
+        'academic_data': academic_data,
+        'overall_stats': overall_stats,
+        'programme': student.programme,
+        'school': student.programme.department,
+    }
+    
+    return render(request, 'dean/student_performance.html', context)
+
+
+@login_required
+def dean_programmes(request):
+    """
+    View for deans to see programmes in their faculty only
+    """
+    # Check if user is a dean
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied. This page is for deans only.")
+        return redirect('dashboard')
+    
+    # Get the faculty where user is dean
+    try:
+        faculty = request.role.get_faculty(active_only=True)
+    except Faculty.DoesNotExist:
+        messages.error(request, "You are not assigned as dean to any faculty.")
+        return redirect('dashboard')
+    
+    # Get search and filter parameters
+    search_query = request.GET.get('search', '').strip()
+    selected_department = request.GET.get('department', '')
+    selected_programme_type = request.GET.get('programme_type', '')
+    selected_study_mode = request.GET.get('study_mode', '')
+    
+    # Start with programmes in dean's faculty
+    programmes = Programme.objects.filter(
+        faculty=faculty,
+        is_active=True
+    ).select_related('faculty', 'department').prefetch_related('students', 'programme_courses')
+    
+    # Apply search filter
+    if search_query:
+        programmes = programmes.filter(
+            Q(name__icontains=search_query) |
+            Q(code__icontains=search_query) |
+            Q(department__name__icontains=search_query) |
+            Q(description__icontains=search_query)
+        )
+    
+    # Apply department filter
+    if selected_department:
+        programmes = programmes.filter(department_id=selected_department)
+    
+    # Apply programme type filter
+    if selected_programme_type:
+        programmes = programmes.filter(programme_type=selected_programme_type)
+    
+    # Apply study mode filter
+    if selected_study_mode:
+        programmes = programmes.filter(study_mode=selected_study_mode)
+    
+    # Annotate with statistics
+    programmes = programmes.annotate(
+        total_courses=Count('programme_courses', distinct=True),
+        active_students=Count('students', filter=Q(students__status='active'), distinct=True)
+    )
+    
+    # Get current semester for enrollment count
+    try:
+        current_semester = Semester.objects.get(is_current=True)
+        programmes_with_stats = []
+        for programme in programmes:
+            current_enrollments = Enrollment.objects.filter(
+                student__programme=programme,
+                semester=current_semester,
+                is_active=True
+            ).count()
+            
+            programmes_with_stats.append({
+                'programme': programme,
+                'total_courses': programme.total_courses,
+                'active_students': programme.active_students,
+                'current_enrollments': current_enrollments
+            })
+    except Semester.DoesNotExist:
+        programmes_with_stats = []
+        for programme in programmes:
+            programmes_with_stats.append({
+                'programme': programme,
+                'total_courses': programme.total_courses,
+                'active_students': programme.active_students,
+                'current_enrollments': 0
+            })
+    
+    # Pagination
+    paginator = Paginator(programmes_with_stats, 12)  # Show 12 programmes per page
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Get filter options for the faculty
+    departments = Department.objects.filter(faculty=faculty, is_active=True)
+    programme_types = Programme.PROGRAMME_TYPES
+    study_modes = Programme.PROGRAMME_MODES
+    
+    context = {
+        'page_obj': page_obj,
+        'faculty': faculty,
+        'departments': departments,
+        'programme_types': programme_types,
+        'study_modes': study_modes,
+        'search_query': search_query,
+        'selected_department': selected_department,
+        'selected_programme_type': selected_programme_type,
+        'selected_study_mode': selected_study_mode,
+    }
+    
+    return render(request, 'dean/programmes.html', context)
+
+
+@login_required
+def dean_allocate_courses(request):
+    """
+    View for deans to allocate courses to lecturers in their faculty
+    """
+    # Check if user is a dean
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied. This page is for deans only.")
+        return redirect('dashboard')
+    
+    # Get the faculty where user is dean
+    try:
+        faculty = request.role.get_faculty(active_only=True)
+    except Faculty.DoesNotExist:
+        messages.error(request, "You are not assigned as dean to any faculty.")
+        return redirect('dashboard')
+    
+    # Handle POST request (allocation submission)
+    if request.method == 'POST':
+        lecturer_id = request.POST.get('lecturer_id')
+        course_id = request.POST.get('course_id')
+        academic_year_id = request.POST.get('academic_year_id')
+        semester_id = request.POST.get('semester_id')
+        lecture_venue = request.POST.get('lecture_venue', '').strip()
+        lecture_time = request.POST.get('lecture_time', '').strip()
+        remarks = request.POST.get('remarks', '').strip()
+        
+        try:
+            lecturer = Lecturer.objects.get(id=lecturer_id, department__faculty=faculty)
+            course = Course.objects.get(id=course_id, department__faculty=faculty)
+            academic_year = AcademicYear.objects.get(id=academic_year_id)
+            semester = Semester.objects.get(id=semester_id, academic_year=academic_year)
+            
+            # Check if assignment already exists
+            existing_assignment = LecturerCourseAssignment.objects.filter(
+                lecturer=lecturer,
+                course=course,
+                academic_year=academic_year,
+                semester=semester
+            ).first()
+            
+            if existing_assignment:
+                if existing_assignment.is_active:
+                    messages.warning(request, f"{course.name} is already assigned to {lecturer.user.get_full_name()} for {academic_year.year} Semester {semester.semester_number}.")
+                else:
+                    # Reactivate the assignment
+                    existing_assignment.is_active = True
+                    existing_assignment.lecture_venue = lecture_venue
+                    existing_assignment.lecture_time = lecture_time
+                    existing_assignment.remarks = remarks
+                    existing_assignment.assigned_by = request.user
+                    existing_assignment.save()
+                    messages.success(request, f"Successfully reactivated assignment: {course.name} to {lecturer.user.get_full_name()}")
+            else:
+                # Create new assignment
+                LecturerCourseAssignment.objects.create(
+                    lecturer=lecturer,
+                    course=course,
+                    academic_year=academic_year,
+                    semester=semester,
+                    assigned_by=request.user,
+                    lecture_venue=lecture_venue,
+                    lecture_time=lecture_time,
+                    remarks=remarks,
+                    is_active=True
+                )
+                messages.success(request, f"Successfully assigned {course.name} to {lecturer.user.get_full_name()}")
+                
+        except (Lecturer.DoesNotExist, Course.DoesNotExist, AcademicYear.DoesNotExist, Semester.DoesNotExist):
+            messages.error(request, "Invalid selection. Please try again.")
+        except Exception as e:
+            messages.error(request, f"An error occurred: {str(e)}")
+        
+        return redirect('dean_allocate_courses')
+    
+    # Handle AJAX request for getting courses by department
+    if request.GET.get('action') == 'get_courses':
+        department_id = request.GET.get('department_id')
+        if department_id:
+            courses = Course.objects.filter(
+                department_id=department_id,
+                department__faculty=faculty,
+                is_active=True
+            ).values('id', 'name', 'code', 'credit_hours', 'level')
+            return JsonResponse({'courses': list(courses)})
+        return JsonResponse({'courses': []})
+    
+    # Handle AJAX request for getting lecturers by department
+    if request.GET.get('action') == 'get_lecturers':
+        department_id = request.GET.get('department_id')
+        if department_id:
+            lecturers = Lecturer.objects.filter(
+                department_id=department_id,
+                department__faculty=faculty,
+                is_active=True
+            ).select_related('user').values(
+                'id', 'user__first_name', 'user__last_name', 
+                'academic_rank', 'employee_number'
+            )
+            lecturer_list = []
+            for lecturer in lecturers:
+                lecturer_list.append({
+                    'id': lecturer['id'],
+                    'name': f"{lecturer['user__first_name']} {lecturer['user__last_name']}",
+                    'rank': lecturer['academic_rank'],
+                    'employee_number': lecturer['employee_number']
+                })
+            return JsonResponse({'lecturers': lecturer_list})
+        return JsonResponse({'lecturers': []})
+    
+    # Get filter parameters
+    selected_department = request.GET.get('department', '')
+    selected_academic_year = request.GET.get('academic_year', '')
+    selected_semester = request.GET.get('semester', '')
+    
+    # Get existing assignments for the faculty
+    assignments = LecturerCourseAssignment.objects.filter(
+        lecturer__department__faculty=faculty
+    ).select_related(
+        'lecturer__user', 'course', 'academic_year', 'semester', 'assigned_by'
+    ).order_by('-assigned_date')
+    
+    # Apply filters
+    if selected_department:
+        assignments = assignments.filter(lecturer__department_id=selected_department)
+    
+    if selected_academic_year:
+        assignments = assignments.filter(academic_year_id=selected_academic_year)
+    
+    if selected_semester:
+        assignments = assignments.filter(semester_id=selected_semester)
+    
+    # Pagination
+    paginator = Paginator(assignments, 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Get form data
+    departments = Department.objects.filter(faculty=faculty, is_active=True)
+    academic_years = AcademicYear.objects.all().order_by('-start_date')
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    semesters = []
+    if current_academic_year:
+        semesters = Semester.objects.filter(academic_year=current_academic_year).order_by('semester_number')
+    
+    context = {
+        'faculty': faculty,
+        'departments': departments,
+        'academic_years': academic_years,
+        'current_academic_year': current_academic_year,
+        'semesters': semesters,
+        'page_obj': page_obj,
+        'selected_department': selected_department,
+        'selected_academic_year': selected_academic_year,
+        'selected_semester': selected_semester,
+    }
+    
+    return render(request, 'dean/allocate_courses.html', context)
+
+
+@login_required
+def dean_remove_course_assignment(request, assignment_id):
+    """
+    Remove/deactivate a course assignment
+    """
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    try:
+        faculty = request.role.get_faculty(active_only=True)
+        assignment = LecturerCourseAssignment.objects.get(
+            id=assignment_id,
+            lecturer__department__faculty=faculty
+        )
+        
+        if request.method == 'POST':
+            assignment.is_active = False
+            assignment.save()
+            messages.success(request, f"Successfully removed assignment: {assignment.course.name} from {assignment.lecturer.user.get_full_name()}")
+        else:
+            messages.error(request, "Invalid request method.")
+            
+    except (Faculty.DoesNotExist, LecturerCourseAssignment.DoesNotExist):
+        messages.error(request, "Assignment not found or access denied.")
+    
+    return redirect('dean_allocate_courses')
+
+
+@login_required
+def dean_view_lecturer_assignments(request, lecturer_id):
+    """
+    View all course assignments for a specific lecturer
+    """
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    try:
+        faculty = request.role.get_faculty(active_only=True)
+        lecturer = Lecturer.objects.get(id=lecturer_id, department__faculty=faculty)
+        
+        assignments = LecturerCourseAssignment.objects.filter(
+            lecturer=lecturer,
+            is_active=True
+        ).select_related('course', 'academic_year', 'semester').order_by(
+            '-academic_year__start_date', 'semester__semester_number'
+        )
+        
+        # Get current academic year assignments
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        current_assignments = assignments.filter(academic_year=current_academic_year) if current_academic_year else []
+        
+        context = {
+            'faculty': faculty,
+            'lecturer': lecturer,
+            'assignments': assignments,
+            'current_assignments': current_assignments,
+            'current_academic_year': current_academic_year,
+        }
+        
+        return render(request, 'dean/lecturer_assignments.html', context)
+        
+    except (Faculty.DoesNotExist, Lecturer.DoesNotExist):
+        messages.error(request, "Lecturer not found or access denied.")
+        return redirect('dean_allocate_courses')
+
+
+@login_required
+def dean_lecturer_list(request):
+    """
+    View for deans to see lecturers in their faculty
+    """
+    # Check if user is a dean
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied. Only deans can access this page.")
+        return redirect('dashboard')
+    
+    # Get the faculty headed by this dean
+    try:
+        faculty = request.role.faculty
+        if not faculty:
+            messages.error(request, "You are not assigned as dean of any faculty.")
+            return redirect('dashboard')
+    except Exception as e:
+        messages.error(request, "Error accessing faculty information.")
+        return redirect('dashboard')
+    
+    # Get all departments under this faculty
+    departments = Department.objects.filter(faculty=faculty, is_active=True)
+    
+    # Base queryset - lecturers in dean's faculty departments
+    lecturers = Lecturer.objects.filter(
+        department__faculty=faculty
+    ).select_related(
+        'user', 'department', 'department__faculty'
+    ).order_by('user__first_name', 'user__last_name')
+    
+    # Search functionality
+    search_query = request.GET.get('search', '').strip()
+    if search_query:
+        lecturers = lecturers.filter(
+            Q(user__first_name__icontains=search_query) |
+            Q(user__last_name__icontains=search_query) |
+            Q(user__email__icontains=search_query) |
+            Q(user__username__icontains=search_query) |
+            Q(employee_number__icontains=search_query) |
+            Q(user__phone__icontains=search_query)
+        )
+    
+    # Department filter
+    department_filter = request.GET.get('department', '')
+    if department_filter:
+        try:
+            department_id = int(department_filter)
+            lecturers = lecturers.filter(department_id=department_id)
+        except (ValueError, TypeError):
+            pass
+    
+    # Academic rank filter
+    rank_filter = request.GET.get('academic_rank', '')
+    if rank_filter:
+        lecturers = lecturers.filter(academic_rank=rank_filter)
+    
+    # Employment type filter
+    employment_filter = request.GET.get('employment_type', '')
+    if employment_filter:
+        lecturers = lecturers.filter(employment_type=employment_filter)
+    
+    # Status filter
+    status_filter = request.GET.get('status', '')
+    if status_filter == 'active':
+        lecturers = lecturers.filter(is_active=True)
+    elif status_filter == 'inactive':
+        lecturers = lecturers.filter(is_active=False)
+    
+    # Order by
+    order_by = request.GET.get('order_by', 'user__first_name')
+    valid_order_fields = [
+        'employee_number', 'user__first_name', 'user__last_name',
+        'department__name', 'academic_rank', 'joining_date',
+        'employment_type'
+    ]
+    if order_by in valid_order_fields:
+        lecturers = lecturers.order_by(order_by)
+    
+    # Pagination
+    paginator = Paginator(lecturers, 25)  # Show 25 lecturers per page
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Get choices for filters
+    rank_choices = Lecturer.ACADEMIC_RANKS
+    employment_choices = Lecturer.EMPLOYMENT_TYPES
+    
+    # Statistics
+    total_lecturers = lecturers.count()
+    active_lecturers = lecturers.filter(is_active=True).count()
+    inactive_lecturers = lecturers.filter(is_active=False).count()
+    
+    context = {
+        'lecturers': page_obj,
+        'faculty': faculty,
+        'departments': departments,
+        'page_obj': page_obj,
+        'search_query': search_query,
+        'department_filter': department_filter,
+        'rank_filter': rank_filter,
+        'employment_filter': employment_filter,
+        'status_filter': status_filter,
+        'order_by': order_by,
+        'rank_choices': rank_choices,
+        'employment_choices': employment_choices,
+        'total_lecturers': total_lecturers,
+        'active_lecturers': active_lecturers,
+        'inactive_lecturers': inactive_lecturers,
+    }
+    
+    return render(request, 'dean/lecturer_list.html', context)
+
+
+@login_required
+def dean_lecturer_detail(request, employee_number):
+    """
+    Detailed view of a lecturer for dean
+    """
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    faculty = request.role.faculty
+    if not faculty:
+        messages.error(request, "You are not assigned as dean of any faculty.")
+        return redirect('dashboard')
+    
+    lecturer = get_object_or_404(
+        Lecturer.objects.select_related('user', 'department'),
+        employee_number=employee_number,
+        department__faculty=faculty
+    )
+    
+    # Get current course assignments
+    current_semester = Semester.objects.filter(is_current=True).first()
+    current_assignments = []
+    if current_semester:
+        current_assignments = LecturerCourseAssignment.objects.filter(
+            lecturer=lecturer,
+            semester=current_semester,
+            is_active=True
+        ).select_related('course').order_by('course__name')
+    
+    context = {
+        'lecturer': lecturer,
+        'faculty': faculty,
+        'current_assignments': current_assignments,
+        'current_semester': current_semester,
+    }
+    
+    return render(request, 'dean/lecturer_detail.html', context)
+
+
+@login_required
+@require_POST
+def dean_lecturer_toggle_status(request, employee_number):
+    """
+    Toggle lecturer active/inactive status - Dean only
+    """
+    if request.user.user_type != 'dean':
+        return JsonResponse({'status': 'error', 'message': 'Access denied.'})
+    
+    faculty = request.role.faculty
+    if not faculty:
+        return JsonResponse({'status': 'error', 'message': 'Faculty not found.'})
+    
+    try:
+        lecturer = Lecturer.objects.get(
+            employee_number=employee_number,
+            department__faculty=faculty
+        )
+        
+        lecturer.is_active = not lecturer.is_active
+        lecturer.save()
+        
+        status_text = 'activated' if lecturer.is_active else 'deactivated'
+        
+        return JsonResponse({
+            'status': 'success',
+            'message': f'Lecturer {lecturer.user.get_full_name()} has been {status_text}.',
+            'is_active': lecturer.is_active
+        })
+        
+    except Lecturer.DoesNotExist:
+        return JsonResponse({'status': 'error', 'message': 'Lecturer not found.'})
+    except Exception as e:
+        return JsonResponse({'status': 'error', 'message': 'An error occurred.'})
+
+
+@login_required
+@require_POST
+def dean_lecturer_bulk_action(request):
+    """
+    Bulk actions for lecturers - Dean only
+    """
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied.")
+        return redirect('dean_lecturer_list')
+    
+    faculty = request.role.faculty
+    if not faculty:
+        messages.error(request, "Faculty not found.")
+        return redirect('dean_lecturer_list')
+    
+    action = request.POST.get('action')
+    lecturer_ids = request.POST.get('lecturer_ids', '').split(',')
+    lecturer_ids = [id.strip() for id in lecturer_ids if id.strip()]
+    
+    if not action or not lecturer_ids:
+        messages.error(request, "Please select an action and at least one lecturer.")
+        return redirect('dean_lecturer_list')
+    
+    # Get lecturers in dean's faculty only
+    lecturers = Lecturer.objects.filter(
+        employee_number__in=lecturer_ids,
+        department__faculty=faculty
+    )
+    
+    if not lecturers.exists():
+        messages.error(request, "No valid lecturers selected.")
+        return redirect('dean_lecturer_list')
+    
+    try:
+        if action == 'activate':
+            lecturers.update(is_active=True)
+            role_context.forget(*lecturers.values_list('user_id', flat=True))
+            messages.success(request, f"Successfully activated {lecturers.count()} lecturer(s).")
+        
+        elif action == 'deactivate':
+            lecturers.update(is_active=False)
+            role_context.forget(*lecturers.values_list('user_id', flat=True))
+            messages.success(request, f"Successfully deactivated {lecturers.count()} lecturer(s).")
+        
+        elif action == 'delete':
+            count = lecturers.count()
+            # Note: Consider soft delete instead of hard delete
+            lecturers.delete()
+            messages.success(request, f"Successfully deleted {count} lecturer(s).")
+        
+        else:
+            messages.error(request, "Invalid action selected.")
+    
+    except Exception as e:
+        messages.error(request, f"An error occurred: {str(e)}")
+    
+    return redirect('dean_lecturer_list')
+
+
+@login_required
+def dean_faculty_departments_api(request):
+    """
+    API endpoint to get departments for dean's faculty
+    """
+    if request.user.user_type != 'dean':
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    faculty = request.role.faculty
+    if not faculty:
+        return JsonResponse({'error': 'Faculty not found'}, status=404)
+    
+    departments = Department.objects.filter(
+        faculty=faculty, 
+        is_active=True
+    ).values('id', 'name', 'code').order_by('name')
+    
+    return JsonResponse({
+        'departments': list(departments),
+        'faculty': {
+            'id': faculty.id,
+            'name': faculty.name,
+            'code': faculty.code
+        }
+    })
+
+
+def dean_required(view_func):
+    """Decorator to ensure user is a dean"""
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated or request.user.user_type != 'dean':
+            messages.error(request, 'Access denied. Dean privileges required.')
+            return redirect('login')
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+@login_required
+@dean_required
+def dean_departments_list(request):
+    """List departments belonging to the logged-in dean's faculty"""
+    try:
+        # Get the dean's faculty
+        faculty = request.role.get_faculty()
+        
+        # Get departments in the dean's faculty
+        departments_queryset = Department.objects.filter(faculty=faculty).select_related(
+            'faculty', 'head_of_department'
+        ).annotate(
+            total_programmes=Count('programmes', distinct=True),
+            total_students=Count('programmes__students', distinct=True),
+            total_lecturers=Count('lecturers', distinct=True)
+        )
+        
+        # Search functionality
+        search_query = request.GET.get('search', '')
+        if search_query:
+            departments_queryset = departments_queryset.filter(
+                Q(name__icontains=search_query) |
+                Q(code__icontains=search_query) |
+                Q(description__icontains=search_query)
+            )
+        
+        # Status filter
+        status_filter = request.GET.get('status', '')
+        if status_filter:
+            if status_filter == 'active':
+                departments_queryset = departments_queryset.filter(is_active=True)
+            elif status_filter == 'inactive':
+                departments_queryset = departments_queryset.filter(is_active=False)
+        
+        # Get statistics
+        total_departments = departments_queryset.count()
+        active_departments = departments_queryset.filter(is_active=True).count()
+        inactive_departments = total_departments - active_departments
+        
+        # Pagination
+        paginator = Paginator(departments_queryset, 10)
+        page_number = request.GET.get('page')
+        departments = paginator.get_page(page_number)
+        
+        # Status choices for filter dropdown
+        status_choices = [
+            ('active', 'Active'),
+            ('inactive', 'Inactive'),
+        ]
+        
+        context = {
+            'departments': departments,
+            'faculty': faculty,
+            'search_query': search_query,
+            'status_filter': status_filter,
+            'status_choices': status_choices,
+            'total_departments': total_departments,
+            'active_departments': active_departments,
+            'inactive_departments': inactive_departments,
+        }
+        
+        return render(request, 'dean/departments_list.html', context)
+        
+    except Faculty.DoesNotExist:
+        messages.error(request, 'You are not assigned as a dean to any faculty.')
+        return redirect('dashboard')
+
+
+@login_required
+@dean_required
+def dean_department_detail(request, code):
+    """Get department details for dean"""
+    try:
+        faculty = request.role.get_faculty()
+        department = get_object_or_404(
+            Department.objects.select_related('faculty', 'head_of_department'),
+            code=code, 
+            faculty=faculty
+        )
+        
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            data = {
+                'name': department.name,
+                'code': department.code,
+                'faculty_name': department.faculty.name,
+                'faculty_code': department.faculty.code,
+                'is_active': department.is_active,
+                'established_date': department.established_date.isoformat() if department.established_date else None,
+                'description': department.description,
+                'total_programmes': department.programmes.count(),
+                'total_students': sum([prog.students.count() for prog in department.programmes.all()]),
+                'total_lecturers': department.lecturers.count(),
+                'head_of_department': {
+                    'name': department.head_of_department.get_full_name(),
+                    'email': department.head_of_department.email,
+                    'phone': getattr(department.head_of_department, 'phone', ''),
+                } if department.head_of_department else None,
+            }
+            return JsonResponse(data)
+        
+        return render(request, 'dean/department_detail.html', {'department': department})
+        
+    except Faculty.DoesNotExist:
+        messages.error(request, 'Access denied.')
+        return redirect('dashboard')
+
+
+@login_required
+@dean_required
+def dean_hods_management(request):
+    """Manage HODs for departments in dean's faculty"""
+    try:
+        faculty = request.role.get_faculty()
+        
+        # Get departments in the dean's faculty
+        departments = Department.objects.filter(faculty=faculty).select_related(
+            'head_of_department', 'faculty'
+        ).annotate(
+            total_programmes=Count('programmes', distinct=True),
+            total_students=Count('programmes__students', distinct=True),
+            total_lecturers=Count('lecturers', distinct=True)
+        )
+        
+        # Get potential HODs (lecturers in the faculty with appropriate ranks)
+        potential_hods = Lecturer.objects.filter(
+            department__faculty=faculty,
+            academic_rank__in=['professor', 'associate_professor', 'senior_lecturer'],
+            is_active=True
+        ).select_related('user', 'department')
+        
+        # Search functionality
+        search_query = request.GET.get('search', '')
+        if search_query:
+            departments = departments.filter(
+                Q(name__icontains=search_query) |
+                Q(code__icontains=search_query) |
+                Q(head_of_department__first_name__icontains=search_query) |
+                Q(head_of_department__last_name__icontains=search_query)
+            )
+        
+        # Assignment status filter
+        hod_filter = request.GET.get('hod_status', '')
+        if hod_filter == 'assigned':
+            departments = departments.filter(head_of_department__isnull=False)
+        elif hod_filter == 'unassigned':
+            departments = departments.filter(head_of_department__isnull=True)
+        
+        # Pagination
+        paginator = Paginator(departments, 10)
+        page_number = request.GET.get('page')
+        departments_page = paginator.get_page(page_number)
+        
+        # Statistics
+        total_departments = departments.count()
+        assigned_hods = departments.filter(head_of_department__isnull=False).count()
+        unassigned_departments = total_departments - assigned_hods
+        
+        context = {
+            'departments': departments_page,
+            'potential_hods': potential_hods,
+            'faculty': faculty,
+            'search_query': search_query,
+            'hod_filter': hod_filter,
+            'total_departments': total_departments,
+            'assigned_hods': assigned_hods,
+            'unassigned_departments': unassigned_departments,
+        }
+        
+        return render(request, 'dean/hods_management.html', context)
+        
+    except Faculty.DoesNotExist:
+        messages.error(request, 'Access denied.')
+        return redirect('dashboard')
+
+
+@login_required
+@dean_required
+@require_http_methods(["POST"])
+def assign_hod(request, department_code):
+    """Assign HOD to a department"""
+    try:
+        faculty = request.role.get_faculty()
+        department = get_object_or_404(Department, code=department_code, faculty=faculty)
+        
+        lecturer_id = request.POST.get('lecturer_id')
+        if not lecturer_id:
+            return JsonResponse({'success': False, 'message': 'Please select a lecturer.'})
+        
+        lecturer = get_object_or_404(
+            Lecturer, 
+            id=lecturer_id, 
+            department__faculty=faculty,
+            is_active=True
+        )
+        
+        # Check if lecturer is already a HOD elsewhere
+        if Department.objects.filter(head_of_department=lecturer.user).exists():
+            current_dept = Department.objects.get(head_of_department=lecturer.user)
+            return JsonResponse({
+                'success': False, 
+                'message': f'{lecturer.user.get_full_name()} is already HOD of {current_dept.name}'
+            })
+        
+        # Assign HOD
+        department.head_of_department = lecturer.user
+        department.save()
+        
+        messages.success(
+            request, 
+            f'{lecturer.user.get_full_name()} has been assigned as HOD of {department.name}'
+        )
+        
+        return JsonResponse({
+            'success': True, 
+            'message': f'HOD assigned successfully to {department.name}'
+        })
+        
+    except Faculty.DoesNotExist:
+        return JsonResponse({'success': False, 'message': 'Access denied.'})
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)})
+
+
+@login_required
+@dean_required
+@require_http_methods(["POST"])
+def remove_hod(request, department_code):
+    """Remove HOD from a department"""
+    try:
+        faculty = request.role.get_faculty()
+        department = get_object_or_404(Department, code=department_code, faculty=faculty)
+        
+        if not department.head_of_department:
+            return JsonResponse({'success': False, 'message': 'No HOD assigned to this department.'})
+        
+        hod_name = department.head_of_department.get_full_name()
+        department.head_of_department = None
+        department.save()
+        
+        messages.success(request, f'{hod_name} has been removed as HOD of {department.name}')
+        
+        return JsonResponse({
+            'success': True, 
+            'message': f'HOD removed successfully from {department.name}'
+        })
+        
+    except Faculty.DoesNotExist:
+        return JsonResponse({'success': False, 'message': 'Access denied.'})
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)})
+
+
+def department_performance_summary(departments):
+    """Students, lecturers and programmes per department with one query each"""
+    from ..models_analytics import StudentFact
+
+    students = dict(
+        StudentFact.objects.filter(department__in=departments, status='active').order_by()
+        .values('department_id').annotate(total=Sum('student_count'))
+        .values_list('department_id', 'total')
+    )
+    lecturers = dict(
+        Lecturer.objects.filter(department__in=departments, is_active=True).order_by()
+        .values('department_id').annotate(total=Count('id'))
+        .values_list('department_id', 'total')
+    )
+    programmes = dict(
+        Programme.objects.filter(department__in=departments, is_active=True).order_by()
+        .values('department_id').annotate(total=Count('id'))
+        .values_list('department_id', 'total')
+    )
+
+    performance = []
+    for dept in departments:
+        students_count = students.get(dept.id, 0)
+        lecturers_count = lecturers.get(dept.id, 0)
+        performance.append({
+            'department': dept.name,
+            'students': students_count,
+            'lecturers': lecturers_count,
+            'programmes': programmes.get(dept.id, 0),
+            'ratio': round(students_count / lecturers_count, 1) if lecturers_count > 0 else 0
+        })
+    return performance
+
+
+@login_required
+@dean_required
+def dean_report(request):
+    """Dean's dashboard with comprehensive analytics"""
+    from ..analytics_facts import ensure_facts
+    from ..models_analytics import EnrollmentFact, FeePaymentFact, StudentFact
+
+    try:
+        faculty = request.role.get_faculty()
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        
+        if not current_academic_year:
+            messages.warning(request, 'No current academic year is set.')
+            return redirect('dean_departments_list')
+        
+        ensure_facts()
+        
+        # Basic statistics
+        departments = Department.objects.filter(faculty=faculty)
+        total_departments = departments.count()
+        departments_with_hod = departments.filter(head_of_department__isnull=False).count()
+        
+        programmes = Programme.objects.filter(faculty=faculty)
+        total_programmes = programmes.count()
+        active_programmes = programmes.filter(is_active=True).count()
+        
+        student_facts = StudentFact.objects.filter(faculty=faculty).order_by()
+        active_student_facts = student_facts.filter(status='active')
+        total_students = active_student_facts.aggregate(total=Sum('student_count'))['total'] or 0
+        
+        lecturers = Lecturer.objects.filter(department__faculty=faculty, is_active=True)
+        total_lecturers = lecturers.count()
+        
+        # Student distribution by programme
+        students_per_programme = dict(
+            active_student_facts.values('programme_id').annotate(
+                total=Sum('student_count')
+            ).values_list('programme_id', 'total')
+        )
+        student_distribution = [
+            {'name': name, 'student_count': students_per_programme.get(programme_id, 0)}
+            for programme_id, name in programmes.values_list('id', 'name')
+        ]
+        
+        # Student distribution by year
+        student_by_year = active_student_facts.values(current_year=F('year_of_study')).annotate(
+            count=Sum('student_count')
+        ).order_by('current_year')
+        
+        # Lecturer distribution by rank
+        lecturer_by_rank = lecturers.values('academic_rank').annotate(
+            count=Count('id')
+        ).order_by('academic_rank')
+        
+        # Programme type distribution
+        programme_by_type = programmes.values('programme_type').annotate(
+            count=Count('id')
+        ).order_by('programme_type')
+        
+        # Student status distribution
+        student_by_status = student_facts.values('status').annotate(
+            count=Sum('student_count')
+        ).order_by('status')
+        
+        # Fee collection statistics (if applicable)
+        fee_stats = None
+        if current_academic_year:
+            fee_structures = FeeStructure.objects.filter(
+                programme__faculty=faculty,
+                academic_year=current_academic_year
+            )
+            total_expected_fees = fee_structures.aggregate(
+                total=Sum('tuition_fee')
+            )['total'] or 0
+            
+            total_collected_fees = FeePaymentFact.objects.filter(
+                faculty=faculty,
+                academic_year=current_academic_year
+            ).aggregate(
+                total=Sum('amount_paid_sum')
+            )['total'] or 0
+            
+            fee_stats = {
+                'expected': float(total_expected_fees),
+                'collected': float(total_collected_fees),
+                'percentage': (total_collected_fees / total_expected_fees * 100) if total_expected_fees > 0 else 0
+            }
+        
+        # Research projects
+        research_projects = Research.objects.filter(
+            department__faculty=faculty
+        )
+        total_research = research_projects.count()
+        ongoing_research = research_projects.filter(status='ongoing').count()
+        completed_research = research_projects.filter(status='completed').count()
+        
+        # Monthly student enrollment trend (last 12 months)
+        this_month = timezone.now().date().replace(day=1)
+        months = []
+        for i in range(11, -1, -1):
+            year, month = divmod(this_month.year * 12 + this_month.month - 1 - i, 12)
+            months.append(this_month.replace(year=year, month=month + 1))
+        
+        monthly_enrollments = dict(
+            EnrollmentFact.objects.filter(
+                faculty=faculty,
+                enrollment_month__gte=months[0]
+            ).order_by().values('enrollment_month').annotate(
+                total=Sum('enrollment_count')
+            ).values_list('enrollment_month', 'total')
+        )
+        enrollment_trend = [
+            {'month': month.strftime('%b %Y'), 'enrollments': monthly_enrollments.get(month, 0)}
+            for month in months
+        ]
+        
+        # Department performance metrics
+        dept_performance = department_performance_summary(departments)
+        for row in dept_performance:
+            row['name'] = row.pop('department')
+        
+        context = {
+            'faculty': faculty,
+            'current_academic_year': current_academic_year,
+            
+            # Basic stats
+            'total_departments': total_departments,
+            'departments_with_hod': departments_with_hod,
+            'total_programmes': total_programmes,
+            'active_programmes': active_programmes,
+            'total_students': total_students,
+            'total_lecturers': total_lecturers,
+            'total_research': total_research,
+            'ongoing_research': ongoing_research,
+            'completed_research': completed_research,
+            
+            # Chart data
+            'student_distribution': list(student_distribution),
+            'student_by_year': list(student_by_year),
+            'lecturer_by_rank': list(lecturer_by_rank),
+            'programme_by_type': list(programme_by_type),
+            'student_by_status': list(student_by_status),
+            'enrollment_trend': enrollment_trend,
+            'dept_performance': dept_performance,
+            
+            # Fee statistics
+            'fee_stats': fee_stats,
+        }
+        
+        return render(request, 'dean/report.html', context)
+        
+    except Faculty.DoesNotExist:
+        messages.error(request, 'You are not assigned as a dean to any faculty.')
+        return redirect('dashboard')
+
+
+@login_required
+@dean_required
+def dean_analytics_api(request):
+    """API endpoint for dashboard analytics data"""
+    from ..analytics_facts import ensure_facts
+    from ..models_analytics import StudentFact
+
+    try:
+        faculty = request.role.get_faculty()
+        chart_type = request.GET.get('chart', 'student_distribution')
+        
+        data = {}
+        
+        if chart_type == 'student_distribution':
+            ensure_facts()
+            students_per_programme = dict(
+                StudentFact.objects.filter(faculty=faculty, status='active').order_by()
+                .values('programme_id').annotate(total=Sum('student_count'))
+                .values_list('programme_id', 'total')
+            )
+            data = [
+                {'name': name, 'student_count': students_per_programme.get(programme_id, 0)}
+                for programme_id, name in Programme.objects.filter(faculty=faculty).values_list('id', 'name')
+            ]
+            
+        elif chart_type == 'lecturer_ranks':
+            lecturers = Lecturer.objects.filter(
+                department__faculty=faculty, 
+                is_active=True
+            ).values('academic_rank').annotate(
+                count=Count('id')
+            )
+            data = list(lecturers)
+            
+        elif chart_type == 'department_performance':
+            ensure_facts()
+            data = department_performance_summary(Department.objects.filter(faculty=faculty))
+        
+        return JsonResponse({'success': True, 'data': data})
+        
+    except Faculty.DoesNotExist:
+        return JsonResponse({'success': False, 'message': 'Access denied.'})
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)})
+
+
+@login_required
+def dean_profile(request):
+    """Dean profile view for managing personal information and password changes"""
+    
+    # Ensure the user is a dean
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied. This page is only for deans.")
+        return redirect('dashboard')
+    
+    # Get the faculty headed by the dean
+    faculty = request.role.active_faculty
+    
+    if request.method == 'POST':
+        try:
+            with transaction.atomic():
+                # Handle profile picture upload
+                if 'profile_picture' in request.FILES:
+                    profile_picture = request.FILES['profile_picture']
+                    
+                    # Delete old profile picture if exists
+                    if request.user.profile_picture:
+                        if default_storage.exists(request.user.profile_picture.name):
+                            default_storage.delete(request.user.profile_picture.name)
+                    
+                    # Save new profile picture
+                    request.user.profile_picture = profile_picture
+                    request.user.save()
+                    
+                    messages.success(request, "Profile picture updated successfully!")
+                    return JsonResponse({'status': 'success'})
+                
+                # Handle personal details update
+                elif 'phone' in request.POST:
+                    request.user.phone = request.POST.get('phone', '')
+                    request.user.address = request.POST.get('address', '')
+                    request.user.email = request.POST.get('email', request.user.email)
+                    request.user.save()
+                    
+                    messages.success(request, "Contact details updated successfully!")
+                
+                # Handle password change
+                elif 'current_password' in request.POST:
+                    form = PasswordChangeForm(request.user, request.POST)
+                    if form.is_valid():
+                        user = form.save()
+                        update_session_auth_hash(request, user)  # Important for keeping user logged in
+                        messages.success(request, "Password changed successfully!")
+                    else:
+                        for field, errors in form.errors.items():
+                            for error in errors:
+                                messages.error(request, f"{field}: {error}")
+                
+                return redirect('dean_profile')
+                
+        except Exception as e:
+            messages.error(request, f"An error occurred: {str(e)}")
+            return redirect('dean_profile')
+    
+    # Calculate years of service if joining date is available
+    years_of_service = None
+    if faculty and hasattr(faculty, 'established_date'):
+        from datetime import date
+        years_of_service = (date.today() - faculty.established_date).days // 365
+    
+    # Get faculty statistics
+    faculty_stats = {}
+    if faculty:
+        faculty_stats = {
+            'total_departments': faculty.departments.filter(is_active=True).count(),
+            'total_programmes': faculty.programmes.filter(is_active=True).count(),
+            'total_students': sum([
+                prog.students.filter(status='active').count() 
+                for prog in faculty.programmes.filter(is_active=True)
+            ]),
+            'total_lecturers': sum([
+                dept.lecturers.filter(is_active=True).count() 
+                for dept in faculty.departments.filter(is_active=True)
+            ])
+        }
+    
+    context = {
+        'dean': request.user,
+        'faculty': faculty,
+        'years_of_service': years_of_service,
+        'faculty_stats': faculty_stats,
+    }
+    
+    return render(request, 'dean/dean_profile.html', context)
@@ -0,0 +1,2088 @@
+# exports.py - PDF, Excel and CSV downloads
+#
+# reportlab, openpyxl, weasyprint and pdfkit are imported inside the views
+# that use them so that loading the URLconf does not load them.
+
+from collections import defaultdict
+import csv
+from datetime import datetime
+from decimal import Decimal
+from io import BytesIO
+import tempfile
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db.models import Q, Sum
+from django.http import HttpResponse, HttpResponseForbidden
+from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import get_template, render_to_string
+from django.utils import timezone
+
+from ..models import (
+    AcademicYear, Attendance, AttendanceSession, Course, Department, Enrollment, FeePayment,
+    FeeStructure, Grade, Lecturer, LecturerCourseAssignment, Programme, Semester,
+    SpecialExamApplication, Student, StudentReporting,
+)
+from .academics import calculate_transcript_data, get_grading_system
+from .cod import cod_required, get_student_fee_status
+from .common import is_admin, is_admin_registrar_or_dean, is_administrative_staff
+
+
+@login_required
+def student_transcript_pdf(request, academic_year_id=None, semester_id=None):
+    """
+    Generate PDF transcript for student - either for specific semester or full academic year
+    """
+    import pdfkit
+
+    # Check if user is a student
+    if request.role.student is None:
+        return HttpResponseForbidden("Access denied. Students only.")
+    
+    student = request.role.student
+    
+    # Determine what to include in the transcript
+    enrollments_filter = Q(student=student, is_active=True)
+    
+    if semester_id:
+        # Specific semester transcript
+        semester = get_object_or_404(Semester, id=semester_id)
+        enrollments_filter &= Q(semester=semester)
+        transcript_type = f"Semester {semester.semester_number}"
+        academic_year = semester.academic_year
+        pdf_filename = f"{student.student_id}_transcript_{semester.academic_year.year}_sem{semester.semester_number}.pdf"
+    elif academic_year_id:
+        # Full academic year transcript
+        academic_year = get_object_or_404(AcademicYear, id=academic_year_id)
+        enrollments_filter &= Q(semester__academic_year=academic_year)
+        transcript_type = f"Academic Year {academic_year.year}"
+        pdf_filename = f"{student.student_id}_transcript_{academic_year.year}.pdf"
+    else:
+        # Full transcript (all years)
+        transcript_type = "Complete Academic Transcript"
+        academic_year = None
+        pdf_filename = f"{student.student_id}_complete_transcript.pdf"
+
+    # Get enrollments based on filter
+    enrollments = Enrollment.objects.filter(enrollments_filter).select_related(
+        'course',
+        'semester',
+        'semester__academic_year',
+        'lecturer'
+    ).prefetch_related('grade').order_by(
+        'semester__academic_year__year', 
+        'semester__semester_number', 
+        'course__code'
+    )
+
+    if not enrollments.exists():
+        return HttpResponse("No academic records found for the specified period.", status=404)
+
+    # Organize data by academic year and semester
+    transcript_data = defaultdict(lambda: defaultdict(list))
+    
+    for enrollment in enrollments:
+        year = enrollment.semester.academic_year.year
+        semester_num = enrollment.semester.semester_number
+        
+        # Get grade information
+        grade_info = None
+        try:
+            grade_info = enrollment.grade
+        except Grade.DoesNotExist:
+            pass
+        
+        # Calculate total marks
+        total_marks = None
+        if grade_info and grade_info.total_marks:
+            total_marks = grade_info.total_marks
+        elif grade_info:
+            # Calculate from individual components if total_marks is not set
+            marks = []
+            if grade_info.continuous_assessment is not None:
+                marks.append(float(grade_info.continuous_assessment))
+            if grade_info.final_exam is not None:
+                marks.append(float(grade_info.final_exam))
+            if grade_info.practical_marks is not None:
+                marks.append(float(grade_info.practical_marks))
+            if grade_info.project_marks is not None:
+                marks.append(float(grade_info.project_marks))
+            
+            if marks:
+                total_marks = sum(marks) / len(marks)
+        
+        subject_data = {
+            'unit': enrollment.course,
+            'enrollment': enrollment,
+            'grade': grade_info,
+            'continuous_assessment': grade_info.continuous_assessment if grade_info else None,
+            'final_exam': grade_info.final_exam if grade_info else None,
+            'practical_marks': grade_info.practical_marks if grade_info else None,
+            'project_marks': grade_info.project_marks if grade_info else None,
+            'total_marks': total_marks,
+            'grade_letter': grade_info.grade if grade_info else 'N/A',
+            'grade_points': grade_info.grade_points if grade_info else None,
+            'quality_points': grade_info.quality_points if grade_info else None,
+            'is_passed': grade_info.is_passed if grade_info else False,
+            'status': 'Passed' if (grade_info and grade_info.is_passed) else 'Failed' if grade_info else 'Pending',
+            'lecturer': enrollment.lecturer.user.get_full_name() if enrollment.lecturer else 'TBA'
+        }
+        
+        transcript_data[year][semester_num].append(subject_data)
+
+    # Convert to regular dict and sort
+    transcript_data = dict(transcript_data)
+    for year in transcript_data:
+        transcript_data[year] = dict(transcript_data[year])
+        for semester in transcript_data[year]:
+            transcript_data[year][semester].sort(key=lambda x: x['unit'].code)
+
+    # Calculate statistics
+    semester_gpas = {}
+    overall_credits = 0
+    overall_grade_points = 0
+    total_subjects = 0
+    passed_subjects = 0
+    total_quality_points = 0
+    
+    for year in transcript_data:
+        for semester_num in transcript_data[year]:
+            semester_credits = 0
+            semester_quality_points = 0
+            semester_subjects = 0
+            semester_passed = 0
+            
+            for subject_data in transcript_data[year][semester_num]:
+                total_subjects += 1
+                semester_subjects += 1
+                
+                if subject_data['is_passed']:
+                    passed_subjects += 1
+                    semester_passed += 1
+                    
+                if subject_data['grade_points'] is not None and subject_data['quality_points'] is not None:
+                    credits = subject_data['unit'].credit_hours
+                    quality_points = float(subject_data['quality_points'])
+                    
+                    semester_credits += credits
+                    semester_quality_points += quality_points
+                    
+                    overall_credits += credits
+                    total_quality_points += quality_points
+            
+            if semester_credits > 0:
+                semester_gpa = semester_quality_points / semester_credits
+                semester_gpas[f"{year}-{semester_num}"] = {
+                    'gpa': round(semester_gpa, 2),
+                    'credits': semester_credits,
+                    'subjects': semester_subjects,
+                    'passed': semester_passed
+                }
+
+    overall_gpa = round(total_quality_points / overall_credits, 2) if overall_credits > 0 else 0
+    
+    # Calculate completion percentage
+    programme_units = student.programme.programme_courses.filter(is_active=True)
+    if semester_id:
+        # For semester transcript, calculate based on that semester's expected units
+        semester_obj = get_object_or_404(Semester, id=semester_id)
+        expected_units = programme_units.filter(
+            year=student.current_year,
+            semester=semester_obj.semester_number
+        ).count()
+        completed_percentage = round((passed_subjects / expected_units) * 100, 1) if expected_units > 0 else 0
+    else:
+        total_programme_units = programme_units.count()
+        completed_percentage = round((passed_subjects / total_programme_units) * 100, 1) if total_programme_units > 0 else 0
+    
+    # Determine academic standing
+    if overall_gpa >= 3.5:
+        academic_standing = "First Class Honours"
+    elif overall_gpa >= 3.0:
+        academic_standing = "Second Class Honours (Upper Division)"
+    elif overall_gpa >= 2.5:
+        academic_standing = "Second Class Honours (Lower Division)"
+    elif overall_gpa >= 2.0:
+        academic_standing = "Pass"
+    else:
+        academic_standing = "Fail"
+
+    # Get university information (you might need to create a University model or use settings)
+    university_info = {
+        'name': getattr(settings, 'UNIVERSITY_NAME', 'MURANGA UNIVERSITY OF TECHNOLOGY'),
+        'logo_url': getattr(settings, 'UNIVERSITY_LOGO_URL', '/static/logo.png'),
+        'address': getattr(settings, 'UNIVERSITY_ADDRESS', '625 Kimathi Avenue, P.O. Box 45678, Nairobi, Kenya'),
+        'phone': getattr(settings, 'UNIVERSITY_PHONE', '+254 757 790 877'),
+        'email': getattr(settings, 'UNIVERSITY_EMAIL', 'info@murangauniversity.ac.ke'),
+        'website': getattr(settings, 'UNIVERSITY_WEBSITE', 'www.murangauniversity.ac.ke'),
+        'motto': getattr(settings, 'UNIVERSITY_MOTTO', 'Excellence in Education'),
+    }
+
+    context = {
+        'student': student,
+        'transcript_data': transcript_data,
+        'semester_gpas': semester_gpas,
+        'overall_gpa': overall_gpa,
+        'total_credits': overall_credits,
+        'completed_percentage': completed_percentage,
+        'academic_standing': academic_standing,
+        'total_subjects': total_subjects,
+        'passed_subjects': passed_subjects,
+        'transcript_type': transcript_type,
+        'academic_year': academic_year,
+        'university_info': university_info,
+        'generated_date': timezone.now().strftime('%B %d, %Y at %I:%M %p'),
+    }
+    
+    # Render HTML template
+    template = get_template('student/transcript_pdf.html')
+    html = template.render(context)
+    
+    # Configure PDF options
+    options = {
+        'page-size': 'A4',
+        'margin-top': '0.5in',
+        'margin-right': '0.5in',
+        'margin-bottom': '0.5in',
+        'margin-left': '0.5in',
+        'encoding': "UTF-8",
+        'no-outline': None,
+        'enable-local-file-access': None,
+        'print-media-type': '',
+        'disable-smart-shrinking': '',
+        'zoom': '0.8',
+    }
+    
+    try:
+        # Generate PDF
+        
+        config = pdfkit.configuration(wkhtmltopdf=settings.WKHTMLTOPDF_CMD)
+        pdf = pdfkit.from_string(html, False, options=options, configuration=config)
+        
+        # Create HTTP response
+        response = HttpResponse(pdf, content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="{pdf_filename}"'
+        
+        return response
+        
+    except Exception as e:
+        # Fallback: return HTML if PDF generation fails
+        return HttpResponse(f"Error generating PDF: {str(e)}")
+
+
+@login_required
+def lecturer_export(request):
+    """Export lecturers to CSV"""
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="lecturers.csv"'
+    
+    writer = csv.writer(response)
+    
+    # Write header
+    writer.writerow([
+        'Employee Number', 'First Name', 'Last Name', 'Email', 'Phone',
+        'Department', 'Faculty', 'Academic Rank', 'Employment Type',
+        'Joining Date', 'Highest Qualification', 'University Graduated',
+        'Teaching Experience (Years)', 'Research Experience (Years)',
+        'Office Location', 'Status'
+    ])
+    
+    # Write data
+    lecturers = Lecturer.objects.select_related(
+        'user', 'department', 'department__faculty'
+    ).all()
+    
+    for lecturer in lecturers:
+        writer.writerow([
+            lecturer.employee_number,
+            lecturer.user.first_name,
+            lecturer.user.last_name,
+            lecturer.user.email,
+            lecturer.user.phone,
+            lecturer.department.name,
+            lecturer.department.faculty.name,
+            lecturer.get_academic_rank_display(),
+            lecturer.get_employment_type_display(),
+            lecturer.joining_date.strftime('%Y-%m-%d') if lecturer.joining_date else '',
+            lecturer.highest_qualification,
+            lecturer.university_graduated,
+            lecturer.teaching_experience_years,
+            lecturer.research_experience_years,
+            lecturer.office_location,
+            'Active' if lecturer.is_active else 'Inactive'
+        ])
+    
+    return response
+
+
+@login_required
+def download_grades_pdf(request):
+    """
+    Generate and download PDF report of grades
+    """
+    # Get the same filters as the main view
+    academic_year_id = request.GET.get('academic_year')
+    semester_id = request.GET.get('semester')
+    programme_id = request.GET.get('programme')
+    department_id = request.GET.get('department')
+    
+    # Get filtered data
+    grades = Grade.objects.select_related(
+        'enrollment__student__user',
+        'enrollment__student__programme',
+        'enrollment__course',
+        'enrollment__semester__academic_year',
+        'enrollment__lecturer__user'
+    ).order_by(
+        'enrollment__student__user__last_name',
+        'enrollment__student__user__first_name',
+        'enrollment__course__code'
+    )
+    
+    # Apply filters
+    if academic_year_id:
+        grades = grades.filter(enrollment__semester__academic_year_id=academic_year_id)
+    if semester_id:
+        grades = grades.filter(enrollment__semester_id=semester_id)
+    if programme_id:
+        grades = grades.filter(enrollment__student__programme_id=programme_id)
+    if department_id:
+        grades = grades.filter(enrollment__course__department_id=department_id)
+    
+    # Group grades by student
+    students_grades = {}
+    for grade in grades:
+        student = grade.enrollment.student
+        student_key = student.student_id
+        
+        if student_key not in students_grades:
+            students_grades[student_key] = {
+                'student': student,
+                'grades': [],
+                'total_credits': 0,
+                'total_quality_points': Decimal('0.00'),
+                'gpa': Decimal('0.00')
+            }
+        
+        students_grades[student_key]['grades'].append(grade)
+        students_grades[student_key]['total_credits'] += grade.enrollment.course.credit_hours
+        if grade.quality_points:
+            students_grades[student_key]['total_quality_points'] += grade.quality_points
+    
+    # Calculate GPA for each student
+    for student_data in students_grades.values():
+        if student_data['total_credits'] > 0:
+            student_data['gpa'] = student_data['total_quality_points'] / student_data['total_credits']
+        student_data['gpa'] = round(student_data['gpa'], 2)
+    
+    # Get filter context for the PDF
+    academic_year = None
+    semester = None
+    programme = None
+    department = None
+    
+    if academic_year_id:
+        academic_year = get_object_or_404(AcademicYear, id=academic_year_id)
+    if semester_id:
+        semester = get_object_or_404(Semester, id=semester_id)
+    if programme_id:
+        programme = get_object_or_404(Programme, id=programme_id)
+    if department_id:
+        department = get_object_or_404(Department, id=department_id)
+    
+    context = {
+        'students_grades': list(students_grades.values()),
+        'academic_year': academic_year,
+        'semester': semester,
+        'programme': programme,
+        'department': department,
+        'total_students': len(students_grades),
+        'total_grades': grades.count(),
+    }
+    
+    return render(request, 'grades/grades_pdf.html', context)
+
+
+@login_required
+def export_attendance(request, course_id, semester_id):
+    """Export attendance data for a course"""
+    try:
+        lecturer = request.role.get_lecturer()
+    except:
+        messages.error(request, "Access denied.")
+        return redirect('my_students')
+    
+    # Verify lecturer has permission
+    assignment = get_object_or_404(
+        LecturerCourseAssignment,
+        lecturer=lecturer,
+        course_id=course_id,
+        semester_id=semester_id,
+        is_active=True
+    )
+    
+    # Get enrolled students and attendance data
+    enrollments = Enrollment.objects.filter(
+        course=assignment.course,
+        semester=assignment.semester,
+        is_active=True
+    ).select_related('student__user').order_by('student__student_id')
+    
+    attendance_sessions = AttendanceSession.objects.filter(
+        timetable_slot__course=assignment.course,
+        semester=assignment.semester,
+        lecturer=lecturer
+    ).order_by('week_number')
+    
+    # Create CSV response
+    import csv
+    from django.http import HttpResponse
+    
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{assignment.course.code}_attendance.csv"'
+    
+    writer = csv.writer(response)
+    
+    # Write headers
+    headers = ['Student ID', 'Student Name', 'Programme']
+    for session in attendance_sessions:
+        headers.append(f'Week {session.week_number} ({session.session_date})')
+    headers.extend(['Total Present', 'Total Sessions', 'Attendance %'])
+    
+    writer.writerow(headers)
+    
+    # Write student data
+    for enrollment in enrollments:
+        student = enrollment.student
+        row = [student.student_id, student.user.get_full_name(), student.programme.name]
+        
+        present_count = 0
+        for session in attendance_sessions:
+            attendance = Attendance.objects.filter(
+                student=student,
+                attendance_session=session
+            ).first()
+            
+            if attendance:
+                row.append(attendance.status.title())
+                if attendance.status in ['present', 'late']:
+                    present_count += 1
+            else:
+                row.append('Absent')
+        
+        total_sessions = attendance_sessions.count()
+        attendance_percentage = round((present_count / total_sessions * 100), 1) if total_sessions > 0 else 0
+        
+        row.extend([present_count, total_sessions, f"{attendance_percentage}%"])
+        writer.writerow(row)
+    
+    return response
+
+
+@staff_member_required
+def download_payment_receipt_pdf(request, payment_id):
+    """
+    Generate and download a professional PDF receipt for a fee payment using HTML to PDF
+    """
+    from weasyprint import CSS, HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    try:
+        # Get the payment record
+        payment = get_object_or_404(FeePayment, id=payment_id, payment_status='completed')
+        
+        # Get related data
+        student = payment.student
+        fee_structure = payment.fee_structure
+        academic_year = fee_structure.academic_year
+        
+        # Calculate totals
+        total_payments = FeePayment.objects.filter(
+            student=student,
+            fee_structure=fee_structure,
+            payment_status='completed'
+        ).aggregate(total=Sum('amount_paid'))['total'] or Decimal('0.00')
+        
+        balance = fee_structure.net_fee() - total_payments
+        
+        # Calculate previous payments (total payments minus current payment)
+        previous_payments = total_payments - payment.amount_paid
+        
+        # Get overpayment details if any
+        overpayment_details = []
+        overpayment_total = Decimal('0.00')
+        if hasattr(payment, 'overpayment_allocations'):
+            overpayment_details = payment.overpayment_allocations.all()
+            overpayment_total = sum(detail.amount for detail in overpayment_details)
+        
+        # Prepare context for template
+        context = {
+            'payment': payment,
+            'student': student,
+            'fee_structure': fee_structure,
+            'academic_year': academic_year,
+            'total_payments': total_payments,
+            'previous_payments': previous_payments,
+            'balance': balance,
+            'overpayment_details': overpayment_details,
+            'overpayment_total': overpayment_total,
+            'university_name': getattr(settings, 'UNIVERSITY_NAME', 'MURANGA UNIVERSITY OF TECHNOLOGY '),
+            'university_address': getattr(settings, 'UNIVERSITY_ADDRESS', 'Muranga Town 351, Kiambu, Kenya'),
+            'university_contact': getattr(settings, 'UNIVERSITY_CONTACT', 'Tel: +254-763-7474893 | Email: finance@mutuniversity.edu'),
+            'logo_url': getattr(settings, 'LOGO_URL', ''),
+        }
+        
+        # Render HTML template
+        html_string = render_to_string('receipt/receipt_template.html', context)
+        
+        # Create PDF response
+        response = HttpResponse(content_type='application/pdf')
+        filename = f"Receipt-{payment.receipt_number}-{payment.payment_date.strftime('%Y%m%d')}.pdf"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        
+        # Generate PDF using WeasyPrint
+        font_config = FontConfiguration()
+        css = CSS(string='''
+            @page {
+                size: A4;
+                margin: 1cm;
+                @top-center {
+                    content: "OFFICIAL FEE PAYMENT RECEIPT";
+                    font-size: 12px;
+                    font-weight: bold;
+                }
+                @bottom-center {
+                    content: "Page " counter(page) " of " counter(pages);
+                    font-size: 10px;
+                }
+            }
+            body {
+                font-family: Arial, sans-serif;
+                font-size: 12px;
+                line-height: 1.4;
+            }
+            .header {
+                text-align: center;
+                margin-bottom: 20px;
+                border-bottom: 2px solid #000;
+                padding-bottom: 10px;
+            }
+            .university-name {
+                font-size: 18px;
+                font-weight: bold;
+                color: #003366;
+            }
+            .receipt-title {
+                font-size: 16px;
+                font-weight: bold;
+                text-align: center;
+                margin: 15px 0;
+                text-decoration: underline;
+            }
+            .section {
+                margin-bottom: 15px;
+            }
+            .section-title {
+                font-weight: bold;
+                background-color: #f0f0f0;
+                padding: 5px;
+                border: 1px solid #ddd;
+            }
+            .two-columns {
+                display: flex;
+                justify-content: space-between;
+            }
+            .column {
+                width: 48%;
+            }
+            table {
+                width: 100%;
+                border-collapse: collapse;
+                margin-bottom: 15px;
+            }
+            th, td {
+                border: 1px solid #ddd;
+                padding: 8px;
+                text-align: left;
+            }
+            th {
+                background-color: #f2f2f2;
+                font-weight: bold;
+            }
+            .total-row {
+                font-weight: bold;
+                background-color: #e6f2ff;
+            }
+            .balance-row {
+                font-weight: bold;
+                background-color: #ffffcc;
+            }
+            .signature-area {
+                margin-top: 50px;
+                border-top: 1px solid #000;
+                padding-top: 10px;
+            }
+            .footer {
+                margin-top: 30px;
+                font-size: 10px;
+                text-align: center;
+                color: #666;
+            }
+            .text-right {
+                text-align: right;
+            }
+            .text-center {
+                text-align: center;
+            }
+            .notes {
+                font-size: 10px;
+                margin-top: 20px;
+                padding: 10px;
+                background-color: #f9f9f9;
+                border: 1px solid #ddd;
+            }
+        ''', font_config=font_config)
+        
+        # Generate PDF
+        HTML(string=html_string).write_pdf(
+            response, 
+            stylesheets=[css],
+            font_config=font_config
+        )
+        
+        return response
+        
+    except Exception as e:
+        # Log the error
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Error generating PDF receipt for payment {payment_id}: {str(e)}")
+        
+        # Return error response
+        return HttpResponse(
+            f"Error generating PDF receipt: {str(e)}", 
+            status=500,
+            content_type='text/plain'
+        )
+
+
+# Alternative view for generating receipt data (for use with frontend PDF generation)
+@staff_member_required
+def get_receipt_data_json(request, payment_id):
+    """
+    Return receipt data as JSON for frontend PDF generation
+    """
+    from django.http import JsonResponse
+    
+    try:
+        payment = get_object_or_404(FeePayment, id=payment_id, payment_status='completed')
+        student = payment.student
+        fee_structure = payment.fee_structure
+        academic_year = fee_structure.academic_year
+        
+        # Calculate totals
+        total_payments = FeePayment.objects.filter(
+            student=student,
+            fee_structure=fee_structure,
+            payment_status='completed'
+        ).aggregate(total=Sum('amount_paid'))['total'] or Decimal('0.00')
+        
+        balance = fee_structure.net_fee() - total_payments
+        
+        receipt_data = {
+            'payment': {
+                'receipt_number': payment.receipt_number,
+                'amount_paid': str(payment.amount_paid),
+                'payment_date': payment.payment_date.strftime('%Y-%m-%d'),
+                'payment_method': payment.get_payment_method_display(),
+                'transaction_reference': payment.transaction_reference or '',
+                'mpesa_receipt': payment.mpesa_receipt or '',
+                'bank_slip_number': payment.bank_slip_number or '',
+                'remarks': payment.remarks or '',
+                'processed_by': payment.processed_by.get_full_name(),
+            },
+            'student': {
+                'student_id': student.student_id,
+                'name': student.user.get_full_name(),
+                'programme': student.programme.name,
+                'year': fee_structure.year,
+                'semester': fee_structure.semester,
+            },
+            'academic_year': {
+                'year': academic_year.year,
+            },
+            'fee_structure': {
+                'tuition_fee': str(fee_structure.tuition_fee),
+                'registration_fee': str(fee_structure.registration_fee),
+                'examination_fee': str(fee_structure.examination_fee),
+                'other_fees': str(fee_structure.other_fees),
+                'total_fee': str(fee_structure.total_fee()),
+                'government_subsidy': str(fee_structure.government_subsidy),
+                'scholarship_amount': str(fee_structure.scholarship_amount),
+                'net_fee': str(fee_structure.net_fee()),
+            },
+            'totals': {
+                'total_paid': str(total_payments),
+                'previous_payments': str(total_payments - payment.amount_paid),
+                'balance': str(balance),
+            }
+        }
+        
+        return JsonResponse({'success': True, 'data': receipt_data})
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@login_required
+@user_passes_test(is_admin_registrar_or_dean)
+def department_export(request):
+    """Export departments to CSV"""
+    
+    # Get filter parameters (same as list view)
+    search_query = request.GET.get('search', '').strip()
+    faculty_filter = request.GET.get('faculty', '')
+    status_filter = request.GET.get('status', '')
+    
+    # Apply same filters as list view
+    departments = Department.objects.select_related('faculty', 'head_of_department')
+    
+    if search_query:
+        departments = departments.filter(
+            Q(name__icontains=search_query) |
+            Q(code__icontains=search_query) |
+            Q(faculty__name__icontains=search_query) |
+            Q(description__icontains=search_query)
+        )
+    
+    if faculty_filter:
+        departments = departments.filter(faculty_id=faculty_filter)
+    
+    if status_filter:
+        if status_filter == 'active':
+            departments = departments.filter(is_active=True)
+        elif status_filter == 'inactive':
+            departments = departments.filter(is_active=False)
+    
+    departments = departments.order_by('faculty__name', 'name')
+    
+    # Create CSV response
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="departments_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv"'
+    
+    writer = csv.writer(response)
+    
+    # Write header
+    writer.writerow([
+        'Department Code',
+        'Department Name',
+        'Faculty',
+        'Head of Department',
+        'HOD Email',
+        'HOD Phone',
+        'Description',
+        'Established Date',
+        'Status',
+        'Created Date',
+    ])
+    
+    # Write data
+    for dept in departments:
+        writer.writerow([
+            dept.code,
+            dept.name,
+            dept.faculty.name,
+            dept.head_of_department.get_full_name() if dept.head_of_department else '',
+            dept.head_of_department.email if dept.head_of_department else '',
+            dept.head_of_department.phone if dept.head_of_department else '',
+            dept.description,
+            dept.established_date.strftime('%Y-%m-%d') if dept.established_date else '',
+            'Active' if dept.is_active else 'Inactive',
+            dept.created_at.strftime('%Y-%m-%d %H:%M:%S') if hasattr(dept, 'created_at') else '',
+        ])
+    
+    return response
+
+
+@login_required
+@user_passes_test(is_administrative_staff)
+def export_reporting_data(request):
+    """Export student reporting data as CSV"""
+    
+    import csv
+    from django.http import HttpResponse
+    
+    # Get filter parameters
+    programme_id = request.GET.get('programme')
+    faculty_id = request.GET.get('faculty')
+    
+    # Build queryset
+    reports = StudentReporting.objects.select_related(
+        'student__user',
+        'student__programme',
+        'semester__academic_year'
+    )
+    
+    if programme_id:
+        reports = reports.filter(student__programme_id=programme_id)
+    
+    if faculty_id:
+        reports = reports.filter(student__programme__faculty_id=faculty_id)
+    
+    # Create CSV response
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="student_reporting_data.csv"'
+    
+    writer = csv.writer(response)
+    writer.writerow([
+        'Student ID', 'Student Name', 'Programme', 'Academic Year',
+        'Semester', 'Reporting Date', 'Status', 'Processed By', 'Remarks'
+    ])
+    
+    for report in reports:
+        writer.writerow([
+            report.student.student_id,
+            report.student.user.get_full_name(),
+            report.student.programme.name,
+            report.semester.academic_year.year,
+            f'Semester {report.semester.semester_number}',
+            report.reporting_date.strftime('%Y-%m-%d %H:%M'),
+            report.get_status_display(),
+            report.processed_by.get_full_name() if report.processed_by else '',
+            report.remarks or ''
+        ])
+    
+    return response
+
+
+@login_required
+def download_eligible_students_csv(request, programme_id, course_id, semester_id):
+    """Download CSV of eligible students for exams"""
+    programme = get_object_or_404(Programme, id=programme_id)
+    course = get_object_or_404(Course, id=course_id)
+    semester = get_object_or_404(Semester, id=semester_id)
+    
+    # Get lecturer assignment
+    lecturer_assignment = LecturerCourseAssignment.objects.filter(
+        course=course,
+        academic_year=semester.academic_year,
+        semester=semester,
+        is_active=True
+    ).select_related('lecturer__user').first()
+    
+    # Get eligible students
+    enrollments = Enrollment.objects.filter(
+        course=course,
+        semester=semester,
+        is_active=True,
+        student__programme=programme
+    ).select_related('student__user', 'student__programme')
+    
+    # Get fee structure
+    fee_structure = FeeStructure.objects.filter(
+        programme=programme,
+        academic_year=semester.academic_year,
+        semester=semester.semester_number
+    ).first()
+    
+    # Create CSV response
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="exam_eligible_students_{course.code}_{semester.academic_year.year}_S{semester.semester_number}.csv"'
+    
+    writer = csv.writer(response)
+    
+    # Write header
+    writer.writerow([
+        'Student ID', 'Student Name', 'Programme', 'Year', 'Semester',
+        'Course Code', 'Course Name', 'Lecturer', 'Phone', 'Email',
+        'Required Fee', 'Amount Paid', 'Balance', 'Exam Eligible'
+    ])
+    
+    # Write student data
+    for enrollment in enrollments:
+        student = enrollment.student
+        
+        # Calculate fee eligibility
+        if fee_structure:
+            payments = FeePayment.objects.filter(
+                student=student,
+                fee_structure=fee_structure,
+                payment_status='completed'
+            ).aggregate(total=Sum('amount_paid'))['total'] or 0
+            
+            required_fee = fee_structure.net_fee()
+            fee_balance = required_fee - payments
+            is_eligible = fee_balance <= 0
+        else:
+            required_fee = 0
+            payments = 0
+            fee_balance = 0
+            is_eligible = True
+        
+        # Only include eligible students
+        if is_eligible:
+            writer.writerow([
+                student.student_id,
+                student.user.get_full_name(),
+                student.programme.name,
+                student.current_year,
+                semester.semester_number,
+                course.code,
+                course.name,
+                lecturer_assignment.lecturer.user.get_full_name() if lecturer_assignment else 'Not Assigned',
+                student.user.phone or 'N/A',
+                student.user.email,
+                f"{required_fee:,.2f}",
+                f"{payments:,.2f}",
+                f"{fee_balance:,.2f}",
+                'Yes' if is_eligible else 'No'
+            ])
+    
+    return response
+
+
+@login_required
+def download_all_students_csv(request, programme_id, course_id, semester_id):
+    """Download CSV of all students (both eligible and ineligible) for exams"""
+    programme = get_object_or_404(Programme, id=programme_id)
+    course = get_object_or_404(Course, id=course_id)
+    semester = get_object_or_404(Semester, id=semester_id)
+    
+    # Get lecturer assignment
+    lecturer_assignment = LecturerCourseAssignment.objects.filter(
+        course=course,
+        academic_year=semester.academic_year,
+        semester=semester,
+        is_active=True
+    ).select_related('lecturer__user').first()
+    
+    # Get all enrolled students
+    enrollments = Enrollment.objects.filter(
+        course=course,
+        semester=semester,
+        is_active=True,
+        student__programme=programme
+    ).select_related('student__user', 'student__programme')
+    
+    # Get fee structure
+    fee_structure = FeeStructure.objects.filter(
+        programme=programme,
+        academic_year=semester.academic_year,
+        semester=semester.semester_number
+    ).first()
+    
+    # Create CSV response
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="all_students_{course.code}_{semester.academic_year.year}_S{semester.semester_number}.csv"'
+    
+    writer = csv.writer(response)
+    
+    # Write header
+    writer.writerow([
+        'Student ID', 'Student Name', 'Programme', 'Year', 'Semester',
+        'Course Code', 'Course Name', 'Lecturer', 'Phone', 'Email',
+        'Required Fee', 'Amount Paid', 'Balance', 'Exam Eligible', 'Status'
+    ])
+    
+    # Write student data
+    for enrollment in enrollments:
+        student = enrollment.student
+        
+        # Calculate fee eligibility
+        if fee_structure:
+            payments = FeePayment.objects.filter(
+                student=student,
+                fee_structure=fee_structure,
+                payment_status='completed'
+            ).aggregate(total=Sum('amount_paid'))['total'] or 0
+            
+            required_fee = fee_structure.net_fee()
+            fee_balance = required_fee - payments
+            is_eligible = fee_balance <= 0
+        else:
+            required_fee = 0
+            payments = 0
+            fee_balance = 0
+            is_eligible = True
+        
+        writer.writerow([
+            student.student_id,
+            student.user.get_full_name(),
+            student.programme.name,
+            student.current_year,
+            semester.semester_number,
+            course.code,
+            course.name,
+            lecturer_assignment.lecturer.user.get_full_name() if lecturer_assignment else 'Not Assigned',
+            student.user.phone or 'N/A',
+            student.user.email,
+            f"{required_fee:,.2f}",
+            f"{payments:,.2f}",
+            f"{fee_balance:,.2f}",
+            'Yes' if is_eligible else 'No',
+            student.status.title()
+        ])
+    
+    return response
+
+
+@login_required
+@user_passes_test(is_admin)
+def download_transcript_pdf(request, student_id):
+    """Generate and download beautiful HTML-based transcript PDF"""
+    import pdfkit
+
+    student = get_object_or_404(Student, student_id=student_id)
+    
+    # Get transcript data
+    enrollments = Enrollment.objects.filter(
+        student=student
+    ).select_related(
+        'course', 'semester', 'semester__academic_year'
+    ).prefetch_related('grade').order_by(
+        'semester__academic_year__start_date', 'semester__semester_number', 'course__name'
+    )
+    
+    # Calculate GPA and other metrics
+    transcript_data, stats = calculate_transcript_data(enrollments, student)
+    
+    # Prepare context for template
+    context = {
+        'student': student,
+        'programme': student.programme,
+        'faculty': student.programme.faculty,
+        'department': student.programme.department,
+        'transcript_data': transcript_data,
+        'stats': stats,
+        'generated_date': timezone.now(),
+        'university_name': 'MURANGA UNIVERSITY OF TECHNOLOGY',
+        'grading_system': get_grading_system(),
+    }
+    
+    # Render HTML template
+    html_string = render_to_string('transcripts/transcript_template.html', context)
+    
+    # Generate PDF from HTML
+    try:
+        # Configure wkhtmltopdf options
+        options = {
+            'page-size': 'A4',
+            'margin-top': '0.5in',
+            'margin-right': '0.5in',
+            'margin-bottom': '0.5in',
+            'margin-left': '0.5in',
+            'encoding': "UTF-8",
+            'no-outline': None,
+            'enable-local-file-access': None,
+            'print-media-type': None,
+        }
+        
+        # Generate PDF
+        config = pdfkit.configuration(wkhtmltopdf=settings.WKHTMLTOPDF_CMD)
+        pdf = pdfkit.from_string(html_string, False, options=options, configuration=config)
+        
+        
+        # Create response
+        response = HttpResponse(pdf, content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="transcript_{student.student_id}.pdf"'
+        
+        return response
+        
+    except Exception as e:
+        messages.error(request, f'Error generating PDF: {str(e)}')
+        return redirect('admin_student_transcript', student_id=student_id)
+
+
+@login_required
+@user_passes_test(is_admin)
+def download_certificate_pdf(request, student_id):
+    """Generate completion certificate for graduated students"""
+    import pdfkit
+
+    student = get_object_or_404(Student, student_id=student_id)
+    
+    # Get transcript data to check completion
+    enrollments = Enrollment.objects.filter(student=student).prefetch_related('grade')
+    transcript_data, stats = calculate_transcript_data(enrollments,  student)
+    
+    if not stats['programme_completed']:
+        messages.error(request, 'Certificate can only be generated for students who have completed their programme.')
+        return redirect('admin_student_transcript', student_id=student_id)
+    
+    # Prepare context for certificate template
+    context = {
+        'student': student,
+        'programme': student.programme,
+        'faculty': student.programme.faculty,
+        'department': student.programme.department,
+        'stats': stats,
+        'completion_date': timezone.now().date(),
+        'generated_date': timezone.now(),
+        'university_name': 'MURANGA UNIVERSITY OF TECHNOLOGY',
+        'university_motto': 'INNOVATING FOR DEVELOPMENT',
+    }
+    
+    # Render HTML template
+    html_string = render_to_string('certificates/certificate_template.html', context)
+    
+    # Generate PDF from HTML
+    try:
+        # Configure wkhtmltopdf options for certificate (landscape might be better)
+        options = {
+            'page-size': 'A4',
+            'orientation': 'Landscape',
+            'margin-top': '0.3in',
+            'margin-right': '0.3in',
+            'margin-bottom': '0.3in',
+            'margin-left': '0.3in',
+            'encoding': "UTF-8",
+            'no-outline': None,
+            'enable-local-file-access': None,
+            'print-media-type': None,
+        }
+        
+        # Generate PDF
+       
+        config = pdfkit.configuration(wkhtmltopdf=settings.WKHTMLTOPDF_CMD)
+        pdf = pdfkit.from_string(html_string, False, options=options, configuration=config)
+        
+        # Create response
+        response = HttpResponse(pdf, content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="certificate_{student.student_id}.pdf"'
+        
+        return response
+        
+    except Exception as e:
+        messages.error(request, f'Error generating certificate PDF: {str(e)}')
+        return redirect('admin_student_transcript', student_id=student_id)
+
+
+@login_required
+def dean_lecturer_export(request):
+    """
+    Export lecturers list to CSV - Dean's faculty only
+    """
+    if request.user.user_type != 'dean':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    faculty = request.role.faculty
+    if not faculty:
+        messages.error(request, "Faculty not found.")
+        return redirect('dashboard')
+    
+    # Get lecturers in dean's faculty
+    lecturers = Lecturer.objects.filter(
+        department__faculty=faculty
+    ).select_related('user', 'department').order_by('employee_number')
+    
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{faculty.code}_lecturers_{timezone.now().strftime("%Y%m%d")}.csv"'
+    
+    writer = csv.writer(response)
+    writer.writerow([
+        'Employee Number', 'First Name', 'Last Name', 'Email', 'Phone',
+        'Department', 'Academic Rank', 'Employment Type', 'Joining Date',
+        'Teaching Experience', 'Highest Qualification', 'Status'
+    ])
+    
+    for lecturer in lecturers:
+        writer.writerow([
+            lecturer.employee_number,
+            lecturer.user.first_name,
+            lecturer.user.last_name,
+            lecturer.user.email,
+            lecturer.user.phone,
+            lecturer.department.name,
+            lecturer.get_academic_rank_display(),
+            lecturer.get_employment_type_display(),
+            lecturer.joining_date.strftime('%Y-%m-%d'),
+            lecturer.teaching_experience_years,
+            lecturer.highest_qualification,
+            'Active' if lecturer.is_active else 'Inactive'
+        ])
+    
+    return response
+
+
+@login_required
+@cod_required
+def download_students_csv(request, programme_id, year):
+    """Download list of students for a specific programme and year"""
+    department = request.role.department
+    
+    try:
+        programme = Programme.objects.get(
+            id=programme_id,
+            department=department,
+            is_active=True
+        )
+    except Programme.DoesNotExist:
+        messages.error(request, 'Programme not found.')
+        return redirect('cod_department_info')
+    
+    # Get students
+    students = Student.objects.filter(
+        programme=programme,
+        current_year=year,
+        status='active'
+    ).select_related('user').order_by('student_id')
+    
+    # Create CSV response
+    response = HttpResponse(content_type='text/csv')
+    filename = f'{programme.code}_Year{year}_Students.csv'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    
+    writer = csv.writer(response)
+    writer.writerow([
+        'Student ID',
+        'First Name',
+        'Last Name',
+        'Email',
+        'Phone',
+        'Programme Name',
+        'Programme Code',
+        'Year of Study',
+        'Status',
+        'Admission Date',
+        'Gender',
+        'National ID'
+    ])
+    
+    for student in students:
+        writer.writerow([
+            student.student_id,
+            student.user.first_name,
+            student.user.last_name,
+            student.user.email,
+            student.user.phone,
+            programme.name,
+            programme.code,
+            year,
+            student.get_status_display(),
+            student.admission_date,
+            student.user.get_gender_display() if student.user.gender else '',
+            student.user.national_id or ''
+        ])
+    
+    return response
+
+
+@login_required
+@cod_required
+def download_all_programme_students_csv(request, programme_id):
+    """Download all students for a specific programme (all years)"""
+    department = request.role.department
+    
+    try:
+        programme = Programme.objects.get(
+            id=programme_id,
+            department=department,
+            is_active=True
+        )
+    except Programme.DoesNotExist:
+        messages.error(request, 'Programme not found.')
+        return redirect('cod_department_info')
+    
+    # Get all active students in programme
+    students = Student.objects.filter(
+        programme=programme,
+        status='active'
+    ).select_related('user').order_by('current_year', 'student_id')
+    
+    # Create CSV response
+    response = HttpResponse(content_type='text/csv')
+    filename = f'{programme.code}_All_Students.csv'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    
+    writer = csv.writer(response)
+    writer.writerow([
+        'Student ID',
+        'First Name',
+        'Last Name',
+        'Email',
+        'Phone',
+        'Programme Name',
+        'Programme Code',
+        'Year of Study',
+        'Status',
+        'Admission Date',
+        'Gender',
+        'National ID'
+    ])
+    
+    for student in students:
+        writer.writerow([
+            student.student_id,
+            student.user.first_name,
+            student.user.last_name,
+            student.user.email,
+            student.user.phone,
+            programme.name,
+            programme.code,
+            student.current_year,
+            student.get_status_display(),
+            student.admission_date,
+            student.user.get_gender_display() if student.user.gender else '',
+            student.user.national_id or ''
+        ])
+    
+    return response
+
+
+@login_required
+def cod_download_results_excel(request):
+    """Download results in Excel format"""
+    import openpyxl
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+    from openpyxl.utils import get_column_letter
+
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    # Get filter parameters
+    programme_id = request.GET.get('programme')
+    year = request.GET.get('year')
+    semester_id = request.GET.get('semester')
+    academic_year_id = request.GET.get('academic_year')
+    
+    # Validate required parameters
+    if not programme_id or not year or not academic_year_id:
+        messages.error(request, "Please select Programme, Year, and Academic Year.")
+        return redirect('cod_view_results')
+    
+    # Get objects
+    programme = get_object_or_404(Programme, id=programme_id, department=department)
+    academic_year = get_object_or_404(AcademicYear, id=academic_year_id)
+    
+    if semester_id:
+        semester = get_object_or_404(Semester, id=semester_id, academic_year=academic_year)
+        semesters = [semester]
+    else:
+        semesters = academic_year.semesters.all().order_by('semester_number')
+    
+    # Get students
+    students = Student.objects.filter(
+        programme=programme,
+        current_year=year,
+        status='active'
+    ).select_related('user').order_by('student_id')
+    
+    # Create Excel workbook
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    
+    # Define styles
+    header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+    header_font = Font(bold=True, color='FFFFFF', size=12)
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    
+    for semester in semesters:
+        # Create sheet for each semester
+        ws = wb.create_sheet(title=f"Semester {semester.semester_number}")
+        
+        # Title
+        ws.merge_cells('A1:H1')
+        title_cell = ws['A1']
+        title_cell.value = f"{department.name} - {programme.name}"
+        title_cell.font = Font(bold=True, size=14)
+        title_cell.alignment = Alignment(horizontal='center')
+        
+        ws.merge_cells('A2:H2')
+        subtitle_cell = ws['A2']
+        subtitle_cell.value = f"Year {year} - {academic_year.year} - Semester {semester.semester_number}"
+        subtitle_cell.font = Font(size=12)
+        subtitle_cell.alignment = Alignment(horizontal='center')
+        
+        # Headers
+        headers = ['Student ID', 'Name', 'Email']
+        
+        # Get all courses for this semester
+        courses = Course.objects.filter(
+            course_programmes__programme=programme,
+            course_programmes__year=year,
+            course_programmes__semester=semester.semester_number
+        ).order_by('code')
+        
+        for course in courses:
+            headers.extend([
+                f"{course.code} Grade",
+                f"{course.code} Marks"
+            ])
+        
+        headers.extend(['Semester GPA', 'Cumulative GPA', 'Status'])
+        
+        # Write headers
+        for col, header in enumerate(headers, start=1):
+            cell = ws.cell(row=4, column=col)
+            cell.value = header
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.border = border
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+        
+        # Write data
+        row = 5
+        for student in students:
+            col = 1
+            
+            # Student info
+            ws.cell(row=row, column=col, value=student.student_id).border = border
+            col += 1
+            ws.cell(row=row, column=col, value=student.user.get_full_name()).border = border
+            col += 1
+            ws.cell(row=row, column=col, value=student.user.email).border = border
+            col += 1
+            
+            # Course grades
+            total_quality_points = 0
+            total_credit_hours = 0
+            
+            for course in courses:
+                try:
+                    enrollment = Enrollment.objects.get(
+                        student=student,
+                        course=course,
+                        semester=semester
+                    )
+                    grade = enrollment.grade
+                    
+                    ws.cell(row=row, column=col, value=grade.grade).border = border
+                    col += 1
+                    ws.cell(row=row, column=col, value=float(grade.total_marks) if grade.total_marks else 0).border = border
+                    col += 1
+                    
+                    if grade.grade_points and grade.quality_points:
+                        total_quality_points += float(grade.quality_points)
+                        total_credit_hours += course.credit_hours
+                        
+                except (Enrollment.DoesNotExist, Grade.DoesNotExist):
+                    ws.cell(row=row, column=col, value='N/A').border = border
+                    col += 1
+                    ws.cell(row=row, column=col, value=0).border = border
+                    col += 1
+            
+            # Calculate GPA
+            semester_gpa = (total_quality_points / total_credit_hours) if total_credit_hours > 0 else 0
+            
+            ws.cell(row=row, column=col, value=round(semester_gpa, 2)).border = border
+            col += 1
+            ws.cell(row=row, column=col, value=float(student.cumulative_gpa) if student.cumulative_gpa else 0).border = border
+            col += 1
+            ws.cell(row=row, column=col, value=student.status).border = border
+            
+            row += 1
+        
+        # Auto-adjust column widths
+        for column in ws.columns:
+            max_length = 0
+            column_letter = get_column_letter(column[0].column)
+            for cell in column:
+                try:
+                    if len(str(cell.value)) > max_length:
+                        max_length = len(cell.value)
+                except:
+                    pass
+            adjusted_width = min(max_length + 2, 50)
+            ws.column_dimensions[column_letter].width = adjusted_width
+    
+    # Prepare response
+    output = BytesIO()
+    wb.save(output)
+    output.seek(0)
+    
+    filename = f"{programme.code}_Year{year}_{academic_year.year}_Results.xlsx"
+    response = HttpResponse(
+        output.read(),
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    
+    return response
+
+
+@login_required
+def cod_download_promotion_list(request):
+    """Download promotion eligible students list"""
+    import openpyxl
+    from openpyxl.styles import Alignment, Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    # Get filter parameters
+    programme_id = request.GET.get('programme')
+    year = request.GET.get('year')
+    academic_year_id = request.GET.get('academic_year')
+    eligible_only = request.GET.get('eligible_only', 'false') == 'true'
+    
+    if not academic_year_id:
+        messages.error(request, "Please select an Academic Year.")
+        return redirect('cod_promotion_analysis')
+    
+    academic_year = get_object_or_404(AcademicYear, id=academic_year_id)
+    
+    # Create Excel workbook
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Promotion List"
+    
+    # Define styles
+    header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+    header_font = Font(bold=True, color='FFFFFF', size=12)
+    eligible_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
+    not_eligible_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+    
+    # Title
+    ws.merge_cells('A1:J1')
+    title_cell = ws['A1']
+    title_cell.value = f"{department.name} - Promotion Analysis"
+    title_cell.font = Font(bold=True, size=14)
+    title_cell.alignment = Alignment(horizontal='center')
+    
+    ws.merge_cells('A2:J2')
+    subtitle_cell = ws['A2']
+    subtitle_cell.value = f"Academic Year: {academic_year.year}"
+    subtitle_cell.font = Font(size=12)
+    subtitle_cell.alignment = Alignment(horizontal='center')
+    
+    # Headers
+    headers = [
+        'Student ID', 'Name', 'Programme', 'Current Year',
+        'Total Courses', 'Passed', 'Failed', 'Year GPA',
+        'Cumulative GPA', 'Eligible for Promotion'
+    ]
+    
+    for col, header in enumerate(headers, start=1):
+        cell = ws.cell(row=4, column=col)
+        cell.value = header
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+    
+    # Get students and analyze
+    students = Student.objects.filter(
+        programme__department=department,
+        status='active'
+    ).select_related('user', 'programme')
+    
+    if programme_id:
+        students = students.filter(programme_id=programme_id)
+    
+    if year:
+        students = students.filter(current_year=year)
+    
+    row = 5
+    for student in students:
+        enrollments = Enrollment.objects.filter(
+            student=student,
+            semester__academic_year=academic_year,
+            is_active=True
+        )
+        
+        total_courses = enrollments.count()
+        if total_courses == 0:
+            continue
+        
+        passed_courses = 0
+        failed_courses = 0
+        total_quality_points = 0
+        total_credit_hours = 0
+        
+        for enrollment in enrollments:
+            try:
+                grade = enrollment.grade
+                if grade.is_passed:
+                    passed_courses += 1
+                else:
+                    failed_courses += 1
+                
+                if grade.grade_points and grade.quality_points:
+                    total_quality_points += float(grade.quality_points)
+                    total_credit_hours += enrollment.course.credit_hours
+            except Grade.DoesNotExist:
+                failed_courses += 1
+        
+        year_gpa = (total_quality_points / total_credit_hours) if total_credit_hours > 0 else 0
+        eligible = failed_courses == 0 and year_gpa >= 2.0
+        
+        if eligible_only and not eligible:
+            continue
+        
+        # Write data
+        ws.cell(row=row, column=1, value=student.student_id)
+        ws.cell(row=row, column=2, value=student.user.get_full_name())
+        ws.cell(row=row, column=3, value=student.programme.name)
+        ws.cell(row=row, column=4, value=student.current_year)
+        ws.cell(row=row, column=5, value=total_courses)
+        ws.cell(row=row, column=6, value=passed_courses)
+        ws.cell(row=row, column=7, value=failed_courses)
+        ws.cell(row=row, column=8, value=round(year_gpa, 2))
+        ws.cell(row=row, column=9, value=float(student.cumulative_gpa) if student.cumulative_gpa else 0)
+        ws.cell(row=row, column=10, value='Yes' if eligible else 'No')
+        
+        # Apply conditional formatting
+        fill = eligible_fill if eligible else not_eligible_fill
+        for col in range(1, 11):
+            ws.cell(row=row, column=col).fill = fill
+        
+        row += 1
+    
+    # Auto-adjust column widths
+    for column in ws.columns:
+        max_length = 0
+        column_letter = get_column_letter(column[0].column)
+        for cell in column:
+            try:
+                if len(str(cell.value)) > max_length:
+                    max_length = len(cell.value)
+            except:
+                pass
+        adjusted_width = min(max_length + 2, 50)
+        ws.column_dimensions[column_letter].width = adjusted_width
+    
+    # Prepare response
+    output = BytesIO()
+    wb.save(output)
+    output.seek(0)
+    
+    filename = f"Promotion_List_{academic_year.year}.xlsx"
+    response = HttpResponse(
+        output.read(),
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    
+    return response
+
+
+@login_required
+def cod_download_transcript_pdf(request, student_id):
+    """Generate and download student transcript as PDF"""
+    from weasyprint import HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    user = request.user
+    
+    # Get COD's department
+    try:
+        department = request.role.get_department()
+    except Department.DoesNotExist:
+        messages.error(request, "You are not assigned as Head of any department.")
+        return redirect('cod_dashboard')
+    
+    # Get student
+    student = get_object_or_404(
+        Student.objects.select_related('user', 'programme'),
+        student_id=student_id,
+        programme__department=department
+    )
+    
+    # Get all academic years with results
+    academic_years = AcademicYear.objects.filter(
+        semesters__enrollments__student=student
+    ).distinct().order_by('-year')
+    
+    # Organize results
+    results_by_year = []
+    overall_stats = {
+        'total_courses': 0,
+        'passed_courses': 0,
+        'total_credit_hours': 0,
+        'total_quality_points': 0,
+    }
+    
+    for academic_year in academic_years:
+        semesters_data = []
+        
+        for semester in academic_year.semesters.filter(
+            enrollments__student=student
+        ).distinct().order_by('semester_number'):
+            
+            enrollments = Enrollment.objects.filter(
+                student=student,
+                semester=semester
+            ).select_related('course', 'grade').order_by('course__code')
+            
+            semester_quality_points = 0
+            semester_credit_hours = 0
+            grades_list = []
+            
+            for enrollment in enrollments:
+                try:
+                    grade = enrollment.grade
+                    grades_list.append({
+                        'course': enrollment.course,
+                        'grade': grade,
+                    })
+                    
+                    if grade.grade_points and grade.quality_points:
+                        semester_quality_points += float(grade.quality_points)
+                        semester_credit_hours += enrollment.course.credit_hours
+                        overall_stats['total_quality_points'] += float(grade.quality_points)
+                        overall_stats['total_credit_hours'] += enrollment.course.credit_hours
+                    
+                    if grade.is_passed:
+                        overall_stats['passed_courses'] += 1
+                    
+                    overall_stats['total_courses'] += 1
+                    
+                except Grade.DoesNotExist:
+                    grades_list.append({
+                        'course': enrollment.course,
+                        'grade': None,
+                    })
+                    overall_stats['total_courses'] += 1
+            
+            semester_gpa = (semester_quality_points / semester_credit_hours) if semester_credit_hours > 0 else 0
+            
+            semesters_data.append({
+                'semester': semester,
+                'grades': grades_list,
+                'semester_gpa': round(semester_gpa, 2),
+            })
+        
+        results_by_year.append({
+            'academic_year': academic_year,
+            'semesters': semesters_data,
+        })
+    
+    # Calculate overall GPA and class
+    overall_gpa = (overall_stats['total_quality_points'] / overall_stats['total_credit_hours']) if overall_stats['total_credit_hours'] > 0 else 0
+    
+    if overall_gpa >= 3.7:
+        class_standing = "First Class Honours"
+    elif overall_gpa >= 3.0:
+        class_standing = "Second Class Honours (Upper Division)"
+    elif overall_gpa >= 2.0:
+        class_standing = "Second Class Honours (Lower Division)"
+    elif overall_gpa >= 1.5:
+        class_standing = "Pass"
+    else:
+        class_standing = "Below Pass Standard"
+    
+    # Prepare context for PDF
+    context = {
+        'student': student,
+        'department': department,
+        'results_by_year': results_by_year,
+        'overall_gpa': round(overall_gpa, 2),
+        'class_standing': class_standing,
+        'total_credit_hours': overall_stats['total_credit_hours'],
+        'generated_date': timezone.now(),
+        'generated_by': user,
+    }
+    
+    # Render HTML template
+    html_string = render_to_string('cod/consultation/transcript_pdf.html', context)
+    
+    # Generate PDF
+    font_config = FontConfiguration()
+    html = HTML(string=html_string)
+    
+    # Create temporary file
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as output:
+        html.write_pdf(output, font_config=font_config)
+        output.seek(0)
+        pdf_content = output.read()
+    
+    # Prepare response
+    response = HttpResponse(pdf_content, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="Transcript_{student.student_id}_{timezone.now().strftime("%Y%m%d")}.pdf"'
+    
+    return response
+
+
+@login_required
+def cod_download_exam_attendance_sheet(request):
+    """Generate and download exam attendance sheet in Excel format"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+    
+    # Verify user is COD
+    if request.user.user_type != 'cod':
+        messages.error(request, "Access denied.")
+        return redirect('dashboard')
+    
+    # Get filter parameters
+    programme_id = request.GET.get('programme')
+    year = request.GET.get('year')
+    academic_year_id = request.GET.get('academic_year')
+    semester_id = request.GET.get('semester')
+    course_id = request.GET.get('course')
+    include_fee_balance = request.GET.get('include_fee_balance', 'no')
+    
+    # Validate required parameters
+    if not all([programme_id, year, academic_year_id, semester_id, course_id]):
+        messages.error(request, "Please fill all required fields.")
+        return redirect('cod_generate_exam_list')
+    
+    try:
+        # Get objects
+        programme = Programme.objects.get(id=programme_id)
+        academic_year = AcademicYear.objects.get(id=academic_year_id)
+        semester = Semester.objects.get(id=semester_id)
+        course = Course.objects.get(id=course_id)
+        
+        # Get course assignment (lecturer info)
+        course_assignment = LecturerCourseAssignment.objects.filter(
+            course=course,
+            academic_year=academic_year,
+            semester=semester,
+            is_active=True
+        ).first()
+        
+        # Base query for enrolled students
+        enrollments = Enrollment.objects.filter(
+            course=course,
+            semester=semester,
+            is_active=True,
+            student__programme=programme,
+            student__current_year=year,
+            student__status='active'
+        ).select_related(
+            'student__user',
+            'student__programme'
+        ).order_by('student__user__last_name', 'student__user__first_name')
+        
+        # Students list
+        students_list = []
+        
+        # Regular enrolled students
+        for enrollment in enrollments:
+            student = enrollment.student
+            
+            # Check fee payment status
+            if include_fee_balance == 'no':
+                # Only include students with no fee balance
+                fee_status = get_student_fee_status(student, semester)
+                if fee_status['has_balance']:
+                    continue
+            
+            # Get fee balance
+            fee_info = get_student_fee_status(student, semester)
+            
+            students_list.append({
+                'student': student,
+                'enrollment_type': 'Regular',
+                'fee_balance': fee_info['balance'],
+                'is_fully_paid': not fee_info['has_balance']
+            })
+        
+        # Students with approved special exam applications
+        special_exam_students = SpecialExamApplication.objects.filter(
+            course=course,
+            semester=semester,
+            student__programme=programme,
+            student__current_year=year,
+            status__in=['approved', 'scheduled'],
+            student__status='active'
+        ).select_related('student__user')
+        
+        for application in special_exam_students:
+            student = application.student
+            
+            # Check if student already in list (from regular enrollment)
+            if not any(s['student'].id == student.id for s in students_list):
+                fee_info = get_student_fee_status(student, semester)
+                
+                students_list.append({
+                    'student': student,
+                    'enrollment_type': 'Special Exam',
+                    'special_exam_date': application.scheduled_exam_date,
+                    'fee_balance': fee_info['balance'],
+                    'is_fully_paid': not fee_info['has_balance']
+                })
+        
+        # Generate Excel file
+        wb = Workbook()
+        ws = wb.active
+        ws.title = f"{course.code} Attendance"
+        
+        # Styling
+        header_fill = PatternFill(start_color="0066CC", end_color="0066CC", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=11)
+        title_font = Font(bold=True, size=14)
+        border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        
+        # Document Header
+        current_row = 1
+        
+        # University/Institution Name (you can customize)
+        ws.merge_cells(f'A{current_row}:H{current_row}')
+        ws[f'A{current_row}'] = "UNIVERSITY EXAMINATION ATTENDANCE SHEET"
+        ws[f'A{current_row}'].font = Font(bold=True, size=16)
+        ws[f'A{current_row}'].alignment = Alignment(horizontal='center', vertical='center')
+        current_row += 2
+        
+        # Course Information
+        info_data = [
+            ['Programme:', programme.name, 'Course Code:', course.code],
+            ['Department:', programme.department.name, 'Course Name:', course.name],
+            ['Academic Year:', academic_year.year, 'Year of Study:', f'Year {year}'],
+            ['Semester:', f'Semester {semester.semester_number}', 'Credit Hours:', course.credit_hours],
+        ]
+        
+        if course_assignment:
+            info_data.append([
+                'Lecturer:', 
+                course_assignment.lecturer.user.get_full_name(),
+                'Date:', 
+                datetime.now().strftime('%d/%m/%Y')
+            ])
+        else:
+            info_data.append(['Date:', datetime.now().strftime('%d/%m/%Y'), '', ''])
+        
+        for row_data in info_data:
+            for col_idx, value in enumerate(row_data, 1):
+                cell = ws.cell(row=current_row, column=col_idx, value=value)
+                if col_idx % 2 == 1:  # Labels
+                    cell.font = Font(bold=True)
+            current_row += 1
+        
+        current_row += 1
+        
+        # Table Headers
+        headers = [
+            'No.',
+            'Student ID',
+            'Full Name',
+            'Type',
+            'Fee Status',
+            'Signature',
+            'Sheet Code',
+            'Remarks'
+        ]
+        
+        for col_idx, header in enumerate(headers, 1):
+            cell = ws.cell(row=current_row, column=col_idx, value=header)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+            cell.border = border
+        
+        # Set row height for header
+        ws.row_dimensions[current_row].height = 25
+        current_row += 1
+        
+        # Student Data
+        for idx, student_data in enumerate(students_list, 1):
+            student = student_data['student']
+            
+            # Prepare row data
+            row_data = [
+                idx,
+                student.student_id,
+                student.user.get_full_name(),
+                student_data['enrollment_type'],
+                'Paid' if student_data['is_fully_paid'] else f"Balance: {student_data['fee_balance']}",
+                '',  # Signature column (empty for manual signing)
+                '',  # Sheet code column (empty for student to fill)
+                ''   # Remarks
+            ]
+            
+            # Write row
+            for col_idx, value in enumerate(row_data, 1):
+                cell = ws.cell(row=current_row, column=col_idx, value=value)
+                cell.border = border
+                cell.alignment = Alignment(horizontal='left' if col_idx > 1 else 'center', vertical='center')
+                
+                # Color code fee status
+                if col_idx == 5:  # Fee Status column
+                    if student_data['is_fully_paid']:
+                        cell.fill = PatternFill(start_color="D4EDDA", end_color="D4EDDA", fill_type="solid")
+                    else:
+                        cell.fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
+            
+            # Set row height
+            ws.row_dimensions[current_row].height = 30
+            current_row += 1
+        
+        # Summary section
+        current_row += 2
+        ws.merge_cells(f'A{current_row}:B{current_row}')
+        ws[f'A{current_row}'] = f"Total Students: {len(students_list)}"
+        ws[f'A{current_row}'].font = Font(bold=True, size=12)
+        current_row += 1
+        
+        paid_students = sum(1 for s in students_list if s['is_fully_paid'])
+        ws.merge_cells(f'A{current_row}:B{current_row}')
+        ws[f'A{current_row}'] = f"Students with Full Payment: {paid_students}"
+        ws[f'A{current_row}'].font = Font(bold=True)
+        current_row += 1
+        
+        balance_students = len(students_list) - paid_students
+        ws.merge_cells(f'A{current_row}:B{current_row}')
+        ws[f'A{current_row}'] = f"Students with Fee Balance: {balance_students}"
+        ws[f'A{current_row}'].font = Font(bold=True)
+        current_row += 1
+        
+        special_exam_count = sum(1 for s in students_list if s['enrollment_type'] == 'Special Exam')
+        ws.merge_cells(f'A{current_row}:B{current_row}')
+        ws[f'A{current_row}'] = f"Special Exam Students: {special_exam_count}"
+        ws[f'A{current_row}'].font = Font(bold=True)
+        
+        # Signature section
+        current_row += 3
+        ws.merge_cells(f'A{current_row}:C{current_row}')
+        ws[f'A{current_row}'] = "Lecturer's Signature: ___________________________"
+        current_row += 2
+        
+        ws.merge_cells(f'A{current_row}:C{current_row}')
+        ws[f'A{current_row}'] = "Invigilator's Signature: ___________________________"
+        
+        # Column widths
+        column_widths = {
+            'A': 6,   # No.
+            'B': 15,  # Student ID
+            'C': 30,  # Full Name
+            'D': 15,  # Type
+            'E': 20,  # Fee Status
+            'F': 25,  # Signature
+            'G': 20,  # Sheet Code
+            'H': 20   # Remarks
+        }
+        
+        for col, width in column_widths.items():
+            ws.column_dimensions[col].width = width
+        
+        # Prepare response
+        response = HttpResponse(
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+        filename = f"Exam_Attendance_{course.code}_{programme.code}_Y{year}_{academic_year.year.replace('/', '-')}_S{semester.semester_number}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        
+        wb.save(response)
+        return response
+        
+    except Programme.DoesNotExist:
+        messages.error(request, "Programme not found.")
+    except Course.DoesNotExist:
+        messages.error(request, "Course not found.")
+    except Exception as e:
+        messages.error(request, f"Error generating attendance sheet: {str(e)}")
+    
+    return redirect('cod_generate_exam_list')
@@ -0,0 +1,1843 @@
+# hostel.py - Hostel booking for students and hostel administration
+
+import json
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Q
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods, require_POST
+
+from ..models import (
+    AcademicYear, Bed, Hostel, HostelBooking, HostelIncident, HostelPayment, Room, Student,
+)
+
+
+@login_required
+def hostel_booking_eligibility(request):
+    """Check if student is eligible for hostel booking"""
+    try:
+        student = request.role.get_student()
+        
+        # Check if student is in year 1
+        if student.current_year != 1:
+            messages.error(request, "Only first-year students are eligible for hostel booking.")
+            return redirect('student_dashboard')
+        
+        # Check if student is active
+        if student.status != 'active':
+            messages.error(request, "Only active students can book hostels.")
+            return redirect('student_dashboard')
+        
+        # Get current academic year
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        if not current_academic_year:
+            messages.error(request, "No current academic year found.")
+            return redirect('student_dashboard')
+        
+        # Check if student already has a booking for current academic year
+        existing_booking = HostelBooking.objects.filter(
+            student=student,
+            academic_year=current_academic_year
+        ).first()
+        
+        if existing_booking:
+            messages.info(request, f"You already have a hostel booking for {current_academic_year.year}.")
+            return redirect('hostel_booking_detail', booking_id=existing_booking.id)
+        
+        return redirect('hostel_list')
+        
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('student_dashboard')
+
+
+@login_required
+def hostel_list(request):
+    """Display available hostels based on student's gender"""
+    try:
+        student = request.role.get_student()
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        
+        if not current_academic_year:
+            messages.error(request, "No current academic year found.")
+            return redirect('dashboard')
+        
+        # Determine hostel type based on student's gender
+        if student.user.gender == 'male':
+            hostel_type = 'boys'
+        elif student.user.gender == 'female':
+            hostel_type = 'girls'
+        else:
+            messages.error(request, "Please update your gender in profile to book hostel.")
+            return redirect('student_profile')
+        
+        # Get active hostels for the student's school and gender
+        hostels = Hostel.objects.filter(
+            hostel_type=hostel_type,
+            #school=student.programme.school,
+            is_active=True
+        )
+        
+        # Add availability information to each hostel
+        hostel_data = []
+        for hostel in hostels:
+            total_beds = hostel.get_total_beds_count(current_academic_year)
+            occupied_beds = hostel.get_occupied_beds_count(current_academic_year)
+            available_beds = total_beds - occupied_beds
+            
+            hostel_data.append({
+                'hostel': hostel,
+                'total_beds': total_beds,
+                'occupied_beds': occupied_beds,
+                'available_beds': available_beds,
+                'occupancy_rate': (occupied_beds / total_beds * 100) if total_beds > 0 else 0
+            })
+        
+        context = {
+            'hostel_data': hostel_data,
+            'student': student,
+            'academic_year': current_academic_year,
+        }
+        
+        return render(request, 'hostels/hostel_list.html', context)
+        
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('student_dashboard')
+
+
+@login_required
+def room_list(request, hostel_id):
+    """Display available rooms in selected hostel"""
+    try:
+        student = request.role.get_student()
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        hostel = get_object_or_404(Hostel, id=hostel_id, is_active=True)
+        
+        # Verify hostel matches student's gender and school
+        hostel_type = 'boys' if student.user.gender == 'male' else 'girls'
+        if hostel.hostel_type != hostel_type :
+            messages.error(request, "You are not eligible for this hostel.")
+            return redirect('hostel_list')
+        
+        # Get rooms with available beds
+        rooms = Room.objects.filter(
+            hostel=hostel,
+            is_active=True
+        ).order_by('floor', 'room_number')
+        
+        room_data = []
+        for room in rooms:
+            available_beds = room.get_available_beds_count(current_academic_year)
+            occupied_beds = room.get_occupied_beds_count(current_academic_year)
+            
+            if available_beds > 0:  # Only show rooms with available beds
+                room_data.append({
+                    'room': room,
+                    'available_beds': available_beds,
+                    'occupied_beds': occupied_beds,
+                    'total_capacity': room.capacity
+                })
+        
+        context = {
+            'hostel': hostel,
+            'room_data': room_data,
+            'student': student,
+            'academic_year': current_academic_year,
+        }
+        
+        return render(request, 'hostels/room_list.html', context)
+        
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('student_dashboard')
+
+
+@login_required
+def bed_list(request, room_id):
+    """Display available beds in selected room"""
+    try:
+        student = request.role.get_student()
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        room = get_object_or_404(Room, id=room_id, is_active=True)
+        
+        # Verify room's hostel matches student's eligibility
+        hostel_type = 'boys' if student.user.gender == 'male' else 'girls'
+        if (room.hostel.hostel_type != hostel_type ):
+            messages.error(request, "You are not eligible for this room.")
+            return redirect('hostel_list')
+        
+        # Get available beds
+        available_beds = Bed.objects.filter(
+            room=room,
+            academic_year=current_academic_year,
+            is_available=True,
+            maintenance_status='good'
+        ).order_by('bed_position')
+        
+        # Get occupied beds for display
+        occupied_beds = Bed.objects.filter(
+            room=room,
+            academic_year=current_academic_year,
+            is_available=False
+        ).order_by('bed_position')
+        
+        context = {
+            'room': room,
+            'available_beds': available_beds,
+            'occupied_beds': occupied_beds,
+            'student': student,
+            'academic_year': current_academic_year,
+        }
+        
+        return render(request, 'hostels/bed_list.html', context)
+        
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('student_dashboard')
+
+
+@login_required
+def book_bed(request, bed_id):
+    """Book a specific bed"""
+    try:
+        student = request.role.get_student()
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        bed = get_object_or_404(Bed, id=bed_id)
+        
+        # Verify bed eligibility
+        hostel_type = 'boys' if student.user.gender == 'male' else 'girls'
+        if (bed.room.hostel.hostel_type != hostel_type ):
+            messages.error(request, "You are not eligible for this bed.")
+            return redirect('hostel_list')
+        
+        # Check if bed is available
+        if not bed.is_available or bed.maintenance_status != 'good':
+            messages.error(request, "This bed is not available for booking.")
+            return redirect('bed_list', room_id=bed.room.id)
+        
+        # Check if student already has a booking
+        existing_booking = HostelBooking.objects.filter(
+            student=student,
+            academic_year=current_academic_year
+        ).first()
+        
+        if existing_booking:
+            messages.error(request, "You already have a hostel booking for this academic year.")
+            return redirect('hostel_booking_detail', booking_id=existing_booking.id)
+        
+        if request.method == 'POST':
+            try:
+                with transaction.atomic():
+                    # Create the booking
+                    booking = HostelBooking.objects.create(
+                        student=student,
+                        bed=bed,
+                        academic_year=current_academic_year,
+                        booking_fee=5000.00,  # Default booking fee - you can make this configurable
+                        booking_status='pending',
+                        payment_status='pending'
+                    )
+                    
+                    messages.success(request, f"Your hostel booking has been submitted successfully! Booking reference: {booking.id}")
+                    return redirect('hostel_booking_detail', booking_id=booking.id)
+                    
+            except ValidationError as e:
+                messages.error(request, f"Booking failed: {e}")
+            except Exception as e:
+                messages.error(request, f"An error occurred: {e}")
+        
+        context = {
+            'bed': bed,
+            'student': student,
+            'academic_year': current_academic_year,
+            'booking_fee': 5000.00,  # Make this configurable
+        }
+        
+        return render(request, 'hostels/book_bed.html', context)
+        
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('dashboard')
+
+
+@login_required
+def hostel_booking_detail(request, booking_id):
+    """Display booking details"""
+    try:
+        student = request.role.get_student()
+        booking = get_object_or_404(
+            HostelBooking, 
+            id=booking_id, 
+            student=student
+        )
+        
+        context = {
+            'booking': booking,
+            'student': student,
+        }
+        
+        return render(request, 'hostels/booking_detail.html', context)
+        
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('student_dashboard')
+
+
+@login_required
+def cancel_booking(request, booking_id):
+    """Cancel a hostel booking"""
+    try:
+        student = request.role.get_student()
+        booking = get_object_or_404(
+            HostelBooking, 
+            id=booking_id, 
+            student=student
+        )
+        
+        # Only allow cancellation if booking is pending
+        if booking.booking_status not in ['pending', 'approved']:
+            messages.error(request, "This booking cannot be cancelled.")
+            return redirect('hostel_booking_detail', booking_id=booking_id)
+        
+        if request.method == 'POST':
+            booking.booking_status = 'cancelled'
+            booking.save()
+            messages.success(request, "Your hostel booking has been cancelled.")
+            return redirect('hostel_list')
+        
+        context = {
+            'booking': booking,
+        }
+        
+        return render(request, 'hostels/cancel_booking.html', context)
+        
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('student_dashboard')
+
+
+# AJAX Views
+@login_required
+def get_rooms_ajax(request):
+    """AJAX endpoint to get rooms for a hostel"""
+    hostel_id = request.GET.get('hostel_id')
+    if not hostel_id:
+        return JsonResponse({'error': 'Hostel ID required'}, status=400)
+    
+    try:
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        rooms = Room.objects.filter(
+            hostel_id=hostel_id,
+            is_active=True
+        ).order_by('floor', 'room_number')
+        
+        room_data = []
+        for room in rooms:
+            available_beds = room.get_available_beds_count(current_academic_year)
+            if available_beds > 0:
+                room_data.append({
+                    'id': room.id,
+                    'room_number': room.room_number,
+                    'floor': room.floor,
+                    'available_beds': available_beds,
+                    'capacity': room.capacity
+                })
+        
+        return JsonResponse({'rooms': room_data})
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def get_beds_ajax(request):
+    """AJAX endpoint to get beds for a room"""
+    room_id = request.GET.get('room_id')
+    if not room_id:
+        return JsonResponse({'error': 'Room ID required'}, status=400)
+    
+    try:
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        beds = Bed.objects.filter(
+            room_id=room_id,
+            academic_year=current_academic_year,
+            is_available=True,
+            maintenance_status='good'
+        ).order_by('bed_position')
+        
+        bed_data = []
+        for bed in beds:
+            bed_data.append({
+                'id': bed.id,
+                'bed_number': bed.bed_number,
+                'bed_position': bed.get_bed_position_display(),
+                'maintenance_status': bed.get_maintenance_status_display()
+            })
+        
+        return JsonResponse({'beds': bed_data})
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def hostel_dashboard(request):
+    """
+    Hostel warden dashboard view with comprehensive statistics and charts
+    """
+    # Get current academic year
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_date = timezone.now().date()
+    
+    # Get hostels managed by current user (warden)
+    if request.role.hostel_ids:
+        managed_hostels = Hostel.objects.filter(pk__in=request.role.hostel_ids)
+    else:
+        # If user doesn't manage any hostels, show all (for admin)
+        managed_hostels = Hostel.objects.filter(is_active=True)
+    
+    # All counts and sums come from hostel_stats in four grouped queries,
+    # cached per warden and academic year
+    from ..hostel_stats import hostel_dashboard_stats
+    managed_hostels = list(managed_hostels)
+    stats = hostel_dashboard_stats(managed_hostels, current_academic_year, current_date)
+    beds = stats['occupancy']
+    bookings = stats['bookings']
+    payments = stats['payments']
+    
+    # Basic Statistics
+    total_hostels = len(managed_hostels)
+    total_rooms = beds['total_rooms']
+    
+    # Bed statistics
+    total_beds = beds['total_beds']
+    occupied_beds = beds['occupied_beds']
+    available_beds = total_beds - occupied_beds
+    occupancy_rate = (occupied_beds / total_beds * 100) if total_beds > 0 else 0
+    
+    # Booking statistics
+    total_bookings = bookings['total_bookings']
+    active_bookings = sum(bookings['status_counts'].get(status, 0) for status in ['approved', 'checked_in'])
+    pending_bookings = bookings['status_counts'].get('pending', 0)
+    
+    # Financial statistics
+    total_revenue = payments['total_revenue']
+    today_payments = payments['today_payments']
+    pending_payments = bookings['pending_balance']
+    
+    # Recent activities
+    recent_bookings = HostelBooking.objects.filter(
+        bed__room__hostel__in=managed_hostels,
+        academic_year=current_academic_year
+    ).select_related('student', 'bed__room__hostel').order_by('-booking_date')[:5]
+    
+    recent_payments = HostelPayment.objects.filter(
+        booking__bed__room__hostel__in=managed_hostels
+    ).select_related('booking__student').order_by('-payment_date')[:5]
+    
+    recent_incidents = HostelIncident.objects.filter(
+        booking__bed__room__hostel__in=managed_hostels
+    ).select_related('booking__student', 'booking__bed__room__hostel').order_by('-incident_date')[:5]
+    
+    # Chart Data Preparation
+    
+    # 1. Gender Distribution (Donut Chart)
+    gender_data = sorted(bookings['gender_counts'].items(), key=lambda item: item[0] or '')
+    
+    gender_chart_data = {
+        'labels': [gender.title() if gender else 'Not Specified' for gender, _ in gender_data],
+        'data': [count for _, count in gender_data],
+        'colors': ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
+    }
+    
+    # 2. Hostel Occupancy (Bar Chart)
+    hostel_occupancy = stats['per_hostel']
+    
+    hostel_chart_data = {
+        'labels': [item['name'] for item in hostel_occupancy],
+        'data': [item['rate'] for item in hostel_occupancy],
+        'occupied': [item['occupied'] for item in hostel_occupancy],
+        'total': [item['total'] for item in hostel_occupancy]
+    }
+    
+    # 3. Monthly Payment Trend (Line Chart)
+    payment_trend_data = {
+        'labels': [month for month, _ in payments['monthly']],
+        'data': [float(amount) for _, amount in payments['monthly']]
+    }
+    
+    # 4. Booking Status Distribution (Pie Chart)
+    booking_status_data = sorted(bookings['status_counts'].items())
+    
+    status_colors = {
+        'pending': '#FFA726',
+        'approved': '#66BB6A',
+        'rejected': '#EF5350',
+        'cancelled': '#BDBDBD',
+        'checked_in': '#42A5F5',
+        'checked_out': '#AB47BC'
+    }
+    
+    booking_status_chart_data = {
+        'labels': [status.replace('_', ' ').title() for status, _ in booking_status_data],
+        'data': [count for _, count in booking_status_data],
+        'colors': [status_colors.get(status, '#78909C') for status, _ in booking_status_data]
+    }
+    
+    # 5. Incident Trends (Bar Chart)
+    incident_trend_data = {
+        'labels': [month for month, _ in stats['incidents']],
+        'data': [count for _, count in stats['incidents']]
+    }
+    
+    # 6. Room Utilization by Floor (Horizontal Bar)
+    floor_chart_data = {
+        'labels': [f'Floor {floor}' for floor in beds['floors']],
+        'data': [(item['occupied'] / item['beds'] * 100) if item['beds'] > 0 else 0 for item in beds['floors'].values()]
+    }
+    
+    # 7. Payment Method Distribution
+    payment_method_chart_data = {
+        'labels': [method.replace('_', ' ').title() for method, _ in payments['methods']],
+        'data': [float(amount) for _, amount in payments['methods']],
+        'colors': ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF']
+    }
+    
+    context = {
+        'current_academic_year': current_academic_year,
+        'current_date': current_date,
+        'managed_hostels': managed_hostels,
+        
+        # Basic stats
+        'total_hostels': total_hostels,
+        'total_rooms': total_rooms,
+        'total_beds': total_beds,
+        'occupied_beds': occupied_beds,
+        'available_beds': available_beds,
+        'occupancy_rate': round(occupancy_rate, 1),
+        
+        # Booking stats
+        'total_bookings': total_bookings,
+        'active_bookings': active_bookings,
+        'pending_bookings': pending_bookings,
+        
+        # Financial stats
+        'total_revenue': total_revenue,
+        'today_payments': today_payments,
+        'pending_payments': pending_payments,
+        
+        # Recent activities
+        'recent_bookings': recent_bookings,
+        'recent_payments': recent_payments,
+        'recent_incidents': recent_incidents,
+        
+        # Chart data (JSON serialized for JavaScript)
+        'gender_chart_data': json.dumps(gender_chart_data),
+        'hostel_chart_data': json.dumps(hostel_chart_data),
+        'payment_trend_data': json.dumps(payment_trend_data),
+        'booking_status_chart_data': json.dumps(booking_status_chart_data),
+        'incident_trend_data': json.dumps(incident_trend_data),
+        'floor_chart_data': json.dumps(floor_chart_data),
+        'payment_method_chart_data': json.dumps(payment_method_chart_data),
+    }
+    
+    return render(request, 'hostels/hostel_dashboard.html', context)
+
+
+def is_admin_or_warden(user):
+    """Check if user is admin or hostel warden"""
+    return user.is_superuser or user.user_type in ['admin', 'hostel_warden']
+
+
+@login_required
+@user_passes_test(is_admin_or_warden)
+def manage_hostel_bookings(request):
+    """Main view for managing hostel bookings"""
+    # Get all academic years
+    academic_years = AcademicYear.objects.all().order_by('-start_date')
+    current_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Get selected academic year from request or use current
+    selected_year_id = request.GET.get('year', current_year.id if current_year else None)
+    selected_year = get_object_or_404(AcademicYear, id=selected_year_id) if selected_year_id else academic_years.first()
+    
+    # Get all hostels
+    hostels = Hostel.objects.filter(is_active=True)
+    
+    # Get booking statistics for selected year
+    booking_stats = get_booking_statistics(selected_year)
+    
+    # Get hostels with availability data (bed counts come with the booking stats)
+    hostels_data = []
+    for hostel in hostels:
+        hostel_beds = booking_stats['hostels'].get(hostel.id, {})
+        total_beds = hostel_beds.get('active_beds', 0)
+        occupied_beds = hostel_beds.get('active_occupied', 0)
+        hostel_data = {
+            'hostel': hostel,
+            'total_beds': total_beds,
+            'occupied_beds': occupied_beds,
+            'available_beds': total_beds - occupied_beds,
+            'occupancy_rate': 0
+        }
+        if hostel_data['total_beds'] > 0:
+            hostel_data['occupancy_rate'] = round(
+                (hostel_data['occupied_beds'] / hostel_data['total_beds']) * 100, 1
+            )
+        hostels_data.append(hostel_data)
+    
+    context = {
+        'academic_years': academic_years,
+        'selected_year': selected_year,
+        'hostels_data': hostels_data,
+        'booking_stats': booking_stats,
+    }
+    
+    return render(request, 'hostels/manage_bookings.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_or_warden)
+def get_booking_data(request):
+    """AJAX endpoint to get booking data for specific academic year"""
+    year_id = request.GET.get('year_id')
+    hostel_id = request.GET.get('hostel_id')
+    status = request.GET.get('status', 'all')
+    search = request.GET.get('search', '')
+    
+    if not year_id:
+        return JsonResponse({'error': 'Academic year required'}, status=400)
+    
+    academic_year = get_object_or_404(AcademicYear, id=year_id)
+    
+    # Build query
+    bookings = HostelBooking.objects.filter(
+        academic_year=academic_year
+    ).select_related(
+        'student__user', 'bed__room__hostel', 'approved_by'
+    ).order_by('-booking_date')
+    
+    # Apply filters
+    if hostel_id and hostel_id != 'all':
+        bookings = bookings.filter(bed__room__hostel_id=hostel_id)
+    
+    if status and status != 'all':
+        bookings = bookings.filter(booking_status=status)
+    
+    if search:
+        bookings = bookings.filter(
+            Q(student__student_id__icontains=search) |
+            Q(student__user__first_name__icontains=search) |
+            Q(student__user__last_name__icontains=search) |
+            Q(bed__bed_number__icontains=search)
+        )
+    
+    # Pagination
+    page = request.GET.get('page', 1)
+    paginator = Paginator(bookings, 20)
+    bookings_page = paginator.get_page(page)
+    
+    # Serialize data
+    bookings_data = []
+    for booking in bookings_page:
+        bookings_data.append({
+            'id': booking.id,
+            'student_id': booking.student.student_id,
+            'student_name': booking.student.user.get_full_name(),
+            'hostel_name': booking.bed.room.hostel.name,
+            'room_number': booking.bed.room.room_number,
+            'bed_number': booking.bed.bed_number,
+            'booking_date': booking.booking_date.strftime('%Y-%m-%d %H:%M'),
+            'check_in_date': booking.check_in_date.strftime('%Y-%m-%d') if booking.check_in_date else None,
+            'check_out_date': booking.check_out_date.strftime('%Y-%m-%d') if booking.check_out_date else None,
+            'booking_status': booking.booking_status,
+            'booking_status_display': booking.get_booking_status_display(),
+            'payment_status': booking.payment_status,
+            'payment_status_display': booking.get_payment_status_display(),
+            'booking_fee': str(booking.booking_fee),
+            'amount_paid': str(booking.amount_paid),
+            'balance_due': str(booking.balance_due),
+            'approved_by': booking.approved_by.get_full_name() if booking.approved_by else None,
+            'approval_date': booking.approval_date.strftime('%Y-%m-%d %H:%M') if booking.approval_date else None,
+        })
+    
+    return JsonResponse({
+        'bookings': bookings_data,
+        'has_next': bookings_page.has_next(),
+        'has_previous': bookings_page.has_previous(),
+        'page_number': bookings_page.number,
+        'total_pages': paginator.num_pages,
+        'total_count': paginator.count,
+    })
+
+
+@login_required
+@user_passes_test(is_admin_or_warden)
+def get_room_availability(request):
+    """AJAX endpoint to get room availability for a hostel"""
+    hostel_id = request.GET.get('hostel_id')
+    year_id = request.GET.get('year_id')
+    
+    if not hostel_id or not year_id:
+        return JsonResponse({'error': 'Hostel and academic year required'}, status=400)
+    
+    hostel = get_object_or_404(Hostel, id=hostel_id)
+    academic_year = get_object_or_404(AcademicYear, id=year_id)
+    
+    rooms_data = []
+    for room in hostel.rooms.filter(is_active=True).prefetch_related('beds'):
+        # Get beds for this academic year
+        beds = room.beds.filter(academic_year=academic_year)
+        
+        room_data = {
+            'id': room.id,
+            'room_number': room.room_number,
+            'floor': room.floor,
+            'capacity': room.capacity,
+            'total_beds': beds.count(),
+            'available_beds': beds.filter(is_available=True).count(),
+            'occupied_beds': beds.filter(is_available=False).count(),
+            'beds': []
+        }
+        
+        # Get bed details
+        for bed in beds:
+            booking = HostelBooking.objects.filter(
+                bed=bed, 
+                academic_year=academic_year,
+                booking_status__in=['approved', 'checked_in']
+            ).select_related('student__user').first()
+            
+            bed_data = {
+                'id': bed.id,
+                'bed_number': bed.bed_number,
+                'bed_position': bed.get_bed_position_display(),
+                'is_available': bed.is_available,
+                'maintenance_status': bed.maintenance_status,
+                'maintenance_status_display': bed.get_maintenance_status_display(),
+                'student': {
+                    'id': booking.student.id,
+                    'student_id': booking.student.student_id,
+                    'name': booking.student.user.get_full_name(),
+                    'booking_status': booking.booking_status,
+                } if booking else None
+            }
+            room_data['beds'].append(bed_data)
+        
+        # Calculate occupancy rate
+        if room_data['total_beds'] > 0:
+            room_data['occupancy_rate'] = round(
+                (room_data['occupied_beds'] / room_data['total_beds']) * 100, 1
+            )
+        else:
+            room_data['occupancy_rate'] = 0
+            
+        rooms_data.append(room_data)
+    
+    return JsonResponse({
+        'hostel_name': hostel.name,
+        'rooms': rooms_data
+    })
+
+
+@login_required
+@user_passes_test(is_admin_or_warden)
+def update_booking_status(request):
+    """AJAX endpoint to update booking status"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST method required'}, status=405)
+    
+    booking_id = request.POST.get('booking_id')
+    new_status = request.POST.get('status')
+    remarks = request.POST.get('remarks', '')
+    
+    if not booking_id or not new_status:
+        return JsonResponse({'error': 'Booking ID and status required'}, status=400)
+    
+    booking = get_object_or_404(HostelBooking, id=booking_id)
+    old_status = booking.booking_status
+    
+    # Update booking status
+    booking.booking_status = new_status
+    booking.approval_remarks = remarks
+    
+    if new_status in ['approved', 'rejected']:
+        booking.approved_by = request.user
+        booking.approval_date = timezone.now()
+    
+    if new_status == 'checked_in':
+        booking.checked_in_by = request.user
+        booking.check_in_date = timezone.now().date()
+    
+    if new_status == 'checked_out':
+        booking.checked_out_by = request.user
+        booking.check_out_date = timezone.now().date()
+    
+    booking.save()  # This will automatically update bed availability
+    
+    return JsonResponse({
+        'success': True,
+        'message': f'Booking status updated from {old_status} to {new_status}',
+        'new_status': booking.get_booking_status_display()
+    })
+
+
+def get_booking_statistics(academic_year):
+    """Helper function to get booking statistics"""
+    from ..hostel_stats import booking_statistics
+    return booking_statistics(academic_year)
+
+
+@login_required
+@require_http_methods(["GET", "POST"])
+def hostel_room_management(request, hostel_id):
+    """Main view for managing rooms in a hostel"""
+    hostel = get_object_or_404(Hostel, id=hostel_id)
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    
+    # Get selected academic year from request
+    selected_year_id = request.GET.get('academic_year', current_academic_year.id if current_academic_year else None)
+    selected_academic_year = get_object_or_404(AcademicYear, id=selected_year_id) if selected_year_id else None
+    
+    # Get rooms for the hostel with pagination
+    rooms = Room.objects.filter(hostel=hostel).order_by('floor', 'room_number')
+    # Calculate bed counts for each room
+    for room in rooms:
+        if selected_academic_year:
+            room.available_beds = room.get_available_beds_count(selected_academic_year)
+            room.occupied_beds = room.get_occupied_beds_count(selected_academic_year)
+        else:
+            room.available_beds = 0
+            room.occupied_beds = 0
+
+    paginator = Paginator(rooms, 20)  # Show 20 rooms per page
+    page_number = request.GET.get('page')
+    page_rooms = paginator.get_page(page_number)
+    
+    # Get room statistics
+    total_rooms = rooms.count()
+    active_rooms = rooms.filter(is_active=True).count()
+    inactive_rooms = total_rooms - active_rooms
+    
+    # Get bed statistics for selected academic year
+    bed_stats = {}
+    if selected_academic_year:
+        bed_stats = {
+            'total_beds': Bed.objects.filter(
+                room__hostel=hostel,
+                academic_year=selected_academic_year
+            ).count(),
+            'available_beds': Bed.objects.filter(
+                room__hostel=hostel,
+                academic_year=selected_academic_year,
+                is_available=True
+            ).count(),
+            'occupied_beds': Bed.objects.filter(
+                room__hostel=hostel,
+                academic_year=selected_academic_year,
+                is_available=False
+            ).count(),
+        }
+    
+    context = {
+        'hostel': hostel,
+        'rooms': page_rooms,
+        'total_rooms': total_rooms,
+        'active_rooms': active_rooms,
+        'inactive_rooms': inactive_rooms,
+        'academic_years': academic_years,
+        'selected_academic_year': selected_academic_year,
+        'bed_stats': bed_stats,
+        'floors': sorted(set(room.floor for room in rooms)) if rooms else [],
+    }
+    
+    return render(request, 'hostels/room_management.html', context)
+
+
+@login_required
+@require_http_methods(["POST"])
+def create_single_room(request, hostel_id):
+    """Create a single room via AJAX"""
+    hostel = get_object_or_404(Hostel, id=hostel_id)
+    
+    try:
+        data = json.loads(request.body)
+        room_number = data.get('room_number', '').strip()
+        floor = int(data.get('floor', 0))
+        capacity = int(data.get('capacity', 4))
+        description = data.get('description', '').strip()
+        facilities = data.get('facilities', '').strip()
+        
+        # Validate room number
+        if not room_number:
+            return JsonResponse({'success': False, 'message': 'Room number is required'})
+        
+        # Check if room already exists
+        if Room.objects.filter(hostel=hostel, room_number=room_number).exists():
+            return JsonResponse({'success': False, 'message': f'Room {room_number} already exists'})
+        
+        # Create the room
+        room = Room.objects.create(
+            hostel=hostel,
+            room_number=room_number,
+            floor=floor,
+            capacity=capacity,
+            description=description,
+            facilities=facilities
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Room {room_number} created successfully',
+            'room': {
+                'id': room.id,
+                'room_number': room.room_number,
+                'floor': room.floor,
+                'capacity': room.capacity,
+                'is_active': room.is_active,
+                'created_at': room.created_at.strftime('%Y-%m-%d %H:%M:%S') if room.created_at else ''
+            }
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'message': 'Invalid JSON data'})
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': 'Invalid number format'})
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': f'Error creating room: {str(e)}'})
+
+
+@login_required
+@require_http_methods(["POST"])
+def bulk_create_rooms(request, hostel_id):
+    """Create multiple rooms with auto-generated numbers"""
+    hostel = get_object_or_404(Hostel, id=hostel_id)
+    
+    try:
+        data = json.loads(request.body)
+        room_prefix = data.get('room_prefix', '').strip().upper()
+        start_number = int(data.get('start_number', 1))
+        room_count = int(data.get('room_count', 1))
+        floor = int(data.get('floor', 0))
+        capacity = int(data.get('capacity', 4))
+        description = data.get('description', '').strip()
+        facilities = data.get('facilities', '').strip()
+        
+        # Validation
+        if not room_prefix:
+            return JsonResponse({'success': False, 'message': 'Room prefix is required'})
+        
+        if room_count > 500:  # Prevent creating too many rooms at once
+            return JsonResponse({'success': False, 'message': 'Cannot create more than 500 rooms at once'})
+        
+        if room_count < 1:
+            return JsonResponse({'success': False, 'message': 'Room count must be at least 1'})
+        
+        created_rooms = []
+        existing_rooms = []
+        
+        with transaction.atomic():
+            for i in range(room_count):
+                room_number = f"{room_prefix}{start_number + i:03d}"  # Format: KL001, KL002, etc.
+                
+                # Check if room already exists
+                if Room.objects.filter(hostel=hostel, room_number=room_number).exists():
+                    existing_rooms.append(room_number)
+                    continue
+                
+                # Create the room
+                room = Room.objects.create(
+                    hostel=hostel,
+                    room_number=room_number,
+                    floor=floor,
+                    capacity=capacity,
+                    description=description,
+                    facilities=facilities
+                )
+                
+                created_rooms.append({
+                    'id': room.id,
+                    'room_number': room.room_number,
+                    'floor': room.floor,
+                    'capacity': room.capacity,
+                    'is_active': room.is_active
+                })
+        
+        message = f"Successfully created {len(created_rooms)} rooms"
+        if existing_rooms:
+            message += f". {len(existing_rooms)} rooms already existed: {', '.join(existing_rooms[:5])}"
+            if len(existing_rooms) > 5:
+                message += f" and {len(existing_rooms) - 5} more"
+        
+        return JsonResponse({
+            'success': True,
+            'message': message,
+            'created_count': len(created_rooms),
+            'existing_count': len(existing_rooms),
+            'rooms': created_rooms
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'message': 'Invalid JSON data'})
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': 'Invalid number format'})
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': f'Error creating rooms: {str(e)}'})
+
+
+@login_required
+@require_http_methods(["DELETE"])
+def delete_room(request, room_id):
+    """Delete a single room via AJAX"""
+    room = get_object_or_404(Room, id=room_id)
+    
+    try:
+        # Check if room has any beds with students
+        occupied_beds = Bed.objects.filter(room=room, is_available=False).exists()
+        if occupied_beds:
+            return JsonResponse({
+                'success': False, 
+                'message': 'Cannot delete room with occupied beds'
+            })
+        
+        room_number = room.room_number
+        room.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Room {room_number} deleted successfully'
+        })
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': f'Error deleting room: {str(e)}'})
+
+
+@login_required
+@require_http_methods(["POST"])
+def bulk_delete_rooms(request, hostel_id):
+    """Delete multiple rooms via AJAX"""
+    hostel = get_object_or_404(Hostel, id=hostel_id)
+    
+    try:
+        data = json.loads(request.body)
+        room_ids = data.get('room_ids', [])
+        
+        if not room_ids:
+            return JsonResponse({'success': False, 'message': 'No rooms selected'})
+        
+        # Get rooms to delete
+        rooms = Room.objects.filter(id__in=room_ids, hostel=hostel)
+        
+        # Check for rooms with occupied beds
+        rooms_with_students = []
+        for room in rooms:
+            if Bed.objects.filter(room=room, is_available=False).exists():
+                rooms_with_students.append(room.room_number)
+        
+        if rooms_with_students:
+            return JsonResponse({
+                'success': False,
+                'message': f'Cannot delete rooms with occupied beds: {", ".join(rooms_with_students)}'
+            })
+        
+        deleted_count = rooms.count()
+        rooms.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Successfully deleted {deleted_count} rooms'
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'message': 'Invalid JSON data'})
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': f'Error deleting rooms: {str(e)}'})
+
+
+@login_required
+@require_http_methods(["POST"])
+def toggle_room_status(request, room_id):
+    """Toggle room active/inactive status via AJAX"""
+    room = get_object_or_404(Room, id=room_id)
+    
+    try:
+        room.is_active = not room.is_active
+        room.save()
+        
+        status = "activated" if room.is_active else "deactivated"
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Room {room.room_number} {status} successfully',
+            'is_active': room.is_active
+        })
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': f'Error updating room status: {str(e)}'})
+
+
+@login_required
+def get_room_details(request, room_id):
+    """Get detailed information about a room via AJAX"""
+    room = get_object_or_404(Room, id=room_id)
+    academic_year_id = request.GET.get('academic_year')
+    
+    try:
+        academic_year = None
+        bed_info = {}
+        
+        if academic_year_id:
+            academic_year = AcademicYear.objects.get(id=academic_year_id)
+            beds = Bed.objects.filter(room=room, academic_year=academic_year)
+            bed_info = {
+                'total_beds': beds.count(),
+                'available_beds': beds.filter(is_available=True).count(),
+                'occupied_beds': beds.filter(is_available=False).count(),
+                'maintenance_beds': beds.filter(maintenance_status__in=['needs_repair', 'under_maintenance', 'out_of_order']).count()
+            }
+        
+        return JsonResponse({
+            'success': True,
+            'room': {
+                'id': room.id,
+                'room_number': room.room_number,
+                'floor': room.floor,
+                'capacity': room.capacity,
+                'description': room.description,
+                'facilities': room.facilities,
+                'is_active': room.is_active,
+                'bed_info': bed_info
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': f'Error getting room details: {str(e)}'})
+
+
+@login_required
+def get_hostel_list(request):
+    """Get list of hostels for room management"""
+    # Check if user can manage hostels (customize based on your permissions)
+    if request.user.user_type not in ['admin', 'hostel_warden', 'staff']:
+        messages.error(request, 'You do not have permission to manage hostels')
+        return redirect('student_dashboard')  # or appropriate redirect
+    
+    hostels = Hostel.objects.filter(is_active=True).select_related('school', 'warden').order_by('hostel_type', 'name')
+    
+    context = {
+        'hostels': hostels
+    }
+    
+    return render(request, 'hostels/warden_hostel_list.html', context)
+
+
+@login_required
+def admin_hostel_management(request):
+    """Main hostel management dashboard"""
+    # Get all hostels without conflicting annotation
+    hostels = Hostel.objects.filter(is_active=True)
+    
+    # Get all academic years
+    academic_years = AcademicYear.objects.all().order_by('-start_date')
+    current_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Overall statistics
+    total_hostels = hostels.count()
+    total_rooms = Room.objects.filter(is_active=True, hostel__is_active=True).count()
+    
+    if current_year:
+        total_beds = Bed.objects.filter(
+            academic_year=current_year,
+            room__is_active=True,
+            room__hostel__is_active=True
+        ).count()
+        occupied_beds = Bed.objects.filter(
+            academic_year=current_year,
+            is_available=False,
+            room__is_active=True,
+            room__hostel__is_active=True
+        ).count()
+        occupancy_rate = (occupied_beds / total_beds * 100) if total_beds > 0 else 0
+    else:
+        total_beds = 0
+        occupied_beds = 0
+        occupancy_rate = 0
+    
+    # Prepare hostel data with year-specific information
+    hostel_data = []
+    for hostel in hostels:
+        year_stats = {}
+        for year in academic_years:
+            # Calculate active rooms count here instead of using annotation
+            rooms_count = hostel.rooms.filter(is_active=True).count()
+            beds_count = Bed.objects.filter(
+                room__hostel=hostel,
+                academic_year=year,
+                room__is_active=True
+            ).count()
+            occupied_count = Bed.objects.filter(
+                room__hostel=hostel,
+                academic_year=year,
+                is_available=False,
+                room__is_active=True
+            ).count()
+            
+            year_stats[year.id] = {
+                'year': year,
+                'rooms_count': rooms_count,
+                'beds_count': beds_count,
+                'occupied_count': occupied_count,
+                'available_count': beds_count - occupied_count,
+                'occupancy_rate': (occupied_count / beds_count * 100) if beds_count > 0 else 0
+            }
+        
+        hostel_data.append({
+            'hostel': hostel,
+            'year_stats': year_stats,
+            'active_rooms_count': hostel.rooms.filter(is_active=True).count()  # Add this line
+        })
+    
+    stats = {
+        'total_hostels': total_hostels,
+        'total_rooms': total_rooms,
+        'total_beds': total_beds,
+        'occupied_beds': occupied_beds,
+        'available_beds': total_beds - occupied_beds,
+        'occupancy_rate': occupancy_rate
+    }
+    
+    context = {
+        'hostel_data': hostel_data,
+        'academic_years': academic_years,
+        'current_year': current_year,
+        'stats': stats,
+    }
+    
+    return render(request, 'admin/hostel_management.html', context)
+
+
+@login_required
+def hostel_detail_view(request, hostel_id):
+    """Detailed view of a specific hostel"""
+    hostel = get_object_or_404(Hostel, id=hostel_id, is_active=True)
+    academic_years = AcademicYear.objects.all().order_by('-start_date')
+    current_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Prepare year-wise data
+    years_data = []
+    for year in academic_years:
+        rooms = hostel.rooms.filter(is_active=True).prefetch_related('beds')
+        
+        rooms_data = []
+        for room in rooms:
+            beds = room.beds.filter(academic_year=year)
+            beds_info = []
+            
+            for bed in beds:
+                booking = HostelBooking.objects.filter(
+                    bed=bed,
+                    academic_year=year,
+                    booking_status__in=['approved', 'checked_in']
+                ).first()
+                
+                beds_info.append({
+                    'bed': bed,
+                    'booking': booking,
+                    'student': booking.student if booking else None
+                })
+            
+            rooms_data.append({
+                'room': room,
+                'beds_info': beds_info,
+                'total_beds': beds.count(),
+                'occupied_beds': beds.filter(is_available=False).count(),
+                'available_beds': beds.filter(is_available=True).count()
+            })
+        
+        # Calculate year statistics
+        total_beds_year = Bed.objects.filter(
+            room__hostel=hostel,
+            academic_year=year,
+            room__is_active=True
+        ).count()
+        occupied_beds_year = Bed.objects.filter(
+            room__hostel=hostel,
+            academic_year=year,
+            is_available=False,
+            room__is_active=True
+        ).count()
+        
+        years_data.append({
+            'academic_year': year,
+            'rooms_data': rooms_data,
+            'stats': {
+                'total_rooms': rooms.count(),
+                'total_beds': total_beds_year,
+                'occupied_beds': occupied_beds_year,
+                'available_beds': total_beds_year - occupied_beds_year,
+                'occupancy_rate': (occupied_beds_year / total_beds_year * 100) if total_beds_year > 0 else 0
+            }
+        })
+    
+    context = {
+        'hostel': hostel,
+        'years_data': years_data,
+        'current_year': current_year,
+        'academic_years': academic_years,
+    }
+    
+    return render(request, 'admin/hostel_detail.html', context)
+
+
+@login_required
+@require_POST
+def create_rooms_bulk(request):
+    """Create rooms in bulk for a hostel"""
+    try:
+        data = json.loads(request.body)
+        hostel_id = data.get('hostel_id')
+        academic_year_id = data.get('academic_year_id')
+        room_count = int(data.get('room_count', 0))
+        beds_per_room = int(data.get('beds_per_room', 4))
+        room_prefix = data.get('room_prefix', '').upper()
+        start_number = int(data.get('start_number', 1))
+        floor_number = int(data.get('floor_number', 0))
+        
+        if not hostel_id or not academic_year_id or room_count <= 0:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid data provided'
+            })
+        
+        hostel = get_object_or_404(Hostel, id=hostel_id, is_active=True)
+        academic_year = get_object_or_404(AcademicYear, id=academic_year_id)
+        
+        created_rooms = []
+        created_beds_count = 0
+        
+        with transaction.atomic():
+            for i in range(room_count):
+                room_number = f"{room_prefix}{start_number + i:03d}"
+                
+                # Check if room already exists
+                if Room.objects.filter(hostel=hostel, room_number=room_number).exists():
+                    continue
+                
+                # Create room
+                room = Room.objects.create(
+                    hostel=hostel,
+                    room_number=room_number,
+                    floor=floor_number,
+                    capacity=beds_per_room,
+                    description=f"Room {room_number} on floor {floor_number}"
+                )
+                
+                # Create beds for this room
+                bed_positions = ['bed_1', 'bed_2', 'bed_3', 'bed_4'][:beds_per_room]
+                for bed_pos in bed_positions:
+                    bed = Bed.objects.create(
+                        room=room,
+                        academic_year=academic_year,
+                        bed_position=bed_pos,
+                        is_available=True
+                    )
+                    created_beds_count += 1
+                
+                created_rooms.append(room.room_number)
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Successfully created {len(created_rooms)} rooms with {created_beds_count} beds',
+            'created_rooms': created_rooms
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+@require_POST
+def toggle_bed_maintenance(request):
+    """Toggle bed maintenance status"""
+    try:
+        data = json.loads(request.body)
+        bed_id = data.get('bed_id')
+        maintenance_status = data.get('maintenance_status', 'good')
+        
+        bed = get_object_or_404(Bed, id=bed_id)
+        bed.maintenance_status = maintenance_status
+        
+        # If bed is under maintenance or out of order, make it unavailable
+        if maintenance_status in ['under_maintenance', 'out_of_order']:
+            bed.is_available = False
+        elif maintenance_status == 'good' and not bed.bookings.filter(
+            booking_status__in=['approved', 'checked_in']
+        ).exists():
+            bed.is_available = True
+            
+        bed.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Bed maintenance status updated to {bed.get_maintenance_status_display()}'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+@require_POST
+def checkout_student(request):
+    """Check out a student from their bed"""
+    try:
+        data = json.loads(request.body)
+        booking_id = data.get('booking_id')
+        checkout_remarks = data.get('remarks', '')
+        
+        booking = get_object_or_404(HostelBooking, id=booking_id)
+        
+        with transaction.atomic():
+            # Update booking status
+            booking.booking_status = 'checked_out'
+            booking.check_out_date = timezone.now().date()
+            booking.checked_out_by = request.user
+            booking.remarks = checkout_remarks
+            booking.save()
+            
+            # Make bed available
+            bed = booking.bed
+            bed.is_available = True
+            bed.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Student {booking.student.student_id} checked out successfully'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+def search_students(request):
+    """Search students for bed assignment"""
+    query = request.GET.get('q', '').strip()
+    
+    if len(query) < 2:
+        return JsonResponse({'students': []})
+    
+    from ..people_search import search_profiles
+    students = search_profiles(
+        Student.objects.filter(status='active').select_related('user', 'programme'),
+        query, 'student', limit=20
+    )
+    
+    students_data = []
+    for student in students:
+        students_data.append({
+            'id': student.id,
+            'student_id': student.student_id,
+            'name': student.user.get_full_name(),
+            'programme': student.programme.name,
+            'year': student.current_year,
+            'semester': student.current_semester
+        })
+    
+    return JsonResponse({'students': students_data})
+
+
+@login_required
+@require_POST
+def assign_bed_to_student(request):
+    """Assign a bed to a student"""
+    try:
+        data = json.loads(request.body)
+        bed_id = data.get('bed_id')
+        student_id = data.get('student_id')
+        academic_year_id = data.get('academic_year_id')
+        booking_fee = float(data.get('booking_fee', 0))
+        
+        bed = get_object_or_404(Bed, id=bed_id)
+        student = get_object_or_404(Student, id=student_id)
+        academic_year = get_object_or_404(AcademicYear, id=academic_year_id)
+        
+        # Check if student already has a booking for this academic year
+        existing_booking = HostelBooking.objects.filter(
+            student=student,
+            academic_year=academic_year,
+            booking_status__in=['pending', 'approved', 'checked_in']
+        ).first()
+        
+        if existing_booking:
+            return JsonResponse({
+                'success': False,
+                'error': f'Student already has a booking for {academic_year.year}'
+            })
+        
+        # Check if bed is available
+        if not bed.is_available:
+            return JsonResponse({
+                'success': False,
+                'error': 'Bed is not available'
+            })
+        
+        with transaction.atomic():
+            # Create booking
+            booking = HostelBooking.objects.create(
+                student=student,
+                bed=bed,
+                academic_year=academic_year,
+                booking_status='approved',
+                booking_fee=booking_fee,
+                approved_by=request.user,
+                approval_date=timezone.now(),
+                approval_remarks=f'Direct assignment by {request.user.get_full_name()}'
+            )
+            
+            # Update bed availability
+            bed.is_available = False
+            bed.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Bed assigned to {student.student_id} successfully'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+def admin_hostel_bookings(request):
+    """Admin hostel bookings list with search, filter and pagination"""
+    
+    # Get filter parameters
+    search_query = request.GET.get('search', '').strip()
+    hostel_filter = request.GET.get('hostel', '')
+    status_filter = request.GET.get('status', '')
+    year_filter = request.GET.get('year', '')
+    booking_type_filter = request.GET.get('booking_type', '')
+    
+    # Base queryset
+    bookings = HostelBooking.objects.select_related(
+        'student__user',
+        'bed__room__hostel',
+        'academic_year'
+    ).order_by('-created_at')
+    
+    # Apply search filter
+    if search_query:
+        bookings = bookings.filter(
+            Q(student__user__first_name__icontains=search_query) |
+            Q(student__user__last_name__icontains=search_query) |
+            Q(student__user__email__icontains=search_query) |
+            Q(student__student_id__icontains=search_query) |
+            Q(bed__room__room_number__icontains=search_query) |
+            Q(bed__room__hostel__name__icontains=search_query)
+        )
+    
+    # Apply filters
+    if hostel_filter:
+        bookings = bookings.filter(bed__room__hostel_id=hostel_filter)
+    
+    if status_filter:
+        bookings = bookings.filter(status=status_filter)
+    
+    if year_filter:
+        bookings = bookings.filter(academic_year_id=year_filter)
+    
+    if booking_type_filter:
+        bookings = bookings.filter(booking_type=booking_type_filter)
+    
+    # Pagination
+    from ..pagination import KeysetPaginator
+    paginator = KeysetPaginator(bookings, 20)  # 20 bookings per page
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Get filter options for dropdowns
+    hostels = Hostel.objects.filter(is_active=True).order_by('name')
+    academic_years = AcademicYear.objects.all().order_by('-start_date')
+    
+    # Status choices from model
+    status_choices = HostelBooking.STATUS_CHOICES if hasattr(HostelBooking, 'STATUS_CHOICES') else [
+        ('pending', 'Pending'),
+        ('confirmed', 'Confirmed'),
+        ('cancelled', 'Cancelled'),
+        ('completed', 'Completed'),
+    ]
+    
+    # Booking type choices
+    booking_type_choices = [
+        ('new', 'New Booking'),
+        ('renewal', 'Renewal'),
+        ('transfer', 'Transfer'),
+    ]
+    
+    context = {
+        'page_obj': page_obj,
+        'hostels': hostels,
+        'academic_years': academic_years,
+        'status_choices': status_choices,
+        'booking_type_choices': booking_type_choices,
+        'search_query': search_query,
+        'current_filters': {
+            'hostel': hostel_filter,
+            'status': status_filter,
+            'year': year_filter,
+            'booking_type': booking_type_filter,
+        }
+    }
+    
+    return render(request, 'admin/hostel_bookings.html', context)
+
+
+@login_required
+@require_http_methods(["GET"])
+def booking_details_ajax(request, booking_id):
+    """Get booking details via AJAX"""
+    try:
+        booking = get_object_or_404(
+            HostelBooking.objects.select_related(
+                'student__user',
+                'bed__room__hostel',
+                'academic_year'
+            ),
+            id=booking_id
+        )
+        
+        data = {
+            'success': True,
+            'booking': {
+                'id': booking.id,
+                'student_name': f"{booking.student.user.first_name} {booking.student.user.last_name}",
+                'student_id': booking.student.student_id,
+                'student_email': booking.student.user.email,
+                'student_phone': getattr(booking.student.user, 'phone', ''),
+                'hostel_name': booking.bed.room.hostel.name,
+                'room_number': booking.bed.room.room_number,
+                'bed_number': booking.bed.bed_number,
+                'academic_year': str(booking.academic_year),
+                'status': booking.booking_status,  # Use booking_status from model
+                'booking_type': getattr(booking, 'booking_type', 'regular'),
+                'booking_date': booking.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'check_in_date': booking.check_in_date.strftime('%Y-%m-%d') if booking.check_in_date else '',
+                'check_out_date': booking.check_out_date.strftime('%Y-%m-%d') if booking.check_out_date else '',
+                'amount': str(booking.booking_fee) if hasattr(booking, 'booking_fee') else '0.00',
+                'payment_status': booking.payment_status,
+                'notes': booking.remarks if hasattr(booking, 'remarks') else '',
+            }
+        }
+        
+        return JsonResponse(data)
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+@require_http_methods(["POST"])
+@csrf_exempt
+def update_booking_ajax(request, booking_id):
+    """Update booking details via AJAX"""
+    try:
+        booking = get_object_or_404(HostelBooking, id=booking_id)
+        
+        # Parse JSON data
+        data = json.loads(request.body)
+        
+        # Update allowed fields - use correct field names from model
+        if 'status' in data:
+            booking.booking_status = data['status']  # Map to booking_status
+        
+        if 'check_in_date' in data and data['check_in_date']:
+            from datetime import datetime
+            booking.check_in_date = datetime.strptime(data['check_in_date'], '%Y-%m-%d').date()
+        
+        if 'check_out_date' in data and data['check_out_date']:
+            from datetime import datetime
+            booking.check_out_date = datetime.strptime(data['check_out_date'], '%Y-%m-%d').date()
+        
+        if 'notes' in data:
+            booking.remarks = data['notes']  # Map to remarks field
+        
+        if 'amount' in data:
+            booking.booking_fee = float(data['amount'])  # Map to booking_fee
+        
+        if 'payment_status' in data:
+            booking.payment_status = data['payment_status']
+        
+        booking.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Booking updated successfully'
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid JSON data'
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+@require_http_methods(["POST"])
+@csrf_exempt
+def delete_booking_ajax(request, booking_id):
+    """Delete booking via AJAX"""
+    try:
+        booking = get_object_or_404(HostelBooking, id=booking_id)
+        
+        # Make bed available again when booking is deleted
+        if booking.bed:
+            booking.bed.is_available = True
+            booking.bed.save()
+        
+        # Hard delete
+        booking.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Booking deleted successfully'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+@require_http_methods(["GET"])
+def booking_stats_ajax(request):
+    """Get booking statistics for dashboard"""
+    try:
+        current_year = AcademicYear.objects.filter(is_current=True).first()
+        
+        if current_year:
+            booking_stats = get_booking_statistics(current_year)
+            total_bookings = booking_stats['total_bookings']
+            confirmed_bookings = booking_stats['approved']
+            pending_bookings = booking_stats['pending']
+            cancelled_bookings = booking_stats['cancelled'] + booking_stats['rejected']
+        else:
+            total_bookings = confirmed_bookings = pending_bookings = cancelled_bookings = 0
+        
+        return JsonResponse({
+            'success': True,
+            'stats': {
+                'total_bookings': total_bookings,
+                'confirmed_bookings': confirmed_bookings,
+                'pending_bookings': pending_bookings,
+                'cancelled_bookings': cancelled_bookings,
+                'confirmation_rate': round((confirmed_bookings / total_bookings * 100), 2) if total_bookings > 0 else 0
+            }
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+@require_http_methods(["POST"])
+@csrf_exempt
+def bulk_update_bookings_ajax(request):
+    """Bulk update multiple bookings"""
+    try:
+        data = json.loads(request.body)
+        booking_ids = data.get('booking_ids', [])
+        action = data.get('action', '')
+        
+        if not booking_ids or not action:
+            return JsonResponse({
+                'success': False,
+                'error': 'Missing booking IDs or action'
+            })
+        
+        bookings = HostelBooking.objects.filter(id__in=booking_ids)
+        
+        if action == 'confirm':
+            # Update beds availability and booking status
+            for booking in bookings:
+                booking.booking_status = 'approved'
+                if booking.bed:
+                    booking.bed.is_available = False
+                    booking.bed.save()
+                booking.save()
+            message = f'{bookings.count()} bookings confirmed successfully'
+            
+        elif action == 'cancel':
+            # Update beds availability and booking status
+            for booking in bookings:
+                booking.booking_status = 'cancelled'
+                if booking.bed:
+                    booking.bed.is_available = True
+                    booking.bed.save()
+                booking.save()
+            message = f'{bookings.count()} bookings cancelled successfully'
+            
+        elif action == 'delete':
+            count = bookings.count()
+            # Make beds available before deleting
+            for booking in bookings:
+                if booking.bed:
+                    booking.bed.is_available = True
+                    booking.bed.save()
+            bookings.delete()
+            message = f'{count} bookings deleted successfully'
+        else:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid action'
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'message': message
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid JSON data'
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
@@ -0,0 +1,1810 @@
+# lecturer.py - Lecturer portal: units, notes, assignments and grading,
+# course allocation, timetable and profile
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from functools import wraps
+import json
+
+from django.contrib import messages
+from django.contrib.auth import update_session_auth_hash
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth.views import redirect_to_login
+from django.core.files.storage import default_storage
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Avg, Count
+from django.http import Http404, HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
+
+from .. import reference_data
+from ..models import (
+    AcademicYear, Assignment, AssignmentAnnouncement, AssignmentSubmission, Attendance,
+    AttendanceSession, Course, CourseNotes, Department, Enrollment, Grade, Lecturer,
+    LecturerCourseAssignment, Semester, Timetable, User,
+)
+from ..reference_data import parse_id, pick, reference_endpoint
+
+
+@login_required
+def lecturer_dashboard(request):
+    # Check if user is a lecturer
+    if request.role.lecturer is None or request.user.user_type not in ['lecturer', 'professor']:
+        messages.error(request, "Access denied. You must be a lecturer to view this page.")
+        return redirect('home')
+    
+    lecturer = request.role.lecturer
+    
+    # Get current semester and academic year
+    current_semester = Semester.objects.filter(is_current=True).first()
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Get lecturer's course assignments for current semester
+    current_assignments = LecturerCourseAssignment.objects.filter(
+        lecturer=lecturer,
+        semester=current_semester,
+        is_active=True
+    ).select_related('course', 'academic_year') if current_semester else LecturerCourseAssignment.objects.none()
+    
+    # Get total students taught by this lecturer in current semester
+    total_students = Enrollment.objects.filter(
+        lecturer=lecturer,
+        semester=current_semester,
+        is_active=True
+    ).count() if current_semester else 0
+    
+    # Get courses taught this semester with detailed statistics
+    courses_with_stats = []
+    total_credit_hours = 0
+    
+    for assignment in current_assignments:
+        course = assignment.course
+        enrollments = Enrollment.objects.filter(
+            course=course,
+            lecturer=lecturer,
+            semester=current_semester,
+            is_active=True
+        )
+        
+        student_count = enrollments.count()
+        grades_completed = Grade.objects.filter(
+            enrollment__in=enrollments,
+            grade__isnull=False
+        ).count()
+        
+        # Calculate average grade for this course
+        avg_grade_points = Grade.objects.filter(
+            enrollment__in=enrollments,
+            grade_points__isnull=False
+        ).aggregate(avg_gpa=Avg('grade_points'))['avg_gpa'] or 0
+        
+        # Get attendance statistics
+        attendance_sessions = AttendanceSession.objects.filter(
+            timetable_slot__course=course,
+            lecturer=lecturer,
+            semester=current_semester
+        )
+        
+        total_sessions = attendance_sessions.count()
+        total_attendance_records = Attendance.objects.filter(
+            attendance_session__in=attendance_sessions,
+            status='present'
+        ).count()
+        
+        # Calculate attendance rate
+        expected_attendance = student_count * total_sessions
+        attendance_rate = (total_attendance_records / expected_attendance * 100) if expected_attendance > 0 else 0
+        
+        courses_with_stats.append({
+            'assignment': assignment,
+            'course': course,
+            'student_count': student_count,
+            'grades_completed': grades_completed,
+            'grading_progress': (grades_completed / student_count * 100) if student_count > 0 else 0,
+            'avg_grade_points': round(avg_grade_points, 2),
+            'attendance_rate': round(attendance_rate, 1),
+            'total_sessions': total_sessions
+        })
+        
+        total_credit_hours += course.credit_hours
+    
+    # Get recent enrollments
+    recent_enrollments = Enrollment.objects.filter(
+        lecturer=lecturer,
+        semester=current_semester,
+        is_active=True
+    ).select_related('student__user', 'course').order_by('-enrollment_date')[:8] if current_semester else []
+    
+    # Calculate overall grading statistics
+    total_grades_pending = Enrollment.objects.filter(
+        lecturer=lecturer,
+        semester=current_semester,
+        is_active=True
+    ).exclude(grade__isnull=False).count() if current_semester else 0
+    
+    total_grades_completed = Grade.objects.filter(
+        enrollment__lecturer=lecturer,
+        enrollment__semester=current_semester
+    ).count() if current_semester else 0
+    
+    total_enrollments = total_grades_pending + total_grades_completed
+    grading_progress = (total_grades_completed / total_enrollments * 100) if total_enrollments > 0 else 0
+    
+    # Get attendance analytics for charts
+    attendance_data = []
+    weekly_attendance = []
+    
+    if current_semester:
+        # Get weekly attendance data for the last 12 weeks
+        end_date = timezone.now().date()
+        start_date = end_date - timedelta(weeks=12)
+        
+        for week in range(12):
+            week_start = start_date + timedelta(weeks=week)
+            week_end = week_start + timedelta(days=6)
+            
+            week_attendance = Attendance.objects.filter(
+                timetable_slot__course__in=[cs['course'] for cs in courses_with_stats],
+                attendance_session__session_date__range=[week_start, week_end],
+                status='present'
+            ).count()
+            
+            week_total = Attendance.objects.filter(
+                timetable_slot__course__in=[cs['course'] for cs in courses_with_stats],
+                attendance_session__session_date__range=[week_start, week_end]
+            ).count()
+            
+            attendance_rate = (week_attendance / week_total * 100) if week_total > 0 else 0
+            
+            weekly_attendance.append({
+                'week': f"Week {week + 1}",
+                'attendance_rate': round(attendance_rate, 1),
+                'total_students': week_total
+            })
+    
+    # Get enrollment trends (monthly data for current academic year)
+    enrollment_trends = []
+    if current_academic_year:
+        for month in range(1, 13):
+            month_enrollments = Enrollment.objects.filter(
+                lecturer=lecturer,
+                enrollment_date__year=current_academic_year.start_date.year,
+                enrollment_date__month=month,
+                is_active=True
+            ).count()
+            
+            enrollment_trends.append({
+                'month': datetime(2024, month, 1).strftime('%B'),
+                'enrollments': month_enrollments
+            })
+    
+    # Get grade distribution data
+    grade_distribution = []
+    if current_semester:
+        grades = Grade.objects.filter(
+            enrollment__lecturer=lecturer,
+            enrollment__semester=current_semester,
+            grade__isnull=False
+        ).values('grade').annotate(count=Count('grade')).order_by('grade')
+        
+        for grade_data in grades:
+            grade_distribution.append({
+                'grade': grade_data['grade'],
+                'count': grade_data['count']
+            })
+    
+    # Get assignment submission statistics
+    assignment_stats = []
+    if current_semester:
+        assignments = Assignment.objects.filter(
+            lecturer_assignment__lecturer=lecturer,
+            lecturer_assignment__semester=current_semester,
+            is_published=True
+        )
+        
+        for assignment in assignments[:5]:  # Latest 5 assignments
+            total_submissions = assignment.submissions.count()
+            submitted_count = assignment.submissions.filter(is_submitted=True).count()
+            pending_count = total_submissions - submitted_count
+            
+            assignment_stats.append({
+                'title': assignment.title,
+                'submitted': submitted_count,
+                'pending': pending_count,
+                'total': total_submissions,
+                'submission_rate': (submitted_count / total_submissions * 100) if total_submissions > 0 else 0
+            })
+    
+    # Get daily schedule for current week
+    today = timezone.now().date()
+    week_start = today - timedelta(days=today.weekday())
+    week_schedule = []
+    
+    for day in range(7):
+        current_day = week_start + timedelta(days=day)
+        day_sessions = AttendanceSession.objects.filter(
+            lecturer=lecturer,
+            session_date=current_day,
+            is_active=True
+        ).select_related('timetable_slot__course')
+        
+        week_schedule.append({
+            'date': current_day,
+            'day_name': current_day.strftime('%A'),
+            'sessions': day_sessions,
+            'is_today': current_day == today
+        })
+    
+    # Calculate performance metrics
+    performance_metrics = {
+        'total_courses': len(courses_with_stats),
+        'total_credit_hours': total_credit_hours,
+        'avg_class_size': round(total_students / len(courses_with_stats), 1) if courses_with_stats else 0,
+        'overall_attendance_rate': round(sum([cs['attendance_rate'] for cs in courses_with_stats]) / len(courses_with_stats), 1) if courses_with_stats else 0,
+        'avg_grade_points': round(sum([cs['avg_grade_points'] for cs in courses_with_stats]) / len(courses_with_stats), 2) if courses_with_stats else 0
+    }
+    
+    # Get upcoming deadlines
+    upcoming_assignments = Assignment.objects.filter(
+        lecturer_assignment__lecturer=lecturer,
+        lecturer_assignment__semester=current_semester,
+        due_date__gte=timezone.now(),
+        is_published=True
+    ).order_by('due_date')[:5]
+    
+    # Prepare chart data for JSON serialization
+    chart_data = {
+        'weekly_attendance': json.dumps(weekly_attendance),
+        'enrollment_trends': json.dumps(enrollment_trends),
+        'grade_distribution': json.dumps(grade_distribution),
+        'assignment_stats': json.dumps(assignment_stats)
+    }
+
+    # Get lecturer's consultation hours and office info
+    consultation_hours = lecturer.consultation_hours
+    office_location = lecturer.office_location
+
+    # Get academic rank and experience
+    academic_rank = lecturer.get_academic_rank_display()
+    teaching_experience = lecturer.teaching_experience_years
+    
+    context = {
+        'lecturer': lecturer,
+        'current_semester': current_semester,
+        'current_academic_year': current_academic_year,
+        'total_students': total_students,
+        'courses_with_stats': courses_with_stats,
+        'recent_enrollments': recent_enrollments,
+        'total_grades_pending': total_grades_pending,
+        'total_grades_completed': total_grades_completed,
+        'grading_progress': round(grading_progress, 1),
+        'consultation_hours': lecturer.consultation_hours,
+        'office_location': lecturer.office_location,
+        'academic_rank': lecturer.get_academic_rank_display(),
+        'teaching_experience': lecturer.teaching_experience_years,
+        'performance_metrics': performance_metrics,
+        'week_schedule': week_schedule,
+        'upcoming_assignments': upcoming_assignments,
+        'chart_data': chart_data,
+        'today': today,
+        'consultation_hours': consultation_hours,
+        'office_location': office_location,
+        'academic_rank': academic_rank,
+        'teaching_experience': teaching_experience,
+    }
+
+    return render(request, 'lecturers/lecturer_dashboard.html', context)
+
+
+def is_admin_or_hod(user):
+    """Check if user is admin or head of department"""
+    return user.user_type in ['admin', 'hod', 'dean']
+
+
+def is_lecturer(user):
+    """Check if user is a lecturer"""
+    return user.user_type in ['lecturer', 'professor'] and hasattr(user, 'lecturer_profile')
+
+
+def lecturer_required(view_func):
+    """user_passes_test(is_lecturer), answered from the request's role context"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.user.user_type in ['lecturer', 'professor'] and request.role.lecturer_id is not None:
+            return view_func(request, *args, **kwargs)
+        return redirect_to_login(request.get_full_path())
+    return wrapper
+
+
+@login_required
+@user_passes_test(is_admin_or_hod)
+def lecturer_allocation_dashboard(request):
+    """Dashboard for admin to allocate units to lecturers"""
+    
+    # Get current academic year and semester
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    if not current_academic_year or not current_semester:
+        messages.error(request, "Please set current academic year and semester first.")
+        return redirect('admin_dashboard')
+    
+    # Get all active courses
+    courses = Course.objects.filter(is_active=True).select_related('department', 'department__faculty')
+    
+    # Get all active lecturers
+    lecturers = Lecturer.objects.filter(
+        is_active=True,
+        user__is_active=True
+    ).select_related('user', 'department')
+    
+    # Get current allocations
+    allocations = LecturerCourseAssignment.objects.filter(
+        academic_year=current_academic_year,
+        semester=current_semester,
+        is_active=True
+    ).select_related('lecturer__user', 'course')
+    
+    # Create a mapping of course_id to lecturer for quick lookup
+    allocated_courses = {alloc.course_id: alloc for alloc in allocations}
+    
+    # Get unallocated courses
+    allocated_course_ids = set(allocated_courses.keys())
+    all_course_ids = set(courses.values_list('id', flat=True))
+    unallocated_course_ids = all_course_ids - allocated_course_ids
+    unallocated_courses = courses.filter(id__in=unallocated_course_ids)
+    
+    # Filter courses by department if user is HOD
+    if request.user.user_type == 'hod':
+        user_department = request.role.department
+        if user_department:
+            courses = courses.filter(department=user_department)
+            lecturers = lecturers.filter(department=user_department)
+            unallocated_courses = unallocated_courses.filter(department=user_department)
+    
+    # Get statistics
+    stats = {
+        'total_courses': courses.count(),
+        'allocated_courses': len(allocated_course_ids),
+        'unallocated_courses': unallocated_courses.count(),
+        'total_lecturers': lecturers.count(),
+        'lecturers_with_assignments': allocations.values('lecturer').distinct().count()
+    }
+    
+    # Get departments for filtering
+    departments = Department.objects.filter(is_active=True)
+    if request.user.user_type == 'hod':
+        user_department = request.role.department
+        if user_department:
+            departments = departments.filter(id=user_department.id)
+    
+    context = {
+        'current_academic_year': current_academic_year,
+        'current_semester': current_semester,
+        'courses': courses,
+        'lecturers': lecturers,
+        'allocations': allocations,
+        'allocated_courses': allocated_courses,
+        'unallocated_courses': unallocated_courses,
+        'stats': stats,
+        'departments': departments,
+    }
+    
+    return render(request, 'admin/lecturer_allocation_dashboard.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_or_hod)
+@require_http_methods(["POST"])
+def allocate_course_to_lecturer(request):
+    """AJAX endpoint to allocate a course to a lecturer"""
+    
+    try:
+        course_id = request.POST.get('course_id')
+        lecturer_id = request.POST.get('lecturer_id')
+        lecture_venue = request.POST.get('lecture_venue', '')
+        lecture_time = request.POST.get('lecture_time', '')
+        remarks = request.POST.get('remarks', '')
+        
+        if not course_id or not lecturer_id:
+            return JsonResponse({'success': False, 'message': 'Course and lecturer are required.'})
+        
+        # Get current academic year and semester
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        current_semester = Semester.objects.filter(is_current=True).first()
+        
+        if not current_academic_year or not current_semester:
+            return JsonResponse({'success': False, 'message': 'Current academic year and semester not set.'})
+        
+        course = get_object_or_404(Course, id=course_id, is_active=True)
+        lecturer = get_object_or_404(Lecturer, id=lecturer_id, is_active=True)
+        
+        # Check if course is already allocated
+        existing_allocation = LecturerCourseAssignment.objects.filter(
+            course=course,
+            academic_year=current_academic_year,
+            semester=current_semester,
+            is_active=True
+        ).first()
+        
+        if existing_allocation:
+            return JsonResponse({
+                'success': False, 
+                'message': f'Course {course.code} is already allocated to {existing_allocation.lecturer.user.get_full_name()}'
+            })
+        
+        # Create allocation
+        allocation = LecturerCourseAssignment.objects.create(
+            lecturer=lecturer,
+            course=course,
+            academic_year=current_academic_year,
+            semester=current_semester,
+            assigned_by=request.user,
+            lecture_venue=lecture_venue,
+            lecture_time=lecture_time,
+            remarks=remarks
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Course {course.code} successfully allocated to {lecturer.user.get_full_name()}',
+            'allocation_id': allocation.id,
+            'lecturer_name': lecturer.user.get_full_name(),
+            'course_code': course.code,
+            'course_name': course.name
+        })
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)})
+
+
+@login_required
+@user_passes_test(is_admin_or_hod)
+@require_http_methods(["POST"])
+def remove_course_allocation(request):
+    """AJAX endpoint to remove a course allocation"""
+    
+    try:
+        allocation_id = request.POST.get('allocation_id')
+        
+        if not allocation_id:
+            return JsonResponse({'success': False, 'message': 'Allocation ID is required.'})
+        
+        allocation = get_object_or_404(LecturerCourseAssignment, id=allocation_id)
+        
+        # Check if user has permission to remove this allocation
+        if request.user.user_type == 'hod':
+            user_department = request.role.department
+            if user_department and allocation.course.department != user_department:
+                return JsonResponse({'success': False, 'message': 'You can only manage allocations in your department.'})
+        
+        course_code = allocation.course.code
+        lecturer_name = allocation.lecturer.user.get_full_name()
+        
+        allocation.delete()
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Allocation of {course_code} to {lecturer_name} has been removed.',
+            'course_id': allocation.course.id
+        })
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)})
+
+
+@login_required
+@lecturer_required
+def lecturer_unit_dashboard(request):
+    """Dashboard for lecturers to view their allocated courses"""
+    
+    lecturer = request.role.get_lecturer()
+    
+    # Get current academic year and semester
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    if not current_academic_year or not current_semester:
+        messages.error(request, "Current academic year and semester not set.")
+        return render(request, 'lecturer/dashboard.html', {'lecturer': lecturer})
+    
+    # Get lecturer's course assignments for current semester
+    assignments = LecturerCourseAssignment.objects.filter(
+        lecturer=lecturer,
+        academic_year=current_academic_year,
+        semester=current_semester,
+        is_active=True
+    ).select_related('course', 'course__department').prefetch_related(
+        'course__enrollments__student__user',
+        'assignments',
+        'course_notes'
+    )
+    
+    # Calculate statistics for each assignment
+    assignment_stats = []
+    for assignment in assignments:
+        # Get enrolled students for this course in current semester
+        enrollments = Enrollment.objects.filter(
+            course=assignment.course,
+            semester=current_semester,
+            is_active=True
+        ).select_related('student__user')
+        
+        # Get assignment and notes counts
+        assignment_count = Assignment.objects.filter(
+            lecturer_assignment=assignment,
+            is_active=True
+        ).count()
+        
+        notes_count = CourseNotes.objects.filter(
+            lecturer_assignment=assignment,
+            is_active=True
+        ).count()
+        
+        # Get pending submissions across all assignments
+        pending_submissions = 0
+        for assign in assignment.assignments.filter(is_active=True, is_published=True):
+            pending_submissions += assign.pending_submissions
+        
+        assignment_stats.append({
+            'assignment': assignment,
+            'enrolled_students': enrollments,
+            'student_count': enrollments.count(),
+            'assignment_count': assignment_count,
+            'notes_count': notes_count,
+            'pending_submissions': pending_submissions
+        })
+    
+    # Overall statistics
+    stats = {
+        'total_courses': assignments.count(),
+        'total_students': sum([stat['student_count'] for stat in assignment_stats]),
+        'total_assignments': sum([stat['assignment_count'] for stat in assignment_stats]),
+        'total_notes': sum([stat['notes_count'] for stat in assignment_stats]),
+        'pending_submissions': sum([stat['pending_submissions'] for stat in assignment_stats])
+    }
+    
+    context = {
+        'lecturer': lecturer,
+        'current_academic_year': current_academic_year,
+        'current_semester': current_semester,
+        'assignment_stats': assignment_stats,
+        'stats': stats
+    }
+    
+    return render(request, 'lecturers/unit_dashboard.html', context)
+
+
+@login_required
+@lecturer_required
+def lecturer_course_detail(request, assignment_id):
+    """Detailed view of a specific course assignment for lecturer"""
+    
+    lecturer = request.role.get_lecturer()
+    assignment = get_object_or_404(
+        LecturerCourseAssignment,
+        id=assignment_id,
+        lecturer=lecturer,
+        is_active=True
+    )
+    
+    # Get enrolled students
+    enrollments = Enrollment.objects.filter(
+        course=assignment.course,
+        semester=assignment.semester,
+        is_active=True
+    ).select_related('student__user', 'student__programme').order_by('student__user__first_name')
+    
+    # Get course assignments
+    course_assignments = Assignment.objects.filter(
+        lecturer_assignment=assignment,
+        is_active=True
+    ).order_by('-posted_date')
+    
+    # Get course notes
+    course_notes = CourseNotes.objects.filter(
+        lecturer_assignment=assignment,
+        is_active=True
+    ).order_by('-posted_date')
+    
+    # Get recent announcements
+    recent_announcements = AssignmentAnnouncement.objects.filter(
+        assignment__lecturer_assignment=assignment,
+        is_active=True
+    ).order_by('-posted_date')[:5]
+    
+    # Statistics
+    stats = {
+        'enrolled_students': enrollments.count(),
+        'total_assignments': course_assignments.count(),
+        'published_assignments': course_assignments.filter(is_published=True).count(),
+        'total_notes': course_notes.count(),
+        'total_announcements': recent_announcements.count()
+    }
+    
+    # Get submission statistics for each assignment
+    assignment_submission_stats = []
+    for assign in course_assignments.filter(is_published=True):
+        submissions = AssignmentSubmission.objects.filter(assignment=assign)
+        assignment_submission_stats.append({
+            'assignment': assign,
+            'total_submissions': submissions.count(),
+            'submitted_count': submissions.filter(is_submitted=True).count(),
+            'pending_grading': submissions.filter(is_submitted=True, grading_status='pending').count(),
+            'graded_count': submissions.filter(grading_status='graded').count()
+        })
+    
+    context = {
+        'lecturer': lecturer,
+        'assignment': assignment,
+        'enrollments': enrollments,
+        'course_assignments': course_assignments,
+        'course_notes': course_notes,
+        'recent_announcements': recent_announcements,
+        'stats': stats,
+        'assignment_submission_stats': assignment_submission_stats
+    }
+    
+    return render(request, 'lecturers/course_detail.html', context)
+
+
+@login_required
+@lecturer_required
+def create_assignment(request, assignment_id):
+    """Create new assignment for a course"""
+    
+    lecturer = request.role.get_lecturer()
+    course_assignment = get_object_or_404(
+        LecturerCourseAssignment,
+        id=assignment_id,
+        lecturer=lecturer,
+        is_active=True
+    )
+    
+    if request.method == 'POST':
+        try:
+            # Get form data
+            title = request.POST.get('title')
+            assignment_type = request.POST.get('assignment_type')
+            description = request.POST.get('description')
+            instructions = request.POST.get('instructions', '')
+            due_date = request.POST.get('due_date')
+            total_marks = request.POST.get('total_marks')
+            weight_percentage = request.POST.get('weight_percentage')
+            submission_format = request.POST.get('submission_format')
+            max_file_size_mb = request.POST.get('max_file_size_mb', 10)
+            late_submission_allowed = request.POST.get('late_submission_allowed') == 'on'
+            late_submission_penalty = request.POST.get('late_submission_penalty', '')
+            is_published = request.POST.get('is_published') == 'on'
+            
+            # Validate required fields
+            if not all([title, assignment_type, description, due_date, total_marks, weight_percentage]):
+                messages.error(request, 'Please fill in all required fields.')
+                return redirect('create_assignment', assignment_id=assignment_id)
+            
+            # Create assignment
+            assignment = Assignment.objects.create(
+                lecturer_assignment=course_assignment,
+                title=title,
+                assignment_type=assignment_type,
+                description=description,
+                instructions=instructions,
+                due_date=due_date,
+                total_marks=int(total_marks),
+                weight_percentage=float(weight_percentage),
+                submission_format=submission_format,
+                max_file_size_mb=int(max_file_size_mb),
+                late_submission_allowed=late_submission_allowed,
+                late_submission_penalty=late_submission_penalty,
+                is_published=is_published
+            )
+            
+            # Handle file upload
+            if 'assignment_file' in request.FILES:
+                assignment.assignment_file = request.FILES['assignment_file']
+                assignment.save()
+            
+            messages.success(request, f'Assignment "{title}" created successfully.')
+            return redirect('lecturer_course_detail', assignment_id=assignment_id)
+            
+        except Exception as e:
+            messages.error(request, f'Error creating assignment: {str(e)}')
+            return redirect('create_assignment', assignment_id=assignment_id)
+    
+    context = {
+        'lecturer': lecturer,
+        'course_assignment': course_assignment,
+        'assignment_types': Assignment.ASSIGNMENT_TYPES,
+        'submission_formats': Assignment.SUBMISSION_FORMATS
+    }
+    
+    return render(request, 'lecturers/create_assignment.html', context)
+
+
+@login_required
+@lecturer_required
+def create_course_notes(request, assignment_id):
+    """Create new course notes"""
+    
+    lecturer = request.role.get_lecturer()
+    course_assignment = get_object_or_404(
+        LecturerCourseAssignment,
+        id=assignment_id,
+        lecturer=lecturer,
+        is_active=True
+    )
+    
+    if request.method == 'POST':
+        try:
+            # Get form data
+            title = request.POST.get('title')
+            note_type = request.POST.get('note_type')
+            description = request.POST.get('description', '')
+            topic = request.POST.get('topic', '')
+            week_number = request.POST.get('week_number')
+            is_public = request.POST.get('is_public') == 'on'
+            
+            # Validate required fields
+            if not all([title, note_type]) or 'notes_file' not in request.FILES:
+                messages.error(request, 'Title, note type, and file are required.')
+                return redirect('create_course_notes', assignment_id=assignment_id)
+            
+            # Create notes
+            notes = CourseNotes.objects.create(
+                lecturer_assignment=course_assignment,
+                title=title,
+                note_type=note_type,
+                description=description,
+                topic=topic,
+                week_number=int(week_number) if week_number else None,
+                is_public=is_public,
+                notes_file=request.FILES['notes_file']
+            )
+            
+            # Set file size
+            if notes.notes_file:
+                notes.file_size = notes.notes_file.size
+                notes.save()
+            
+            messages.success(request, f'Notes "{title}" uploaded successfully.')
+            return redirect('lecturer_course_detail', assignment_id=assignment_id)
+            
+        except Exception as e:
+            messages.error(request, f'Error uploading notes: {str(e)}')
+            return redirect('create_course_notes', assignment_id=assignment_id)
+    
+    context = {
+        'lecturer': lecturer,
+        'course_assignment': course_assignment,
+        'note_types': CourseNotes.NOTE_TYPES
+    }
+    
+    return render(request, 'lecturers/create_notes.html', context)
+
+
+@login_required
+@lecturer_required
+def create_announcement(request, assignment_id):
+    """Create announcement for an assignment"""
+    
+    lecturer = request.role.get_lecturer()
+    
+    if request.method == 'POST':
+        try:
+            assignment_pk = request.POST.get('assignment_pk')
+            title = request.POST.get('title')
+            message = request.POST.get('message')
+            is_urgent = request.POST.get('is_urgent') == 'on'
+            
+            if not all([assignment_pk, title, message]):
+                return JsonResponse({'success': False, 'message': 'All fields are required.'})
+            
+            # Verify assignment belongs to lecturer
+            assignment = get_object_or_404(
+                Assignment,
+                id=assignment_pk,
+                lecturer_assignment__lecturer=lecturer,
+                is_active=True
+            )
+            
+            # Create announcement
+            announcement = AssignmentAnnouncement.objects.create(
+                assignment=assignment,
+                title=title,
+                message=message,
+                is_urgent=is_urgent
+            )
+            
+            return JsonResponse({
+                'success': True,
+                'message': 'Announcement created successfully.',
+                'announcement': {
+                    'id': announcement.id,
+                    'title': announcement.title,
+                    'message': announcement.message,
+                    'is_urgent': announcement.is_urgent,
+                    'posted_date': announcement.posted_date.strftime('%Y-%m-%d %H:%M')
+                }
+            })
+            
+        except Exception as e:
+            return JsonResponse({'success': False, 'message': str(e)})
+    
+    return JsonResponse({'success': False, 'message': 'Invalid request method.'})
+
+
+@login_required
+def assignment_submissions_list(request, assignment_id):
+    """View all submissions for a specific assignment"""
+    assignment = get_object_or_404(Assignment, id=assignment_id)
+    lecturer_assignment = assignment.lecturer_assignment
+    
+    # Verify lecturer has access to this assignment
+    if request.role.lecturer is None:
+        messages.error(request, "Access denied. Only lecturers can view submissions.")
+        return redirect('lecturer_unit_dashboard')
+    
+    lecturer = request.role.lecturer
+    if lecturer_assignment.lecturer != lecturer:
+        messages.error(request, "You don't have permission to view these submissions.")
+        return redirect('lecturer_unit_dashboard')
+    
+    # Get all enrolled students for this course and semester
+    enrolled_students = Enrollment.objects.filter(
+        course=lecturer_assignment.course,
+        semester=lecturer_assignment.semester,
+        is_active=True
+    ).select_related('student__user', 'student__programme')
+    
+    # Get all submissions for this assignment
+    submissions = AssignmentSubmission.objects.filter(
+        assignment=assignment
+    ).select_related('student__user', 'student__programme')
+    
+    # Create a comprehensive list combining enrolled students and their submissions
+    submission_data = []
+    submitted_student_ids = set(submissions.values_list('student_id', flat=True))
+    
+    for enrollment in enrolled_students:
+        student = enrollment.student
+        try:
+            submission = submissions.get(student=student)
+        except AssignmentSubmission.DoesNotExist:
+            submission = None
+        
+        submission_data.append({
+            'student': student,
+            'enrollment': enrollment,
+            'submission': submission,
+            'has_submitted': submission is not None and submission.is_submitted,
+            'is_late': submission.is_late if submission else False,
+            'is_graded': submission and submission.grading_status == 'graded',
+        })
+    
+    # Sort by submission status and student name
+    submission_data.sort(key=lambda x: (
+        not x['has_submitted'],  # Submitted first
+        x['is_late'],  # On-time submissions before late ones
+        x['student'].user.last_name
+    ))
+    
+    # Pagination
+    paginator = Paginator(submission_data, 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Statistics
+    total_enrolled = enrolled_students.count()
+    total_submitted = submissions.filter(is_submitted=True).count()
+    total_graded = submissions.filter(grading_status='graded').count()
+    total_pending = total_submitted - total_graded
+    late_submissions = submissions.filter(is_late=True, is_submitted=True).count()
+    
+    # Grade statistics
+    graded_submissions = submissions.filter(grading_status='graded', marks_obtained__isnull=False)
+    avg_score = graded_submissions.aggregate(avg_score=Avg('percentage_score'))['avg_score']
+    
+    context = {
+        'assignment': assignment,
+        'lecturer_assignment': lecturer_assignment,
+        'submission_data': page_obj,
+        'page_obj': page_obj,
+        'stats': {
+            'total_enrolled': total_enrolled,
+            'total_submitted': total_submitted,
+            'total_graded': total_graded,
+            'total_pending': total_pending,
+            'late_submissions': late_submissions,
+            'submission_rate': round((total_submitted / total_enrolled * 100), 1) if total_enrolled > 0 else 0,
+            'avg_score': round(avg_score, 1) if avg_score else 0,
+        }
+    }
+    
+    return render(request, 'assignment/assignment_submissions_list.html', context)
+
+
+@login_required
+def grade_submission(request, submission_id):
+    """Grade a specific submission"""
+    submission = get_object_or_404(AssignmentSubmission, id=submission_id)
+    assignment = submission.assignment
+    lecturer_assignment = assignment.lecturer_assignment
+    
+    # Verify lecturer has access
+    if request.role.lecturer is None:
+        messages.error(request, "Access denied.")
+        return redirect('lecturer_unit_dashboard')
+    
+    lecturer = request.role.lecturer
+    if lecturer_assignment.lecturer != lecturer:
+        messages.error(request, "You don't have permission to grade this submission.")
+        return redirect('lecturer_unit_dashboard')
+    
+    if request.method == 'POST':
+        try:
+            marks_obtained = Decimal(request.POST.get('marks_obtained', 0))
+            lecturer_feedback = request.POST.get('lecturer_feedback', '')
+            
+            # Validate marks
+            if marks_obtained < 0 or marks_obtained > assignment.total_marks:
+                messages.error(request, f"Marks must be between 0 and {assignment.total_marks}")
+                return redirect('grade_submission', submission_id=submission_id)
+            
+            # Update submission
+            submission.marks_obtained = marks_obtained
+            submission.lecturer_feedback = lecturer_feedback
+            submission.grading_status = 'graded'
+            submission.graded_date = timezone.now()
+            submission.graded_by = request.user
+            submission.save()
+            
+            messages.success(request, f"Submission graded successfully. Score: {submission.percentage_score}%")
+            
+            # Redirect to next ungraded submission or back to list
+            next_submission = AssignmentSubmission.objects.filter(
+                assignment=assignment,
+                grading_status='pending',
+                is_submitted=True
+            ).exclude(id=submission_id).first()
+            
+            if next_submission and request.POST.get('grade_next'):
+                return redirect('grade_submission', submission_id=next_submission.id)
+            else:
+                return redirect('assignment_submissions_list', assignment_id=assignment.id)
+                
+        except (ValueError, TypeError) as e:
+            messages.error(request, "Invalid marks entered. Please enter a valid number.")
+    
+    # Get next and previous submissions for navigation
+    all_submissions = AssignmentSubmission.objects.filter(
+        assignment=assignment,
+        is_submitted=True
+    ).order_by('student__user__last_name')
+    
+    submission_ids = list(all_submissions.values_list('id', flat=True))
+    current_index = submission_ids.index(submission.id) if submission.id in submission_ids else 0
+    
+    next_submission = None
+    prev_submission = None
+    if current_index < len(submission_ids) - 1:
+        next_submission = AssignmentSubmission.objects.get(id=submission_ids[current_index + 1])
+    if current_index > 0:
+        prev_submission = AssignmentSubmission.objects.get(id=submission_ids[current_index - 1])
+    
+    context = {
+        'submission': submission,
+        'assignment': assignment,
+        'lecturer_assignment': lecturer_assignment,
+        'next_submission': next_submission,
+        'prev_submission': prev_submission,
+        'current_position': current_index + 1,
+        'total_submissions': len(submission_ids),
+    }
+    
+    return render(request, 'assignment/grade_submission.html', context)
+
+
+@login_required
+def download_submission(request, submission_id):
+    """
+    Download (or, with ?inline=1, preview) a submission file, or its
+    feedback file with ?file=feedback. Open to the student who submitted it,
+    the course lecturer and staff.
+    """
+    from ..media_delivery import serve_file, teaches
+    
+    submission = get_object_or_404(
+        AssignmentSubmission.objects.select_related('assignment__lecturer_assignment', 'student'),
+        id=submission_id
+    )
+    lecturer_assignment = submission.assignment.lecturer_assignment
+    
+    allowed = (
+        submission.student.user_id == request.user.pk
+        or request.user.is_staff
+        or teaches(request.user, lecturer_assignment.course_id, lecturer_assignment.semester_id)
+    )
+    if not allowed:
+        return HttpResponseForbidden("You don't have permission to download this file.")
+    
+    if request.GET.get('file') == 'feedback':
+        field_file, filename = submission.feedback_file, None
+    else:
+        field_file, filename = submission.submission_file, submission.original_filename or None
+    if not field_file:
+        raise Http404("File not found")
+    
+    try:
+        return serve_file(request, field_file, filename=filename, as_attachment=not request.GET.get('inline'))
+    except (FileNotFoundError, OSError):
+        raise Http404("File not found")
+
+
+@login_required
+@require_http_methods(["POST"])
+def quick_grade_submission(request, submission_id):
+    """Quick grade submission via AJAX"""
+    submission = get_object_or_404(AssignmentSubmission, id=submission_id)
+    assignment = submission.assignment
+    lecturer_assignment = assignment.lecturer_assignment
+    
+    # Verify lecturer has access
+    if request.role.lecturer is None:
+        return JsonResponse({'success': False, 'message': 'Access denied'})
+    
+    lecturer = request.role.lecturer
+    if lecturer_assignment.lecturer != lecturer:
+        return JsonResponse({'success': False, 'message': 'Permission denied'})
+    
+    try:
+        data = json.loads(request.body)
+        marks_obtained = Decimal(str(data.get('marks_obtained', 0)))
+        feedback = data.get('feedback', '')
+        
+        # Validate marks
+        if marks_obtained < 0 or marks_obtained > assignment.total_marks:
+            return JsonResponse({
+                'success': False, 
+                'message': f'Marks must be between 0 and {assignment.total_marks}'
+            })
+        
+        # Update submission
+        submission.marks_obtained = marks_obtained
+        submission.lecturer_feedback = feedback
+        submission.grading_status = 'graded'
+        submission.graded_date = timezone.now()
+        submission.graded_by = request.user
+        submission.save()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Submission graded successfully',
+            'percentage_score': float(submission.percentage_score),
+            'graded_date': submission.graded_date.strftime('%Y-%m-%d %H:%M')
+        })
+        
+    except (ValueError, TypeError, json.JSONDecodeError) as e:
+        return JsonResponse({'success': False, 'message': 'Invalid data provided'})
+
+
+@login_required
+def bulk_grade_submissions(request, assignment_id):
+    """Bulk grade multiple submissions"""
+    assignment = get_object_or_404(Assignment, id=assignment_id)
+    lecturer_assignment = assignment.lecturer_assignment
+    
+    # Verify lecturer has access
+    if request.role.lecturer is None:
+        messages.error(request, "Access denied.")
+        return redirect('lecturer_unit_dashboard')
+    
+    lecturer = request.role.lecturer
+    if lecturer_assignment.lecturer != lecturer:
+        messages.error(request, "Permission denied.")
+        return redirect('lecturer_unit_dashboard')
+    
+    if request.method == 'POST':
+        try:
+            graded_count = 0
+            errors = []
+            
+            for key, value in request.POST.items():
+                if key.startswith('marks_'):
+                    submission_id = key.replace('marks_', '')
+                    try:
+                        submission = AssignmentSubmission.objects.get(
+                            id=submission_id, 
+                            assignment=assignment
+                        )
+                        marks = Decimal(str(value)) if value else None
+                        feedback = request.POST.get(f'feedback_{submission_id}', '')
+                        
+                        if marks is not None:
+                            if marks < 0 or marks > assignment.total_marks:
+                                errors.append(f"Invalid marks for {submission.student.user.get_full_name()}")
+                                continue
+                            
+                            submission.marks_obtained = marks
+                            submission.lecturer_feedback = feedback
+                            submission.grading_status = 'graded'
+                            submission.graded_date = timezone.now()
+                            submission.graded_by = request.user
+                            submission.save()
+                            graded_count += 1
+                            
+                    except (AssignmentSubmission.DoesNotExist, ValueError, TypeError):
+                        errors.append(f"Error grading submission {submission_id}")
+            
+            if graded_count > 0:
+                messages.success(request, f"Successfully graded {graded_count} submissions.")
+            
+            if errors:
+                messages.warning(request, f"Errors occurred: {'; '.join(errors)}")
+            
+            return redirect('assignment_submissions_list', assignment_id=assignment_id)
+            
+        except Exception as e:
+            messages.error(request, "An error occurred during bulk grading.")
+    
+    # Get all submitted but ungraded submissions
+    submissions = AssignmentSubmission.objects.filter(
+        assignment=assignment,
+        is_submitted=True
+    ).select_related('student__user').order_by('student__user__last_name')
+    
+    context = {
+        'assignment': assignment,
+        'lecturer_assignment': lecturer_assignment,
+        'submissions': submissions,
+    }
+    
+    return render(request, 'assignment/bulk_grade_submissions.html', context)
+
+
+@login_required
+def submission_statistics(request, assignment_id):
+    """View detailed statistics for assignment submissions"""
+    assignment = get_object_or_404(Assignment, id=assignment_id)
+    lecturer_assignment = assignment.lecturer_assignment
+    
+    # Verify lecturer has access
+    if request.role.lecturer is None:
+        return JsonResponse({'error': 'Access denied'})
+    
+    lecturer = request.role.lecturer
+    if lecturer_assignment.lecturer != lecturer:
+        return JsonResponse({'error': 'Permission denied'})
+    
+    submissions = AssignmentSubmission.objects.filter(assignment=assignment, is_submitted=True)
+    
+    # Grade distribution
+    grade_ranges = [
+        {'name': 'A (80-100)', 'min': 80, 'max': 100, 'count': 0},
+        {'name': 'B (70-79)', 'min': 70, 'max': 79, 'count': 0},
+        {'name': 'C (60-69)', 'min': 60, 'max': 69, 'count': 0},
+        {'name': 'D (50-59)', 'min': 50, 'max': 59, 'count': 0},
+        {'name': 'F (0-49)', 'min': 0, 'max': 49, 'count': 0},
+    ]
+    
+    for submission in submissions.filter(grading_status='graded'):
+        score = submission.percentage_score or 0
+        for grade_range in grade_ranges:
+            if grade_range['min'] <= score <= grade_range['max']:
+                grade_range['count'] += 1
+                break
+    
+    stats = {
+        'total_enrolled': Enrollment.objects.filter(
+            course=lecturer_assignment.course,
+            semester=lecturer_assignment.semester,
+            is_active=True
+        ).count(),
+        'total_submitted': submissions.count(),
+        'total_graded': submissions.filter(grading_status='graded').count(),
+        'late_submissions': submissions.filter(is_late=True).count(),
+        'avg_score': submissions.filter(
+            grading_status='graded', 
+            percentage_score__isnull=False
+        ).aggregate(avg=Avg('percentage_score'))['avg'] or 0,
+        'grade_distribution': grade_ranges,
+    }
+    
+    return JsonResponse(stats)
+
+
+@login_required
+def lecturer_timetable_view(request):
+    """View for lecturers to see their teaching schedule"""
+    try:
+        # Get lecturer profile
+        lecturer = request.role.lecturer_or_404()
+        
+        # Get current academic year and semester
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        current_semester = Semester.objects.filter(is_current=True).first()
+        
+        if not current_academic_year or not current_semester:
+            context = {
+                'error': 'No active academic year or semester found.',
+                'lecturer': lecturer,
+            }
+            return render(request, 'lecturers/lecturer_timetable.html', context)
+        
+        # Get lecturer's teaching assignments for current semester
+        timetable_entries = Timetable.objects.filter(
+            lecturer=lecturer,
+            semester=current_semester,
+            is_active=True
+        ).select_related('course', 'programme').order_by('day_of_week', 'start_time')
+        
+        if not timetable_entries.exists():
+            context = {
+                'error': 'No teaching assignments found for current semester.',
+                'lecturer': lecturer,
+                'current_academic_year': current_academic_year,
+                'current_semester': current_semester,
+            }
+            return render(request, 'lecturers/lecturer_timetable.html', context)
+        
+        # Define time slots
+        time_slots = [
+            {'start': time(7, 0), 'end': time(10, 0), 'label': '7:00 - 10:00 AM'},
+            {'start': time(10, 0), 'end': time(13, 0), 'label': '10:00 - 1:00 PM'},
+            {'start': time(14, 0), 'end': time(17, 0), 'label': '2:00 - 5:00 PM'},
+            {'start': time(17, 0), 'end': time(19, 0), 'label': '5:00 - 7:00 PM'},
+        ]
+        
+        # Days of the week
+        days_of_week = [
+            {'key': 'monday', 'label': 'Monday'},
+            {'key': 'tuesday', 'label': 'Tuesday'},
+            {'key': 'wednesday', 'label': 'Wednesday'},
+            {'key': 'thursday', 'label': 'Thursday'},
+            {'key': 'friday', 'label': 'Friday'},
+            {'key': 'saturday', 'label': 'Saturday'},
+        ]
+        
+        # Organize timetable data - group multiple courses in same time slot
+        timetable_grid = defaultdict(lambda: defaultdict(list))
+        
+        for entry in timetable_entries:
+            # Find matching time slot
+            for slot in time_slots:
+                if entry.start_time >= slot['start'] and entry.start_time < slot['end']:
+                    timetable_grid[entry.day_of_week][slot['start']].append(entry)
+                    break
+        
+        # Get unique courses and programmes
+        unique_courses = timetable_entries.values_list('course__code', 'course__name').distinct()
+        unique_programmes = timetable_entries.values_list('programme__code', 'programme__name').distinct()
+        
+        # Calculate statistics
+        total_courses = len(unique_courses)
+        total_classes = timetable_entries.count()
+        total_programmes = len(unique_programmes)
+        
+        # Get weekly teaching hours
+        weekly_hours = 0
+        for entry in timetable_entries:
+            # Calculate duration in hours
+            start_datetime = entry.start_time
+            end_datetime = entry.end_time
+            duration = (end_datetime.hour - start_datetime.hour) + (end_datetime.minute - start_datetime.minute) / 60.0
+            weekly_hours += duration
+        
+        context = {
+            'lecturer': lecturer,
+            'current_academic_year': current_academic_year,
+            'current_semester': current_semester,
+            'timetable_grid': dict(timetable_grid),
+            'time_slots': time_slots,
+            'days_of_week': days_of_week,
+            'timetable_entries': timetable_entries,
+            'unique_courses': unique_courses,
+            'unique_programmes': unique_programmes,
+            'stats': {
+                'total_courses': total_courses,
+                'total_classes': total_classes,
+                'total_programmes': total_programmes,
+                'weekly_hours': round(weekly_hours, 1),
+            }
+        }
+        
+        return render(request, 'lecturers/lecturer_timetable.html', context)
+        
+    except Lecturer.DoesNotExist:
+        context = {
+            'error': 'Lecturer profile not found.',
+        }
+        return render(request, 'lecturers/lecturer_timetable.html', context)
+    
+    except Exception as e:
+        context = {
+            'error': f'An error occurred: {str(e)}',
+        }
+        return render(request, 'lecturers/lecturer_timetable.html', context)
+
+
+def lecturer_support(request):
+    return render( request, 'lecturers/support.html')
+
+
+def lecturer_training(request):
+    return render( request, 'lecturers/lecturer_training.html')
+
+
+def curriculum(request):
+    return render( request, 'lecturers/curriculum.html')
+
+
+@login_required
+def grade_entry(request):
+    """Main grade entry page for lecturers"""
+    # Ensure user is a lecturer
+    try:
+        lecturer = request.role.get_lecturer()
+    except:
+        messages.error(request, "Access denied. Only lecturers can access this page.")
+        return redirect('lecturer_dashboard')
+    
+    # Get current academic year and semester
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get all academic years and semesters for the dropdown
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    semesters = Semester.objects.all().order_by('-academic_year__year', '-semester_number')
+    
+    # Get lecturer's assigned courses for current semester
+    lecturer_assignments = LecturerCourseAssignment.objects.filter(
+        lecturer=lecturer,
+        is_active=True
+    ).select_related('course', 'academic_year', 'semester')
+    
+    context = {
+        'lecturer': lecturer,
+        'current_academic_year': current_academic_year,
+        'current_semester': current_semester,
+        'academic_years': academic_years,
+        'semesters': semesters,
+        'lecturer_assignments': lecturer_assignments,
+    }
+    
+    return render(request, 'lecturers/grade_entry.html', context)
+
+
+@login_required
+@require_http_methods(["POST"])
+def save_grades(request):
+    """AJAX view to save/update student grades"""
+    try:
+        lecturer = request.role.get_lecturer()
+    except:
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    try:
+        data = json.loads(request.body)
+        grades_data = data.get('grades', [])
+        
+        if not grades_data:
+            return JsonResponse({'error': 'No grade data provided'}, status=400)
+        
+        saved_grades = []
+        errors = []
+        
+        with transaction.atomic():
+            for grade_item in grades_data:
+                try:
+                    enrollment_id = grade_item.get('enrollment_id')
+                    enrollment = get_object_or_404(Enrollment, id=enrollment_id)
+                    
+                    # Verify lecturer has permission to grade this enrollment
+                    lecturer_assignment = LecturerCourseAssignment.objects.filter(
+                        lecturer=lecturer,
+                        course=enrollment.course,
+                        academic_year=enrollment.semester.academic_year,
+                        semester=enrollment.semester,
+                        is_active=True
+                    ).first()
+                    
+                    if not lecturer_assignment:
+                        errors.append(f"No permission to grade {enrollment.course.code}")
+                        continue
+                    
+                    # Get or create grade object
+                    grade, created = Grade.objects.get_or_create(
+                        enrollment=enrollment,
+                        defaults={'exam_date': enrollment.semester.end_date}
+                    )
+                    
+                    # Update grade fields
+                    continuous_assessment = grade_item.get('continuous_assessment')
+                    final_exam = grade_item.get('final_exam')
+                    practical_marks = grade_item.get('practical_marks')
+                    project_marks = grade_item.get('project_marks')
+                    remarks = grade_item.get('remarks', '')
+                    
+                    # Validate and set marks
+                    if continuous_assessment is not None and continuous_assessment != '':
+                        if 0 <= float(continuous_assessment) <= 40:
+                            grade.continuous_assessment = float(continuous_assessment)
+                        else:
+                            errors.append(f"{enrollment.course.code}: CAT marks must be between 0-40")
+                            continue
+                    
+                    if final_exam is not None and final_exam != '':
+                        if 0 <= float(final_exam) <= 60:
+                            grade.final_exam = float(final_exam)
+                        else:
+                            errors.append(f"{enrollment.course.code}: Final exam marks must be between 0-60")
+                            continue
+                    
+                    if practical_marks is not None and practical_marks != '':
+                        if 0 <= float(practical_marks) <= 100:
+                            grade.practical_marks = float(practical_marks)
+                        else:
+                            errors.append(f"{enrollment.course.code}: Practical marks must be between 0-100")
+                            continue
+                    
+                    if project_marks is not None and project_marks != '':
+                        if 0 <= float(project_marks) <= 100:
+                            grade.project_marks = float(project_marks)
+                        else:
+                            errors.append(f"{enrollment.course.code}: Project marks must be between 0-100")
+                            continue
+                    
+                    grade.remarks = remarks
+                    grade.save()  # This will trigger the grade calculation in the model
+                    
+                    saved_grades.append({
+                        'course_code': enrollment.course.code,
+                        'total_marks': float(grade.total_marks) if grade.total_marks else 0,
+                        'grade': grade.grade,
+                        'grade_points': float(grade.grade_points) if grade.grade_points else 0,
+                        'is_passed': grade.is_passed
+                    })
+                    
+                except ValueError as e:
+                    errors.append(f"{enrollment.course.code}: Invalid numeric value")
+                except Exception as e:
+                    errors.append(f"{enrollment.course.code}: {str(e)}")
+        
+        if errors:
+            return JsonResponse({
+                'success': False,
+                'errors': errors,
+                'saved_grades': saved_grades
+            }, status=400)
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Successfully saved grades for {len(saved_grades)} courses',
+            'saved_grades': saved_grades
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+@reference_endpoint
+def get_semesters_by_year(request):
+    """AJAX view to get semesters for a specific academic year"""
+    academic_year_id = request.GET.get('academic_year_id')
+    
+    if not academic_year_id:
+        return JsonResponse({'error': 'Academic year ID required'}, status=400)
+    
+    try:
+        semesters = reference_data.select('semesters', academic_year_id=parse_id(academic_year_id))
+        
+        return JsonResponse({
+            'success': True,
+            'semesters': pick(semesters, 'id', 'semester_number', 'start_date', 'end_date')
+        })
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def my_students(request):
+    """Main view showing lecturer's assigned courses and students"""
+    # Ensure user is a lecturer
+    try:
+        lecturer = request.role.get_lecturer()
+    except:
+        messages.error(request, "Access denied. Only lecturers can access this page.")
+        return redirect('lecturer_dashboard')
+    
+    # Get current academic year and semester
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get all academic years and semesters for the dropdown
+    academic_years = AcademicYear.objects.all().order_by('-year')
+    semesters = Semester.objects.all().order_by('-academic_year__year', '-semester_number')
+    
+    # Get lecturer's course assignments for current semester
+    lecturer_assignments = LecturerCourseAssignment.objects.filter(
+        lecturer=lecturer,
+        is_active=True
+    ).select_related('course', 'academic_year', 'semester').prefetch_related(
+        'course__enrollments__student__user'
+    )
+    
+    # Get course statistics
+    course_stats = []
+    for assignment in lecturer_assignments:
+        # Get enrolled students for this course in this semester
+        enrolled_students = Enrollment.objects.filter(
+            course=assignment.course,
+            semester=assignment.semester,
+            is_active=True
+        ).select_related('student__user')
+        
+        # Get attendance sessions for this course
+        attendance_sessions = AttendanceSession.objects.filter(
+            timetable_slot__course=assignment.course,
+            semester=assignment.semester,
+            lecturer=lecturer
+        ).count()
+        
+        # Calculate average attendance
+        total_sessions = attendance_sessions
+        if total_sessions > 0:
+            total_possible_attendance = enrolled_students.count() * total_sessions
+            present_count = Attendance.objects.filter(
+                timetable_slot__course=assignment.course,
+                attendance_session__semester=assignment.semester,
+                status__in=['present', 'late']
+            ).count()
+            attendance_percentage = round((present_count / total_possible_attendance * 100), 1) if total_possible_attendance > 0 else 0
+        else:
+            attendance_percentage = 0
+        
+        course_stats.append({
+            'assignment': assignment,
+            'student_count': enrolled_students.count(),
+            'attendance_sessions': total_sessions,
+            'attendance_percentage': attendance_percentage,
+            'students': enrolled_students
+        })
+    
+    context = {
+        'lecturer': lecturer,
+        'current_academic_year': current_academic_year,
+        'current_semester': current_semester,
+        'academic_years': academic_years,
+        'semesters': semesters,
+        'course_stats': course_stats,
+        'total_courses': lecturer_assignments.count(),
+        'total_students': sum(stat['student_count'] for stat in course_stats),
+    }
+    
+    return render(request, 'lecturers/my_students.html', context)
+
+
+@login_required
+@require_http_methods(["GET", "POST"])
+def lecturer_profile(request):
+    """
+    Handle lecturer profile view and updates
+    """
+    # Check if user is a lecturer
+    if request.user.user_type not in ['lecturer', 'professor']:
+        messages.error(request, "Access denied. This page is for lecturers only.")
+        return redirect('login')
+    
+    try:
+        lecturer = request.role.get_lecturer()
+    except Lecturer.DoesNotExist:
+        messages.error(request, "Lecturer profile not found. Please contact the administrator.")
+        return redirect('lecturer_dashboard')
+    
+    if request.method == 'POST':
+        return handle_lecturer_profile_update(request, lecturer)
+    
+    context = {
+        'lecturer': lecturer,
+        'departments': Department.objects.filter(is_active=True),
+    }
+    
+    return render(request, 'lecturers/lecturer_profile.html', context)
+
+
+def handle_lecturer_profile_update(request, lecturer):
+    """
+    Handle POST requests for lecturer profile updates
+    """
+    user = request.user
+    
+    # Handle profile picture upload
+    if 'profile_picture' in request.FILES:
+        profile_picture = request.FILES['profile_picture']
+        
+        # Validate file type
+        allowed_extensions = ['jpg', 'jpeg', 'png', 'gif']
+        file_extension = profile_picture.name.split('.')[-1].lower()
+        
+        if file_extension not in allowed_extensions:
+            messages.error(request, "Invalid file type. Please upload JPG, JPEG, PNG, or GIF files only.")
+            return redirect('lecturer_profile')
+        
+        # Validate file size (5MB limit)
+        if profile_picture.size > 5 * 1024 * 1024:
+            messages.error(request, "File size too large. Please upload files smaller than 5MB.")
+            return redirect('lecturer_profile')
+        
+        # Delete old profile picture if exists
+        if user.profile_picture:
+            if default_storage.exists(user.profile_picture.name):
+                default_storage.delete(user.profile_picture.name)
+        
+        user.profile_picture = profile_picture
+        user.save()
+        messages.success(request, "Profile picture updated successfully!")
+        return redirect('lecturer_profile')
+    
+    # Handle personal details update
+    if any(field in request.POST for field in ['first_name', 'last_name', 'phone', 'email', 'address']):
+        try:
+            # Update user fields
+            if 'first_name' in request.POST:
+                user.first_name = request.POST.get('first_name', '').strip()
+            if 'last_name' in request.POST:
+                user.last_name = request.POST.get('last_name', '').strip()
+            if 'phone' in request.POST:
+                user.phone = request.POST.get('phone', '').strip()
+            if 'email' in request.POST:
+                email = request.POST.get('email', '').strip()
+                if email and User.objects.exclude(id=user.id).filter(email=email).exists():
+                    messages.error(request, "This email address is already in use.")
+                    return redirect('lecturer_profile')
+                user.email = email
+            if 'address' in request.POST:
+                user.address = request.POST.get('address', '').strip()
+            
+            user.save()
+            messages.success(request, "Personal details updated successfully!")
+            
+        except Exception as e:
+            messages.error(request, f"Error updating personal details: {str(e)}")
+    
+    # Handle professional details update
+    if any(field in request.POST for field in [
+        'academic_rank', 'employment_type', 'highest_qualification', 'university_graduated',
+        'graduation_year', 'research_interests', 'publications', 'professional_registration',
+        'teaching_experience_years', 'research_experience_years', 'industry_experience_years',
+        'office_location', 'office_phone', 'consultation_hours'
+    ]):
+        try:
+            # Update lecturer fields
+            if 'academic_rank' in request.POST:
+                lecturer.academic_rank = request.POST.get('academic_rank', lecturer.academic_rank)
+            if 'employment_type' in request.POST:
+                lecturer.employment_type = request.POST.get('employment_type', lecturer.employment_type)
+            if 'highest_qualification' in request.POST:
+                lecturer.highest_qualification = request.POST.get('highest_qualification', '').strip()
+            if 'university_graduated' in request.POST:
+                lecturer.university_graduated = request.POST.get('university_graduated', '').strip()
+            if 'graduation_year' in request.POST:
+                graduation_year = request.POST.get('graduation_year', '').strip()
+                lecturer.graduation_year = int(graduation_year) if graduation_year.isdigit() else lecturer.graduation_year
+            if 'research_interests' in request.POST:
+                lecturer.research_interests = request.POST.get('research_interests', '').strip()
+            if 'publications' in request.POST:
+                lecturer.publications = request.POST.get('publications', '').strip()
+            if 'professional_registration' in request.POST:
+                lecturer.professional_registration = request.POST.get('professional_registration', '').strip()
+            if 'teaching_experience_years' in request.POST:
+                teaching_exp = request.POST.get('teaching_experience_years', '0').strip()
+                lecturer.teaching_experience_years = int(teaching_exp) if teaching_exp.isdigit() else lecturer.teaching_experience_years
+            if 'research_experience_years' in request.POST:
+                research_exp = request.POST.get('research_experience_years', '0').strip()
+                lecturer.research_experience_years = int(research_exp) if research_exp.isdigit() else lecturer.research_experience_years
+            if 'industry_experience_years' in request.POST:
+                industry_exp = request.POST.get('industry_experience_years', '0').strip()
+                lecturer.industry_experience_years = int(industry_exp) if industry_exp.isdigit() else lecturer.industry_experience_years
+            if 'office_location' in request.POST:
+                lecturer.office_location = request.POST.get('office_location', '').strip()
+            if 'office_phone' in request.POST:
+                lecturer.office_phone = request.POST.get('office_phone', '').strip()
+            if 'consultation_hours' in request.POST:
+                lecturer.consultation_hours = request.POST.get('consultation_hours', '').strip()
+            
+            lecturer.save()
+            messages.success(request, "Professional details updated successfully!")
+            
+        except ValueError as e:
+            messages.error(request, "Invalid input for numeric fields. Please check your entries.")
+        except Exception as e:
+            messages.error(request, f"Error updating professional details: {str(e)}")
+    
+    # Handle password change
+    if all(field in request.POST for field in ['current_password', 'new_password1', 'new_password2']):
+        current_password = request.POST.get('current_password')
+        new_password1 = request.POST.get('new_password1')
+        new_password2 = request.POST.get('new_password2')
+        
+        # Validate current password
+        if not user.check_password(current_password):
+            messages.error(request, "Current password is incorrect.")
+            return redirect('lecturer_profile')
+        
+        # Validate new passwords match
+        if new_password1 != new_password2:
+            messages.error(request, "New passwords do not match.")
+            return redirect('lecturer_profile')
+        
+        # Validate password strength (basic validation)
+        if len(new_password1) < 8:
+            messages.error(request, "New password must be at least 8 characters long.")
+            return redirect('lecturer_profile')
+        
+        try:
+            user.set_password(new_password1)
+            user.save()
+            update_session_auth_hash(request, user)  # Keep user logged in
+            messages.success(request, "Password changed successfully!")
+        except Exception as e:
+            messages.error(request, f"Error changing password: {str(e)}")
+    
+    return redirect('lecturer_profile')
+
+
+# Alternative AJAX view for profile picture upload (optional)
+@login_required
+@require_http_methods(["POST"])
+def lecturer_profile_picture_upload(request):
+    """
+    Handle AJAX profile picture upload for lecturers
+    """
+    if request.user.user_type not in ['lecturer', 'professor']:
+        return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
+    
+    if 'profile_picture' not in request.FILES:
+        return JsonResponse({'success': False, 'error': 'No file uploaded'}, status=400)
+    
+    profile_picture = request.FILES['profile_picture']
+    
+    # Validate file type
+    allowed_extensions = ['jpg', 'jpeg', 'png', 'gif']
+    file_extension = profile_picture.name.split('.')[-1].lower()
+    
+    if file_extension not in allowed_extensions:
+        return JsonResponse({
+            'success': False, 
+            'error': 'Invalid file type. Please upload JPG, JPEG, PNG, or GIF files only.'
+        }, status=400)
+    
+    # Validate file size (5MB limit)
+    if profile_picture.size > 5 * 1024 * 1024:
+        return JsonResponse({
+            'success': False, 
+            'error': 'File size too large. Please upload files smaller than 5MB.'
+        }, status=400)
+    
+    try:
+        user = request.user
+        
+        # Delete old profile picture if exists
+        if user.profile_picture:
+            if default_storage.exists(user.profile_picture.name):
+                default_storage.delete(user.profile_picture.name)
+        
+        user.profile_picture = profile_picture
+        user.save()
+        
+        return JsonResponse({
+            'success': True, 
+            'message': 'Profile picture updated successfully!',
+            'profile_picture_url': user.profile_picture.url if user.profile_picture else None
+        })
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
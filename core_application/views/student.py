@@ -0,0 +1,2317 @@
+# student.py - Student portal: dashboard, units, assignments, grades, fees,
+# exam repository, applications, messages and notifications
+
+from collections import defaultdict
+from datetime import time, timedelta
+from decimal import Decimal
+import json
+import logging
+import os
+
+from django.contrib import messages
+from django.contrib.auth import authenticate, update_session_auth_hash
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Sum
+from django.http import HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods, require_POST
+
+from ..forms import (
+    ClearanceRequestForm, DefermentApplicationForm, MessageForm, MessageReplyForm,
+    SpecialExamApplicationForm, StudentCommentForm,
+)
+from ..models import (
+    AcademicYear, Assignment, AssignmentAnnouncement, AssignmentSubmission, ClearanceRequest,
+    ClubEvent, ClubMembership, CommonQuestion, Course, CourseNotes, DefermentApplication,
+    Enrollment, Event, EventRegistration, ExamMaterialDownload, ExamRepository, FeePayment,
+    FeeStructure, Grade, LecturerCourseAssignment, Message, NewsArticle, NotesDownload,
+    ProgrammeCourse, QuickLink, Semester, SpecialExamApplication, Student, StudentClub,
+    StudentComment, StudentNotification, StudentReporting, Timetable, User,
+)
+from ..models_registration import CourseWaitlistEntry
+from ..registration_control import admission_gate, join_waitlist, leave_waitlist, reserve_seat, seat_availability
+
+logger = logging.getLogger(__name__)
+
+
+@login_required
+def student_dashboard(request):
+    """Main dashboard for logged-in students"""
+    if request.user.user_type != 'student':
+        return redirect('login_view')
+    
+    student = request.role.student_or_404()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+    
+    # Initialize variables
+    current_enrollments = []
+    is_on_holiday = False
+    next_semester_date = None
+    fee_balance = Decimal('0.00')
+    
+    # Check if student is on holiday (semester mismatch logic)
+    if current_semester and student.programme.semesters_per_year >= current_semester.semester_number:
+        # Student is in a valid semester period
+        if student.current_semester != current_semester.semester_number:
+            # Check if student is ahead (on holiday)
+            if student.current_semester > current_semester.semester_number:
+                is_on_holiday = True
+                # Calculate approximate next semester start date
+                next_semester_date = current_semester.end_date + timedelta(days=30)  # Approximate
+                messages.info(
+                    request, 
+                    f"🌴 Happy holidays! Enjoy your break. The next semester is expected to start around {next_semester_date.strftime('%B %d, %Y')}."
+                )
+    
+    # Get current semester enrollments (only if not on holiday)
+    if not is_on_holiday and current_semester:
+        current_enrollments = Enrollment.objects.filter(
+            student=student,
+            semester=current_semester,
+            is_active=True
+        ).select_related('course')
+    
+    # Calculate fee balance for current semester and academic year
+    if current_academic_year:
+        # Get fee structure for current student's year, semester, and programme
+        fee_structure = FeeStructure.objects.filter(
+            programme=student.programme,
+            academic_year=current_academic_year,
+            year=student.current_year,
+            semester=student.current_semester
+        ).first()
+        
+        if fee_structure:
+            # Calculate total fee required
+            total_fee_required = fee_structure.net_fee()  # This includes subsidies
+            
+            # Calculate total payments made for this fee structure
+            total_payments = FeePayment.objects.filter(
+                student=student,
+                fee_structure=fee_structure,
+                payment_status='completed'
+            ).aggregate(
+                total=Sum('amount_paid')
+            )['total'] or Decimal('0.00')
+            
+            # Calculate balance (negative means overpayment)
+            fee_balance = total_fee_required - total_payments
+        else:
+            # No fee structure found - check if there are any payments
+            # for current academic year and student's current semester
+            fee_structures = FeeStructure.objects.filter(
+                programme=student.programme,
+                academic_year=current_academic_year,
+                year=student.current_year
+            )
+            
+            if fee_structures.exists():
+                # Use the first available fee structure as fallback
+                fee_structure = fee_structures.first()
+                total_fee_required = fee_structure.net_fee()
+                
+                total_payments = FeePayment.objects.filter(
+                    student=student,
+                    fee_structure__in=fee_structures,
+                    payment_status='completed'
+                ).aggregate(
+                    total=Sum('amount_paid')
+                )['total'] or Decimal('0.00')
+                
+                fee_balance = total_fee_required - total_payments
+    
+    # Calculate semester progress
+    total_semesters = student.programme.total_semesters
+    completed_semesters = (student.current_year - 1) * student.programme.semesters_per_year + (student.current_semester - 1)
+    progress_percentage = (completed_semesters / total_semesters) * 100 if total_semesters > 0 else 0
+    
+    # Add contextual message for fee balance
+    if fee_balance == 0:
+        fee_status_message = "✅ Fees fully paid for current semester"
+        messages.success(request, fee_status_message)
+    elif fee_balance < 0:
+        overpayment = abs(fee_balance)
+        fee_status_message = f"💰 You have an overpayment of KES {overpayment:,.2f}"
+        messages.info(request, fee_status_message)
+    else:
+        fee_status_message = f"⚠️ Outstanding fee balance: KES {fee_balance:,.2f}"
+        if fee_balance > 10000:  # High balance warning
+            messages.warning(request, "Please settle your fee balance to avoid academic holds.")
+    
+    context = {
+        'student': student,
+        'current_semester': current_semester,
+        'current_academic_year': current_academic_year,
+        'current_enrollments': current_enrollments,
+        'progress_percentage': round(progress_percentage, 1),
+        'completed_semesters': completed_semesters,
+        'total_semesters': total_semesters,
+        'fee_balance': fee_balance,
+        'is_on_holiday': is_on_holiday,
+        'next_semester_date': next_semester_date,
+        'total_enrolled_units': len(current_enrollments),
+    }
+    
+    return render(request, 'student/dashboard.html', context)
+
+
+@login_required
+def student_profile(request):
+    try:
+        student = request.role.get_student()
+    except:
+        messages.error(request, 'Student profile not found.')
+        return redirect('login_view')  # or wherever you want to redirect
+    
+    if request.method == 'POST':
+        # Handle AJAX profile picture upload
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest' and 'profile_picture' in request.FILES:
+            try:
+                request.user.profile_picture = request.FILES['profile_picture']
+                request.user.save()
+                return JsonResponse({'success': True, 'message': 'Profile picture updated successfully!'})
+            except Exception as e:
+                return JsonResponse({'success': False, 'message': f'Error updating profile picture: {str(e)}'})
+        
+        # Handle profile picture upload (non-AJAX)
+        if 'profile_picture' in request.FILES:
+            try:
+                request.user.profile_picture = request.FILES['profile_picture']
+                request.user.save()
+                messages.success(request, 'Profile picture updated successfully!')
+                return redirect('student_profile')
+            except Exception as e:
+                messages.error(request, f'Error updating profile picture: {str(e)}')
+                return redirect('student_profile')
+        
+        # Handle custom password change (allows any password)
+        if 'current_password' in request.POST:
+            current_password = request.POST.get('current_password')
+            new_password1 = request.POST.get('new_password1')
+            new_password2 = request.POST.get('new_password2')
+            
+            # Check if current password is correct
+            if not authenticate(username=request.user.username, password=current_password):
+                messages.error(request, 'Current password is incorrect.')
+                return redirect('student_profile#Password')
+            
+            # Check if new passwords match
+            if new_password1 != new_password2:
+                messages.error(request, 'New passwords do not match.')
+                return redirect('student_profile#Password')
+            
+            # Check if new password is not empty
+            if not new_password1:
+                messages.error(request, 'New password cannot be empty.')
+                return redirect('student_profile#Password')
+            
+            # Set the new password (bypassing Django's default validators)
+            try:
+                request.user.set_password(new_password1)
+                request.user.save()
+                update_session_auth_hash(request, request.user)  # Keep user logged in
+                messages.success(request, 'Password changed successfully!')
+                return redirect('student_profile')
+            except Exception as e:
+                messages.error(request, f'Error changing password: {str(e)}')
+                return redirect('student_profile#Password')
+        
+        # Handle profile updates
+        try:
+            # Update User model fields
+            user_fields = {
+                'first_name': request.POST.get('first_name', '').strip(),
+                'last_name': request.POST.get('last_name', '').strip(),
+                'email': request.POST.get('email', '').strip(),
+                'phone': request.POST.get('phone', '').strip(),
+                'address': request.POST.get('address', '').strip(),
+            }
+            
+            # Only update fields that have values in the POST data
+            for field, value in user_fields.items():
+                if field in request.POST:
+                    setattr(request.user, field, value)
+            
+            # Update Student model fields
+            student_fields = {
+                'guardian_name': request.POST.get('guardian_name', '').strip(),
+                'guardian_phone': request.POST.get('guardian_phone', '').strip(),
+                'guardian_relationship': request.POST.get('guardian_relationship', '').strip(),
+                'guardian_address': request.POST.get('guardian_address', '').strip(),
+                'emergency_contact': request.POST.get('emergency_contact', '').strip(),
+                'blood_group': request.POST.get('blood_group', '').strip(),
+                'medical_conditions': request.POST.get('medical_conditions', '').strip(),
+            }
+            
+            # Only update fields that have values in the POST data
+            for field, value in student_fields.items():
+                if field in request.POST:
+                    setattr(student, field, value)
+            
+            # Save both models
+            request.user.save()
+            student.save()
+            messages.success(request, 'Profile updated successfully!')
+            
+        except Exception as e:
+            messages.error(request, f'Error updating profile: {str(e)}')
+        
+        return redirect('student_profile')
+    
+    # GET request - display the profile
+    context = {
+        'student': student,
+    }
+    return render(request, 'student/student_profile.html', context)
+
+
+@login_required
+@admission_gate('registration')
+def student_units_view(request):
+    """
+    View for student course enrollment, history, and curriculum display
+    """
+    # Get student profile
+    try:
+        student = Student.objects.select_related(
+            'user', 'programme', 'programme__department', 'programme__faculty'
+        ).get(user=request.user)
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('dashboard')
+    
+    # Get current semester
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Check if registration is open
+    show_registration = False
+    if current_semester:
+        today = timezone.now().date()
+        show_registration = (
+            current_semester.registration_start_date <= today <= current_semester.registration_end_date
+        )
+    
+    # Get ALL courses the student has ever enrolled in (across all semesters)
+    all_enrolled_course_ids = Enrollment.objects.filter(
+        student=student
+    ).values_list('course_id', flat=True)
+    
+    # Get available courses for registration
+    available_courses = []
+    if show_registration and current_semester:
+        # Get programme courses for student's current year and semester
+        programme_courses = ProgrammeCourse.objects.select_related('course').filter(
+            programme=student.programme,
+            year=student.current_year,
+            semester=student.current_semester,
+            is_active=True,
+            course__is_active=True
+        )
+        
+        # Get already enrolled courses for current semester
+        current_semester_enrolled_course_ids = Enrollment.objects.filter(
+            student=student,
+            semester=current_semester,
+            is_active=True
+        ).values_list('course_id', flat=True)
+        
+        # Seats left per capacity-limited course, read from the counters
+        seats_left = seat_availability(
+            current_semester, [pc.course_id for pc in programme_courses]
+        )
+        waitlisted_course_ids = set(CourseWaitlistEntry.objects.filter(
+            student=student, semester=current_semester, status='waiting'
+        ).values_list('course_id', flat=True))
+        
+        # Filter out courses already enrolled in current semester AND courses ever enrolled
+        for programme_course in programme_courses:
+            course = programme_course.course
+            
+            # Check if student has ever taken this course (across all semesters)
+            has_ever_taken = course.id in all_enrolled_course_ids
+            
+            # Check if currently enrolled in this course this semester
+            currently_enrolled = course.id in current_semester_enrolled_course_ids
+            
+            if not currently_enrolled:
+                # Add course with information about previous enrollment
+                course.previously_enrolled = has_ever_taken
+                course.seats_available = seats_left.get(course.id)
+                course.waitlisted = course.id in waitlisted_course_ids
+                available_courses.append(course)
+    
+    # Get enrollment history (include both active and inactive enrollments)
+    enrollments = Enrollment.objects.select_related(
+        'course', 'semester', 'semester__academic_year', 'lecturer'
+    ).filter(
+        student=student
+    ).order_by('-semester__academic_year__year', '-semester__semester_number', 'course__code')
+    
+    # Group enrollments by academic year and semester
+    enrollment_history = {}
+    for enrollment in enrollments:
+        year_key = enrollment.semester.academic_year.year
+        sem_key = f"Semester {enrollment.semester.semester_number}"
+        
+        if year_key not in enrollment_history:
+            enrollment_history[year_key] = {}
+        if sem_key not in enrollment_history[year_key]:
+            enrollment_history[year_key][sem_key] = []
+            
+        enrollment_history[year_key][sem_key].append(enrollment)
+    
+    # Get complete curriculum
+    curriculum_data = {}
+    programme_courses = ProgrammeCourse.objects.select_related('course').filter(
+        programme=student.programme,
+        is_active=True,
+        course__is_active=True
+    ).order_by('year', 'semester', 'course__name')
+    
+    for programme_course in programme_courses:
+        year_key = programme_course.year
+        sem_key = f"Semester {programme_course.semester}"
+        
+        if year_key not in curriculum_data:
+            curriculum_data[year_key] = {}
+        if sem_key not in curriculum_data[year_key]:
+            curriculum_data[year_key][sem_key] = []
+            
+        # Mark if student has taken this course (any semester)
+        course = programme_course.course
+        course.enrolled = course.id in all_enrolled_course_ids
+        curriculum_data[year_key][sem_key].append(course)
+    
+    # Handle POST request for course enrollment
+    if request.method == 'POST':
+        return handle_course_enrollment(request, student, current_semester, available_courses, all_enrolled_course_ids)
+    
+    context = {
+        'student': student,
+        'current_semester': current_semester,
+        'show_registration': show_registration,
+        'available_units': available_courses,
+        'enrollment_history': enrollment_history,
+        'curriculum_data': curriculum_data,
+        'all_enrolled_course_ids': list(all_enrolled_course_ids),
+    }
+    
+    return render(request, 'student/units.html', context)
+
+
+def handle_course_enrollment(request, student, current_semester, available_courses, all_enrolled_course_ids):
+    """
+    Handle course enrollment logic with duplicate prevention
+    """
+    if not current_semester:
+        messages.error(request, 'No active semester found.')
+        return redirect('student_units')
+    
+    # Check if registration is still open
+    today = timezone.now().date()
+    if not (current_semester.registration_start_date <= today <= current_semester.registration_end_date):
+        messages.error(request, 'Registration period has ended.')
+        return redirect('student_units')
+    
+    # Get selected course IDs
+    selected_course_ids = request.POST.getlist('units')
+    
+    if not selected_course_ids:
+        messages.error(request, 'Please select at least one course to register.')
+        return redirect('student_units')
+    
+    # Validate selected courses
+    valid_course_ids = [course.id for course in available_courses]
+    invalid_selections = [course_id for course_id in selected_course_ids 
+                         if int(course_id) not in valid_course_ids]
+    
+    if invalid_selections:
+        messages.error(request, 'Some selected courses are not available for registration.')
+        return redirect('student_units')
+    
+    # Check for prerequisite violations
+    prerequisite_violations = []
+    enrolled_courses = Enrollment.objects.filter(
+        student=student,
+        is_active=True
+    ).values_list('course_id', flat=True)
+    
+    for course_id in selected_course_ids:
+        try:
+            course = Course.objects.get(id=course_id)
+            missing_prerequisites = []
+            
+            for prerequisite in course.prerequisites.all():
+                if prerequisite.id not in enrolled_courses:
+                    missing_prerequisites.append(prerequisite.code)
+            
+            if missing_prerequisites:
+                prerequisite_violations.append({
+                    'course': course.code,
+                    'missing': missing_prerequisites
+                })
+        except Course.DoesNotExist:
+            continue
+    
+    if prerequisite_violations:
+        violation_messages = []
+        for violation in prerequisite_violations:
+            violation_messages.append(
+                f"{violation['course']}: Missing prerequisites {', '.join(violation['missing'])}"
+            )
+        messages.error(request, 'Prerequisite violations found: ' + '; '.join(violation_messages))
+        return redirect('student_units')
+    
+    # Perform enrollment in a transaction
+    try:
+        with transaction.atomic():
+            enrolled_count = 0
+            failed_enrollments = []
+            repeat_enrollments = []
+            waitlisted_courses = []
+            
+            for course_id in selected_course_ids:
+                try:
+                    course = Course.objects.get(id=course_id)
+                    
+                    # Check if student has ever taken this course before (across all semesters)
+                    previously_enrolled = int(course_id) in all_enrolled_course_ids
+                    
+                    # Check if already enrolled in current semester (double-check)
+                    existing_enrollment = Enrollment.objects.filter(
+                        student=student,
+                        course=course,
+                        semester=current_semester
+                    ).first()
+                    
+                    if existing_enrollment:
+                        if existing_enrollment.is_active:
+                            failed_enrollments.append(f"{course.code} - Already enrolled this semester")
+                        elif not reserve_seat(course.id, current_semester.id):
+                            if join_waitlist(student, course, current_semester)[0]:
+                                waitlisted_courses.append(course.code)
+                            else:
+                                failed_enrollments.append(f"{course.code} - Course is full")
+                        else:
+                            # Reactivate inactive enrollment and mark as repeat if previously enrolled
+                            existing_enrollment.is_active = True
+                            existing_enrollment.is_repeat = previously_enrolled
+                            existing_enrollment.enrollment_date = timezone.now().date()
+                            existing_enrollment._seat_reserved = True
+                            existing_enrollment.save()
+                            enrolled_count += 1
+                            if previously_enrolled:
+                                repeat_enrollments.append(course.code)
+                    elif not reserve_seat(course.id, current_semester.id):
+                        # Course is full - queue the student for the next free seat
+                        if join_waitlist(student, course, current_semester)[0]:
+                            waitlisted_courses.append(course.code)
+                        else:
+                            failed_enrollments.append(f"{course.code} - Course is full")
+                    else:
+                        # Create new enrollment and mark as repeat if previously enrolled
+                        enrollment = Enrollment(
+                            student=student,
+                            course=course,
+                            semester=current_semester,
+                            enrollment_date=timezone.now().date(),
+                            is_active=True,
+                            is_repeat=previously_enrolled
+                        )
+                        enrollment._seat_reserved = True
+                        enrollment.save()
+                        enrolled_count += 1
+                        if previously_enrolled:
+                            repeat_enrollments.append(course.code)
+                        
+                except Course.DoesNotExist:
+                    failed_enrollments.append(f"Course ID {course_id} - Not found")
+                except IntegrityError:
+                    failed_enrollments.append(f"{course.code} - Duplicate enrollment detected")
+                except Exception as e:
+                    failed_enrollments.append(f"Course ID {course_id} - {str(e)}")
+            
+            # Provide feedback
+            if enrolled_count > 0:
+                success_message = f'Successfully enrolled in {enrolled_count} course{"s" if enrolled_count != 1 else ""}.'
+                if repeat_enrollments:
+                    success_message += f' Repeat courses: {", ".join(repeat_enrollments)}'
+                messages.success(request, success_message)
+            
+            if failed_enrollments:
+                messages.warning(
+                    request, 
+                    f'Failed enrollments: {"; ".join(failed_enrollments)}'
+                )
+            
+            if waitlisted_courses:
+                messages.info(
+                    request,
+                    f'Full courses - you have been waitlisted for: {", ".join(waitlisted_courses)}'
+                )
+            
+            if enrolled_count == 0 and not failed_enrollments and not waitlisted_courses:
+                messages.info(request, 'No new enrollments were processed.')
+                
+    except Exception as e:
+        messages.error(request, f'Enrollment failed: {str(e)}')
+    
+    return redirect('student_units')
+
+
+@login_required
+@require_POST
+def leave_course_waitlist(request, course_id):
+    """Give up a place in the queue for a full course"""
+    student = request.role.student_or_404()
+    course = get_object_or_404(Course, id=course_id)
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    if current_semester and leave_waitlist(student, course, current_semester):
+        messages.success(request, f'You have left the waitlist for {course.code}.')
+    else:
+        messages.info(request, f'You are not on the waitlist for {course.code}.')
+    return redirect('student_units')
+
+
+# Additional helper view for AJAX requests (optional)
+@login_required
+@admission_gate('registration')
+def check_prerequisites_ajax(request):
+    """
+    AJAX endpoint to check prerequisites for selected courses
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request method'}, status=405)
+    
+    try:
+        student = request.role.get_student()
+        course_ids = request.POST.getlist('course_ids')
+        
+        # Get student's completed/enrolled courses
+        enrolled_courses = Enrollment.objects.filter(
+            student=student,
+            is_active=True
+        ).values_list('course_id', flat=True)
+        
+        prerequisite_info = []
+        
+        for course_id in course_ids:
+            try:
+                course = Course.objects.get(id=course_id)
+                missing_prerequisites = []
+                
+                for prerequisite in course.prerequisites.all():
+                    if prerequisite.id not in enrolled_courses:
+                        missing_prerequisites.append({
+                            'code': prerequisite.code,
+                            'name': prerequisite.name
+                        })
+                
+                prerequisite_info.append({
+                    'course_id': course.id,
+                    'course_code': course.code,
+                    'course_name': course.name,
+                    'missing_prerequisites': missing_prerequisites,
+                    'can_enroll': len(missing_prerequisites) == 0
+                })
+                
+            except Course.DoesNotExist:
+                prerequisite_info.append({
+                    'course_id': course_id,
+                    'error': 'Course not found'
+                })
+        
+        return JsonResponse({
+            'success': True,
+            'prerequisite_info': prerequisite_info
+        })
+        
+    except Student.DoesNotExist:
+        return JsonResponse({'error': 'Student profile not found'}, status=404)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+# View for getting course details (optional)
+@login_required
+def course_details_ajax(request, course_id):
+    """
+    AJAX endpoint to get detailed course information
+    """
+    try:
+        course = Course.objects.select_related('department').prefetch_related('prerequisites').get(
+            id=course_id, 
+            is_active=True
+        )
+        
+        prerequisites = [
+            {
+                'id': prereq.id,
+                'code': prereq.code,
+                'name': prereq.name
+            } for prereq in course.prerequisites.all()
+        ]
+        
+        course_data = {
+            'id': course.id,
+            'code': course.code,
+            'name': course.name,
+            'description': course.description,
+            'credit_hours': course.credit_hours,
+            'course_type': course.get_course_type_display(),
+            'level': course.get_level_display(),
+            'department': course.department.name if course.department else None,
+            'prerequisites': prerequisites,
+            'learning_outcomes': course.learning_outcomes,
+            'assessment_methods': course.assessment_methods,
+            'recommended_textbooks': course.recommended_textbooks,
+        }
+        
+        return JsonResponse({
+            'success': True,
+            'course': course_data
+        })
+        
+    except Course.DoesNotExist:
+        return JsonResponse({'error': 'Course not found'}, status=404)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def student_reporting(request):
+    student = request.role.student_or_404()
+    current_semester = Semester.objects.filter(is_current=True).first()
+    reports = StudentReporting.objects.filter(student=student).order_by('-reporting_date')
+    
+    # Check if student has already reported for current semester
+    has_reported = False
+    if current_semester:
+        has_reported = StudentReporting.objects.filter(
+            student=student,
+            semester=current_semester
+        ).exists()
+    
+    # Calculate student's current semester number (across all years)
+    total_semesters_completed = StudentReporting.objects.filter(
+        student=student, 
+        status='approved'
+    ).count()
+    
+    current_semester_number = total_semesters_completed + 1
+    
+    # Check if student can report to this semester based on programme limits
+    can_report = True
+    error_message = ""
+    
+    if current_semester:
+        # Check if student has exceeded programme semester limit
+        if current_semester_number > student.programme.total_semesters:
+            can_report = False
+            error_message = f"Cannot report. Your programme ({student.programme.name}) has a maximum of {student.programme.total_semesters} semesters."
+        
+        # Check if student is trying to report to a semester that doesn't match their programme structure
+        programme_semesters_per_year = student.programme.semesters_per_year
+        current_semester_in_year = (current_semester_number - 1) % programme_semesters_per_year + 1
+        
+        if current_semester.semester_number != current_semester_in_year:
+            can_report = False
+            error_message = f"Cannot report to Semester {current_semester.semester_number}. Your programme structure requires Semester {current_semester_in_year} at this stage."
+    
+    if request.method == 'POST':
+        if not current_semester:
+            messages.error(request, "No active semester found for reporting.")
+            return redirect('student_dashboard')
+        
+        if has_reported:
+            messages.error(request, f"You have already reported for {current_semester}.")
+            return redirect('student_reporting')
+        
+        if not can_report:
+            messages.error(request, error_message)
+            return redirect('student_reporting')
+        
+        remarks = request.POST.get('remarks', '')
+        
+        try:
+            # Create new reporting record
+            StudentReporting.objects.create(
+                student=student,
+                semester=current_semester,
+                reporting_type='online',
+                remarks=remarks,
+                status='approved'  # Auto-approve online reporting
+            )
+            
+            messages.success(request, f"Successfully reported for {current_semester}!")
+            return redirect('student_reporting')
+            
+        except Exception as e:
+            messages.error(request, f"Error submitting report: {str(e)}")
+    
+    context = {
+        'student': student,
+        'current_semester': current_semester,
+        'reports': reports,
+        'has_reported': has_reported,
+        'can_report': can_report,
+        'error_message': error_message,
+        'current_semester_number': current_semester_number,
+        'total_semesters_completed': total_semesters_completed,
+        'programme_max_semesters': student.programme.total_semesters,
+    }
+    return render(request, 'student/student_reporting.html', context)
+
+
+@login_required
+def student_news(request):
+    # Get all news articles, ordered by most recent first
+    news_articles = NewsArticle.objects.filter(is_published=True).order_by('-publish_date')
+    
+    context = {
+        'news_articles': news_articles,
+        'featured_article': news_articles.first() if news_articles.exists() else None,
+        'regular_articles': news_articles[1:4] if news_articles.count() > 1 else [],
+        'older_articles': news_articles[4:] if news_articles.count() > 4 else []
+    }
+    return render(request, 'news/student_news.html', context)
+
+
+@login_required
+def student_comments(request):
+    student = request.role.student_or_404()
+    
+    if request.method == 'POST':
+        form = StudentCommentForm(request.POST)
+        if form.is_valid():
+            comment = form.save(commit=False)
+            comment.student = student
+            comment.save()
+            messages.success(request, 'Your comment has been submitted successfully!')
+            return redirect('student_comments')
+    else:
+        form = StudentCommentForm()
+    
+    comments = StudentComment.objects.filter(student=student).order_by('-created_at')
+    
+    context = {
+        'student': student,
+        'form': form,
+        'comments': comments,
+    }
+    return render(request, 'comments/comments.html', context)
+
+
+@login_required
+def faqs(request): 
+    return render(request, 'settings/faqs.html')
+
+
+@login_required
+def virtual_assistant(request):
+    # Get the current user
+    user = request.user
+    
+    # Fetch data from database models
+    common_questions = CommonQuestion.objects.all()
+    quick_links = QuickLink.objects.all()
+    
+    # Prepare context
+    context = {
+        'user': user,
+        'common_questions': common_questions,
+        'quick_links': quick_links,
+    }
+    
+    return render(request, 'assistant/virtual_assistant.html', context)
+
+
+@login_required
+@require_POST
+def process_assistant_query(request):
+    try:
+        data = json.loads(request.body)
+        query = data.get('query', '').lower()
+        
+        # Simple response logic - would normally integrate with NLP/AI
+        responses = {
+            'results': 'Exam results are available on the student portal under "Academic Records".',
+            'lecture': 'Lecture materials can be found on the LMS or by contacting your lecturer.',
+            'hostel': 'Hostel applications open twice a year. Check the accommodation office for dates.',
+            'fee': 'Fee payment can be made via MPesa or bank deposit. See the finance office for details.',
+            'library': 'The library is open from 8am to 9pm weekdays, 9am to 4pm weekends.',
+            'default': "I'm sorry, I didn't understand that. Could you rephrase your question?"
+        }
+        
+        response_text = responses['default']
+        for keyword in responses:
+            if keyword in query and keyword != 'default':
+                response_text = responses[keyword]
+                break
+        
+        return JsonResponse({'response': response_text})
+    
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+
+@login_required
+def student_clubs(request):
+    clubs = StudentClub.objects.filter(is_active=True).order_by('name')
+    user_memberships = ClubMembership.objects.filter(student=request.user, is_active=True)
+    
+    # Create a dictionary to hold executive members for each club
+    club_executives = {}
+    for club in clubs:
+        club_executives[club.id] = club.members.filter(is_executive=True)
+    
+    context = {
+        'clubs': clubs,
+        'user_memberships': user_memberships,
+        'categories': dict(StudentClub.CATEGORY_CHOICES),
+        'club_executives': club_executives
+    }
+    return render(request, 'clubs/student_clubs.html', context)
+
+
+@login_required
+def join_club(request, club_id):
+    club = StudentClub.objects.get(id=club_id)
+    if not ClubMembership.objects.filter(student=request.user, club=club).exists():
+        ClubMembership.objects.create(student=request.user, club=club)
+    return redirect('student_clubs')
+
+
+@login_required
+def leave_club(request, club_id):
+    membership = ClubMembership.objects.filter(student=request.user, club_id=club_id).first()
+    if membership:
+        membership.delete()
+    return redirect('student_clubs')
+
+
+@login_required
+def club_events(request, club_id=None):
+    now = timezone.now()
+    
+    # Get events based on club_id or all clubs
+    if club_id:
+        club = StudentClub.objects.get(id=club_id)
+        events = ClubEvent.objects.filter(club=club)
+    else:
+        club = None
+        events = ClubEvent.objects.all()
+    
+    # Categorize events
+    upcoming_events = events.filter(start_datetime__gt=now).order_by('start_datetime')
+    latest_events = events.filter(start_datetime__lte=now, end_datetime__gte=now).order_by('start_datetime')
+    past_events = events.filter(end_datetime__lt=now).order_by('-start_datetime')[:10]  # Last 10 past events
+    
+    context = {
+        'club': club,
+        'upcoming_events': upcoming_events,
+        'latest_events': latest_events,
+        'past_events': past_events,
+    }
+    
+    return render(request, 'events/club_events.html', context)
+
+
+@login_required
+def student_events(request):
+    student = request.role.student_or_404()
+    
+    # Get upcoming events
+    upcoming_events = Event.objects.filter(
+        start_date__gte=timezone.now(),
+        is_public=True
+    ).order_by('start_date')
+    
+    # Get registered events
+    registered_events = EventRegistration.objects.filter(
+        user=request.user
+    ).select_related('event')
+    
+    context = {
+        'student': student,
+        'upcoming_events': upcoming_events,
+        'registered_events': registered_events,
+    }
+    return render(request, 'student/events.html', context)
+
+
+@login_required
+def register_event(request, event_id):
+    if request.method == 'POST':
+        event = get_object_or_404(Event, id=event_id)
+        
+        # Check if already registered
+        if EventRegistration.objects.filter(user=request.user, event=event).exists():
+            messages.error(request, 'You are already registered for this event')
+        else:
+            EventRegistration.objects.create(
+                user=request.user,
+                event=event
+            )
+            messages.success(request, 'Successfully registered for the event')
+        
+        return redirect('student_events')
+
+
+@login_required
+def student_transcript(request, student_id=None):
+    # Check if user is a student
+    if request.role.student is None:
+        return HttpResponseForbidden("Access denied. Students only.")
+    
+    student = request.role.student
+
+    # Get all enrollments for this student with related data
+    enrollments = Enrollment.objects.filter(
+        student=student,
+        is_active=True
+    ).select_related(
+        'course',
+        'semester',
+        'semester__academic_year'
+    ).prefetch_related(
+        'grade'
+    ).order_by('semester__academic_year__year', 'semester__semester_number', 'course__code')
+
+    # Organize data by academic year and semester
+    transcript_data = defaultdict(lambda: defaultdict(list))
+    
+    for enrollment in enrollments:
+        year = enrollment.semester.academic_year.year
+        semester_num = enrollment.semester.semester_number
+        
+        # Get grade information
+        grade_info = None
+        try:
+            grade_info = enrollment.grade
+        except Grade.DoesNotExist:
+            pass
+        
+        # Calculate total marks
+        total_marks = None
+        if grade_info and grade_info.total_marks:
+            total_marks = grade_info.total_marks
+        elif grade_info:
+            # Calculate from individual components if total_marks is not set
+            marks = []
+            if grade_info.theory_marks is not None:
+                marks.append(grade_info.theory_marks)
+            if grade_info.practical_marks is not None:
+                marks.append(grade_info.practical_marks)
+            if grade_info.clinical_marks is not None:
+                marks.append(grade_info.clinical_marks)
+            if grade_info.continuous_assessment is not None:
+                marks.append(grade_info.continuous_assessment)
+            if grade_info.final_exam_marks is not None:
+                marks.append(grade_info.final_exam_marks)
+            
+            if marks:
+                total_marks = sum(marks) / len(marks)
+        
+        subject_data = {
+            'unit': enrollment.course,
+            'enrollment': enrollment,
+            'grade': grade_info,
+            'theory_marks': grade_info.final_exam if grade_info else None,
+            'practical_marks': grade_info.practical_marks if grade_info else None,
+            'clinical_marks': grade_info.project_marks if grade_info else None,
+            'continuous_assessment': grade_info.continuous_assessment if grade_info else None,
+            'final_exam_marks': grade_info.total_marks if grade_info else None,
+            'total_marks': total_marks,
+            'grade_letter': grade_info.grade if grade_info else 'N/A',
+            'grade_points': grade_info.grade_points if grade_info else None,
+            'is_passed': grade_info.is_passed if grade_info else False,
+            'status': 'Passed' if (grade_info and grade_info.is_passed) else 'Failed' if grade_info else 'Pending'
+        }
+        
+        transcript_data[year][semester_num].append(subject_data)
+
+    # Convert to regular dict and sort
+    transcript_data = dict(transcript_data)
+    for year in transcript_data:
+        transcript_data[year] = dict(transcript_data[year])
+        for semester in transcript_data[year]:
+            transcript_data[year][semester].sort(key=lambda x: x['unit'].code)
+
+    # Calculate GPA for each semester and overall
+    semester_gpas = {}
+    overall_credits = 0
+    overall_grade_points = 0
+    total_subjects = 0
+    passed_subjects = 0
+    
+    for year in transcript_data:
+        for semester_num in transcript_data[year]:
+            semester_credits = 0
+            semester_grade_points = 0
+            
+            for subject_data in transcript_data[year][semester_num]:
+                total_subjects += 1
+                if subject_data['is_passed']:
+                    passed_subjects += 1
+                    
+                if subject_data['grade_points'] is not None:
+                    credits = subject_data['unit'].credit_hours
+                    grade_points = subject_data['grade_points']
+                    
+                    semester_credits += credits
+                    semester_grade_points += (grade_points * credits)
+                    
+                    overall_credits += credits
+                    overall_grade_points += (grade_points * credits)
+            
+            if semester_credits > 0:
+                semester_gpa = semester_grade_points / semester_credits
+                semester_gpas[f"{year}-{semester_num}"] = {
+                    'gpa': round(semester_gpa, 2),
+                    'credits': semester_credits
+                }
+
+    overall_gpa = round(overall_grade_points / overall_credits, 2) if overall_credits > 0 else 0
+    
+    # Calculate completion percentage based on programme requirements
+    programme_units = student.programme.programme_courses.filter(is_active=True)
+    total_programme_units = programme_units.count()
+    completed_percentage = round((passed_subjects / total_programme_units) * 100, 1) if total_programme_units > 0 else 0
+    
+    # Determine academic standing
+    if overall_gpa >= 3.5:
+        academic_standing = "Excellent"
+    elif overall_gpa >= 3.0:
+        academic_standing = "Good"
+    elif overall_gpa >= 2.5:
+        academic_standing = "Satisfactory"
+    elif overall_gpa >= 2.0:
+        academic_standing = "Fair"
+    else:
+        academic_standing = "Poor"
+
+    # Get academic year objects with their IDs for the dropdown
+    academic_years_in_transcript = []
+    for year_string in transcript_data.keys():
+        try:
+            # Find the academic year object by year string
+            academic_year_obj = AcademicYear.objects.get(year=year_string)
+            academic_years_in_transcript.append({
+                'id': academic_year_obj.id,
+                'year': year_string,
+                'object': academic_year_obj
+            })
+        except AcademicYear.DoesNotExist:
+            # If no exact match, you might need to handle this differently
+            # depending on your AcademicYear model structure
+            pass
+    
+    # Get all available academic years for the student
+    available_years = AcademicYear.objects.filter(
+        semesters__enrollments__student=student,
+        semesters__enrollments__is_active=True
+    ).distinct().order_by('-year')
+
+
+    context = {
+        'student': student,
+        'transcript_data': transcript_data,
+        'semester_gpas': semester_gpas,
+        'overall_gpa': overall_gpa,
+        'total_credits': overall_credits,
+        'completed_percentage': completed_percentage,
+        'academic_standing': academic_standing,
+        'total_subjects': total_subjects,
+        'passed_subjects': passed_subjects,
+
+        'transcript_type': 'Complete Academic Transcript',
+        'academic_year': None,
+        'available_years': available_years,
+        'academic_years_in_transcript': academic_years_in_transcript,  # New context variable
+        'current_academic_year': AcademicYear.objects.filter(is_current=True).first(),
+        'current_semester': Semester.objects.filter(is_current=True).first(),
+        'generated_date': timezone.now().strftime('%B %d, %Y at %I:%M %p'),
+    }
+    
+    return render(request, 'student/student_transcript.html', context)
+
+
+@login_required
+def student_transcript_preview(request, academic_year_id=None, semester_id=None):
+    """
+    Preview the transcript before downloading (same logic as PDF but returns HTML)
+    """
+    # This uses the same logic as the PDF view but returns HTML for preview
+    # You can reuse most of the code from student_transcript_pdf
+    # Just return render instead of PDF generation
+    pass
+
+
+#used for cats and notes
+@login_required
+def student_unit_dashboard(request):
+    """Main student dashboard showing enrolled courses and overview"""
+    try:
+        student = request.role.get_student()
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found. Please contact administrator.")
+        return redirect('login')
+    
+    # Get current semester
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get student's active enrollments for current semester
+    enrollments = Enrollment.objects.filter(
+        student=student,
+        semester=current_semester,
+        is_active=True
+    ).select_related(
+        'course', 'course__department', 'course__department__faculty', 'lecturer'
+    ).order_by('course__name')
+    
+    # Calculate statistics
+    total_courses = enrollments.count()
+    total_assignments = Assignment.objects.filter(
+        lecturer_assignment__course__in=[e.course for e in enrollments],
+        lecturer_assignment__semester=current_semester,
+        is_published=True
+    ).count()
+    
+    # Get pending assignments (not submitted)
+    submitted_assignments = AssignmentSubmission.objects.filter(
+        student=student,
+        is_submitted=True
+    ).values_list('assignment_id', flat=True)
+    
+    pending_assignments = Assignment.objects.filter(
+        lecturer_assignment__course__in=[e.course for e in enrollments],
+        lecturer_assignment__semester=current_semester,
+        is_published=True
+    ).exclude(id__in=submitted_assignments).count()
+    
+    # Get overdue assignments
+    overdue_assignments = Assignment.objects.filter(
+        lecturer_assignment__course__in=[e.course for e in enrollments],
+        lecturer_assignment__semester=current_semester,
+        is_published=True,
+        due_date__lt=timezone.now()
+    ).exclude(id__in=submitted_assignments).count()
+    
+    # Get recent announcements
+    recent_announcements = AssignmentAnnouncement.objects.filter(
+        assignment__lecturer_assignment__course__in=[e.course for e in enrollments],
+        assignment__lecturer_assignment__semester=current_semester,
+        is_active=True
+    ).order_by('-posted_date')[:5]
+    
+    # Course statistics for each enrollment
+    course_stats = []
+    for enrollment in enrollments:
+        course_assignments = Assignment.objects.filter(
+            lecturer_assignment__course=enrollment.course,
+            lecturer_assignment__semester=current_semester,
+            is_published=True
+        )
+        
+        submitted_count = AssignmentSubmission.objects.filter(
+            student=student,
+            assignment__in=course_assignments,
+            is_submitted=True
+        ).count()
+        
+        course_notes_count = CourseNotes.objects.filter(
+            lecturer_assignment__course=enrollment.course,
+            lecturer_assignment__semester=current_semester,
+            is_active=True,
+            is_public=True
+        ).count()
+        
+        course_stats.append({
+            'enrollment': enrollment,
+            'total_assignments': course_assignments.count(),
+            'submitted_assignments': submitted_count,
+            'pending_assignments': course_assignments.count() - submitted_count,
+            'notes_count': course_notes_count
+        })
+    
+    context = {
+        'student': student,
+        'current_semester': current_semester,
+        'enrollments': enrollments,
+        'course_stats': course_stats,
+        'total_courses': total_courses,
+        'total_assignments': total_assignments,
+        'pending_assignments': pending_assignments,
+        'overdue_assignments': overdue_assignments,
+        'recent_announcements': recent_announcements,
+    }
+    
+    return render(request, 'student/unit_dashboard.html', context)
+
+
+@login_required
+def student_course_detail(request, enrollment_id):
+    """Detailed view of a specific course with assignments and notes"""
+    try:
+        student = request.role.get_student()
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('login')
+    
+    enrollment = get_object_or_404(
+        Enrollment.objects.select_related(
+            'course', 'course__department', 'course__department__faculty', 
+            'lecturer', 'semester'
+        ),
+        id=enrollment_id,
+        student=student,
+        is_active=True
+    )
+    
+    # Get lecturer assignment for this course
+    lecturer_assignment = LecturerCourseAssignment.objects.filter(
+        course=enrollment.course,
+        semester=enrollment.semester,
+        is_active=True
+    ).first()
+    
+    # Get course assignments
+    assignments = Assignment.objects.filter(
+        lecturer_assignment=lecturer_assignment,
+        is_published=True
+    ).order_by('-posted_date')
+    
+    # Get student's submissions for these assignments
+    submissions = AssignmentSubmission.objects.filter(
+        student=student,
+        assignment__in=assignments
+    )
+    submission_dict = {sub.assignment_id: sub for sub in submissions}
+    
+    # Add submission status to assignments
+    for assignment in assignments:
+        assignment.student_submission = submission_dict.get(assignment.id)
+        assignment.is_submitted = assignment.id in submission_dict and submission_dict[assignment.id].is_submitted
+        assignment.is_late = assignment.due_date < timezone.now()
+        assignment.can_submit = not assignment.is_late or assignment.late_submission_allowed
+    
+    # Get course notes
+    course_notes = CourseNotes.objects.filter(
+        lecturer_assignment=lecturer_assignment,
+        is_active=True,
+        is_public=True
+    ).order_by('-posted_date')
+    
+    # Get recent announcements for this course
+    announcements = AssignmentAnnouncement.objects.filter(
+        assignment__lecturer_assignment=lecturer_assignment,
+        is_active=True
+    ).order_by('-posted_date')[:10]
+    
+    # Calculate statistics
+    total_assignments = assignments.count()
+    submitted_count = len([a for a in assignments if a.is_submitted])
+    pending_count = total_assignments - submitted_count
+    overdue_count = len([a for a in assignments if a.is_overdue and not a.is_submitted])
+    
+    # Get student's grades for this course
+    try:
+        from ..models import Grade
+        grade = Grade.objects.get(enrollment=enrollment)
+    except Grade.DoesNotExist:
+        grade = None
+    
+    context = {
+        'student': student,
+        'enrollment': enrollment,
+        'lecturer_assignment': lecturer_assignment,
+        'assignments': assignments,
+        'course_notes': course_notes,
+        'announcements': announcements,
+        'grade': grade,
+        'stats': {
+            'total_assignments': total_assignments,
+            'submitted_count': submitted_count,
+            'pending_count': pending_count,
+            'overdue_count': overdue_count,
+            'notes_count': course_notes.count(),
+        }
+    }
+    
+    return render(request, 'student/course_detail.html', context)
+
+
+@login_required
+def download_notes(request, notes_id):
+    """Download (or, with ?inline=1, preview) course notes and track the download"""
+    from ..counters import increment, record
+    from ..media_delivery import is_enrolled, serve_file
+    
+    try:
+        student = request.role.get_student()
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('login')
+    
+    notes = get_object_or_404(
+        CourseNotes.objects.select_related('lecturer_assignment'),
+        id=notes_id, is_active=True, is_public=True
+    )
+    
+    # Check if student is enrolled in this course (cached per student and course)
+    lecturer_assignment = notes.lecturer_assignment
+    if not is_enrolled(request.user, lecturer_assignment.course_id, lecturer_assignment.semester_id):
+        messages.error(request, "You are not enrolled in this course.")
+        return redirect('student_dashboard')
+    
+    if not notes.notes_file:
+        messages.error(request, "File not found.")
+        return redirect('student_dashboard')
+    
+    def record_download():
+        # Buffered and written in batches (see counters.py)
+        record(NotesDownload(
+            course_notes=notes,
+            student=student,
+            ip_address=request.META.get('REMOTE_ADDR')
+        ))
+        increment(CourseNotes, notes.pk, 'download_count')
+    
+    # Stream the file (ranges and conditional requests supported)
+    try:
+        return serve_file(request, notes.notes_file, as_attachment=not request.GET.get('inline'),
+                          record_download=record_download)
+    except (FileNotFoundError, OSError):
+        logger.error(f"Notes file missing for CourseNotes {notes.pk}: {notes.notes_file.name}")
+        messages.error(request, "Error downloading file. Please try again.")
+        return redirect('student_dashboard')
+
+
+@login_required
+def assignment_detail(request, assignment_id):
+    """Detailed view of an assignment with submission form"""
+    try:
+        student = request.role.get_student()
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('login')
+    
+    assignment = get_object_or_404(
+        Assignment.objects.select_related(
+            'lecturer_assignment', 'lecturer_assignment__course',
+            'lecturer_assignment__lecturer', 'lecturer_assignment__semester'
+        ),
+        id=assignment_id,
+        is_published=True
+    )
+    
+    # Check if student is enrolled in this course
+    enrollment = get_object_or_404(
+        Enrollment,
+        student=student,
+        course=assignment.lecturer_assignment.course,
+        semester=assignment.lecturer_assignment.semester,
+        is_active=True
+    )
+    
+    # Get or create submission
+    submission, created = AssignmentSubmission.objects.get_or_create(
+        assignment=assignment,
+        student=student,
+        defaults={'submission_status': 'draft'}
+    )
+    
+    # Check if assignment is overdue
+    is_overdue = assignment.due_date < timezone.now()
+    can_submit = not is_overdue or assignment.late_submission_allowed
+    
+    # Get assignment announcements
+    announcements = AssignmentAnnouncement.objects.filter(
+        assignment=assignment,
+        is_active=True
+    ).order_by('-posted_date')
+    
+    context = {
+        'student': student,
+        'assignment': assignment,
+        'enrollment': enrollment,
+        'submission': submission,
+        'is_overdue': is_overdue,
+        'can_submit': can_submit,
+        'announcements': announcements,
+    }
+    
+    return render(request, 'student/assignment_detail.html', context)
+
+
+@login_required
+@require_http_methods(["POST"])
+def submit_assignment(request, assignment_id):
+    """Handle assignment submission"""
+    try:
+        student = request.role.get_student()
+    except Student.DoesNotExist:
+        return JsonResponse({'success': False, 'message': 'Student profile not found.'})
+    
+    assignment = get_object_or_404(Assignment, id=assignment_id, is_published=True)
+    
+    # Check if student is enrolled
+    enrollment = Enrollment.objects.filter(
+        student=student,
+        course=assignment.lecturer_assignment.course,
+        semester=assignment.lecturer_assignment.semester,
+        is_active=True
+    ).first()
+    
+    if not enrollment:
+        return JsonResponse({'success': False, 'message': 'You are not enrolled in this course.'})
+    
+    # Check if submission is allowed
+    is_overdue = assignment.due_date < timezone.now()
+    if is_overdue and not assignment.late_submission_allowed:
+        return JsonResponse({'success': False, 'message': 'Assignment submission deadline has passed.'})
+    
+    # Get or create submission
+    submission, created = AssignmentSubmission.objects.get_or_create(
+        assignment=assignment,
+        student=student
+    )
+    
+    # Check if already submitted
+    if submission.is_submitted:
+        return JsonResponse({'success': False, 'message': 'Assignment has already been submitted.'})
+    
+    # Handle file upload
+    if 'submission_file' not in request.FILES:
+        return JsonResponse({'success': False, 'message': 'Please select a file to upload.'})
+    
+    uploaded_file = request.FILES['submission_file']
+    
+    # Validate file size
+    max_size = assignment.max_file_size_mb * 1024 * 1024  # Convert MB to bytes
+    if uploaded_file.size > max_size:
+        return JsonResponse({
+            'success': False, 
+            'message': f'File size exceeds maximum allowed size of {assignment.max_file_size_mb}MB.'
+        })
+    
+    # Validate file format
+    allowed_extensions = {
+        'pdf': ['.pdf'],
+        'doc': ['.doc', '.docx'],
+        'any': ['.pdf', '.doc', '.docx', '.txt', '.rtf'],
+        'code': ['.py', '.java', '.cpp', '.c', '.js', '.html', '.css', '.zip'],
+        'presentation': ['.ppt', '.pptx', '.odp']
+    }
+    
+    file_extension = os.path.splitext(uploaded_file.name)[1].lower()
+    if assignment.submission_format in allowed_extensions:
+        if file_extension not in allowed_extensions[assignment.submission_format]:
+            return JsonResponse({
+                'success': False,
+                'message': f'Invalid file format. Allowed formats: {", ".join(allowed_extensions[assignment.submission_format])}'
+            })
+    
+    # Update submission
+    submission.submission_file = uploaded_file
+    submission.original_filename = uploaded_file.name
+    submission.file_size = uploaded_file.size
+    submission.student_comments = request.POST.get('student_comments', '')
+    submission.is_submitted = True
+    submission.submitted_date = timezone.now()
+    
+    if is_overdue:
+        submission.is_late = True
+        submission.submission_status = 'late'
+    else:
+        submission.submission_status = 'submitted'
+    
+    submission.save()
+    
+    messages.success(request, 'Assignment submitted successfully!')
+    return JsonResponse({'success': True, 'message': 'Assignment submitted successfully!'})
+
+
+@login_required
+def student_assignments(request):
+    """View all assignments for the student across all courses"""
+    try:
+        student = request.role.get_student()
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('login')
+    
+    current_semester = Semester.objects.filter(is_current=True).first()
+    
+    # Get all enrollments for current semester
+    enrollments = Enrollment.objects.filter(
+        student=student,
+        semester=current_semester,
+        is_active=True
+    ).select_related('course')
+    
+    # Get all assignments for enrolled courses
+    assignments = Assignment.objects.filter(
+        lecturer_assignment__course__in=[e.course for e in enrollments],
+        lecturer_assignment__semester=current_semester,
+        is_published=True
+    ).select_related(
+        'lecturer_assignment', 'lecturer_assignment__course'
+    ).order_by('-posted_date')
+    
+    # Get submission status for each assignment
+    submissions = AssignmentSubmission.objects.filter(
+        student=student,
+        assignment__in=assignments
+    )
+    submission_dict = {sub.assignment_id: sub for sub in submissions}
+    
+    # Add submission info to assignments
+    for assignment in assignments:
+        assignment.student_submission = submission_dict.get(assignment.id)
+        assignment.is_submitted = assignment.id in submission_dict and submission_dict[assignment.id].is_submitted
+        assignment.is_overdue = assignment.due_date < timezone.now()
+    
+    # Filter assignments based on status
+    status_filter = request.GET.get('status', 'all')
+    if status_filter == 'pending':
+        assignments = [a for a in assignments if not a.is_submitted]
+    elif status_filter == 'submitted':
+        assignments = [a for a in assignments if a.is_submitted]
+    elif status_filter == 'overdue':
+        assignments = [a for a in assignments if a.is_overdue and not a.is_submitted]
+    
+    # Pagination
+    paginator = Paginator(assignments, 10)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    context = {
+        'student': student,
+        'assignments': page_obj,
+        'current_semester': current_semester,
+        'status_filter': status_filter,
+    }
+    
+    return render(request, 'student/assignments.html', context)
+
+
+@login_required
+def student_grades(request):
+    """View student's grades for all courses"""
+    try:
+        student = request.role.get_student()
+    except Student.DoesNotExist:
+        messages.error(request, "Student profile not found.")
+        return redirect('login')
+    
+    # Get all enrollments with grades
+    from ..models import Grade
+    grades = Grade.objects.filter(
+        enrollment__student=student
+    ).select_related(
+        'enrollment', 'enrollment__course', 'enrollment__semester'
+    ).order_by('-enrollment__semester__start_date', 'enrollment__course__name')
+    
+    # Calculate overall GPA
+    total_quality_points = sum(g.quality_points or 0 for g in grades if g.quality_points)
+    total_credit_hours = sum(g.enrollment.course.credit_hours for g in grades if g.quality_points)
+    overall_gpa = total_quality_points / total_credit_hours if total_credit_hours > 0 else 0
+    
+    # Update student's cumulative GPA
+    student.cumulative_gpa = overall_gpa
+    student.total_credit_hours = total_credit_hours
+    student.save(update_fields=['cumulative_gpa', 'total_credit_hours'])
+    
+    context = {
+        'student': student,
+        'grades': grades,
+        'overall_gpa': overall_gpa,
+        'total_credit_hours': total_credit_hours,
+        'passed_courses_count': Grade.objects.filter(
+            enrollment__student=student, 
+            is_passed=True
+        ).count(),
+    }
+    
+    return render(request, 'student/grades_student.html', context)
+
+
+@login_required
+def student_timetable_view(request):
+    """View for students to see their timetable"""
+    try:
+        # Get student profile
+        student = request.role.student_or_404()
+        
+        # Get current academic year and semester
+        current_academic_year = AcademicYear.objects.filter(is_current=True).first()
+        current_semester = Semester.objects.filter(is_current=True).first()
+        
+        if not current_academic_year or not current_semester:
+            context = {
+                'error': 'No active academic year or semester found.',
+                'student': student,
+            }
+            return render(request, 'students/student_timetable.html', context)
+        
+        # Get student's enrolled courses for current semester
+        enrollments = Enrollment.objects.filter(
+            student=student,
+            semester=current_semester,
+            is_active=True
+        ).select_related('course', 'lecturer')
+        
+        if not enrollments.exists():
+            context = {
+                'error': 'No course enrollments found for current semester.',
+                'student': student,
+                'current_academic_year': current_academic_year,
+                'current_semester': current_semester,
+            }
+            return render(request, 'students/student_timetable.html', context)
+        
+        # Get course codes for enrolled courses
+        enrolled_courses = [enrollment.course for enrollment in enrollments]
+        
+        # Get timetable entries for enrolled courses
+        timetable_entries = Timetable.objects.filter(
+            course__in=enrolled_courses,
+            semester=current_semester,
+            programme=student.programme,
+            year=student.current_year,
+            is_active=True
+        ).select_related('course', 'lecturer', 'lecturer__user').order_by('day_of_week', 'start_time')
+        
+        # Define time slots (you can customize these)
+        time_slots = [
+            {'start': time(7, 0), 'end': time(10, 0), 'label': '7:00 - 10:00 AM'},
+            {'start': time(10, 0), 'end': time(13, 0), 'label': '10:00 - 1:00 PM'},
+            {'start': time(14, 0), 'end': time(17, 0), 'label': '2:00 - 5:00 PM'},
+            {'start': time(17, 0), 'end': time(19, 0), 'label': '5:00 - 7:00 PM'},
+        ]
+        
+        # Days of the week
+        days_of_week = [
+            {'key': 'monday', 'label': 'Monday'},
+            {'key': 'tuesday', 'label': 'Tuesday'},
+            {'key': 'wednesday', 'label': 'Wednesday'},
+            {'key': 'thursday', 'label': 'Thursday'},
+            {'key': 'friday', 'label': 'Friday'},
+            {'key': 'saturday', 'label': 'Saturday'},
+        ]
+        
+        # Organize timetable data
+        timetable_grid = defaultdict(lambda: defaultdict(list))
+        
+        for entry in timetable_entries:
+            # Find matching time slot
+            for slot in time_slots:
+                if entry.start_time >= slot['start'] and entry.start_time < slot['end']:
+                    timetable_grid[entry.day_of_week][slot['start']].append(entry)
+                    break
+        
+        # Calculate statistics
+        total_courses = len(enrolled_courses)
+        total_classes = timetable_entries.count()
+        total_credit_hours = sum(course.credit_hours for course in enrolled_courses)
+        
+        context = {
+            'student': student,
+            'programme': student.programme,
+            'current_academic_year': current_academic_year,
+            'current_semester': current_semester,
+            'timetable_grid': dict(timetable_grid),
+            'time_slots': time_slots,
+            'days_of_week': days_of_week,
+            'enrolled_courses': enrolled_courses,
+            'enrollments': enrollments,
+            'stats': {
+                'total_courses': total_courses,
+                'total_classes': total_classes,
+                'total_credit_hours': total_credit_hours,
+            }
+        }
+        
+        return render(request, 'student/student_timetable.html', context)
+        
+    except Student.DoesNotExist:
+        context = {
+            'error': 'Student profile not found.',
+        }
+        return render(request, 'student/student_timetable.html', context)
+    
+    except Exception as e:
+        context = {
+            'error': f'An error occurred: {str(e)}',
+        }
+        return render(request, 'student/student_timetable.html', context)
+
+
+@login_required
+def student_fee_management(request):
+    """
+    View for students to manage and view their fee payments
+    Only shows academic years and semesters relevant to the student's programme
+    """
+    try:
+        student = request.role.get_student()
+    except:
+        messages.error(request, "You don't have a student profile.")
+        return redirect('login')
+    
+    # Get student's programme details
+    programme = student.programme
+    programme_duration_years = programme.duration_years
+    semesters_per_year = programme.semesters_per_year
+    admission_year = student.admission_date.year
+    
+    # Calculate the academic years the student should be in
+    # For example, if admitted in 2021/2022 and programme is 3 years:
+    # Academic years: 2021/2022, 2022/2023, 2023/2024
+    relevant_academic_years = []
+    
+    for year_offset in range(programme_duration_years):
+        start_year = admission_year + year_offset
+        end_year = start_year + 1
+        academic_year_str = f"{start_year}/{end_year}"
+        
+        try:
+            academic_year = AcademicYear.objects.get(year=academic_year_str)
+            relevant_academic_years.append(academic_year)
+        except AcademicYear.DoesNotExist:
+            # Create the academic year if it doesn't exist (optional)
+            # You might want to handle this differently based on your requirements
+            continue
+    
+    # Calculate overall statistics
+    total_fees_charged = Decimal('0.00')
+    total_fees_paid = Decimal('0.00')
+    overall_balance = Decimal('0.00')
+    
+    # Prepare data for each relevant academic year
+    years_data = []
+    
+    for year_index, academic_year in enumerate(relevant_academic_years):
+        # Calculate which programme year this academic year represents for the student
+        student_programme_year = year_index + 1
+        
+        # Get only the semesters that exist for this programme
+        # Most programmes have semester 1 and 2, some have 3
+        semester_numbers = list(range(1, semesters_per_year + 1))
+        
+        year_data = {
+            'academic_year': academic_year,
+            'student_programme_year': student_programme_year,
+            'semesters': [],
+            'year_total_charged': Decimal('0.00'),
+            'year_total_paid': Decimal('0.00'),
+            'year_balance': Decimal('0.00')
+        }
+        
+        for semester_number in semester_numbers:
+            # Try to get the actual semester object
+            try:
+                semester = Semester.objects.get(
+                    academic_year=academic_year,
+                    semester_number=semester_number
+                )
+            except Semester.DoesNotExist:
+                # Create a minimal semester object for display purposes
+                semester = type('obj', (object,), {
+                    'semester_number': semester_number,
+                    'academic_year': academic_year,
+                    'start_date': None,
+                    'end_date': None
+                })()
+            
+            # Get fee structure for this specific semester and programme year
+            try:
+                fee_structure = FeeStructure.objects.get(
+                    programme=student.programme,
+                    academic_year=academic_year,
+                    year=student_programme_year,  # Use the calculated programme year
+                    semester=semester_number
+                )
+                semester_fee = fee_structure.net_fee()
+            except FeeStructure.DoesNotExist:
+                fee_structure = None
+                semester_fee = Decimal('0.00')
+            
+            # Get payments for this semester
+            payments = FeePayment.objects.filter(
+                student=student,
+                fee_structure__academic_year=academic_year,
+                fee_structure__year=student_programme_year,
+                fee_structure__semester=semester_number,
+                payment_status='completed'
+            ).order_by('-payment_date')
+            
+            semester_paid = payments.aggregate(
+                total=Sum('amount_paid')
+            )['total'] or Decimal('0.00')
+            
+            semester_balance = semester_fee - semester_paid
+            
+            semester_data = {
+                'semester': semester,
+                'fee_structure': fee_structure,
+                'semester_fee': semester_fee,
+                'semester_paid': semester_paid,
+                'semester_balance': semester_balance,
+                'payments': payments,
+                'student_programme_year': student_programme_year
+            }
+            
+            year_data['semesters'].append(semester_data)
+            year_data['year_total_charged'] += semester_fee
+            year_data['year_total_paid'] += semester_paid
+        
+        year_data['year_balance'] = year_data['year_total_charged'] - year_data['year_total_paid']
+        
+        # Only add year data if there are semesters or if it's relevant to the student
+        if year_data['semesters']:
+            years_data.append(year_data)
+            
+            # Add to overall totals
+            total_fees_charged += year_data['year_total_charged']
+            total_fees_paid += year_data['year_total_paid']
+    
+    overall_balance = total_fees_charged - total_fees_paid
+    
+    # Get recent payments for quick overview (last 5 payments)
+    recent_payments = FeePayment.objects.filter(
+        student=student,
+        payment_status='completed'
+    ).order_by('-payment_date')[:5]
+    
+    # Calculate statistics
+    stats = {
+        'total_fees_charged': total_fees_charged,
+        'total_fees_paid': total_fees_paid,
+        'overall_balance': overall_balance,
+        'total_payments': FeePayment.objects.filter(
+            student=student, 
+            payment_status='completed'
+        ).count(),
+        'payment_methods_used': FeePayment.objects.filter(
+            student=student,
+            payment_status='completed'
+        ).values('payment_method').distinct().count()
+    }
+    
+    # Calculate expected graduation year for context
+    expected_graduation_year = admission_year + programme_duration_years
+    expected_graduation_academic_year = f"{expected_graduation_year-1}/{expected_graduation_year}"
+    
+    context = {
+        'student': student,
+        'years_data': years_data,
+        'recent_payments': recent_payments,
+        'stats': stats,
+        'current_year': timezone.now().year,
+        'programme_info': {
+            'duration_years': programme_duration_years,
+            'semesters_per_year': semesters_per_year,
+            'expected_graduation': expected_graduation_academic_year,
+            'admission_year': f"{admission_year}/{admission_year + 1}",
+        }
+    }
+    
+    return render(request, 'student/fee_management.html', context)
+
+
+# Exam Repository Views
+@login_required
+def exam_repository(request):
+    """Display exam materials for student's programme"""
+    if request.role.student is None:
+        return redirect('student_dashboard')
+    
+    student = request.role.student
+    
+    # Get materials for student's programme
+    materials = ExamRepository.objects.filter(
+        programme=student.programme,
+        is_public=True
+    ).select_related('course', 'academic_year')
+    
+    # Filter by course if specified
+    course_id = request.GET.get('course')
+    if course_id:
+        materials = materials.filter(course_id=course_id)
+    
+    # Filter by material type if specified
+    material_type = request.GET.get('type')
+    if material_type:
+        materials = materials.filter(material_type=material_type)
+    
+    # Get courses for filtering
+    courses = Course.objects.filter(
+        course_programmes__programme=student.programme
+    ).distinct()
+    
+    # Pagination
+    paginator = Paginator(materials, 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    context = {
+        'page_obj': page_obj,
+        'courses': courses,
+        'selected_course': course_id,
+        'selected_type': material_type,
+        'material_types': ExamRepository.MATERIAL_TYPES,
+    }
+    return render(request, 'student/exam_repository.html', context)
+
+
+@login_required
+def download_exam_material(request, material_id):
+    """Download exam material and track the download"""
+    from ..counters import increment, record
+    from ..media_delivery import serve_file
+    
+    if request.role.student is None:
+        return redirect('student_dashboard')
+    
+    student = request.role.student
+    material = get_object_or_404(ExamRepository, id=material_id, is_public=True)
+    
+    # Check if student's programme has access to this material
+    if material.programme_id != student.programme_id:
+        messages.error(request, "You don't have access to this material.")
+        return redirect('exam_repository')
+    
+    def record_download():
+        # Buffered and written in batches (see counters.py)
+        record(ExamMaterialDownload(
+            exam_material=material,
+            student=student,
+            ip_address=request.META.get('REMOTE_ADDR')
+        ))
+        increment(ExamRepository, material.pk, 'download_count')
+    
+    # Stream the file (ranges and conditional requests supported)
+    try:
+        return serve_file(request, material.material_file, record_download=record_download)
+    except (FileNotFoundError, OSError, ValueError):
+        messages.error(request, "Error downloading file.")
+        return redirect('exam_repository')
+
+
+# Special Exam Application Views
+@login_required
+def special_exam_applications(request):
+    """List student's special exam applications"""
+    if request.role.student is None:
+        return redirect('student_dashboard')
+    
+    student = request.role.student
+    applications = SpecialExamApplication.objects.filter(
+        student=student
+    ).select_related('course', 'semester')
+    
+    context = {
+        'applications': applications,
+    }
+    return render(request, 'student/special_exam_list.html', context)
+
+
+@login_required
+def apply_special_exam(request):
+    """Apply for special exam"""
+    if request.role.student is None:
+        return redirect('student_dashboard')
+    
+    student = request.role.student
+    
+    if request.method == 'POST':
+        form = SpecialExamApplicationForm(request.POST, request.FILES)
+        if form.is_valid():
+            application = form.save(commit=False)
+            application.student = student
+            application.save()
+            messages.success(request, "Special exam application submitted successfully!")
+            return redirect('special_exam_applications')
+    else:
+        form = SpecialExamApplicationForm()
+    
+    # Get courses student is enrolled in current semester
+    current_semester = Semester.objects.filter(is_current=True).first()
+    enrolled_courses = []
+    if current_semester:
+        enrolled_courses = Course.objects.filter(
+            enrollments__student=student,
+            enrollments__semester=current_semester
+        )
+    
+    context = {
+        'form': form,
+        'enrolled_courses': enrolled_courses,
+    }
+    return render(request, 'student/apply_special_exam.html', context)
+
+
+# Deferment Application Views
+@login_required
+def deferment_applications(request):
+    """List student's deferment applications"""
+    if request.role.student is None:
+        return redirect('student_dashboard')
+    
+    student = request.role.student
+    applications = DefermentApplication.objects.filter(student=student)
+    
+    context = {
+        'applications': applications,
+    }
+    return render(request, 'student/deferment_list.html', context)
+
+
+@login_required
+def apply_deferment(request):
+    """Apply for academic deferment"""
+    if request.role.student is None:
+        return redirect('student_dashboard')
+    
+    student = request.role.student
+    
+    if request.method == 'POST':
+        form = DefermentApplicationForm(request.POST, request.FILES)
+        if form.is_valid():
+            application = form.save(commit=False)
+            application.student = student
+            application.save()
+            messages.success(request, "Deferment application submitted successfully!")
+            return redirect('deferment_applications')
+    else:
+        form = DefermentApplicationForm()
+    
+    context = {
+        'form': form,
+    }
+    return render(request, 'student/apply_deferment.html', context)
+
+
+# Clearance Views
+@login_required
+def clearance_requests(request):
+    """List student's clearance requests"""
+    if request.role.student is None:
+        return redirect('student_dashboard')
+    
+    student = request.role.student
+    requests = ClearanceRequest.objects.filter(student=student)
+    
+    context = {
+        'clearance_requests': requests,
+    }
+    return render(request, 'student/clearance_list.html', context)
+
+
+@login_required
+def request_clearance(request):
+    """Request clearance"""
+    if request.role.student is None:
+        return redirect('student_dashboard')
+    
+    student = request.role.student
+    
+    if request.method == 'POST':
+        form = ClearanceRequestForm(request.POST)
+        if form.is_valid():
+            clearance_request = form.save(commit=False)
+            clearance_request.student = student
+            clearance_request.save()
+            messages.success(request, "Clearance request submitted successfully!")
+            return redirect('clearance_requests')
+    else:
+        form = ClearanceRequestForm()
+    
+    context = {
+        'form': form,
+    }
+    return render(request, 'student/request_clearance.html', context)
+
+
+# Messaging Views
+@login_required
+def messages_inbox(request):
+    """Student's message inbox"""
+    messages_list = Message.objects.filter(
+        recipient=request.user,
+        is_deleted_by_recipient=False
+    ).select_related('sender')
+    
+    # Search functionality
+    search = request.GET.get('search')
+    if search:
+        messages_list = messages_list.filter(
+            Q(subject__icontains=search) | 
+            Q(message__icontains=search) |
+            Q(sender__first_name__icontains=search) |
+            Q(sender__last_name__icontains=search)
+        )
+    
+    # Filter by read/unread
+    filter_type = request.GET.get('filter')
+    if filter_type == 'unread':
+        messages_list = messages_list.filter(is_read=False)
+    elif filter_type == 'starred':
+        messages_list = messages_list.filter(is_starred=True)
+    
+    # Pagination
+    paginator = Paginator(messages_list, 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    context = {
+        'page_obj': page_obj,
+        'search': search,
+        'filter_type': filter_type,
+    }
+    return render(request, 'student/messages_inbox.html', context)
+
+
+@login_required
+def message_detail(request, message_id):
+    """View message details"""
+    message = get_object_or_404(
+        Message, 
+        id=message_id,
+        recipient=request.user,
+        is_deleted_by_recipient=False
+    )
+    
+    # Mark as read
+    message.mark_as_read()
+    
+    # Get replies
+    replies = Message.objects.filter(
+        parent_message=message,
+        is_deleted_by_recipient=False
+    ).select_related('sender')
+    
+    context = {
+        'message': message,
+        'replies': replies,
+    }
+    return render(request, 'student/message_detail.html', context)
+
+
+@login_required
+def compose_message(request):
+    """Compose new message"""
+    if request.method == 'POST':
+        form = MessageForm(request.POST, request.FILES)
+        if form.is_valid():
+            message = form.save(commit=False)
+            message.sender = request.user
+            message.save()
+            messages.success(request, "Message sent successfully!")
+            return redirect('messages_inbox')
+    else:
+        form = MessageForm()
+    
+    # Get possible recipients (lecturers, staff, admins)
+    recipients = User.objects.filter(
+        Q(user_type__in=['lecturer', 'staff', 'admin', 'hod', 'dean']) |
+        Q(is_staff=True)
+    ).exclude(id=request.user.id)
+    
+    context = {
+        'form': form,
+        'recipients': recipients,
+    }
+    return render(request, 'student/compose_message.html', context)
+
+
+@login_required
+def reply_message(request, message_id):
+    """Reply to a message"""
+    parent_message = get_object_or_404(
+        Message,
+        id=message_id,
+        recipient=request.user
+    )
+    
+    if request.method == 'POST':
+        form = MessageReplyForm(request.POST, request.FILES)
+        if form.is_valid():
+            reply = form.save(commit=False)
+            reply.sender = request.user
+            reply.recipient = parent_message.sender
+            reply.parent_message = parent_message
+            reply.subject = f"Re: {parent_message.subject}"
+            reply.save()
+            messages.success(request, "Reply sent successfully!")
+            return redirect('message_detail', message_id=parent_message.id)
+    else:
+        form = MessageReplyForm()
+    
+    context = {
+        'form': form,
+        'parent_message': parent_message,
+    }
+    return render(request, 'student/reply_message.html', context)
+
+
+@login_required
+def sent_messages(request):
+    """View sent messages"""
+    messages_list = Message.objects.filter(
+        sender=request.user,
+        is_deleted_by_sender=False
+    ).select_related('recipient')
+    
+    # Pagination
+    paginator = Paginator(messages_list, 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    context = {
+        'page_obj': page_obj,
+    }
+    return render(request, 'student/sent_messages.html', context)
+
+
+@login_required
+def notifications(request):
+    """View student notifications"""
+    if request.role.student is None:
+        return redirect('student_dashboard')
+    
+    from ..broadcasts import broadcasts_for, mark_all_read, unread_count
+    
+    student = request.role.student
+    notifications_list = StudentNotification.objects.filter(student=student)
+    
+    # Announcements for the student's audiences, read flags as of this visit
+    unread = unread_count(request.user)
+    broadcasts = list(broadcasts_for(request.user)[:20])
+    
+    # Mark all as read when viewing (one watermark upsert and one UPDATE)
+    mark_all_read(request.user)
+    
+    # Pagination
+    paginator = Paginator(notifications_list, 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    context = {
+        'page_obj': page_obj,
+        'broadcasts': broadcasts,
+        'unread_count': unread,
+    }
+    return render(request, 'student/student_notifications.html', context)
+
+
+def course_evaluation(request):
+    return render (request , 'student/course_evaluation.html')
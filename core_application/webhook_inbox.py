@@ -0,0 +1,402 @@
+# webhook_inbox.py - Durable intake and batch posting of payment callbacks
+#
+# Banks retry callbacks that are slow to answer, and every retry used to post
+# another FeePayment. The webhook views now call enqueue(), which stores the
+# raw payload under a unique (provider, transaction reference) key and returns
+# at once; a retry of the same transaction finds the existing row.
+#
+# process_inbox() runs a pool of workers over the inbox. Each worker claims a
+# batch with a conditional UPDATE (pending -> processing, with a lease), posts
+# every item in its own transaction and only commits if it still holds the
+# claim, so a payment is posted exactly once even when a lease expires and
+# another worker picks the item up. Receipts, email and SMS go out after the
+# commit. Failed items stay in the inbox until replay() queues them again.
+#
+# A background thread drains the inbox after each commit that stored a new
+# callback (WEBHOOK_INBOX_POST_ON_COMMIT). Items waiting for a retry after an
+# unexpected error are picked up by the next drain; run
+# ``process_webhook_inbox --loop`` (or the Celery task) to retry them without
+# waiting for another callback.
+#
+# post_payment() is also used directly by process_bank_payment(). Both paths
+# record the payment as a PostedTransaction, unique per (provider, transaction
+# reference): a second posting of the same transaction fails that insert and
+# is reported as a duplicate instead of creating another payment.
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+import logging
+import threading
+import uuid
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import FeePayment, FeeStructure, Semester, Student, StudentNotification
+from .models_webhooks import PostedTransaction, WebhookInboxItem
+from .receipt_sequence import next_receipt_number
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentRejected(Exception):
+    """The callback cannot be posted as sent (unknown student, bad amount, ...)"""
+
+
+class ClaimLost(Exception):
+    """Another worker took over the item while it was being posted"""
+
+
+# =============================================================================
+# Provider payloads
+# =============================================================================
+
+def _mpesa_items(payload):
+    callback = payload.get('Body', {}).get('stkCallback', {})
+    return {
+        item.get('Name'): item.get('Value')
+        for item in callback.get('CallbackMetadata', {}).get('Item', [])
+    }
+
+
+def event_key(provider, payload):
+    """The provider's transaction reference, used as the idempotency key"""
+    if provider == 'equity':
+        key = payload.get('transaction_id')
+    elif provider == 'kcb':
+        key = payload.get('transaction_ref')
+    else:
+        key = _mpesa_items(payload).get('MpesaReceiptNumber')
+    return str(key).strip() if key else ''
+
+
+def parse_payment(provider, payload, received_at):
+    """Map a provider payload onto the fields of a FeePayment"""
+    if provider == 'equity':
+        fields = {
+            'student_id': payload.get('student_id'),
+            'amount': payload.get('amount'),
+            'payment_date': payload.get('payment_date'),
+            'bank_reference': payload.get('bank_reference') or '',
+            'payment_method': 'bank_transfer',
+        }
+    elif provider == 'kcb':
+        fields = {
+            'student_id': payload.get('student_number'),
+            'amount': payload.get('amount_paid'),
+            'payment_date': payload.get('transaction_date'),
+            'bank_reference': payload.get('kcb_reference') or '',
+            'payment_method': 'bank_transfer',
+        }
+    else:
+        items = _mpesa_items(payload)
+        fields = {
+            # The STK push initiator stores the student on the callback
+            'student_id': payload.get('student_id'),
+            'amount': items.get('Amount'),
+            'payment_date': timezone.localtime(received_at).date(),
+            'bank_reference': items.get('MpesaReceiptNumber') or '',
+            'payment_method': 'mpesa',
+        }
+
+    try:
+        fields['amount'] = Decimal(str(fields['amount']))
+    except (InvalidOperation, TypeError):
+        raise PaymentRejected(f"Invalid amount {fields['amount']!r}")
+    if fields['amount'] <= 0:
+        raise PaymentRejected(f"Invalid amount {fields['amount']}")
+
+    if not isinstance(fields['payment_date'], date):
+        parsed = parse_date(str(fields['payment_date'] or '')[:10])
+        if parsed is None:
+            raise PaymentRejected(f"Invalid payment date {fields['payment_date']!r}")
+        fields['payment_date'] = parsed
+    return fields
+
+
+# =============================================================================
+# Intake
+# =============================================================================
+
+def enqueue(provider, payload):
+    """
+    Store a verified callback. Returns (item, created); ``created`` is False
+    when the provider is retrying a transaction already in the inbox.
+    """
+    key = event_key(provider, payload)
+    if not key:
+        raise ValueError("Callback has no transaction reference")
+    item, created = WebhookInboxItem.objects.get_or_create(
+        provider=provider, event_key=key, defaults={'payload': payload}
+    )
+    if created:
+        _kick_on_commit()
+    return item, created
+
+
+# =============================================================================
+# Posting
+# =============================================================================
+
+def post_payment(provider, transaction_id, student_id, amount, payment_date,
+                 bank_reference, payment_method):
+    """
+    Create the FeePayment for a callback. Must run inside a transaction.
+    Returns (payment, balance, created); an already posted transaction
+    returns the existing payment with ``created`` False. The unique
+    PostedTransaction key catches a concurrent posting of the same
+    transaction that the lookup below misses.
+    """
+    existing = _posted(provider, transaction_id)
+    if existing:
+        return existing, None, False
+
+    try:
+        student = Student.objects.select_related('user', 'programme').get(
+            student_id=student_id, status='active'
+        )
+    except Student.DoesNotExist:
+        raise PaymentRejected(f"Student {student_id} not found or inactive")
+
+    current_semester = Semester.objects.filter(is_current=True).first()
+    if not current_semester:
+        raise PaymentRejected("No active semester found")
+
+    fee_structure = FeeStructure.objects.filter(
+        programme=student.programme,
+        academic_year=current_semester.academic_year_id,
+        year=student.current_year,
+        semester=student.current_semester
+    ).first()
+    if not fee_structure:
+        raise PaymentRejected(
+            f"No fee structure found for {student.programme.name}, "
+            f"Year {student.current_year}, Semester {student.current_semester}"
+        )
+
+    try:
+        with transaction.atomic():
+            receipt_number = next_receipt_number(provider[:3].upper())
+            payment = FeePayment.objects.create(
+                student=student,
+                fee_structure=fee_structure,
+                receipt_number=receipt_number,
+                amount_paid=amount,
+                payment_date=payment_date,
+                payment_method=payment_method,
+                payment_status='completed',
+                transaction_reference=transaction_id,
+                bank_slip_number=bank_reference,
+                remarks=f"Auto-posted from {provider.upper()} Bank",
+                mpesa_receipt=transaction_id if payment_method == 'mpesa' else ''
+            )
+            PostedTransaction.objects.create(provider=provider, reference=transaction_id, fee_payment=payment)
+    except IntegrityError:
+        existing = _posted(provider, transaction_id)
+        if existing is None:
+            raise
+        return existing, None, False
+
+    total_paid = FeePayment.objects.filter(
+        student=student,
+        fee_structure=fee_structure,
+        payment_status='completed'
+    ).aggregate(total=Sum('amount_paid'))['total'] or Decimal('0')
+    balance = fee_structure.net_fee() - total_paid
+
+    StudentNotification.objects.create(
+        student=student,
+        title='Fee Payment Received',
+        message=f'Your payment of KES {amount:,.2f} has been received. Receipt No: {receipt_number}. Balance: KES {balance:,.2f}',
+        notification_type='general'
+    )
+    return payment, balance, True
+
+
+def _posted(provider, transaction_id):
+    """The FeePayment already posted for the transaction, or None"""
+    posted = PostedTransaction.objects.select_related('fee_payment').filter(
+        provider=provider, reference=transaction_id
+    ).first()
+    return posted.fee_payment if posted else None
+
+
+def _notify(payment, balance):
+    from .views import send_payment_notifications
+    send_payment_notifications(payment.student, payment, balance)
+
+
+def process_item(item):
+    """Post one claimed item. The item must carry the worker's claim token."""
+    now = timezone.now()
+    try:
+        fields = parse_payment(item.provider, item.payload, item.received_at)
+        with transaction.atomic():
+            payment, balance, created = post_payment(item.provider, item.event_key, **fields)
+            # Commit only while this worker still owns the item
+            claimed = WebhookInboxItem.objects.filter(
+                pk=item.pk, claim_token=item.claim_token, status='processing'
+            ).update(
+                status='processed' if created else 'duplicate',
+                fee_payment=payment,
+                processed_at=now,
+                locked_until=None,
+                last_error='',
+            )
+            if not claimed:
+                raise ClaimLost(f"Lost the claim on inbox item {item.pk}")
+            if created:
+                transaction.on_commit(lambda: _notify(payment, balance))
+    except ClaimLost as e:
+        logger.warning(str(e))
+        return 'lost'
+    except PaymentRejected as e:
+        _release(item, 'failed', str(e))
+        logger.error(f"Webhook {item.provider}:{item.event_key} rejected: {str(e)}")
+        return 'failed'
+    except Exception as e:
+        max_attempts = getattr(settings, 'WEBHOOK_INBOX_MAX_ATTEMPTS', 5)
+        status = 'failed' if item.attempts >= max_attempts else 'pending'
+        # Back off before the next attempt instead of reclaiming it at once
+        retry_at = now + timedelta(seconds=getattr(settings, 'WEBHOOK_INBOX_RETRY_SECONDS', 30) * item.attempts)
+        _release(item, status, str(e), retry_at if status == 'pending' else None)
+        logger.error(f"Error posting webhook {item.provider}:{item.event_key} (attempt {item.attempts}): {str(e)}")
+        return status
+
+    logger.info(f"Webhook {item.provider}:{item.event_key} {'posted' if created else 'already posted'}")
+    return 'processed' if created else 'duplicate'
+
+
+def _release(item, status, error, retry_at=None):
+    WebhookInboxItem.objects.filter(pk=item.pk, claim_token=item.claim_token).update(
+        status=status, last_error=error[:2000], locked_until=retry_at
+    )
+
+
+# =============================================================================
+# Workers
+# =============================================================================
+
+def claim_batch(batch_size):
+    """
+    Atomically take up to ``batch_size`` pending (or abandoned) items. The
+    status check is repeated in the UPDATE, so concurrent workers never
+    claim the same row.
+    """
+    now = timezone.now()
+    # Pending items may carry a retry time; processing ones an expired lease
+    claimable = (
+        Q(status='pending', locked_until__isnull=True)
+        | Q(status__in=['pending', 'processing'], locked_until__lt=now)
+    )
+    candidates = list(
+        WebhookInboxItem.objects.filter(claimable)
+        .order_by('received_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not candidates:
+        return []
+
+    token = uuid.uuid4().hex
+    lease = timedelta(seconds=getattr(settings, 'WEBHOOK_INBOX_LEASE_SECONDS', 300))
+    WebhookInboxItem.objects.filter(claimable, id__in=candidates).update(
+        status='processing',
+        claim_token=token,
+        locked_until=now + lease,
+        attempts=F('attempts') + 1,
+    )
+    return list(WebhookInboxItem.objects.filter(claim_token=token, status='processing'))
+
+
+def _worker(batch_size, max_batches, own_connection=True):
+    counts = {}
+    try:
+        for _ in range(max_batches):
+            items = claim_batch(batch_size)
+            if not items:
+                break
+            for item in items:
+                outcome = process_item(item)
+                counts[outcome] = counts.get(outcome, 0) + 1
+    finally:
+        # Pool threads open their own database connection
+        if own_connection:
+            connection.close()
+    return counts
+
+
+def process_inbox(workers=None, batch_size=None, max_batches=100):
+    """
+    Drain the inbox with ``workers`` threads, each claiming ``batch_size``
+    items at a time. Returns outcome counts, e.g. {'processed': 12}.
+    """
+    workers = workers or getattr(settings, 'WEBHOOK_INBOX_WORKERS', 4)
+    batch_size = batch_size or getattr(settings, 'WEBHOOK_INBOX_BATCH_SIZE', 50)
+    if connection.vendor == 'sqlite':
+        # SQLite allows one writer at a time; parallel workers only add lock errors
+        workers = 1
+
+    if workers <= 1:
+        results = [_worker(batch_size, max_batches, own_connection=False)]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='webhook-inbox') as pool:
+            futures = [pool.submit(_worker, batch_size, max_batches) for _ in range(workers)]
+            results = [future.result() for future in futures]
+
+    totals = {}
+    for counts in results:
+        for outcome, count in counts.items():
+            totals[outcome] = totals.get(outcome, 0) + count
+    return totals
+
+
+def replay(items):
+    """Queue ``items`` (e.g. failed ones) for another attempt; returns how many"""
+    count = items.exclude(status__in=['processed', 'duplicate']).update(
+        status='pending', attempts=0, claim_token='', locked_until=None
+    )
+    if count:
+        _kick_on_commit()
+    return count
+
+
+# =============================================================================
+# Background drain after commit
+# =============================================================================
+
+_drainer = None
+_drainer_lock = threading.Lock()
+_drain_again = threading.Event()
+
+
+def _drain():
+    try:
+        while True:
+            _drain_again.clear()
+            process_inbox()
+            if not _drain_again.is_set():
+                break
+    except Exception as e:
+        logger.error(f"Webhook inbox drain failed: {str(e)}")
+    finally:
+        connection.close()
+
+
+def kick():
+    """Drain the inbox on a background thread (one per process)"""
+    global _drainer
+    with _drainer_lock:
+        if _drainer is not None and _drainer.is_alive():
+            _drain_again.set()
+            return
+        _drainer = threading.Thread(target=_drain, name='webhook-inbox-drain', daemon=True)
+        _drainer.start()
+
+
+def _kick_on_commit():
+    if getattr(settings, 'WEBHOOK_INBOX_POST_ON_COMMIT', True):
+        transaction.on_commit(kick)
@@ -45,9 +45,13 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'core_application.middleware.SlidingSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core_application.middleware.RoleContextMiddleware',
+    'core_application.ratelimit.RateLimitMiddleware',
+    'core_application.middleware.QueryProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'core_application.middleware.UserSessionMiddleware',  
@@ -186,11 +190,191 @@ MPESA_SHORTCODE = '174379'  # Your paybill number
 MPESA_PASSKEY = 'your_mpesa_passkey'
 MPESA_CALLBACK_URL = 'https://youruniversity.ac.ke/api/payments/mpesa/callback/'
 
+# ============ WEBHOOK INBOX ============
+# Payment callbacks are stored and acknowledged at once, then posted by a
+# background thread after the commit. Items waiting for a retry are posted
+# by the next drain, or by `process_webhook_inbox --loop` (or the
+# process_webhook_inbox Celery task) when that runs as a service.
+WEBHOOK_INBOX_POST_ON_COMMIT = True
+WEBHOOK_INBOX_WORKERS = 4          # worker threads per run
+WEBHOOK_INBOX_BATCH_SIZE = 50      # items a worker claims at a time
+WEBHOOK_INBOX_LEASE_SECONDS = 300  # after this a claimed item can be taken over
+WEBHOOK_INBOX_MAX_ATTEMPTS = 5     # unexpected errors retried before an item fails
+WEBHOOK_INBOX_RETRY_SECONDS = 30   # back-off per attempt after an unexpected error
+
+# ============ STATEMENT RECONCILIATION ============
+# Statements are reconciled with `reconcile_statement`, from the reconciliation
+# page, or daily from BANK_STATEMENT_DIR (reconcile_bank_payments task).
+BANK_STATEMENT_DIR = BASE_DIR / 'bank_statements'
+RECONCILIATION_CHUNK_SIZE = 1000       # statement lines matched per query
+RECONCILIATION_DATE_WINDOW_DAYS = 3    # allowed gap between statement and posting dates
+
+# ============ REGISTRATION ADMISSION CONTROL ============
+# Token bucket in front of the course registration views. Buckets are per worker
+# process, so the site admits RATE x workers per second; size these per worker.
+REGISTRATION_ADMISSION_ENABLED = True
+REGISTRATION_ADMISSION_RATE = 20   # requests admitted per second
+REGISTRATION_ADMISSION_BURST = 40  # short burst allowance
+
+# ============ QUERY PROFILING ============
+# Per-request SQL capture and N+1 detection. Admins can profile a single
+# request without enabling it globally by sending the signed X-Profile-Token
+# header shown on the query profiler page.
+QUERY_PROFILING_ENABLED = config("QUERY_PROFILING_ENABLED", cast=bool, default=False)
+QUERY_PROFILING_SAMPLE_RATE = 0.1        # share of profiled requests stored in RequestProfileSample
+QUERY_PROFILING_BUFFER_SIZE = 200        # recent profiles kept in memory per process
+QUERY_PROFILING_DUPLICATE_THRESHOLD = 3  # same query shape this many times counts as N+1
+QUERY_PROFILING_MAX_QUERIES = 2000       # statements kept per request for the report
+
+# ============ ANALYTICS FACT TABLES ============
+# Dean/COD reports read pre-aggregated fact tables. A report started after
+# the last refresh is older than this many seconds refreshes them on a
+# background thread; the first report after a deploy builds them. Running
+# `refresh_analytics_facts` on a schedule keeps reports from ever waiting.
+ANALYTICS_FACTS_MAX_AGE = 60 * 15
+
+# ============ ANALYTICS API CACHE ============
+# Result cache for the /analytics/api/ endpoints. Entries are also
+# invalidated by entity-version bumps on writes (see analytics_cache.py).
+ANALYTICS_CACHE_ENABLED = True
+ANALYTICS_CACHE_TTLS = {
+    'default': 300,
+    'student_enrollment': 600,
+    'academic_performance': 900,
+    'financial': 300,
+    'hostel_occupancy': 120,
+    'library_usage': 300,
+    'attendance_analytics': 300,
+}
+ANALYTICS_SINGLE_FLIGHT_WAIT = 10  # seconds a request waits for a concurrent computation
+
+# ============ FINANCE DASHBOARD ============
+# Seconds the finance dashboard aggregates stay cached per academic year;
+# writes to payments, fee structures or students invalidate them earlier.
+# 0 recomputes on every request.
+FINANCE_DASHBOARD_CACHE_TTL = 300
+
+# ============ HOSTEL STATISTICS ============
+# Seconds warden dashboard and booking statistics stay cached per warden and
+# academic year; hostel, booking, payment and incident writes invalidate them.
+# 0 recomputes on every request.
+HOSTEL_STATS_CACHE_TTL = 120
+
+# ============ PEOPLE SEARCH ============
+# Backend for the student/lecturer/staff search index: 'auto' picks FTS5 on
+# SQLite and pg_trgm on PostgreSQL; 'basic' falls back to LIKE on the index.
+PEOPLE_SEARCH_BACKEND = 'auto'
+PEOPLE_SEARCH_FUZZY_THRESHOLD = 0.85  # similarity for near-miss registration numbers
+PEOPLE_SEARCH_FUZZY_CANDIDATES = 500
+
+# ============ PAGINATION ============
+# List views count exactly up to this many rows; larger counts are cached
+# (or estimated from planner statistics on PostgreSQL) for the TTL below.
+PAGINATION_EXACT_COUNT_LIMIT = 10000
+PAGINATION_COUNT_CACHE_TTL = 120
+
 # ============ SMS CONFIGURATION ============
 # Using Africa's Talking (https://africastalking.com)
 AT_USERNAME = 'MurangaUniversity'
 AT_API_KEY = 'your_africastalking_api_key'
 AT_SENDER_ID = 'MUT'
+# core_application.sms_backends.AfricasTalkingSMSBackend in production
+SMS_BACKEND = 'core_application.sms_backends.ConsoleSMSBackend'
+SMS_BATCH_SIZE = 100  # numbers per gateway call
+
+# ============ OUTBOX ============
+# Email and SMS are queued in OutboundMessage and delivered in batches by
+# `process_outbox` (or the process_outbox Celery task); a background thread
+# also drains the outbox after each commit that queued something.
+OUTBOX_SEND_ON_COMMIT = True
+OUTBOX_BATCH_SIZE = 100       # messages sent per SMTP connection / claim
+OUTBOX_LEASE_SECONDS = 300    # after this a claimed message can be taken over
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_SECONDS = 60     # first retry delay, doubled on every attempt
+OUTBOX_RATE_LIMITS = {        # (messages per second, burst) per worker process
+    'email': (5, 50),
+    'sms': (20, 200),
+}
+
+# ============ MEDIA DELIVERY ============
+# Notes, exam materials and submissions are streamed by
+# core_application/media_delivery.py. Set MEDIA_DELIVERY_OFFLOAD to
+# 'x-sendfile' or 'x-accel-redirect' to let the web server send the bytes
+# (for nginx, map MEDIA_ACCEL_REDIRECT_PREFIX to MEDIA_ROOT as an internal
+# location).
+MEDIA_DELIVERY_OFFLOAD = config('MEDIA_DELIVERY_OFFLOAD', default='')
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+MEDIA_ACCESS_CACHE_TTL = 300  # cached enrolment / teaching checks
+
+# ============ WRITE-BEHIND COUNTERS ============
+# Download counters and download audit rows are buffered in each worker
+# process and written in batches (core_application/counters.py) by a flush
+# thread per worker, when the threshold is reached and at interpreter exit.
+# Graceful restarts flush; a worker that is killed outright (SIGKILL, OOM)
+# loses what it buffered since its last flush, i.e. at most
+# COUNTER_FLUSH_INTERVAL seconds or COUNTER_FLUSH_THRESHOLD operations.
+# Set COUNTER_WRITE_BEHIND = False where every count must survive.
+COUNTER_WRITE_BEHIND = True
+COUNTER_FLUSH_INTERVAL = 10        # seconds between background flushes
+COUNTER_FLUSH_THRESHOLD = 1000     # buffered operations that force a flush
+COUNTER_MAX_BUFFERED_ROWS = 10000  # audit rows per model kept while flushes fail
+
+# ============ RATE LIMITING ============
+# Sliding-window counters in the 'ratelimit' cache (see
+# core_application/ratelimit.py). Local memory counts per worker process;
+# point RATE_LIMIT_CACHE_BACKEND at FileBasedCache (or Redis/Memcached) to
+# share the counters between workers. Admin login lockouts and alerts count
+# the AdminLoginAttempt rows instead (one query per login) until the counters
+# are shared; ``manage.py check --deploy`` warns about that (W004).
+RATE_LIMIT_ENABLED = True
+# Reverse proxies (nginx, load balancer) in front of the app, each appending
+# to X-Forwarded-For; with 0 the header is ignored and REMOTE_ADDR is used.
+TRUSTED_PROXY_COUNT = config('TRUSTED_PROXY_COUNT', cast=int, default=0)
+RATE_LIMIT_CACHE = 'ratelimit'
+RATE_LIMITS = {                            # scope: (requests, window seconds)
+    'login_ip': (300, 60),                 # student/staff login POSTs per IP
+    'login_user': (10, 900),               # login POSTs per username
+    'admin_login_failures_ip': (5, 900),   # failed admin logins before a block
+    'admin_login_failures_user': (2, 900),
+    'webhooks': (600, 60),                 # bank/M-Pesa callbacks per IP
+    'ajax': (120, 60),                     # AJAX requests per user
+}
+RATE_LIMIT_RULES = [
+    {'scope': 'webhooks', 'paths': ['/api/payments/'], 'key': 'ip', 'methods': ['POST']},
+    {'scope': 'ajax', 'ajax': True, 'key': 'user'},
+]
+
+# The default cache holds entity versions, role scopes and their
+# invalidation, so in production every worker must share it (Redis or
+# Memcached); ``manage.py check --deploy`` fails on a per-process backend.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    },
+    'ratelimit': {
+        'BACKEND': config('RATE_LIMIT_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('RATE_LIMIT_CACHE_LOCATION', default='ratelimit'),
+    },
+}
+
+# ============ BROADCAST NOTIFICATIONS ============
+# Audience-targeted notices are stored once and matched on read; see
+# core_application/broadcasts.py.
+BROADCAST_UNREAD_CACHE_TTL = 300    # per-user unread counter
+BROADCAST_AUDIENCE_CACHE_TTL = 600  # a user's programme/year/hostel
+
+# ============ ROLE CONTEXT ============
+# request.role carries the user's profile and HOD/dean/warden scope, cached
+# per user; see core_application/role_context.py.
+ROLE_CONTEXT_CACHE_TTL = 600
+
+# ============ REFERENCE DATA ============
+# Faculties, departments, programmes, academic years, semesters and hostels
+# are served from versioned in-process snapshots; see
+# core_application/reference_data.py.
+REFERENCE_DATA_MAX_AGE = 120        # seconds browsers may reuse a dropdown response
+REFERENCE_DATA_SNAPSHOT_TTL = 300   # seconds before a worker reloads a snapshot regardless
 
 # ============ PAYMENT SETTINGS ============
 PAYMENT_WEBHOOK_IPS = [
@@ -198,6 +382,11 @@ PAYMENT_WEBHOOK_IPS = [
     '105.x.x.x',  # KCB Bank IP
     # Add bank IP addresses for security
 ]
+# Bank receipt numbers (EQU-2025-000042) are allocated in their own short
+# transaction, so a rolled back posting leaves a gap. True allocates them in
+# the posting's transaction instead: no gaps, but postings under one prefix
+# run one at a time. SQLite always behaves as True.
+RECEIPT_NUMBERS_GAPLESS = False
 
 # Email settings for security alerts
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -211,9 +400,17 @@ DEFAULT_FROM_EMAIL = config(
     default="University Security System <security@yourdomain.com>"
 )
 
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
-SESSION_SAVE_EVERY_REQUEST = True
+# ============ SESSIONS ============
+# cached_db reads sessions from the cache and writes through to the
+# database; 'django.contrib.sessions.backends.signed_cookies' stores them in
+# the cookie and needs no session table at all. Rather than saving the
+# session on every request (SESSION_SAVE_EVERY_REQUEST), SlidingSessionMiddleware
+# extends its expiry at most once per SESSION_REFRESH_INTERVAL.
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.cached_db')
+SESSION_SAVE_EVERY_REQUEST = False
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
+SESSION_REFRESH_INTERVAL = 300   # seconds between sliding-expiry saves
+SESSION_ACTIVITY_INTERVAL = 60   # seconds between UserSession.last_activity writes
 
 
 # Security settings